@@ -156,7 +156,7 @@ class ScheduledReportResponse(BaseModel):
 
 # Report Templates
 @router.post("/report-templates", response_model=ReportTemplateResponse, status_code=status.HTTP_201_CREATED)
-async def create_report_template(
+def create_report_template(
     template_data: ReportTemplateCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_reports"))
@@ -172,7 +172,7 @@ async def create_report_template(
     return template
 
 @router.get("/report-templates", response_model=List[ReportTemplateResponse])
-async def get_report_templates(
+def get_report_templates(
     report_type: Optional[ReportType] = Query(None),
     category: Optional[str] = Query(None),
     is_public: Optional[bool] = Query(None),
@@ -192,7 +192,7 @@ async def get_report_templates(
     return query.filter(ReportTemplate.is_active == True).all()
 
 @router.get("/report-templates/{template_id}", response_model=ReportTemplateResponse)
-async def get_report_template(
+def get_report_template(
     template_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("view_reports"))
@@ -205,7 +205,7 @@ async def get_report_template(
 
 # Report Instances
 @router.post("/report-instances", response_model=ReportInstanceResponse, status_code=status.HTTP_201_CREATED)
-async def create_report_instance(
+def create_report_instance(
     instance_data: ReportInstanceCreate,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
@@ -232,7 +232,7 @@ async def create_report_instance(
     return instance
 
 @router.get("/report-instances", response_model=List[ReportInstanceResponse])
-async def get_report_instances(
+def get_report_instances(
     template_id: Optional[int] = Query(None),
     status: Optional[str] = Query(None),
     generated_by: Optional[int] = Query(None),
@@ -252,7 +252,7 @@ async def get_report_instances(
     return query.order_by(ReportInstance.generated_date.desc()).all()
 
 @router.get("/report-instances/{instance_id}", response_model=ReportInstanceResponse)
-async def get_report_instance(
+def get_report_instance(
     instance_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("view_reports"))
@@ -265,7 +265,7 @@ async def get_report_instance(
 
 # Dashboard Widgets
 @router.post("/dashboard-widgets", response_model=DashboardWidgetResponse, status_code=status.HTTP_201_CREATED)
-async def create_dashboard_widget(
+def create_dashboard_widget(
     widget_data: DashboardWidgetCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_dashboard"))
@@ -281,7 +281,7 @@ async def create_dashboard_widget(
     return widget
 
 @router.get("/dashboard-widgets", response_model=List[DashboardWidgetResponse])
-async def get_dashboard_widgets(
+def get_dashboard_widgets(
     widget_type: Optional[WidgetType] = Query(None),
     is_public: Optional[bool] = Query(None),
     db: Session = Depends(get_db),
@@ -298,7 +298,7 @@ async def get_dashboard_widgets(
     return query.filter(DashboardWidget.is_active == True).all()
 
 @router.get("/dashboard-widgets/{widget_id}", response_model=DashboardWidgetResponse)
-async def get_dashboard_widget(
+def get_dashboard_widget(
     widget_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("view_dashboard"))
@@ -311,7 +311,7 @@ async def get_dashboard_widget(
 
 # Scheduled Reports
 @router.post("/scheduled-reports", response_model=ScheduledReportResponse, status_code=status.HTTP_201_CREATED)
-async def create_scheduled_report(
+def create_scheduled_report(
     report_data: ScheduledReportCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_scheduled_reports"))
@@ -332,7 +332,7 @@ async def create_scheduled_report(
     return scheduled_report
 
 @router.get("/scheduled-reports", response_model=List[ScheduledReportResponse])
-async def get_scheduled_reports(
+def get_scheduled_reports(
     is_active: Optional[bool] = Query(None),
     created_by: Optional[int] = Query(None),
     db: Session = Depends(get_db),
@@ -349,7 +349,7 @@ async def get_scheduled_reports(
     return query.all()
 
 @router.get("/scheduled-reports/{report_id}", response_model=ScheduledReportResponse)
-async def get_scheduled_report(
+def get_scheduled_report(
     report_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("view_scheduled_reports"))
@@ -362,7 +362,7 @@ async def get_scheduled_report(
 
 # Report Categories
 @router.get("/report-categories")
-async def get_report_categories(
+def get_report_categories(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("view_reports"))
 ):
@@ -372,7 +372,7 @@ async def get_report_categories(
 
 # Report Statistics
 @router.get("/report-statistics")
-async def get_report_statistics(
+def get_report_statistics(
     date_from: Optional[date] = Query(None),
     date_to: Optional[date] = Query(None),
     db: Session = Depends(get_db),
@@ -141,7 +141,7 @@ class ApprovalActionResponse(BaseModel):
 
 # Approval Workflows
 @router.post("/approval-workflows", response_model=ApprovalWorkflowResponse, status_code=status.HTTP_201_CREATED)
-async def create_approval_workflow(
+def create_approval_workflow(
     workflow_data: ApprovalWorkflowCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_workflows"))
@@ -154,7 +154,7 @@ async def create_approval_workflow(
     return workflow
 
 @router.get("/approval-workflows", response_model=List[ApprovalWorkflowResponse])
-async def get_approval_workflows(
+def get_approval_workflows(
     document_type: Optional[DocumentType] = Query(None),
     is_active: Optional[bool] = Query(None),
     db: Session = Depends(get_db),
@@ -171,7 +171,7 @@ async def get_approval_workflows(
     return query.all()
 
 @router.get("/approval-workflows/{workflow_id}", response_model=ApprovalWorkflowResponse)
-async def get_approval_workflow(
+def get_approval_workflow(
     workflow_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("view_workflows"))
@@ -184,7 +184,7 @@ async def get_approval_workflow(
 
 # Approval Steps
 @router.post("/approval-steps", response_model=ApprovalStepResponse, status_code=status.HTTP_201_CREATED)
-async def create_approval_step(
+def create_approval_step(
     step_data: ApprovalStepCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_workflows"))
@@ -197,7 +197,7 @@ async def create_approval_step(
     return step
 
 @router.get("/approval-steps", response_model=List[ApprovalStepResponse])
-async def get_approval_steps(
+def get_approval_steps(
     workflow_id: Optional[int] = Query(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("view_workflows"))
@@ -212,7 +212,7 @@ async def get_approval_steps(
 
 # Approval Records
 @router.post("/approval-records", response_model=ApprovalRecordResponse, status_code=status.HTTP_201_CREATED)
-async def create_approval_record(
+def create_approval_record(
     record_data: ApprovalRecordCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_workflows"))
@@ -236,7 +236,7 @@ async def create_approval_record(
     return record
 
 @router.get("/approval-records", response_model=List[ApprovalRecordResponse])
-async def get_approval_records(
+def get_approval_records(
     document_type: Optional[DocumentType] = Query(None),
     status: Optional[WorkflowStatus] = Query(None),
     initiated_by: Optional[int] = Query(None),
@@ -256,7 +256,7 @@ async def get_approval_records(
     return query.order_by(ApprovalRecord.created_at.desc()).all()
 
 @router.get("/approval-records/{record_id}", response_model=ApprovalRecordResponse)
-async def get_approval_record(
+def get_approval_record(
     record_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("view_workflows"))
@@ -269,7 +269,7 @@ async def get_approval_record(
 
 # Approval Actions
 @router.post("/approval-actions", response_model=ApprovalActionResponse, status_code=status.HTTP_201_CREATED)
-async def create_approval_action(
+def create_approval_action(
     action_data: ApprovalActionCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_workflows"))
@@ -285,7 +285,7 @@ async def create_approval_action(
     return action
 
 @router.get("/approval-actions", response_model=List[ApprovalActionResponse])
-async def get_approval_actions(
+def get_approval_actions(
     record_id: Optional[int] = Query(None),
     action_type: Optional[str] = Query(None),
     db: Session = Depends(get_db),
@@ -303,7 +303,7 @@ async def get_approval_actions(
 
 # Workflow Statistics
 @router.get("/workflow-statistics")
-async def get_workflow_statistics(
+def get_workflow_statistics(
     date_from: Optional[date] = Query(None),
     date_to: Optional[date] = Query(None),
     db: Session = Depends(get_db),
@@ -332,7 +332,7 @@ async def get_workflow_statistics(
 
 # My Pending Approvals
 @router.get("/my-pending-approvals", response_model=List[ApprovalRecordResponse])
-async def get_my_pending_approvals(
+def get_my_pending_approvals(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("view_workflows"))
 ):
@@ -343,7 +343,7 @@ async def get_my_pending_approvals(
 
 # Workflow Dashboard
 @router.get("/workflow-dashboard")
-async def get_workflow_dashboard(
+def get_workflow_dashboard(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("view_workflows"))
 ):
@@ -219,7 +219,7 @@ class AnalyticReportResponse(BaseModel):
 
 # Analytic Accounts
 @router.post("/analytic-accounts", response_model=AnalyticAccountResponse, status_code=status.HTTP_201_CREATED)
-async def create_analytic_account(
+def create_analytic_account(
     account_data: AnalyticAccountCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_analytic"))
@@ -232,7 +232,7 @@ async def create_analytic_account(
     return account
 
 @router.get("/analytic-accounts", response_model=List[AnalyticAccountResponse])
-async def get_analytic_accounts(
+def get_analytic_accounts(
     account_type: Optional[AnalyticAccountType] = Query(None),
     parent_id: Optional[int] = Query(None),
     is_active: Optional[bool] = Query(None),
@@ -255,7 +255,7 @@ async def get_analytic_accounts(
     return query.order_by(AnalyticAccount.name).all()
 
 @router.get("/analytic-accounts/{account_id}", response_model=AnalyticAccountResponse)
-async def get_analytic_account(
+def get_analytic_account(
     account_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("view_analytic"))
@@ -268,7 +268,7 @@ async def get_analytic_account(
 
 # Analytic Lines
 @router.post("/analytic-lines", response_model=AnalyticLineResponse, status_code=status.HTTP_201_CREATED)
-async def create_analytic_line(
+def create_analytic_line(
     line_data: AnalyticLineCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_analytic"))
@@ -284,7 +284,7 @@ async def create_analytic_line(
     return line
 
 @router.get("/analytic-lines", response_model=List[AnalyticLineResponse])
-async def get_analytic_lines(
+def get_analytic_lines(
     analytic_account_id: Optional[int] = Query(None),
     date_from: Optional[date] = Query(None),
     date_to: Optional[date] = Query(None),
@@ -308,7 +308,7 @@ async def get_analytic_lines(
 
 # Analytic Plans
 @router.post("/analytic-plans", response_model=AnalyticPlanResponse, status_code=status.HTTP_201_CREATED)
-async def create_analytic_plan(
+def create_analytic_plan(
     plan_data: AnalyticPlanCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_analytic"))
@@ -325,7 +325,7 @@ async def create_analytic_plan(
     return plan
 
 @router.get("/analytic-plans", response_model=List[AnalyticPlanResponse])
-async def get_analytic_plans(
+def get_analytic_plans(
     is_active: Optional[bool] = Query(None),
     is_default: Optional[bool] = Query(None),
     db: Session = Depends(get_db),
@@ -343,7 +343,7 @@ async def get_analytic_plans(
 
 # Analytic Distributions
 @router.post("/analytic-distributions", response_model=AnalyticDistributionResponse, status_code=status.HTTP_201_CREATED)
-async def create_analytic_distribution(
+def create_analytic_distribution(
     distribution_data: AnalyticDistributionCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_analytic"))
@@ -356,7 +356,7 @@ async def create_analytic_distribution(
     return distribution
 
 @router.get("/analytic-distributions", response_model=List[AnalyticDistributionResponse])
-async def get_analytic_distributions(
+def get_analytic_distributions(
     account_id: Optional[int] = Query(None),
     analytic_account_id: Optional[int] = Query(None),
     distribution_method: Optional[DistributionMethod] = Query(None),
@@ -380,7 +380,7 @@ async def get_analytic_distributions(
 
 # Analytic Budgets
 @router.post("/analytic-budgets", response_model=AnalyticBudgetResponse, status_code=status.HTTP_201_CREATED)
-async def create_analytic_budget(
+def create_analytic_budget(
     budget_data: AnalyticBudgetCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_analytic"))
@@ -396,7 +396,7 @@ async def create_analytic_budget(
     return budget
 
 @router.get("/analytic-budgets", response_model=List[AnalyticBudgetResponse])
-async def get_analytic_budgets(
+def get_analytic_budgets(
     analytic_account_id: Optional[int] = Query(None),
     account_id: Optional[int] = Query(None),
     budget_period: Optional[str] = Query(None),
@@ -420,7 +420,7 @@ async def get_analytic_budgets(
 
 # Analytic Reports
 @router.post("/analytic-reports", response_model=AnalyticReportResponse, status_code=status.HTTP_201_CREATED)
-async def create_analytic_report(
+def create_analytic_report(
     report_data: AnalyticReportCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_analytic"))
@@ -436,7 +436,7 @@ async def create_analytic_report(
     return report
 
 @router.get("/analytic-reports", response_model=List[AnalyticReportResponse])
-async def get_analytic_reports(
+def get_analytic_reports(
     report_type: Optional[str] = Query(None),
     is_active: Optional[bool] = Query(None),
     created_by: Optional[int] = Query(None),
@@ -457,7 +457,7 @@ async def get_analytic_reports(
 
 # Analytic Statistics
 @router.get("/analytic-statistics")
-async def get_analytic_statistics(
+def get_analytic_statistics(
     date_from: Optional[date] = Query(None),
     date_to: Optional[date] = Query(None),
     analytic_account_id: Optional[int] = Query(None),
@@ -479,7 +479,7 @@ async def get_analytic_statistics(
 
 # Analytic Dashboard
 @router.get("/analytic-dashboard")
-async def get_analytic_dashboard(
+def get_analytic_dashboard(
     date_from: Optional[date] = Query(None),
     date_to: Optional[date] = Query(None),
     db: Session = Depends(get_db),
@@ -196,7 +196,7 @@ class CashRoundingResponse(BaseModel):
 
 # Bank Accounts
 @router.post("/bank-accounts", response_model=BankAccountResponse, status_code=status.HTTP_201_CREATED)
-async def create_bank_account(
+def create_bank_account(
     account_data: BankAccountCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_banking"))
@@ -210,7 +210,7 @@ async def create_bank_account(
     return account
 
 @router.get("/bank-accounts", response_model=List[BankAccountResponse])
-async def get_bank_accounts(
+def get_bank_accounts(
     account_type: Optional[BankAccountType] = Query(None),
     is_active: Optional[bool] = Query(None),
     is_primary: Optional[bool] = Query(None),
@@ -230,7 +230,7 @@ async def get_bank_accounts(
     return query.all()
 
 @router.get("/bank-accounts/{account_id}", response_model=BankAccountResponse)
-async def get_bank_account(
+def get_bank_account(
     account_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("view_banking"))
@@ -243,7 +243,7 @@ async def get_bank_account(
 
 # Bank Statements
 @router.post("/bank-statements", response_model=BankStatementResponse, status_code=status.HTTP_201_CREATED)
-async def create_bank_statement(
+def create_bank_statement(
     statement_data: BankStatementCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_banking"))
@@ -265,7 +265,7 @@ async def create_bank_statement(
     return statement
 
 @router.get("/bank-statements", response_model=List[BankStatementResponse])
-async def get_bank_statements(
+def get_bank_statements(
     bank_account_id: Optional[int] = Query(None),
     status: Optional[StatementStatus] = Query(None),
     date_from: Optional[date] = Query(None),
@@ -288,7 +288,7 @@ async def get_bank_statements(
     return query.order_by(BankStatement.statement_date.desc()).all()
 
 @router.get("/bank-statements/{statement_id}", response_model=BankStatementResponse)
-async def get_bank_statement(
+def get_bank_statement(
     statement_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("view_banking"))
@@ -301,7 +301,7 @@ async def get_bank_statement(
 
 # Bank Statement Lines
 @router.post("/bank-statement-lines", response_model=BankStatementLineResponse, status_code=status.HTTP_201_CREATED)
-async def create_bank_statement_line(
+def create_bank_statement_line(
     line_data: BankStatementLineCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_banking"))
@@ -319,7 +319,7 @@ async def create_bank_statement_line(
     return line
 
 @router.get("/bank-statement-lines", response_model=List[BankStatementLineResponse])
-async def get_bank_statement_lines(
+def get_bank_statement_lines(
     statement_id: Optional[int] = Query(None),
     is_reconciled: Optional[bool] = Query(None),
     date_from: Optional[date] = Query(None),
@@ -343,7 +343,7 @@ async def get_bank_statement_lines(
 
 # Payment Methods
 @router.post("/payment-methods", response_model=PaymentMethodResponse, status_code=status.HTTP_201_CREATED)
-async def create_payment_method(
+def create_payment_method(
     method_data: PaymentMethodCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_banking"))
@@ -356,7 +356,7 @@ async def create_payment_method(
     return method
 
 @router.get("/payment-methods", response_model=List[PaymentMethodResponse])
-async def get_payment_methods(
+def get_payment_methods(
     payment_type: Optional[PaymentMethodType] = Query(None),
     is_active: Optional[bool] = Query(None),
     db: Session = Depends(get_db),
@@ -374,7 +374,7 @@ async def get_payment_methods(
 
 # Payment Terms
 @router.post("/payment-terms", response_model=PaymentTermResponse, status_code=status.HTTP_201_CREATED)
-async def create_payment_term(
+def create_payment_term(
     term_data: PaymentTermCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_banking"))
@@ -387,7 +387,7 @@ async def create_payment_term(
     return term
 
 @router.get("/payment-terms", response_model=List[PaymentTermResponse])
-async def get_payment_terms(
+def get_payment_terms(
     is_active: Optional[bool] = Query(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("view_banking"))
@@ -402,7 +402,7 @@ async def get_payment_terms(
 
 # Cash Rounding
 @router.post("/cash-rounding", response_model=CashRoundingResponse, status_code=status.HTTP_201_CREATED)
-async def create_cash_rounding(
+def create_cash_rounding(
     rounding_data: CashRoundingCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_banking"))
@@ -415,7 +415,7 @@ async def create_cash_rounding(
     return rounding
 
 @router.get("/cash-rounding", response_model=List[CashRoundingResponse])
-async def get_cash_rounding_rules(
+def get_cash_rounding_rules(
     is_active: Optional[bool] = Query(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("view_banking"))
@@ -430,7 +430,7 @@ async def get_cash_rounding_rules(
 
 # Bank Statement Import
 @router.post("/bank-statements/import")
-async def import_bank_statement(
+def import_bank_statement(
     bank_account_id: int,
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
@@ -453,7 +453,7 @@ async def import_bank_statement(
 
 # Bank Reconciliation
 @router.post("/bank-reconciliation")
-async def create_bank_reconciliation(
+def create_bank_reconciliation(
     bank_account_id: int,
     reconciliation_date: date,
     db: Session = Depends(get_db),
@@ -476,7 +476,7 @@ async def create_bank_reconciliation(
 
 # Banking Statistics
 @router.get("/banking-statistics")
-async def get_banking_statistics(
+def get_banking_statistics(
     date_from: Optional[date] = Query(None),
     date_to: Optional[date] = Query(None),
     db: Session = Depends(get_db),
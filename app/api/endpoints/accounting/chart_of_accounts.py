@@ -94,7 +94,7 @@ class ProfitLossResponse(BaseModel):
 
 # Chart of Accounts Management Endpoints
 @router.post("/", response_model=ChartOfAccountResponse)
-async def create_account(
+def create_account(
     account_data: ChartOfAccountCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("chart_of_accounts.create")),
@@ -137,7 +137,7 @@ async def create_account(
         )
 
 @router.get("/", response_model=List[ChartOfAccountResponse])
-async def list_accounts(
+def list_accounts(
     company_id: int = Query(...),
     account_type: Optional[str] = Query(None),
     parent_id: Optional[int] = Query(None),
@@ -167,7 +167,7 @@ async def list_accounts(
     return accounts
 
 @router.get("/hierarchy", response_model=dict)
-async def get_account_hierarchy(
+def get_account_hierarchy(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("chart_of_accounts.view")),
     db: Session = Depends(get_db)
@@ -191,7 +191,7 @@ async def get_account_hierarchy(
     return hierarchy
 
 @router.get("/{account_id}", response_model=ChartOfAccountResponse)
-async def get_account(
+def get_account(
     account_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("chart_of_accounts.view")),
@@ -223,7 +223,7 @@ async def get_account(
     return account
 
 @router.put("/{account_id}", response_model=ChartOfAccountResponse)
-async def update_account(
+def update_account(
     account_id: int,
     account_data: ChartOfAccountUpdateRequest,
     company_id: int = Query(...),
@@ -264,7 +264,7 @@ async def update_account(
         )
 
 @router.delete("/{account_id}")
-async def delete_account(
+def delete_account(
     account_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("chart_of_accounts.delete")),
@@ -309,7 +309,7 @@ async def delete_account(
         )
 
 @router.post("/initialize-indian")
-async def initialize_indian_chart_of_accounts(
+def initialize_indian_chart_of_accounts(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("chart_of_accounts.create")),
     db: Session = Depends(get_db)
@@ -345,7 +345,7 @@ async def initialize_indian_chart_of_accounts(
 
 # Account Balance Endpoints
 @router.get("/{account_id}/balance", response_model=AccountBalanceResponse)
-async def get_account_balance(
+def get_account_balance(
     account_id: int,
     company_id: int = Query(...),
     from_date: Optional[date] = Query(None),
@@ -387,7 +387,7 @@ async def get_account_balance(
         )
 
 @router.get("/trial-balance", response_model=TrialBalanceResponse)
-async def get_trial_balance(
+def get_trial_balance(
     company_id: int = Query(...),
     from_date: Optional[date] = Query(None),
     to_date: Optional[date] = Query(None),
@@ -422,7 +422,7 @@ async def get_trial_balance(
         )
 
 @router.get("/balance-sheet", response_model=BalanceSheetResponse)
-async def get_balance_sheet(
+def get_balance_sheet(
     company_id: int = Query(...),
     as_on_date: date = Query(...),
     current_user: User = Depends(require_permission("chart_of_accounts.view")),
@@ -455,7 +455,7 @@ async def get_balance_sheet(
         )
 
 @router.get("/profit-loss", response_model=ProfitLossResponse)
-async def get_profit_loss(
+def get_profit_loss(
     company_id: int = Query(...),
     from_date: date = Query(...),
     to_date: date = Query(...),
@@ -491,7 +491,7 @@ async def get_profit_loss(
 
 # Export Endpoints
 @router.get("/export/excel")
-async def export_chart_of_accounts_excel(
+def export_chart_of_accounts_excel(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("chart_of_accounts.view")),
     db: Session = Depends(get_db)
@@ -572,7 +572,7 @@ async def get_account_types(
 
 # Account Validation Endpoints
 @router.post("/validate-code")
-async def validate_account_code(
+def validate_account_code(
     account_code: str = Query(...),
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("chart_of_accounts.view")),
@@ -187,7 +187,7 @@ class AccountingPeriodResponse(BaseModel):
 
 # Journal Entry Endpoints
 @router.post("/journal-entries", response_model=JournalEntryResponse)
-async def create_journal_entry(
+def create_journal_entry(
     entry_data: JournalEntryCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("accounting.manage")),
@@ -226,7 +226,7 @@ async def create_journal_entry(
         )
 
 @router.post("/journal-entries/{entry_id}/items")
-async def add_items_to_journal_entry(
+def add_items_to_journal_entry(
     entry_id: int,
     items: List[JournalEntryItemCreateRequest],
     company_id: int = Query(...),
@@ -273,7 +273,7 @@ async def add_items_to_journal_entry(
         )
 
 @router.post("/journal-entries/{entry_id}/post")
-async def post_journal_entry(
+def post_journal_entry(
     entry_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("accounting.manage")),
@@ -318,7 +318,7 @@ async def post_journal_entry(
         )
 
 @router.post("/journal-entries/{entry_id}/reverse")
-async def reverse_journal_entry(
+def reverse_journal_entry(
     entry_id: int,
     reversal_date: date = Query(...),
     reversal_narration: Optional[str] = Query(None),
@@ -365,7 +365,7 @@ async def reverse_journal_entry(
 
 # Trial Balance Endpoints
 @router.post("/trial-balance", response_model=TrialBalanceResponse)
-async def generate_trial_balance(
+def generate_trial_balance(
     balance_date: date = Query(...),
     financial_year_id: Optional[int] = Query(None),
     company_id: int = Query(...),
@@ -407,7 +407,7 @@ async def generate_trial_balance(
 
 # Balance Sheet Endpoints
 @router.post("/balance-sheet", response_model=BalanceSheetResponse)
-async def generate_balance_sheet(
+def generate_balance_sheet(
     sheet_date: date = Query(...),
     financial_year_id: Optional[int] = Query(None),
     company_id: int = Query(...),
@@ -449,7 +449,7 @@ async def generate_balance_sheet(
 
 # Profit & Loss Statement Endpoints
 @router.post("/profit-loss-statement", response_model=ProfitLossStatementResponse)
-async def generate_profit_loss_statement(
+def generate_profit_loss_statement(
     from_date: date = Query(...),
     to_date: date = Query(...),
     financial_year_id: Optional[int] = Query(None),
@@ -493,7 +493,7 @@ async def generate_profit_loss_statement(
 
 # Cash Flow Statement Endpoints
 @router.post("/cash-flow-statement", response_model=CashFlowStatementResponse)
-async def generate_cash_flow_statement(
+def generate_cash_flow_statement(
     from_date: date = Query(...),
     to_date: date = Query(...),
     financial_year_id: Optional[int] = Query(None),
@@ -537,7 +537,7 @@ async def generate_cash_flow_statement(
 
 # Account Reconciliation Endpoints
 @router.post("/account-reconciliation", response_model=AccountReconciliationResponse)
-async def create_account_reconciliation(
+def create_account_reconciliation(
     reconciliation_data: AccountReconciliationCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("accounting.manage")),
@@ -577,7 +577,7 @@ async def create_account_reconciliation(
         )
 
 @router.post("/account-reconciliation/{reconciliation_id}/items")
-async def add_reconciliation_items(
+def add_reconciliation_items(
     reconciliation_id: int,
     items: List[ReconciliationItemCreateRequest],
     company_id: int = Query(...),
@@ -620,7 +620,7 @@ async def add_reconciliation_items(
 
 # Accounting Period Endpoints
 @router.post("/accounting-periods", response_model=AccountingPeriodResponse)
-async def create_accounting_period(
+def create_accounting_period(
     period_data: AccountingPeriodCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("accounting.manage")),
@@ -659,7 +659,7 @@ async def create_accounting_period(
         )
 
 @router.post("/accounting-periods/{period_id}/close")
-async def close_accounting_period(
+def close_accounting_period(
     period_id: int,
     closing_date: date = Query(...),
     company_id: int = Query(...),
@@ -705,9 +705,50 @@ async def close_accounting_period(
             detail=f"Failed to close accounting period: {str(e)}"
         )
 
+# Balance Snapshot Endpoints
+@router.post("/balance-snapshots/refresh")
+def refresh_balance_snapshots(
+    company_id: int = Query(...),
+    current_user: User = Depends(require_permission("accounting.manage")),
+    db: Session = Depends(get_db)
+):
+    """Fold posted journal entries not yet in the balance snapshots"""
+    
+    # Check if user has access to company
+    from ...services.company_service import company_service
+    company = company_service.get_company_by_id(db, company_id, current_user.id)
+    if not company:
+        raise HTTPException(
+            status_code=403,
+            detail="Access denied to this company"
+        )
+    
+    applied = double_entry_accounting_service.account_balance_service.refresh_balance_snapshots(db, company_id)
+    return {"message": "Balance snapshots refreshed", "entries_applied": applied}
+
+@router.post("/balance-snapshots/rebuild")
+def rebuild_balance_snapshots(
+    company_id: int = Query(...),
+    current_user: User = Depends(require_permission("accounting.manage")),
+    db: Session = Depends(get_db)
+):
+    """Discard and recompute the balance snapshots from all posted journal entries (backfill)"""
+    
+    # Check if user has access to company
+    from ...services.company_service import company_service
+    company = company_service.get_company_by_id(db, company_id, current_user.id)
+    if not company:
+        raise HTTPException(
+            status_code=403,
+            detail="Access denied to this company"
+        )
+    
+    applied = double_entry_accounting_service.account_balance_service.rebuild_balance_snapshots(db, company_id)
+    return {"message": "Balance snapshots rebuilt", "entries_applied": applied}
+
 # Financial Summary Endpoint
 @router.get("/financial-summary")
-async def get_financial_summary(
+def get_financial_summary(
     company_id: int = Query(...),
     financial_year_id: Optional[int] = Query(None),
     current_user: User = Depends(require_permission("accounting.view")),
@@ -72,7 +72,7 @@ class CarryForwardResponse(BaseModel):
 
 # Financial Year Management Endpoints
 @router.post("/", response_model=FinancialYearResponse)
-async def create_financial_year(
+def create_financial_year(
     fy_data: FinancialYearCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("financial_year.create")),
@@ -124,7 +124,7 @@ async def create_financial_year(
         )
 
 @router.get("/", response_model=List[FinancialYearResponse])
-async def list_financial_years(
+def list_financial_years(
     company_id: int = Query(...),
     include_closed: bool = Query(False),
     current_user: User = Depends(require_permission("financial_year.view")),
@@ -150,7 +150,7 @@ async def list_financial_years(
     return financial_years
 
 @router.get("/active", response_model=FinancialYearResponse)
-async def get_active_financial_year(
+def get_active_financial_year(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("financial_year.view")),
     db: Session = Depends(get_db)
@@ -180,7 +180,7 @@ async def get_active_financial_year(
     return financial_year
 
 @router.get("/{fy_id}", response_model=FinancialYearResponse)
-async def get_financial_year(
+def get_financial_year(
     fy_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("financial_year.view")),
@@ -212,7 +212,7 @@ async def get_financial_year(
     return financial_year
 
 @router.put("/{fy_id}", response_model=FinancialYearResponse)
-async def update_financial_year(
+def update_financial_year(
     fy_id: int,
     fy_data: FinancialYearUpdateRequest,
     company_id: int = Query(...),
@@ -262,7 +262,7 @@ async def update_financial_year(
     return financial_year
 
 @router.post("/{fy_id}/close")
-async def close_financial_year(
+def close_financial_year(
     fy_id: int,
     closing_remarks: Optional[str] = Query(None),
     company_id: int = Query(...),
@@ -310,7 +310,7 @@ async def close_financial_year(
         )
 
 @router.get("/{fy_id}/closing-balances", response_model=ClosingBalanceResponse)
-async def get_closing_balances(
+def get_closing_balances(
     fy_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("financial_year.view")),
@@ -349,7 +349,7 @@ async def get_closing_balances(
     return ClosingBalanceResponse(**closing_balances)
 
 @router.post("/{fy_id}/opening-balances")
-async def create_opening_balances(
+def create_opening_balances(
     fy_id: int,
     opening_data: OpeningBalanceRequest,
     company_id: int = Query(...),
@@ -396,7 +396,7 @@ async def create_opening_balances(
         )
 
 @router.post("/carry-forward", response_model=CarryForwardResponse)
-async def carry_forward_data(
+def carry_forward_data(
     carry_data: CarryForwardRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("financial_year.manage")),
@@ -436,7 +436,7 @@ async def carry_forward_data(
         )
 
 @router.get("/{fy_id}/summary")
-async def get_financial_year_summary(
+def get_financial_year_summary(
     fy_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("financial_year.view")),
@@ -474,7 +474,7 @@ async def get_financial_year_summary(
         )
 
 @router.get("/{fy_id}/reports")
-async def get_financial_year_reports(
+def get_financial_year_reports(
     fy_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("financial_year.view")),
@@ -512,7 +512,7 @@ async def get_financial_year_reports(
         )
 
 @router.get("/suggestions")
-async def get_financial_year_suggestions(
+def get_financial_year_suggestions(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("financial_year.view")),
     db: Session = Depends(get_db)
@@ -199,7 +199,7 @@ class YearReportResponse(BaseModel):
 
 # Financial Year Endpoints
 @router.post("/financial-years", response_model=FinancialYearResponse)
-async def create_financial_year(
+def create_financial_year(
     year_data: FinancialYearCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("financial_year.manage")),
@@ -242,7 +242,7 @@ async def create_financial_year(
         )
 
 @router.get("/financial-years", response_model=List[FinancialYearResponse])
-async def get_financial_years(
+def get_financial_years(
     company_id: int = Query(...),
     is_active: Optional[bool] = Query(None),
     is_closed: Optional[bool] = Query(None),
@@ -272,7 +272,7 @@ async def get_financial_years(
     return years
 
 @router.post("/financial-years/{year_id}/activate", response_model=FinancialYearResponse)
-async def activate_financial_year(
+def activate_financial_year(
     year_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("financial_year.manage")),
@@ -311,7 +311,7 @@ async def activate_financial_year(
         )
 
 @router.post("/financial-years/{year_id}/close", response_model=YearClosingResponse)
-async def close_financial_year(
+def close_financial_year(
     year_id: int,
     closing_data: YearClosingCreateRequest,
     company_id: int = Query(...),
@@ -353,7 +353,7 @@ async def close_financial_year(
 
 # Opening Balance Endpoints
 @router.post("/opening-balances", response_model=OpeningBalanceResponse)
-async def create_opening_balance(
+def create_opening_balance(
     balance_data: OpeningBalanceCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("financial_year.manage")),
@@ -397,7 +397,7 @@ async def create_opening_balance(
         )
 
 @router.get("/opening-balances", response_model=List[OpeningBalanceResponse])
-async def get_opening_balances(
+def get_opening_balances(
     financial_year_id: int = Query(...),
     company_id: int = Query(...),
     is_verified: Optional[bool] = Query(None),
@@ -425,7 +425,7 @@ async def get_opening_balances(
     return balances
 
 @router.post("/opening-balances/{balance_id}/verify", response_model=OpeningBalanceResponse)
-async def verify_opening_balance(
+def verify_opening_balance(
     balance_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("financial_year.manage")),
@@ -465,7 +465,7 @@ async def verify_opening_balance(
 
 # Data Carry Forward Endpoints
 @router.post("/data-carry-forward", response_model=DataCarryForwardResponse)
-async def create_data_carry_forward(
+def create_data_carry_forward(
     carry_forward_data: DataCarryForwardCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("financial_year.manage")),
@@ -507,7 +507,7 @@ async def create_data_carry_forward(
 
 # Year Analytics Endpoints
 @router.get("/year-analytics", response_model=YearAnalyticsResponse)
-async def get_year_analytics(
+def get_year_analytics(
     financial_year_id: int = Query(...),
     analytics_date: Optional[date] = Query(None),
     company_id: int = Query(...),
@@ -536,7 +536,7 @@ async def get_year_analytics(
 
 # Year Backup Endpoints
 @router.post("/year-backups", response_model=YearBackupResponse)
-async def create_year_backup(
+def create_year_backup(
     backup_data: YearBackupCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("financial_year.manage")),
@@ -578,7 +578,7 @@ async def create_year_backup(
 
 # Year Report Endpoints
 @router.post("/year-reports", response_model=YearReportResponse)
-async def generate_year_report(
+def generate_year_report(
     report_data: YearReportCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("financial_year.view")),
@@ -45,7 +45,7 @@ class AutomationLogResponse(BaseModel):
 
 # Automation Control Endpoints
 @router.get("/settings", response_model=AutomationSettingsResponse)
-async def get_automation_settings(
+def get_automation_settings(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("automation.view")),
     db: Session = Depends(get_db)
@@ -79,7 +79,7 @@ async def get_automation_settings(
         )
 
 @router.put("/settings", response_model=AutomationSettingsResponse)
-async def update_automation_settings(
+def update_automation_settings(
     settings_data: AutomationSettingsRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("automation.update")),
@@ -120,7 +120,7 @@ async def update_automation_settings(
         )
 
 @router.post("/gst/process")
-async def process_gst_automation(
+def process_gst_automation(
     return_data: dict,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("automation.gst")),
@@ -150,7 +150,7 @@ async def process_gst_automation(
         )
 
 @router.post("/banking/process")
-async def process_banking_automation(
+def process_banking_automation(
     transaction_data: dict,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("automation.banking")),
@@ -180,7 +180,7 @@ async def process_banking_automation(
         )
 
 @router.post("/approve", response_model=dict)
-async def approve_automation_request(
+def approve_automation_request(
     approval_data: AutomationApprovalRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("automation.approve")),
@@ -213,7 +213,7 @@ async def approve_automation_request(
         )
 
 @router.get("/logs", response_model=List[AutomationLogResponse])
-async def get_automation_logs(
+def get_automation_logs(
     company_id: int = Query(...),
     limit: int = Query(100, ge=1, le=1000),
     current_user: User = Depends(require_permission("automation.logs")),
@@ -254,7 +254,7 @@ async def get_automation_logs(
         )
 
 @router.post("/rollback")
-async def rollback_automation(
+def rollback_automation(
     log_id: int = Query(...),
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("automation.rollback")),
@@ -284,7 +284,7 @@ async def rollback_automation(
         )
 
 @router.get("/status")
-async def get_automation_status(
+def get_automation_status(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("automation.status")),
     db: Session = Depends(get_db)
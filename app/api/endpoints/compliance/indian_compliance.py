@@ -32,7 +32,7 @@ router = APIRouter()
 
 # GST Registration Endpoints
 @router.post("/gst/registrations", response_model=GSTRegistrationResponse, status_code=status.HTTP_201_CREATED)
-async def create_gst_registration(
+def create_gst_registration(
     registration_data: GSTRegistrationCreate,
     current_user: User = Depends(require_permission("compliance.gst.create")),
     db: Session = Depends(get_db)
@@ -62,7 +62,7 @@ async def create_gst_registration(
     return gst_registration
 
 @router.get("/gst/registrations", response_model=List[GSTRegistrationResponse])
-async def get_gst_registrations(
+def get_gst_registrations(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     is_active: Optional[bool] = Query(None),
@@ -82,7 +82,7 @@ async def get_gst_registrations(
     return registrations
 
 @router.get("/gst/registrations/{registration_id}", response_model=GSTRegistrationResponse)
-async def get_gst_registration(
+def get_gst_registration(
     registration_id: int,
     current_user: User = Depends(require_permission("compliance.gst.view")),
     db: Session = Depends(get_db)
@@ -104,7 +104,7 @@ async def get_gst_registration(
 
 # GST Return Endpoints
 @router.post("/gst/returns", response_model=GSTReturnResponse, status_code=status.HTTP_201_CREATED)
-async def create_gst_return(
+def create_gst_return(
     return_data: GSTReturnCreate,
     current_user: User = Depends(require_permission("compliance.gst.create")),
     db: Session = Depends(get_db)
@@ -136,7 +136,7 @@ async def create_gst_return(
     return gst_return
 
 @router.get("/gst/returns", response_model=List[GSTReturnResponse])
-async def get_gst_returns(
+def get_gst_returns(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     return_period: Optional[str] = Query(None),
@@ -162,7 +162,7 @@ async def get_gst_returns(
     return returns
 
 @router.get("/gst/returns/{return_id}", response_model=GSTReturnResponse)
-async def get_gst_return(
+def get_gst_return(
     return_id: int,
     current_user: User = Depends(require_permission("compliance.gst.view")),
     db: Session = Depends(get_db)
@@ -184,7 +184,7 @@ async def get_gst_return(
 
 # GST Payment Endpoints
 @router.post("/gst/payments", response_model=GSTPaymentResponse, status_code=status.HTTP_201_CREATED)
-async def create_gst_payment(
+def create_gst_payment(
     payment_data: GSTPaymentCreate,
     current_user: User = Depends(require_permission("compliance.gst.create")),
     db: Session = Depends(get_db)
@@ -216,7 +216,7 @@ async def create_gst_payment(
     return gst_payment
 
 @router.get("/gst/payments", response_model=List[GSTPaymentResponse])
-async def get_gst_payments(
+def get_gst_payments(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     gst_registration_id: Optional[int] = Query(None),
@@ -240,7 +240,7 @@ async def get_gst_payments(
 
 # TDS Return Endpoints
 @router.post("/tds/returns", response_model=TDSReturnResponse, status_code=status.HTTP_201_CREATED)
-async def create_tds_return(
+def create_tds_return(
     return_data: TDSReturnCreate,
     current_user: User = Depends(require_permission("compliance.tds.create")),
     db: Session = Depends(get_db)
@@ -260,7 +260,7 @@ async def create_tds_return(
     return tds_return
 
 @router.get("/tds/returns", response_model=List[TDSReturnResponse])
-async def get_tds_returns(
+def get_tds_returns(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     return_period: Optional[str] = Query(None),
@@ -287,7 +287,7 @@ async def get_tds_returns(
 
 # TCS Return Endpoints
 @router.post("/tcs/returns", response_model=TCSReturnResponse, status_code=status.HTTP_201_CREATED)
-async def create_tcs_return(
+def create_tcs_return(
     return_data: TCSReturnCreate,
     current_user: User = Depends(require_permission("compliance.tcs.create")),
     db: Session = Depends(get_db)
@@ -307,7 +307,7 @@ async def create_tcs_return(
     return tcs_return
 
 @router.get("/tcs/returns", response_model=List[TCSReturnResponse])
-async def get_tcs_returns(
+def get_tcs_returns(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     return_period: Optional[str] = Query(None),
@@ -334,7 +334,7 @@ async def get_tcs_returns(
 
 # E-Invoice Endpoints
 @router.post("/e-invoices", response_model=EInvoiceResponse, status_code=status.HTTP_201_CREATED)
-async def create_e_invoice(
+def create_e_invoice(
     invoice_data: EInvoiceCreate,
     current_user: User = Depends(require_permission("compliance.e_invoice.create")),
     db: Session = Depends(get_db)
@@ -364,7 +364,7 @@ async def create_e_invoice(
     return e_invoice
 
 @router.get("/e-invoices", response_model=List[EInvoiceResponse])
-async def get_e_invoices(
+def get_e_invoices(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     status: Optional[str] = Query(None),
@@ -385,7 +385,7 @@ async def get_e_invoices(
 
 # E-Waybill Endpoints
 @router.post("/e-waybills", response_model=EWaybillResponse, status_code=status.HTTP_201_CREATED)
-async def create_e_waybill(
+def create_e_waybill(
     waybill_data: EWaybillCreate,
     current_user: User = Depends(require_permission("compliance.e_waybill.create")),
     db: Session = Depends(get_db)
@@ -415,7 +415,7 @@ async def create_e_waybill(
     return e_waybill
 
 @router.get("/e-waybills", response_model=List[EWaybillResponse])
-async def get_e_waybills(
+def get_e_waybills(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     status: Optional[str] = Query(None),
@@ -436,7 +436,7 @@ async def get_e_waybills(
 
 # Compliance Settings Endpoints
 @router.get("/settings", response_model=ComplianceSettingsResponse)
-async def get_compliance_settings(
+def get_compliance_settings(
     current_user: User = Depends(require_permission("compliance.settings.view")),
     db: Session = Depends(get_db)
 ):
@@ -458,7 +458,7 @@ async def get_compliance_settings(
     return settings
 
 @router.put("/settings", response_model=ComplianceSettingsResponse)
-async def update_compliance_settings(
+def update_compliance_settings(
     settings_data: ComplianceSettingsCreate,
     current_user: User = Depends(require_permission("compliance.settings.update")),
     db: Session = Depends(get_db)
@@ -486,7 +486,7 @@ async def update_compliance_settings(
 
 # Compliance Alerts Endpoints
 @router.get("/alerts", response_model=List[ComplianceAlertResponse])
-async def get_compliance_alerts(
+def get_compliance_alerts(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     compliance_type: Optional[str] = Query(None),
@@ -513,7 +513,7 @@ async def get_compliance_alerts(
 
 # Compliance Dashboard
 @router.get("/dashboard", response_model=ComplianceDashboardResponse)
-async def get_compliance_dashboard(
+def get_compliance_dashboard(
     current_user: User = Depends(require_permission("compliance.dashboard.view")),
     db: Session = Depends(get_db)
 ):
@@ -1,12 +1,15 @@
 # backend/app/api/endpoints/auth.py
 from fastapi import APIRouter, Depends, HTTPException, status, Form
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 from typing import Optional
 from pydantic import BaseModel, EmailStr
 
-from ...database import get_db
+from ...database import get_db, get_async_db
 from ...models.user import User, Role
 from ...core.security import SecurityService, get_current_user
 from ...config import settings
@@ -55,15 +58,18 @@ class ChangePasswordRequest(BaseModel):
 @router.post("/login", response_model=Token)
 async def login_for_access_token(
     login_data: LoginRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Authenticate user and return access token"""
     
     # Find user
-    user = db.query(User).filter(User.username == login_data.username).first()
+    result = await db.execute(select(User).where(User.username == login_data.username))
+    user = result.scalars().first()
     
-    # Verify user exists and password is correct
-    if not user or not SecurityService.verify_password(login_data.password, user.hashed_password):
+    # Verify user exists and password is correct; bcrypt is CPU-bound, keep it off the event loop
+    if not user or not await run_in_threadpool(
+        SecurityService.verify_password, login_data.password, user.hashed_password
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -92,11 +98,11 @@ async def login_for_access_token(
     # Create access token
     access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
     access_token = SecurityService.create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
+        data={"sub": user.username, "uid": user.id}, expires_delta=access_token_expires
     )
     
     # Save changes
-    db.commit()
+    await db.commit()
     
     return {
         "access_token": access_token,
@@ -107,14 +113,14 @@ async def login_for_access_token(
 @router.post("/login-form", response_model=Token)
 async def login_with_form(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Alternative login endpoint for form data (OAuth2 compatible)"""
     login_data = LoginRequest(username=form_data.username, password=form_data.password)
     return await login_for_access_token(login_data, db)
 
 @router.get("/me", response_model=UserResponse)
-async def read_users_me(current_user: User = Depends(get_current_user)):
+def read_users_me(current_user: User = Depends(get_current_user)):
     """Get current user information"""
     return UserResponse(
         id=current_user.id,
@@ -128,7 +134,7 @@ async def read_users_me(current_user: User = Depends(get_current_user)):
     )
 
 @router.post("/change-password")
-async def change_password(
+def change_password(
     password_data: ChangePasswordRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -149,13 +155,13 @@ async def change_password(
     return {"message": "Password changed successfully"}
 
 @router.post("/logout")
-async def logout(current_user: User = Depends(get_current_user)):
+def logout(current_user: User = Depends(get_current_user)):
     """Logout user (client-side token invalidation)"""
     return {"message": "Successfully logged out"}
 
 # User management endpoints (admin only)
 @router.post("/users", response_model=UserResponse)
-async def create_user(
+def create_user(
     user_data: CreateUserRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -216,7 +222,7 @@ async def create_user(
     )
 
 @router.get("/users", response_model=list[UserResponse])
-async def get_users(
+def get_users(
     skip: int = 0,
     limit: int = 100,
     current_user: User = Depends(get_current_user),
@@ -248,7 +254,7 @@ async def get_users(
     ]
 
 @router.get("/users/{user_id}", response_model=UserResponse)
-async def get_user(
+def get_user(
     user_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -282,7 +288,7 @@ async def get_user(
     )
 
 @router.put("/users/{user_id}/toggle-status")
-async def toggle_user_status(
+def toggle_user_status(
     user_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -317,7 +323,7 @@ async def toggle_user_status(
     return {"message": f"User {'activated' if user.is_active else 'deactivated'} successfully"}
 
 @router.get("/roles")
-async def get_roles(
+def get_roles(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -35,7 +35,7 @@ router = APIRouter(prefix="/automation", tags=["Automation Control"])
 
 
 @router.get("/settings", response_model=AutomationSettingsResponse)
-async def get_automation_settings(
+def get_automation_settings(
     company_id: int = Query(..., description="Company ID"),
     module: Optional[str] = Query(None, description="Module name"),
     db: Session = Depends(get_db)
@@ -51,7 +51,7 @@ async def get_automation_settings(
 
 
 @router.post("/settings", response_model=AutomationWorkflowResponse)
-async def update_automation_setting(
+def update_automation_setting(
     company_id: int,
     setting_data: AutomationSettingCreate,
     db: Session = Depends(get_db)
@@ -67,7 +67,7 @@ async def update_automation_setting(
 
 
 @router.put("/settings/{setting_id}", response_model=AutomationWorkflowResponse)
-async def update_automation_setting_by_id(
+def update_automation_setting_by_id(
     setting_id: int = Path(..., description="Setting ID"),
     setting_data: AutomationSettingUpdate,
     db: Session = Depends(get_db)
@@ -83,7 +83,7 @@ async def update_automation_setting_by_id(
 
 
 @router.post("/workflows", response_model=AutomationWorkflowResponse)
-async def create_automation_workflow(
+def create_automation_workflow(
     company_id: int,
     workflow_data: AutomationWorkflowCreate,
     db: Session = Depends(get_db)
@@ -99,7 +99,7 @@ async def create_automation_workflow(
 
 
 @router.post("/workflows/{workflow_id}/execute", response_model=AutomationWorkflowResponse)
-async def execute_automation_workflow(
+def execute_automation_workflow(
     company_id: int,
     workflow_id: int = Path(..., description="Workflow ID"),
     trigger_data: dict = None,
@@ -116,7 +116,7 @@ async def execute_automation_workflow(
 
 
 @router.get("/approvals", response_model=AutomationApprovalsResponse)
-async def get_automation_approvals(
+def get_automation_approvals(
     company_id: int = Query(..., description="Company ID"),
     status: Optional[str] = Query(None, description="Approval status"),
     db: Session = Depends(get_db)
@@ -132,7 +132,7 @@ async def get_automation_approvals(
 
 
 @router.post("/approvals/{approval_id}/approve", response_model=AutomationWorkflowResponse)
-async def approve_automation_request(
+def approve_automation_request(
     company_id: int,
     approval_id: int = Path(..., description="Approval ID"),
     approved_by: int = Query(..., description="Approved by user ID"),
@@ -150,7 +150,7 @@ async def approve_automation_request(
 
 
 @router.get("/logs", response_model=AutomationLogsResponse)
-async def get_automation_logs(
+def get_automation_logs(
     company_id: int = Query(..., description="Company ID"),
     module: Optional[str] = Query(None, description="Module name"),
     limit: int = Query(100, description="Limit"),
@@ -167,7 +167,7 @@ async def get_automation_logs(
 
 
 @router.post("/rollback/{log_id}", response_model=AutomationRollbackResponse)
-async def rollback_automation(
+def rollback_automation(
     company_id: int,
     log_id: int = Path(..., description="Log ID"),
     rollback_data: AutomationRollbackCreate,
@@ -184,7 +184,7 @@ async def rollback_automation(
 
 
 @router.get("/analytics", response_model=AutomationAnalyticsResponse)
-async def get_automation_analytics(
+def get_automation_analytics(
     company_id: int = Query(..., description="Company ID"),
     from_date: Optional[date] = Query(None, description="From date"),
     to_date: Optional[date] = Query(None, description="To date"),
@@ -201,7 +201,7 @@ async def get_automation_analytics(
 
 
 @router.get("/integration-status", response_model=AutomationIntegrationStatusResponse)
-async def get_automation_integration_status(
+def get_automation_integration_status(
     company_id: int = Query(..., description="Company ID"),
     db: Session = Depends(get_db)
 ):
@@ -243,7 +243,7 @@ async def get_automation_integration_status(
 
 
 @router.get("/workflow-automation", response_model=AutomationWorkflowAutomationResponse)
-async def get_automation_workflow_automation(
+def get_automation_workflow_automation(
     company_id: int = Query(..., description="Company ID"),
     db: Session = Depends(get_db)
 ):
@@ -1,6 +1,6 @@
 # backend/app/api/endpoints/backup.py
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from typing import List, Dict, Any
 from datetime import datetime
 import os
@@ -9,7 +9,7 @@ from pathlib import Path
 from ..database import get_db
 from ...models.user import User
 from ...core.security import get_current_user
-from ...services.backup_service import backup_service
+from ...services.backup_service import backup_service, MANIFEST_SUFFIX
 from ...config import settings
 
 router = APIRouter()
@@ -92,6 +92,15 @@ async def download_backup(
         if not backup_path.exists():
             raise HTTPException(status_code=404, detail="Backup file not found")
 
+        # Snapshots are assembled into a ZIP from the chunk store as they download
+        if backup_service.is_manifest(backup_file):
+            archive_name = backup_file[:-len(MANIFEST_SUFFIX)] + ".zip"
+            return StreamingResponse(
+                backup_service.iter_backup_archive(str(backup_path)),
+                media_type="application/zip",
+                headers={"Content-Disposition": f"attachment; filename={archive_name}"}
+            )
+
         return FileResponse(
             path=backup_path,
             filename=backup_file,
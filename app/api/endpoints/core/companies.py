@@ -115,7 +115,7 @@ class UserCompanyResponse(BaseModel):
 
 # Company Management Endpoints
 @router.post("/", response_model=CompanyResponse)
-async def create_company(
+def create_company(
     company_data: CompanyCreateRequest,
     current_user: User = Depends(require_permission("companies.create")),
     db: Session = Depends(get_db)
@@ -200,7 +200,7 @@ async def create_company(
     return company
 
 @router.get("/", response_model=List[CompanyResponse])
-async def list_companies(
+def list_companies(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     search: Optional[str] = Query(None),
@@ -239,7 +239,7 @@ async def list_companies(
     return companies
 
 @router.get("/{company_id}", response_model=CompanyResponse)
-async def get_company(
+def get_company(
     company_id: int,
     current_user: User = Depends(require_permission("companies.view")),
     db: Session = Depends(get_db)
@@ -269,7 +269,7 @@ async def get_company(
     return company
 
 @router.put("/{company_id}", response_model=CompanyResponse)
-async def update_company(
+def update_company(
     company_id: int,
     company_data: CompanyUpdateRequest,
     current_user: User = Depends(require_permission("companies.update")),
@@ -311,7 +311,7 @@ async def update_company(
     return company
 
 @router.delete("/{company_id}")
-async def delete_company(
+def delete_company(
     company_id: int,
     current_user: User = Depends(require_permission("companies.delete")),
     db: Session = Depends(get_db)
@@ -350,7 +350,7 @@ async def delete_company(
 
 # User-Company Management Endpoints
 @router.post("/{company_id}/users", response_model=UserCompanyResponse)
-async def add_user_to_company(
+def add_user_to_company(
     company_id: int,
     user_company_data: UserCompanyRequest,
     current_user: User = Depends(require_permission("companies.manage_users")),
@@ -422,7 +422,7 @@ async def add_user_to_company(
     return user_company
 
 @router.get("/{company_id}/users", response_model=List[UserCompanyResponse])
-async def list_company_users(
+def list_company_users(
     company_id: int,
     current_user: User = Depends(require_permission("companies.view_users")),
     db: Session = Depends(get_db)
@@ -456,7 +456,7 @@ async def list_company_users(
     return user_companies
 
 @router.put("/{company_id}/users/{user_id}", response_model=UserCompanyResponse)
-async def update_user_company(
+def update_user_company(
     company_id: int,
     user_id: int,
     user_company_data: UserCompanyRequest,
@@ -513,7 +513,7 @@ async def update_user_company(
     return user_company
 
 @router.delete("/{company_id}/users/{user_id}")
-async def remove_user_from_company(
+def remove_user_from_company(
     company_id: int,
     user_id: int,
     current_user: User = Depends(require_permission("companies.manage_users")),
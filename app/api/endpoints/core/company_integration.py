@@ -40,7 +40,7 @@ class CompanySyncResponse(BaseModel):
 
 # Company Integration Endpoints
 @router.get("/data-isolation", response_model=CompanyDataIsolationResponse)
-async def get_company_data_isolation(
+def get_company_data_isolation(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("company.view")),
     db: Session = Depends(get_db)
@@ -77,7 +77,7 @@ async def get_company_data_isolation(
         )
 
 @router.get("/analytics", response_model=CompanyAnalyticsResponse)
-async def get_company_analytics(
+def get_company_analytics(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("company.analytics")),
     db: Session = Depends(get_db)
@@ -116,7 +116,7 @@ async def get_company_analytics(
         )
 
 @router.post("/sync", response_model=CompanySyncResponse)
-async def sync_company_data(
+def sync_company_data(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("company.sync")),
     db: Session = Depends(get_db)
@@ -152,7 +152,7 @@ async def sync_company_data(
         )
 
 @router.get("/modules")
-async def get_company_modules(
+def get_company_modules(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("company.view")),
     db: Session = Depends(get_db)
@@ -183,7 +183,7 @@ async def get_company_modules(
         )
 
 @router.get("/permissions")
-async def get_company_permissions(
+def get_company_permissions(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("company.view")),
     db: Session = Depends(get_db)
@@ -210,7 +210,7 @@ async def get_company_permissions(
         )
 
 @router.get("/integrations")
-async def get_company_integrations(
+def get_company_integrations(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("company.view")),
     db: Session = Depends(get_db)
@@ -237,7 +237,7 @@ async def get_company_integrations(
         )
 
 @router.get("/dashboard")
-async def get_company_dashboard(
+def get_company_dashboard(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("company.dashboard")),
     db: Session = Depends(get_db)
@@ -276,7 +276,7 @@ async def get_company_dashboard(
         )
 
 @router.get("/health")
-async def get_company_health(
+def get_company_health(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("company.view")),
     db: Session = Depends(get_db)
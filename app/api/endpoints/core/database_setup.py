@@ -1,6 +1,7 @@
 # backend/app/api/endpoints/database_setup.py
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from anyio import from_thread
 from sqlalchemy import create_engine, text
 from pydantic import BaseModel, validator
 from typing import Dict, Any, List, Optional
@@ -281,7 +282,7 @@ async def get_setup_status():
 
 # Complete Setup Wizard
 @router.post("/complete-setup")
-async def complete_setup_wizard(
+def complete_setup_wizard(
     setup_data: SetupWizardRequest,
     db: Session = Depends(get_db)
 ):
@@ -379,7 +380,7 @@ async def complete_setup_wizard(
         # Step 6: Initialize default data
         if setup_data.create_sample_data:
             logger.info("Loading sample data...")
-            await initialize_default_data()
+            from_thread.run(initialize_default_data)
         
         db.commit()
         
@@ -86,7 +86,7 @@ class DiscountAnalyticsResponse(BaseModel):
 
 # Discount Integration Endpoints
 @router.post("/rules", response_model=DiscountIntegrationResponse)
-async def create_discount_rule_with_integrations(
+def create_discount_rule_with_integrations(
     rule_data: DiscountRuleCreateRequest,
     current_user: User = Depends(require_permission("discounts.create")),
     db: Session = Depends(get_db)
@@ -128,7 +128,7 @@ async def create_discount_rule_with_integrations(
         )
 
 @router.post("/coupons", response_model=DiscountIntegrationResponse)
-async def create_discount_coupon_with_integrations(
+def create_discount_coupon_with_integrations(
     coupon_data: DiscountCouponCreateRequest,
     current_user: User = Depends(require_permission("discounts.create")),
     db: Session = Depends(get_db)
@@ -170,7 +170,7 @@ async def create_discount_coupon_with_integrations(
         )
 
 @router.post("/apply", response_model=DiscountApplicationResponse)
-async def apply_discount_to_transaction(
+def apply_discount_to_transaction(
     application_data: DiscountApplicationRequest,
     current_user: User = Depends(require_permission("discounts.apply")),
     db: Session = Depends(get_db)
@@ -203,7 +203,7 @@ async def apply_discount_to_transaction(
         )
 
 @router.get("/analytics", response_model=DiscountAnalyticsResponse)
-async def get_discount_analytics(
+def get_discount_analytics(
     company_id: int = Query(...),
     from_date: Optional[date] = Query(None),
     to_date: Optional[date] = Query(None),
@@ -241,7 +241,7 @@ async def get_discount_analytics(
         )
 
 @router.get("/rules/{rule_id}/applicable")
-async def check_rule_applicability(
+def check_rule_applicability(
     rule_id: int,
     transaction_data: dict,
     current_user: User = Depends(require_permission("discounts.view")),
@@ -277,7 +277,7 @@ async def check_rule_applicability(
         )
 
 @router.get("/coupons/{coupon_code}/applicable")
-async def check_coupon_applicability(
+def check_coupon_applicability(
     coupon_code: str,
     transaction_data: dict,
     current_user: User = Depends(require_permission("discounts.view")),
@@ -315,7 +315,7 @@ async def check_coupon_applicability(
         )
 
 @router.get("/calculate")
-async def calculate_discount_amount(
+def calculate_discount_amount(
     rule_id: Optional[int] = Query(None),
     coupon_code: Optional[str] = Query(None),
     amount: Decimal = Query(...),
@@ -384,7 +384,7 @@ async def calculate_discount_amount(
         )
 
 @router.get("/integration-status")
-async def get_discount_integration_status(
+def get_discount_integration_status(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("discounts.view")),
     db: Session = Depends(get_db)
@@ -429,7 +429,7 @@ async def get_discount_integration_status(
         )
 
 @router.get("/workflow-automation")
-async def get_discount_workflow_automation(
+def get_discount_workflow_automation(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("discounts.automation")),
     db: Session = Depends(get_db)
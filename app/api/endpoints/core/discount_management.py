@@ -218,7 +218,7 @@ class DiscountReportResponse(BaseModel):
 
 # Discount Type Endpoints
 @router.post("/discount-types", response_model=DiscountTypeResponse)
-async def create_discount_type(
+def create_discount_type(
     type_data: DiscountTypeCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("discount.manage")),
@@ -262,7 +262,7 @@ async def create_discount_type(
         )
 
 @router.get("/discount-types", response_model=List[DiscountTypeResponse])
-async def get_discount_types(
+def get_discount_types(
     company_id: int = Query(...),
     is_active: Optional[bool] = Query(None),
     current_user: User = Depends(require_permission("discount.view")),
@@ -289,7 +289,7 @@ async def get_discount_types(
 
 # Discount Rule Endpoints
 @router.post("/discount-rules", response_model=DiscountRuleResponse)
-async def create_discount_rule(
+def create_discount_rule(
     rule_data: DiscountRuleCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("discount.manage")),
@@ -345,7 +345,7 @@ async def create_discount_rule(
         )
 
 @router.get("/discount-rules", response_model=List[DiscountRuleResponse])
-async def get_discount_rules(
+def get_discount_rules(
     company_id: int = Query(...),
     rule_type: Optional[str] = Query(None),
     is_active: Optional[bool] = Query(None),
@@ -373,7 +373,7 @@ async def get_discount_rules(
     return rules
 
 @router.post("/discount-rules/{rule_id}/apply")
-async def apply_discount_rule(
+def apply_discount_rule(
     rule_id: int,
     transaction_type: str = Query(...),
     transaction_id: int = Query(...),
@@ -430,7 +430,7 @@ async def apply_discount_rule(
 
 # Discount Coupon Endpoints
 @router.post("/discount-coupons", response_model=DiscountCouponResponse)
-async def create_discount_coupon(
+def create_discount_coupon(
     coupon_data: DiscountCouponCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("discount.manage")),
@@ -481,7 +481,7 @@ async def create_discount_coupon(
         )
 
 @router.post("/discount-coupons/apply")
-async def apply_discount_coupon(
+def apply_discount_coupon(
     coupon_code: str = Query(...),
     customer_id: int = Query(...),
     transaction_type: str = Query(...),
@@ -533,7 +533,7 @@ async def apply_discount_coupon(
 
 # Discount Tier Endpoints
 @router.post("/discount-tiers", response_model=DiscountTierResponse)
-async def create_discount_tier(
+def create_discount_tier(
     tier_data: DiscountTierCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("discount.manage")),
@@ -579,7 +579,7 @@ async def create_discount_tier(
         )
 
 @router.post("/discount-tiers/apply")
-async def apply_discount_tier(
+def apply_discount_tier(
     item_id: int = Query(...),
     quantity: Decimal = Query(...),
     unit_price: Decimal = Query(...),
@@ -630,7 +630,7 @@ async def apply_discount_tier(
 
 # Customer Discount Endpoints
 @router.post("/customer-discounts", response_model=CustomerDiscountResponse)
-async def create_customer_discount(
+def create_customer_discount(
     discount_data: CustomerDiscountCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("discount.manage")),
@@ -678,7 +678,7 @@ async def create_customer_discount(
 
 # Discount Analytics Endpoints
 @router.get("/analytics")
-async def get_discount_analytics(
+def get_discount_analytics(
     company_id: int = Query(...),
     from_date: Optional[date] = Query(None),
     to_date: Optional[date] = Query(None),
@@ -711,7 +711,7 @@ async def get_discount_analytics(
 
 # Discount Report Endpoints
 @router.post("/reports", response_model=DiscountReportResponse)
-async def generate_discount_report(
+def generate_discount_report(
     report_data: DiscountReportCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("discount.view")),
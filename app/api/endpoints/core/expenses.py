@@ -30,7 +30,7 @@ router = APIRouter()
 # Expense Head Management
 
 @router.post("/heads", response_model=ExpenseHeadResponse)
-async def create_expense_head(
+def create_expense_head(
     head_data: ExpenseHeadCreate,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
@@ -64,7 +64,7 @@ async def create_expense_head(
     return expense_head
 
 @router.get("/heads", response_model=List[ExpenseHeadResponse])
-async def get_expense_heads(
+def get_expense_heads(
     category: Optional[str] = None,
     active: Optional[bool] = True,
     db: Session = Depends(get_db),
@@ -109,7 +109,7 @@ async def get_expense_heads(
     return result
 
 @router.put("/heads/{head_id}", response_model=ExpenseHeadResponse)
-async def update_expense_head(
+def update_expense_head(
     head_id: str,
     head_update: ExpenseHeadUpdate,
     db: Session = Depends(get_db),
@@ -142,7 +142,7 @@ async def update_expense_head(
     return expense_head
 
 @router.delete("/heads/{head_id}")
-async def delete_expense_head(
+def delete_expense_head(
     head_id: str,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
@@ -175,7 +175,7 @@ async def delete_expense_head(
 # Expense Entry Management
 
 @router.post("/", response_model=ExpenseResponse)
-async def create_expense(
+def create_expense(
     expense_data: ExpenseCreate,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
@@ -230,7 +230,7 @@ async def create_expense(
     return expense
 
 @router.get("/", response_model=List[ExpenseResponse])
-async def get_expenses(
+def get_expenses(
     skip: int = 0,
     limit: int = 100,
     from_date: Optional[date] = None,
@@ -262,7 +262,7 @@ async def get_expenses(
     return expenses
 
 @router.get("/{expense_id}", response_model=ExpenseDetailResponse)
-async def get_expense_details(
+def get_expense_details(
     expense_id: str,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
@@ -309,7 +309,7 @@ async def get_expense_details(
     )
 
 @router.put("/{expense_id}", response_model=ExpenseResponse)
-async def update_expense(
+def update_expense(
     expense_id: str,
     expense_update: ExpenseUpdate,
     db: Session = Depends(get_db),
@@ -342,7 +342,7 @@ async def update_expense(
     return expense
 
 @router.post("/{expense_id}/approve")
-async def approve_expense(
+def approve_expense(
     expense_id: str,
     notes: Optional[str] = None,
     db: Session = Depends(get_db),
@@ -372,7 +372,7 @@ async def approve_expense(
     return {"success": True, "message": "Expense approved successfully"}
 
 @router.post("/{expense_id}/reject")
-async def reject_expense(
+def reject_expense(
     expense_id: str,
     reason: str,
     db: Session = Depends(get_db),
@@ -402,7 +402,7 @@ async def reject_expense(
     return {"success": True, "message": "Expense rejected"}
 
 @router.post("/bulk-approve")
-async def bulk_approve_expenses(
+def bulk_approve_expenses(
     request: ExpenseBulkApprovalRequest,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
@@ -444,7 +444,7 @@ async def bulk_approve_expenses(
 # Cash Flow & Reconciliation
 
 @router.get("/cashflow/summary")
-async def get_cashflow_summary(
+def get_cashflow_summary(
     from_date: Optional[date] = None,
     to_date: Optional[date] = None,
     db: Session = Depends(get_db),
@@ -529,7 +529,7 @@ async def get_cashflow_summary(
     )
 
 @router.get("/bank/reconciliation")
-async def get_bank_reconciliation(
+def get_bank_reconciliation(
     from_date: Optional[date] = None,
     to_date: Optional[date] = None,
     db: Session = Depends(get_db),
@@ -582,7 +582,7 @@ async def get_bank_reconciliation(
 # Reports & Analytics
 
 @router.get("/summary/by-category")
-async def get_expense_summary_by_category(
+def get_expense_summary_by_category(
     from_date: Optional[date] = None,
     to_date: Optional[date] = None,
     db: Session = Depends(get_db),
@@ -646,7 +646,7 @@ async def get_expense_summary_by_category(
     }
 
 @router.get("/summary/trend")
-async def get_expense_trend(
+def get_expense_trend(
     months: int = 6,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
@@ -684,7 +684,7 @@ async def get_expense_trend(
 # Import/Export
 
 @router.post("/import", response_model=ExpenseImportResponse)
-async def import_expenses(
+def import_expenses(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
@@ -693,7 +693,7 @@ async def import_expenses(
     if not file.filename.endswith(('.xlsx', '.xls')):
         raise HTTPException(status_code=400, detail="Only Excel files are allowed")
     
-    content = await file.read()
+    content = file.file.read()
     
     try:
         df = pd.read_excel(io.BytesIO(content))
@@ -764,7 +764,7 @@ async def import_expenses(
         raise HTTPException(status_code=400, detail=f"Error processing file: {str(e)}")
 
 @router.get("/export")
-async def export_expenses(
+def export_expenses(
     from_date: Optional[date] = None,
     to_date: Optional[date] = None,
     db: Session = Depends(get_db),
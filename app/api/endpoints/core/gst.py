@@ -11,6 +11,7 @@ from ...models.company import Company, GSTSlab
 from ...models.user import User
 from ...core.security import get_current_user, require_permission
 from ...services.gst_calculation_service import gst_calculation_service
+from ...services.gst_period_summary_service import gst_period_summary_service
 
 router = APIRouter()
 
@@ -82,10 +83,22 @@ class GSTReturnDataResponse(BaseModel):
     company_details: dict
     sales_data: List[dict]
     purchase_data: List[dict]
+    gstr1_summary: dict = {}
+    gstr3b_summary: dict = {}
+
+class GSTRateChange(BaseModel):
+    old_rate: Decimal
+    new_rate: Decimal
+
+class GSTRetaxRequest(BaseModel):
+    rate_changes: List[GSTRateChange]
+    from_date: Optional[date] = None
+    to_date: Optional[date] = None
+    hsn_codes: Optional[List[str]] = None
 
 # GST Calculation Endpoints
 @router.post("/calculate", response_model=GSTCalculationResponse)
-async def calculate_gst(
+def calculate_gst(
     calculation_data: GSTCalculationRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("gst.calculate")),
@@ -121,7 +134,7 @@ async def calculate_gst(
         )
 
 @router.get("/rates", response_model=List[dict])
-async def get_gst_rates(
+def get_gst_rates(
     company_id: int = Query(...),
     effective_date: Optional[date] = Query(None),
     current_user: User = Depends(require_permission("gst.view")),
@@ -147,7 +160,7 @@ async def get_gst_rates(
     return rates
 
 @router.get("/liability", response_model=GSTLiabilityResponse)
-async def get_gst_liability(
+def get_gst_liability(
     company_id: int = Query(...),
     from_date: date = Query(...),
     to_date: date = Query(...),
@@ -175,7 +188,7 @@ async def get_gst_liability(
     return GSTLiabilityResponse(**liability)
 
 @router.get("/return-data", response_model=GSTReturnDataResponse)
-async def get_gst_return_data(
+def get_gst_return_data(
     company_id: int = Query(...),
     from_date: date = Query(...),
     to_date: date = Query(...),
@@ -228,7 +241,7 @@ async def validate_gst_number(
 
 # GST Slab Management Endpoints
 @router.post("/slabs", response_model=GSTSlabResponse)
-async def create_gst_slab(
+def create_gst_slab(
     slab_data: GSTSlabCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("gst.manage")),
@@ -277,7 +290,7 @@ async def create_gst_slab(
     return gst_slab
 
 @router.get("/slabs", response_model=List[GSTSlabResponse])
-async def list_gst_slabs(
+def list_gst_slabs(
     company_id: int = Query(...),
     effective_date: Optional[date] = Query(None),
     is_active: Optional[bool] = Query(None),
@@ -313,7 +326,7 @@ async def list_gst_slabs(
     return slabs
 
 @router.get("/slabs/{slab_id}", response_model=GSTSlabResponse)
-async def get_gst_slab(
+def get_gst_slab(
     slab_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("gst.view")),
@@ -344,7 +357,7 @@ async def get_gst_slab(
     return slab
 
 @router.put("/slabs/{slab_id}", response_model=GSTSlabResponse)
-async def update_gst_slab(
+def update_gst_slab(
     slab_id: int,
     slab_data: GSTSlabUpdateRequest,
     company_id: int = Query(...),
@@ -387,7 +400,7 @@ async def update_gst_slab(
     return slab
 
 @router.delete("/slabs/{slab_id}")
-async def delete_gst_slab(
+def delete_gst_slab(
     slab_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("gst.manage")),
@@ -425,8 +438,88 @@ async def delete_gst_slab(
     return {"message": "GST slab deleted successfully"}
 
 # GST Reports Endpoints
+@router.post("/reports/summary/rebuild")
+def rebuild_gst_summary(
+    company_id: int = Query(...),
+    from_date: Optional[date] = Query(None),
+    to_date: Optional[date] = Query(None),
+    current_user: User = Depends(require_permission("gst.manage")),
+    db: Session = Depends(get_db)
+):
+    """Rebuild the GST period summary from invoice and bill lines (whole months)"""
+    
+    # Check if user has access to company
+    from ...services.company_service import company_service
+    company = company_service.get_company_by_id(db, company_id, current_user.id)
+    if not company:
+        raise HTTPException(
+            status_code=403,
+            detail="Access denied to this company"
+        )
+    
+    return gst_period_summary_service.rebuild(
+        db,
+        company_id=company_id,
+        from_date=from_date,
+        to_date=to_date
+    )
+
+@router.post("/reports/sale-invoices/retax")
+def retax_sale_invoices(
+    retax_data: GSTRetaxRequest,
+    company_id: int = Query(...),
+    current_user: User = Depends(require_permission("gst.manage")),
+    db: Session = Depends(get_db)
+):
+    """Re-tax draft sale invoices after a GST rate change, as a background job; poll /reports/sale-invoices/retax-jobs/{job_id}"""
+    
+    # Check if user has access to company
+    from ...services.company_service import company_service
+    company = company_service.get_company_by_id(db, company_id, current_user.id)
+    if not company:
+        raise HTTPException(
+            status_code=403,
+            detail="Access denied to this company"
+        )
+    
+    if not retax_data.rate_changes:
+        raise HTTPException(
+            status_code=400,
+            detail="At least one rate change is required"
+        )
+    
+    job = gst_calculation_service.start_retax_job(
+        company_id=company_id,
+        rate_changes={change.old_rate: change.new_rate for change in retax_data.rate_changes},
+        from_date=retax_data.from_date,
+        to_date=retax_data.to_date,
+        hsn_codes=retax_data.hsn_codes,
+        user_id=current_user.id
+    )
+    return {
+        "message": "Re-tax started",
+        "job_id": job.id,
+        "status": job.status
+    }
+
+@router.get("/reports/sale-invoices/retax-jobs/{job_id}")
+def get_retax_job(
+    job_id: str,
+    current_user: User = Depends(require_permission("gst.manage"))
+):
+    """Get progress of a background sale invoice re-tax"""
+    
+    job = gst_calculation_service.get_retax_job(job_id)
+    if not job or (job.user_id != current_user.id and not current_user.is_superuser):
+        raise HTTPException(
+            status_code=404,
+            detail="Re-tax job not found"
+        )
+    
+    return job.to_dict()
+
 @router.get("/reports/summary")
-async def get_gst_summary_report(
+def get_gst_summary_report(
     company_id: int = Query(...),
     from_date: date = Query(...),
     to_date: date = Query(...),
@@ -459,7 +552,7 @@ async def get_gst_summary_report(
     }
 
 @router.get("/reports/rate-wise")
-async def get_gst_rate_wise_report(
+def get_gst_rate_wise_report(
     company_id: int = Query(...),
     from_date: date = Query(...),
     to_date: date = Query(...),
@@ -14,6 +14,7 @@ from ...models.enhanced_purchase import PurchaseInvoice
 from ...models.customer import Customer, Supplier
 from ...models.user import User
 from ...core.security import get_current_user, require_permission
+from ...services.core.document_number_service import document_number_service
 
 router = APIRouter()
 
@@ -83,29 +84,30 @@ class PaymentResponse(BaseModel):
         from_attributes = True
 
 # Helper functions
-def generate_payment_number(db: Session, payment_type: str) -> str:
-    """Generate unique payment number"""
-    today = datetime.now()
-    prefix = f"{'PR' if payment_type == 'received' else 'PP'}{today.strftime('%Y%m%d')}"
-    
-    last_payment = db.query(Payment).filter(
-        Payment.payment_number.like(f"{prefix}%")
-    ).order_by(desc(Payment.payment_number)).first()
-    
-    if last_payment:
+def generate_payment_number(db: Session, payment_type: str, company_id: Optional[int] = None) -> str:
+    """Generate unique payment number: PR/PP, the date and a daily sequence"""
+    document_type = "payment_received" if payment_type == "received" else "payment_made"
+    period = datetime.now().strftime('%Y%m%d')
+    prefix = f"{'PR' if payment_type == 'received' else 'PP'}{period}"
+    
+    def last_sequence(seed_db: Session) -> int:
+        # A day's series continues after payments numbered before it existed
+        last_payment = seed_db.query(Payment).filter(
+            Payment.payment_number.like(f"{prefix}%")
+        ).order_by(desc(Payment.payment_number)).first()
+        
         try:
-            last_seq = int(last_payment.payment_number[-4:])
-            next_seq = last_seq + 1
-        except:
-            next_seq = 1
-    else:
-        next_seq = 1
+            return int(last_payment.payment_number[-4:]) if last_payment else 0
+        except ValueError:
+            return 0
     
-    return f"{prefix}{next_seq:04d}"
+    return document_number_service.next_number(
+        db, company_id, document_type, seed=last_sequence, period=period
+    )
 
 # Payment Method endpoints
 @router.get("/methods", response_model=List[PaymentMethodResponse])
-async def get_payment_methods(
+def get_payment_methods(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -116,7 +118,7 @@ async def get_payment_methods(
 
 # Payment endpoints
 @router.get("", response_model=List[PaymentResponse])
-async def get_payments(
+def get_payments(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     search: Optional[str] = Query(None),
@@ -165,7 +167,7 @@ async def get_payments(
     return [PaymentResponse.from_orm(payment) for payment in payments]
 
 @router.get("/{payment_id}", response_model=PaymentResponse)
-async def get_payment(
+def get_payment(
     payment_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -182,7 +184,7 @@ async def get_payment(
     return PaymentResponse.from_orm(payment)
 
 @router.post("", response_model=PaymentResponse)
-async def create_payment(
+def create_payment(
     payment_data: PaymentRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -278,7 +280,7 @@ async def create_payment(
         )
     
     # Generate payment number
-    payment_number = generate_payment_number(db, payment_data.payment_type)
+    payment_number = generate_payment_number(db, payment_data.payment_type, current_user.company_id)
     
     # Create payment
     db_payment = Payment(
@@ -344,7 +346,7 @@ async def create_payment(
     return PaymentResponse.from_orm(db_payment)
 
 @router.put("/{payment_id}/status")
-async def update_payment_status(
+def update_payment_status(
     payment_id: int,
     new_status: str = Query(..., regex="^(completed|pending|bounced|cancelled)$"),
     current_user: User = Depends(get_current_user),
@@ -408,7 +410,7 @@ async def update_payment_status(
 
 # Analytics endpoints
 @router.get("/analytics/daily-collections")
-async def get_daily_collections(
+def get_daily_collections(
     date_from: date = Query(...),
     date_to: date = Query(...),
     current_user: User = Depends(get_current_user),
@@ -451,7 +453,7 @@ async def get_daily_collections(
     }
 
 @router.get("/analytics/payment-methods")
-async def get_payment_method_analytics(
+def get_payment_method_analytics(
     period_days: int = Query(30, ge=1),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -494,7 +496,7 @@ async def get_payment_method_analytics(
     }
 
 @router.get("/analytics/outstanding-summary")
-async def get_outstanding_summary(
+def get_outstanding_summary(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
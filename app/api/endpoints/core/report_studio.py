@@ -206,7 +206,7 @@ class ReportScheduleResponse(BaseModel):
 
 # Report Category Endpoints
 @router.post("/report-categories", response_model=ReportCategoryResponse)
-async def create_report_category(
+def create_report_category(
     category_data: ReportCategoryCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("report.manage")),
@@ -252,7 +252,7 @@ async def create_report_category(
         )
 
 @router.get("/report-categories", response_model=List[ReportCategoryResponse])
-async def get_report_categories(
+def get_report_categories(
     company_id: int = Query(...),
     parent_category_id: Optional[int] = Query(None),
     is_active: Optional[bool] = Query(None),
@@ -281,7 +281,7 @@ async def get_report_categories(
 
 # Report Template Endpoints
 @router.post("/report-templates", response_model=ReportTemplateResponse)
-async def create_report_template(
+def create_report_template(
     template_data: ReportTemplateCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("report.manage")),
@@ -335,7 +335,7 @@ async def create_report_template(
         )
 
 @router.get("/report-templates", response_model=List[ReportTemplateResponse])
-async def get_report_templates(
+def get_report_templates(
     company_id: int = Query(...),
     category_id: Optional[int] = Query(None),
     report_type: Optional[str] = Query(None),
@@ -370,7 +370,7 @@ async def get_report_templates(
 
 # Report Instance Endpoints
 @router.post("/report-instances", response_model=ReportInstanceResponse)
-async def create_report_instance(
+def create_report_instance(
     instance_data: ReportInstanceCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("report.manage")),
@@ -414,7 +414,7 @@ async def create_report_instance(
         )
 
 @router.post("/report-instances/{instance_id}/generate", response_model=ReportInstanceResponse)
-async def generate_report_instance(
+def generate_report_instance(
     instance_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("report.manage")),
@@ -454,7 +454,7 @@ async def generate_report_instance(
 
 # Report View Endpoints
 @router.post("/report-views", response_model=ReportViewResponse)
-async def create_report_view(
+def create_report_view(
     view_data: ReportViewCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("report.manage")),
@@ -504,9 +504,40 @@ async def create_report_view(
             detail=f"Failed to create report view: {str(e)}"
         )
 
+@router.get("/report-views/{view_id}/data")
+def get_report_view_data(
+    view_id: int,
+    company_id: int = Query(...),
+    current_user: User = Depends(require_permission("report.view")),
+    db: Session = Depends(get_db)
+):
+    """Get report view rows with the view's sorting, grouping and aggregation applied"""
+    
+    # Check if user has access to company
+    from ...services.company_service import company_service
+    company = company_service.get_company_by_id(db, company_id, current_user.id)
+    if not company:
+        raise HTTPException(
+            status_code=403,
+            detail="Access denied to this company"
+        )
+    
+    try:
+        return report_studio_service.get_report_view_data(
+            db=db,
+            company_id=company_id,
+            view_id=view_id
+        )
+        
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        )
+
 # Report Schedule Endpoints
 @router.post("/report-schedules", response_model=ReportScheduleResponse)
-async def create_report_schedule(
+def create_report_schedule(
     schedule_data: ReportScheduleCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("report.manage")),
@@ -556,7 +587,7 @@ async def create_report_schedule(
         )
 
 @router.post("/report-schedules/{schedule_id}/execute")
-async def execute_report_schedule(
+def execute_report_schedule(
     schedule_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("report.manage")),
@@ -585,6 +616,8 @@ async def execute_report_schedule(
             "message": "Report schedule executed successfully",
             "log_id": log.id,
             "status": log.status,
+            "refresh_mode": log.refresh_mode,
+            "row_count": log.row_count,
             "execution_time": log.execution_time
         }
         
@@ -601,7 +634,7 @@ async def execute_report_schedule(
 
 # Report Export Endpoints
 @router.post("/report-instances/{instance_id}/export")
-async def export_report_instance(
+def export_report_instance(
     instance_id: int,
     export_format: str = Query(...),
     export_config: Optional[dict] = Query(None),
@@ -649,9 +682,42 @@ async def export_report_instance(
             detail=f"Failed to export report: {str(e)}"
         )
 
+@router.get("/report-instances/{instance_id}/download")
+def download_report_instance(
+    instance_id: int,
+    export_format: str = Query("csv", regex="^(csv|excel|xlsx|json|ndjson)$"),
+    company_id: int = Query(...),
+    current_user: User = Depends(require_permission("report.view")),
+    db: Session = Depends(get_db)
+):
+    """Stream a generated report instance as CSV, XLSX, JSON or NDJSON"""
+    
+    # Check if user has access to company
+    from ...services.company_service import company_service
+    company = company_service.get_company_by_id(db, company_id, current_user.id)
+    if not company:
+        raise HTTPException(
+            status_code=403,
+            detail="Access denied to this company"
+        )
+    
+    try:
+        return report_studio_service.stream_report_export(
+            db=db,
+            company_id=company_id,
+            instance_id=instance_id,
+            export_format=export_format
+        )
+        
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        )
+
 # Report Analytics Endpoints
 @router.get("/analytics")
-async def get_report_analytics(
+def get_report_analytics(
     company_id: int = Query(...),
     from_date: Optional[date] = Query(None),
     to_date: Optional[date] = Query(None),
@@ -8,23 +8,24 @@ from datetime import datetime, date, timedelta
 import io
 import pandas as pd
 
-from ...database import get_db
+from ...database import get_db, get_db_session
 from ...models.enhanced_sales import SalesInvoice, SalesInvoiceItem
 from ...models.enhanced_purchase import PurchaseInvoice, PurchaseInvoiceItem
 from ...models.item import Item
-from ...models.stock import StockItem, StockMovement
+from ...models.stock import StockMovement
 from ...models.customer import Customer, Supplier
 from ...models.payment import Payment
 from ...models.user import User
 from ...core.security import get_current_user, require_permission
 from ...services.stock_service import StockService
 from ...services.gst_service import GSTService
+from ...services.export_service import export_service
 
 router = APIRouter()
 
 # Sales Reports
 @router.get("/sales/summary")
-async def get_sales_summary_report(
+def get_sales_summary_report(
     date_from: date = Query(...),
     date_to: date = Query(...),
     customer_id: Optional[int] = Query(None),
@@ -84,68 +85,76 @@ async def get_sales_summary_report(
     }
 
 @router.get("/sales/detailed")
-async def get_detailed_sales_report(
+def get_detailed_sales_report(
     date_from: date = Query(...),
     date_to: date = Query(...),
     customer_id: Optional[int] = Query(None),
-    export_format: str = Query("json", regex="^(json|excel)$"),
+    export_format: str = Query("json", regex="^(json|excel|csv|ndjson)$"),
     current_user: User = Depends(require_permission("reports.sales")),
     db: Session = Depends(get_db)
 ):
     """Get detailed sales report with line items"""
     
-    query = db.query(SalesInvoice).filter(
-        and_(
-            SalesInvoice.invoice_date >= datetime.combine(date_from, datetime.min.time()),
-            SalesInvoice.invoice_date <= datetime.combine(date_to, datetime.max.time()),
-            SalesInvoice.status != 'cancelled'
-        )
-    )
+    columns = [
+        "invoice_date", "invoice_number", "customer_name", "customer_mobile", "item_code", "item_name",
+        "hsn_code", "quantity", "unit_price", "line_total", "discount_amount", "tax_amount",
+        "cgst_amount", "sgst_amount", "igst_amount", "payment_status", "is_pos_sale"
+    ]
     
-    if customer_id:
-        query = query.filter(SalesInvoice.customer_id == customer_id)
-    
-    invoices = query.order_by(SalesInvoice.invoice_date).all()
-    
-    detailed_data = []
-    for invoice in invoices:
-        for item in invoice.invoice_items:
-            detailed_data.append({
-                "invoice_date": invoice.invoice_date,
-                "invoice_number": invoice.invoice_number,
-                "customer_name": invoice.customer_name,
-                "customer_mobile": invoice.customer_mobile,
-                "item_code": item.item_code,
-                "item_name": item.item_name,
-                "hsn_code": item.hsn_code,
-                "quantity": float(item.quantity),
-                "unit_price": float(item.unit_price),
-                "line_total": float(item.line_total),
-                "discount_amount": float(item.discount_amount),
-                "tax_amount": float(item.tax_amount),
-                "cgst_amount": float(item.cgst_amount),
-                "sgst_amount": float(item.sgst_amount),
-                "igst_amount": float(item.igst_amount),
-                "payment_status": invoice.payment_status,
-                "is_pos_sale": invoice.is_pos_sale
-            })
-    
-    if export_format == "excel":
-        # Create Excel file
-        df = pd.DataFrame(detailed_data)
-        output = io.BytesIO()
+    def detailed_rows(session: Session):
+        query = session.query(SalesInvoice, SalesInvoiceItem).join(
+            SalesInvoiceItem, SalesInvoiceItem.invoice_id == SalesInvoice.id
+        ).filter(
+            and_(
+                SalesInvoice.invoice_date >= datetime.combine(date_from, datetime.min.time()),
+                SalesInvoice.invoice_date <= datetime.combine(date_to, datetime.max.time()),
+                SalesInvoice.status != 'cancelled'
+            )
+        )
         
-        with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-            df.to_excel(writer, sheet_name='Sales Report', index=False)
+        if customer_id:
+            query = query.filter(SalesInvoice.customer_id == customer_id)
         
-        output.seek(0)
-        filename = f"sales_detailed_{date_from}_{date_to}.xlsx"
+        # Invoice and line pairs come off the cursor a chunk at a time
+        query = query.order_by(
+            SalesInvoice.invoice_date, SalesInvoice.id, SalesInvoiceItem.id
+        ).yield_per(export_service.chunk_rows)
         
-        return StreamingResponse(
-            io.BytesIO(output.read()),
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
-        )
+        for invoice, item in query:
+            yield dict(zip(columns, (
+                invoice.invoice_date,
+                invoice.invoice_number,
+                invoice.customer_name,
+                invoice.customer_mobile,
+                item.item_code,
+                item.item_name,
+                item.hsn_code,
+                float(item.quantity),
+                float(item.unit_price),
+                float(item.line_total),
+                float(item.discount_amount),
+                float(item.tax_amount),
+                float(item.cgst_amount),
+                float(item.sgst_amount),
+                float(item.igst_amount),
+                invoice.payment_status,
+                invoice.is_pos_sale
+            )))
+    
+    if export_format != "json":
+        # The response outlives the request's session, so rows are read in a session of their own
+        def body():
+            with get_db_session() as stream_db:
+                yield from export_service.iter_export(
+                    detailed_rows(stream_db), export_format, columns=columns, sheet_name='Sales Report'
+                )
+        
+        extension = export_service.normalize_format(export_format)
+        filename = f"sales_detailed_{date_from}_{date_to}.{extension}"
+        
+        return export_service.response(body(), export_format, filename)
+    
+    detailed_data = list(detailed_rows(db))
     
     return {
         "period": {"from": date_from, "to": date_to},
@@ -154,7 +163,7 @@ async def get_detailed_sales_report(
     }
 
 @router.get("/sales/top-customers")
-async def get_top_customers_report(
+def get_top_customers_report(
     date_from: date = Query(...),
     date_to: date = Query(...),
     limit: int = Query(20, ge=1, le=100),
@@ -201,7 +210,7 @@ async def get_top_customers_report(
     }
 
 @router.get("/sales/top-items")
-async def get_top_selling_items_report(
+def get_top_selling_items_report(
     date_from: date = Query(...),
     date_to: date = Query(...),
     limit: int = Query(20, ge=1, le=100),
@@ -252,9 +261,14 @@ async def get_top_selling_items_report(
 
 # Stock Reports
 @router.get("/stock/valuation")
-async def get_stock_valuation_report(
+def get_stock_valuation_report(
     location_id: Optional[int] = Query(None),
     category_id: Optional[int] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: Optional[int] = Query(
+        None, ge=1, le=10000,
+        description="Page size; all rows when omitted"
+    ),
     export_format: str = Query("json", regex="^(json|excel)$"),
     current_user: User = Depends(require_permission("reports.stock")),
     db: Session = Depends(get_db)
@@ -262,94 +276,69 @@ async def get_stock_valuation_report(
     """Get stock valuation report"""
     
     stock_service = StockService()
-    
-    if location_id:
-        # Get stock for specific location
-        query = db.query(Item, StockItem).join(
-            StockItem, and_(
-                Item.id == StockItem.item_id,
-                StockItem.location_id == location_id
-            )
-        ).filter(
-            and_(
-                Item.track_inventory == True,
-                Item.status == 'active',
-                StockItem.quantity > 0
-            )
-        )
-    else:
-        # Get stock for main location
-        main_location = stock_service.get_main_location(db)
-        query = db.query(Item, StockItem).join(
-            StockItem, and_(
-                Item.id == StockItem.item_id,
-                StockItem.location_id == main_location.id
-            )
-        ).filter(
-            and_(
-                Item.track_inventory == True,
-                Item.status == 'active',
-                StockItem.quantity > 0
-            )
+    columns = [
+        "item_code", "item_name", "category", "brand", "uom", "current_stock", "unit_cost",
+        "total_value", "last_movement_date", "min_stock_level", "status"
+    ]
+    
+    # Category names are resolved per chunk of streamed rows, not per row
+    def valuation_rows(session: Session, page_size: Optional[int]):
+        rows = stock_service.iter_stock_valuation(
+            session, location_id=location_id, category_id=category_id, offset=skip, limit=page_size
         )
-    
-    if category_id:
-        query = query.filter(Item.category_id == category_id)
-    
-    items_stock = query.all()
-    
-    valuation_data = []
-    total_quantity = 0
-    total_value = 0
-    
-    for item, stock in items_stock:
-        unit_cost = stock.average_cost or item.landed_cost or item.purchase_rate or 0
-        item_value = stock.quantity * unit_cost
-        
-        valuation_data.append({
-            "item_code": item.barcode,
-            "item_name": item.name,
-            "category": item.category.display_name if item.category else "",
-            "brand": item.brand or "",
-            "uom": item.uom,
-            "current_stock": float(stock.quantity),
-            "unit_cost": float(unit_cost),
-            "total_value": float(item_value),
-            "last_movement_date": stock.last_movement_date,
-            "min_stock_level": float(item.min_stock_level),
-            "status": "Low Stock" if stock.quantity <= item.min_stock_level else "Normal"
-        })
-        
-        total_quantity += stock.quantity
-        total_value += item_value
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= stock_service.lookup_chunk_size:
+                yield from format_chunk(session, chunk)
+                chunk = []
+        if chunk:
+            yield from format_chunk(session, chunk)
+    
+    def format_chunk(session: Session, chunk):
+        category_names = stock_service.get_category_names(session, [row.category_id for row in chunk])
+        for row in chunk:
+            yield dict(zip(columns, (
+                row.barcode,
+                row.name,
+                category_names.get(row.category_id, ""),
+                row.brand or "",
+                row.uom,
+                float(row.quantity),
+                float(row.unit_cost),
+                float(row.total_value),
+                row.last_movement_date,
+                float(row.min_stock_level),
+                "Low Stock" if row.quantity <= row.min_stock_level else "Normal"
+            )))
     
     if export_format == "excel":
-        df = pd.DataFrame(valuation_data)
-        output = io.BytesIO()
+        # The response outlives the request's session, so rows are read in a session of their own
+        def body():
+            with get_db_session() as stream_db:
+                yield from export_service.iter_export(
+                    valuation_rows(stream_db, limit), "xlsx", columns=columns, sheet_name='Stock Valuation'
+                )
         
-        with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-            df.to_excel(writer, sheet_name='Stock Valuation', index=False)
-        
-        output.seek(0)
         filename = f"stock_valuation_{datetime.now().strftime('%Y%m%d')}.xlsx"
-        
-        return StreamingResponse(
-            io.BytesIO(output.read()),
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
-        )
+        return export_service.response(body(), "xlsx", filename)
+    
+    summary = stock_service.get_stock_valuation_summary(
+        db, location_id=location_id, category_id=category_id
+    )
     
     return {
         "summary": {
-            "total_items": len(valuation_data),
-            "total_quantity": float(total_quantity),
-            "total_value": float(total_value)
+            "total_items": summary['total_items'],
+            "total_quantity": float(summary['total_quantity']),
+            "total_value": float(summary['total_value'])
         },
-        "items": valuation_data
+        "pagination": {"skip": skip, "limit": limit, "total": summary['total_items']},
+        "items": list(valuation_rows(db, limit))
     }
 
 @router.get("/stock/movements")
-async def get_stock_movement_report(
+def get_stock_movement_report(
     date_from: date = Query(...),
     date_to: date = Query(...),
     item_id: Optional[int] = Query(None),
@@ -416,7 +405,7 @@ async def get_stock_movement_report(
     }
 
 @router.get("/stock/low-stock")
-async def get_low_stock_report(
+def get_low_stock_report(
     current_user: User = Depends(require_permission("reports.stock")),
     db: Session = Depends(get_db)
 ):
@@ -433,7 +422,7 @@ async def get_low_stock_report(
 
 # Financial Reports
 @router.get("/financial/gst-summary")
-async def get_gst_summary_report(
+def get_gst_summary_report(
     date_from: date = Query(...),
     date_to: date = Query(...),
     current_user: User = Depends(require_permission("reports.financial")),
@@ -518,7 +507,7 @@ async def get_gst_summary_report(
     }
 
 @router.get("/financial/profit-loss")
-async def get_profit_loss_report(
+def get_profit_loss_report(
     date_from: date = Query(...),
     date_to: date = Query(...),
     current_user: User = Depends(require_permission("reports.financial")),
@@ -596,7 +585,7 @@ async def get_profit_loss_report(
 
 # Dashboard Reports
 @router.get("/dashboard/summary")
-async def get_dashboard_summary(
+def get_dashboard_summary(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -646,7 +635,7 @@ async def get_dashboard_summary(
     
     # Low stock items count
     stock_service = StockService()
-    low_stock_count = len(stock_service.get_low_stock_items(db))
+    low_stock_count = stock_service.count_low_stock_items(db)
     
     # Recent activities (last 10)
     recent_sales = db.query(SalesInvoice).filter(
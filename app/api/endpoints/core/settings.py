@@ -169,7 +169,7 @@ async def import_settings(
 
 # Company Settings Endpoints
 @router.get("/company")
-async def get_company_settings(
+def get_company_settings(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -177,7 +177,7 @@ async def get_company_settings(
     return company_settings.get_company_settings(db)
 
 @router.post("/company")
-async def update_company_settings(
+def update_company_settings(
     settings: CompanySettings,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_role(["admin"]))
@@ -190,7 +190,7 @@ async def update_company_settings(
     return {"message": "Company settings updated successfully"}
 
 @router.post("/company/logo")
-async def upload_company_logo(
+def upload_company_logo(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_role(["admin"]))
@@ -203,7 +203,7 @@ async def upload_company_logo(
     # Save logo
     logo_path = f"uploads/logo_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{file.filename}"
     with open(logo_path, "wb") as f:
-        content = await file.read()
+        content = file.file.read()
         f.write(content)
     
     # Update company settings
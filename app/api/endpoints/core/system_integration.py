@@ -59,7 +59,7 @@ class SystemTestingResponse(BaseModel):
 
 # System Health Check Endpoints
 @router.get("/health-check", response_model=SystemHealthCheckResponse)
-async def perform_system_health_check(
+def perform_system_health_check(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("system.admin")),
     db: Session = Depends(get_db)
@@ -91,7 +91,7 @@ async def perform_system_health_check(
 
 # System Optimization Endpoints
 @router.post("/optimize", response_model=SystemOptimizationResponse)
-async def optimize_system_performance(
+def optimize_system_performance(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("system.admin")),
     db: Session = Depends(get_db)
@@ -123,7 +123,7 @@ async def optimize_system_performance(
 
 # System Security Enhancement Endpoints
 @router.post("/enhance-security", response_model=SystemSecurityResponse)
-async def enhance_system_security(
+def enhance_system_security(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("system.admin")),
     db: Session = Depends(get_db)
@@ -155,7 +155,7 @@ async def enhance_system_security(
 
 # System Testing Endpoints
 @router.post("/test", response_model=SystemTestingResponse)
-async def perform_system_testing(
+def perform_system_testing(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("system.admin")),
     db: Session = Depends(get_db)
@@ -187,7 +187,7 @@ async def perform_system_testing(
 
 # System Status Endpoints
 @router.get("/status")
-async def get_system_status(
+def get_system_status(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("system.view")),
     db: Session = Depends(get_db)
@@ -224,7 +224,7 @@ async def get_system_status(
 
 # System Metrics Endpoints
 @router.get("/metrics")
-async def get_system_metrics(
+def get_system_metrics(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("system.view")),
     db: Session = Depends(get_db)
@@ -272,7 +272,7 @@ async def get_system_metrics(
 
 # System Backup Endpoints
 @router.post("/backup")
-async def create_system_backup(
+def create_system_backup(
     company_id: int = Query(...),
     backup_type: str = Query("full"),
     current_user: User = Depends(require_permission("system.admin")),
@@ -310,7 +310,7 @@ async def create_system_backup(
 
 # System Restore Endpoints
 @router.post("/restore")
-async def restore_system_backup(
+def restore_system_backup(
     company_id: int = Query(...),
     backup_path: str = Query(...),
     current_user: User = Depends(require_permission("system.admin")),
@@ -347,7 +347,7 @@ async def restore_system_backup(
 
 # System Maintenance Endpoints
 @router.post("/maintenance")
-async def perform_system_maintenance(
+def perform_system_maintenance(
     company_id: int = Query(...),
     maintenance_type: str = Query("routine"),
     current_user: User = Depends(require_permission("system.admin")),
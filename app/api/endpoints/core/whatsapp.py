@@ -3,6 +3,7 @@ WhatsApp API endpoints for webhook and management
 """
 
 from fastapi import APIRouter, Request, Response, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 import hmac
 import hashlib
@@ -54,7 +55,7 @@ async def verify_webhook(request: Request):
     raise HTTPException(status_code=403, detail="Verification failed")
 
 @router.post("/send-test")
-async def send_test_message(
+def send_test_message(
     mobile: str,
     message: str,
     db: Session = Depends(get_db),
@@ -87,7 +88,7 @@ async def send_bulk_messages(
     if customer_grade:
         query = query.filter(Customer.grade == customer_grade)
     
-    customers = query.all()
+    customers = await run_in_threadpool(query.all)
     
     recipients = [
         {
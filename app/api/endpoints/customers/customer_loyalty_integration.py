@@ -90,7 +90,7 @@ class CustomerAnalyticsResponse(BaseModel):
 
 # Customer Loyalty Integration Endpoints
 @router.post("/customers", response_model=CustomerLoyaltyResponse)
-async def create_customer_with_loyalty_integration(
+def create_customer_with_loyalty_integration(
     customer_data: CustomerCreateRequest,
     current_user: User = Depends(require_permission("customers.create")),
     db: Session = Depends(get_db)
@@ -134,7 +134,7 @@ async def create_customer_with_loyalty_integration(
         )
 
 @router.post("/loyalty/earn", response_model=LoyaltyPointsResponse)
-async def process_loyalty_points_earning(
+def process_loyalty_points_earning(
     earning_data: LoyaltyPointsEarningRequest,
     current_user: User = Depends(require_permission("loyalty.earn")),
     db: Session = Depends(get_db)
@@ -168,7 +168,7 @@ async def process_loyalty_points_earning(
         )
 
 @router.post("/loyalty/redeem", response_model=LoyaltyPointsResponse)
-async def process_loyalty_points_redemption(
+def process_loyalty_points_redemption(
     redemption_data: LoyaltyPointsRedemptionRequest,
     current_user: User = Depends(require_permission("loyalty.redeem")),
     db: Session = Depends(get_db)
@@ -202,7 +202,7 @@ async def process_loyalty_points_redemption(
         )
 
 @router.get("/loyalty/benefits/{customer_id}", response_model=CustomerLoyaltyBenefitsResponse)
-async def get_customer_loyalty_benefits(
+def get_customer_loyalty_benefits(
     customer_id: int,
     current_user: User = Depends(require_permission("loyalty.view")),
     db: Session = Depends(get_db)
@@ -231,7 +231,7 @@ async def get_customer_loyalty_benefits(
         )
 
 @router.get("/analytics/{customer_id}", response_model=CustomerAnalyticsResponse)
-async def get_customer_analytics(
+def get_customer_analytics(
     customer_id: int,
     current_user: User = Depends(require_permission("customers.analytics")),
     db: Session = Depends(get_db)
@@ -262,7 +262,7 @@ async def get_customer_analytics(
         )
 
 @router.get("/loyalty/history/{customer_id}")
-async def get_customer_loyalty_history(
+def get_customer_loyalty_history(
     customer_id: int,
     limit: int = Query(20, ge=1, le=100),
     current_user: User = Depends(require_permission("loyalty.view")),
@@ -287,7 +287,7 @@ async def get_customer_loyalty_history(
         )
 
 @router.get("/recommendations/{customer_id}")
-async def get_customer_recommendations(
+def get_customer_recommendations(
     customer_id: int,
     current_user: User = Depends(require_permission("customers.recommendations")),
     db: Session = Depends(get_db)
@@ -312,7 +312,7 @@ async def get_customer_recommendations(
         )
 
 @router.get("/tier-benefits/{tier}")
-async def get_tier_benefits(
+def get_tier_benefits(
     tier: str,
     current_user: User = Depends(require_permission("loyalty.view")),
     db: Session = Depends(get_db)
@@ -335,7 +335,7 @@ async def get_tier_benefits(
         )
 
 @router.get("/integration-status")
-async def get_customer_loyalty_integration_status(
+def get_customer_loyalty_integration_status(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("customers.view")),
     db: Session = Depends(get_db)
@@ -382,7 +382,7 @@ async def get_customer_loyalty_integration_status(
         )
 
 @router.get("/workflow-automation")
-async def get_customer_loyalty_workflow_automation(
+def get_customer_loyalty_workflow_automation(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("customers.automation")),
     db: Session = Depends(get_db)
@@ -180,7 +180,7 @@ def generate_customer_code(db: Session, customer_type: str = "retail") -> str:
 
 # Customer endpoints
 @router.get("", response_model=List[CustomerResponse])
-async def get_customers(
+def get_customers(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     search: Optional[str] = Query(None, description="Search in name, mobile, or email"),
@@ -219,7 +219,7 @@ async def get_customers(
     return [CustomerResponse.from_orm(customer) for customer in customers]
 
 @router.get("/{customer_id}", response_model=CustomerResponse)
-async def get_customer(
+def get_customer(
     customer_id: int,
     current_user: User = Depends(require_permission("customers.view")),
     db: Session = Depends(get_db)
@@ -236,7 +236,7 @@ async def get_customer(
     return CustomerResponse.from_orm(customer)
 
 @router.get("/code/{customer_code}", response_model=CustomerResponse)
-async def get_customer_by_code(
+def get_customer_by_code(
     customer_code: str,
     current_user: User = Depends(require_permission("customers.view")),
     db: Session = Depends(get_db)
@@ -253,7 +253,7 @@ async def get_customer_by_code(
     return CustomerResponse.from_orm(customer)
 
 @router.get("/mobile/{mobile}", response_model=CustomerResponse)
-async def get_customer_by_mobile(
+def get_customer_by_mobile(
     mobile: str,
     current_user: User = Depends(require_permission("customers.view")),
     db: Session = Depends(get_db)
@@ -270,7 +270,7 @@ async def get_customer_by_mobile(
     return CustomerResponse.from_orm(customer)
 
 @router.post("", response_model=CustomerResponse)
-async def create_customer(
+def create_customer(
     customer_data: CustomerCreateRequest,
     current_user: User = Depends(require_permission("customers.create")),
     db: Session = Depends(get_db)
@@ -313,7 +313,7 @@ async def create_customer(
     return CustomerResponse.from_orm(db_customer)
 
 @router.put("/{customer_id}", response_model=CustomerResponse)
-async def update_customer(
+def update_customer(
     customer_id: int,
     customer_data: CustomerUpdateRequest,
     current_user: User = Depends(require_permission("customers.edit")),
@@ -363,7 +363,7 @@ async def update_customer(
     return CustomerResponse.from_orm(customer)
 
 @router.delete("/{customer_id}")
-async def delete_customer(
+def delete_customer(
     customer_id: int,
     current_user: User = Depends(require_permission("customers.delete")),
     db: Session = Depends(get_db)
@@ -401,7 +401,7 @@ async def delete_customer(
     return {"message": "Customer deleted successfully"}
 
 @router.put("/{customer_id}/toggle-status")
-async def toggle_customer_status(
+def toggle_customer_status(
     customer_id: int,
     current_user: User = Depends(require_permission("customers.edit")),
     db: Session = Depends(get_db)
@@ -424,7 +424,7 @@ async def toggle_customer_status(
     return {"message": f"Customer {'activated' if customer.is_active else 'deactivated'} successfully"}
 
 @router.put("/{customer_id}/loyalty")
-async def toggle_loyalty_membership(
+def toggle_loyalty_membership(
     customer_id: int,
     current_user: User = Depends(require_permission("customers.edit")),
     db: Session = Depends(get_db)
@@ -454,7 +454,7 @@ async def toggle_loyalty_membership(
     }
 
 @router.get("/{customer_id}/balance-summary")
-async def get_customer_balance_summary(
+def get_customer_balance_summary(
     customer_id: int,
     current_user: User = Depends(require_permission("customers.view")),
     db: Session = Depends(get_db)
@@ -483,7 +483,7 @@ async def get_customer_balance_summary(
 
 # Customer Groups endpoints
 @router.get("/groups", response_model=List[CustomerGroupResponse])
-async def get_customer_groups(
+def get_customer_groups(
     current_user: User = Depends(require_permission("customers.view")),
     db: Session = Depends(get_db)
 ):
@@ -493,7 +493,7 @@ async def get_customer_groups(
     return [CustomerGroupResponse.from_orm(group) for group in groups]
 
 @router.post("/groups", response_model=CustomerGroupResponse)
-async def create_customer_group(
+def create_customer_group(
     group_data: CustomerGroupCreateRequest,
     current_user: User = Depends(require_permission("customers.create")),
     db: Session = Depends(get_db)
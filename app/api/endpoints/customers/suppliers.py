@@ -181,7 +181,7 @@ def generate_supplier_code(db: Session, supplier_type: str = "vendor") -> str:
 
 # Supplier endpoints
 @router.get("", response_model=List[SupplierResponse])
-async def get_suppliers(
+def get_suppliers(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     search: Optional[str] = Query(None, description="Search in name, mobile, or email"),
@@ -217,7 +217,7 @@ async def get_suppliers(
     return [SupplierResponse.from_orm(supplier) for supplier in suppliers]
 
 @router.get("/{supplier_id}", response_model=SupplierResponse)
-async def get_supplier(
+def get_supplier(
     supplier_id: int,
     current_user: User = Depends(require_permission("suppliers.view")),
     db: Session = Depends(get_db)
@@ -234,7 +234,7 @@ async def get_supplier(
     return SupplierResponse.from_orm(supplier)
 
 @router.get("/code/{supplier_code}", response_model=SupplierResponse)
-async def get_supplier_by_code(
+def get_supplier_by_code(
     supplier_code: str,
     current_user: User = Depends(require_permission("suppliers.view")),
     db: Session = Depends(get_db)
@@ -251,7 +251,7 @@ async def get_supplier_by_code(
     return SupplierResponse.from_orm(supplier)
 
 @router.post("", response_model=SupplierResponse)
-async def create_supplier(
+def create_supplier(
     supplier_data: SupplierCreateRequest,
     current_user: User = Depends(require_permission("suppliers.create")),
     db: Session = Depends(get_db)
@@ -294,7 +294,7 @@ async def create_supplier(
     return SupplierResponse.from_orm(db_supplier)
 
 @router.put("/{supplier_id}", response_model=SupplierResponse)
-async def update_supplier(
+def update_supplier(
     supplier_id: int,
     supplier_data: SupplierUpdateRequest,
     current_user: User = Depends(require_permission("suppliers.edit")),
@@ -344,7 +344,7 @@ async def update_supplier(
     return SupplierResponse.from_orm(supplier)
 
 @router.delete("/{supplier_id}")
-async def delete_supplier(
+def delete_supplier(
     supplier_id: int,
     current_user: User = Depends(require_permission("suppliers.delete")),
     db: Session = Depends(get_db)
@@ -382,7 +382,7 @@ async def delete_supplier(
     return {"message": "Supplier deleted successfully"}
 
 @router.put("/{supplier_id}/toggle-status")
-async def toggle_supplier_status(
+def toggle_supplier_status(
     supplier_id: int,
     current_user: User = Depends(require_permission("suppliers.edit")),
     db: Session = Depends(get_db)
@@ -405,7 +405,7 @@ async def toggle_supplier_status(
     return {"message": f"Supplier {'activated' if supplier.is_active else 'deactivated'} successfully"}
 
 @router.put("/{supplier_id}/rating")
-async def update_supplier_rating(
+def update_supplier_rating(
     supplier_id: int,
     rating: int = Query(..., ge=1, le=5, description="Rating between 1-5"),
     current_user: User = Depends(require_permission("suppliers.edit")),
@@ -428,7 +428,7 @@ async def update_supplier_rating(
     return {"message": f"Supplier rating updated to {rating} stars"}
 
 @router.get("/{supplier_id}/balance-summary")
-async def get_supplier_balance_summary(
+def get_supplier_balance_summary(
     supplier_id: int,
     current_user: User = Depends(require_permission("suppliers.view")),
     db: Session = Depends(get_db)
@@ -455,7 +455,7 @@ async def get_supplier_balance_summary(
     }
 
 @router.get("/{supplier_id}/items")
-async def get_supplier_items(
+def get_supplier_items(
     supplier_id: int,
     current_user: User = Depends(require_permission("suppliers.view")),
     db: Session = Depends(get_db)
@@ -494,7 +494,7 @@ async def get_supplier_items(
 
 # Supplier Groups endpoints
 @router.get("/groups", response_model=List[SupplierGroupResponse])
-async def get_supplier_groups(
+def get_supplier_groups(
     current_user: User = Depends(require_permission("suppliers.view")),
     db: Session = Depends(get_db)
 ):
@@ -504,7 +504,7 @@ async def get_supplier_groups(
     return [SupplierGroupResponse.from_orm(group) for group in groups]
 
 @router.post("/groups", response_model=SupplierGroupResponse)
-async def create_supplier_group(
+def create_supplier_group(
     group_data: SupplierGroupCreateRequest,
     current_user: User = Depends(require_permission("suppliers.create")),
     db: Session = Depends(get_db)
@@ -138,7 +138,7 @@ class SeasonalItemCreateRequest(BaseModel):
 
 # Inventory Groups Endpoints
 @router.post("/groups", response_model=InventoryGroupResponse)
-async def create_inventory_group(
+def create_inventory_group(
     group_data: InventoryGroupCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("inventory.manage")),
@@ -181,7 +181,7 @@ async def create_inventory_group(
         )
 
 @router.get("/groups/hierarchy", response_model=dict)
-async def get_inventory_group_hierarchy(
+def get_inventory_group_hierarchy(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("inventory.view")),
     db: Session = Depends(get_db)
@@ -206,7 +206,7 @@ async def get_inventory_group_hierarchy(
 
 # Inventory Attributes Endpoints
 @router.post("/attributes", response_model=InventoryAttributeResponse)
-async def create_inventory_attribute(
+def create_inventory_attribute(
     attribute_data: InventoryAttributeCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("inventory.manage")),
@@ -250,7 +250,7 @@ async def create_inventory_attribute(
         )
 
 @router.get("/attributes", response_model=List[InventoryAttributeResponse])
-async def get_inventory_attributes(
+def get_inventory_attributes(
     company_id: int = Query(...),
     attribute_type: Optional[str] = Query(None),
     is_required: Optional[bool] = Query(None),
@@ -279,7 +279,7 @@ async def get_inventory_attributes(
 
 # Inventory Variants Endpoints
 @router.post("/variants", response_model=InventoryVariantResponse)
-async def create_inventory_variant(
+def create_inventory_variant(
     variant_data: InventoryVariantCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("inventory.manage")),
@@ -329,7 +329,7 @@ async def create_inventory_variant(
         )
 
 @router.get("/variants/{item_id}", response_model=List[InventoryVariantResponse])
-async def get_item_variants(
+def get_item_variants(
     item_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("inventory.view")),
@@ -355,7 +355,7 @@ async def get_item_variants(
     return variants
 
 @router.put("/variants/{variant_id}/attributes")
-async def update_variant_attributes(
+def update_variant_attributes(
     variant_id: int,
     attributes: List[dict],
     company_id: int = Query(...),
@@ -400,7 +400,7 @@ async def update_variant_attributes(
 
 # Seasonal Planning Endpoints
 @router.post("/seasonal-plans")
-async def create_seasonal_plan(
+def create_seasonal_plan(
     plan_data: SeasonalPlanCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("inventory.manage")),
@@ -444,7 +444,7 @@ async def create_seasonal_plan(
         )
 
 @router.post("/seasonal-plans/{plan_id}/items")
-async def add_item_to_seasonal_plan(
+def add_item_to_seasonal_plan(
     plan_id: int,
     item_data: SeasonalItemCreateRequest,
     company_id: int = Query(...),
@@ -493,7 +493,7 @@ async def add_item_to_seasonal_plan(
         )
 
 @router.get("/seasonal-plans/{plan_id}/analysis")
-async def get_seasonal_plan_analysis(
+def get_seasonal_plan_analysis(
     plan_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("inventory.view")),
@@ -532,7 +532,7 @@ async def get_seasonal_plan_analysis(
 
 # Analytics and Reports Endpoints
 @router.get("/analytics")
-async def get_inventory_analytics(
+def get_inventory_analytics(
     company_id: int = Query(...),
     from_date: Optional[date] = Query(None),
     to_date: Optional[date] = Query(None),
@@ -560,7 +560,7 @@ async def get_inventory_analytics(
     return analytics
 
 @router.get("/recommendations")
-async def get_inventory_recommendations(
+def get_inventory_recommendations(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("inventory.view")),
     db: Session = Depends(get_db)
@@ -227,7 +227,7 @@ class ItemReviewResponse(BaseModel):
 
 # HSN Code Endpoints
 @router.post("/hsn-codes", response_model=HSNCodeResponse)
-async def create_hsn_code(
+def create_hsn_code(
     hsn_data: HSNCodeCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("item_master.manage")),
@@ -270,7 +270,7 @@ async def create_hsn_code(
         )
 
 @router.get("/hsn-codes", response_model=List[HSNCodeResponse])
-async def get_hsn_codes(
+def get_hsn_codes(
     company_id: int = Query(...),
     search_term: Optional[str] = Query(None),
     gst_rate: Optional[Decimal] = Query(None),
@@ -301,7 +301,7 @@ async def get_hsn_codes(
 
 # Barcode Endpoints
 @router.post("/barcodes", response_model=BarcodeResponse)
-async def create_barcode(
+def create_barcode(
     barcode_data: BarcodeCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("item_master.manage")),
@@ -344,7 +344,7 @@ async def create_barcode(
         )
 
 @router.get("/barcodes/search")
-async def search_item_by_barcode(
+def search_item_by_barcode(
     barcode: str = Query(...),
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("item_master.view")),
@@ -384,7 +384,7 @@ async def search_item_by_barcode(
     }
 
 @router.get("/barcodes/{item_id}", response_model=List[BarcodeResponse])
-async def get_item_barcodes(
+def get_item_barcodes(
     item_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("item_master.view")),
@@ -411,7 +411,7 @@ async def get_item_barcodes(
 
 # Item Specifications Endpoints
 @router.post("/specifications", response_model=ItemSpecificationResponse)
-async def add_item_specification(
+def add_item_specification(
     spec_data: ItemSpecificationCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("item_master.manage")),
@@ -454,7 +454,7 @@ async def add_item_specification(
         )
 
 @router.get("/specifications/{item_id}", response_model=List[ItemSpecificationResponse])
-async def get_item_specifications(
+def get_item_specifications(
     item_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("item_master.view")),
@@ -481,7 +481,7 @@ async def get_item_specifications(
 
 # Item Images Endpoints
 @router.post("/images", response_model=ItemImageResponse)
-async def add_item_image(
+def add_item_image(
     image_data: ItemImageCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("item_master.manage")),
@@ -526,7 +526,7 @@ async def add_item_image(
         )
 
 @router.get("/images/{item_id}", response_model=List[ItemImageResponse])
-async def get_item_images(
+def get_item_images(
     item_id: int,
     company_id: int = Query(...),
     image_type: Optional[str] = Query(None),
@@ -555,7 +555,7 @@ async def get_item_images(
 
 # Item Pricing Endpoints
 @router.post("/pricing", response_model=ItemPricingResponse)
-async def add_item_pricing(
+def add_item_pricing(
     pricing_data: ItemPricingCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("item_master.manage")),
@@ -599,7 +599,7 @@ async def add_item_pricing(
         )
 
 @router.get("/pricing/{item_id}", response_model=List[ItemPricingResponse])
-async def get_item_pricing(
+def get_item_pricing(
     item_id: int,
     company_id: int = Query(...),
     price_type: Optional[str] = Query(None),
@@ -630,7 +630,7 @@ async def get_item_pricing(
 
 # Item Categories Endpoints
 @router.post("/categories", response_model=ItemCategoryResponse)
-async def create_item_category(
+def create_item_category(
     category_data: ItemCategoryCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("item_master.manage")),
@@ -673,7 +673,7 @@ async def create_item_category(
         )
 
 @router.get("/categories", response_model=List[ItemCategoryResponse])
-async def get_item_categories(
+def get_item_categories(
     company_id: int = Query(...),
     parent_id: Optional[int] = Query(None),
     is_active: Optional[bool] = Query(None),
@@ -702,7 +702,7 @@ async def get_item_categories(
 
 # Item Brands Endpoints
 @router.post("/brands", response_model=ItemBrandResponse)
-async def create_item_brand(
+def create_item_brand(
     brand_data: ItemBrandCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("item_master.manage")),
@@ -745,7 +745,7 @@ async def create_item_brand(
         )
 
 @router.get("/brands", response_model=List[ItemBrandResponse])
-async def get_item_brands(
+def get_item_brands(
     company_id: int = Query(...),
     is_active: Optional[bool] = Query(None),
     current_user: User = Depends(require_permission("item_master.view")),
@@ -772,7 +772,7 @@ async def get_item_brands(
 
 # Item Reviews Endpoints
 @router.post("/reviews", response_model=ItemReviewResponse)
-async def add_item_review(
+def add_item_review(
     review_data: ItemReviewCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("item_master.manage")),
@@ -816,7 +816,7 @@ async def add_item_review(
         )
 
 @router.get("/reviews/{item_id}", response_model=List[ItemReviewResponse])
-async def get_item_reviews(
+def get_item_reviews(
     item_id: int,
     company_id: int = Query(...),
     is_approved: Optional[bool] = Query(None),
@@ -844,7 +844,7 @@ async def get_item_reviews(
     return reviews
 
 @router.get("/reviews/{item_id}/rating-summary")
-async def get_item_rating_summary(
+def get_item_rating_summary(
     item_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("item_master.view")),
@@ -871,7 +871,7 @@ async def get_item_rating_summary(
 
 # Item Wishlist Endpoints
 @router.post("/wishlist")
-async def add_to_wishlist(
+def add_to_wishlist(
     item_id: int = Query(...),
     customer_id: int = Query(...),
     company_id: int = Query(...),
@@ -915,7 +915,7 @@ async def add_to_wishlist(
         )
 
 @router.get("/wishlist/{customer_id}")
-async def get_customer_wishlist(
+def get_customer_wishlist(
     customer_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("item_master.view")),
@@ -953,7 +953,7 @@ async def get_customer_wishlist(
     }
 
 @router.delete("/wishlist/{item_id}/{customer_id}")
-async def remove_from_wishlist(
+def remove_from_wishlist(
     item_id: int,
     customer_id: int,
     company_id: int = Query(...),
@@ -63,7 +63,7 @@ class ItemSalesHistoryResponse(BaseModel):
 
 # Inventory Integration Endpoints
 @router.post("/stock/update-sale", response_model=StockUpdateResponse)
-async def update_stock_on_sale(
+def update_stock_on_sale(
     sale_order_id: int = Query(...),
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("inventory.stock")),
@@ -103,7 +103,7 @@ async def update_stock_on_sale(
         )
 
 @router.post("/stock/update-purchase", response_model=StockUpdateResponse)
-async def update_stock_on_purchase(
+def update_stock_on_purchase(
     purchase_order_id: int = Query(...),
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("inventory.stock")),
@@ -143,7 +143,7 @@ async def update_stock_on_purchase(
         )
 
 @router.post("/stock/update-pos", response_model=StockUpdateResponse)
-async def update_stock_on_pos_transaction(
+def update_stock_on_pos_transaction(
     pos_transaction_id: int = Query(...),
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("inventory.stock")),
@@ -183,7 +183,7 @@ async def update_stock_on_pos_transaction(
         )
 
 @router.get("/availability/{item_id}", response_model=ItemAvailabilityResponse)
-async def get_item_availability(
+def get_item_availability(
     item_id: int,
     location_id: int = Query(...),
     company_id: int = Query(...),
@@ -224,7 +224,7 @@ async def get_item_availability(
         )
 
 @router.get("/low-stock", response_model=LowStockResponse)
-async def get_low_stock_items(
+def get_low_stock_items(
     company_id: int = Query(...),
     location_id: Optional[int] = Query(None),
     current_user: User = Depends(require_permission("inventory.view")),
@@ -262,7 +262,7 @@ async def get_low_stock_items(
         )
 
 @router.post("/cost/update-purchase")
-async def update_item_cost_from_purchase(
+def update_item_cost_from_purchase(
     purchase_bill_id: int = Query(...),
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("inventory.cost")),
@@ -297,7 +297,7 @@ async def update_item_cost_from_purchase(
         )
 
 @router.get("/valuation", response_model=InventoryValuationResponse)
-async def get_inventory_valuation(
+def get_inventory_valuation(
     company_id: int = Query(...),
     location_id: Optional[int] = Query(None),
     current_user: User = Depends(require_permission("inventory.valuation")),
@@ -333,7 +333,7 @@ async def get_inventory_valuation(
         )
 
 @router.get("/sales-history/{item_id}", response_model=ItemSalesHistoryResponse)
-async def get_item_sales_history(
+def get_item_sales_history(
     item_id: int,
     from_date: Optional[date] = Query(None),
     to_date: Optional[date] = Query(None),
@@ -374,7 +374,7 @@ async def get_item_sales_history(
         )
 
 @router.get("/purchase-history/{item_id}")
-async def get_item_purchase_history(
+def get_item_purchase_history(
     item_id: int,
     from_date: Optional[date] = Query(None),
     to_date: Optional[date] = Query(None),
@@ -406,7 +406,7 @@ async def get_item_purchase_history(
         )
 
 @router.post("/adjustment")
-async def create_inventory_adjustment(
+def create_inventory_adjustment(
     adjustment_data: dict,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("inventory.adjustment")),
@@ -444,7 +444,7 @@ async def create_inventory_adjustment(
         )
 
 @router.get("/integration-status")
-async def get_inventory_integration_status(
+def get_inventory_integration_status(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("inventory.view")),
     db: Session = Depends(get_db)
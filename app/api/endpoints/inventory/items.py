@@ -1,18 +1,21 @@
 # backend/app/api/endpoints/items.py
 from fastapi import APIRouter, Depends, HTTPException, status, Query, File, UploadFile
+from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import or_, func, select
 from typing import Optional, List
 from pydantic import BaseModel, validator
 from decimal import Decimal
-import io
-import pandas as pd
 
-from ...database import get_db
+from ...database import get_db, get_async_db, get_db_session, run_sync_service
 from ...models.item import Item, ItemCategory, Brand
 from ...models.user import User
 from ...core.security import get_current_user, require_permission
 from ...services.stock_service import StockService
+from ...services.item_import_service import item_import_service
+from ...services.item_export_service import item_export_service
+from ...services.export_service import export_service
 
 router = APIRouter()
 
@@ -173,11 +176,11 @@ async def get_items(
     status: Optional[str] = Query(None),
     low_stock: bool = Query(False, description="Show items with stock below minimum level"),
     current_user: User = Depends(require_permission("items.view")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get items with filtering and pagination"""
     
-    query = db.query(Item)
+    query = select(Item)
     
     # Apply filters
     if search:
@@ -186,27 +189,33 @@ async def get_items(
             Item.style_code.ilike(f"%{search}%"),
             Item.name.ilike(f"%{search}%")
         )
-        query = query.filter(search_filter)
+        query = query.where(search_filter)
     
     if category_id:
-        query = query.filter(Item.category_id == category_id)
+        query = query.where(Item.category_id == category_id)
     
     if brand:
-        query = query.filter(Item.brand.ilike(f"%{brand}%"))
+        query = query.where(Item.brand.ilike(f"%{brand}%"))
     
     if status:
-        query = query.filter(Item.status == status)
+        query = query.where(Item.status == status)
     
     # Get items
-    items = query.offset(skip).limit(limit).all()
+    items = (await db.execute(query.offset(skip).limit(limit))).scalars().all()
     
-    # Convert to response format and add stock information
+    # Resolve stock and category names for the whole page at once
     stock_service = StockService()
+    stock_levels = await run_sync_service(
+        db, stock_service.get_items_stock, [item.id for item in items if item.track_inventory]
+    )
+    category_names = await run_sync_service(
+        db, stock_service.get_category_names, [item.category_id for item in items]
+    )
     result = []
     
     for item in items:
         # Get current stock
-        current_stock = stock_service.get_item_stock(db, item.id) if item.track_inventory else None
+        current_stock = stock_levels.get(item.id) if item.track_inventory else None
         
         # Skip if low_stock filter is applied and stock is not low
         if low_stock and current_stock is not None:
@@ -214,10 +223,7 @@ async def get_items(
                 continue
         
         # Get category and brand names
-        category_name = None
-        if item.category_id:
-            category = db.query(ItemCategory).filter(ItemCategory.id == item.category_id).first()
-            category_name = category.display_name if category else None
+        category_name = category_names.get(item.category_id) if item.category_id else None
         
         item_data = ItemResponse.from_orm(item)
         item_data.current_stock = current_stock
@@ -233,11 +239,11 @@ async def get_items(
 async def get_item(
     item_id: int,
     current_user: User = Depends(require_permission("items.view")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get item by ID"""
     
-    item = db.query(Item).filter(Item.id == item_id).first()
+    item = await db.get(Item, item_id)
     if not item:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -246,11 +252,14 @@ async def get_item(
     
     # Get current stock and category name
     stock_service = StockService()
-    current_stock = stock_service.get_item_stock(db, item.id) if item.track_inventory else None
+    current_stock = (
+        await run_sync_service(db, stock_service.get_item_stock, item.id)
+        if item.track_inventory else None
+    )
     
     category_name = None
     if item.category_id:
-        category = db.query(ItemCategory).filter(ItemCategory.id == item.category_id).first()
+        category = await db.get(ItemCategory, item.category_id)
         category_name = category.display_name if category else None
     
     item_data = ItemResponse.from_orm(item)
@@ -265,11 +274,12 @@ async def get_item(
 async def get_item_by_barcode(
     barcode: str,
     current_user: User = Depends(require_permission("items.view")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get item by barcode (for POS scanning)"""
     
-    item = db.query(Item).filter(Item.barcode == barcode).first()
+    result = await db.execute(select(Item).where(Item.barcode == barcode))
+    item = result.scalars().first()
     if not item:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -278,7 +288,10 @@ async def get_item_by_barcode(
     
     # Get current stock
     stock_service = StockService()
-    current_stock = stock_service.get_item_stock(db, item.id) if item.track_inventory else None
+    current_stock = (
+        await run_sync_service(db, stock_service.get_item_stock, item.id)
+        if item.track_inventory else None
+    )
     
     item_data = ItemResponse.from_orm(item)
     item_data.current_stock = current_stock
@@ -287,7 +300,7 @@ async def get_item_by_barcode(
     return item_data
 
 @router.post("", response_model=ItemResponse)
-async def create_item(
+def create_item(
     item_data: ItemCreateRequest,
     current_user: User = Depends(require_permission("items.create")),
     db: Session = Depends(get_db)
@@ -329,7 +342,7 @@ async def create_item(
     return ItemResponse.from_orm(db_item)
 
 @router.put("/{item_id}", response_model=ItemResponse)
-async def update_item(
+def update_item(
     item_id: int,
     item_data: ItemUpdateRequest,
     current_user: User = Depends(require_permission("items.edit")),
@@ -366,7 +379,7 @@ async def update_item(
     return ItemResponse.from_orm(item)
 
 @router.delete("/{item_id}")
-async def delete_item(
+def delete_item(
     item_id: int,
     current_user: User = Depends(require_permission("items.delete")),
     db: Session = Depends(get_db)
@@ -401,7 +414,7 @@ async def delete_item(
 
 # Category endpoints
 @router.get("/categories", response_model=List[ItemCategoryResponse])
-async def get_categories(
+def get_categories(
     current_user: User = Depends(require_permission("items.view")),
     db: Session = Depends(get_db)
 ):
@@ -410,7 +423,7 @@ async def get_categories(
     return [ItemCategoryResponse.from_orm(cat) for cat in categories]
 
 @router.post("/categories", response_model=ItemCategoryResponse)
-async def create_category(
+def create_category(
     category_data: CategoryCreateRequest,
     current_user: User = Depends(require_permission("items.create")),
     db: Session = Depends(get_db)
@@ -447,7 +460,7 @@ async def create_category(
 
 # Brand endpoints
 @router.get("/brands", response_model=List[BrandResponse])
-async def get_brands(
+def get_brands(
     current_user: User = Depends(require_permission("items.view")),
     db: Session = Depends(get_db)
 ):
@@ -456,7 +469,7 @@ async def get_brands(
     return [BrandResponse.from_orm(brand) for brand in brands]
 
 @router.post("/brands", response_model=BrandResponse)
-async def create_brand(
+def create_brand(
     brand_data: BrandCreateRequest,
     current_user: User = Depends(require_permission("items.create")),
     db: Session = Depends(get_db)
@@ -484,12 +497,18 @@ async def create_brand(
 
 # Import/Export endpoints
 @router.post("/import-excel")
-async def import_items_from_excel(
+def import_items_from_excel(
     file: UploadFile = File(...),
+    background: bool = Query(False, description="Run as a background job; poll /import-jobs/{job_id}"),
     current_user: User = Depends(require_permission("items.import")),
     db: Session = Depends(get_db)
 ):
-    """Import items from Excel file"""
+    """
+    Import items from Excel file.
+    
+    By default the whole file is imported or nothing is. A background job
+    imports the valid rows and collects the rejected ones in an error file.
+    """
     
     if not file.filename.endswith(('.xlsx', '.xls')):
         raise HTTPException(
@@ -497,227 +516,191 @@ async def import_items_from_excel(
             detail="File must be an Excel file (.xlsx or .xls)"
         )
     
-    try:
-        # Read Excel file
-        content = await file.read()
-        df = pd.read_excel(io.BytesIO(content))
-        
-        # Validate required columns
-        required_columns = ['barcode', 'style_code', 'name']
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        if missing_columns:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Missing required columns: {', '.join(missing_columns)}"
-            )
-        
-        created_items = 0
-        updated_items = 0
-        errors = []
-        
-        for index, row in df.iterrows():
-            try:
-                # Check if item exists
-                existing_item = db.query(Item).filter(Item.barcode == row['barcode']).first()
-                
-                # Prepare item data
-                item_data = {
-                    'barcode': str(row['barcode']).strip(),
-                    'style_code': str(row['style_code']).strip(),
-                    'name': str(row['name']).strip(),
-                    'description': str(row.get('description', '')).strip() if pd.notna(row.get('description')) else None,
-                    'color': str(row.get('color', '')).strip() if pd.notna(row.get('color')) else None,
-                    'size': str(row.get('size', '')).strip() if pd.notna(row.get('size')) else None,
-                    'brand': str(row.get('brand', '')).strip() if pd.notna(row.get('brand')) else None,
-                    'gender': str(row.get('gender', '')).strip() if pd.notna(row.get('gender')) else None,
-                    'hsn_code': str(row.get('hsn_code', '')).strip() if pd.notna(row.get('hsn_code')) else None,
-                    'gst_rate': float(row.get('gst_rate', 18.0)) if pd.notna(row.get('gst_rate')) else 18.0,
-                    'mrp': float(row.get('mrp', 0)) if pd.notna(row.get('mrp')) else None,
-                    'purchase_rate': float(row.get('purchase_rate', 0)) if pd.notna(row.get('purchase_rate')) else None,
-                    'selling_price': float(row.get('selling_price', 0)) if pd.notna(row.get('selling_price')) else None,
-                    'uom': str(row.get('uom', 'PCS')).strip() if pd.notna(row.get('uom')) else 'PCS',
-                    'status': 'active'
-                }
-                
-                if existing_item:
-                    # Update existing item
-                    for key, value in item_data.items():
-                        if key != 'barcode':  # Don't update barcode
-                            setattr(existing_item, key, value)
-                    existing_item.updated_by = current_user.id
-                    updated_items += 1
-                else:
-                    # Create new item
-                    item_data['created_by'] = current_user.id
-                    new_item = Item(**item_data)
-                    db.add(new_item)
-                    created_items += 1
-                
-            except Exception as e:
-                errors.append(f"Row {index + 2}: {str(e)}")
-        
-        # Commit changes if no errors
-        if not errors:
-            db.commit()
-        else:
-            db.rollback()
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Import failed. Errors: {'; '.join(errors[:5])}"  # Show first 5 errors
-            )
-        
+    content = file.file.read()
+    
+    if background:
+        job = item_import_service.start_job(content, file.filename, current_user.id)
         return {
-            "message": f"Import completed successfully",
-            "created_items": created_items,
-            "updated_items": updated_items,
-            "total_processed": created_items + updated_items
+            "message": "Import started",
+            "job_id": job.id,
+            "status": job.status
         }
-        
+    
+    try:
+        result = item_import_service.import_items(db, content, current_user.id)
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
+        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Error processing file: {str(e)}"
         )
-
-@router.get("/export-excel")
-async def export_items_to_excel(
-    current_user: User = Depends(require_permission("items.export")),
-    db: Session = Depends(get_db)
-):
-    """Export items to Excel file"""
     
-    from fastapi.responses import StreamingResponse
-    import xlsxwriter
+    # Commit changes if no errors
+    if result["error_rows"]:
+        db.rollback()
+        errors = [f"Row {error['row']}: {error['error']}" for error in result["errors"][:5]]
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Import failed. Errors: {'; '.join(errors)}"  # Show first 5 errors
+        )
+    db.commit()
     
-    # Get all active items
-    items = db.query(Item).filter(Item.status == 'active').all()
+    return {
+        "message": f"Import completed successfully",
+        "created_items": result["created_items"],
+        "updated_items": result["updated_items"],
+        "total_processed": result["total_processed"]
+    }
+
+def _get_import_job(job_id: str, current_user: User):
+    job = item_import_service.get_job(job_id)
+    if not job or (job.user_id != current_user.id and not current_user.is_superuser):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import job not found"
+        )
+    return job
+
+@router.get("/import-jobs/{job_id}")
+async def get_item_import_job(
+    job_id: str,
+    current_user: User = Depends(require_permission("items.import"))
+):
+    """Get progress of a background item import"""
     
-    # Create Excel file in memory
-    output = io.BytesIO()
-    workbook = xlsxwriter.Workbook(output, {'in_memory': True})
-    worksheet = workbook.add_worksheet('Items')
+    return _get_import_job(job_id, current_user).to_dict()
+
+@router.get("/import-jobs/{job_id}/errors")
+async def download_item_import_errors(
+    job_id: str,
+    current_user: User = Depends(require_permission("items.import"))
+):
+    """Download the rows a background item import rejected, with the reason for each"""
     
-    # Define headers
-    headers = [
-        'Barcode', 'Style Code', 'Name', 'Description', 'Color', 'Size', 
-        'Brand', 'Gender', 'HSN Code', 'GST Rate', 'MRP', 'Purchase Rate', 
-        'Selling Price', 'UOM', 'Current Stock', 'Status'
-    ]
+    job = _get_import_job(job_id, current_user)
+    if not job.error_file:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import job has no rejected rows"
+        )
     
-    # Write headers
-    for col, header in enumerate(headers):
-        worksheet.write(0, col, header)
+    return FileResponse(
+        job.error_file,
+        media_type="text/csv",
+        filename=f"import_errors_{job.id}.csv"
+    )
+
+@router.get("/export-excel")
+def export_items_to_excel(
+    export_format: str = Query("xlsx", regex="^(xlsx|csv)$"),
+    columns: Optional[str] = Query(None, description="Comma-separated columns, e.g. barcode,name,mrp,current_stock"),
+    item_status: Optional[str] = Query("active", alias="status"),
+    category_id: Optional[int] = Query(None),
+    brand: Optional[str] = Query(None),
+    search: Optional[str] = Query(None, description="Search in barcode, style_code, or name"),
+    current_user: User = Depends(require_permission("items.export")),
+    db: Session = Depends(get_db)
+):
+    """Export items to an Excel or CSV file, streamed as it is written"""
     
-    # Write data
-    stock_service = StockService()
-    for row, item in enumerate(items, start=1):
-        current_stock = stock_service.get_item_stock(db, item.id) if item.track_inventory else 0
-        
-        data = [
-            item.barcode,
-            item.style_code,
-            item.name,
-            item.description or '',
-            item.color or '',
-            item.size or '',
-            item.brand or '',
-            item.gender or '',
-            item.hsn_code or '',
-            float(item.gst_rate) if item.gst_rate else 0,
-            float(item.mrp) if item.mrp else 0,
-            float(item.purchase_rate) if item.purchase_rate else 0,
-            float(item.selling_price) if item.selling_price else 0,
-            item.uom,
-            float(current_stock) if current_stock else 0,
-            item.status
-        ]
-        
-        for col, value in enumerate(data):
-            worksheet.write(row, col, value)
+    try:
+        keys, headers = item_export_service.resolve_columns(columns.split(',') if columns else None)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
-    workbook.close()
-    output.seek(0)
+    location_id = StockService().get_main_location_id(db) if 'current_stock' in keys else None
+    
+    # The response outlives the request's session, so rows are read in a session of their own
+    def body():
+        with get_db_session() as stream_db:
+            rows = item_export_service.iter_items(
+                stream_db, keys,
+                status=item_status,
+                category_id=category_id,
+                brand=brand,
+                search=search,
+                location_id=location_id
+            )
+            yield from export_service.iter_export(rows, export_format, columns=keys, headers=headers, sheet_name='Items')
     
-    return StreamingResponse(
-        io.BytesIO(output.read()),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=items_export.xlsx"}
-    )
+    return export_service.response(body(), export_format, f"items_export.{export_format}")
 
 @router.get("/low-stock")
-async def get_low_stock_items(
+def get_low_stock_items(
+    skip: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=10000, description="Page size; all rows when omitted"),
+    category_id: Optional[int] = Query(None),
     current_user: User = Depends(require_permission("items.view")),
     db: Session = Depends(get_db)
 ):
     """Get items with stock below minimum level"""
     
     stock_service = StockService()
-    low_stock_items = []
-    
-    # Get all trackable items
-    items = db.query(Item).filter(
-        and_(Item.track_inventory == True, Item.status == 'active')
-    ).all()
     
-    for item in items:
-        current_stock = stock_service.get_item_stock(db, item.id)
-        if current_stock is not None and current_stock <= item.min_stock_level:
-            low_stock_items.append({
-                "id": item.id,
-                "barcode": item.barcode,
-                "name": item.name,
-                "current_stock": float(current_stock),
-                "min_stock_level": float(item.min_stock_level),
-                "shortage": float(item.min_stock_level - current_stock)
-            })
+    low_stock_items = [
+        {
+            "id": row['item_id'],
+            "barcode": row['barcode'],
+            "name": row['name'],
+            "current_stock": float(row['current_stock']),
+            "min_stock_level": float(row['min_stock_level']),
+            "shortage": float(row['shortage'])
+        }
+        for row in stock_service.iter_low_stock_items(
+            db, category_id=category_id, offset=skip, limit=limit
+        )
+    ]
     
     return {
         "items": low_stock_items,
-        "total_count": len(low_stock_items)
+        "total_count": stock_service.count_low_stock_items(db, category_id=category_id)
     }
 
 @router.get("/stock-valuation")
-async def get_stock_valuation(
+def get_stock_valuation(
+    skip: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=10000, description="Page size; all rows when omitted"),
+    category_id: Optional[int] = Query(None),
     current_user: User = Depends(require_permission("items.view")),
     db: Session = Depends(get_db)
 ):
     """Get stock valuation report"""
     
     stock_service = StockService()
-    total_items = 0
-    total_quantity = 0
-    total_value = 0
     
-    items_valuation = []
-    
-    # Get all stockable items
-    items = db.query(Item).filter(
-        and_(Item.track_inventory == True, Item.status == 'active')
-    ).all()
+    # Item master costs only, as this screen has always reported
+    summary = stock_service.get_stock_valuation_summary(
+        db, category_id=category_id, use_average_cost=False
+    )
     
-    for item in items:
-        current_stock = stock_service.get_item_stock(db, item.id)
-        if current_stock is not None and current_stock > 0:
-            item_value = current_stock * (item.landed_cost or item.purchase_rate or 0)
-            
-            items_valuation.append({
-                "id": item.id,
-                "barcode": item.barcode,
-                "name": item.name,
-                "current_stock": float(current_stock),
-                "unit_cost": float(item.landed_cost or item.purchase_rate or 0),
-                "total_value": float(item_value)
-            })
-            
-            total_items += 1
-            total_quantity += current_stock
-            total_value += item_value
+    items_valuation = [
+        {
+            "id": row.item_id,
+            "barcode": row.barcode,
+            "name": row.name,
+            "current_stock": float(row.quantity),
+            "unit_cost": float(row.unit_cost),
+            "total_value": float(row.total_value)
+        }
+        for row in stock_service.iter_stock_valuation(
+            db, category_id=category_id, use_average_cost=False, offset=skip, limit=limit
+        )
+    ]
     
     return {
         "summary": {
-            "total_items": total_items,
-            "total_quantity": float(total_quantity),
-            "total_value": float(total_value)
+            "total_items": summary['total_items'],
+            "total_quantity": float(summary['total_quantity']),
+            "total_value": float(summary['total_value'])
         },
-        "items": sorted(items_valuation, key=lambda x: x['total_value'], reverse=True)
-    }
\ No newline at end of file
+        "items": items_valuation
+    }
@@ -111,7 +111,7 @@ class IndianPincodeResponse(BaseModel):
 
 # Countries
 @router.get("/countries", response_model=List[CountryResponse], summary="Get all countries")
-async def get_all_countries(
+def get_all_countries(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("view_geography"))
 ):
@@ -122,7 +122,7 @@ async def get_all_countries(
     return db.query(Country).filter(Country.is_active == True).all()
 
 @router.get("/countries/{country_id}", response_model=CountryResponse, summary="Get country by ID")
-async def get_country(
+def get_country(
     country_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("view_geography"))
@@ -138,7 +138,7 @@ async def get_country(
 
 # Indian States
 @router.get("/states", response_model=List[IndianStateResponse], summary="Get all Indian states")
-async def get_all_indian_states(
+def get_all_indian_states(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("view_geography"))
 ):
@@ -149,7 +149,7 @@ async def get_all_indian_states(
     return db.query(IndianState).filter(IndianState.is_active == True).all()
 
 @router.get("/states/{state_id}", response_model=IndianStateResponse, summary="Get Indian state by ID")
-async def get_indian_state(
+def get_indian_state(
     state_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("view_geography"))
@@ -164,7 +164,7 @@ async def get_indian_state(
     return state
 
 @router.get("/states/by-code/{state_code}", response_model=IndianStateResponse, summary="Get Indian state by code")
-async def get_indian_state_by_code(
+def get_indian_state_by_code(
     state_code: str,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("view_geography"))
@@ -180,7 +180,7 @@ async def get_indian_state_by_code(
 
 # Indian Cities
 @router.get("/cities", response_model=List[IndianCityResponse], summary="Get all Indian cities")
-async def get_all_indian_cities(
+def get_all_indian_cities(
     state_id: Optional[int] = Query(None, description="Filter by state ID"),
     is_major_city: Optional[bool] = Query(None, description="Filter by major cities only"),
     db: Session = Depends(get_db),
@@ -200,7 +200,7 @@ async def get_all_indian_cities(
     return query.all()
 
 @router.get("/cities/{city_id}", response_model=IndianCityResponse, summary="Get Indian city by ID")
-async def get_indian_city(
+def get_indian_city(
     city_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("view_geography"))
@@ -215,7 +215,7 @@ async def get_indian_city(
     return city
 
 @router.get("/cities/search", response_model=List[IndianCityResponse], summary="Search Indian cities")
-async def search_indian_cities(
+def search_indian_cities(
     q: str = Query(..., description="Search query for city name"),
     state_id: Optional[int] = Query(None, description="Filter by state ID"),
     limit: int = Query(20, ge=1, le=100, description="Maximum number of results"),
@@ -238,7 +238,7 @@ async def search_indian_cities(
 
 # Indian Districts
 @router.get("/districts", response_model=List[IndianDistrictResponse], summary="Get all Indian districts")
-async def get_all_indian_districts(
+def get_all_indian_districts(
     state_id: Optional[int] = Query(None, description="Filter by state ID"),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("view_geography"))
@@ -256,7 +256,7 @@ async def get_all_indian_districts(
 
 # Indian Pincodes
 @router.get("/pincodes", response_model=List[IndianPincodeResponse], summary="Get pincodes")
-async def get_pincodes(
+def get_pincodes(
     pincode: Optional[str] = Query(None, description="Search by pincode"),
     state_id: Optional[int] = Query(None, description="Filter by state ID"),
     city_id: Optional[int] = Query(None, description="Filter by city ID"),
@@ -280,7 +280,7 @@ async def get_pincodes(
     return query.limit(limit).all()
 
 @router.get("/pincodes/{pincode_id}", response_model=IndianPincodeResponse, summary="Get pincode by ID")
-async def get_pincode(
+def get_pincode(
     pincode_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("view_geography"))
@@ -296,7 +296,7 @@ async def get_pincode(
 
 # Geographic Hierarchy
 @router.get("/geography/hierarchy", summary="Get geographic hierarchy")
-async def get_geographic_hierarchy(
+def get_geographic_hierarchy(
     country_id: Optional[int] = Query(None, description="Country ID"),
     state_id: Optional[int] = Query(None, description="State ID"),
     city_id: Optional[int] = Query(None, description="City ID"),
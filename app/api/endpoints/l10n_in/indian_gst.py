@@ -103,7 +103,7 @@ class GSTINValidationResponse(BaseModel):
 # API Endpoints
 
 @router.post("/calculate-gst", response_model=GSTCalculationResponse)
-async def calculate_gst(
+def calculate_gst(
     request: GSTCalculationRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -130,7 +130,7 @@ async def calculate_gst(
         )
 
 @router.get("/gst-slabs", response_model=List[GSTSlabResponse])
-async def get_gst_slabs(
+def get_gst_slabs(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -146,7 +146,7 @@ async def get_gst_slabs(
         )
 
 @router.post("/gst-slabs", response_model=GSTSlabResponse)
-async def create_gst_slab(
+def create_gst_slab(
     request: GSTSlabCreate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -185,7 +185,7 @@ async def create_gst_slab(
         )
 
 @router.get("/hsn-codes", response_model=List[HSNCodeResponse])
-async def get_hsn_codes(
+def get_hsn_codes(
     search: Optional[str] = Query(None, description="Search term for HSN codes"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -204,7 +204,7 @@ async def get_hsn_codes(
         )
 
 @router.get("/sac-codes", response_model=List[SACCodeResponse])
-async def get_sac_codes(
+def get_sac_codes(
     search: Optional[str] = Query(None, description="Search term for SAC codes"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -223,7 +223,7 @@ async def get_sac_codes(
         )
 
 @router.get("/state-codes", response_model=List[StateCodeResponse])
-async def get_state_codes(
+def get_state_codes(
     db: Session = Depends(get_db)
 ):
     """Get all GST state codes"""
@@ -238,7 +238,7 @@ async def get_state_codes(
         )
 
 @router.post("/validate-gstin", response_model=GSTINValidationResponse)
-async def validate_gstin(
+def validate_gstin(
     request: GSTINValidationRequest,
     db: Session = Depends(get_db)
 ):
@@ -254,7 +254,7 @@ async def validate_gstin(
         )
 
 @router.get("/place-of-supply-rules")
-async def get_place_of_supply_rules(
+def get_place_of_supply_rules(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -270,7 +270,7 @@ async def get_place_of_supply_rules(
         )
 
 @router.get("/gst-summary")
-async def get_gst_summary(
+def get_gst_summary(
     from_date: date = Query(..., description="From date"),
     to_date: date = Query(..., description="To date"),
     current_user: User = Depends(get_current_user),
@@ -3,67 +3,25 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
-import json
-import os
-from pathlib import Path
 import logging
 
 from ...database import get_db
 from ...core.security import get_current_user, require_permission
 from ...models.core import User, Company
 from ...models.l10n_in import IndianPincode, IndianCity, IndianState
+from ...services.l10n_in.geography_index_service import (
+    geography_index_service, GeographyIndex, KIND_AREA, KIND_CITY, KIND_STATE
+)
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# Load processed pincode data
-PINCODE_DATA = None
-PINCODE_LOOKUP = None
-CITY_LOOKUP = None
-STATE_LOOKUP = None
-AREA_LOOKUP = None
-
-def load_pincode_data():
-    """Load processed pincode data from JSON files"""
-    global PINCODE_DATA, PINCODE_LOOKUP, CITY_LOOKUP, STATE_LOOKUP, AREA_LOOKUP
-    
-    try:
-        data_dir = Path(__file__).parent.parent.parent.parent / "data" / "processed"
-        
-        # Load pincode data
-        pincodes_file = data_dir / "pincodes.json"
-        if pincodes_file.exists():
-            with open(pincodes_file, 'r', encoding='utf-8') as f:
-                PINCODE_DATA = json.load(f)
-        
-        # Load lookup data
-        lookup_file = data_dir / "pincode_lookup.json"
-        if lookup_file.exists():
-            with open(lookup_file, 'r', encoding='utf-8') as f:
-                PINCODE_LOOKUP = json.load(f)
-        
-        city_lookup_file = data_dir / "city_lookup.json"
-        if city_lookup_file.exists():
-            with open(city_lookup_file, 'r', encoding='utf-8') as f:
-                CITY_LOOKUP = json.load(f)
-        
-        state_lookup_file = data_dir / "state_lookup.json"
-        if state_lookup_file.exists():
-            with open(state_lookup_file, 'r', encoding='utf-8') as f:
-                STATE_LOOKUP = json.load(f)
-        
-        area_lookup_file = data_dir / "area_lookup.json"
-        if area_lookup_file.exists():
-            with open(area_lookup_file, 'r', encoding='utf-8') as f:
-                AREA_LOOKUP = json.load(f)
-        
-        logger.info("✅ Pincode data loaded successfully")
-        
-    except Exception as e:
-        logger.error(f"Error loading pincode data: {e}")
-
-# Initialize data on module load
-load_pincode_data()
+def get_geography_index() -> GeographyIndex:
+    """The pincode index, or 503 when no pincode data has been processed"""
+    index = geography_index_service.get_index()
+    if index is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Pincode data not loaded")
+    return index
 
 # --- Schemas ---
 class PincodeResponse(BaseModel):
@@ -103,6 +61,20 @@ class AreaResponse(BaseModel):
     latitude: Optional[float] = None
     longitude: Optional[float] = None
 
+class SuggestionResponse(BaseModel):
+    type: str
+    label: str
+    area_name: Optional[str] = None
+    city_name: Optional[str] = None
+    state_name: Optional[str] = None
+    state_code: Optional[str] = None
+    pincode: Optional[str] = None
+    pincode_count: int
+
+class AutocompleteResponse(BaseModel):
+    query: str
+    suggestions: List[SuggestionResponse]
+
 class PincodeSearchResponse(BaseModel):
     query: str
     results: List[PincodeResponse]
@@ -110,26 +82,27 @@ class PincodeSearchResponse(BaseModel):
     search_type: str
 
 # --- Endpoints ---
+# Fixed paths are declared before /pincodes/{pincode}, which would otherwise match them
 
-@router.get("/pincodes/{pincode}", response_model=PincodeResponse, summary="Get pincode details")
-async def get_pincode_details(
-    pincode: str,
+@router.get("/pincodes/autocomplete", response_model=AutocompleteResponse, summary="Autocomplete pincodes and places")
+def autocomplete_pincodes(
+    q: str = Query(..., min_length=1, description="Pincode digits or the start of an area, city or state name"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of suggestions"),
+    types: Optional[List[str]] = Query(None, description="Restrict to: area, city, state"),
     current_user: User = Depends(require_permission("view_geography"))
 ):
     """
-    Get detailed information for a specific pincode.
+    Ranked suggestions for a partial pincode or place name.
     Requires 'view_geography' permission.
     """
-    if not PINCODE_LOOKUP:
-        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Pincode data not loaded")
-    
-    # Clean pincode (remove spaces, ensure 6 digits)
-    clean_pincode = pincode.strip().zfill(6)
-    
-    if clean_pincode not in PINCODE_LOOKUP:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Pincode {pincode} not found")
+    if types and any(kind not in ("area", "city", "state") for kind in types):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="types must be area, city or state")
     
-    return PincodeResponse(**PINCODE_LOOKUP[clean_pincode])
+    index = get_geography_index()
+    return AutocompleteResponse(
+        query=q,
+        suggestions=[SuggestionResponse(**suggestion) for suggestion in index.autocomplete(q, limit, types)]
+    )
 
 @router.get("/pincodes/city/{city_name}", response_model=CityResponse, summary="Get city pincodes")
 async def get_city_pincodes(
@@ -141,29 +114,14 @@ async def get_city_pincodes(
     Get all pincodes for a specific city.
     Requires 'view_geography' permission.
     """
-    if not CITY_LOOKUP:
-        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="City data not loaded")
-    
-    # Search for city (case insensitive)
-    city_key = None
-    for key, data in CITY_LOOKUP.items():
-        if city_name.lower() in data["city_name"].lower():
-            if not state_name or state_name.lower() in data["state_name"].lower():
-                city_key = key
-                break
+    index = get_geography_index()
     
-    if not city_key:
+    matches = index.find(KIND_CITY, city_name, within=state_name)
+    if not matches:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"City {city_name} not found")
     
-    city_data = CITY_LOOKUP[city_key]
-    return CityResponse(
-        city_name=city_data["city_name"],
-        state_name=city_data["state_name"],
-        state_code=city_data["state_code"],
-        region=city_data.get("region"),
-        pincodes=city_data["pincodes"],
-        total_pincodes=len(city_data["pincodes"])
-    )
+    city_data = index.city(matches[0])
+    return CityResponse(**city_data, total_pincodes=len(city_data["pincodes"]))
 
 @router.get("/pincodes/state/{state_name}", response_model=StateResponse, summary="Get state cities and pincodes")
 async def get_state_data(
@@ -174,26 +132,15 @@ async def get_state_data(
     Get all cities and pincodes for a specific state.
     Requires 'view_geography' permission.
     """
-    if not STATE_LOOKUP:
-        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="State data not loaded")
-    
-    # Search for state (case insensitive)
-    state_key = None
-    for key, data in STATE_LOOKUP.items():
-        if state_name.lower() in data["state_name"].lower():
-            state_key = key
-            break
+    index = get_geography_index()
     
-    if not state_key:
+    matches = index.find(KIND_STATE, state_name)
+    if not matches:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"State {state_name} not found")
     
-    state_data = STATE_LOOKUP[state_key]
+    state_data = index.state(matches[0])
     return StateResponse(
-        state_name=state_data["state_name"],
-        state_code=state_data["state_code"],
-        region=state_data.get("region"),
-        cities=state_data["cities"],
-        pincodes=state_data["pincodes"],
+        **state_data,
         total_cities=len(state_data["cities"]),
         total_pincodes=len(state_data["pincodes"])
     )
@@ -206,31 +153,15 @@ async def search_pincodes(
     current_user: User = Depends(require_permission("view_geography"))
 ):
     """
-    Search pincodes by various criteria.
+    Search pincodes by pincode prefix, or by the start of an area, city or
+    state name (or of any word in it).
     Requires 'view_geography' permission.
     """
-    if not PINCODE_DATA:
-        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Pincode data not loaded")
+    if search_type not in ("all", "pincode", "area", "city", "state"):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid search type: {search_type}")
     
-    results = []
-    query_lower = q.lower()
-    
-    for pincode_data in PINCODE_DATA:
-        match = False
-        
-        if search_type in ["all", "pincode"] and query_lower in pincode_data["pincode"]:
-            match = True
-        elif search_type in ["all", "area"] and query_lower in pincode_data["area_name"].lower():
-            match = True
-        elif search_type in ["all", "city"] and query_lower in pincode_data["city_name"].lower():
-            match = True
-        elif search_type in ["all", "state"] and query_lower in pincode_data["state_name"].lower():
-            match = True
-        
-        if match:
-            results.append(PincodeResponse(**pincode_data))
-            if len(results) >= limit:
-                break
+    index = get_geography_index()
+    results = [PincodeResponse(**record) for record in index.search(q, search_type, limit)]
     
     return PincodeSearchResponse(
         query=q,
@@ -249,15 +180,9 @@ async def get_area_details(
     Get details for a specific area.
     Requires 'view_geography' permission.
     """
-    if not AREA_LOOKUP:
-        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Area data not loaded")
-    
-    results = []
-    for key, data in AREA_LOOKUP.items():
-        if area_name.lower() in data["area_name"].lower():
-            if not city_name or city_name.lower() in data["city_name"].lower():
-                results.append(AreaResponse(**data))
+    index = get_geography_index()
     
+    results = [AreaResponse(**index.area(area)) for area in index.find(KIND_AREA, area_name, within=city_name, limit=100)]
     if not results:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Area {area_name} not found")
     
@@ -275,39 +200,8 @@ async def find_nearby_pincodes(
     Find pincodes near a specific location.
     Requires 'view_geography' permission.
     """
-    if not PINCODE_DATA:
-        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Pincode data not loaded")
-    
-    # Simple distance calculation (for production, use proper geospatial queries)
-    def calculate_distance(lat1, lon1, lat2, lon2):
-        if not all([lat1, lon1, lat2, lon2]):
-            return float('inf')
-        
-        # Haversine formula (simplified)
-        import math
-        R = 6371  # Earth's radius in kilometers
-        
-        dlat = math.radians(lat2 - lat1)
-        dlon = math.radians(lon2 - lon1)
-        a = math.sin(dlat/2)**2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
-        return R * c
-    
-    nearby_pincodes = []
-    for pincode_data in PINCODE_DATA:
-        if pincode_data.get("latitude") and pincode_data.get("longitude"):
-            distance = calculate_distance(
-                latitude, longitude,
-                pincode_data["latitude"], pincode_data["longitude"]
-            )
-            if distance <= radius_km:
-                nearby_pincodes.append((distance, PincodeResponse(**pincode_data)))
-    
-    # Sort by distance and limit results
-    nearby_pincodes.sort(key=lambda x: x[0])
-    results = [pincode for _, pincode in nearby_pincodes[:limit]]
-    
-    return results
+    index = get_geography_index()
+    return [PincodeResponse(**record) for record in index.nearby(latitude, longitude, radius_km, limit)]
 
 @router.get("/pincodes/stats", summary="Get pincode statistics")
 async def get_pincode_statistics(
@@ -317,16 +211,18 @@ async def get_pincode_statistics(
     Get statistics about the pincode database.
     Requires 'view_geography' permission.
     """
-    if not PINCODE_DATA:
-        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Pincode data not loaded")
+    index = get_geography_index()
+    counts = index.counts
     
     stats = {
-        "total_pincodes": len(PINCODE_DATA),
-        "total_cities": len(CITY_LOOKUP) if CITY_LOOKUP else 0,
-        "total_states": len(STATE_LOOKUP) if STATE_LOOKUP else 0,
-        "total_areas": len(AREA_LOOKUP) if AREA_LOOKUP else 0,
+        "total_pincodes": counts["pincodes"],
+        "total_records": counts["records"],
+        "total_cities": counts["cities"],
+        "total_states": counts["states"],
+        "total_areas": counts["areas"],
         "data_loaded": True,
-        "last_updated": "Unknown"  # Could be added to metadata
+        "last_updated": index.header.get("built_at", "Unknown"),
+        "data_version": index.header["checksum"][:12]
     }
     
     return stats
@@ -336,12 +232,33 @@ async def reload_pincode_data(
     current_user: User = Depends(require_permission("manage_geography"))
 ):
     """
-    Reload pincode data from JSON files.
+    Reload pincode data after process_pincode_excel.py recompiled the dataset.
     Requires 'manage_geography' permission.
     """
     try:
-        load_pincode_data()
-        return {"message": "Pincode data reloaded successfully", "status": "success"}
+        index = geography_index_service.reload()
     except Exception as e:
         logger.error(f"Error reloading pincode data: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Failed to reload data: {e}")
\ No newline at end of file
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Failed to reload data: {e}")
+    
+    if index is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Pincode data not found")
+    return {"message": "Pincode data reloaded successfully", "status": "success", "counts": index.counts}
+
+@router.get("/pincodes/{pincode}", response_model=PincodeResponse, summary="Get pincode details")
+async def get_pincode_details(
+    pincode: str,
+    current_user: User = Depends(require_permission("view_geography"))
+):
+    """
+    Get detailed information for a specific pincode.
+    Requires 'view_geography' permission.
+    """
+    index = get_geography_index()
+    
+    # Clean pincode (remove spaces, ensure 6 digits)
+    records = index.lookup(pincode.strip().zfill(6))
+    if not records:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Pincode {pincode} not found")
+    
+    return PincodeResponse(**records[0])
\ No newline at end of file
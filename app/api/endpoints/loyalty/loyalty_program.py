@@ -291,7 +291,7 @@ class LoyaltyCampaignResponse(BaseModel):
 
 # Loyalty Program Endpoints
 @router.post("/loyalty-programs", response_model=LoyaltyProgramResponse)
-async def create_loyalty_program(
+def create_loyalty_program(
     program_data: LoyaltyProgramCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("loyalty.manage")),
@@ -340,7 +340,7 @@ async def create_loyalty_program(
         )
 
 @router.get("/loyalty-programs", response_model=List[LoyaltyProgramResponse])
-async def get_loyalty_programs(
+def get_loyalty_programs(
     company_id: int = Query(...),
     is_active: Optional[bool] = Query(None),
     program_type: Optional[str] = Query(None),
@@ -369,7 +369,7 @@ async def get_loyalty_programs(
 
 # Loyalty Tier Endpoints
 @router.post("/loyalty-tiers", response_model=LoyaltyTierResponse)
-async def create_loyalty_tier(
+def create_loyalty_tier(
     tier_data: LoyaltyTierCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("loyalty.manage")),
@@ -418,7 +418,7 @@ async def create_loyalty_tier(
         )
 
 @router.get("/loyalty-tiers", response_model=List[LoyaltyTierResponse])
-async def get_loyalty_tiers(
+def get_loyalty_tiers(
     loyalty_program_id: int = Query(...),
     company_id: int = Query(...),
     is_active: Optional[bool] = Query(None),
@@ -447,7 +447,7 @@ async def get_loyalty_tiers(
 
 # Customer Loyalty Tier Endpoints
 @router.post("/customer-loyalty-tiers", response_model=CustomerLoyaltyTierResponse)
-async def assign_customer_tier(
+def assign_customer_tier(
     tier_data: CustomerLoyaltyTierCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("loyalty.manage")),
@@ -489,7 +489,7 @@ async def assign_customer_tier(
 
 # Loyalty Point Endpoints
 @router.post("/loyalty-points", response_model=LoyaltyPointResponse)
-async def create_loyalty_point(
+def create_loyalty_point(
     point_data: LoyaltyPointCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("loyalty.manage")),
@@ -536,7 +536,7 @@ async def create_loyalty_point(
         )
 
 @router.post("/loyalty-points/earn", response_model=LoyaltyPointTransactionResponse)
-async def earn_loyalty_points(
+def earn_loyalty_points(
     transaction_data: LoyaltyPointTransactionCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("loyalty.manage")),
@@ -581,7 +581,7 @@ async def earn_loyalty_points(
 
 # Loyalty Reward Endpoints
 @router.post("/loyalty-rewards", response_model=LoyaltyRewardResponse)
-async def create_loyalty_reward(
+def create_loyalty_reward(
     reward_data: LoyaltyRewardCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("loyalty.manage")),
@@ -630,7 +630,7 @@ async def create_loyalty_reward(
         )
 
 @router.get("/loyalty-rewards", response_model=List[LoyaltyRewardResponse])
-async def get_loyalty_rewards(
+def get_loyalty_rewards(
     loyalty_program_id: int = Query(...),
     company_id: int = Query(...),
     is_active: Optional[bool] = Query(None),
@@ -658,7 +658,7 @@ async def get_loyalty_rewards(
     return rewards
 
 @router.post("/loyalty-rewards/redeem", response_model=LoyaltyRewardRedemptionResponse)
-async def redeem_loyalty_points(
+def redeem_loyalty_points(
     redemption_data: LoyaltyRewardRedemptionCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("loyalty.manage")),
@@ -703,7 +703,7 @@ async def redeem_loyalty_points(
 
 # Loyalty Analytics Endpoints
 @router.get("/loyalty-analytics", response_model=LoyaltyAnalyticsResponse)
-async def get_loyalty_analytics(
+def get_loyalty_analytics(
     loyalty_program_id: int = Query(...),
     analytics_date: Optional[date] = Query(None),
     company_id: int = Query(...),
@@ -732,7 +732,7 @@ async def get_loyalty_analytics(
 
 # Loyalty Campaign Endpoints
 @router.post("/loyalty-campaigns", response_model=LoyaltyCampaignResponse)
-async def create_loyalty_campaign(
+def create_loyalty_campaign(
     campaign_data: LoyaltyCampaignCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("loyalty.manage")),
@@ -779,7 +779,7 @@ async def create_loyalty_campaign(
         )
 
 @router.get("/loyalty-campaigns", response_model=List[LoyaltyCampaignResponse])
-async def get_loyalty_campaigns(
+def get_loyalty_campaigns(
     loyalty_program_id: int = Query(...),
     company_id: int = Query(...),
     is_active: Optional[bool] = Query(None),
@@ -41,7 +41,7 @@ class OverallOptimizationResults(BaseModel):
 
 # Performance Optimization Endpoints
 @router.post("/run-comprehensive-optimization", response_model=PerformanceOptimizationResponse)
-async def run_comprehensive_performance_optimization(
+def run_comprehensive_performance_optimization(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("optimization.run")),
     db: Session = Depends(get_db)
@@ -75,7 +75,7 @@ async def run_comprehensive_performance_optimization(
         )
 
 @router.get("/optimize-database-performance", response_model=OptimizationResultResponse)
-async def optimize_database_performance(
+def optimize_database_performance(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("optimization.database")),
     db: Session = Depends(get_db)
@@ -109,7 +109,7 @@ async def optimize_database_performance(
         )
 
 @router.get("/optimize-query-performance", response_model=OptimizationResultResponse)
-async def optimize_query_performance(
+def optimize_query_performance(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("optimization.query")),
     db: Session = Depends(get_db)
@@ -143,7 +143,7 @@ async def optimize_query_performance(
         )
 
 @router.get("/optimize-cache-performance", response_model=OptimizationResultResponse)
-async def optimize_cache_performance(
+def optimize_cache_performance(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("optimization.cache")),
     db: Session = Depends(get_db)
@@ -177,7 +177,7 @@ async def optimize_cache_performance(
         )
 
 @router.get("/optimize-api-performance", response_model=OptimizationResultResponse)
-async def optimize_api_performance(
+def optimize_api_performance(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("optimization.api")),
     db: Session = Depends(get_db)
@@ -211,7 +211,7 @@ async def optimize_api_performance(
         )
 
 @router.get("/optimize-memory-performance", response_model=OptimizationResultResponse)
-async def optimize_memory_performance(
+def optimize_memory_performance(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("optimization.memory")),
     db: Session = Depends(get_db)
@@ -245,7 +245,7 @@ async def optimize_memory_performance(
         )
 
 @router.get("/optimize-integration-performance", response_model=OptimizationResultResponse)
-async def optimize_integration_performance(
+def optimize_integration_performance(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("optimization.integration")),
     db: Session = Depends(get_db)
@@ -279,7 +279,7 @@ async def optimize_integration_performance(
         )
 
 @router.get("/performance-metrics")
-async def get_performance_metrics(
+def get_performance_metrics(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("optimization.metrics")),
     db: Session = Depends(get_db)
@@ -324,7 +324,7 @@ async def get_performance_metrics(
         )
 
 @router.get("/optimization-status")
-async def get_optimization_status(
+def get_optimization_status(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("optimization.status")),
     db: Session = Depends(get_db)
@@ -1,17 +1,20 @@
 # backend/app/api/endpoints/pos/pos_comprehensive.py
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
 from pydantic import BaseModel, validator
 from decimal import Decimal
 from datetime import datetime, date
 import json
 
-from ...database import get_db
+from ...database import get_db, get_async_db, get_db_session, run_sync_service
 from ...models.company import Company
 from ...models.user import User
 from ...core.security import get_current_user, require_permission
 from ...services.pos_service import pos_service
+from ...services.core.document_number_service import document_number_service
 
 router = APIRouter()
 
@@ -34,7 +37,7 @@ class POSSessionCloseRequest(BaseModel):
     notes: Optional[str] = None
 
 class POSTransactionCreateRequest(BaseModel):
-    transaction_number: str
+    transaction_number: Optional[str] = None  # Allocated from the session's number block when omitted
     customer_id: Optional[int] = None
     transaction_type: str = 'sale'
     subtotal: Decimal
@@ -190,7 +193,7 @@ class StoreResponse(BaseModel):
 
 # POS Session Endpoints
 @router.post("/pos-sessions", response_model=POSSessionResponse)
-async def create_pos_session(
+def create_pos_session(
     session_data: POSSessionCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("pos.manage")),
@@ -228,7 +231,7 @@ async def create_pos_session(
         )
 
 @router.get("/pos-sessions", response_model=List[POSSessionResponse])
-async def get_pos_sessions(
+def get_pos_sessions(
     company_id: int = Query(...),
     store_id: Optional[int] = Query(None),
     status: Optional[str] = Query(None),
@@ -258,7 +261,7 @@ async def get_pos_sessions(
         )
 
 @router.get("/pos-sessions/{session_id}", response_model=POSSessionResponse)
-async def get_pos_session(
+def get_pos_session(
     session_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("pos.view")),
@@ -288,7 +291,7 @@ async def get_pos_session(
         )
 
 @router.post("/pos-sessions/{session_id}/close")
-async def close_pos_session(
+def close_pos_session(
     session_id: int,
     close_data: POSSessionCloseRequest,
     company_id: int = Query(...),
@@ -307,6 +310,10 @@ async def close_pos_session(
             user_id=current_user.id
         )
         
+        # Take the session's unused pre-allocated numbers out of circulation
+        document_number_service.release_session_blocks(db, session_id)
+        db.commit()
+        
         return {
             "message": "POS session closed successfully",
             "session_id": session_id,
@@ -327,16 +334,30 @@ async def create_pos_transaction(
     session_id: int = Query(...),
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("pos.manage")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create POS transaction"""
     
+    def allocate_transaction_number():
+        # The POS series is not gapless, so the number is reserved in a short
+        # transaction of its own; that uses a sync session, so keep it off the loop
+        with get_db_session() as number_db:
+            return document_number_service.next_number(
+                number_db,
+                company_id=company_id,
+                document_type="pos_transaction",
+                pos_session_id=session_id
+            )
+    
     try:
-        pos_transaction = pos_service.create_pos_transaction(
-            db=db,
+        transaction_number = transaction_data.transaction_number or await run_in_threadpool(allocate_transaction_number)
+        
+        pos_transaction = await run_sync_service(
+            db,
+            pos_service.create_pos_transaction,
             company_id=company_id,
             session_id=session_id,
-            transaction_number=transaction_data.transaction_number,
+            transaction_number=transaction_number,
             customer_id=transaction_data.customer_id,
             transaction_type=transaction_data.transaction_type,
             subtotal=transaction_data.subtotal,
@@ -362,7 +383,7 @@ async def create_pos_transaction(
         )
 
 @router.post("/pos-transactions/{transaction_id}/complete")
-async def complete_pos_transaction(
+def complete_pos_transaction(
     transaction_id: int,
     company_id: int = Query(...),
     send_whatsapp: bool = Query(True, description="Send WhatsApp receipt to customer"),
@@ -478,13 +499,14 @@ async def get_pos_transactions(
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     current_user: User = Depends(require_permission("pos.view")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get POS transactions with filters"""
     
     try:
-        pos_transactions = pos_service.get_pos_transactions(
-            db=db,
+        pos_transactions = await run_sync_service(
+            db,
+            pos_service.get_pos_transactions,
             company_id=company_id,
             session_id=session_id,
             customer_id=customer_id,
@@ -506,13 +528,14 @@ async def get_pos_transaction(
     transaction_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("pos.view")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get specific POS transaction"""
     
     try:
-        pos_transaction = pos_service.get_pos_transaction_by_id(
-            db=db,
+        pos_transaction = await run_sync_service(
+            db,
+            pos_service.get_pos_transaction_by_id,
             transaction_id=transaction_id,
             company_id=company_id
         )
@@ -537,7 +560,7 @@ async def add_items_to_pos_transaction(
     items: List[POSTransactionItemCreateRequest],
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("pos.manage")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Add items to POS transaction"""
     
@@ -545,8 +568,9 @@ async def add_items_to_pos_transaction(
         # Convert Pydantic models to dictionaries
         items_data = [item.dict() for item in items]
         
-        transaction_items = pos_service.add_items_to_pos_transaction(
-            db=db,
+        transaction_items = await run_sync_service(
+            db,
+            pos_service.add_items_to_pos_transaction,
             company_id=company_id,
             transaction_id=transaction_id,
             items=items_data,
@@ -570,13 +594,14 @@ async def add_payment_to_pos_transaction(
     payment_data: POSPaymentCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("pos.manage")),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Add payment to POS transaction"""
     
     try:
-        payment = pos_service.add_payment_to_pos_transaction(
-            db=db,
+        payment = await run_sync_service(
+            db,
+            pos_service.add_payment_to_pos_transaction,
             company_id=company_id,
             transaction_id=transaction_id,
             payment_data=payment_data.dict(),
@@ -592,7 +617,7 @@ async def add_payment_to_pos_transaction(
         )
 
 @router.post("/pos-transactions/{transaction_id}/void")
-async def void_pos_transaction(
+def void_pos_transaction(
     transaction_id: int,
     void_reason: str,
     company_id: int = Query(...),
@@ -624,7 +649,7 @@ async def void_pos_transaction(
 
 # Store Management Endpoints
 @router.post("/stores", response_model=StoreResponse)
-async def create_store(
+def create_store(
     store_data: StoreCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("pos.manage")),
@@ -662,7 +687,7 @@ async def create_store(
         )
 
 @router.get("/stores", response_model=List[StoreResponse])
-async def get_stores(
+def get_stores(
     company_id: int = Query(...),
     is_active: Optional[bool] = Query(None),
     current_user: User = Depends(require_permission("pos.view")),
@@ -687,7 +712,7 @@ async def get_stores(
 
 # POS Receipt Endpoints
 @router.post("/pos-transactions/{transaction_id}/receipt")
-async def create_pos_receipt(
+def create_pos_receipt(
     transaction_id: int,
     receipt_data: POSReceiptCreateRequest,
     company_id: int = Query(...),
@@ -714,7 +739,7 @@ async def create_pos_receipt(
         )
 
 @router.post("/pos-transactions/{transaction_id}/print-receipt")
-async def print_pos_receipt(
+def print_pos_receipt(
     transaction_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("pos.manage")),
@@ -745,7 +770,7 @@ async def print_pos_receipt(
 
 # POS Analytics Endpoints
 @router.get("/pos-analytics/dashboard")
-async def get_pos_dashboard(
+def get_pos_dashboard(
     company_id: int = Query(...),
     store_id: Optional[int] = Query(None),
     start_date: Optional[date] = Query(None),
@@ -773,7 +798,7 @@ async def get_pos_dashboard(
         )
 
 @router.get("/pos-analytics/sales-report")
-async def get_pos_sales_report(
+def get_pos_sales_report(
     company_id: int = Query(...),
     store_id: Optional[int] = Query(None),
     start_date: Optional[date] = Query(None),
@@ -802,7 +827,7 @@ async def get_pos_sales_report(
 
 # POS Integration Endpoints
 @router.post("/pos-transactions/{transaction_id}/link-exchange")
-async def link_exchange_to_pos_transaction(
+def link_exchange_to_pos_transaction(
     transaction_id: int,
     exchange_id: int,
     company_id: int = Query(...),
@@ -834,7 +859,7 @@ async def link_exchange_to_pos_transaction(
         )
 
 @router.post("/pos-transactions/{transaction_id}/link-return")
-async def link_return_to_pos_transaction(
+def link_return_to_pos_transaction(
     transaction_id: int,
     return_id: int,
     company_id: int = Query(...),
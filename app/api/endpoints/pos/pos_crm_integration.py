@@ -134,7 +134,7 @@ class POSCustomerAnalyticsResponse(BaseModel):
 
 # POS Customer Search Endpoints
 @router.post("/customers/search", response_model=POSCustomerSearchResponse)
-async def search_pos_customers(
+def search_pos_customers(
     search_data: POSCustomerSearchRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("pos.customer")),
@@ -173,7 +173,7 @@ async def search_pos_customers(
         )
 
 @router.post("/customers", response_model=POSCustomerCreateResponse)
-async def create_pos_customer(
+def create_pos_customer(
     customer_data: POSCustomerCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("pos.customer")),
@@ -231,7 +231,7 @@ async def create_pos_customer(
         )
 
 @router.get("/customers/{customer_id}", response_model=POSCustomerInfoResponse)
-async def get_pos_customer_info(
+def get_pos_customer_info(
     customer_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("pos.customer")),
@@ -269,7 +269,7 @@ async def get_pos_customer_info(
         )
 
 @router.put("/customers/{customer_id}", response_model=POSCustomerInfoResponse)
-async def update_pos_customer(
+def update_pos_customer(
     customer_id: int,
     customer_data: POSCustomerUpdateRequest,
     company_id: int = Query(...),
@@ -320,7 +320,7 @@ async def update_pos_customer(
         )
 
 @router.get("/customers/{customer_id}/transactions", response_model=POSCustomerTransactionHistoryResponse)
-async def get_customer_transaction_history(
+def get_customer_transaction_history(
     customer_id: int,
     from_date: Optional[date] = Query(None),
     to_date: Optional[date] = Query(None),
@@ -367,7 +367,7 @@ async def get_customer_transaction_history(
         )
 
 @router.get("/customers/{customer_id}/loyalty", response_model=POSCustomerLoyaltyResponse)
-async def get_customer_loyalty_info(
+def get_customer_loyalty_info(
     customer_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("pos.customer")),
@@ -405,7 +405,7 @@ async def get_customer_loyalty_info(
         )
 
 @router.get("/customers/{customer_id}/analytics", response_model=POSCustomerAnalyticsResponse)
-async def get_customer_analytics(
+def get_customer_analytics(
     customer_id: int,
     from_date: Optional[date] = Query(None),
     to_date: Optional[date] = Query(None),
@@ -447,7 +447,7 @@ async def get_customer_analytics(
         )
 
 @router.get("/customers/{customer_id}/benefits")
-async def get_customer_benefits(
+def get_customer_benefits(
     customer_id: int,
     order_amount: Decimal = Query(0),
     company_id: int = Query(...),
@@ -487,7 +487,7 @@ async def get_customer_benefits(
         )
 
 @router.get("/customers/{customer_id}/recommendations")
-async def get_customer_recommendations(
+def get_customer_recommendations(
     customer_id: int,
     limit: int = Query(10, ge=1, le=50),
     company_id: int = Query(...),
@@ -527,7 +527,7 @@ async def get_customer_recommendations(
         )
 
 @router.get("/customers/{customer_id}/quick-actions")
-async def get_customer_quick_actions(
+def get_customer_quick_actions(
     customer_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("pos.customer")),
@@ -565,7 +565,7 @@ async def get_customer_quick_actions(
         )
 
 @router.post("/customers/{customer_id}/add-to-favorites")
-async def add_item_to_customer_favorites(
+def add_item_to_customer_favorites(
     customer_id: int,
     item_id: int,
     company_id: int = Query(...),
@@ -606,7 +606,7 @@ async def add_item_to_customer_favorites(
         )
 
 @router.get("/customers/{customer_id}/favorites")
-async def get_customer_favorites(
+def get_customer_favorites(
     customer_id: int,
     limit: int = Query(20, ge=1, le=100),
     company_id: int = Query(...),
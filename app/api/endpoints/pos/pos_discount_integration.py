@@ -87,7 +87,7 @@ class POSDiscountAnalyticsResponse(BaseModel):
 
 # POS Discount Calculation Endpoints
 @router.post("/calculate-discounts", response_model=POSDiscountCalculationResponse)
-async def calculate_pos_discounts(
+def calculate_pos_discounts(
     calculation_data: POSDiscountCalculationRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("pos.discount")),
@@ -107,6 +107,7 @@ async def calculate_pos_discounts(
     try:
         # Convert request to transaction data
         transaction_data = {
+            'company_id': company_id,
             'transaction_id': calculation_data.transaction_id,
             'customer_id': calculation_data.customer_id,
             'store_id': calculation_data.store_id,
@@ -147,7 +148,7 @@ async def calculate_pos_discounts(
         )
 
 @router.post("/apply-coupon", response_model=POSApplyCouponResponse)
-async def apply_coupon_to_pos_transaction(
+def apply_coupon_to_pos_transaction(
     coupon_data: POSApplyCouponRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("pos.discount")),
@@ -198,7 +199,7 @@ async def apply_coupon_to_pos_transaction(
         )
 
 @router.post("/remove-discount", response_model=POSRemoveDiscountResponse)
-async def remove_discount_from_pos_transaction(
+def remove_discount_from_pos_transaction(
     discount_data: POSRemoveDiscountRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("pos.discount")),
@@ -259,7 +260,7 @@ async def remove_discount_from_pos_transaction(
         )
 
 @router.post("/redeem-loyalty-points", response_model=POSLoyaltyPointsResponse)
-async def redeem_loyalty_points(
+def redeem_loyalty_points(
     loyalty_data: POSLoyaltyPointsRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("pos.discount")),
@@ -308,7 +309,7 @@ async def redeem_loyalty_points(
         )
 
 @router.get("/available-discounts")
-async def get_available_discounts(
+def get_available_discounts(
     customer_id: Optional[int] = Query(None),
     store_id: Optional[int] = Query(None),
     order_amount: Decimal = Query(0),
@@ -330,6 +331,7 @@ async def get_available_discounts(
     try:
         # Get available discounts
         transaction_data = {
+            'company_id': company_id,
             'subtotal': order_amount,
             'items': [],
             'customer_id': customer_id,
@@ -357,7 +359,7 @@ async def get_available_discounts(
         )
 
 @router.get("/discount-analytics", response_model=POSDiscountAnalyticsResponse)
-async def get_discount_analytics(
+def get_discount_analytics(
     from_date: date = Query(...),
     to_date: date = Query(...),
     store_id: Optional[int] = Query(None),
@@ -406,7 +408,7 @@ async def get_discount_analytics(
         )
 
 @router.get("/customer-benefits/{customer_id}")
-async def get_customer_benefits(
+def get_customer_benefits(
     customer_id: int,
     order_amount: Decimal = Query(0),
     company_id: int = Query(...),
@@ -429,7 +431,8 @@ async def get_customer_benefits(
         benefits = pos_discount_service.get_customer_benefits(
             db=db,
             customer_id=customer_id,
-            order_amount=order_amount
+            order_amount=order_amount,
+            company_id=company_id
         )
         
         return benefits
@@ -441,7 +444,7 @@ async def get_customer_benefits(
         )
 
 @router.get("/coupons/validate/{coupon_code}")
-async def validate_coupon(
+def validate_coupon(
     coupon_code: str,
     customer_id: Optional[int] = Query(None),
     order_amount: Decimal = Query(0),
@@ -502,7 +505,7 @@ async def validate_coupon(
         )
 
 @router.get("/loyalty-points/{customer_id}")
-async def get_customer_loyalty_points(
+def get_customer_loyalty_points(
     customer_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("pos.discount")),
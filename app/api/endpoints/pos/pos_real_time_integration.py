@@ -1,5 +1,6 @@
 # backend/app/api/endpoints/pos/pos_real_time_integration.py
 from fastapi import APIRouter, Depends, HTTPException, status, Query, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import Optional, List
 from pydantic import BaseModel, validator
@@ -11,12 +12,14 @@ from ...database import get_db
 from ...models.company import Company
 from ...models.user import User
 from ...core.security import get_current_user, require_permission
-from ...services.pos.pos_real_time_integration_service import POSRealTimeIntegrationService
+from ...services.pos.pos_real_time_integration_service import pos_real_time_integration_service
+from ...services.core.outbox_service import outbox_service
+from ...core.realtime_hub import realtime_hub, item_topic
 
 router = APIRouter()
 
-# Initialize service
-pos_real_time_service = POSRealTimeIntegrationService()
+# Shared service instance; it owns the WebSocket sessions and the outbox handlers
+pos_real_time_service = pos_real_time_integration_service
 
 # Pydantic schemas for POS Real-time Integration
 class POSTransactionCreateRequest(BaseModel):
@@ -50,7 +53,7 @@ class POSAnalyticsResponse(BaseModel):
 
 # POS Real-time Integration Endpoints
 @router.post("/transactions", response_model=POSRealTimeResponse)
-async def create_pos_transaction_with_real_time_integrations(
+def create_pos_transaction_with_real_time_integrations(
     transaction_data: POSTransactionCreateRequest,
     current_user: User = Depends(require_permission("pos.create")),
     db: Session = Depends(get_db)
@@ -96,19 +99,21 @@ async def websocket_endpoint(
     websocket: WebSocket,
     session_id: int,
     company_id: int = Query(...),
+    store_id: Optional[int] = Query(None),
     current_user: User = Depends(require_permission("pos.websocket"))
 ):
     """WebSocket endpoint for real-time POS updates"""
     
     try:
-        # Connect WebSocket
-        await pos_real_time_service.connect_websocket(websocket, session_id)
+        # Connect WebSocket; replies go through the client's send queue like any other update
+        client = await pos_real_time_service.connect_websocket(websocket, session_id, store_id)
         
         # Send initial connection message
-        await websocket.send_json({
+        realtime_hub.send(client, {
             'type': 'connection_established',
             'session_id': session_id,
             'company_id': company_id,
+            'store_id': store_id,
             'timestamp': datetime.utcnow().isoformat()
         })
         
@@ -120,16 +125,23 @@ async def websocket_endpoint(
                 
                 # Handle different message types
                 if data.get('type') == 'ping':
-                    await websocket.send_json({
+                    realtime_hub.send(client, {
                         'type': 'pong',
                         'timestamp': datetime.utcnow().isoformat()
                     })
+                elif data.get('type') in ('subscribe_items', 'unsubscribe_items'):
+                    # Follow stock levels of specific items
+                    for item_id in data.get('item_ids', []):
+                        if data['type'] == 'subscribe_items':
+                            realtime_hub.subscribe(client, item_topic(int(item_id)))
+                        else:
+                            realtime_hub.unsubscribe(client, item_topic(int(item_id)))
                 elif data.get('type') == 'get_analytics':
                     # Send real-time analytics
                     analytics = pos_real_time_service.get_real_time_pos_analytics(
                         db, company_id, session_id
                     )
-                    await websocket.send_json({
+                    realtime_hub.send(client, {
                         'type': 'analytics_update',
                         'data': analytics,
                         'timestamp': datetime.utcnow().isoformat()
@@ -139,7 +151,7 @@ async def websocket_endpoint(
                     inventory_data = pos_real_time_service.get_real_time_inventory_data(
                         db, company_id
                     )
-                    await websocket.send_json({
+                    realtime_hub.send(client, {
                         'type': 'inventory_update',
                         'data': inventory_data,
                         'timestamp': datetime.utcnow().isoformat()
@@ -149,7 +161,7 @@ async def websocket_endpoint(
                     customer_data = pos_real_time_service.get_real_time_customer_data(
                         db, company_id
                     )
-                    await websocket.send_json({
+                    realtime_hub.send(client, {
                         'type': 'customer_update',
                         'data': customer_data,
                         'timestamp': datetime.utcnow().isoformat()
@@ -159,7 +171,7 @@ async def websocket_endpoint(
                 break
             except Exception as e:
                 logger.error(f"Error in WebSocket message handling: {str(e)}")
-                await websocket.send_json({
+                realtime_hub.send(client, {
                     'type': 'error',
                     'message': str(e),
                     'timestamp': datetime.utcnow().isoformat()
@@ -172,7 +184,7 @@ async def websocket_endpoint(
         await pos_real_time_service.disconnect_websocket(websocket, session_id)
 
 @router.get("/analytics", response_model=POSAnalyticsResponse)
-async def get_real_time_pos_analytics(
+def get_real_time_pos_analytics(
     company_id: int = Query(...),
     session_id: Optional[int] = Query(None),
     current_user: User = Depends(require_permission("pos.analytics")),
@@ -208,7 +220,7 @@ async def get_real_time_pos_analytics(
         )
 
 @router.get("/inventory/real-time")
-async def get_real_time_inventory_data(
+def get_real_time_inventory_data(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("pos.inventory")),
     db: Session = Depends(get_db)
@@ -240,7 +252,7 @@ async def get_real_time_inventory_data(
         )
 
 @router.get("/customers/real-time")
-async def get_real_time_customer_data(
+def get_real_time_customer_data(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("pos.customers")),
     db: Session = Depends(get_db)
@@ -272,7 +284,7 @@ async def get_real_time_customer_data(
         )
 
 @router.get("/sessions/active")
-async def get_active_pos_sessions(
+def get_active_pos_sessions(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("pos.sessions")),
     db: Session = Depends(get_db)
@@ -317,6 +329,7 @@ async def broadcast_to_pos_sessions(
     message: dict,
     company_id: int = Query(...),
     session_id: Optional[int] = Query(None),
+    store_id: Optional[int] = Query(None),
     current_user: User = Depends(require_permission("pos.broadcast")),
     db: Session = Depends(get_db)
 ):
@@ -326,7 +339,7 @@ async def broadcast_to_pos_sessions(
         # Validate company access
         from ...services.core.company_integration_service import CompanyIntegrationService
         company_service = CompanyIntegrationService()
-        if not company_service.validate_company_access(db, company_id, current_user.id):
+        if not await run_in_threadpool(company_service.validate_company_access, db, company_id, current_user.id):
             raise HTTPException(
                 status_code=403,
                 detail="Access denied to this company"
@@ -335,6 +348,8 @@ async def broadcast_to_pos_sessions(
         # Broadcast message
         if session_id:
             await pos_real_time_service.broadcast_to_session(session_id, message)
+        elif store_id:
+            await pos_real_time_service.broadcast_to_store(store_id, message)
         else:
             await pos_real_time_service.broadcast_to_all(message)
         
@@ -351,7 +366,7 @@ async def broadcast_to_pos_sessions(
         )
 
 @router.get("/integration-status")
-async def get_pos_real_time_integration_status(
+def get_pos_real_time_integration_status(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("pos.view")),
     db: Session = Depends(get_db)
@@ -382,6 +397,8 @@ async def get_pos_real_time_integration_status(
                 "loyalty_integration": integrations.get('loyalty', {}).get('status', 'unknown'),
                 "sales_integration": integrations.get('sales', {}).get('status', 'unknown')
             },
+            "post_sale_outbox": outbox_service.get_lag_metrics(db),
+            "realtime_hub": realtime_hub.get_stats(),
             "real_time_features": {
                 "live_inventory_updates": "enabled",
                 "live_customer_updates": "enabled",
@@ -400,7 +417,7 @@ async def get_pos_real_time_integration_status(
         )
 
 @router.get("/workflow-automation")
-async def get_pos_workflow_automation(
+def get_pos_workflow_automation(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("pos.automation")),
     db: Session = Depends(get_db)
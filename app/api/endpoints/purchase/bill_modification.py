@@ -69,7 +69,7 @@ class BillModificationResponse(BaseModel):
 
 # Endpoints
 @router.get("/bills/{bill_id}/check-usage", response_model=PurchaseBillUsageResponse)
-async def check_purchase_bill_usage(
+def check_purchase_bill_usage(
     bill_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("purchases.view")),
@@ -91,7 +91,7 @@ async def check_purchase_bill_usage(
 
 
 @router.get("/bills/{bill_id}/can-modify")
-async def can_modify_purchase_bill(
+def can_modify_purchase_bill(
     bill_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("purchases.view")),
@@ -115,7 +115,7 @@ async def can_modify_purchase_bill(
 
 
 @router.put("/bills/{bill_id}", response_model=BillModificationResponse)
-async def modify_purchase_bill(
+def modify_purchase_bill(
     bill_id: int,
     bill_data: PurchaseBillUpdateRequest,
     company_id: int = Query(...),
@@ -159,7 +159,7 @@ async def modify_purchase_bill(
 
 
 @router.delete("/bills/{bill_id}", response_model=BillModificationResponse)
-async def delete_purchase_bill(
+def delete_purchase_bill(
     bill_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("purchases.delete")),
@@ -127,7 +127,7 @@ class PurchaseReturnResponse(BaseModel):
 
 # Excel Import Endpoints
 @router.post("/excel-import", response_model=ExcelImportResponse)
-async def import_purchase_excel(
+def import_purchase_excel(
     file: UploadFile = File(...),
     import_name: str = Query(...),
     company_id: int = Query(...),
@@ -155,7 +155,7 @@ async def import_purchase_excel(
     try:
         # Save uploaded file
         with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
-            content = await file.read()
+            content = file.file.read()
             tmp_file.write(content)
             tmp_file_path = tmp_file.name
         
@@ -186,7 +186,7 @@ async def import_purchase_excel(
         )
 
 @router.get("/excel-import/{import_id}/items")
-async def get_excel_import_items(
+def get_excel_import_items(
     import_id: int,
     company_id: int = Query(...),
     processing_status: Optional[str] = Query(None),
@@ -232,6 +232,8 @@ async def get_excel_import_items(
                 "processing_status": item.processing_status,
                 "error_message": item.error_message,
                 "matched_item_id": item.matched_item_id,
+                "match_confidence": item.match_confidence,
+                "match_method": item.match_method,
                 "matched_supplier_id": item.matched_supplier_id
             }
             for item in items
@@ -240,7 +242,7 @@ async def get_excel_import_items(
     }
 
 @router.post("/excel-import/{import_id}/match-items")
-async def match_excel_items(
+def match_excel_items(
     import_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("purchase.manage")),
@@ -275,7 +277,7 @@ async def match_excel_items(
 
 # Direct Stock Inward Endpoints
 @router.post("/direct-stock-inward", response_model=DirectStockInwardResponse)
-async def create_direct_stock_inward(
+def create_direct_stock_inward(
     inward_data: DirectStockInwardCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("purchase.manage")),
@@ -313,7 +315,7 @@ async def create_direct_stock_inward(
         )
 
 @router.post("/direct-stock-inward/{inward_id}/items")
-async def add_items_to_direct_inward(
+def add_items_to_direct_inward(
     inward_id: int,
     items: List[DirectStockInwardItemCreateRequest],
     company_id: int = Query(...),
@@ -355,7 +357,7 @@ async def add_items_to_direct_inward(
         )
 
 @router.post("/direct-stock-inward/{inward_id}/process")
-async def process_direct_stock_inward(
+def process_direct_stock_inward(
     inward_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("purchase.manage")),
@@ -396,7 +398,7 @@ async def process_direct_stock_inward(
 
 # Purchase Return Endpoints
 @router.post("/purchase-returns", response_model=PurchaseReturnResponse)
-async def create_purchase_return(
+def create_purchase_return(
     return_data: PurchaseReturnCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("purchase.manage")),
@@ -435,7 +437,7 @@ async def create_purchase_return(
         )
 
 @router.post("/purchase-returns/{return_id}/items")
-async def add_items_to_purchase_return(
+def add_items_to_purchase_return(
     return_id: int,
     items: List[PurchaseReturnItemCreateRequest],
     company_id: int = Query(...),
@@ -477,7 +479,7 @@ async def add_items_to_purchase_return(
         )
 
 @router.post("/purchase-returns/{return_id}/process")
-async def process_purchase_return(
+def process_purchase_return(
     return_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("purchase.manage")),
@@ -518,7 +520,7 @@ async def process_purchase_return(
 
 # Purchase Analytics Endpoints
 @router.get("/analytics")
-async def get_purchase_analytics(
+def get_purchase_analytics(
     company_id: int = Query(...),
     from_date: Optional[date] = Query(None),
     to_date: Optional[date] = Query(None),
@@ -547,7 +549,7 @@ async def get_purchase_analytics(
 
 # Bill Matching Endpoints
 @router.post("/bill-matching")
-async def create_bill_matching(
+def create_bill_matching(
     import_id: int = Query(...),
     supplier_id: int = Query(...),
     bill_number: str = Query(...),
@@ -592,7 +594,7 @@ async def create_bill_matching(
         )
 
 @router.post("/bill-matching/{matching_id}/items")
-async def add_items_to_bill_matching(
+def add_items_to_bill_matching(
     matching_id: int,
     import_item_ids: List[int],
     company_id: int = Query(...),
@@ -126,7 +126,7 @@ class PurchaseAnalyticResponse(BaseModel):
 
 # Purchase Journal Entries
 @router.post("/purchase-journal-entries", response_model=PurchaseJournalEntryResponse, status_code=status.HTTP_201_CREATED)
-async def create_purchase_journal_entry(
+def create_purchase_journal_entry(
     entry_data: PurchaseJournalEntryCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_purchase_accounting"))
@@ -139,7 +139,7 @@ async def create_purchase_journal_entry(
     return entry
 
 @router.get("/purchase-journal-entries", response_model=List[PurchaseJournalEntryResponse])
-async def get_purchase_journal_entries(
+def get_purchase_journal_entries(
     purchase_invoice_id: Optional[int] = Query(None),
     purchase_order_id: Optional[int] = Query(None),
     purchase_return_id: Optional[int] = Query(None),
@@ -165,7 +165,7 @@ async def get_purchase_journal_entries(
     return query.order_by(PurchaseJournalEntry.created_at.desc()).all()
 
 @router.get("/purchase-journal-entries/{entry_id}", response_model=PurchaseJournalEntryResponse)
-async def get_purchase_journal_entry(
+def get_purchase_journal_entry(
     entry_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("view_purchase_accounting"))
@@ -178,7 +178,7 @@ async def get_purchase_journal_entry(
 
 # Purchase Payments
 @router.post("/purchase-payments", response_model=PurchasePaymentResponse, status_code=status.HTTP_201_CREATED)
-async def create_purchase_payment(
+def create_purchase_payment(
     payment_data: PurchasePaymentCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_purchase_accounting"))
@@ -191,7 +191,7 @@ async def create_purchase_payment(
     return payment
 
 @router.get("/purchase-payments", response_model=List[PurchasePaymentResponse])
-async def get_purchase_payments(
+def get_purchase_payments(
     purchase_invoice_id: Optional[int] = Query(None),
     payment_status: Optional[PaymentStatus] = Query(None),
     payment_date_from: Optional[date] = Query(None),
@@ -214,7 +214,7 @@ async def get_purchase_payments(
     return query.order_by(PurchasePayment.payment_date.desc()).all()
 
 @router.get("/purchase-payments/{payment_id}", response_model=PurchasePaymentResponse)
-async def get_purchase_payment(
+def get_purchase_payment(
     payment_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("view_purchase_accounting"))
@@ -227,7 +227,7 @@ async def get_purchase_payment(
 
 # Purchase Analytics
 @router.post("/purchase-analytics", response_model=PurchaseAnalyticResponse, status_code=status.HTTP_201_CREATED)
-async def create_purchase_analytic(
+def create_purchase_analytic(
     analytic_data: PurchaseAnalyticCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_purchase_accounting"))
@@ -240,7 +240,7 @@ async def create_purchase_analytic(
     return analytic
 
 @router.get("/purchase-analytics", response_model=List[PurchaseAnalyticResponse])
-async def get_purchase_analytics(
+def get_purchase_analytics(
     purchase_invoice_id: Optional[int] = Query(None),
     purchase_order_id: Optional[int] = Query(None),
     purchase_return_id: Optional[int] = Query(None),
@@ -264,7 +264,7 @@ async def get_purchase_analytics(
 
 # Auto-create Journal Entries
 @router.post("/auto-create-journal-entries/{purchase_invoice_id}")
-async def auto_create_journal_entry(
+def auto_create_journal_entry(
     purchase_invoice_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_purchase_accounting"))
@@ -280,7 +280,7 @@ async def auto_create_journal_entry(
 
 # Purchase Accounting Statistics
 @router.get("/purchase-accounting-statistics")
-async def get_purchase_accounting_statistics(
+def get_purchase_accounting_statistics(
     date_from: Optional[date] = Query(None),
     date_to: Optional[date] = Query(None),
     db: Session = Depends(get_db),
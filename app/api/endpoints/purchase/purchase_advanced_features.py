@@ -178,7 +178,7 @@ class PurchaseAdvancedReportingResponse(BaseModel):
 
 # Purchase Advanced Workflows
 @router.post("/purchase-advanced-workflows", response_model=PurchaseAdvancedWorkflowResponse, status_code=status.HTTP_201_CREATED)
-async def create_purchase_advanced_workflow(
+def create_purchase_advanced_workflow(
     workflow_data: PurchaseAdvancedWorkflowCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_purchase_advanced_workflows"))
@@ -191,7 +191,7 @@ async def create_purchase_advanced_workflow(
     return workflow
 
 @router.get("/purchase-advanced-workflows", response_model=List[PurchaseAdvancedWorkflowResponse])
-async def get_purchase_advanced_workflows(
+def get_purchase_advanced_workflows(
     purchase_invoice_id: Optional[int] = Query(None),
     purchase_order_id: Optional[int] = Query(None),
     purchase_return_id: Optional[int] = Query(None),
@@ -220,7 +220,7 @@ async def get_purchase_advanced_workflows(
     return query.order_by(PurchaseAdvancedWorkflow.created_at.desc()).all()
 
 @router.get("/purchase-advanced-workflows/{workflow_id}", response_model=PurchaseAdvancedWorkflowResponse)
-async def get_purchase_advanced_workflow(
+def get_purchase_advanced_workflow(
     workflow_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("view_purchase_advanced_workflows"))
@@ -233,7 +233,7 @@ async def get_purchase_advanced_workflow(
 
 # Purchase Document Management
 @router.post("/purchase-document-management", response_model=PurchaseDocumentManagementResponse, status_code=status.HTTP_201_CREATED)
-async def create_purchase_document_management(
+def create_purchase_document_management(
     document_data: PurchaseDocumentManagementCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_purchase_document_management"))
@@ -246,7 +246,7 @@ async def create_purchase_document_management(
     return document
 
 @router.get("/purchase-document-management", response_model=List[PurchaseDocumentManagementResponse])
-async def get_purchase_document_management(
+def get_purchase_document_management(
     purchase_invoice_id: Optional[int] = Query(None),
     purchase_order_id: Optional[int] = Query(None),
     purchase_return_id: Optional[int] = Query(None),
@@ -273,7 +273,7 @@ async def get_purchase_document_management(
 
 # Purchase Advanced Reporting
 @router.post("/purchase-advanced-reporting", response_model=PurchaseAdvancedReportingResponse, status_code=status.HTTP_201_CREATED)
-async def create_purchase_advanced_reporting(
+def create_purchase_advanced_reporting(
     reporting_data: PurchaseAdvancedReportingCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_purchase_advanced_reporting"))
@@ -286,7 +286,7 @@ async def create_purchase_advanced_reporting(
     return reporting
 
 @router.get("/purchase-advanced-reporting", response_model=List[PurchaseAdvancedReportingResponse])
-async def get_purchase_advanced_reporting(
+def get_purchase_advanced_reporting(
     purchase_invoice_id: Optional[int] = Query(None),
     purchase_order_id: Optional[int] = Query(None),
     purchase_return_id: Optional[int] = Query(None),
@@ -316,7 +316,7 @@ async def get_purchase_advanced_reporting(
 
 # Purchase Advanced Features Statistics
 @router.get("/purchase-advanced-features-statistics")
-async def get_purchase_advanced_features_statistics(
+def get_purchase_advanced_features_statistics(
     date_from: Optional[date] = Query(None),
     date_to: Optional[date] = Query(None),
     db: Session = Depends(get_db),
@@ -339,7 +339,7 @@ async def get_purchase_advanced_features_statistics(
 
 # Auto-create Advanced Workflows
 @router.post("/auto-create-advanced-workflows/{purchase_invoice_id}")
-async def auto_create_advanced_workflows(
+def auto_create_advanced_workflows(
     purchase_invoice_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_purchase_advanced_workflows"))
@@ -355,7 +355,7 @@ async def auto_create_advanced_workflows(
 
 # Generate Advanced Reports
 @router.post("/generate-advanced-reports/{purchase_invoice_id}")
-async def generate_advanced_reports(
+def generate_advanced_reports(
     purchase_invoice_id: int,
     report_type: str = Query(..., description="Report type to generate"),
     db: Session = Depends(get_db),
@@ -170,7 +170,7 @@ class PurchasePerformanceOptimizationResponse(BaseModel):
 
 # Purchase Inventory Integration
 @router.post("/purchase-inventory-integration", response_model=PurchaseInventoryIntegrationResponse, status_code=status.HTTP_201_CREATED)
-async def create_purchase_inventory_integration(
+def create_purchase_inventory_integration(
     integration_data: PurchaseInventoryIntegrationCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_purchase_inventory_integration"))
@@ -183,7 +183,7 @@ async def create_purchase_inventory_integration(
     return integration
 
 @router.get("/purchase-inventory-integration", response_model=List[PurchaseInventoryIntegrationResponse])
-async def get_purchase_inventory_integration(
+def get_purchase_inventory_integration(
     purchase_invoice_id: Optional[int] = Query(None),
     purchase_order_id: Optional[int] = Query(None),
     purchase_return_id: Optional[int] = Query(None),
@@ -219,7 +219,7 @@ async def get_purchase_inventory_integration(
 
 # Purchase Supplier Integration
 @router.post("/purchase-supplier-integration", response_model=PurchaseSupplierIntegrationResponse, status_code=status.HTTP_201_CREATED)
-async def create_purchase_supplier_integration(
+def create_purchase_supplier_integration(
     integration_data: PurchaseSupplierIntegrationCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_purchase_supplier_integration"))
@@ -232,7 +232,7 @@ async def create_purchase_supplier_integration(
     return integration
 
 @router.get("/purchase-supplier-integration", response_model=List[PurchaseSupplierIntegrationResponse])
-async def get_purchase_supplier_integration(
+def get_purchase_supplier_integration(
     purchase_invoice_id: Optional[int] = Query(None),
     purchase_order_id: Optional[int] = Query(None),
     purchase_return_id: Optional[int] = Query(None),
@@ -262,7 +262,7 @@ async def get_purchase_supplier_integration(
 
 # Purchase Performance Optimization
 @router.post("/purchase-performance-optimization", response_model=PurchasePerformanceOptimizationResponse, status_code=status.HTTP_201_CREATED)
-async def create_purchase_performance_optimization(
+def create_purchase_performance_optimization(
     optimization_data: PurchasePerformanceOptimizationCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_purchase_performance_optimization"))
@@ -275,7 +275,7 @@ async def create_purchase_performance_optimization(
     return optimization
 
 @router.get("/purchase-performance-optimization", response_model=List[PurchasePerformanceOptimizationResponse])
-async def get_purchase_performance_optimization(
+def get_purchase_performance_optimization(
     purchase_invoice_id: Optional[int] = Query(None),
     purchase_order_id: Optional[int] = Query(None),
     purchase_return_id: Optional[int] = Query(None),
@@ -299,7 +299,7 @@ async def get_purchase_performance_optimization(
 
 # Purchase Enhanced Integration Statistics
 @router.get("/purchase-enhanced-integration-statistics")
-async def get_purchase_enhanced_integration_statistics(
+def get_purchase_enhanced_integration_statistics(
     date_from: Optional[date] = Query(None),
     date_to: Optional[date] = Query(None),
     db: Session = Depends(get_db),
@@ -323,7 +323,7 @@ async def get_purchase_enhanced_integration_statistics(
 
 # Auto-optimize Performance
 @router.post("/auto-optimize-performance/{purchase_invoice_id}")
-async def auto_optimize_performance(
+def auto_optimize_performance(
     purchase_invoice_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_purchase_performance_optimization"))
@@ -339,7 +339,7 @@ async def auto_optimize_performance(
 
 # Sync Real-time Data
 @router.post("/sync-real-time-data/{purchase_invoice_id}")
-async def sync_real_time_data(
+def sync_real_time_data(
     purchase_invoice_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_purchase_real_time_sync"))
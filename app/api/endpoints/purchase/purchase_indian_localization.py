@@ -173,7 +173,7 @@ class PurchaseEWaybillResponse(BaseModel):
 
 # Purchase GST
 @router.post("/purchase-gst", response_model=PurchaseGSTResponse, status_code=status.HTTP_201_CREATED)
-async def create_purchase_gst(
+def create_purchase_gst(
     gst_data: PurchaseGSTCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_purchase_gst"))
@@ -186,7 +186,7 @@ async def create_purchase_gst(
     return gst
 
 @router.get("/purchase-gst", response_model=List[PurchaseGSTResponse])
-async def get_purchase_gst(
+def get_purchase_gst(
     purchase_invoice_id: Optional[int] = Query(None),
     purchase_order_id: Optional[int] = Query(None),
     purchase_return_id: Optional[int] = Query(None),
@@ -209,7 +209,7 @@ async def get_purchase_gst(
     return query.order_by(PurchaseGST.created_at.desc()).all()
 
 @router.get("/purchase-gst/{gst_id}", response_model=PurchaseGSTResponse)
-async def get_purchase_gst_record(
+def get_purchase_gst_record(
     gst_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("view_purchase_gst"))
@@ -222,7 +222,7 @@ async def get_purchase_gst_record(
 
 # Purchase E-Invoice
 @router.post("/purchase-e-invoice", response_model=PurchaseEInvoiceResponse, status_code=status.HTTP_201_CREATED)
-async def create_purchase_e_invoice(
+def create_purchase_e_invoice(
     e_invoice_data: PurchaseEInvoiceCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_purchase_e_invoice"))
@@ -235,7 +235,7 @@ async def create_purchase_e_invoice(
     return e_invoice
 
 @router.get("/purchase-e-invoice", response_model=List[PurchaseEInvoiceResponse])
-async def get_purchase_e_invoice(
+def get_purchase_e_invoice(
     purchase_invoice_id: Optional[int] = Query(None),
     e_invoice_status: Optional[str] = Query(None),
     portal_upload_status: Optional[str] = Query(None),
@@ -255,7 +255,7 @@ async def get_purchase_e_invoice(
     return query.order_by(PurchaseEInvoice.created_at.desc()).all()
 
 @router.post("/purchase-e-invoice/generate/{purchase_invoice_id}")
-async def generate_purchase_e_invoice(
+def generate_purchase_e_invoice(
     purchase_invoice_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_purchase_e_invoice"))
@@ -271,7 +271,7 @@ async def generate_purchase_e_invoice(
 
 # Purchase E-Waybill
 @router.post("/purchase-e-waybill", response_model=PurchaseEWaybillResponse, status_code=status.HTTP_201_CREATED)
-async def create_purchase_e_waybill(
+def create_purchase_e_waybill(
     e_waybill_data: PurchaseEWaybillCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_purchase_e_waybill"))
@@ -284,7 +284,7 @@ async def create_purchase_e_waybill(
     return e_waybill
 
 @router.get("/purchase-e-waybill", response_model=List[PurchaseEWaybillResponse])
-async def get_purchase_e_waybill(
+def get_purchase_e_waybill(
     purchase_invoice_id: Optional[int] = Query(None),
     purchase_order_id: Optional[int] = Query(None),
     eway_bill_status: Optional[str] = Query(None),
@@ -307,7 +307,7 @@ async def get_purchase_e_waybill(
     return query.order_by(PurchaseEWaybill.created_at.desc()).all()
 
 @router.post("/purchase-e-waybill/generate/{purchase_invoice_id}")
-async def generate_purchase_e_waybill(
+def generate_purchase_e_waybill(
     purchase_invoice_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_purchase_e_waybill"))
@@ -323,7 +323,7 @@ async def generate_purchase_e_waybill(
 
 # Purchase Indian Localization Statistics
 @router.get("/purchase-indian-localization-statistics")
-async def get_purchase_indian_localization_statistics(
+def get_purchase_indian_localization_statistics(
     date_from: Optional[date] = Query(None),
     date_to: Optional[date] = Query(None),
     db: Session = Depends(get_db),
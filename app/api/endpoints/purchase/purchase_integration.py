@@ -82,7 +82,7 @@ class PurchaseAnalyticsResponse(BaseModel):
 
 # Purchase Integration Endpoints
 @router.post("/orders", response_model=PurchaseIntegrationResponse)
-async def create_purchase_order_with_integrations(
+def create_purchase_order_with_integrations(
     order_data: PurchaseOrderCreateRequest,
     current_user: User = Depends(require_permission("purchase.create")),
     db: Session = Depends(get_db)
@@ -124,7 +124,7 @@ async def create_purchase_order_with_integrations(
         )
 
 @router.post("/bills", response_model=PurchaseIntegrationResponse)
-async def create_purchase_bill_with_integrations(
+def create_purchase_bill_with_integrations(
     bill_data: PurchaseBillCreateRequest,
     current_user: User = Depends(require_permission("purchase.create")),
     db: Session = Depends(get_db)
@@ -166,7 +166,7 @@ async def create_purchase_bill_with_integrations(
         )
 
 @router.post("/payments", response_model=PurchaseIntegrationResponse)
-async def process_purchase_payment_with_integrations(
+def process_purchase_payment_with_integrations(
     payment_data: PurchasePaymentCreateRequest,
     current_user: User = Depends(require_permission("purchase.payment")),
     db: Session = Depends(get_db)
@@ -208,7 +208,7 @@ async def process_purchase_payment_with_integrations(
         )
 
 @router.get("/analytics", response_model=PurchaseAnalyticsResponse)
-async def get_purchase_analytics(
+def get_purchase_analytics(
     company_id: int = Query(...),
     from_date: Optional[date] = Query(None),
     to_date: Optional[date] = Query(None),
@@ -248,7 +248,7 @@ async def get_purchase_analytics(
         )
 
 @router.get("/supplier-analytics")
-async def get_supplier_purchase_analytics(
+def get_supplier_purchase_analytics(
     company_id: int = Query(...),
     from_date: Optional[date] = Query(None),
     to_date: Optional[date] = Query(None),
@@ -279,7 +279,7 @@ async def get_supplier_purchase_analytics(
         )
 
 @router.get("/product-analytics")
-async def get_product_purchase_analytics(
+def get_product_purchase_analytics(
     company_id: int = Query(...),
     from_date: Optional[date] = Query(None),
     to_date: Optional[date] = Query(None),
@@ -310,7 +310,7 @@ async def get_product_purchase_analytics(
         )
 
 @router.get("/integration-status")
-async def get_purchase_integration_status(
+def get_purchase_integration_status(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("purchase.view")),
     db: Session = Depends(get_db)
@@ -347,7 +347,7 @@ async def get_purchase_integration_status(
         )
 
 @router.get("/workflow-automation")
-async def get_purchase_workflow_automation(
+def get_purchase_workflow_automation(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("purchase.automation")),
     db: Session = Depends(get_db)
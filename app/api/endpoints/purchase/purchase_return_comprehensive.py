@@ -229,7 +229,7 @@ class PurchaseReturnAnalyticsCreateRequest(BaseModel):
 
 # Core Purchase Return Endpoints
 @router.post("/purchase-returns", response_model=PurchaseReturnResponse)
-async def create_purchase_return(
+def create_purchase_return(
     return_data: PurchaseReturnCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("purchase.manage")),
@@ -269,7 +269,7 @@ async def create_purchase_return(
         )
 
 @router.get("/purchase-returns", response_model=List[PurchaseReturnResponse])
-async def get_purchase_returns(
+def get_purchase_returns(
     company_id: int = Query(...),
     supplier_id: Optional[int] = Query(None),
     status: Optional[str] = Query(None),
@@ -310,7 +310,7 @@ async def get_purchase_returns(
         )
 
 @router.get("/purchase-returns/{return_id}", response_model=PurchaseReturnResponse)
-async def get_purchase_return(
+def get_purchase_return(
     return_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("purchase.view")),
@@ -349,7 +349,7 @@ async def get_purchase_return(
         )
 
 @router.put("/purchase-returns/{return_id}", response_model=PurchaseReturnResponse)
-async def update_purchase_return(
+def update_purchase_return(
     return_id: int,
     return_data: PurchaseReturnUpdateRequest,
     company_id: int = Query(...),
@@ -385,7 +385,7 @@ async def update_purchase_return(
         )
 
 @router.delete("/purchase-returns/{return_id}")
-async def delete_purchase_return(
+def delete_purchase_return(
     return_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("purchase.manage")),
@@ -426,7 +426,7 @@ async def delete_purchase_return(
 
 # Phase 1: Accounting Integration Endpoints
 @router.post("/purchase-returns/{return_id}/accounting")
-async def create_purchase_return_accounting(
+def create_purchase_return_accounting(
     return_id: int,
     accounting_data: PurchaseReturnAccountingCreateRequest,
     company_id: int = Query(...),
@@ -453,7 +453,7 @@ async def create_purchase_return_accounting(
         )
 
 @router.post("/purchase-returns/{return_id}/payments")
-async def create_purchase_return_payment(
+def create_purchase_return_payment(
     return_id: int,
     payment_data: PurchaseReturnPaymentCreateRequest,
     company_id: int = Query(...),
@@ -480,7 +480,7 @@ async def create_purchase_return_payment(
         )
 
 @router.post("/purchase-returns/{return_id}/analytics")
-async def create_purchase_return_analytic(
+def create_purchase_return_analytic(
     return_id: int,
     analytic_data: PurchaseReturnAnalyticCreateRequest,
     company_id: int = Query(...),
@@ -508,7 +508,7 @@ async def create_purchase_return_analytic(
 
 # Phase 2: Indian Localization Endpoints
 @router.post("/purchase-returns/{return_id}/gst")
-async def create_purchase_return_gst(
+def create_purchase_return_gst(
     return_id: int,
     gst_data: PurchaseReturnGSTCreateRequest,
     company_id: int = Query(...),
@@ -535,7 +535,7 @@ async def create_purchase_return_gst(
         )
 
 @router.post("/purchase-returns/{return_id}/einvoice")
-async def create_purchase_return_einvoice(
+def create_purchase_return_einvoice(
     return_id: int,
     einvoice_data: PurchaseReturnEInvoiceCreateRequest,
     company_id: int = Query(...),
@@ -562,7 +562,7 @@ async def create_purchase_return_einvoice(
         )
 
 @router.post("/purchase-returns/{return_id}/ewaybill")
-async def create_purchase_return_ewaybill(
+def create_purchase_return_ewaybill(
     return_id: int,
     ewaybill_data: PurchaseReturnEWaybillCreateRequest,
     company_id: int = Query(...),
@@ -589,7 +589,7 @@ async def create_purchase_return_ewaybill(
         )
 
 @router.post("/purchase-returns/{return_id}/tds")
-async def create_purchase_return_tds(
+def create_purchase_return_tds(
     return_id: int,
     tds_data: PurchaseReturnTDSCreateRequest,
     company_id: int = Query(...),
@@ -616,7 +616,7 @@ async def create_purchase_return_tds(
         )
 
 @router.post("/purchase-returns/{return_id}/tcs")
-async def create_purchase_return_tcs(
+def create_purchase_return_tcs(
     return_id: int,
     tcs_data: PurchaseReturnTCSCreateRequest,
     company_id: int = Query(...),
@@ -644,7 +644,7 @@ async def create_purchase_return_tcs(
 
 # Phase 3: Advanced Features Endpoints
 @router.post("/purchase-returns/{return_id}/workflows")
-async def create_purchase_return_workflow(
+def create_purchase_return_workflow(
     return_id: int,
     workflow_data: PurchaseReturnWorkflowCreateRequest,
     company_id: int = Query(...),
@@ -671,7 +671,7 @@ async def create_purchase_return_workflow(
         )
 
 @router.post("/purchase-returns/{return_id}/documents")
-async def create_purchase_return_document(
+def create_purchase_return_document(
     return_id: int,
     document_data: PurchaseReturnDocumentCreateRequest,
     company_id: int = Query(...),
@@ -698,7 +698,7 @@ async def create_purchase_return_document(
         )
 
 @router.post("/purchase-returns/{return_id}/notifications")
-async def create_purchase_return_notification(
+def create_purchase_return_notification(
     return_id: int,
     notification_data: PurchaseReturnNotificationCreateRequest,
     company_id: int = Query(...),
@@ -726,7 +726,7 @@ async def create_purchase_return_notification(
 
 # Phase 4: Enhanced Integration Endpoints
 @router.post("/purchase-returns/{return_id}/inventory")
-async def create_purchase_return_inventory(
+def create_purchase_return_inventory(
     return_id: int,
     inventory_data: PurchaseReturnInventoryCreateRequest,
     company_id: int = Query(...),
@@ -753,7 +753,7 @@ async def create_purchase_return_inventory(
         )
 
 @router.post("/purchase-returns/{return_id}/supplier")
-async def create_purchase_return_supplier(
+def create_purchase_return_supplier(
     return_id: int,
     supplier_data: PurchaseReturnSupplierCreateRequest,
     company_id: int = Query(...),
@@ -780,7 +780,7 @@ async def create_purchase_return_supplier(
         )
 
 @router.post("/purchase-returns/{return_id}/performance")
-async def create_purchase_return_performance(
+def create_purchase_return_performance(
     return_id: int,
     performance_data: PurchaseReturnPerformanceCreateRequest,
     company_id: int = Query(...),
@@ -807,7 +807,7 @@ async def create_purchase_return_performance(
         )
 
 @router.post("/purchase-returns/{return_id}/user-experience")
-async def create_purchase_return_user_experience(
+def create_purchase_return_user_experience(
     return_id: int,
     ux_data: PurchaseReturnUserExperienceCreateRequest,
     company_id: int = Query(...),
@@ -834,7 +834,7 @@ async def create_purchase_return_user_experience(
         )
 
 @router.post("/purchase-returns/{return_id}/sync")
-async def create_purchase_return_sync(
+def create_purchase_return_sync(
     return_id: int,
     sync_data: PurchaseReturnSyncCreateRequest,
     company_id: int = Query(...),
@@ -861,7 +861,7 @@ async def create_purchase_return_sync(
         )
 
 @router.post("/purchase-returns/{return_id}/analytics")
-async def create_purchase_return_analytics(
+def create_purchase_return_analytics(
     return_id: int,
     analytics_data: PurchaseReturnAnalyticsCreateRequest,
     company_id: int = Query(...),
@@ -889,7 +889,7 @@ async def create_purchase_return_analytics(
 
 # Bulk Operations
 @router.post("/purchase-returns/bulk-process")
-async def bulk_process_purchase_returns(
+def bulk_process_purchase_returns(
     return_ids: List[int],
     action: str,  # approve, reject, process, cancel
     company_id: int = Query(...),
@@ -917,7 +917,7 @@ async def bulk_process_purchase_returns(
 
 # Reports and Analytics
 @router.get("/purchase-returns/reports/summary")
-async def get_purchase_return_summary_report(
+def get_purchase_return_summary_report(
     company_id: int = Query(...),
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
@@ -947,7 +947,7 @@ async def get_purchase_return_summary_report(
         )
 
 @router.get("/purchase-returns/reports/analytics")
-async def get_purchase_return_analytics_report(
+def get_purchase_return_analytics_report(
     company_id: int = Query(...),
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
@@ -15,6 +15,7 @@ from ...models.user import User
 from ...core.security import get_current_user, require_permission
 from ...services.stock_service import StockService
 from ...services.gst_service import GSTService
+from ...services.core.document_number_service import document_number_service
 
 router = APIRouter()
 
@@ -154,49 +155,47 @@ class PurchaseInvoiceResponse(BaseModel):
         from_attributes = True
 
 # Helper functions
-def generate_purchase_order_number(db: Session) -> str:
-    """Generate unique purchase order number"""
-    today = datetime.now()
-    prefix = f"PO{today.strftime('%Y%m%d')}"
-    
-    last_order = db.query(PurchaseOrder).filter(
-        PurchaseOrder.order_number.like(f"{prefix}%")
-    ).order_by(desc(PurchaseOrder.order_number)).first()
-    
-    if last_order:
+def generate_purchase_order_number(db: Session, company_id: Optional[int] = None) -> str:
+    """Generate unique purchase order number: PO, the date and a daily sequence"""
+    period = datetime.now().strftime('%Y%m%d')
+    
+    def last_sequence(seed_db: Session) -> int:
+        # A day's series continues after orders numbered before it existed
+        last_order = seed_db.query(PurchaseOrder).filter(
+            PurchaseOrder.order_number.like(f"PO{period}%")
+        ).order_by(desc(PurchaseOrder.order_number)).first()
+        
         try:
-            last_seq = int(last_order.order_number[-4:])
-            next_seq = last_seq + 1
-        except:
-            next_seq = 1
-    else:
-        next_seq = 1
+            return int(last_order.order_number[-4:]) if last_order else 0
+        except ValueError:
+            return 0
     
-    return f"{prefix}{next_seq:04d}"
+    return document_number_service.next_number(
+        db, company_id, "purchase_order", seed=last_sequence, period=period
+    )
 
-def generate_purchase_invoice_number(db: Session) -> str:
-    """Generate unique purchase invoice number"""
-    today = datetime.now()
-    prefix = f"PI{today.strftime('%Y%m%d')}"
-    
-    last_invoice = db.query(PurchaseInvoice).filter(
-        PurchaseInvoice.invoice_number.like(f"{prefix}%")
-    ).order_by(desc(PurchaseInvoice.invoice_number)).first()
+def generate_purchase_invoice_number(db: Session, company_id: Optional[int] = None) -> str:
+    """Generate unique purchase invoice number: PI, the date and a daily sequence"""
+    period = datetime.now().strftime('%Y%m%d')
     
-    if last_invoice:
+    def last_sequence(seed_db: Session) -> int:
+        # A day's series continues after invoices numbered before it existed
+        last_invoice = seed_db.query(PurchaseInvoice).filter(
+            PurchaseInvoice.invoice_number.like(f"PI{period}%")
+        ).order_by(desc(PurchaseInvoice.invoice_number)).first()
+        
         try:
-            last_seq = int(last_invoice.invoice_number[-4:])
-            next_seq = last_seq + 1
-        except:
-            next_seq = 1
-    else:
-        next_seq = 1
+            return int(last_invoice.invoice_number[-4:]) if last_invoice else 0
+        except ValueError:
+            return 0
     
-    return f"{prefix}{next_seq:04d}"
+    return document_number_service.next_number(
+        db, company_id, "purchase_invoice", seed=last_sequence, period=period
+    )
 
 # Purchase Order endpoints
 @router.get("/orders", response_model=List[PurchaseOrderResponse])
-async def get_purchase_orders(
+def get_purchase_orders(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     search: Optional[str] = Query(None),
@@ -236,7 +235,7 @@ async def get_purchase_orders(
     return [PurchaseOrderResponse.from_orm(order) for order in orders]
 
 @router.get("/orders/{order_id}", response_model=PurchaseOrderResponse)
-async def get_purchase_order(
+def get_purchase_order(
     order_id: int,
     current_user: User = Depends(require_permission("purchases.view")),
     db: Session = Depends(get_db)
@@ -253,7 +252,7 @@ async def get_purchase_order(
     return PurchaseOrderResponse.from_orm(order)
 
 @router.post("/orders", response_model=PurchaseOrderResponse)
-async def create_purchase_order(
+def create_purchase_order(
     order_data: PurchaseOrderRequest,
     current_user: User = Depends(require_permission("purchases.create")),
     db: Session = Depends(get_db)
@@ -278,7 +277,7 @@ async def create_purchase_order(
             )
     
     # Generate order number
-    order_number = generate_purchase_order_number(db)
+    order_number = generate_purchase_order_number(db, current_user.company_id)
     
     # Create purchase order
     db_order = PurchaseOrder(
@@ -333,7 +332,7 @@ async def create_purchase_order(
     return PurchaseOrderResponse.from_orm(db_order)
 
 @router.put("/orders/{order_id}/status")
-async def update_purchase_order_status(
+def update_purchase_order_status(
     order_id: int,
     new_status: str = Query(..., regex="^(pending|confirmed|received|cancelled)$"),
     current_user: User = Depends(require_permission("purchases.edit")),
@@ -357,7 +356,7 @@ async def update_purchase_order_status(
 
 # Purchase Invoice endpoints
 @router.get("/invoices", response_model=List[PurchaseInvoiceResponse])
-async def get_purchase_invoices(
+def get_purchase_invoices(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     search: Optional[str] = Query(None),
@@ -398,7 +397,7 @@ async def get_purchase_invoices(
     return [PurchaseInvoiceResponse.from_orm(invoice) for invoice in invoices]
 
 @router.get("/invoices/{invoice_id}", response_model=PurchaseInvoiceResponse)
-async def get_purchase_invoice(
+def get_purchase_invoice(
     invoice_id: int,
     current_user: User = Depends(require_permission("purchases.view")),
     db: Session = Depends(get_db)
@@ -415,7 +414,7 @@ async def get_purchase_invoice(
     return PurchaseInvoiceResponse.from_orm(invoice)
 
 @router.post("/invoices", response_model=PurchaseInvoiceResponse)
-async def create_purchase_invoice(
+def create_purchase_invoice(
     invoice_data: PurchaseInvoiceRequest,
     current_user: User = Depends(require_permission("purchases.create")),
     db: Session = Depends(get_db)
@@ -431,16 +430,20 @@ async def create_purchase_invoice(
         )
     
     # Validate items
+    items = {
+        item.id: item for item in db.query(Item).filter(
+            Item.id.in_({item_data.item_id for item_data in invoice_data.items})
+        ).all()
+    }
     for item_data in invoice_data.items:
-        item = db.query(Item).filter(Item.id == item_data.item_id).first()
-        if not item:
+        if item_data.item_id not in items:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Item with ID {item_data.item_id} not found"
             )
     
     # Generate invoice number
-    invoice_number = generate_purchase_invoice_number(db)
+    invoice_number = generate_purchase_invoice_number(db, current_user.company_id)
     
     # Create purchase invoice
     db_invoice = PurchaseInvoice(
@@ -460,9 +463,10 @@ async def create_purchase_invoice(
     # Create invoice items and update stock
     stock_service = StockService()
     gst_service = GSTService()
+    stock_movements = []
     
     for item_data in invoice_data.items:
-        item = db.query(Item).filter(Item.id == item_data.item_id).first()
+        item = items[item_data.item_id]
         
         # Calculate line total and tax
         line_total = item_data.quantity * item_data.unit_price
@@ -485,27 +489,29 @@ async def create_purchase_invoice(
         
         db.add(invoice_item)
         
-        # Update stock - increase quantity
+        # Stock increase is posted for the whole invoice below
         if item.track_inventory:
-            stock_service.add_stock_movement(
-                db=db,
-                item_id=item.id,
-                location_id=None,  # Use main location
-                movement_type="in",
-                quantity=item_data.quantity,
-                unit_cost=item_data.unit_price,
-                reference_type="purchase_invoice",
-                reference_id=db_invoice.id,
-                reference_number=invoice_number,
-                remarks=f"Purchase from {supplier.name}",
-                batch_number=item_data.batch_number
-            )
+            stock_movements.append({
+                'item_id': item.id,
+                'location_id': None,  # Use main location
+                'movement_type': "in",
+                'quantity': item_data.quantity,
+                'unit_cost': item_data.unit_price,
+                'reference_type': "purchase_invoice",
+                'reference_id': db_invoice.id,
+                'reference_number': invoice_number,
+                'remarks': f"Purchase from {supplier.name}",
+                'batch_number': item_data.batch_number
+            })
         
         # Update item costs
         if item_data.unit_price > 0:
             item.purchase_rate = item_data.unit_price
             item.landed_cost = item_data.unit_price  # Simplified - in reality would include freight, etc.
     
+    # Update stock - increase quantity
+    stock_service.post_movements(db, stock_movements, commit=False)
+    
     # Calculate invoice totals
     db_invoice.subtotal = sum(item.line_total for item in db_invoice.invoice_items)
     db_invoice.tax_amount = sum(item.tax_amount for item in db_invoice.invoice_items)
@@ -526,7 +532,7 @@ async def create_purchase_invoice(
     return PurchaseInvoiceResponse.from_orm(db_invoice)
 
 @router.put("/invoices/{invoice_id}/payment-status")
-async def update_purchase_invoice_payment_status(
+def update_purchase_invoice_payment_status(
     invoice_id: int,
     paid_amount: Decimal = Query(..., ge=0),
     current_user: User = Depends(require_permission("purchases.edit")),
@@ -566,7 +572,7 @@ async def update_purchase_invoice_payment_status(
 
 # Analytics endpoints
 @router.get("/analytics/supplier-performance")
-async def get_supplier_performance(
+def get_supplier_performance(
     period_days: int = Query(30, ge=1),
     limit: int = Query(10, ge=1, le=100),
     current_user: User = Depends(require_permission("purchases.view")),
@@ -611,7 +617,7 @@ async def get_supplier_performance(
     }
 
 @router.get("/analytics/monthly-trends")
-async def get_monthly_purchase_trends(
+def get_monthly_purchase_trends(
     months: int = Query(6, ge=1, le=24),
     current_user: User = Depends(require_permission("purchases.view")),
     db: Session = Depends(get_db)
@@ -655,7 +661,7 @@ async def get_monthly_purchase_trends(
     }
 
 @router.get("/analytics/pending-payments")
-async def get_pending_payments(
+def get_pending_payments(
     current_user: User = Depends(require_permission("purchases.view")),
     db: Session = Depends(get_db)
 ):
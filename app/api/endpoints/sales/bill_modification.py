@@ -48,7 +48,7 @@ class SalesInvoiceModificationResponse(BaseModel):
 
 # Endpoints
 @router.get("/invoices/{invoice_id}/can-modify")
-async def can_modify_sales_invoice(
+def can_modify_sales_invoice(
     invoice_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("sales.view")),
@@ -72,7 +72,7 @@ async def can_modify_sales_invoice(
 
 
 @router.put("/invoices/{invoice_id}", response_model=SalesInvoiceModificationResponse)
-async def modify_sales_invoice(
+def modify_sales_invoice(
     invoice_id: int,
     invoice_data: SalesInvoiceUpdateRequest,
     company_id: int = Query(...),
@@ -115,7 +115,7 @@ async def modify_sales_invoice(
 
 
 @router.delete("/invoices/{invoice_id}", response_model=SalesInvoiceModificationResponse)
-async def delete_sales_invoice(
+def delete_sales_invoice(
     invoice_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("sales.delete")),
@@ -67,6 +67,8 @@ class BillSeriesCreateRequest(BaseModel):
     starting_number: int = 1
     number_length: int = 6
     is_default: bool = False
+    is_gapless: bool = False
+    block_size: int = 0
     notes: Optional[str] = None
 
 class BillSeriesResponse(BaseModel):
@@ -82,6 +84,8 @@ class BillSeriesResponse(BaseModel):
     number_length: int
     is_active: bool
     is_default: bool
+    is_gapless: bool = False
+    block_size: int = 0
     notes: Optional[str] = None
     created_at: datetime
     updated_at: datetime
@@ -245,7 +249,7 @@ class SaleReturnResponse(BaseModel):
 
 # Sale Challan Endpoints
 @router.post("/sale-challans", response_model=SaleChallanResponse)
-async def create_sale_challan(
+def create_sale_challan(
     challan_data: SaleChallanCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("sales.manage")),
@@ -288,7 +292,7 @@ async def create_sale_challan(
         )
 
 @router.post("/sale-challans/{challan_id}/items")
-async def add_items_to_challan(
+def add_items_to_challan(
     challan_id: int,
     items: List[SaleChallanItemCreateRequest],
     company_id: int = Query(...),
@@ -330,7 +334,7 @@ async def add_items_to_challan(
         )
 
 @router.post("/sale-challans/{challan_id}/deliver")
-async def deliver_challan_items(
+def deliver_challan_items(
     challan_id: int,
     item_deliveries: List[dict],
     company_id: int = Query(...),
@@ -373,7 +377,7 @@ async def deliver_challan_items(
 
 # Bill Series Endpoints
 @router.post("/bill-series", response_model=BillSeriesResponse)
-async def create_bill_series(
+def create_bill_series(
     series_data: BillSeriesCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("sales.manage")),
@@ -402,6 +406,8 @@ async def create_bill_series(
             starting_number=series_data.starting_number,
             number_length=series_data.number_length,
             is_default=series_data.is_default,
+            is_gapless=series_data.is_gapless,
+            block_size=series_data.block_size,
             notes=series_data.notes,
             user_id=current_user.id
         )
@@ -420,7 +426,7 @@ async def create_bill_series(
         )
 
 @router.get("/bill-series", response_model=List[BillSeriesResponse])
-async def get_bill_series(
+def get_bill_series(
     company_id: int = Query(...),
     document_type: Optional[str] = Query(None),
     is_active: Optional[bool] = Query(None),
@@ -448,13 +454,13 @@ async def get_bill_series(
     return series
 
 @router.get("/bill-series/generate-number")
-async def generate_bill_number(
+def generate_bill_number(
     document_type: str = Query(...),
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("sales.view")),
     db: Session = Depends(get_db)
 ):
-    """Generate next bill number"""
+    """Preview the next bill number (not reserved)"""
     
     # Check if user has access to company
     from ...services.company_service import company_service
@@ -490,7 +496,7 @@ async def generate_bill_number(
 
 # Payment Mode Endpoints
 @router.post("/payment-modes", response_model=PaymentModeResponse)
-async def create_payment_mode(
+def create_payment_mode(
     mode_data: PaymentModeCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("sales.manage")),
@@ -539,7 +545,7 @@ async def create_payment_mode(
         )
 
 @router.get("/payment-modes", response_model=List[PaymentModeResponse])
-async def get_payment_modes(
+def get_payment_modes(
     company_id: int = Query(...),
     is_active: Optional[bool] = Query(None),
     current_user: User = Depends(require_permission("sales.view")),
@@ -566,7 +572,7 @@ async def get_payment_modes(
 
 # Staff Management Endpoints
 @router.post("/staff", response_model=StaffResponse)
-async def create_staff(
+def create_staff(
     staff_data: StaffCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("sales.manage")),
@@ -616,7 +622,7 @@ async def create_staff(
         )
 
 @router.get("/staff", response_model=List[StaffResponse])
-async def get_staff(
+def get_staff(
     company_id: int = Query(...),
     is_active: Optional[bool] = Query(None),
     department: Optional[str] = Query(None),
@@ -645,7 +651,7 @@ async def get_staff(
 
 # Staff Target Endpoints
 @router.post("/staff-targets", response_model=StaffTargetResponse)
-async def create_staff_target(
+def create_staff_target(
     target_data: StaffTargetCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("sales.manage")),
@@ -686,7 +692,7 @@ async def create_staff_target(
         )
 
 @router.post("/staff-targets/{staff_id}/update-achievement")
-async def update_staff_target_achievement(
+def update_staff_target_achievement(
     staff_id: int,
     target_date: date = Query(...),
     achieved_amount: Decimal = Query(...),
@@ -732,7 +738,7 @@ async def update_staff_target_achievement(
 
 # Sale Return Endpoints
 @router.post("/sale-returns", response_model=SaleReturnResponse)
-async def create_sale_return(
+def create_sale_return(
     return_data: SaleReturnCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("sales.manage")),
@@ -772,7 +778,7 @@ async def create_sale_return(
         )
 
 @router.post("/sale-returns/{return_id}/items")
-async def add_items_to_sale_return(
+def add_items_to_sale_return(
     return_id: int,
     items: List[SaleReturnItemCreateRequest],
     company_id: int = Query(...),
@@ -814,7 +820,7 @@ async def add_items_to_sale_return(
         )
 
 @router.post("/sale-returns/{return_id}/process")
-async def process_sale_return(
+def process_sale_return(
     return_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("sales.manage")),
@@ -855,7 +861,7 @@ async def process_sale_return(
 
 # POS Session Endpoints
 @router.post("/pos-sessions/start")
-async def start_pos_session(
+def start_pos_session(
     staff_id: int = Query(...),
     opening_cash: Decimal = Query(0),
     notes: Optional[str] = Query(None),
@@ -902,7 +908,7 @@ async def start_pos_session(
         )
 
 @router.post("/pos-sessions/{session_id}/close")
-async def close_pos_session(
+def close_pos_session(
     session_id: int,
     closing_cash: Decimal = Query(...),
     notes: Optional[str] = Query(None),
@@ -947,7 +953,7 @@ async def close_pos_session(
 
 # Sales Analytics Endpoints
 @router.get("/analytics")
-async def get_sales_analytics(
+def get_sales_analytics(
     company_id: int = Query(...),
     from_date: Optional[date] = Query(None),
     to_date: Optional[date] = Query(None),
@@ -9,12 +9,13 @@ import uuid
 from ...database import get_db
 from ...models import (
     Sale, SaleItem, SaleReturn, SaleReturnItem, ReturnCredit,
-    Customer, Item, Stock, BillSeries
+    Customer, Item, Stock
 )
 from ...services.gst_service import GSTService
 from ...services.stock_service import StockService
 from ...services.whatsapp_service import WhatsAppService
 from ...core.security import get_current_user
+from ...services.core.document_number_service import document_number_service
 from ...core.constants import TaxRegion, ReturnCreditStatus
 from ...schemas.sale_return_schema import (
     SaleReturnCreate, SaleReturnResponse, SaleReturnItemCreate,
@@ -23,23 +24,12 @@ from ...schemas.sale_return_schema import (
 
 router = APIRouter()
 
-def get_next_return_number(db: Session) -> str:
+def get_next_return_number(db: Session, company_id: Optional[int] = None) -> str:
     """Generate next sale return number"""
-    series = db.query(BillSeries).filter(
-        BillSeries.code == "SR",
-        BillSeries.active == True
-    ).first()
-    
-    if not series:
-        raise HTTPException(status_code=404, detail="Sale Return series not found")
-    
-    sr_no = f"{series.prefix}-{str(series.next_no).zfill(series.width)}"
-    series.next_no += 1
-    
-    return sr_no
+    return document_number_service.next_number(db, company_id, "sale_return")
 
 @router.post("/return/search-sale-line")
-async def search_sale_line_for_return(
+def search_sale_line_for_return(
     barcode: str,
     from_date: Optional[date] = None,
     to_date: Optional[date] = None,
@@ -117,7 +107,7 @@ async def search_sale_line_for_return(
     return result
 
 @router.post("/return/create")
-async def create_sale_return(
+def create_sale_return(
     return_data: SaleReturnCreate,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
@@ -125,7 +115,7 @@ async def create_sale_return(
     """Create sale return with return credit generation"""
     
     # Generate return number
-    sr_no = get_next_return_number(db)
+    sr_no = get_next_return_number(db, current_user.company_id)
     
     # Get tax region from company settings
     tax_region = return_data.tax_region or TaxRegion.LOCAL
@@ -259,7 +249,7 @@ async def create_sale_return(
     }
 
 @router.get("/return/{sr_no}")
-async def get_sale_return(
+def get_sale_return(
     sr_no: str,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
@@ -307,7 +297,7 @@ async def get_sale_return(
     }
 
 @router.get("/returns")
-async def get_sale_returns(
+def get_sale_returns(
     skip: int = 0,
     limit: int = 100,
     from_date: Optional[date] = None,
@@ -126,7 +126,7 @@ class SaleAnalyticResponse(BaseModel):
 
 # Sale Journal Entries
 @router.post("/sale-journal-entries", response_model=SaleJournalEntryResponse, status_code=status.HTTP_201_CREATED)
-async def create_sale_journal_entry(
+def create_sale_journal_entry(
     entry_data: SaleJournalEntryCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_sales_accounting"))
@@ -139,7 +139,7 @@ async def create_sale_journal_entry(
     return entry
 
 @router.get("/sale-journal-entries", response_model=List[SaleJournalEntryResponse])
-async def get_sale_journal_entries(
+def get_sale_journal_entries(
     sale_invoice_id: Optional[int] = Query(None),
     sale_challan_id: Optional[int] = Query(None),
     sale_return_id: Optional[int] = Query(None),
@@ -165,7 +165,7 @@ async def get_sale_journal_entries(
     return query.order_by(SaleJournalEntry.created_at.desc()).all()
 
 @router.get("/sale-journal-entries/{entry_id}", response_model=SaleJournalEntryResponse)
-async def get_sale_journal_entry(
+def get_sale_journal_entry(
     entry_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("view_sales_accounting"))
@@ -178,7 +178,7 @@ async def get_sale_journal_entry(
 
 # Sale Payments
 @router.post("/sale-payments", response_model=SalePaymentResponse, status_code=status.HTTP_201_CREATED)
-async def create_sale_payment(
+def create_sale_payment(
     payment_data: SalePaymentCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_sales_accounting"))
@@ -191,7 +191,7 @@ async def create_sale_payment(
     return payment
 
 @router.get("/sale-payments", response_model=List[SalePaymentResponse])
-async def get_sale_payments(
+def get_sale_payments(
     sale_invoice_id: Optional[int] = Query(None),
     payment_status: Optional[PaymentStatus] = Query(None),
     payment_date_from: Optional[date] = Query(None),
@@ -214,7 +214,7 @@ async def get_sale_payments(
     return query.order_by(SalePayment.payment_date.desc()).all()
 
 @router.get("/sale-payments/{payment_id}", response_model=SalePaymentResponse)
-async def get_sale_payment(
+def get_sale_payment(
     payment_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("view_sales_accounting"))
@@ -227,7 +227,7 @@ async def get_sale_payment(
 
 # Sale Analytics
 @router.post("/sale-analytics", response_model=SaleAnalyticResponse, status_code=status.HTTP_201_CREATED)
-async def create_sale_analytic(
+def create_sale_analytic(
     analytic_data: SaleAnalyticCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_sales_accounting"))
@@ -240,7 +240,7 @@ async def create_sale_analytic(
     return analytic
 
 @router.get("/sale-analytics", response_model=List[SaleAnalyticResponse])
-async def get_sale_analytics(
+def get_sale_analytics(
     sale_invoice_id: Optional[int] = Query(None),
     sale_challan_id: Optional[int] = Query(None),
     sale_return_id: Optional[int] = Query(None),
@@ -264,7 +264,7 @@ async def get_sale_analytics(
 
 # Auto-create Journal Entries
 @router.post("/auto-create-journal-entries/{sale_invoice_id}")
-async def auto_create_journal_entry(
+def auto_create_journal_entry(
     sale_invoice_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_sales_accounting"))
@@ -280,7 +280,7 @@ async def auto_create_journal_entry(
 
 # Sales Accounting Statistics
 @router.get("/sales-accounting-statistics")
-async def get_sales_accounting_statistics(
+def get_sales_accounting_statistics(
     date_from: Optional[date] = Query(None),
     date_to: Optional[date] = Query(None),
     db: Session = Depends(get_db),
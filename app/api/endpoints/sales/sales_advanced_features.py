@@ -178,7 +178,7 @@ class SaleAdvancedReportingResponse(BaseModel):
 
 # Sale Advanced Workflows
 @router.post("/sale-advanced-workflows", response_model=SaleAdvancedWorkflowResponse, status_code=status.HTTP_201_CREATED)
-async def create_sale_advanced_workflow(
+def create_sale_advanced_workflow(
     workflow_data: SaleAdvancedWorkflowCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_sales_advanced_workflows"))
@@ -191,7 +191,7 @@ async def create_sale_advanced_workflow(
     return workflow
 
 @router.get("/sale-advanced-workflows", response_model=List[SaleAdvancedWorkflowResponse])
-async def get_sale_advanced_workflows(
+def get_sale_advanced_workflows(
     sale_invoice_id: Optional[int] = Query(None),
     sale_challan_id: Optional[int] = Query(None),
     sale_return_id: Optional[int] = Query(None),
@@ -220,7 +220,7 @@ async def get_sale_advanced_workflows(
     return query.order_by(SaleAdvancedWorkflow.created_at.desc()).all()
 
 @router.get("/sale-advanced-workflows/{workflow_id}", response_model=SaleAdvancedWorkflowResponse)
-async def get_sale_advanced_workflow(
+def get_sale_advanced_workflow(
     workflow_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("view_sales_advanced_workflows"))
@@ -233,7 +233,7 @@ async def get_sale_advanced_workflow(
 
 # Sale Document Management
 @router.post("/sale-document-management", response_model=SaleDocumentManagementResponse, status_code=status.HTTP_201_CREATED)
-async def create_sale_document_management(
+def create_sale_document_management(
     document_data: SaleDocumentManagementCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_sales_document_management"))
@@ -246,7 +246,7 @@ async def create_sale_document_management(
     return document
 
 @router.get("/sale-document-management", response_model=List[SaleDocumentManagementResponse])
-async def get_sale_document_management(
+def get_sale_document_management(
     sale_invoice_id: Optional[int] = Query(None),
     sale_challan_id: Optional[int] = Query(None),
     sale_return_id: Optional[int] = Query(None),
@@ -273,7 +273,7 @@ async def get_sale_document_management(
 
 # Sale Advanced Reporting
 @router.post("/sale-advanced-reporting", response_model=SaleAdvancedReportingResponse, status_code=status.HTTP_201_CREATED)
-async def create_sale_advanced_reporting(
+def create_sale_advanced_reporting(
     reporting_data: SaleAdvancedReportingCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_sales_advanced_reporting"))
@@ -286,7 +286,7 @@ async def create_sale_advanced_reporting(
     return reporting
 
 @router.get("/sale-advanced-reporting", response_model=List[SaleAdvancedReportingResponse])
-async def get_sale_advanced_reporting(
+def get_sale_advanced_reporting(
     sale_invoice_id: Optional[int] = Query(None),
     sale_challan_id: Optional[int] = Query(None),
     sale_return_id: Optional[int] = Query(None),
@@ -316,7 +316,7 @@ async def get_sale_advanced_reporting(
 
 # Sale Advanced Features Statistics
 @router.get("/sales-advanced-features-statistics")
-async def get_sales_advanced_features_statistics(
+def get_sales_advanced_features_statistics(
     date_from: Optional[date] = Query(None),
     date_to: Optional[date] = Query(None),
     db: Session = Depends(get_db),
@@ -339,7 +339,7 @@ async def get_sales_advanced_features_statistics(
 
 # Auto-create Advanced Workflows
 @router.post("/auto-create-advanced-workflows/{sale_invoice_id}")
-async def auto_create_advanced_workflows(
+def auto_create_advanced_workflows(
     sale_invoice_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_sales_advanced_workflows"))
@@ -355,7 +355,7 @@ async def auto_create_advanced_workflows(
 
 # Generate Advanced Reports
 @router.post("/generate-advanced-reports/{sale_invoice_id}")
-async def generate_advanced_reports(
+def generate_advanced_reports(
     sale_invoice_id: int,
     report_type: str = Query(..., description="Report type to generate"),
     db: Session = Depends(get_db),
@@ -170,7 +170,7 @@ class SalePerformanceOptimizationResponse(BaseModel):
 
 # Sale Inventory Integration
 @router.post("/sale-inventory-integration", response_model=SaleInventoryIntegrationResponse, status_code=status.HTTP_201_CREATED)
-async def create_sale_inventory_integration(
+def create_sale_inventory_integration(
     integration_data: SaleInventoryIntegrationCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_sales_inventory_integration"))
@@ -183,7 +183,7 @@ async def create_sale_inventory_integration(
     return integration
 
 @router.get("/sale-inventory-integration", response_model=List[SaleInventoryIntegrationResponse])
-async def get_sale_inventory_integration(
+def get_sale_inventory_integration(
     sale_invoice_id: Optional[int] = Query(None),
     sale_challan_id: Optional[int] = Query(None),
     sale_return_id: Optional[int] = Query(None),
@@ -219,7 +219,7 @@ async def get_sale_inventory_integration(
 
 # Sale Customer Integration
 @router.post("/sale-customer-integration", response_model=SaleCustomerIntegrationResponse, status_code=status.HTTP_201_CREATED)
-async def create_sale_customer_integration(
+def create_sale_customer_integration(
     integration_data: SaleCustomerIntegrationCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_sales_customer_integration"))
@@ -232,7 +232,7 @@ async def create_sale_customer_integration(
     return integration
 
 @router.get("/sale-customer-integration", response_model=List[SaleCustomerIntegrationResponse])
-async def get_sale_customer_integration(
+def get_sale_customer_integration(
     sale_invoice_id: Optional[int] = Query(None),
     sale_challan_id: Optional[int] = Query(None),
     sale_return_id: Optional[int] = Query(None),
@@ -262,7 +262,7 @@ async def get_sale_customer_integration(
 
 # Sale Performance Optimization
 @router.post("/sale-performance-optimization", response_model=SalePerformanceOptimizationResponse, status_code=status.HTTP_201_CREATED)
-async def create_sale_performance_optimization(
+def create_sale_performance_optimization(
     optimization_data: SalePerformanceOptimizationCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_sales_performance_optimization"))
@@ -275,7 +275,7 @@ async def create_sale_performance_optimization(
     return optimization
 
 @router.get("/sale-performance-optimization", response_model=List[SalePerformanceOptimizationResponse])
-async def get_sale_performance_optimization(
+def get_sale_performance_optimization(
     sale_invoice_id: Optional[int] = Query(None),
     sale_challan_id: Optional[int] = Query(None),
     sale_return_id: Optional[int] = Query(None),
@@ -299,7 +299,7 @@ async def get_sale_performance_optimization(
 
 # Sale Enhanced Integration Statistics
 @router.get("/sales-enhanced-integration-statistics")
-async def get_sales_enhanced_integration_statistics(
+def get_sales_enhanced_integration_statistics(
     date_from: Optional[date] = Query(None),
     date_to: Optional[date] = Query(None),
     db: Session = Depends(get_db),
@@ -323,7 +323,7 @@ async def get_sales_enhanced_integration_statistics(
 
 # Auto-optimize Performance
 @router.post("/auto-optimize-performance/{sale_invoice_id}")
-async def auto_optimize_performance(
+def auto_optimize_performance(
     sale_invoice_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_sales_performance_optimization"))
@@ -339,7 +339,7 @@ async def auto_optimize_performance(
 
 # Sync Real-time Data
 @router.post("/sync-real-time-data/{sale_invoice_id}")
-async def sync_real_time_data(
+def sync_real_time_data(
     sale_invoice_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_sales_real_time_sync"))
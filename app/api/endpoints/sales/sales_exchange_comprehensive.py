@@ -171,7 +171,7 @@ class SalesExchangeAnalyticsCreateRequest(BaseModel):
 
 # Core Sales Exchange Endpoints
 @router.post("/sales-exchanges", response_model=SalesExchangeResponse)
-async def create_sales_exchange(
+def create_sales_exchange(
     exchange_data: SalesExchangeCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("sales.manage")),
@@ -213,7 +213,7 @@ async def create_sales_exchange(
         )
 
 @router.get("/sales-exchanges", response_model=List[SalesExchangeResponse])
-async def get_sales_exchanges(
+def get_sales_exchanges(
     company_id: int = Query(...),
     customer_id: Optional[int] = Query(None),
     status: Optional[str] = Query(None),
@@ -254,7 +254,7 @@ async def get_sales_exchanges(
         )
 
 @router.get("/sales-exchanges/{exchange_id}", response_model=SalesExchangeResponse)
-async def get_sales_exchange(
+def get_sales_exchange(
     exchange_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("sales.view")),
@@ -293,7 +293,7 @@ async def get_sales_exchange(
         )
 
 @router.put("/sales-exchanges/{exchange_id}", response_model=SalesExchangeResponse)
-async def update_sales_exchange(
+def update_sales_exchange(
     exchange_id: int,
     exchange_data: SalesExchangeUpdateRequest,
     company_id: int = Query(...),
@@ -329,7 +329,7 @@ async def update_sales_exchange(
         )
 
 @router.delete("/sales-exchanges/{exchange_id}")
-async def delete_sales_exchange(
+def delete_sales_exchange(
     exchange_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("sales.manage")),
@@ -370,7 +370,7 @@ async def delete_sales_exchange(
 
 # Exchange Item Management
 @router.post("/sales-exchanges/{exchange_id}/items")
-async def add_items_to_sales_exchange(
+def add_items_to_sales_exchange(
     exchange_id: int,
     items: List[SalesExchangeItemCreateRequest],
     company_id: int = Query(...),
@@ -403,7 +403,7 @@ async def add_items_to_sales_exchange(
         )
 
 @router.post("/sales-exchanges/{exchange_id}/process")
-async def process_sales_exchange(
+def process_sales_exchange(
     exchange_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("sales.manage")),
@@ -434,7 +434,7 @@ async def process_sales_exchange(
 
 # Exchange Workflow Endpoints
 @router.post("/sales-exchanges/{exchange_id}/workflows")
-async def create_sales_exchange_workflow(
+def create_sales_exchange_workflow(
     exchange_id: int,
     workflow_data: SalesExchangeWorkflowCreateRequest,
     company_id: int = Query(...),
@@ -461,7 +461,7 @@ async def create_sales_exchange_workflow(
         )
 
 @router.post("/sales-exchanges/{exchange_id}/documents")
-async def create_sales_exchange_document(
+def create_sales_exchange_document(
     exchange_id: int,
     document_data: SalesExchangeDocumentCreateRequest,
     company_id: int = Query(...),
@@ -489,7 +489,7 @@ async def create_sales_exchange_document(
 
 # Exchange Inventory Endpoints
 @router.post("/sales-exchanges/{exchange_id}/inventory")
-async def create_sales_exchange_inventory(
+def create_sales_exchange_inventory(
     exchange_id: int,
     inventory_data: SalesExchangeInventoryCreateRequest,
     company_id: int = Query(...),
@@ -517,7 +517,7 @@ async def create_sales_exchange_inventory(
 
 # Exchange Accounting Endpoints
 @router.post("/sales-exchanges/{exchange_id}/accounting")
-async def create_sales_exchange_accounting(
+def create_sales_exchange_accounting(
     exchange_id: int,
     accounting_data: SalesExchangeAccountingCreateRequest,
     company_id: int = Query(...),
@@ -545,7 +545,7 @@ async def create_sales_exchange_accounting(
 
 # Exchange GST Endpoints
 @router.post("/sales-exchanges/{exchange_id}/gst")
-async def create_sales_exchange_gst(
+def create_sales_exchange_gst(
     exchange_id: int,
     gst_data: SalesExchangeGSTCreateRequest,
     company_id: int = Query(...),
@@ -573,7 +573,7 @@ async def create_sales_exchange_gst(
 
 # Exchange Customer Endpoints
 @router.post("/sales-exchanges/{exchange_id}/customer")
-async def create_sales_exchange_customer(
+def create_sales_exchange_customer(
     exchange_id: int,
     customer_data: SalesExchangeCustomerCreateRequest,
     company_id: int = Query(...),
@@ -601,7 +601,7 @@ async def create_sales_exchange_customer(
 
 # Exchange Analytics Endpoints
 @router.post("/sales-exchanges/{exchange_id}/analytics")
-async def create_sales_exchange_analytics(
+def create_sales_exchange_analytics(
     exchange_id: int,
     analytics_data: SalesExchangeAnalyticsCreateRequest,
     company_id: int = Query(...),
@@ -629,7 +629,7 @@ async def create_sales_exchange_analytics(
 
 # Bulk Operations
 @router.post("/sales-exchanges/bulk-process")
-async def bulk_process_sales_exchanges(
+def bulk_process_sales_exchanges(
     exchange_ids: List[int],
     action: str,  # approve, reject, process, cancel
     company_id: int = Query(...),
@@ -657,7 +657,7 @@ async def bulk_process_sales_exchanges(
 
 # Reports and Analytics
 @router.get("/sales-exchanges/reports/summary")
-async def get_sales_exchange_summary_report(
+def get_sales_exchange_summary_report(
     company_id: int = Query(...),
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
@@ -687,7 +687,7 @@ async def get_sales_exchange_summary_report(
         )
 
 @router.get("/sales-exchanges/reports/analytics")
-async def get_sales_exchange_analytics_report(
+def get_sales_exchange_analytics_report(
     company_id: int = Query(...),
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
@@ -714,7 +714,7 @@ async def get_sales_exchange_analytics_report(
 
 # Special B2C Exchange Endpoints
 @router.get("/sales-exchanges/pending-for-pos")
-async def get_pending_exchanges_for_pos(
+def get_pending_exchanges_for_pos(
     company_id: int = Query(...),
     customer_id: Optional[int] = Query(None),
     current_user: User = Depends(require_permission("sales.view")),
@@ -738,7 +738,7 @@ async def get_pending_exchanges_for_pos(
         )
 
 @router.post("/sales-exchanges/{exchange_id}/link-to-pos")
-async def link_exchange_to_pos_bill(
+def link_exchange_to_pos_bill(
     exchange_id: int,
     pos_bill_id: int,
     company_id: int = Query(...),
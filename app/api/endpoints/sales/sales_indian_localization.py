@@ -173,7 +173,7 @@ class SaleEWaybillResponse(BaseModel):
 
 # Sale GST
 @router.post("/sale-gst", response_model=SaleGSTResponse, status_code=status.HTTP_201_CREATED)
-async def create_sale_gst(
+def create_sale_gst(
     gst_data: SaleGSTCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_sales_gst"))
@@ -186,7 +186,7 @@ async def create_sale_gst(
     return gst
 
 @router.get("/sale-gst", response_model=List[SaleGSTResponse])
-async def get_sale_gst(
+def get_sale_gst(
     sale_invoice_id: Optional[int] = Query(None),
     sale_challan_id: Optional[int] = Query(None),
     sale_return_id: Optional[int] = Query(None),
@@ -209,7 +209,7 @@ async def get_sale_gst(
     return query.order_by(SaleGST.created_at.desc()).all()
 
 @router.get("/sale-gst/{gst_id}", response_model=SaleGSTResponse)
-async def get_sale_gst_record(
+def get_sale_gst_record(
     gst_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("view_sales_gst"))
@@ -222,7 +222,7 @@ async def get_sale_gst_record(
 
 # Sale E-Invoice
 @router.post("/sale-e-invoice", response_model=SaleEInvoiceResponse, status_code=status.HTTP_201_CREATED)
-async def create_sale_e_invoice(
+def create_sale_e_invoice(
     e_invoice_data: SaleEInvoiceCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_sales_e_invoice"))
@@ -235,7 +235,7 @@ async def create_sale_e_invoice(
     return e_invoice
 
 @router.get("/sale-e-invoice", response_model=List[SaleEInvoiceResponse])
-async def get_sale_e_invoice(
+def get_sale_e_invoice(
     sale_invoice_id: Optional[int] = Query(None),
     e_invoice_status: Optional[str] = Query(None),
     portal_upload_status: Optional[str] = Query(None),
@@ -255,7 +255,7 @@ async def get_sale_e_invoice(
     return query.order_by(SaleEInvoice.created_at.desc()).all()
 
 @router.post("/sale-e-invoice/generate/{sale_invoice_id}")
-async def generate_sale_e_invoice(
+def generate_sale_e_invoice(
     sale_invoice_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_sales_e_invoice"))
@@ -271,7 +271,7 @@ async def generate_sale_e_invoice(
 
 # Sale E-Waybill
 @router.post("/sale-e-waybill", response_model=SaleEWaybillResponse, status_code=status.HTTP_201_CREATED)
-async def create_sale_e_waybill(
+def create_sale_e_waybill(
     e_waybill_data: SaleEWaybillCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_sales_e_waybill"))
@@ -284,7 +284,7 @@ async def create_sale_e_waybill(
     return e_waybill
 
 @router.get("/sale-e-waybill", response_model=List[SaleEWaybillResponse])
-async def get_sale_e_waybill(
+def get_sale_e_waybill(
     sale_invoice_id: Optional[int] = Query(None),
     sale_challan_id: Optional[int] = Query(None),
     eway_bill_status: Optional[str] = Query(None),
@@ -307,7 +307,7 @@ async def get_sale_e_waybill(
     return query.order_by(SaleEWaybill.created_at.desc()).all()
 
 @router.post("/sale-e-waybill/generate/{sale_invoice_id}")
-async def generate_sale_e_waybill(
+def generate_sale_e_waybill(
     sale_invoice_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_sales_e_waybill"))
@@ -323,7 +323,7 @@ async def generate_sale_e_waybill(
 
 # Sales Indian Localization Statistics
 @router.get("/sales-indian-localization-statistics")
-async def get_sales_indian_localization_statistics(
+def get_sales_indian_localization_statistics(
     date_from: Optional[date] = Query(None),
     date_to: Optional[date] = Query(None),
     db: Session = Depends(get_db),
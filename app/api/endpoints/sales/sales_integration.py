@@ -82,7 +82,7 @@ class SalesAnalyticsResponse(BaseModel):
 
 # Sales Integration Endpoints
 @router.post("/orders", response_model=SalesIntegrationResponse)
-async def create_sale_order_with_integrations(
+def create_sale_order_with_integrations(
     order_data: SaleOrderCreateRequest,
     current_user: User = Depends(require_permission("sales.create")),
     db: Session = Depends(get_db)
@@ -124,7 +124,7 @@ async def create_sale_order_with_integrations(
         )
 
 @router.post("/invoices", response_model=SalesIntegrationResponse)
-async def create_sale_invoice_with_integrations(
+def create_sale_invoice_with_integrations(
     invoice_data: SaleInvoiceCreateRequest,
     current_user: User = Depends(require_permission("sales.create")),
     db: Session = Depends(get_db)
@@ -166,7 +166,7 @@ async def create_sale_invoice_with_integrations(
         )
 
 @router.post("/payments", response_model=SalesIntegrationResponse)
-async def process_sale_payment_with_integrations(
+def process_sale_payment_with_integrations(
     payment_data: SalePaymentCreateRequest,
     current_user: User = Depends(require_permission("sales.payment")),
     db: Session = Depends(get_db)
@@ -208,7 +208,7 @@ async def process_sale_payment_with_integrations(
         )
 
 @router.get("/analytics", response_model=SalesAnalyticsResponse)
-async def get_sales_analytics(
+def get_sales_analytics(
     company_id: int = Query(...),
     from_date: Optional[date] = Query(None),
     to_date: Optional[date] = Query(None),
@@ -248,7 +248,7 @@ async def get_sales_analytics(
         )
 
 @router.get("/customer-analytics")
-async def get_customer_sales_analytics(
+def get_customer_sales_analytics(
     company_id: int = Query(...),
     from_date: Optional[date] = Query(None),
     to_date: Optional[date] = Query(None),
@@ -279,7 +279,7 @@ async def get_customer_sales_analytics(
         )
 
 @router.get("/product-analytics")
-async def get_product_sales_analytics(
+def get_product_sales_analytics(
     company_id: int = Query(...),
     from_date: Optional[date] = Query(None),
     to_date: Optional[date] = Query(None),
@@ -310,7 +310,7 @@ async def get_product_sales_analytics(
         )
 
 @router.get("/integration-status")
-async def get_sales_integration_status(
+def get_sales_integration_status(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("sales.view")),
     db: Session = Depends(get_db)
@@ -348,7 +348,7 @@ async def get_sales_integration_status(
         )
 
 @router.get("/workflow-automation")
-async def get_sales_workflow_automation(
+def get_sales_workflow_automation(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("sales.automation")),
     db: Session = Depends(get_db)
@@ -231,7 +231,7 @@ class SalesReturnAnalyticsCreateRequest(BaseModel):
 
 # Core Sales Return Endpoints
 @router.post("/sales-returns", response_model=SalesReturnResponse)
-async def create_sales_return(
+def create_sales_return(
     return_data: SalesReturnCreateRequest,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("sales.manage")),
@@ -272,7 +272,7 @@ async def create_sales_return(
         )
 
 @router.get("/sales-returns", response_model=List[SalesReturnResponse])
-async def get_sales_returns(
+def get_sales_returns(
     company_id: int = Query(...),
     customer_id: Optional[int] = Query(None),
     status: Optional[str] = Query(None),
@@ -313,7 +313,7 @@ async def get_sales_returns(
         )
 
 @router.get("/sales-returns/{return_id}", response_model=SalesReturnResponse)
-async def get_sales_return(
+def get_sales_return(
     return_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("sales.view")),
@@ -352,7 +352,7 @@ async def get_sales_return(
         )
 
 @router.put("/sales-returns/{return_id}", response_model=SalesReturnResponse)
-async def update_sales_return(
+def update_sales_return(
     return_id: int,
     return_data: SalesReturnUpdateRequest,
     company_id: int = Query(...),
@@ -388,7 +388,7 @@ async def update_sales_return(
         )
 
 @router.delete("/sales-returns/{return_id}")
-async def delete_sales_return(
+def delete_sales_return(
     return_id: int,
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("sales.manage")),
@@ -429,7 +429,7 @@ async def delete_sales_return(
 
 # Phase 1: Accounting Integration Endpoints
 @router.post("/sales-returns/{return_id}/accounting")
-async def create_sales_return_accounting(
+def create_sales_return_accounting(
     return_id: int,
     accounting_data: SalesReturnAccountingCreateRequest,
     company_id: int = Query(...),
@@ -456,7 +456,7 @@ async def create_sales_return_accounting(
         )
 
 @router.post("/sales-returns/{return_id}/payments")
-async def create_sales_return_payment(
+def create_sales_return_payment(
     return_id: int,
     payment_data: SalesReturnPaymentCreateRequest,
     company_id: int = Query(...),
@@ -483,7 +483,7 @@ async def create_sales_return_payment(
         )
 
 @router.post("/sales-returns/{return_id}/analytics")
-async def create_sales_return_analytic(
+def create_sales_return_analytic(
     return_id: int,
     analytic_data: SalesReturnAnalyticCreateRequest,
     company_id: int = Query(...),
@@ -511,7 +511,7 @@ async def create_sales_return_analytic(
 
 # Phase 2: Indian Localization Endpoints
 @router.post("/sales-returns/{return_id}/gst")
-async def create_sales_return_gst(
+def create_sales_return_gst(
     return_id: int,
     gst_data: SalesReturnGSTCreateRequest,
     company_id: int = Query(...),
@@ -538,7 +538,7 @@ async def create_sales_return_gst(
         )
 
 @router.post("/sales-returns/{return_id}/einvoice")
-async def create_sales_return_einvoice(
+def create_sales_return_einvoice(
     return_id: int,
     einvoice_data: SalesReturnEInvoiceCreateRequest,
     company_id: int = Query(...),
@@ -565,7 +565,7 @@ async def create_sales_return_einvoice(
         )
 
 @router.post("/sales-returns/{return_id}/ewaybill")
-async def create_sales_return_ewaybill(
+def create_sales_return_ewaybill(
     return_id: int,
     ewaybill_data: SalesReturnEWaybillCreateRequest,
     company_id: int = Query(...),
@@ -592,7 +592,7 @@ async def create_sales_return_ewaybill(
         )
 
 @router.post("/sales-returns/{return_id}/tds")
-async def create_sales_return_tds(
+def create_sales_return_tds(
     return_id: int,
     tds_data: SalesReturnTDSCreateRequest,
     company_id: int = Query(...),
@@ -619,7 +619,7 @@ async def create_sales_return_tds(
         )
 
 @router.post("/sales-returns/{return_id}/tcs")
-async def create_sales_return_tcs(
+def create_sales_return_tcs(
     return_id: int,
     tcs_data: SalesReturnTCSCreateRequest,
     company_id: int = Query(...),
@@ -647,7 +647,7 @@ async def create_sales_return_tcs(
 
 # Phase 3: Advanced Features Endpoints
 @router.post("/sales-returns/{return_id}/workflows")
-async def create_sales_return_workflow(
+def create_sales_return_workflow(
     return_id: int,
     workflow_data: SalesReturnWorkflowCreateRequest,
     company_id: int = Query(...),
@@ -674,7 +674,7 @@ async def create_sales_return_workflow(
         )
 
 @router.post("/sales-returns/{return_id}/documents")
-async def create_sales_return_document(
+def create_sales_return_document(
     return_id: int,
     document_data: SalesReturnDocumentCreateRequest,
     company_id: int = Query(...),
@@ -701,7 +701,7 @@ async def create_sales_return_document(
         )
 
 @router.post("/sales-returns/{return_id}/notifications")
-async def create_sales_return_notification(
+def create_sales_return_notification(
     return_id: int,
     notification_data: SalesReturnNotificationCreateRequest,
     company_id: int = Query(...),
@@ -729,7 +729,7 @@ async def create_sales_return_notification(
 
 # Phase 4: Enhanced Integration Endpoints
 @router.post("/sales-returns/{return_id}/inventory")
-async def create_sales_return_inventory(
+def create_sales_return_inventory(
     return_id: int,
     inventory_data: SalesReturnInventoryCreateRequest,
     company_id: int = Query(...),
@@ -756,7 +756,7 @@ async def create_sales_return_inventory(
         )
 
 @router.post("/sales-returns/{return_id}/customer")
-async def create_sales_return_customer(
+def create_sales_return_customer(
     return_id: int,
     customer_data: SalesReturnCustomerCreateRequest,
     company_id: int = Query(...),
@@ -783,7 +783,7 @@ async def create_sales_return_customer(
         )
 
 @router.post("/sales-returns/{return_id}/performance")
-async def create_sales_return_performance(
+def create_sales_return_performance(
     return_id: int,
     performance_data: SalesReturnPerformanceCreateRequest,
     company_id: int = Query(...),
@@ -810,7 +810,7 @@ async def create_sales_return_performance(
         )
 
 @router.post("/sales-returns/{return_id}/user-experience")
-async def create_sales_return_user_experience(
+def create_sales_return_user_experience(
     return_id: int,
     ux_data: SalesReturnUserExperienceCreateRequest,
     company_id: int = Query(...),
@@ -837,7 +837,7 @@ async def create_sales_return_user_experience(
         )
 
 @router.post("/sales-returns/{return_id}/sync")
-async def create_sales_return_sync(
+def create_sales_return_sync(
     return_id: int,
     sync_data: SalesReturnSyncCreateRequest,
     company_id: int = Query(...),
@@ -864,7 +864,7 @@ async def create_sales_return_sync(
         )
 
 @router.post("/sales-returns/{return_id}/analytics")
-async def create_sales_return_analytics(
+def create_sales_return_analytics(
     return_id: int,
     analytics_data: SalesReturnAnalyticsCreateRequest,
     company_id: int = Query(...),
@@ -892,7 +892,7 @@ async def create_sales_return_analytics(
 
 # Bulk Operations
 @router.post("/sales-returns/bulk-process")
-async def bulk_process_sales_returns(
+def bulk_process_sales_returns(
     return_ids: List[int],
     action: str,  # approve, reject, process, cancel
     company_id: int = Query(...),
@@ -920,7 +920,7 @@ async def bulk_process_sales_returns(
 
 # Reports and Analytics
 @router.get("/sales-returns/reports/summary")
-async def get_sales_return_summary_report(
+def get_sales_return_summary_report(
     company_id: int = Query(...),
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
@@ -950,7 +950,7 @@ async def get_sales_return_summary_report(
         )
 
 @router.get("/sales-returns/reports/analytics")
-async def get_sales_return_analytics_report(
+def get_sales_return_analytics_report(
     company_id: int = Query(...),
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
@@ -42,7 +42,7 @@ class OverallTestResults(BaseModel):
 
 # Integration Testing Endpoints
 @router.post("/run-comprehensive-tests", response_model=IntegrationTestResponse)
-async def run_comprehensive_integration_tests(
+def run_comprehensive_integration_tests(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("testing.run")),
     db: Session = Depends(get_db)
@@ -76,7 +76,7 @@ async def run_comprehensive_integration_tests(
         )
 
 @router.get("/test-core-integrations", response_model=TestResultResponse)
-async def test_core_integrations(
+def test_core_integrations(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("testing.core")),
     db: Session = Depends(get_db)
@@ -111,7 +111,7 @@ async def test_core_integrations(
         )
 
 @router.get("/test-sales-purchase-integrations", response_model=TestResultResponse)
-async def test_sales_purchase_integrations(
+def test_sales_purchase_integrations(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("testing.sales_purchase")),
     db: Session = Depends(get_db)
@@ -146,7 +146,7 @@ async def test_sales_purchase_integrations(
         )
 
 @router.get("/test-pos-integrations", response_model=TestResultResponse)
-async def test_pos_integrations(
+def test_pos_integrations(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("testing.pos")),
     db: Session = Depends(get_db)
@@ -181,7 +181,7 @@ async def test_pos_integrations(
         )
 
 @router.get("/test-customer-loyalty-integrations", response_model=TestResultResponse)
-async def test_customer_loyalty_integrations(
+def test_customer_loyalty_integrations(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("testing.customer_loyalty")),
     db: Session = Depends(get_db)
@@ -216,7 +216,7 @@ async def test_customer_loyalty_integrations(
         )
 
 @router.get("/test-discount-integrations", response_model=TestResultResponse)
-async def test_discount_integrations(
+def test_discount_integrations(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("testing.discount")),
     db: Session = Depends(get_db)
@@ -251,7 +251,7 @@ async def test_discount_integrations(
         )
 
 @router.get("/test-compliance-integrations", response_model=TestResultResponse)
-async def test_compliance_integrations(
+def test_compliance_integrations(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("testing.compliance")),
     db: Session = Depends(get_db)
@@ -286,7 +286,7 @@ async def test_compliance_integrations(
         )
 
 @router.get("/test-banking-integrations", response_model=TestResultResponse)
-async def test_banking_integrations(
+def test_banking_integrations(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("testing.banking")),
     db: Session = Depends(get_db)
@@ -321,7 +321,7 @@ async def test_banking_integrations(
         )
 
 @router.get("/test-reports-integrations", response_model=TestResultResponse)
-async def test_reports_integrations(
+def test_reports_integrations(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("testing.reports")),
     db: Session = Depends(get_db)
@@ -356,7 +356,7 @@ async def test_reports_integrations(
         )
 
 @router.get("/test-status")
-async def get_test_status(
+def get_test_status(
     company_id: int = Query(...),
     current_user: User = Depends(require_permission("testing.status")),
     db: Session = Depends(get_db)
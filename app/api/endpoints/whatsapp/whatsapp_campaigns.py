@@ -21,7 +21,7 @@ campaign_service = WhatsAppCampaignService()
 
 
 @router.post("/", response_model=WhatsAppCampaignResponse)
-async def create_campaign(
+def create_campaign(
     campaign_data: WhatsAppCampaignCreate,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
@@ -57,7 +57,7 @@ async def create_campaign(
 
 
 @router.get("/", response_model=List[WhatsAppCampaignResponse])
-async def get_campaigns(
+def get_campaigns(
     status: Optional[WhatsAppCampaignStatus] = None,
     created_by: Optional[str] = None,
     db: Session = Depends(get_db),
@@ -81,7 +81,7 @@ async def get_campaigns(
 
 
 @router.get("/{campaign_id}", response_model=WhatsAppCampaignResponse)
-async def get_campaign(
+def get_campaign(
     campaign_id: int,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
@@ -112,7 +112,7 @@ async def get_campaign(
 
 
 @router.put("/{campaign_id}", response_model=WhatsAppCampaignResponse)
-async def update_campaign(
+def update_campaign(
     campaign_id: int,
     campaign_data: WhatsAppCampaignUpdate,
     db: Session = Depends(get_db),
@@ -159,7 +159,7 @@ async def update_campaign(
 
 
 @router.post("/{campaign_id}/start")
-async def start_campaign(
+def start_campaign(
     campaign_id: int,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
@@ -189,7 +189,7 @@ async def start_campaign(
 
 
 @router.post("/{campaign_id}/pause")
-async def pause_campaign(
+def pause_campaign(
     campaign_id: int,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
@@ -219,7 +219,7 @@ async def pause_campaign(
 
 
 @router.post("/{campaign_id}/resume")
-async def resume_campaign(
+def resume_campaign(
     campaign_id: int,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
@@ -249,7 +249,7 @@ async def resume_campaign(
 
 
 @router.get("/{campaign_id}/statistics")
-async def get_campaign_statistics(
+def get_campaign_statistics(
     campaign_id: int,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
@@ -279,7 +279,7 @@ async def get_campaign_statistics(
 
 
 @router.delete("/{campaign_id}")
-async def delete_campaign(
+def delete_campaign(
     campaign_id: int,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
@@ -23,7 +23,7 @@ integration_service = WhatsAppIntegrationService()
 
 
 @router.post("/pos/receipt")
-async def send_pos_receipt(
+def send_pos_receipt(
     receipt_data: POSReceiptRequest,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
@@ -55,7 +55,7 @@ async def send_pos_receipt(
 
 
 @router.post("/loyalty/points")
-async def send_loyalty_points_update(
+def send_loyalty_points_update(
     points_data: LoyaltyPointsRequest,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
@@ -89,7 +89,7 @@ async def send_loyalty_points_update(
 
 
 @router.post("/invoice")
-async def send_invoice(
+def send_invoice(
     invoice_data: InvoiceRequest,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
@@ -120,7 +120,7 @@ async def send_invoice(
 
 
 @router.post("/marketing")
-async def send_marketing_message(
+def send_marketing_message(
     marketing_data: MarketingMessageRequest,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
@@ -152,7 +152,7 @@ async def send_marketing_message(
 
 
 @router.post("/opt-in")
-async def handle_opt_in(
+def handle_opt_in(
     opt_data: OptInRequest,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
@@ -184,7 +184,7 @@ async def handle_opt_in(
 
 
 @router.post("/opt-out")
-async def handle_opt_out(
+def handle_opt_out(
     opt_data: OptOutRequest,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
@@ -215,7 +215,7 @@ async def handle_opt_out(
 
 
 @router.get("/customer/{customer_id}/preferences")
-async def get_customer_preferences(
+def get_customer_preferences(
     customer_id: int,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
@@ -256,7 +256,7 @@ async def get_customer_preferences(
 
 
 @router.get("/messages/{customer_id}")
-async def get_customer_messages(
+def get_customer_messages(
     customer_id: int,
     limit: int = 50,
     offset: int = 0,
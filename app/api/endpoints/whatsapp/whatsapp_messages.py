@@ -21,7 +21,7 @@ whatsapp_service = WhatsAppService()
 
 
 @router.post("/send", response_model=dict)
-async def send_message(
+def send_message(
     message_data: WhatsAppMessageSend,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
@@ -74,7 +74,7 @@ async def send_message(
 
 
 @router.get("/", response_model=List[WhatsAppMessageResponse])
-async def get_messages(
+def get_messages(
     customer_id: Optional[int] = None,
     status: Optional[WhatsAppMessageStatus] = None,
     context_type: Optional[str] = None,
@@ -106,7 +106,7 @@ async def get_messages(
 
 
 @router.get("/{message_id}", response_model=WhatsAppMessageResponse)
-async def get_message(
+def get_message(
     message_id: int,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
@@ -135,7 +135,7 @@ async def get_message(
 
 
 @router.get("/{message_id}/status")
-async def get_message_status(
+def get_message_status(
     message_id: int,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
@@ -179,7 +179,7 @@ async def get_message_status(
 
 
 @router.put("/{message_id}/status")
-async def update_message_status(
+def update_message_status(
     message_id: int,
     status_data: WhatsAppMessageStatusUpdate,
     db: Session = Depends(get_db),
@@ -224,7 +224,7 @@ async def update_message_status(
 
 
 @router.get("/statistics/overview")
-async def get_message_statistics(
+def get_message_statistics(
     days: int = 30,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
@@ -16,7 +16,7 @@ setup_service = WhatsAppSetupService()
 
 
 @router.post("/initialize", response_model=WhatsAppSetupResponse)
-async def initialize_whatsapp_templates(
+def initialize_whatsapp_templates(
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
@@ -45,7 +45,7 @@ async def initialize_whatsapp_templates(
 
 
 @router.post("/configure")
-async def setup_whatsapp_integration(
+def setup_whatsapp_integration(
     setup_data: WhatsAppSetupRequest,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
@@ -78,7 +78,7 @@ async def setup_whatsapp_integration(
 
 
 @router.get("/status")
-async def get_setup_status(
+def get_setup_status(
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
@@ -104,7 +104,7 @@ async def get_setup_status(
 
 
 @router.post("/sample-campaign")
-async def create_sample_campaign(
+def create_sample_campaign(
     campaign_name: str = "Welcome New Customers",
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
@@ -135,7 +135,7 @@ async def create_sample_campaign(
 
 
 @router.get("/templates/preview")
-async def preview_templates(
+def preview_templates(
     category: str = None,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
@@ -165,7 +165,7 @@ async def preview_templates(
 
 
 @router.get("/templates/{template_name}/preview")
-async def preview_template(
+def preview_template(
     template_name: str,
     sample_variables: Dict[str, Any] = None,
     db: Session = Depends(get_db),
@@ -24,7 +24,7 @@ template_service = WhatsAppTemplateService()
 
 
 @router.post("/", response_model=WhatsAppTemplateResponse)
-async def create_template(
+def create_template(
     template_data: WhatsAppTemplateCreate,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
@@ -61,7 +61,7 @@ async def create_template(
 
 
 @router.get("/", response_model=List[WhatsAppTemplateResponse])
-async def get_templates(
+def get_templates(
     status: Optional[WhatsAppTemplateStatus] = None,
     category: Optional[str] = None,
     language: Optional[str] = None,
@@ -87,7 +87,7 @@ async def get_templates(
 
 
 @router.get("/{template_id}", response_model=WhatsAppTemplateResponse)
-async def get_template(
+def get_template(
     template_id: int,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
@@ -116,7 +116,7 @@ async def get_template(
 
 
 @router.put("/{template_id}", response_model=WhatsAppTemplateResponse)
-async def update_template(
+def update_template(
     template_id: int,
     template_data: WhatsAppTemplateUpdate,
     db: Session = Depends(get_db),
@@ -160,7 +160,7 @@ async def update_template(
 
 
 @router.post("/{template_id}/submit", response_model=dict)
-async def submit_template(
+def submit_template(
     template_id: int,
     submit_data: WhatsAppTemplateSubmit,
     db: Session = Depends(get_db),
@@ -192,7 +192,7 @@ async def submit_template(
 
 
 @router.post("/{template_id}/approve", response_model=dict)
-async def approve_template(
+def approve_template(
     template_id: int,
     approve_data: WhatsAppTemplateApprove,
     db: Session = Depends(get_db),
@@ -224,7 +224,7 @@ async def approve_template(
 
 
 @router.delete("/{template_id}")
-async def delete_template(
+def delete_template(
     template_id: int,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
@@ -262,7 +262,7 @@ async def delete_template(
 
 
 @router.get("/{template_id}/usage")
-async def get_template_usage(
+def get_template_usage(
     template_id: int,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
@@ -2,7 +2,8 @@
 WhatsApp Webhook API Endpoints
 Handles incoming webhooks from WhatsApp Business API
 """
-from fastapi import APIRouter, Request, HTTPException, status, Query
+from fastapi import APIRouter, Depends, Request, HTTPException, status, Query
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import Dict, Any
 
@@ -51,7 +52,7 @@ async def handle_webhook(
         webhook_data = await request.json()
         
         # Process webhook
-        result = whatsapp_service.process_webhook(webhook_data, db)
+        result = await run_in_threadpool(whatsapp_service.process_webhook, webhook_data, db)
         
         if not result["success"]:
             raise HTTPException(
@@ -71,7 +72,7 @@ async def handle_webhook(
 
 
 @router.post("/test")
-async def test_webhook(
+def test_webhook(
     test_data: Dict[str, Any],
     db: Session = Depends(get_db)
 ):
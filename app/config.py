@@ -27,9 +27,15 @@ class Settings(BaseSettings):
     # Database Settings
     database_type: str = Field(default="sqlite", env="DATABASE_TYPE")
     database_url: Optional[str] = Field(default=None, env="DATABASE_URL")
+    async_database_url: Optional[str] = Field(default=None, env="ASYNC_DATABASE_URL")  # Derived from database_url when unset
+    db_thread_pool_size: int = Field(default=40, env="DB_THREAD_POOL_SIZE")  # Worker threads for sync (def) handlers
     
     # SQLite specific
     sqlite_path: str = Field(default="./database/erp_system.db", env="SQLITE_PATH")
+    sqlite_reader_pool_size: int = Field(default=8, env="SQLITE_READER_POOL_SIZE")  # WAL readers; writes use one dedicated connection
+
+    # Session metrics
+    db_metrics_window: int = Field(default=1000, env="DB_METRICS_WINDOW")  # Recent requests kept for pool status
     
     # PostgreSQL specific
     postgres_host: str = Field(default="localhost", env="POSTGRES_HOST")
@@ -57,6 +63,8 @@ class Settings(BaseSettings):
     # Security Features
     max_login_attempts: int = Field(default=5, env="MAX_LOGIN_ATTEMPTS")
     lockout_duration_minutes: int = Field(default=30, env="LOCKOUT_DURATION_MINUTES")
+    permission_cache_ttl_seconds: int = Field(default=300, env="PERMISSION_CACHE_TTL_SECONDS")  # Role and permission edits reach other workers within this
+    permission_cache_max_users: int = Field(default=10000, env="PERMISSION_CACHE_MAX_USERS")
     enable_2fa: bool = Field(default=False, env="ENABLE_2FA")
     
     # CORS Settings
@@ -106,6 +114,7 @@ class Settings(BaseSettings):
     gst_rate_18: float = Field(default=18.0, env="GST_RATE_18")
     gst_rate_28: float = Field(default=28.0, env="GST_RATE_28")
     gst_threshold_amount: float = Field(default=999.00, env="GST_THRESHOLD_AMOUNT")
+    gst_context_cache_ttl_seconds: int = Field(default=300, env="GST_CONTEXT_CACHE_TTL_SECONDS")  # Slab and cess edits reach other workers within this
     
     # Company Settings
     company_name: str = Field(default="Your Company Name", env="COMPANY_NAME")
@@ -134,11 +143,41 @@ class Settings(BaseSettings):
     loyalty_min_redemption: int = Field(default=100, env="LOYALTY_MIN_REDEMPTION")
     loyalty_points_expiry_days: int = Field(default=365, env="LOYALTY_POINTS_EXPIRY_DAYS")
     
+    # Discount Settings
+    discount_rule_cache_ttl_seconds: int = Field(default=300, env="DISCOUNT_RULE_CACHE_TTL_SECONDS")  # Other workers apply discount edits within this
+    
+    # Integration Outbox
+    outbox_enabled: bool = Field(default=True, env="OUTBOX_ENABLED")
+    outbox_batch_size: int = Field(default=100, env="OUTBOX_BATCH_SIZE")
+    outbox_poll_interval_seconds: float = Field(default=1.0, env="OUTBOX_POLL_INTERVAL_SECONDS")
+    outbox_max_attempts: int = Field(default=10, env="OUTBOX_MAX_ATTEMPTS")
+    outbox_retention_days: int = Field(default=7, env="OUTBOX_RETENTION_DAYS")
+    
+    # Real-time Updates
+    realtime_client_queue_size: int = Field(default=100, env="REALTIME_CLIENT_QUEUE_SIZE")  # Slow clients are dropped when full
+    realtime_coalesce_interval_ms: int = Field(default=200, env="REALTIME_COALESCE_INTERVAL_MS")
+    realtime_send_timeout_seconds: float = Field(default=5.0, env="REALTIME_SEND_TIMEOUT_SECONDS")
+    
+    # Report Studio
+    report_query_timeout_seconds: int = Field(default=300, env="REPORT_QUERY_TIMEOUT_SECONDS")
+    report_max_rows: int = Field(default=1000000, env="REPORT_MAX_ROWS")
+    report_stream_chunk_size: int = Field(default=5000, env="REPORT_STREAM_CHUNK_SIZE")
+    report_stored_rows: int = Field(default=10000, env="REPORT_STORED_ROWS")  # Larger results keep a preview; exports re-stream
+    report_cache_ttl_seconds: int = Field(default=900, env="REPORT_CACHE_TTL_SECONDS")
+    report_cache_max_bytes: int = Field(default=268435456, env="REPORT_CACHE_MAX_BYTES")  # Per company, least recently used evicted first
+    report_scheduler_enabled: bool = Field(default=True, env="REPORT_SCHEDULER_ENABLED")
+    report_scheduler_workers: int = Field(default=4, env="REPORT_SCHEDULER_WORKERS")
+    report_scheduler_poll_seconds: int = Field(default=30, env="REPORT_SCHEDULER_POLL_SECONDS")
+    report_scheduler_batch_size: int = Field(default=50, env="REPORT_SCHEDULER_BATCH_SIZE")
+    
     # Inventory Settings
     enable_negative_stock: bool = Field(default=False, env="ENABLE_NEGATIVE_STOCK")
     low_stock_threshold: int = Field(default=10, env="LOW_STOCK_THRESHOLD")
     enable_batch_tracking: bool = Field(default=False, env="ENABLE_BATCH_TRACKING")
     enable_serial_tracking: bool = Field(default=False, env="ENABLE_SERIAL_TRACKING")
+    item_import_chunk_rows: int = Field(default=5000, env="ITEM_IMPORT_CHUNK_ROWS")
+    item_import_workers: int = Field(default=2, env="ITEM_IMPORT_WORKERS")
+    purchase_match_min_confidence: float = Field(default=60.0, env="PURCHASE_MATCH_MIN_CONFIDENCE")  # Fuzzy name matches, 0-100
     
     # Backup Settings
     backup_enabled: bool = Field(default=True, env="BACKUP_ENABLED")
@@ -146,6 +185,9 @@ class Settings(BaseSettings):
     backup_time: str = Field(default="02:00", env="BACKUP_TIME")
     backup_retention_days: int = Field(default=7, env="BACKUP_RETENTION_DAYS")
     backup_location: str = Field(default="./backups", env="BACKUP_LOCATION")
+    backup_chunk_size: int = Field(default=4194304, env="BACKUP_CHUNK_SIZE")  # A multiple of the SQLite page size
+    backup_workers: int = Field(default=4, env="BACKUP_WORKERS")
+    backup_compression_level: int = Field(default=6, env="BACKUP_COMPRESSION_LEVEL")
     
     # File Storage Settings
     upload_dir: str = Field(default="uploads", env="UPLOAD_DIR")
@@ -155,6 +197,10 @@ class Settings(BaseSettings):
         env="ALLOWED_UPLOAD_EXTENSIONS"
     )
     
+    # Geography Settings
+    geography_data_dir: str = Field(default="data/processed", env="GEOGRAPHY_DATA_DIR")
+    geography_source_file: str = Field(default="data/pincode wise details.xlsx", env="GEOGRAPHY_SOURCE_FILE")
+    
     # Logging Settings
     log_dir: str = Field(default="logs", env="LOG_DIR")
     log_level: str = Field(default="INFO", env="LOG_LEVEL")
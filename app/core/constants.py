@@ -77,4 +77,46 @@ WHATSAPP_TEMPLATES = {
     "OTP": "otp_template",
     "INVOICE": "invoice_template",
     "COUPON": "coupon_template"
-}
\ No newline at end of file
+}
+
+# Indian States and Union Territories (codes are GST state codes)
+INDIAN_STATES = [
+    # States
+    {"code": "01", "name": "Jammu and Kashmir", "type": "state", "region": "North", "capital": "Srinagar"},
+    {"code": "02", "name": "Himachal Pradesh", "type": "state", "region": "North", "capital": "Shimla"},
+    {"code": "03", "name": "Punjab", "type": "state", "region": "North", "capital": "Chandigarh"},
+    {"code": "04", "name": "Chandigarh", "type": "union_territory", "region": "North", "capital": "Chandigarh"},
+    {"code": "05", "name": "Uttarakhand", "type": "state", "region": "North", "capital": "Dehradun"},
+    {"code": "06", "name": "Haryana", "type": "state", "region": "North", "capital": "Chandigarh"},
+    {"code": "07", "name": "Delhi", "type": "union_territory", "region": "North", "capital": "New Delhi"},
+    {"code": "08", "name": "Rajasthan", "type": "state", "region": "North", "capital": "Jaipur"},
+    {"code": "09", "name": "Uttar Pradesh", "type": "state", "region": "North", "capital": "Lucknow"},
+    {"code": "10", "name": "Bihar", "type": "state", "region": "East", "capital": "Patna"},
+    {"code": "11", "name": "Sikkim", "type": "state", "region": "Northeast", "capital": "Gangtok"},
+    {"code": "12", "name": "Arunachal Pradesh", "type": "state", "region": "Northeast", "capital": "Itanagar"},
+    {"code": "13", "name": "Nagaland", "type": "state", "region": "Northeast", "capital": "Kohima"},
+    {"code": "14", "name": "Manipur", "type": "state", "region": "Northeast", "capital": "Imphal"},
+    {"code": "15", "name": "Mizoram", "type": "state", "region": "Northeast", "capital": "Aizawl"},
+    {"code": "16", "name": "Tripura", "type": "state", "region": "Northeast", "capital": "Agartala"},
+    {"code": "17", "name": "Meghalaya", "type": "state", "region": "Northeast", "capital": "Shillong"},
+    {"code": "18", "name": "Assam", "type": "state", "region": "Northeast", "capital": "Dispur"},
+    {"code": "19", "name": "West Bengal", "type": "state", "region": "East", "capital": "Kolkata"},
+    {"code": "20", "name": "Jharkhand", "type": "state", "region": "East", "capital": "Ranchi"},
+    {"code": "21", "name": "Odisha", "type": "state", "region": "East", "capital": "Bhubaneswar"},
+    {"code": "22", "name": "Chhattisgarh", "type": "state", "region": "Central", "capital": "Raipur"},
+    {"code": "23", "name": "Madhya Pradesh", "type": "state", "region": "Central", "capital": "Bhopal"},
+    {"code": "24", "name": "Gujarat", "type": "state", "region": "West", "capital": "Gandhinagar"},
+    {"code": "25", "name": "Daman and Diu", "type": "union_territory", "region": "West", "capital": "Daman"},
+    {"code": "26", "name": "Dadra and Nagar Haveli", "type": "union_territory", "region": "West", "capital": "Silvassa"},
+    {"code": "27", "name": "Maharashtra", "type": "state", "region": "West", "capital": "Mumbai"},
+    {"code": "28", "name": "Andhra Pradesh", "type": "state", "region": "South", "capital": "Amaravati"},
+    {"code": "29", "name": "Karnataka", "type": "state", "region": "South", "capital": "Bangalore"},
+    {"code": "30", "name": "Goa", "type": "state", "region": "West", "capital": "Panaji"},
+    {"code": "31", "name": "Lakshadweep", "type": "union_territory", "region": "South", "capital": "Kavaratti"},
+    {"code": "32", "name": "Kerala", "type": "state", "region": "South", "capital": "Thiruvananthapuram"},
+    {"code": "33", "name": "Tamil Nadu", "type": "state", "region": "South", "capital": "Chennai"},
+    {"code": "34", "name": "Puducherry", "type": "union_territory", "region": "South", "capital": "Puducherry"},
+    {"code": "35", "name": "Andaman and Nicobar Islands", "type": "union_territory", "region": "South", "capital": "Port Blair"},
+    {"code": "36", "name": "Telangana", "type": "state", "region": "South", "capital": "Hyderabad"},
+    {"code": "37", "name": "Ladakh", "type": "union_territory", "region": "North", "capital": "Leh"},
+]
\ No newline at end of file
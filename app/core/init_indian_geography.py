@@ -4,12 +4,19 @@ Initialize Indian Geography Data
 This script populates the database with Indian states, cities, and pincodes
 """
 
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
+from typing import Dict, List
 from ..models.l10n_in import Country, IndianState, IndianCity, IndianDistrict, IndianPincode
+from ..services.l10n_in.geography_index_service import geography_index_service, GeographyIndex
+from .constants import INDIAN_STATES
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Rows per INSERT when seeding in bulk
+SEED_BATCH_SIZE = 5000
+
 def init_indian_geography_data(db: Session):
     """Initialize Indian geography data"""
     
@@ -33,67 +40,28 @@ def init_indian_geography_data(db: Session):
         db.refresh(india)
         logger.info("Created India country record")
     
-    # Indian States and Union Territories
-    indian_states = [
-        # States
-        {"code": "01", "name": "Jammu and Kashmir", "type": "state", "region": "North", "capital": "Srinagar"},
-        {"code": "02", "name": "Himachal Pradesh", "type": "state", "region": "North", "capital": "Shimla"},
-        {"code": "03", "name": "Punjab", "type": "state", "region": "North", "capital": "Chandigarh"},
-        {"code": "04", "name": "Chandigarh", "type": "union_territory", "region": "North", "capital": "Chandigarh"},
-        {"code": "05", "name": "Uttarakhand", "type": "state", "region": "North", "capital": "Dehradun"},
-        {"code": "06", "name": "Haryana", "type": "state", "region": "North", "capital": "Chandigarh"},
-        {"code": "07", "name": "Delhi", "type": "union_territory", "region": "North", "capital": "New Delhi"},
-        {"code": "08", "name": "Rajasthan", "type": "state", "region": "North", "capital": "Jaipur"},
-        {"code": "09", "name": "Uttar Pradesh", "type": "state", "region": "North", "capital": "Lucknow"},
-        {"code": "10", "name": "Bihar", "type": "state", "region": "East", "capital": "Patna"},
-        {"code": "11", "name": "Sikkim", "type": "state", "region": "Northeast", "capital": "Gangtok"},
-        {"code": "12", "name": "Arunachal Pradesh", "type": "state", "region": "Northeast", "capital": "Itanagar"},
-        {"code": "13", "name": "Nagaland", "type": "state", "region": "Northeast", "capital": "Kohima"},
-        {"code": "14", "name": "Manipur", "type": "state", "region": "Northeast", "capital": "Imphal"},
-        {"code": "15", "name": "Mizoram", "type": "state", "region": "Northeast", "capital": "Aizawl"},
-        {"code": "16", "name": "Tripura", "type": "state", "region": "Northeast", "capital": "Agartala"},
-        {"code": "17", "name": "Meghalaya", "type": "state", "region": "Northeast", "capital": "Shillong"},
-        {"code": "18", "name": "Assam", "type": "state", "region": "Northeast", "capital": "Dispur"},
-        {"code": "19", "name": "West Bengal", "type": "state", "region": "East", "capital": "Kolkata"},
-        {"code": "20", "name": "Jharkhand", "type": "state", "region": "East", "capital": "Ranchi"},
-        {"code": "21", "name": "Odisha", "type": "state", "region": "East", "capital": "Bhubaneswar"},
-        {"code": "22", "name": "Chhattisgarh", "type": "state", "region": "Central", "capital": "Raipur"},
-        {"code": "23", "name": "Madhya Pradesh", "type": "state", "region": "Central", "capital": "Bhopal"},
-        {"code": "24", "name": "Gujarat", "type": "state", "region": "West", "capital": "Gandhinagar"},
-        {"code": "25", "name": "Daman and Diu", "type": "union_territory", "region": "West", "capital": "Daman"},
-        {"code": "26", "name": "Dadra and Nagar Haveli", "type": "union_territory", "region": "West", "capital": "Silvassa"},
-        {"code": "27", "name": "Maharashtra", "type": "state", "region": "West", "capital": "Mumbai"},
-        {"code": "28", "name": "Andhra Pradesh", "type": "state", "region": "South", "capital": "Amaravati"},
-        {"code": "29", "name": "Karnataka", "type": "state", "region": "South", "capital": "Bangalore"},
-        {"code": "30", "name": "Goa", "type": "state", "region": "West", "capital": "Panaji"},
-        {"code": "31", "name": "Lakshadweep", "type": "union_territory", "region": "South", "capital": "Kavaratti"},
-        {"code": "32", "name": "Kerala", "type": "state", "region": "South", "capital": "Thiruvananthapuram"},
-        {"code": "33", "name": "Tamil Nadu", "type": "state", "region": "South", "capital": "Chennai"},
-        {"code": "34", "name": "Puducherry", "type": "union_territory", "region": "South", "capital": "Puducherry"},
-        {"code": "35", "name": "Andaman and Nicobar Islands", "type": "union_territory", "region": "South", "capital": "Port Blair"},
-        {"code": "36", "name": "Telangana", "type": "state", "region": "South", "capital": "Hyderabad"},
-        {"code": "37", "name": "Ladakh", "type": "union_territory", "region": "North", "capital": "Leh"},
-    ]
     
     # Create states
-    for state_data in indian_states:
-        existing_state = db.query(IndianState).filter(IndianState.state_code == state_data["code"]).first()
-        if not existing_state:
-            state = IndianState(
-                state_code=state_data["code"],
-                state_name=state_data["name"],
-                state_type=state_data["type"],
-                region=state_data["region"],
-                capital=state_data["capital"],
-                gst_state_code=state_data["code"],
-                gst_state_name=state_data["name"],
-                country_id=india.id,
-                is_active=True
-            )
-            db.add(state)
-            db.commit()
-            db.refresh(state)
-            logger.info(f"Created state: {state_data['name']}")
+    existing_states = {code for (code,) in db.query(IndianState.state_code).all()}
+    new_states = [
+        IndianState(
+            state_code=state_data["code"],
+            state_name=state_data["name"],
+            state_type=state_data["type"],
+            region=state_data["region"],
+            capital=state_data["capital"],
+            gst_state_code=state_data["code"],
+            gst_state_name=state_data["name"],
+            country_id=india.id,
+            is_active=True
+        )
+        for state_data in INDIAN_STATES if state_data["code"] not in existing_states
+    ]
+    if new_states:
+        db.add_all(new_states)
+        db.commit()
+        logger.info(f"Created {len(new_states)} states")
+    state_ids = dict(db.query(IndianState.state_code, IndianState.id).all())
     
     # Major Indian Cities
     major_cities = [
@@ -186,25 +154,30 @@ def init_indian_geography_data(db: Session):
     ]
     
     # Create cities
-    for city_data in major_cities:
-        state = db.query(IndianState).filter(IndianState.state_code == city_data["state_code"]).first()
-        if state:
-            existing_city = db.query(IndianCity).filter(
-                IndianCity.city_name == city_data["name"],
-                IndianCity.state_id == state.id
-            ).first()
-            if not existing_city:
-                city = IndianCity(
-                    city_name=city_data["name"],
-                    city_type=city_data["type"],
-                    is_major_city=city_data["is_major"],
-                    state_id=state.id,
-                    is_active=True
-                )
-                db.add(city)
-                db.commit()
-                db.refresh(city)
-                logger.info(f"Created city: {city_data['name']} in {state.state_name}")
+    existing_cities = set(db.query(IndianCity.city_name, IndianCity.state_id).all())
+    new_cities = [
+        IndianCity(
+            city_name=city_data["name"],
+            city_type=city_data["type"],
+            is_major_city=city_data["is_major"],
+            state_id=state_ids[city_data["state_code"]],
+            is_active=True
+        )
+        for city_data in major_cities
+        if city_data["state_code"] in state_ids
+        and (city_data["name"], state_ids[city_data["state_code"]]) not in existing_cities
+    ]
+    if new_cities:
+        db.add_all(new_cities)
+        db.commit()
+        logger.info(f"Created {len(new_cities)} cities")
+    
+    # Pincodes come from the compiled geography dataset when there is one
+    index = geography_index_service.get_index()
+    if index is not None:
+        seed_geography_from_index(db, index)
+        logger.info("Indian Geography Data initialization completed!")
+        return
     
     # Sample Pincodes for major cities
     sample_pincodes = [
@@ -242,27 +215,100 @@ def init_indian_geography_data(db: Session):
     ]
     
     # Create pincodes
+    city_ids = {(name, state_id): city_id for city_id, name, state_id in db.query(IndianCity.id, IndianCity.city_name, IndianCity.state_id).all()}
+    existing_pincodes = {pincode for (pincode,) in db.query(IndianPincode.pincode).all()}
+    new_pincodes = []
     for pincode_data in sample_pincodes:
-        state = db.query(IndianState).filter(IndianState.state_code == pincode_data["state_code"]).first()
-        city = db.query(IndianCity).filter(
-            IndianCity.city_name == pincode_data["city"],
-            IndianCity.state_id == state.id
-        ).first()
-        
-        if state and city:
-            existing_pincode = db.query(IndianPincode).filter(IndianPincode.pincode == pincode_data["pincode"]).first()
-            if not existing_pincode:
-                pincode = IndianPincode(
-                    pincode=pincode_data["pincode"],
-                    area_name=pincode_data["area"],
-                    area_type="Post Office",
-                    city_id=city.id,
-                    state_id=state.id,
-                    is_active=True
-                )
-                db.add(pincode)
-                db.commit()
-                logger.info(f"Created pincode: {pincode_data['pincode']} for {pincode_data['area']}")
+        state_id = state_ids.get(pincode_data["state_code"])
+        city_id = city_ids.get((pincode_data["city"], state_id))
+        if state_id and city_id and pincode_data["pincode"] not in existing_pincodes:
+            new_pincodes.append(IndianPincode(
+                pincode=pincode_data["pincode"],
+                area_name=pincode_data["area"],
+                area_type="Post Office",
+                city_id=city_id,
+                state_id=state_id,
+                is_active=True
+            ))
+    if new_pincodes:
+        db.add_all(new_pincodes)
+        db.commit()
+        logger.info(f"Created {len(new_pincodes)} pincodes")
     
     logger.info("Indian Geography Data initialization completed!")
-    return True
\ No newline at end of file
+
+def seed_geography_from_index(db: Session, index: GeographyIndex) -> Dict[str, int]:
+    """
+    Bulk-insert the cities and pincodes of a compiled geography dataset that
+    are not in the database yet, in one transaction. States must already
+    exist; records of states that do not are skipped.
+    """
+    
+    logger.info(f"Seeding geography from dataset {index.header['checksum'][:12]}")
+    
+    # Dataset state -> state id (0 when the state is not in the database)
+    state_ids = dict(db.query(IndianState.state_code, IndianState.id).all())
+    state_of = [state_ids.get(code, 0) for code in index.strings(index.state_code)]
+    
+    # Cities match case-insensitively (the post office data is upper case)
+    def city_ids() -> Dict:
+        return {
+            (name.casefold(), state_id): city_id
+            for city_id, name, state_id in db.query(IndianCity.id, IndianCity.city_name, IndianCity.state_id).all()
+        }
+    
+    city_names = index.strings(index.city_name)
+    city_state = [state_of[int(state)] for state in index.city_state]
+    
+    known = city_ids()
+    new_cities = []
+    for city, name in enumerate(city_names):
+        key = (name.casefold(), city_state[city])
+        if name and city_state[city] and key not in known:
+            known[key] = None
+            new_cities.append({
+                "city_name": name[:100],
+                "city_type": "city",
+                "is_major_city": False,
+                "state_id": city_state[city],
+                "is_active": True
+            })
+    _insert_batches(db, IndianCity, new_cities)
+    
+    known = city_ids()
+    city_of = [known.get((name.casefold(), city_state[city])) for city, name in enumerate(city_names)]
+    
+    # Pincodes already in the database are left as they are
+    area_names = index.strings(index.area_name)
+    existing_pincodes = {pincode for (pincode,) in db.query(IndianPincode.pincode).all()}
+    new_pincodes = []
+    for position, pincode in enumerate(index.rec_pincode.tolist()):
+        pincode = f"{pincode:06d}"
+        city = int(index.rec_city[position])
+        if pincode in existing_pincodes or not city_state[city]:
+            continue
+        
+        area = int(index.rec_area[position])
+        latitude = float(index.rec_lat[position])
+        longitude = float(index.rec_lon[position])
+        new_pincodes.append({
+            "pincode": pincode,
+            # Area-less records (district-level data) are named after their city
+            "area_name": (area_names[area] if area >= 0 else city_names[city])[:200],
+            "area_type": "Post Office" if area >= 0 else None,
+            "latitude": None if latitude != latitude else latitude,
+            "longitude": None if longitude != longitude else longitude,
+            "city_id": city_of[city],
+            "state_id": city_state[city],
+            "is_active": True
+        })
+    _insert_batches(db, IndianPincode, new_pincodes)
+    
+    db.commit()
+    logger.info(f"Created {len(new_cities)} cities and {len(new_pincodes)} pincodes from the geography dataset")
+    return {"cities": len(new_cities), "pincodes": len(new_pincodes)}
+
+def _insert_batches(db: Session, model, rows: List[Dict]):
+    """Executemany INSERTs of SEED_BATCH_SIZE rows"""
+    for start in range(0, len(rows), SEED_BATCH_SIZE):
+        db.execute(insert(model.__table__), rows[start:start + SEED_BATCH_SIZE])
@@ -0,0 +1,126 @@
+# backend/app/core/model_cache.py
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+from datetime import date
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+import threading
+import time
+import logging
+
+from .session_hooks import invalidate_after_commit
+
+logger = logging.getLogger(__name__)
+
+class ModelCache(ABC):
+    """
+    Per-process cache of values built from database rows, one per key.
+    
+    An entry is served while it is younger than the TTL, was built today and
+    was built under the current version. Saving any of the watched models
+    bumps the version, which retires every entry at once, or only the
+    entries invalidated_keys() names for the saved row; other worker
+    processes pick up changes within the TTL. Entries also expire at
+    midnight, when validity dates move.
+    
+    Subclasses implement build() and list their models in watched_models().
+    """
+    
+    def __init__(self, ttl_seconds: int = 300):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Hashable, Tuple[Any, Tuple[int, int], date, float]] = {}
+        self._version = 0
+        self._key_versions: Dict[Hashable, int] = {}
+        self._watching = False
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, db: Session, key: Hashable) -> Any:
+        """Get the cached value for key, building it on a miss"""
+        entry = self._entries.get(key)
+        if entry is not None and self._is_fresh(key, entry):
+            self.hits += 1
+            return entry[0]
+        
+        self.misses += 1
+        return self.load(db, key)
+    
+    def load(self, db: Session, key: Hashable) -> Any:
+        """Build the value for key and cache it, unless the cache was invalidated meanwhile"""
+        if not self._watching:
+            self._watch()
+        
+        version = self._current_version(key)
+        built_on = date.today()
+        loaded_at = time.monotonic()
+        value = self.build(db, key)
+        
+        with self._lock:
+            if version == self._current_version(key):
+                self._entries[key] = (value, version, built_on, loaded_at)
+        
+        return value
+    
+    @abstractmethod
+    def build(self, db: Session, key: Hashable) -> Any:
+        """Build the value for key from the database"""
+    
+    def watched_models(self) -> Iterable[type]:
+        """Models whose changes invalidate the cache (resolved on first load, so they may be imported lazily)"""
+        return ()
+    
+    def invalidated_keys(self, target) -> Optional[Iterable[Hashable]]:
+        """Keys a change to this watched row affects; None retires every entry"""
+        return None
+    
+    def invalidate(self, keys: Optional[Iterable[Hashable]] = None):
+        """Retire every cached value, or only those of the given keys"""
+        with self._lock:
+            if keys is None:
+                self._version += 1
+                self._entries.clear()
+            else:
+                for key in keys:
+                    self._key_versions[key] = self._key_versions.get(key, 0) + 1
+                    self._entries.pop(key, None)
+        logger.debug(f"{type(self).__name__} cleared {'all keys' if keys is None else keys}, version {self._version}")
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache size and hit/miss counters"""
+        return {
+            "entries": len(self._entries),
+            "version": self._version,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+    
+    def _watch(self):
+        models = tuple(self.watched_models())
+        with self._lock:
+            if self._watching:
+                return
+            for model in models:
+                for identifier in ("after_insert", "after_update", "after_delete"):
+                    event.listen(model, identifier, self._model_changed)
+            self._watching = True
+    
+    def _model_changed(self, mapper, connection, target):
+        name = f"{type(self).__name__}_{id(self)}"
+        keys = self.invalidated_keys(target)
+        if keys is None:
+            invalidate_after_commit(object_session(target), name, self.invalidate)
+        else:
+            keys = frozenset(keys)
+            invalidate_after_commit(object_session(target), f"{name}_{sorted(map(repr, keys))}", lambda: self.invalidate(keys))
+    
+    def _current_version(self, key: Hashable) -> Tuple[int, int]:
+        return self._version, self._key_versions.get(key, 0)
+    
+    def _is_fresh(self, key: Hashable, entry: Tuple[Any, Tuple[int, int], date, float]) -> bool:
+        _, version, built_on, loaded_at = entry
+        return (
+            version == self._current_version(key)
+            and built_on == date.today()
+            and time.monotonic() - loaded_at < self.ttl_seconds
+        )
@@ -0,0 +1,213 @@
+# backend/app/core/permission_cache.py
+from collections import OrderedDict
+from typing import Optional, Dict, FrozenSet
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+import threading
+import time
+import logging
+
+from ..config import settings
+from .session_hooks import invalidate_after_commit
+
+logger = logging.getLogger(__name__)
+
+class UserPrincipal:
+    """Snapshot of a user's identity, roles and permissions"""
+    
+    __slots__ = (
+        "id", "username", "email", "full_name", "company_id", "is_superuser", "is_active",
+        "role_names", "permissions", "role_version", "loaded_at"
+    )
+    
+    def __init__(self, id: int, username: str, email: str, full_name: str, company_id: Optional[int],
+                 is_superuser: bool, is_active: bool, role_names: FrozenSet[str] = frozenset(),
+                 permissions: FrozenSet[str] = frozenset(), role_version: int = 0, loaded_at: float = 0.0):
+        self.id = id
+        self.username = username
+        self.email = email
+        self.full_name = full_name
+        self.company_id = company_id
+        self.is_superuser = is_superuser
+        self.is_active = is_active
+        self.role_names = role_names
+        self.permissions = permissions
+        self.role_version = role_version
+        self.loaded_at = loaded_at
+    
+    def has_permission(self, permission_name: str) -> bool:
+        """Check if user has specific permission"""
+        return self.is_superuser or permission_name in self.permissions
+    
+    def has_role(self, role_name: str) -> bool:
+        """Check if user has specific role"""
+        return role_name in self.role_names
+
+class PermissionCache:
+    """
+    Per-process cache of user principals, keyed by user id.
+    
+    An entry is valid while it is younger than the TTL and was loaded under
+    the current role version. Changes to a user drop that user's entry; changes
+    to any role or permission bump the role version, which retires every
+    entry at once. Other worker processes pick up changes within the TTL.
+    """
+    
+    def __init__(self, ttl_seconds: int = 300, max_users: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_users = max_users
+        self._entries: "OrderedDict[int, UserPrincipal]" = OrderedDict()
+        self._user_ids: Dict[str, int] = {}
+        self._role_version = 0
+        self._tracking = False
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    @property
+    def role_version(self) -> int:
+        return self._role_version
+    
+    def get(self, user_id: int) -> Optional[UserPrincipal]:
+        """Get a valid cached principal, or None on a miss"""
+        with self._lock:
+            principal = self._entries.get(user_id)
+            if principal is None or not self._is_fresh(principal):
+                if principal is not None:
+                    self._drop(user_id)
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return principal
+    
+    def get_user_id(self, username: str) -> Optional[int]:
+        """Resolve a username seen before (tokens issued without a user id)"""
+        return self._user_ids.get(username)
+    
+    def put(self, principal: UserPrincipal):
+        """Store a principal; ignored if roles changed while it was loading"""
+        with self._lock:
+            if principal.role_version != self._role_version:
+                return
+            
+            self._drop(principal.id)
+            self._entries[principal.id] = principal
+            self._user_ids[principal.username] = principal.id
+            
+            while len(self._entries) > self.max_users:
+                oldest_id = next(iter(self._entries))
+                self._drop(oldest_id)
+    
+    def invalidate_user(self, user_id: int):
+        """Drop one user's cached principal"""
+        with self._lock:
+            self._drop(user_id)
+    
+    def invalidate_roles(self):
+        """Retire every cached principal after a role or permission change"""
+        with self._lock:
+            self._role_version += 1
+            self._entries.clear()
+            self._user_ids.clear()
+        logger.debug(f"Permission cache cleared, role version {self._role_version}")
+    
+    def clear(self):
+        """Remove all cached principals"""
+        self.invalidate_roles()
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache size and hit/miss counters"""
+        return {
+            "users": len(self._entries),
+            "role_version": self._role_version,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+    
+    def load(self, db: Session, user_id: Optional[int] = None, username: Optional[str] = None) -> Optional[UserPrincipal]:
+        """Load a principal from the database (two queries) and cache it"""
+        from ..models.core import User, Role, Permission
+        from ..models.core.user import user_roles, role_permissions
+        
+        if not self._tracking:
+            self._track_changes()
+        role_version = self._role_version
+        
+        query = db.query(User)
+        if user_id is not None:
+            user = query.filter(User.id == user_id).first()
+        else:
+            user = query.filter(User.username == username).first()
+        
+        if user is None:
+            return None
+        
+        # Roles and their permissions in one round trip
+        rows = db.query(Role.name, Permission.name).select_from(user_roles).join(
+            Role, Role.id == user_roles.c.role_id
+        ).outerjoin(
+            role_permissions, role_permissions.c.role_id == Role.id
+        ).outerjoin(
+            Permission, Permission.id == role_permissions.c.permission_id
+        ).filter(user_roles.c.user_id == user.id).all()
+        
+        principal = UserPrincipal(
+            id=user.id,
+            username=user.username,
+            email=user.email,
+            full_name=user.full_name,
+            company_id=user.company_id,
+            is_superuser=bool(user.is_superuser),
+            is_active=bool(user.is_active),
+            role_names=frozenset(role_name for role_name, _ in rows),
+            permissions=frozenset(permission_name for _, permission_name in rows if permission_name),
+            role_version=role_version,
+            loaded_at=time.monotonic()
+        )
+        
+        self.put(principal)
+        return principal
+    
+    def _track_changes(self):
+        """Invalidate on changes to users, roles and permissions
+        
+        Registered on first load rather than at import, as the models import
+        this module; nothing is cached before then.
+        """
+        from ..models.core import User, Role, Permission
+        
+        def role_changed(mapper, connection, target):
+            invalidate_after_commit(object_session(target), "permission_cache_roles", self.invalidate_roles)
+        
+        def user_changed(mapper, connection, target):
+            user_id = target.id
+            invalidate_after_commit(
+                object_session(target), f"permission_cache_user_{user_id}", lambda: self.invalidate_user(user_id)
+            )
+        
+        with self._lock:
+            if self._tracking:
+                return
+            for model, listener in ((Role, role_changed), (Permission, role_changed), (User, user_changed)):
+                for identifier in ("after_insert", "after_update", "after_delete"):
+                    event.listen(model, identifier, listener)
+            self._tracking = True
+    
+    def _is_fresh(self, principal: UserPrincipal) -> bool:
+        return (
+            principal.role_version == self._role_version
+            and time.monotonic() - principal.loaded_at < self.ttl_seconds
+        )
+    
+    def _drop(self, user_id: int):
+        principal = self._entries.pop(user_id, None)
+        if principal is not None:
+            self._user_ids.pop(principal.username, None)
+
+# Global permission cache
+permission_cache = PermissionCache(
+    ttl_seconds=settings.permission_cache_ttl_seconds,
+    max_users=settings.permission_cache_max_users
+)
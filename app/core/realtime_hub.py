@@ -0,0 +1,275 @@
+# backend/app/core/realtime_hub.py
+from typing import Optional, Dict, Set, List, Any, Iterable, Callable
+from fastapi import WebSocket
+import asyncio
+import itertools
+import logging
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+def store_topic(store_id: int) -> str:
+    return f"store:{store_id}"
+
+def session_topic(session_id: int) -> str:
+    return f"session:{session_id}"
+
+def item_topic(item_id: int) -> str:
+    return f"item:{item_id}"
+
+# Every connected client hears broadcasts
+BROADCAST_TOPIC = "all"
+
+class LocalBroker:
+    """
+    In-process broker: a published message reaches subscribers in this worker only.
+    
+    A multi-worker broker (Redis, Postgres LISTEN/NOTIFY) implements the same
+    three methods and calls hub.deliver() for every message it receives.
+    """
+    
+    def __init__(self):
+        self.hub: Optional["RealtimeHub"] = None
+    
+    async def start(self, hub: "RealtimeHub"):
+        self.hub = hub
+    
+    async def stop(self):
+        self.hub = None
+    
+    async def publish(self, topic: str, message: Dict, coalesce_key: Optional[str] = None):
+        if self.hub is not None:
+            self.hub.deliver(topic, message, coalesce_key)
+
+class HubClient:
+    """One WebSocket connection with its own bounded send queue"""
+    
+    __slots__ = ("id", "websocket", "topics", "queue", "sender", "sent", "connected_at", "info", "on_detach")
+    
+    def __init__(
+        self,
+        id: int,
+        websocket: WebSocket,
+        queue_size: int,
+        info: Optional[Dict] = None,
+        on_detach: Optional[Callable[["HubClient"], None]] = None
+    ):
+        self.id = id
+        self.websocket = websocket
+        self.topics: Set[str] = set()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.sender: Optional[asyncio.Task] = None
+        self.sent = 0
+        self.connected_at = asyncio.get_running_loop().time()
+        self.info = info or {}
+        self.on_detach = on_detach
+
+class RealtimeHub:
+    """
+    Topic-based fan-out for POS terminals and dashboards.
+    
+    Each client gets a bounded queue drained by its own sender task, so one
+    slow socket never holds up the others; a client whose queue fills up is
+    disconnected. Messages published with a coalesce key (stock levels,
+    for instance) are held for one tick and only the latest per topic and
+    key is sent. Publishing goes through the broker, so swapping LocalBroker
+    for a shared one fans out across worker processes.
+    """
+    
+    def __init__(self, broker=None, queue_size: int = 100, tick_seconds: float = 0.2, send_timeout_seconds: float = 5.0):
+        self.broker = broker or LocalBroker()
+        self.queue_size = queue_size
+        self.tick_seconds = tick_seconds
+        self.send_timeout_seconds = send_timeout_seconds
+        
+        self._clients: Dict[int, HubClient] = {}
+        self._subscriptions: Dict[str, Set[int]] = {}
+        self._pending: Dict[tuple, Dict] = {}
+        self._ids = itertools.count(1)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._flusher: Optional[asyncio.Task] = None
+        
+        self.published = 0
+        self.delivered = 0
+        self.coalesced = 0
+        self.dropped_clients = 0
+        self.send_errors = 0
+    
+    async def start(self):
+        """Bind to the running loop and start the coalescing flusher"""
+        self._loop = asyncio.get_running_loop()
+        await self.broker.start(self)
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_loop())
+    
+    async def stop(self):
+        """Stop flushing and close every client"""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        
+        for client in list(self._clients.values()):
+            await self.disconnect(client)
+        
+        await self.broker.stop()
+    
+    async def connect(
+        self,
+        websocket: WebSocket,
+        topics: Iterable[str] = (),
+        info: Optional[Dict] = None,
+        on_detach: Optional[Callable[[HubClient], None]] = None
+    ) -> HubClient:
+        """
+        Accept a socket and subscribe it to topics. on_detach(client) runs once
+        when the client leaves the hub: disconnected, dropped as a slow consumer
+        or after a failed send.
+        """
+        if self._loop is None:
+            await self.start()
+        
+        await websocket.accept()
+        
+        client = HubClient(next(self._ids), websocket, self.queue_size, info, on_detach)
+        self._clients[client.id] = client
+        for topic in (BROADCAST_TOPIC, *topics):
+            self.subscribe(client, topic)
+        
+        client.sender = asyncio.create_task(self._send_loop(client))
+        return client
+    
+    async def disconnect(self, client: HubClient):
+        """Unsubscribe a client and stop its sender"""
+        self._detach(client)
+    
+    def subscribe(self, client: HubClient, topic: str):
+        if client.id not in self._clients:
+            return
+        client.topics.add(topic)
+        self._subscriptions.setdefault(topic, set()).add(client.id)
+    
+    def unsubscribe(self, client: HubClient, topic: str):
+        client.topics.discard(topic)
+        subscribers = self._subscriptions.get(topic)
+        if subscribers is not None:
+            subscribers.discard(client.id)
+            if not subscribers:
+                del self._subscriptions[topic]
+    
+    def subscribers(self, topic: str) -> List[HubClient]:
+        return [self._clients[client_id] for client_id in self._subscriptions.get(topic, ()) if client_id in self._clients]
+    
+    async def publish(self, topic: str, message: Dict, coalesce_key: Optional[str] = None):
+        """Publish to a topic through the broker"""
+        self.published += 1
+        await self.broker.publish(topic, message, coalesce_key)
+    
+    def publish_threadsafe(self, topic: str, message: Dict, coalesce_key: Optional[str] = None):
+        """Publish from sync code running outside the event loop (worker pool threads)"""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(self.publish(topic, message, coalesce_key), loop)
+    
+    def send(self, client: HubClient, message: Dict):
+        """Queue a message for one client (replies to its own requests)"""
+        self._enqueue(client, message)
+    
+    def deliver(self, topic: str, message: Dict, coalesce_key: Optional[str] = None):
+        """Called by the broker for each message; coalesced messages wait for the next tick"""
+        if coalesce_key is not None:
+            key = (topic, coalesce_key)
+            if key in self._pending:
+                self.coalesced += 1
+            self._pending[key] = message
+            return
+        
+        for client in self.subscribers(topic):
+            self._enqueue(client, message)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Connection, queue depth and drop metrics"""
+        depths = [client.queue.qsize() for client in self._clients.values()]
+        return {
+            "connections": len(self._clients),
+            "topics": len(self._subscriptions),
+            "queue_depth_total": sum(depths),
+            "queue_depth_max": max(depths, default=0),
+            "queue_size": self.queue_size,
+            "pending_coalesced": len(self._pending),
+            "published": self.published,
+            "delivered": self.delivered,
+            "coalesced": self.coalesced,
+            "dropped_clients": self.dropped_clients,
+            "send_errors": self.send_errors
+        }
+    
+    def _detach(self, client: HubClient) -> bool:
+        if self._clients.pop(client.id, None) is None:
+            return False
+        
+        for topic in list(client.topics):
+            self.unsubscribe(client, topic)
+        
+        if client.sender is not None and client.sender is not asyncio.current_task():
+            client.sender.cancel()
+        
+        if client.on_detach is not None:
+            try:
+                client.on_detach(client)
+            except Exception as e:
+                logger.error(f"WebSocket client {client.id} detach callback failed: {str(e)}")
+        return True
+    
+    def _enqueue(self, client: HubClient, message: Dict):
+        try:
+            client.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Slow consumer: drop it rather than let it back up the store
+            if self._detach(client):
+                self.dropped_clients += 1
+                logger.warning(f"Dropping slow WebSocket client {client.id} ({client.queue.qsize()} messages queued)")
+                asyncio.ensure_future(self._close(client))
+    
+    async def _close(self, client: HubClient):
+        try:
+            await client.websocket.close(code=1013)  # Try again later
+        except Exception:
+            pass
+    
+    async def _send_loop(self, client: HubClient):
+        try:
+            while True:
+                message = await client.queue.get()
+                await asyncio.wait_for(client.websocket.send_json(message), self.send_timeout_seconds)
+                client.sent += 1
+                self.delivered += 1
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.send_errors += 1
+            logger.info(f"WebSocket client {client.id} send failed: {str(e)}")
+            self._detach(client)
+    
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.tick_seconds)
+            if not self._pending:
+                continue
+            
+            pending, self._pending = self._pending, {}
+            for (topic, _), message in pending.items():
+                for client in self.subscribers(topic):
+                    self._enqueue(client, message)
+
+# Global hub
+realtime_hub = RealtimeHub(
+    queue_size=settings.realtime_client_queue_size,
+    tick_seconds=settings.realtime_coalesce_interval_ms / 1000,
+    send_timeout_seconds=settings.realtime_send_timeout_seconds
+)
@@ -8,6 +8,7 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from ..config import settings
 from ..database import get_db
+from .permission_cache import permission_cache, UserPrincipal
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -57,32 +58,79 @@ class SecurityService:
                 detail="Could not validate credentials"
             )
 
+# Authenticated user backed by the permission cache
+class AuthenticatedUser:
+    """
+    Current user as seen by request handlers.
+    Identity fields and permission checks come from the cached principal;
+    any other attribute loads the ORM User from the request session on first use.
+    """
+    
+    _principal_fields = frozenset(("id", "username", "email", "full_name", "company_id", "is_superuser", "is_active"))
+    
+    def __init__(self, principal: UserPrincipal, db: Session):
+        object.__setattr__(self, "principal", principal)
+        object.__setattr__(self, "_db", db)
+        object.__setattr__(self, "_user", None)
+    
+    def has_permission(self, permission_name: str) -> bool:
+        """Check if user has specific permission"""
+        return self.principal.has_permission(permission_name)
+    
+    def has_role(self, role_name: str) -> bool:
+        """Check if user has specific role"""
+        return self.principal.has_role(role_name)
+    
+    def get_user(self):
+        """Get the ORM User, loading it on first access"""
+        if self._user is None:
+            from ..models.core import User
+            object.__setattr__(self, "_user", self._db.get(User, self.principal.id))
+        return self._user
+    
+    def __getattr__(self, name):
+        if name in AuthenticatedUser._principal_fields:
+            return getattr(self.principal, name)
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.get_user(), name)
+    
+    def __setattr__(self, name, value):
+        # Writes go to the ORM User so the handler's commit persists them
+        setattr(self.get_user(), name, value)
+    
+    def __repr__(self):
+        return f"<AuthenticatedUser(username='{self.principal.username}')>"
+
 # Authentication dependency
-async def get_current_user(
+def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ):
-    """Get current authenticated user"""
+    """Get current authenticated user (served from the permission cache)"""
     token = credentials.credentials
     payload = SecurityService.verify_token(token)
     
-    # Import here to avoid circular imports
-    from ..models.core import User
+    # Tokens carry the user id; older tokens only have the username
+    user_id = payload.get("uid") or permission_cache.get_user_id(payload.get("sub"))
+    principal = permission_cache.get(user_id) if user_id else None
+    
+    if principal is None:
+        principal = permission_cache.load(db, user_id=user_id, username=payload.get("sub"))
     
-    user = db.query(User).filter(User.username == payload.get("sub")).first()
-    if user is None:
+    if principal is None or principal.username != payload.get("sub"):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found"
         )
     
-    if not user.is_active:
+    if not principal.is_active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Inactive user"
         )
     
-    return user
+    return AuthenticatedUser(principal, db)
 
 # Permission checking
 def require_permission(permission: str):
@@ -94,4 +142,4 @@ def require_permission(permission: str):
                 detail=f"Not enough permissions. Required: {permission}"
             )
         return current_user
-    return permission_dependency
\ No newline at end of file
+    return permission_dependency
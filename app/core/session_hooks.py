@@ -0,0 +1,67 @@
+# backend/app/core/session_hooks.py
+"""
+Per-transaction commit callbacks.
+
+Services register a callback on the session that changed their models,
+usually from a mapper event, instead of listening to every commit of every
+session. Callbacks are keyed, so registering the same work twice in one
+transaction runs it once, and savepoints are ignored: callbacks run when
+the outermost transaction commits and are dropped when it rolls back.
+State the callbacks collect belongs in transaction_info(), which is
+discarded the same way.
+"""
+from typing import Callable
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_BEFORE_COMMIT = "before_commit_callbacks"
+_AFTER_COMMIT = "after_commit_callbacks"
+_TRANSACTION_INFO = "transaction_info"
+
+def transaction_info(session: Session) -> dict:
+    """Scratch space for the current transaction"""
+    return session.info.setdefault(_TRANSACTION_INFO, {})
+
+def on_before_commit(session: Session, key: str, callback: Callable[[Session], None]):
+    """Run callback(session) inside the transaction, just before it commits"""
+    session.info.setdefault(_BEFORE_COMMIT, {})[key] = callback
+
+def on_after_commit(session: Session, key: str, callback: Callable[[Session], None]):
+    """Run callback(session) once the transaction has committed"""
+    session.info.setdefault(_AFTER_COMMIT, {})[key] = callback
+
+def invalidate_after_commit(session: Session, key: str, invalidate: Callable[[], None]):
+    """Invalidate a cache that holds rows this session is changing"""
+    # Invalidate now and again after commit, so a concurrent request cannot
+    # re-cache the pre-commit state in between
+    invalidate()
+    on_after_commit(session, key, lambda _session: invalidate())
+
+@event.listens_for(Session, "before_commit")
+def _run_before_commit(session):
+    if session.in_nested_transaction():
+        return
+    # Flush first, so the mapper events of pending changes register their callbacks
+    session.flush()
+    callbacks = session.info.get(_BEFORE_COMMIT)
+    # A callback may flush changes that register further callbacks
+    while callbacks:
+        key = next(iter(callbacks))
+        callbacks.pop(key)(session)
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session):
+    if session.in_nested_transaction():
+        return
+    session.info.pop(_BEFORE_COMMIT, None)
+    session.info.pop(_TRANSACTION_INFO, None)
+    for callback in session.info.pop(_AFTER_COMMIT, {}).values():
+        callback(session)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_callbacks(session):
+    if session.in_nested_transaction():
+        return
+    session.info.pop(_BEFORE_COMMIT, None)
+    session.info.pop(_AFTER_COMMIT, None)
+    session.info.pop(_TRANSACTION_INFO, None)
@@ -2,11 +2,16 @@
 from sqlalchemy import create_engine, MetaData, event, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool, NullPool, QueuePool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import StaticPool, NullPool, QueuePool, AsyncAdaptedQueuePool
+from sqlalchemy.sql.expression import Select, CompoundSelect, TextClause
 from contextlib import contextmanager
+from contextvars import ContextVar
+from collections import deque
 import logging
+import threading
 from pathlib import Path
-from typing import Generator, Dict, Any
+from typing import Generator, AsyncGenerator, Callable, Dict, Any, List, Optional, TypeVar
 import asyncio
 import time
 
@@ -19,38 +24,156 @@ if settings.database_type == "sqlite":
     db_path = Path(settings.sqlite_path)
     db_path.parent.mkdir(exist_ok=True, parents=True)
 
-def create_database_engine():
+# Per-request database metrics
+class RequestDBMetrics:
+    """Database usage collected for a single request"""
+    
+    __slots__ = ("path", "checkouts", "checkout_wait", "query_count", "db_time", "elapsed")
+    
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.checkouts = 0
+        self.checkout_wait = 0.0
+        self.query_count = 0
+        self.db_time = 0.0
+        self.elapsed = 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "checkouts": self.checkouts,
+            "checkout_wait_ms": round(self.checkout_wait * 1000, 3),
+            "query_count": self.query_count,
+            "db_time_ms": round(self.db_time * 1000, 3),
+            "elapsed_ms": round(self.elapsed * 1000, 3)
+        }
+
+_request_metrics: ContextVar[Optional[RequestDBMetrics]] = ContextVar("request_db_metrics", default=None)
+_recent_request_metrics = deque(maxlen=settings.db_metrics_window)
+_metrics_lock = threading.Lock()
+
+@contextmanager
+def track_request_db_metrics(path: Optional[str] = None) -> Generator[RequestDBMetrics, None, None]:
+    """
+    Collect checkout wait, query count and DB time for the enclosed request.
+    Sync handlers run in worker threads with a copy of this context, so they
+    report into the same metrics object.
+    """
+    metrics = RequestDBMetrics(path)
+    token = _request_metrics.set(metrics)
+    start = time.perf_counter()
+    try:
+        yield metrics
+    finally:
+        metrics.elapsed = time.perf_counter() - start
+        _request_metrics.reset(token)
+        with _metrics_lock:
+            _recent_request_metrics.append(metrics)
+
+def record_checkout_wait(seconds: float):
+    """Add a connection checkout wait to the current request"""
+    metrics = _request_metrics.get()
+    if metrics is not None:
+        metrics.checkouts += 1
+        metrics.checkout_wait += seconds
+
+class _CheckoutTimingMixin:
+    """Pool mixin that times how long callers wait for a connection"""
+    
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            record_checkout_wait(time.perf_counter() - start)
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    pass
+
+class InstrumentedStaticPool(_CheckoutTimingMixin, StaticPool):
+    pass
+
+class InstrumentedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+def instrument_engine(engine):
+    """Count queries and DB time per request on the given (sync) engine"""
+    
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+    
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        metrics = _request_metrics.get()
+        if metrics is not None:
+            metrics.query_count += 1
+            metrics.db_time += elapsed
+    
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        # Failed statements never reach after_cursor_execute
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start_time"):
+            conn.info["query_start_time"].pop()
+    
+    return engine
+
+def set_sqlite_pragmas(engine):
+    """Register the SQLite optimization pragmas on every new connection"""
+    
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragma(dbapi_conn, connection_record):
+        cursor = dbapi_conn.cursor()
+        # Enable foreign key constraints
+        cursor.execute("PRAGMA foreign_keys=ON")
+        # Use WAL mode for better concurrency
+        cursor.execute("PRAGMA journal_mode=WAL")
+        # Optimize SQLite performance
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA cache_size=10000")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")  # 256MB
+        cursor.close()
+    
+    return engine
+
+def is_sqlite_memory_database(database_url: str) -> bool:
+    """In-memory SQLite lives in one connection and cannot be pooled"""
+    return ":memory:" in database_url or database_url.rstrip("/") == "sqlite:"
+
+def create_database_engine(pool_size: Optional[int] = None):
     """Create database engine with optimized configuration"""
     
     if settings.database_type == "sqlite":
         # SQLite specific settings
-        engine = create_engine(
-            settings.database_url,
+        sqlite_args = dict(
             connect_args={
                 "check_same_thread": False,
                 "timeout": 30,
                 "isolation_level": None,  # Use autocommit mode
             },
-            poolclass=StaticPool,
             pool_pre_ping=True,
             echo=settings.debug and False,  # Set to True for SQL debugging
             future=True
         )
         
+        if is_sqlite_memory_database(settings.database_url):
+            engine = create_engine(settings.database_url, poolclass=InstrumentedStaticPool, **sqlite_args)
+        else:
+            # WAL lets readers run concurrently; each pooled connection is one reader
+            engine = create_engine(
+                settings.database_url,
+                poolclass=InstrumentedQueuePool,
+                pool_size=pool_size or settings.sqlite_reader_pool_size,
+                max_overflow=0,
+                pool_timeout=30,
+                **sqlite_args
+            )
+        
         # SQLite optimization pragmas
-        @event.listens_for(engine, "connect")
-        def set_sqlite_pragma(dbapi_conn, connection_record):
-            cursor = dbapi_conn.cursor()
-            # Enable foreign key constraints
-            cursor.execute("PRAGMA foreign_keys=ON")
-            # Use WAL mode for better concurrency
-            cursor.execute("PRAGMA journal_mode=WAL")
-            # Optimize SQLite performance
-            cursor.execute("PRAGMA synchronous=NORMAL")
-            cursor.execute("PRAGMA cache_size=10000")
-            cursor.execute("PRAGMA temp_store=MEMORY")
-            cursor.execute("PRAGMA mmap_size=268435456")  # 256MB
-            cursor.close()
+        set_sqlite_pragmas(engine)
             
     elif settings.database_type == "postgresql":
         # PostgreSQL specific settings
@@ -60,7 +183,7 @@ def create_database_engine():
             max_overflow=40,
             pool_pre_ping=True,
             pool_recycle=3600,
-            poolclass=QueuePool,
+            poolclass=InstrumentedQueuePool,
             echo=settings.debug and False,
             future=True,
             connect_args={
@@ -77,19 +200,214 @@ def create_database_engine():
             future=True
         )
     
-    return engine
+    return instrument_engine(engine)
 
-# Create engine
+def create_write_engine():
+    """
+    SQLite allows a single writer at a time. Funnelling writes through one
+    pooled connection makes writers queue in the pool (visible as checkout
+    wait) instead of failing lock upgrades with "database is locked".
+    """
+    if settings.database_type != "sqlite" or is_sqlite_memory_database(settings.database_url):
+        return None
+    
+    write_engine = create_database_engine(pool_size=1)
+    
+    # pysqlite runs in autocommit mode; start real transactions on the writer so
+    # multi-statement writes (document + its number) commit or roll back together.
+    # IMMEDIATE takes the write lock up front, so other processes wait on
+    # busy_timeout instead of failing a lock upgrade mid-transaction.
+    @event.listens_for(write_engine, "begin")
+    def begin_immediate(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+    
+    return write_engine
+
+# Create engines; write_engine is None where the server handles concurrency
 engine = create_database_engine()
+write_engine = create_write_engine()
+
+def _is_read_only(clause) -> bool:
+    """True for statements that can safely run on a reader connection"""
+    if isinstance(clause, (Select, CompoundSelect)):
+        return getattr(clause, "_for_update_arg", None) is None
+    if isinstance(clause, TextClause):
+        return clause.text.lstrip()[:6].upper() in ("SELECT", "WITH")
+    return False
+
+# Writer connection whose transaction is open in the current request or thread
+_active_writer: ContextVar[Optional[Any]] = ContextVar("active_writer_connection", default=None)
+
+class RoutingSession(Session):
+    """
+    Session that sends reads to the reader pool and writes to the writer.
+    Once a transaction has written, it stays on the writer so it keeps
+    reading its own changes.
+    
+    The writer pool holds a single connection, so a session opened while
+    another session in the same context holds it (get_db_session() inside a
+    request that has written) runs on that connection, in a savepoint,
+    instead of waiting for it forever.
+    """
+    
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if write_engine is None:
+            return super().get_bind(mapper, clause=clause, **kwargs)
+        
+        if self.info.get("use_writer"):
+            return write_engine
+        
+        outer = _active_writer.get()
+        if outer is not None and not outer.closed and outer.in_transaction():
+            return outer
+        
+        if self._flushing or (clause is not None and not _is_read_only(clause)):
+            self.info["use_writer"] = True
+            return write_engine
+        
+        # Reads, and lookups without a statement (dialect checks), stay on the readers
+        return engine
+
+@event.listens_for(RoutingSession, "after_begin")
+def track_writer_connection(session, transaction, connection):
+    if write_engine is not None and connection.engine is write_engine and _active_writer.get() is None:
+        _active_writer.set(connection)
+        session.info["writer_connection"] = connection
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def reset_session_routing(session, transaction):
+    if transaction.parent is None:
+        session.info.pop("use_writer", None)
+        connection = session.info.pop("writer_connection", None)
+        if connection is not None and _active_writer.get() is connection:
+            _active_writer.set(None)
 
 # Create session factory
 SessionLocal = sessionmaker(
+    class_=RoutingSession,
     autocommit=False,
     autoflush=False,
     bind=engine,
-    expire_on_commit=False
+    expire_on_commit=False,
+    # Sessions joining the outer writer connection commit into a savepoint
+    join_transaction_mode="create_savepoint"
 )
 
+def get_async_database_url(database_url: str) -> str:
+    """Map a sync database URL onto its async driver equivalent"""
+    if settings.async_database_url:
+        return settings.async_database_url
+    
+    for sync_prefix, async_prefix in (
+        ("sqlite:///", "sqlite+aiosqlite:///"),
+        ("postgresql+psycopg2://", "postgresql+asyncpg://"),
+        ("postgresql://", "postgresql+asyncpg://"),
+    ):
+        if database_url.startswith(sync_prefix):
+            return async_prefix + database_url[len(sync_prefix):]
+    
+    return database_url
+
+def create_async_database_engine(pool_size: Optional[int] = None):
+    """Create the async engine used by async handlers (aiosqlite / asyncpg)"""
+    
+    url = get_async_database_url(settings.database_url)
+    
+    if settings.database_type == "sqlite":
+        # Same reader pool sizing as the sync engine; in-memory databases keep the default pool
+        pool_args = {} if is_sqlite_memory_database(url) else dict(
+            poolclass=InstrumentedAsyncQueuePool,
+            pool_size=pool_size or settings.sqlite_reader_pool_size,
+            max_overflow=0,
+            pool_timeout=30
+        )
+        async_engine = create_async_engine(
+            url,
+            connect_args={"timeout": 30},
+            echo=settings.debug and False,
+            **pool_args
+        )
+        
+        # Same pragmas as the sync engine
+        @event.listens_for(async_engine.sync_engine, "connect")
+        def set_async_sqlite_pragma(dbapi_conn, connection_record):
+            cursor = dbapi_conn.cursor()
+            cursor.execute("PRAGMA foreign_keys=ON")
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA cache_size=10000")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            cursor.close()
+    
+    elif settings.database_type == "postgresql":
+        async_engine = create_async_engine(
+            url,
+            pool_size=20,
+            max_overflow=40,
+            pool_pre_ping=True,
+            pool_recycle=3600,
+            poolclass=InstrumentedAsyncQueuePool,
+            echo=settings.debug and False,
+            connect_args={"timeout": 30},
+        )
+    else:
+        async_engine = create_async_engine(url, echo=settings.debug and False)
+    
+    instrument_engine(async_engine.sync_engine)
+    return async_engine
+
+def create_async_write_engine():
+    """
+    Async counterpart of create_write_engine: one connection that starts its
+    transactions with BEGIN IMMEDIATE. aiosqlite otherwise begins deferred
+    and upgrades to the write lock mid-transaction, failing with "database
+    is locked" while the sync writer holds it; this way async and sync
+    writers wait for each other on busy_timeout instead.
+    """
+    if settings.database_type != "sqlite" or is_sqlite_memory_database(settings.database_url):
+        return None
+    
+    async_write_engine = create_async_database_engine(pool_size=1)
+    
+    @event.listens_for(async_write_engine.sync_engine, "connect")
+    def disable_implicit_begin(dbapi_conn, connection_record):
+        dbapi_conn.isolation_level = None
+    
+    @event.listens_for(async_write_engine.sync_engine, "begin")
+    def begin_immediate(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+    
+    return async_write_engine
+
+# Async engines; None when the async driver is not installed
+try:
+    async_engine = create_async_database_engine()
+    async_write_engine = create_async_write_engine()
+except ImportError as e:
+    logger.warning(f"Async database driver unavailable, async sessions disabled: {e}")
+    async_engine = async_write_engine = None
+
+class AsyncRoutingSession(RoutingSession):
+    """Sync side of AsyncSession: the same read/write routing over the async engines"""
+    
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if async_write_engine is None:
+            return super(RoutingSession, self).get_bind(mapper, clause=clause, **kwargs)
+        
+        if self.info.get("use_writer") or self._flushing or (clause is not None and not _is_read_only(clause)):
+            self.info["use_writer"] = True
+            return async_write_engine.sync_engine
+        
+        return async_engine.sync_engine
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    sync_session_class=AsyncRoutingSession,
+    autoflush=False,
+    expire_on_commit=False
+) if async_engine is not None else None
+
 # Base class for models
 Base = declarative_base()
 
@@ -141,13 +459,11 @@ class DatabaseHealthCheck:
 # Dependency to get DB session
 def get_db() -> Generator[Session, None, None]:
     """
-    Get database session with automatic cleanup
-    Includes retry logic and connection validation
+    Get database session with automatic cleanup.
+    Connections are validated by the pool's pre-ping on checkout.
     """
     db = SessionLocal()
     try:
-        # Test connection before yielding
-        db.execute(text("SELECT 1"))
         yield db
     except Exception as e:
         logger.error(f"Database session error: {e}")
@@ -156,6 +472,49 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+# Async dependency for handlers that must not block the event loop
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get async database session with automatic cleanup.
+    Use with `async def` handlers; sync handlers keep using get_db.
+    """
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database driver is not installed")
+    
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception as e:
+            logger.error(f"Async database session error: {e}")
+            await db.rollback()
+            raise
+
+T = TypeVar("T")
+
+async def run_sync_service(db: AsyncSession, func: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Migration shim: run Session-based service code on an AsyncSession.
+    
+    The sync code runs on the async connection, so its I/O is awaited rather
+    than blocking the event loop. Results must not lazy-load afterwards.
+    """
+    return await db.run_sync(lambda session: func(session, *args, **kwargs))
+
+def configure_thread_pool(size: Optional[int] = None):
+    """Bound the worker pool FastAPI uses for sync (def) handlers and dependencies"""
+    from anyio import to_thread
+    
+    limiter = to_thread.current_default_thread_limiter()
+    limiter.total_tokens = size or settings.db_thread_pool_size
+    logger.info(f"Sync handler thread pool size: {limiter.total_tokens}")
+
+async def dispose_async_engine():
+    """Close pooled async connections on shutdown"""
+    if async_engine is not None:
+        await async_engine.dispose()
+    if async_write_engine is not None:
+        await async_write_engine.dispose()
+
 # Context manager for database session
 @contextmanager
 def get_db_session() -> Generator[Session, None, None]:
@@ -175,21 +534,25 @@ def get_db_session() -> Generator[Session, None, None]:
 
 # Async context manager for database session
 class AsyncDatabaseSession:
-    """Async database session manager"""
+    """Async database session manager with automatic transaction management"""
     
     def __init__(self):
         self.db = None
     
-    async def __aenter__(self) -> Session:
-        self.db = SessionLocal()
+    async def __aenter__(self) -> AsyncSession:
+        if AsyncSessionLocal is None:
+            raise RuntimeError("Async database driver is not installed")
+        self.db = AsyncSessionLocal()
         return self.db
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if exc_type:
-            self.db.rollback()
-        else:
-            self.db.commit()
-        self.db.close()
+        try:
+            if exc_type:
+                await self.db.rollback()
+            else:
+                await self.db.commit()
+        finally:
+            await self.db.close()
 
 # Database initialization functions
 def create_tables():
@@ -377,17 +740,73 @@ def create_backup():
         raise
 
 # Connection pool monitoring
+def _pool_snapshot(pool) -> Dict[str, Any]:
+    """Checkout counters for a single pool (StaticPool/NullPool report what they can)"""
+    if not isinstance(pool, QueuePool):
+        return {"pool_class": type(pool).__name__}
+    
+    return {
+        "pool_class": type(pool).__name__,
+        "pool_size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "total_connections": pool.checkedin() + pool.checkedout()
+    }
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def get_request_metrics_summary(slowest: int = 5) -> Dict[str, Any]:
+    """
+    Aggregate recent per-request DB metrics.
+    A high checkout_wait_share means requests wait for connections (pool
+    starvation); a low share with high db_time means the queries are slow.
+    """
+    with _metrics_lock:
+        samples = list(_recent_request_metrics)
+    
+    if not samples:
+        return {"requests": 0}
+    
+    count = len(samples)
+    waits = sorted(m.checkout_wait for m in samples)
+    db_times = sorted(m.db_time for m in samples)
+    queries = [m.query_count for m in samples]
+    total_wait = sum(waits)
+    total_db_time = sum(db_times)
+    
+    return {
+        "requests": count,
+        "avg_checkout_wait_ms": round(total_wait / count * 1000, 3),
+        "p95_checkout_wait_ms": round(_percentile(waits, 95) * 1000, 3),
+        "max_checkout_wait_ms": round(waits[-1] * 1000, 3),
+        "avg_queries": round(sum(queries) / count, 2),
+        "max_queries": max(queries),
+        "avg_db_time_ms": round(total_db_time / count * 1000, 3),
+        "p95_db_time_ms": round(_percentile(db_times, 95) * 1000, 3),
+        "checkout_wait_share": round(total_wait / (total_wait + total_db_time), 4) if total_wait + total_db_time else 0.0,
+        "slowest_requests": [
+            m.to_dict()
+            for m in sorted(samples, key=lambda m: m.checkout_wait + m.db_time, reverse=True)[:slowest]
+        ]
+    }
+
 def get_pool_status() -> Dict[str, Any]:
-    """Get connection pool status"""
+    """Get connection pool status and recent per-request DB metrics"""
     try:
-        pool = engine.pool
-        return {
-            "pool_size": pool.size(),
-            "checked_in": pool.checkedin(),
-            "checked_out": pool.checkedout(),
-            "overflow": pool.overflow(),
-            "total_connections": pool.checkedin() + pool.checkedout()
-        }
+        status = _pool_snapshot(engine.pool)
+        if write_engine is not None:
+            status["writer"] = _pool_snapshot(write_engine.pool)
+        if async_engine is not None:
+            status["async"] = _pool_snapshot(async_engine.sync_engine.pool)
+        if async_write_engine is not None:
+            status["async_writer"] = _pool_snapshot(async_write_engine.sync_engine.pool)
+        status["requests"] = get_request_metrics_summary()
+        return status
     except Exception as e:
         return {"error": str(e)}
 
@@ -446,10 +865,19 @@ class DatabasePerformanceMonitor:
 # Export commonly used objects
 __all__ = [
     "engine",
+    "write_engine",
+    "async_engine",
+    "async_write_engine",
     "SessionLocal", 
+    "RoutingSession",
+    "AsyncSessionLocal",
     "Base",
     "metadata",
     "get_db",
+    "get_async_db",
+    "run_sync_service",
+    "configure_thread_pool",
+    "dispose_async_engine",
     "get_db_session",
     "AsyncDatabaseSession",
     "create_tables",
@@ -462,6 +890,8 @@ __all__ = [
     "vacuum_database",
     "create_backup",
     "get_pool_status",
+    "get_request_metrics_summary",
+    "track_request_db_metrics",
     "run_migrations",
     "DatabasePerformanceMonitor"
 ]
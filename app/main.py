@@ -20,7 +20,11 @@ from typing import Dict, Any
 sys.path.append(str(Path(__file__).parent))
 
 from .config import settings
-from .database import create_tables, get_db, engine, Base, check_database_connection
+from .core.realtime_hub import realtime_hub
+from .database import (
+    create_tables, get_db, get_db_session, engine, Base, check_database_connection,
+    configure_thread_pool, dispose_async_engine, get_pool_status, track_request_db_metrics
+)
 from .api.endpoints import (
     # Core endpoints
     auth, setup, companies, settings as settings_api, payments, expenses, reports, backup, gst, discount_management, report_studio, system_integration, whatsapp, database_setup,
@@ -150,12 +154,62 @@ async def health_check_task():
             logger.error(f"Health check error: {e}")
             await asyncio.sleep(300)
 
+# Outbox worker
+async def outbox_worker_task():
+    """Drain post-commit integration events in batches"""
+    from .services.core.outbox_service import outbox_service
+    from .services.pos.pos_real_time_integration_service import pos_real_time_integration_service
+    pos_real_time_integration_service.register_outbox_handlers()
+    
+    def purge_processed():
+        with get_db_session() as db:
+            return outbox_service.purge_processed(db, settings.outbox_retention_days)
+    
+    last_purge = 0.0
+    while True:
+        try:
+            result = await asyncio.to_thread(outbox_service.process_batch)
+            
+            if time.time() - last_purge > 3600:
+                await asyncio.to_thread(purge_processed)
+                last_purge = time.time()
+            
+            # A full batch means there is more waiting
+            if result['claimed'] < outbox_service.batch_size:
+                await asyncio.sleep(settings.outbox_poll_interval_seconds)
+        except asyncio.CancelledError:
+            break
+        except Exception as e:
+            logger.error(f"Outbox worker error: {e}")
+            await asyncio.sleep(settings.outbox_poll_interval_seconds * 10)
+
+# Report scheduler
+async def report_scheduler_task():
+    """Hand due report schedules to the scheduler's worker pool"""
+    from .services.core.report_scheduler_service import report_scheduler_service
+    
+    try:
+        while True:
+            try:
+                await asyncio.to_thread(report_scheduler_service.dispatch_due)
+                await asyncio.sleep(settings.report_scheduler_poll_seconds)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Report scheduler error: {e}")
+                await asyncio.sleep(settings.report_scheduler_poll_seconds * 10)
+    finally:
+        report_scheduler_service.shutdown()
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown events"""
     # Startup
     logger.info(f"🚀 Starting {settings.app_name} v{settings.app_version}")
     
+    # Sync handlers run in a bounded worker pool so they never block the event loop
+    configure_thread_pool()
+    
     # Check database connection
     if not check_database_connection():
         logger.error("❌ Database connection failed!")
@@ -193,6 +247,19 @@ async def lifespan(app: FastAPI):
     health_task = asyncio.create_task(health_check_task())
     logger.info("✅ Health monitoring started")
     
+    outbox_task = None
+    if settings.outbox_enabled:
+        outbox_task = asyncio.create_task(outbox_worker_task())
+        logger.info("✅ Outbox worker started")
+    
+    scheduler_task = None
+    if settings.report_scheduler_enabled:
+        scheduler_task = asyncio.create_task(report_scheduler_task())
+        logger.info("✅ Report scheduler started")
+    
+    await realtime_hub.start()
+    logger.info("✅ Real-time hub started")
+    
     # Print startup message
     print("\n" + "="*60)
     print(f"🎉 {settings.app_name.upper()} STARTED SUCCESSFULLY")
@@ -228,6 +295,24 @@ async def lifespan(app: FastAPI):
         except asyncio.CancelledError:
             pass
     
+    if outbox_task:
+        outbox_task.cancel()
+        try:
+            await outbox_task
+        except asyncio.CancelledError:
+            pass
+    
+    if scheduler_task:
+        scheduler_task.cancel()
+        try:
+            await scheduler_task
+        except asyncio.CancelledError:
+            pass
+    
+    await realtime_hub.stop()
+    
+    await dispose_async_engine()
+    
     logger.info("✅ ERP System shutdown complete")
 
 # Create FastAPI app with lifespan
@@ -289,11 +374,16 @@ async def log_requests(request: Request, call_next):
     # Log request
     logger.info(f"🔵 {request.method} {request.url.path} - {request.client.host}")
     
-    response = await call_next(request)
+    with track_request_db_metrics(request.url.path) as db_metrics:
+        response = await call_next(request)
     
     # Log response
     process_time = time.time() - start_time
-    logger.info(f"🔴 {response.status_code} {request.url.path} - {process_time:.3f}s")
+    logger.info(
+        f"🔴 {response.status_code} {request.url.path} - {process_time:.3f}s "
+        f"(db: {db_metrics.query_count} queries, {db_metrics.db_time:.3f}s, "
+        f"pool wait {db_metrics.checkout_wait:.3f}s)"
+    )
     
     # Add processing time header
     response.headers["X-Process-Time"] = str(process_time)
@@ -347,7 +437,8 @@ async def health_check():
         "version": settings.app_version,
         "database": {
             "status": "connected" if check_database_connection() else "disconnected",
-            "type": settings.database_type
+            "type": settings.database_type,
+            "pool": get_pool_status()
         },
         "services": {
             "backup_service": "active" if settings.backup_enabled else "disabled",
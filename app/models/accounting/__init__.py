@@ -2,6 +2,7 @@
 from .double_entry_accounting import (
     JournalEntry,
     JournalEntryItem,
+    AccountBalanceSnapshot,
     TrialBalance,
     BalanceSheet,
     ProfitLossStatement,
@@ -71,6 +72,7 @@ __all__ = [
     # Double Entry Accounting
     "JournalEntry",
     "JournalEntryItem", 
+    "AccountBalanceSnapshot",
     "TrialBalance",
     "BalanceSheet",
     "ProfitLossStatement",
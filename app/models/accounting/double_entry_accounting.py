@@ -1,5 +1,5 @@
 # backend/app/models/double_entry_accounting.py
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Numeric, Date, JSON
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Numeric, Date, JSON, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..base import BaseModel
@@ -19,6 +19,7 @@ class JournalEntry(BaseModel):
     status = Column(String(20), default='draft')  # draft, posted, cancelled
     is_reversed = Column(Boolean, default=False)
     reversed_entry_id = Column(Integer, ForeignKey('journal_entry.id'), nullable=True)
+    balance_snapshot_at = Column(DateTime, nullable=True, index=True)  # Set once folded into AccountBalanceSnapshot
     notes = Column(Text, nullable=True)
     
     # Relationships
@@ -65,6 +66,26 @@ class AccountBalance(BaseModel):
     def __repr__(self):
         return f"<AccountBalance(account_id={self.account_id}, balance={self.current_balance})>"
 
+class AccountBalanceSnapshot(BaseModel):
+    """Materialized debit/credit totals per account for one day or one month"""
+    __tablename__ = "account_balance_snapshot"
+    __table_args__ = (
+        UniqueConstraint('company_id', 'account_id', 'period_type', 'period_start', name='uq_account_balance_snapshot_period'),
+    )
+    
+    account_id = Column(Integer, ForeignKey('chart_of_account.id'), nullable=False, index=True)
+    period_type = Column(String(10), nullable=False)  # day, month
+    period_start = Column(Date, nullable=False, index=True)
+    debit_total = Column(Numeric(15, 2), default=0)
+    credit_total = Column(Numeric(15, 2), default=0)
+    transaction_count = Column(Integer, default=0)
+    
+    # Relationships
+    account = relationship("ChartOfAccount")
+    
+    def __repr__(self):
+        return f"<AccountBalanceSnapshot(account_id={self.account_id}, {self.period_type}='{self.period_start}')>"
+
 class TrialBalance(BaseModel):
     """Trial balance management"""
     __tablename__ = "trial_balance"
@@ -49,6 +49,15 @@ from .gst_state_codes import (
     GSTStateCode
 )
 
+from .outbox import (
+    IntegrationOutbox
+)
+
+from .gst_period_summary import (
+    GSTPeriodSummary,
+    GSTDocumentContribution
+)
+
 __all__ = [
     # Company Models
     "Company",
@@ -90,5 +99,12 @@ __all__ = [
     "ReportParameter",
     
     # GST Models
-    "GSTStateCode"
+    "GSTStateCode",
+    
+    # Outbox Models
+    "IntegrationOutbox",
+    
+    # GST Summary Models
+    "GSTPeriodSummary",
+    "GSTDocumentContribution"
 ]
\ No newline at end of file
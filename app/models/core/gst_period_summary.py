@@ -0,0 +1,47 @@
+# backend/app/models/core/gst_period_summary.py
+from sqlalchemy import Column, Integer, String, Numeric
+from .base import BaseModel
+
+class GSTPeriodSummary(BaseModel):
+    """Monthly GST totals per rate, HSN, place of supply and supply type (one row per cell)"""
+    __tablename__ = "gst_period_summary"
+    
+    # Cell dimensions
+    cell_key = Column(String(120), unique=True, nullable=False)  # company|period|direction|rate|hsn|pos|supply type
+    period = Column(String(7), nullable=False, index=True)  # YYYY-MM
+    direction = Column(String(10), nullable=False)  # outward (sales), inward (purchases)
+    gst_rate = Column(Numeric(5, 2), nullable=False)
+    hsn_code = Column(String(20), nullable=False, default='')
+    place_of_supply = Column(String(2), nullable=False, default='')  # State code
+    supply_type = Column(String(10), nullable=False)  # B2B, B2C; RCM for reverse charge purchases
+    
+    # Totals
+    taxable_amount = Column(Numeric(15, 2), default=0, nullable=False)
+    cgst_amount = Column(Numeric(15, 2), default=0, nullable=False)
+    sgst_amount = Column(Numeric(15, 2), default=0, nullable=False)
+    igst_amount = Column(Numeric(15, 2), default=0, nullable=False)
+    cess_amount = Column(Numeric(15, 2), default=0, nullable=False)
+    line_count = Column(Integer, default=0, nullable=False)
+    document_count = Column(Integer, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f"<GSTPeriodSummary(cell='{self.cell_key}', taxable={self.taxable_amount})>"
+
+class GSTDocumentContribution(BaseModel):
+    """What one invoice or bill currently adds to a summary cell; diffed when the document changes"""
+    __tablename__ = "gst_document_contribution"
+    
+    document_type = Column(String(20), nullable=False)  # sale_invoice, purchase_bill
+    document_id = Column(Integer, nullable=False, index=True)
+    cell_key = Column(String(120), nullable=False)
+    period = Column(String(7), nullable=False, index=True)
+    
+    taxable_amount = Column(Numeric(15, 2), default=0, nullable=False)
+    cgst_amount = Column(Numeric(15, 2), default=0, nullable=False)
+    sgst_amount = Column(Numeric(15, 2), default=0, nullable=False)
+    igst_amount = Column(Numeric(15, 2), default=0, nullable=False)
+    cess_amount = Column(Numeric(15, 2), default=0, nullable=False)
+    line_count = Column(Integer, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f"<GSTDocumentContribution({self.document_type} {self.document_id} -> '{self.cell_key}')>"
@@ -0,0 +1,27 @@
+# backend/app/models/core/outbox.py
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON
+from datetime import datetime
+from .base import BaseModel
+
+class IntegrationOutbox(BaseModel):
+    """Post-commit integration event, written in the same transaction as its document"""
+    __tablename__ = "integration_outbox"
+    
+    # Event details
+    topic = Column(String(50), nullable=False, index=True)  # pos.loyalty, pos.accounting, pos.customer, pos.sales
+    aggregate_type = Column(String(50), nullable=False)  # pos_transaction
+    aggregate_id = Column(Integer, nullable=False, index=True)
+    idempotency_key = Column(String(150), unique=True, nullable=False)
+    payload = Column(JSON, nullable=True)
+    
+    # Processing state
+    status = Column(String(20), default='pending', nullable=False, index=True)  # pending, processing, done, failed
+    attempts = Column(Integer, default=0, nullable=False)
+    available_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    locked_at = Column(DateTime, nullable=True)
+    locked_by = Column(String(100), nullable=True)
+    processed_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    
+    def __repr__(self):
+        return f"<IntegrationOutbox(topic='{self.topic}', aggregate_id={self.aggregate_id}, status='{self.status}')>"
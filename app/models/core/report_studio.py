@@ -126,7 +126,7 @@ class ReportSchedule(BaseModel):
     file_format = Column(String(20), default='pdf')
     is_active = Column(Boolean, default=True)
     last_run = Column(DateTime, nullable=True)
-    next_run = Column(DateTime, nullable=True)
+    next_run = Column(DateTime, nullable=True, index=True)
     run_count = Column(Integer, default=0)
     success_count = Column(Integer, default=0)
     failure_count = Column(Integer, default=0)
@@ -143,10 +143,20 @@ class ReportScheduleLog(BaseModel):
     """Report schedule execution log"""
     __tablename__ = "report_schedule_log"
     
-    schedule_id = Column(Integer, ForeignKey('report_schedule.id'), nullable=False)
+    schedule_id = Column(Integer, ForeignKey('report_schedule.id'), nullable=False, index=True)
     execution_date = Column(DateTime, default=datetime.utcnow)
     status = Column(String(20), nullable=False)  # success, failed, running
     execution_time = Column(Numeric(10, 3), nullable=True)  # in seconds
+    instance_id = Column(Integer, ForeignKey('report_instance.id'), nullable=True, index=True)
+    due_at = Column(DateTime, nullable=True)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    wait_time = Column(Numeric(10, 3), nullable=True)  # due to started, in seconds
+    query_time = Column(Numeric(10, 3), nullable=True)  # in seconds
+    export_time = Column(Numeric(10, 3), nullable=True)  # in seconds
+    row_count = Column(Integer, nullable=True)
+    refresh_mode = Column(String(20), nullable=True)  # full, incremental, shared
+    watermark = Column(Date, nullable=True)  # latest partition date covered
     file_path = Column(String(500), nullable=True)
     file_size = Column(Integer, nullable=True)
     email_sent = Column(Boolean, default=False)
@@ -23,7 +23,7 @@ class StockLocation(BaseModel):
 class StockItem(BaseModel):
     __tablename__ = "stock_item"
     
-    item_id = Column(Integer, ForeignKey('item.id'), nullable=False)
+    item_id = Column(Integer, ForeignKey('item.id'), nullable=False, index=True)
     location_id = Column(Integer, ForeignKey('stock_location.id'), nullable=False)
     
     # Stock quantities
@@ -57,6 +57,8 @@ class PurchaseExcelImportItem(BaseModel):
     error_message = Column(Text, nullable=True)
     matched_item_id = Column(Integer, ForeignKey('item.id'), nullable=True)
     matched_supplier_id = Column(Integer, ForeignKey('supplier.id'), nullable=True)
+    match_confidence = Column(Numeric(5, 2), nullable=True)  # 0-100, 100 for exact matches
+    match_method = Column(String(20), nullable=True)  # barcode, item_code, name, fuzzy_name
     
     # Relationships
     import_record = relationship("PurchaseExcelImport", back_populates="import_items")
@@ -51,7 +51,7 @@ class PurchaseBillItem(BaseModel):
     """Purchase bill line items"""
     __tablename__ = "purchase_bill_item"
     
-    purchase_bill_id = Column(Integer, ForeignKey('purchase_bill.id'), nullable=False)
+    purchase_bill_id = Column(Integer, ForeignKey('purchase_bill.id'), nullable=False, index=True)
     
     # Item Information
     barcode = Column(String(50), nullable=False)
@@ -3,6 +3,7 @@ from .enhanced_sales import (
     SaleChallan,
     SaleChallanItem,
     BillSeries,
+    BillNumberBlock,
     PaymentMode,
     Staff,
     StaffTarget,
@@ -65,6 +66,7 @@ __all__ = [
     "SaleChallan",
     "SaleChallanItem",
     "BillSeries",
+    "BillNumberBlock",
     "PaymentMode", 
     "Staff",
     "StaffTarget",
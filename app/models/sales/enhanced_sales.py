@@ -92,20 +92,44 @@ class BillSeries(BaseModel):
     number_length = Column(Integer, default=6)
     is_active = Column(Boolean, default=True)
     is_default = Column(Boolean, default=False)
+    is_gapless = Column(Boolean, default=False)  # GST invoices: numbers allocated inside the document's transaction
+    block_size = Column(Integer, default=0)  # Numbers pre-allocated per POS session (0 = no blocks)
     notes = Column(Text, nullable=True)
     
     # Relationships
     bills = relationship("SaleBill", back_populates="bill_series")
     purchase_bills = relationship("PurchaseBill", back_populates="bill_series")
+    number_blocks = relationship("BillNumberBlock", back_populates="series")
     
     def __repr__(self):
         return f"<BillSeries(name='{self.series_name}', code='{self.series_code}')>"
     
-    def generate_number(self):
-        """Generate next bill number"""
-        self.current_number += 1
-        number_str = str(self.current_number).zfill(self.number_length)
+    def format_number(self, number: int) -> str:
+        """Format a sequence number with the series prefix, padding and suffix"""
+        number_str = str(number).zfill(self.number_length or 0)
         return f"{self.prefix}{number_str}{self.suffix or ''}"
+    
+    def generate_number(self):
+        """Generate next bill number (unlocked; use document_number_service for concurrent allocation)"""
+        self.current_number = (self.current_number or 0) + 1
+        return self.format_number(self.current_number)
+
+class BillNumberBlock(BaseModel):
+    """Range of bill numbers pre-allocated to a POS session"""
+    __tablename__ = "bill_number_block"
+    
+    series_id = Column(Integer, ForeignKey('bill_series.id'), nullable=False, index=True)
+    pos_session_id = Column(Integer, nullable=False, index=True)
+    start_number = Column(Integer, nullable=False)
+    end_number = Column(Integer, nullable=False)
+    next_number = Column(Integer, nullable=False)
+    status = Column(String(20), default='open')  # open, exhausted, released
+    
+    # Relationships
+    series = relationship("BillSeries", back_populates="number_blocks")
+    
+    def __repr__(self):
+        return f"<BillNumberBlock(series_id={self.series_id}, range={self.start_number}-{self.end_number})>"
 
 class PaymentMode(BaseModel):
     """Payment mode management"""
@@ -401,7 +425,7 @@ class SaleInvoiceItem(BaseModel):
     """Individual items in sale invoice with Indian GST compliance"""
     __tablename__ = "sale_invoice_item"
     
-    invoice_id = Column(Integer, ForeignKey('sale_invoice.id'), nullable=False)
+    invoice_id = Column(Integer, ForeignKey('sale_invoice.id'), nullable=False, index=True)
     item_id = Column(Integer, ForeignKey('item.id'), nullable=False)
     variant_id = Column(Integer, ForeignKey('inventory_variant.id'), nullable=True)
     
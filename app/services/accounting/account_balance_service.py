@@ -1,7 +1,8 @@
 # backend/app/services/account_balance_service.py
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc, asc
-from typing import Optional, List, Dict, Tuple
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy import and_, or_, func, desc, asc, event, inspect, select
+from sqlalchemy.exc import IntegrityError
+from typing import Optional, List, Dict, Tuple, Iterable
 from decimal import Decimal
 from datetime import datetime, date, timedelta
 import json
@@ -10,7 +11,8 @@ import logging
 from ..models.core import Company, ChartOfAccount
 from ..models.sales import SalesInvoice, SalesInvoiceItem
 from ..models.purchase import PurchaseBill, PurchaseBillItem
-from ..models.accounting import JournalEntry, JournalEntryItem, AccountBalance
+from ..models.accounting import JournalEntry, JournalEntryItem, AccountBalance, AccountBalanceSnapshot
+from ...core.session_hooks import on_before_commit, transaction_info
 
 logger = logging.getLogger(__name__)
 
@@ -20,17 +22,418 @@ class AccountBalanceService:
     def __init__(self):
         pass
     
-    def calculate_account_balance(
-        self, 
-        db: Session, 
+    # Balance snapshots
+    @staticmethod
+    def _month_start(value: date) -> date:
+        return value.replace(day=1)
+    
+    @staticmethod
+    def _is_debit_normal(account_type: str) -> bool:
+        """Assets and Expenses: Debit increases, Credit decreases"""
+        return (account_type or '').lower() in ('asset', 'expense')
+    
+    def _signed_balance(self, account_type: str, debit: Decimal, credit: Decimal) -> Decimal:
+        if self._is_debit_normal(account_type):
+            return debit - credit
+        return credit - debit
+    
+    def apply_entries_to_snapshots(
+        self,
+        db: Session,
+        company_id: int,
+        entry_ids: List[int]
+    ) -> int:
+        """Fold posted journal entries into the daily and monthly balance snapshots
+        
+        Entries already folded in are skipped, so calling this twice is harmless.
+        Does not commit; callers commit together with the posting itself.
+        """
+        
+        if not entry_ids:
+            return 0
+        
+        pending_ids = [
+            entry_id for (entry_id,) in db.query(JournalEntry.id).filter(
+                JournalEntry.id.in_(entry_ids),
+                JournalEntry.company_id == company_id,
+                JournalEntry.status == 'posted',
+                JournalEntry.balance_snapshot_at.is_(None)
+            ).all()
+        ]
+        
+        if not pending_ids:
+            return 0
+        
+        movements = db.query(
+            JournalEntryItem.account_id,
+            JournalEntry.entry_date,
+            func.coalesce(func.sum(JournalEntryItem.debit_amount), 0),
+            func.coalesce(func.sum(JournalEntryItem.credit_amount), 0),
+            func.count(JournalEntryItem.id)
+        ).join(JournalEntry, JournalEntryItem.entry_id == JournalEntry.id).filter(
+            JournalEntryItem.entry_id.in_(pending_ids)
+        ).group_by(JournalEntryItem.account_id, JournalEntry.entry_date).all()
+        
+        # Accumulate deltas per (account, period_type, period_start)
+        deltas: Dict[Tuple[int, str, date], List] = {}
+        for account_id, entry_date, debit, credit, count in movements:
+            for key in ((account_id, 'day', entry_date), (account_id, 'month', self._month_start(entry_date))):
+                delta = deltas.setdefault(key, [Decimal('0'), Decimal('0'), 0])
+                delta[0] += Decimal(str(debit))
+                delta[1] += Decimal(str(credit))
+                delta[2] += count
+        
+        if deltas:
+            account_ids = {key[0] for key in deltas}
+            period_starts = {key[2] for key in deltas}
+            
+            existing = {
+                (snapshot.account_id, snapshot.period_type, snapshot.period_start): snapshot
+                for snapshot in db.query(AccountBalanceSnapshot).filter(
+                    AccountBalanceSnapshot.company_id == company_id,
+                    AccountBalanceSnapshot.account_id.in_(account_ids),
+                    AccountBalanceSnapshot.period_start.in_(period_starts)
+                ).with_for_update().all()
+            }
+            
+            for key, (debit, credit, count) in deltas.items():
+                snapshot = existing.get(key)
+                if snapshot is None:
+                    account_id, period_type, period_start = key
+                    snapshot = AccountBalanceSnapshot(
+                        company_id=company_id,
+                        account_id=account_id,
+                        period_type=period_type,
+                        period_start=period_start,
+                        debit_total=Decimal('0'),
+                        credit_total=Decimal('0'),
+                        transaction_count=0
+                    )
+                    db.add(snapshot)
+                    existing[key] = snapshot
+                
+                snapshot.debit_total = (snapshot.debit_total or Decimal('0')) + debit
+                snapshot.credit_total = (snapshot.credit_total or Decimal('0')) + credit
+                snapshot.transaction_count = (snapshot.transaction_count or 0) + count
+        
+        db.query(JournalEntry).filter(JournalEntry.id.in_(pending_ids)).update(
+            {JournalEntry.balance_snapshot_at: datetime.utcnow()},
+            synchronize_session=False
+        )
+        db.flush()
+        
+        return len(pending_ids)
+    
+    def refresh_balance_snapshots(
+        self,
+        db: Session,
+        company_id: int,
+        batch_size: int = 500
+    ) -> int:
+        """Fold every posted entry not yet in the snapshots (e.g. entries posted by integrations)"""
+        
+        applied = 0
+        while True:
+            entry_ids = [
+                entry_id for (entry_id,) in db.query(JournalEntry.id).filter(
+                    JournalEntry.company_id == company_id,
+                    JournalEntry.status == 'posted',
+                    JournalEntry.balance_snapshot_at.is_(None)
+                ).order_by(JournalEntry.id).limit(batch_size).all()
+            ]
+            if not entry_ids:
+                break
+            applied += self.apply_entries_to_snapshots(db, company_id, entry_ids)
+            db.commit()
+        
+        logger.info(f"Balance snapshots refreshed for company {company_id}: {applied} entries")
+        
+        return applied
+    
+    def recompute_snapshots(
+        self,
+        db: Session,
+        company_id: int,
+        movements: Iterable[Tuple[int, date]]
+    ) -> int:
+        """Recompute the day and month snapshots covering the given (account, date) pairs
+        
+        Used when entries already folded in are edited, cancelled or deleted:
+        the affected periods are re-summed from the folded entries still posted,
+        and periods left without movements are removed.
+        """
+        
+        keys = set()
+        for account_id, entry_date in movements:
+            keys.add((account_id, 'day', entry_date))
+            keys.add((account_id, 'month', self._month_start(entry_date)))
+        if not keys:
+            return 0
+        
+        account_ids = {key[0] for key in keys}
+        existing = {
+            (snapshot.account_id, snapshot.period_type, snapshot.period_start): snapshot
+            for snapshot in db.query(AccountBalanceSnapshot).filter(
+                AccountBalanceSnapshot.company_id == company_id,
+                AccountBalanceSnapshot.account_id.in_(account_ids),
+                AccountBalanceSnapshot.period_start.in_({key[2] for key in keys})
+            ).with_for_update().all()
+        }
+        
+        months = {key[2] for key in keys if key[1] == 'month'}
+        totals: Dict[Tuple[int, str, date], List] = {}
+        for account_id, entry_date, debit, credit, count in db.query(
+            JournalEntryItem.account_id,
+            JournalEntry.entry_date,
+            func.coalesce(func.sum(JournalEntryItem.debit_amount), 0),
+            func.coalesce(func.sum(JournalEntryItem.credit_amount), 0),
+            func.count(JournalEntryItem.id)
+        ).join(JournalEntry, JournalEntryItem.entry_id == JournalEntry.id).filter(
+            JournalEntry.company_id == company_id,
+            JournalEntry.status == 'posted',
+            JournalEntry.balance_snapshot_at.isnot(None),
+            JournalEntryItem.account_id.in_(account_ids),
+            or_(*[
+                and_(JournalEntry.entry_date >= month, JournalEntry.entry_date < self._month_start(month + timedelta(days=31)))
+                for month in months
+            ])
+        ).group_by(JournalEntryItem.account_id, JournalEntry.entry_date).all():
+            for key in ((account_id, 'day', entry_date), (account_id, 'month', self._month_start(entry_date))):
+                if key in keys:
+                    total = totals.setdefault(key, [Decimal('0'), Decimal('0'), 0])
+                    total[0] += Decimal(str(debit))
+                    total[1] += Decimal(str(credit))
+                    total[2] += count
+        
+        for key in keys:
+            snapshot = existing.get(key)
+            total = totals.get(key)
+            if total is None:
+                if snapshot is not None:
+                    db.delete(snapshot)
+                continue
+            if snapshot is None:
+                account_id, period_type, period_start = key
+                snapshot = AccountBalanceSnapshot(
+                    company_id=company_id,
+                    account_id=account_id,
+                    period_type=period_type,
+                    period_start=period_start
+                )
+                db.add(snapshot)
+            snapshot.debit_total, snapshot.credit_total, snapshot.transaction_count = total
+        db.flush()
+        
+        return len(keys)
+    
+    def apply_session_postings(self, db: Session):
+        """Bring the snapshots up to date with the journal entries changed in this transaction (see the hooks below)"""
+        
+        changes = transaction_info(db).pop(_JOURNAL_CHANGES, None)
+        if not changes:
+            return
+        
+        entries = {
+            entry_id: (company_id, entry_date, status, folded_at)
+            for entry_id, company_id, entry_date, status, folded_at in db.query(
+                JournalEntry.id, JournalEntry.company_id, JournalEntry.entry_date,
+                JournalEntry.status, JournalEntry.balance_snapshot_at
+            ).filter(JournalEntry.id.in_(changes)).all()
+        }
+        
+        # Entries that were in the snapshots before this transaction; those
+        # only known through their lines are looked up
+        folded_ids = []
+        for entry_id, change in changes.items():
+            folded = change["folded"]
+            if folded is None:
+                folded = entry_id in entries and entries[entry_id][3] is not None
+            if folded:
+                folded_ids.append(entry_id)
+        accounts = {entry_id: set(changes[entry_id]["accounts"]) for entry_id in folded_ids}
+        if folded_ids:
+            for entry_id, account_id in db.query(JournalEntryItem.entry_id, JournalEntryItem.account_id).filter(
+                JournalEntryItem.entry_id.in_(folded_ids)
+            ).distinct().all():
+                accounts[entry_id].add(account_id)
+        
+        # Entries already folded in: recompute every period they were or are in
+        refold: Dict[int, set] = {}
+        unfold_ids = []
+        for entry_id in folded_ids:
+            periods = set(changes[entry_id]["periods"])
+            entry = entries.get(entry_id)
+            if entry is not None:
+                periods.add(entry[:2])
+                if entry[2] != 'posted':
+                    unfold_ids.append(entry_id)
+            for company_id, entry_date in periods:
+                if company_id is not None and entry_date is not None:
+                    refold.setdefault(company_id, set()).update(
+                        (account_id, entry_date) for account_id in accounts[entry_id]
+                    )
+        if unfold_ids:
+            db.query(JournalEntry).filter(JournalEntry.id.in_(unfold_ids)).update(
+                {JournalEntry.balance_snapshot_at: None},
+                synchronize_session=False
+            )
+        for company_id, movements in refold.items():
+            self._update_snapshots(db, company_id, self.recompute_snapshots, movements)
+        
+        # New postings: fold in incrementally
+        by_company: Dict[int, List[int]] = {}
+        for entry_id, (company_id, entry_date, status, folded_at) in entries.items():
+            if status == 'posted' and folded_at is None:
+                by_company.setdefault(company_id, []).append(entry_id)
+        for company_id, entry_ids in by_company.items():
+            self._update_snapshots(db, company_id, self.apply_entries_to_snapshots, entry_ids)
+    
+    def _update_snapshots(self, db: Session, company_id: int, update, *args):
+        """Run a snapshot update in a savepoint, so a failure leaves the posting intact
+        
+        Unfolded entries are picked up by refresh_balance_snapshots; anything
+        else is repaired by rebuild_balance_snapshots.
+        """
+        
+        for _ in range(2):
+            try:
+                with db.begin_nested():
+                    update(db, company_id, *args)
+                return
+            except IntegrityError as e:
+                # A concurrent commit created the same snapshot row; the retry finds and locks it
+                error = e
+            except Exception as e:
+                error = e
+                break
+        logger.error(f"Balance snapshot update failed for company {company_id}: {str(error)}")
+    
+    def rebuild_balance_snapshots(self, db: Session, company_id: int) -> int:
+        """Discard and recompute all balance snapshots for a company"""
+        
+        db.query(AccountBalanceSnapshot).filter(
+            AccountBalanceSnapshot.company_id == company_id
+        ).delete(synchronize_session=False)
+        db.query(JournalEntry).filter(
+            JournalEntry.company_id == company_id
+        ).update({JournalEntry.balance_snapshot_at: None}, synchronize_session=False)
+        db.commit()
+        
+        return self.refresh_balance_snapshots(db, company_id)
+    
+    def _movements_before(
+        self,
+        db: Session,
+        company_id: int,
+        cutoff: Optional[date] = None,
+        account_ids: Optional[List[int]] = None
+    ) -> Dict[int, List]:
+        """Debit, credit and item count per account for posted entries dated before cutoff
+        
+        Reads whole months and the days of the cutoff month from the snapshots,
+        plus one aggregate over posted entries not yet folded into them.
+        """
+        
+        totals: Dict[int, List] = {}
+        
+        def add(rows):
+            for account_id, debit, credit, count in rows:
+                total = totals.setdefault(account_id, [Decimal('0'), Decimal('0'), 0])
+                total[0] += Decimal(str(debit or 0))
+                total[1] += Decimal(str(credit or 0))
+                total[2] += int(count or 0)
+        
+        def snapshot_query(period_type: str):
+            query = db.query(
+                AccountBalanceSnapshot.account_id,
+                func.sum(AccountBalanceSnapshot.debit_total),
+                func.sum(AccountBalanceSnapshot.credit_total),
+                func.sum(AccountBalanceSnapshot.transaction_count)
+            ).filter(
+                AccountBalanceSnapshot.company_id == company_id,
+                AccountBalanceSnapshot.period_type == period_type
+            )
+            if account_ids is not None:
+                query = query.filter(AccountBalanceSnapshot.account_id.in_(account_ids))
+            return query
+        
+        months = snapshot_query('month')
+        if cutoff is not None:
+            month_start = self._month_start(cutoff)
+            months = months.filter(AccountBalanceSnapshot.period_start < month_start)
+            add(snapshot_query('day').filter(
+                AccountBalanceSnapshot.period_start >= month_start,
+                AccountBalanceSnapshot.period_start < cutoff
+            ).group_by(AccountBalanceSnapshot.account_id).all())
+        add(months.group_by(AccountBalanceSnapshot.account_id).all())
+        
+        tail = db.query(
+            JournalEntryItem.account_id,
+            func.sum(JournalEntryItem.debit_amount),
+            func.sum(JournalEntryItem.credit_amount),
+            func.count(JournalEntryItem.id)
+        ).join(JournalEntry, JournalEntryItem.entry_id == JournalEntry.id).filter(
+            JournalEntry.company_id == company_id,
+            JournalEntry.status == 'posted',
+            JournalEntry.balance_snapshot_at.is_(None)
+        )
+        if cutoff is not None:
+            tail = tail.filter(JournalEntry.entry_date < cutoff)
+        if account_ids is not None:
+            tail = tail.filter(JournalEntryItem.account_id.in_(account_ids))
+        add(tail.group_by(JournalEntryItem.account_id).all())
+        
+        return totals
+    
+    def _daily_movements(
+        self,
+        db: Session,
         company_id: int,
         account_id: int,
-        from_date: Optional[date] = None,
-        to_date: Optional[date] = None
-    ) -> Dict:
-        """Calculate account balance for period"""
+        from_date: date,
+        to_date: date
+    ) -> Dict[date, List]:
+        """Debit, credit and item count per day for one account within a date range"""
+        
+        days: Dict[date, List] = {}
+        
+        def add(rows):
+            for day, debit, credit, count in rows:
+                total = days.setdefault(day, [Decimal('0'), Decimal('0'), 0])
+                total[0] += Decimal(str(debit or 0))
+                total[1] += Decimal(str(credit or 0))
+                total[2] += int(count or 0)
+        
+        add(db.query(
+            AccountBalanceSnapshot.period_start,
+            AccountBalanceSnapshot.debit_total,
+            AccountBalanceSnapshot.credit_total,
+            AccountBalanceSnapshot.transaction_count
+        ).filter(
+            AccountBalanceSnapshot.company_id == company_id,
+            AccountBalanceSnapshot.account_id == account_id,
+            AccountBalanceSnapshot.period_type == 'day',
+            AccountBalanceSnapshot.period_start >= from_date,
+            AccountBalanceSnapshot.period_start <= to_date
+        ).all())
+        
+        add(db.query(
+            JournalEntry.entry_date,
+            func.sum(JournalEntryItem.debit_amount),
+            func.sum(JournalEntryItem.credit_amount),
+            func.count(JournalEntryItem.id)
+        ).join(JournalEntry, JournalEntryItem.entry_id == JournalEntry.id).filter(
+            JournalEntryItem.account_id == account_id,
+            JournalEntry.company_id == company_id,
+            JournalEntry.status == 'posted',
+            JournalEntry.balance_snapshot_at.is_(None),
+            JournalEntry.entry_date >= from_date,
+            JournalEntry.entry_date <= to_date
+        ).group_by(JournalEntry.entry_date).all())
         
-        # Get account
+        return days
+    
+    def _get_account(self, db: Session, company_id: int, account_id: int) -> ChartOfAccount:
         account = db.query(ChartOfAccount).filter(
             ChartOfAccount.id == account_id,
             ChartOfAccount.company_id == company_id
@@ -39,40 +442,36 @@ class AccountBalanceService:
         if not account:
             raise ValueError("Account not found")
         
-        # Build query for journal entry items
-        query = db.query(JournalEntryItem).join(JournalEntry).filter(
-            JournalEntryItem.account_id == account_id,
-            JournalEntry.company_id == company_id,
-            JournalEntry.status == 'posted'  # Only posted entries
+        return account
+    
+    def calculate_account_balance(
+        self, 
+        db: Session, 
+        company_id: int,
+        account_id: int,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None
+    ) -> Dict:
+        """Calculate account balance for period"""
+        
+        account = self._get_account(db, company_id, account_id)
+        
+        # Opening balance is everything posted before the period starts
+        empty = [Decimal('0'), Decimal('0'), 0]
+        opening = (
+            self._movements_before(db, company_id, from_date, [account_id]).get(account_id, empty)
+            if from_date else empty
         )
+        closing_cutoff = to_date + timedelta(days=1) if to_date else None
+        closing = self._movements_before(db, company_id, closing_cutoff, [account_id]).get(account_id, empty)
+        
+        debit_total = closing[0] - opening[0]
+        credit_total = closing[1] - opening[1]
+        transaction_count = closing[2] - opening[2]
         
-        # Apply date filters if provided
-        if from_date:
-            query = query.filter(JournalEntry.entry_date >= from_date)
-        if to_date:
-            query = query.filter(JournalEntry.entry_date <= to_date)
-        
-        # Get all journal entry items for this account
-        journal_items = query.all()
-        
-        # Calculate totals
-        debit_total = Decimal('0')
-        credit_total = Decimal('0')
-        transaction_count = len(journal_items)
-        
-        for item in journal_items:
-            debit_total += item.debit_amount
-            credit_total += item.credit_amount
-        
-        # Calculate closing balance
-        if account.account_type in ["Asset", "Expense"]:
-            # Assets and Expenses: Debit increases, Credit decreases
-            closing_balance = debit_total - credit_total
-            balance_type = "debit"
-        else:
-            # Liabilities, Equity, Income: Credit increases, Debit decreases
-            closing_balance = credit_total - debit_total
-            balance_type = "credit"
+        opening_balance = self._signed_balance(account.account_type, opening[0], opening[1])
+        closing_balance = opening_balance + self._signed_balance(account.account_type, debit_total, credit_total)
+        balance_type = "debit" if self._is_debit_normal(account.account_type) else "credit"
         
         return {
             "account": {
@@ -85,7 +484,7 @@ class AccountBalanceService:
                 "from_date": from_date,
                 "to_date": to_date
             },
-            "opening_balance": Decimal('0'),  # Would need to calculate from previous period
+            "opening_balance": opening_balance,
             "debit_total": debit_total,
             "credit_total": credit_total,
             "closing_balance": closing_balance,
@@ -93,6 +492,81 @@ class AccountBalanceService:
             "transaction_count": transaction_count
         }
     
+    def calculate_account_balances(
+        self,
+        db: Session,
+        company_id: int,
+        account_ids: Optional[List[int]] = None,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None,
+        active_only: bool = False
+    ) -> Dict[str, List]:
+        """Calculate balances for many accounts with account-grouped aggregates
+        
+        Returns parallel columns (one list per field, one position per account)
+        rather than a dict per account, so callers can total or rank cheaply.
+        """
+        
+        query = db.query(
+            ChartOfAccount.id,
+            ChartOfAccount.account_code,
+            ChartOfAccount.account_name,
+            ChartOfAccount.account_type
+        ).filter(ChartOfAccount.company_id == company_id)
+        
+        if account_ids is not None:
+            query = query.filter(ChartOfAccount.id.in_(account_ids))
+        if active_only:
+            query = query.filter(ChartOfAccount.is_active == True)
+        
+        accounts = query.order_by(ChartOfAccount.account_code).all()
+        
+        columns = {
+            "account_id": [],
+            "account_code": [],
+            "account_name": [],
+            "account_type": [],
+            "opening_balance": [],
+            "debit_total": [],
+            "credit_total": [],
+            "closing_balance": [],
+            "balance_type": [],
+            "transaction_count": []
+        }
+        
+        if not accounts:
+            return columns
+        
+        # Pass the id filter through only when the caller narrowed the chart
+        scope = [account.id for account in accounts] if account_ids is not None else None
+        empty = [Decimal('0'), Decimal('0'), 0]
+        opening = self._movements_before(db, company_id, from_date, scope) if from_date else {}
+        closing = self._movements_before(
+            db, company_id, to_date + timedelta(days=1) if to_date else None, scope
+        )
+        
+        for account_id, account_code, account_name, account_type in accounts:
+            before = opening.get(account_id, empty)
+            through = closing.get(account_id, empty)
+            debit_total = through[0] - before[0]
+            credit_total = through[1] - before[1]
+            opening_balance = self._signed_balance(account_type, before[0], before[1])
+            
+            columns["account_id"].append(account_id)
+            columns["account_code"].append(account_code)
+            columns["account_name"].append(account_name)
+            columns["account_type"].append(account_type)
+            columns["opening_balance"].append(opening_balance)
+            columns["debit_total"].append(debit_total)
+            columns["credit_total"].append(credit_total)
+            columns["closing_balance"].append(
+                opening_balance + self._signed_balance(account_type, debit_total, credit_total)
+            )
+            columns["balance_type"].append("debit" if self._is_debit_normal(account_type) else "credit")
+            columns["transaction_count"].append(through[2] - before[2])
+        
+        return columns
+    
     def get_account_balances_bulk(
         self, 
         db: Session, 
@@ -103,48 +577,49 @@ class AccountBalanceService:
     ) -> List[Dict]:
         """Get balances for multiple accounts"""
         
-        balances = []
+        columns = self.calculate_account_balances(
+            db, company_id, account_ids=account_ids, from_date=from_date, to_date=to_date
+        )
         
-        for account_id in account_ids:
-            try:
-                balance = self.calculate_account_balance(
-                    db=db,
-                    company_id=company_id,
-                    account_id=account_id,
-                    from_date=from_date,
-                    to_date=to_date
-                )
-                balances.append(balance)
-            except ValueError:
-                continue
+        # Keep the caller's ordering; unknown accounts are skipped
+        position = {account_id: i for i, account_id in enumerate(columns["account_id"])}
         
-        return balances
+        return [
+            {
+                "account": {
+                    "id": columns["account_id"][i],
+                    "account_code": columns["account_code"][i],
+                    "account_name": columns["account_name"][i],
+                    "account_type": columns["account_type"][i]
+                },
+                "period": {
+                    "from_date": from_date,
+                    "to_date": to_date
+                },
+                "opening_balance": columns["opening_balance"][i],
+                "debit_total": columns["debit_total"][i],
+                "credit_total": columns["credit_total"][i],
+                "closing_balance": columns["closing_balance"][i],
+                "balance_type": columns["balance_type"][i],
+                "transaction_count": columns["transaction_count"][i]
+            }
+            for i in (position[account_id] for account_id in dict.fromkeys(account_ids) if account_id in position)
+        ]
     
-    def get_account_balance_summary(
-        self, 
-        db: Session, 
-        company_id: int,
-        from_date: Optional[date] = None,
-        to_date: Optional[date] = None
-    ) -> Dict:
-        """Get account balance summary"""
-        
-        # Get all active accounts
-        accounts = db.query(ChartOfAccount).filter(
-            ChartOfAccount.company_id == company_id,
-            ChartOfAccount.is_active == True
-        ).all()
+    def _summarize_balances(self, columns: Dict[str, List]) -> Dict:
+        """Totals by account type over a calculate_account_balances result"""
         
         summary = {
-            "total_accounts": len(accounts),
+            "total_accounts": len(columns["account_id"]),
             "accounts_by_type": {},
             "total_debit": Decimal('0'),
             "total_credit": Decimal('0'),
             "balanced": False
         }
         
-        for account in accounts:
-            account_type = account.account_type
+        for account_type, balance_type, closing_balance in zip(
+            columns["account_type"], columns["balance_type"], columns["closing_balance"]
+        ):
             if account_type not in summary["accounts_by_type"]:
                 summary["accounts_by_type"][account_type] = {
                     "count": 0,
@@ -152,33 +627,35 @@ class AccountBalanceService:
                     "total_credit": Decimal('0')
                 }
             
-            summary["accounts_by_type"][account_type]["count"] += 1
+            type_summary = summary["accounts_by_type"][account_type]
+            type_summary["count"] += 1
             
-            # Calculate real balance for this account
-            try:
-                balance = self.calculate_account_balance(
-                    db=db,
-                    company_id=company_id,
-                    account_id=account.id,
-                    from_date=from_date,
-                    to_date=to_date
-                )
-                
-                if account.account_type in ["Asset", "Expense"]:
-                    summary["accounts_by_type"][account_type]["total_debit"] += balance["closing_balance"]
-                    summary["total_debit"] += balance["closing_balance"]
-                else:
-                    summary["accounts_by_type"][account_type]["total_credit"] += balance["closing_balance"]
-                    summary["total_credit"] += balance["closing_balance"]
-                    
-            except ValueError:
-                # Skip accounts with errors
-                continue
+            if balance_type == "debit":
+                type_summary["total_debit"] += closing_balance
+                summary["total_debit"] += closing_balance
+            else:
+                type_summary["total_credit"] += closing_balance
+                summary["total_credit"] += closing_balance
         
         summary["balanced"] = summary["total_debit"] == summary["total_credit"]
         
         return summary
     
+    def get_account_balance_summary(
+        self, 
+        db: Session, 
+        company_id: int,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None
+    ) -> Dict:
+        """Get account balance summary"""
+        
+        columns = self.calculate_account_balances(
+            db, company_id, from_date=from_date, to_date=to_date, active_only=True
+        )
+        
+        return self._summarize_balances(columns)
+    
     def get_account_balance_history(
         self, 
         db: Session, 
@@ -189,35 +666,32 @@ class AccountBalanceService:
     ) -> List[Dict]:
         """Get account balance history"""
         
-        from ..models.accounting import JournalEntry, JournalEntryItem
+        account = self._get_account(db, company_id, account_id)
+        
+        opening = self._movements_before(db, company_id, from_date, [account_id]).get(
+            account_id, [Decimal('0'), Decimal('0'), 0]
+        )
+        running_balance = self._signed_balance(account.account_type, opening[0], opening[1])
+        days = self._daily_movements(db, company_id, account_id, from_date, to_date)
         
         history = []
         current_date = from_date
         
         while current_date <= to_date:
-            # Calculate balance for this specific date
-            daily_balance = self.calculate_account_balance(
-                db=db,
-                company_id=company_id,
-                account_id=account_id,
-                from_date=from_date,
-                to_date=current_date
+            debit_total, credit_total, transaction_count = days.get(
+                current_date, [Decimal('0'), Decimal('0'), 0]
+            )
+            opening_balance = running_balance
+            running_balance = opening_balance + self._signed_balance(
+                account.account_type, debit_total, credit_total
             )
-            
-            # Get transaction count for this date
-            transaction_count = db.query(JournalEntryItem).join(JournalEntry).filter(
-                JournalEntryItem.account_id == account_id,
-                JournalEntry.company_id == company_id,
-                JournalEntry.entry_date == current_date,
-                JournalEntry.status == 'posted'
-            ).count()
             
             history.append({
                 "date": current_date,
-                "opening_balance": daily_balance["opening_balance"],
-                "debit_total": daily_balance["debit_total"],
-                "credit_total": daily_balance["credit_total"],
-                "closing_balance": daily_balance["closing_balance"],
+                "opening_balance": opening_balance,
+                "debit_total": debit_total,
+                "credit_total": credit_total,
+                "closing_balance": running_balance,
                 "transaction_count": transaction_count
             })
             
@@ -237,78 +711,36 @@ class AccountBalanceService:
     ) -> Dict:
         """Get account balance trend"""
         
-        # This would require implementing journal entries
-        # For now, return mock data
+        history = self.get_account_balance_history(db, company_id, account_id, from_date, to_date)
+        
+        # Group the daily closing balances into buckets; each bucket reports its last closing
+        buckets: Dict[str, Decimal] = {}
+        for day in history:
+            if period == "weekly":
+                label = f"Week {day['date'].isocalendar()[1]}"
+            elif period == "monthly":
+                label = day['date'].strftime("%Y-%m")
+            else:
+                label = day['date'].isoformat()
+            buckets[label] = day['closing_balance']
+        
+        start_balance = history[0]['opening_balance'] if history else Decimal('0')
         trend_data = []
+        previous_balance = start_balance
         
-        if period == "daily":
-            current_date = from_date
-            while current_date <= to_date:
-                trend_data.append({
-                    "period": current_date.isoformat(),
-                    "balance": Decimal('0'),
-                    "change": Decimal('0')
-                })
-                current_date = current_date.replace(day=current_date.day + 1)
-        
-        elif period == "weekly":
-            # Weekly aggregation
-            current_date = from_date
-            week_start = current_date - timedelta(days=current_date.weekday())
-            
-            while week_start <= to_date:
-                week_end = week_start + timedelta(days=6)
-                if week_end > to_date:
-                    week_end = to_date
-                
-                # Calculate balance for this week
-                week_balance = self.calculate_account_balance(
-                    db=db,
-                    company_id=company_id,
-                    account_id=account_id,
-                    from_date=week_start,
-                    to_date=week_end
-                )
-                
-                trend_data.append({
-                    "period": f"Week {week_start.isocalendar()[1]}",
-                    "balance": week_balance["closing_balance"],
-                    "change": Decimal('0')  # Would need previous week for comparison
-                })
-                
-                week_start = week_end + timedelta(days=1)
+        for label, balance in buckets.items():
+            trend_data.append({
+                "period": label,
+                "balance": balance,
+                "change": balance - previous_balance
+            })
+            previous_balance = balance
         
-        elif period == "monthly":
-            # Monthly aggregation
-            current_date = from_date.replace(day=1)
-            
-            while current_date <= to_date:
-                # Get last day of month
-                if current_date.month == 12:
-                    next_month = current_date.replace(year=current_date.year + 1, month=1, day=1)
-                else:
-                    next_month = current_date.replace(month=current_date.month + 1, day=1)
-                
-                month_end = next_month - timedelta(days=1)
-                if month_end > to_date:
-                    month_end = to_date
-                
-                # Calculate balance for this month
-                month_balance = self.calculate_account_balance(
-                    db=db,
-                    company_id=company_id,
-                    account_id=account_id,
-                    from_date=current_date,
-                    to_date=month_end
-                )
-                
-                trend_data.append({
-                    "period": current_date.strftime("%Y-%m"),
-                    "balance": month_balance["closing_balance"],
-                    "change": Decimal('0')  # Would need previous month for comparison
-                })
-                
-                current_date = next_month
+        end_balance = history[-1]['closing_balance'] if history else Decimal('0')
+        average_balance = (
+            sum((item['balance'] for item in trend_data), Decimal('0')) / len(trend_data)
+            if trend_data else Decimal('0')
+        )
         
         return {
             "account_id": account_id,
@@ -319,10 +751,10 @@ class AccountBalanceService:
             },
             "trend_data": trend_data,
             "summary": {
-                "start_balance": Decimal('0'),
-                "end_balance": Decimal('0'),
-                "total_change": Decimal('0'),
-                "average_balance": Decimal('0')
+                "start_balance": start_balance,
+                "end_balance": end_balance,
+                "total_change": end_balance - start_balance,
+                "average_balance": average_balance
             }
         }
     
@@ -505,27 +937,137 @@ class AccountBalanceService:
         db: Session, 
         company_id: int,
         from_date: date,
-        to_date: date
+        to_date: date,
+        top_n: int = 10
     ) -> Dict:
         """Get account balance dashboard"""
         
-        # This would require implementing dashboard logic
-        # For now, return mock data
+        columns = self.calculate_account_balances(
+            db, company_id, from_date=from_date, to_date=to_date, active_only=True
+        )
+        summary = self._summarize_balances(columns)
+        
+        positions = range(len(columns["account_id"]))
+        top_positions = sorted(
+            positions, key=lambda i: abs(columns["closing_balance"][i]), reverse=True
+        )[:top_n]
+        
+        def account_row(i):
+            return {
+                "account_id": columns["account_id"][i],
+                "account_code": columns["account_code"][i],
+                "account_name": columns["account_name"][i],
+                "account_type": columns["account_type"][i],
+                "closing_balance": columns["closing_balance"][i]
+            }
+        
+        alerts = [
+            {
+                "type": "negative_balance",
+                "message": f"{columns['account_name'][i]} has negative balance",
+                "severity": "high",
+                "account_id": columns["account_id"][i],
+                "balance": columns["closing_balance"][i]
+            }
+            for i in positions if columns["closing_balance"][i] < 0
+        ]
+        
         return {
             "period": {
                 "from_date": from_date,
                 "to_date": to_date
             },
             "summary": {
-                "total_accounts": 0,
-                "active_accounts": 0,
-                "total_balance": Decimal('0'),
-                "balanced": True
+                "total_accounts": summary["total_accounts"],
+                "active_accounts": sum(1 for count in columns["transaction_count"] if count),
+                "total_balance": summary["total_debit"],
+                "balanced": summary["balanced"]
             },
-            "top_accounts": [],
-            "alerts": [],
-            "trends": []
+            "top_accounts": [account_row(i) for i in top_positions],
+            "alerts": alerts,
+            "trends": [
+                {
+                    "account_type": account_type,
+                    "count": type_summary["count"],
+                    "balance": type_summary["total_debit"] + type_summary["total_credit"]
+                }
+                for account_type, type_summary in summary["accounts_by_type"].items()
+            ]
         }
 
 # Global service instance
-account_balance_service = AccountBalanceService()
\ No newline at end of file
+account_balance_service = AccountBalanceService()
+
+# Posting hooks: journal entries are posted and edited directly by many
+# integrations, so every change to an entry or its lines is noted on the
+# session, with the periods and accounts it held before, and the snapshots
+# are brought up to date just before the transaction commits
+_JOURNAL_CHANGES = "journal_entry_changes"
+
+def _stored_values(connection, target, names: Tuple[str, ...]) -> Dict:
+    """Column values of target as stored in the database, before this flush writes it"""
+    state = inspect(target)
+    values, missing = {}, []
+    for name in names:
+        history = state.attrs[name].history
+        if history.deleted or history.unchanged:
+            values[name] = (history.deleted or history.unchanged)[0]
+        elif state.key is not None:
+            missing.append(name)
+    if missing:
+        model = type(target)
+        row = connection.execute(
+            select(*[getattr(model, name) for name in missing]).where(model.id == target.id)
+        ).one()
+        values.update(zip(missing, row))
+    return values
+
+def _entry_change(session: Session, entry_id: int, folded: Optional[bool] = None) -> Dict:
+    on_before_commit(session, _JOURNAL_CHANGES, account_balance_service.apply_session_postings)
+    changes = transaction_info(session).setdefault(_JOURNAL_CHANGES, {})
+    change = changes.setdefault(entry_id, {"periods": set(), "accounts": set(), "folded": None})
+    # The first state seen is the one before this transaction
+    if change["folded"] is None:
+        change["folded"] = folded
+    return change
+
+def _has_changes(target, names: Tuple[str, ...]) -> bool:
+    state = inspect(target)
+    return any(state.attrs[name].history.has_changes() for name in names)
+
+@event.listens_for(JournalEntry, "after_insert")
+def _note_new_entry(mapper, connection, target):
+    _entry_change(object_session(target), target.id, folded=False)
+
+@event.listens_for(JournalEntry, "before_update")
+def _note_changed_entry(mapper, connection, target):
+    if _has_changes(target, ('status', 'entry_date', 'company_id')):
+        stored = _stored_values(connection, target, ('company_id', 'entry_date', 'balance_snapshot_at'))
+        change = _entry_change(object_session(target), target.id, stored.get('balance_snapshot_at') is not None)
+        change["periods"].add((stored.get('company_id'), stored.get('entry_date')))
+
+@event.listens_for(JournalEntry, "before_delete")
+def _note_deleted_entry(mapper, connection, target):
+    stored = _stored_values(connection, target, ('company_id', 'entry_date', 'balance_snapshot_at'))
+    change = _entry_change(object_session(target), target.id, stored.get('balance_snapshot_at') is not None)
+    change["periods"].add((stored.get('company_id'), stored.get('entry_date')))
+    change["accounts"].update(connection.execute(
+        select(JournalEntryItem.account_id).where(JournalEntryItem.entry_id == target.id)
+    ).scalars())
+
+def _note_item(session: Session, target, stored: Dict):
+    for entry_id in {stored.get('entry_id'), target.entry_id} - {None}:
+        _entry_change(session, entry_id)["accounts"].update({stored.get('account_id'), target.account_id} - {None})
+
+@event.listens_for(JournalEntryItem, "after_insert")
+def _note_new_item(mapper, connection, target):
+    _note_item(object_session(target), target, {})
+
+@event.listens_for(JournalEntryItem, "before_update")
+def _note_changed_item(mapper, connection, target):
+    if _has_changes(target, ('entry_id', 'account_id', 'debit_amount', 'credit_amount')):
+        _note_item(object_session(target), target, _stored_values(connection, target, ('entry_id', 'account_id')))
+
+@event.listens_for(JournalEntryItem, "before_delete")
+def _note_deleted_item(mapper, connection, target):
+    _note_item(object_session(target), target, _stored_values(connection, target, ('entry_id', 'account_id')))
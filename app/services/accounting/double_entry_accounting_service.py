@@ -1,6 +1,6 @@
 # backend/app/services/double_entry_accounting_service.py
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc, asc
+from sqlalchemy import and_, or_, func, desc, asc, insert
 from typing import Optional, List, Dict, Tuple
 from decimal import Decimal
 from datetime import datetime, date
@@ -263,6 +263,90 @@ class DoubleEntryAccountingService:
         
         return reversal_entry
     
+    # Financial Statement Helpers
+    def _resolve_financial_year_id(self, db: Session, company_id: int, financial_year_id: int = None) -> int:
+        """Use the given financial year or fall back to the company's active one"""
+        
+        if financial_year_id:
+            return financial_year_id
+        
+        fy = db.query(FinancialYear).filter(
+            FinancialYear.company_id == company_id,
+            FinancialYear.is_active == True
+        ).first()
+        if not fy:
+            raise ValueError("No active financial year found")
+        
+        return fy.id
+    
+    def _get_statement_balances(
+        self,
+        db: Session,
+        company_id: int,
+        financial_year_id: int,
+        account_types: List[str] = None,
+        name_filter: str = None,
+        active_only: bool = True
+    ) -> List:
+        """Load every account's balance for the year with one joined query"""
+        
+        query = db.query(
+            ChartOfAccount.id.label('account_id'),
+            ChartOfAccount.account_type,
+            ChartOfAccount.account_name,
+            func.coalesce(func.sum(AccountBalance.debit_total), 0).label('debit_total'),
+            func.coalesce(func.sum(AccountBalance.credit_total), 0).label('credit_total'),
+            func.coalesce(func.sum(AccountBalance.current_balance), 0).label('current_balance')
+        ).join(
+            AccountBalance, and_(
+                AccountBalance.account_id == ChartOfAccount.id,
+                AccountBalance.financial_year_id == financial_year_id
+            )
+        ).filter(ChartOfAccount.company_id == company_id)
+        
+        if active_only:
+            query = query.filter(ChartOfAccount.is_active == True)
+        if account_types:
+            query = query.filter(ChartOfAccount.account_type.in_(account_types))
+        if name_filter:
+            query = query.filter(ChartOfAccount.account_name.ilike(name_filter))
+        
+        return query.group_by(
+            ChartOfAccount.id, ChartOfAccount.account_type, ChartOfAccount.account_name
+        ).order_by(ChartOfAccount.id).all()
+    
+    def _save_statement(
+        self,
+        db: Session,
+        statement,
+        item_model,
+        parent_key: str,
+        item_rows: List[Dict],
+        items_attr: str,
+        persist: bool = True
+    ):
+        """
+        Persist a statement header and its lines with one bulk insert.
+        Without persist, return the statement unsaved with its lines attached.
+        """
+        
+        if not persist:
+            setattr(statement, items_attr, [item_model(**row) for row in item_rows])
+            return statement
+        
+        db.add(statement)
+        db.flush()
+        
+        if item_rows:
+            for row in item_rows:
+                row[parent_key] = statement.id
+            db.execute(insert(item_model), item_rows)
+        
+        db.commit()
+        db.refresh(statement)
+        
+        return statement
+    
     # Trial Balance Management
     def generate_trial_balance(
         self, 
@@ -270,21 +354,13 @@ class DoubleEntryAccountingService:
         company_id: int,
         balance_date: date,
         financial_year_id: int = None,
-        user_id: int = None
+        user_id: int = None,
+        persist: bool = True
     ) -> TrialBalance:
         """Generate trial balance"""
         
-        # Get financial year
-        if not financial_year_id:
-            fy = db.query(FinancialYear).filter(
-                FinancialYear.company_id == company_id,
-                FinancialYear.is_active == True
-            ).first()
-            if not fy:
-                raise ValueError("No active financial year found")
-            financial_year_id = fy.id
+        financial_year_id = self._resolve_financial_year_id(db, company_id, financial_year_id)
         
-        # Create trial balance
         trial_balance = TrialBalance(
             company_id=company_id,
             balance_date=balance_date,
@@ -292,51 +368,34 @@ class DoubleEntryAccountingService:
             created_by=user_id
         )
         
-        db.add(trial_balance)
-        db.commit()
-        db.refresh(trial_balance)
-        
-        # Get all accounts with balances
-        accounts = db.query(ChartOfAccount).filter(
-            ChartOfAccount.company_id == company_id,
-            ChartOfAccount.is_active == True
-        ).all()
-        
         total_debit = Decimal('0')
         total_credit = Decimal('0')
+        item_rows = []
         
-        for account in accounts:
-            # Get account balance
-            balance = db.query(AccountBalance).filter(
-                AccountBalance.account_id == account.id,
-                AccountBalance.financial_year_id == financial_year_id
-            ).first()
-            
-            if balance and (balance.debit_total > 0 or balance.credit_total > 0):
-                debit_balance = max(0, balance.current_balance) if balance.current_balance > 0 else 0
-                credit_balance = max(0, -balance.current_balance) if balance.current_balance < 0 else 0
+        for balance in self._get_statement_balances(db, company_id, financial_year_id):
+            if balance.debit_total > 0 or balance.credit_total > 0:
+                current_balance = Decimal(str(balance.current_balance))
+                debit_balance = current_balance if current_balance > 0 else Decimal('0')
+                credit_balance = -current_balance if current_balance < 0 else Decimal('0')
                 
-                # Create trial balance item
-                balance_item = TrialBalanceItem(
-                    company_id=company_id,
-                    trial_balance_id=trial_balance.id,
-                    account_id=account.id,
-                    debit_balance=debit_balance,
-                    credit_balance=credit_balance,
-                    created_by=user_id
-                )
-                
-                db.add(balance_item)
+                item_rows.append({
+                    "company_id": company_id,
+                    "account_id": balance.account_id,
+                    "debit_balance": debit_balance,
+                    "credit_balance": credit_balance,
+                    "created_by": user_id
+                })
                 
                 total_debit += debit_balance
                 total_credit += credit_balance
         
-        # Update trial balance totals
         trial_balance.total_debit = total_debit
         trial_balance.total_credit = total_credit
         trial_balance.is_balanced = (total_debit == total_credit)
         
-        db.commit()
+        trial_balance = self._save_statement(
+            db, trial_balance, TrialBalanceItem, "trial_balance_id", item_rows, "balance_items", persist
+        )
         
         logger.info(f"Trial balance generated: {balance_date}")
         
@@ -349,21 +408,13 @@ class DoubleEntryAccountingService:
         company_id: int,
         sheet_date: date,
         financial_year_id: int = None,
-        user_id: int = None
+        user_id: int = None,
+        persist: bool = True
     ) -> BalanceSheet:
         """Generate balance sheet"""
         
-        # Get financial year
-        if not financial_year_id:
-            fy = db.query(FinancialYear).filter(
-                FinancialYear.company_id == company_id,
-                FinancialYear.is_active == True
-            ).first()
-            if not fy:
-                raise ValueError("No active financial year found")
-            financial_year_id = fy.id
+        financial_year_id = self._resolve_financial_year_id(db, company_id, financial_year_id)
         
-        # Create balance sheet
         balance_sheet = BalanceSheet(
             company_id=company_id,
             sheet_date=sheet_date,
@@ -371,59 +422,33 @@ class DoubleEntryAccountingService:
             created_by=user_id
         )
         
-        db.add(balance_sheet)
-        db.commit()
-        db.refresh(balance_sheet)
-        
-        # Get accounts by type
-        account_types = ['asset', 'liability', 'equity']
-        total_assets = Decimal('0')
-        total_liabilities = Decimal('0')
-        total_equity = Decimal('0')
-        
-        for account_type in account_types:
-            accounts = db.query(ChartOfAccount).filter(
-                ChartOfAccount.company_id == company_id,
-                ChartOfAccount.account_type == account_type,
-                ChartOfAccount.is_active == True
-            ).all()
-            
-            for account in accounts:
-                # Get account balance
-                balance = db.query(AccountBalance).filter(
-                    AccountBalance.account_id == account.id,
-                    AccountBalance.financial_year_id == financial_year_id
-                ).first()
+        totals = {'asset': Decimal('0'), 'liability': Decimal('0'), 'equity': Decimal('0')}
+        item_rows = []
+        
+        for balance in self._get_statement_balances(
+            db, company_id, financial_year_id, account_types=list(totals)
+        ):
+            if balance.current_balance != 0:
+                amount = abs(Decimal(str(balance.current_balance)))
+                
+                item_rows.append({
+                    "company_id": company_id,
+                    "account_id": balance.account_id,
+                    "account_type": balance.account_type,
+                    "amount": amount,
+                    "created_by": user_id
+                })
                 
-                if balance and balance.current_balance != 0:
-                    amount = abs(balance.current_balance)
-                    
-                    # Create balance sheet item
-                    sheet_item = BalanceSheetItem(
-                        company_id=company_id,
-                        balance_sheet_id=balance_sheet.id,
-                        account_id=account.id,
-                        account_type=account_type,
-                        amount=amount,
-                        created_by=user_id
-                    )
-                    
-                    db.add(sheet_item)
-                    
-                    if account_type == 'asset':
-                        total_assets += amount
-                    elif account_type == 'liability':
-                        total_liabilities += amount
-                    elif account_type == 'equity':
-                        total_equity += amount
-        
-        # Update balance sheet totals
-        balance_sheet.total_assets = total_assets
-        balance_sheet.total_liabilities = total_liabilities
-        balance_sheet.total_equity = total_equity
-        balance_sheet.is_balanced = (total_assets == total_liabilities + total_equity)
+                totals[balance.account_type] += amount
         
-        db.commit()
+        balance_sheet.total_assets = totals['asset']
+        balance_sheet.total_liabilities = totals['liability']
+        balance_sheet.total_equity = totals['equity']
+        balance_sheet.is_balanced = (totals['asset'] == totals['liability'] + totals['equity'])
+        
+        balance_sheet = self._save_statement(
+            db, balance_sheet, BalanceSheetItem, "balance_sheet_id", item_rows, "sheet_items", persist
+        )
         
         logger.info(f"Balance sheet generated: {sheet_date}")
         
@@ -437,21 +462,13 @@ class DoubleEntryAccountingService:
         from_date: date,
         to_date: date,
         financial_year_id: int = None,
-        user_id: int = None
+        user_id: int = None,
+        persist: bool = True
     ) -> ProfitLossStatement:
         """Generate profit & loss statement"""
         
-        # Get financial year
-        if not financial_year_id:
-            fy = db.query(FinancialYear).filter(
-                FinancialYear.company_id == company_id,
-                FinancialYear.is_active == True
-            ).first()
-            if not fy:
-                raise ValueError("No active financial year found")
-            financial_year_id = fy.id
+        financial_year_id = self._resolve_financial_year_id(db, company_id, financial_year_id)
         
-        # Create profit & loss statement
         statement = ProfitLossStatement(
             company_id=company_id,
             statement_date=to_date,
@@ -461,55 +478,32 @@ class DoubleEntryAccountingService:
             created_by=user_id
         )
         
-        db.add(statement)
-        db.commit()
-        db.refresh(statement)
+        totals = {'income': Decimal('0'), 'expense': Decimal('0')}
+        item_rows = []
         
-        # Get income and expense accounts
-        account_types = ['income', 'expense']
-        total_income = Decimal('0')
-        total_expenses = Decimal('0')
-        
-        for account_type in account_types:
-            accounts = db.query(ChartOfAccount).filter(
-                ChartOfAccount.company_id == company_id,
-                ChartOfAccount.account_type == account_type,
-                ChartOfAccount.is_active == True
-            ).all()
-            
-            for account in accounts:
-                # Get account balance for the period
-                balance = db.query(AccountBalance).filter(
-                    AccountBalance.account_id == account.id,
-                    AccountBalance.financial_year_id == financial_year_id
-                ).first()
+        for balance in self._get_statement_balances(
+            db, company_id, financial_year_id, account_types=list(totals)
+        ):
+            if balance.current_balance != 0:
+                amount = abs(Decimal(str(balance.current_balance)))
+                
+                item_rows.append({
+                    "company_id": company_id,
+                    "account_id": balance.account_id,
+                    "account_type": balance.account_type,
+                    "amount": amount,
+                    "created_by": user_id
+                })
                 
-                if balance and balance.current_balance != 0:
-                    amount = abs(balance.current_balance)
-                    
-                    # Create statement item
-                    statement_item = ProfitLossItem(
-                        company_id=company_id,
-                        statement_id=statement.id,
-                        account_id=account.id,
-                        account_type=account_type,
-                        amount=amount,
-                        created_by=user_id
-                    )
-                    
-                    db.add(statement_item)
-                    
-                    if account_type == 'income':
-                        total_income += amount
-                    elif account_type == 'expense':
-                        total_expenses += amount
-        
-        # Update statement totals
-        statement.total_income = total_income
-        statement.total_expenses = total_expenses
-        statement.net_profit = total_income - total_expenses
+                totals[balance.account_type] += amount
         
-        db.commit()
+        statement.total_income = totals['income']
+        statement.total_expenses = totals['expense']
+        statement.net_profit = totals['income'] - totals['expense']
+        
+        statement = self._save_statement(
+            db, statement, ProfitLossItem, "statement_id", item_rows, "statement_items", persist
+        )
         
         logger.info(f"Profit & Loss statement generated: {from_date} to {to_date}")
         
@@ -523,21 +517,13 @@ class DoubleEntryAccountingService:
         from_date: date,
         to_date: date,
         financial_year_id: int = None,
-        user_id: int = None
+        user_id: int = None,
+        persist: bool = True
     ) -> CashFlowStatement:
         """Generate cash flow statement"""
         
-        # Get financial year
-        if not financial_year_id:
-            fy = db.query(FinancialYear).filter(
-                FinancialYear.company_id == company_id,
-                FinancialYear.is_active == True
-            ).first()
-            if not fy:
-                raise ValueError("No active financial year found")
-            financial_year_id = fy.id
+        financial_year_id = self._resolve_financial_year_id(db, company_id, financial_year_id)
         
-        # Create cash flow statement
         statement = CashFlowStatement(
             company_id=company_id,
             statement_date=to_date,
@@ -547,65 +533,42 @@ class DoubleEntryAccountingService:
             created_by=user_id
         )
         
-        db.add(statement)
-        db.commit()
-        db.refresh(statement)
-        
-        # Get cash accounts
-        cash_accounts = db.query(ChartOfAccount).filter(
-            ChartOfAccount.company_id == company_id,
-            ChartOfAccount.account_type == 'asset',
-            ChartOfAccount.account_name.ilike('%cash%'),
-            ChartOfAccount.is_active == True
-        ).all()
-        
-        operating_cash_flow = Decimal('0')
-        investing_cash_flow = Decimal('0')
-        financing_cash_flow = Decimal('0')
+        totals = {'operating': Decimal('0'), 'investing': Decimal('0'), 'financing': Decimal('0')}
+        item_rows = []
         
-        for account in cash_accounts:
-            # Get account balance for the period
-            balance = db.query(AccountBalance).filter(
-                AccountBalance.account_id == account.id,
-                AccountBalance.financial_year_id == financial_year_id
-            ).first()
-            
-            if balance and balance.current_balance != 0:
-                amount = balance.current_balance
+        # Cash accounts only
+        for balance in self._get_statement_balances(
+            db, company_id, financial_year_id, account_types=['asset'], name_filter='%cash%'
+        ):
+            if balance.current_balance != 0:
+                amount = Decimal(str(balance.current_balance))
                 
                 # Determine flow type based on account name
+                account_name = balance.account_name.lower()
                 flow_type = 'operating'
-                if 'investment' in account.account_name.lower():
+                if 'investment' in account_name:
                     flow_type = 'investing'
-                elif 'loan' in account.account_name.lower() or 'equity' in account.account_name.lower():
+                elif 'loan' in account_name or 'equity' in account_name:
                     flow_type = 'financing'
                 
-                # Create cash flow item
-                flow_item = CashFlowItem(
-                    company_id=company_id,
-                    statement_id=statement.id,
-                    account_id=account.id,
-                    flow_type=flow_type,
-                    amount=amount,
-                    created_by=user_id
-                )
-                
-                db.add(flow_item)
+                item_rows.append({
+                    "company_id": company_id,
+                    "account_id": balance.account_id,
+                    "flow_type": flow_type,
+                    "amount": amount,
+                    "created_by": user_id
+                })
                 
-                if flow_type == 'operating':
-                    operating_cash_flow += amount
-                elif flow_type == 'investing':
-                    investing_cash_flow += amount
-                elif flow_type == 'financing':
-                    financing_cash_flow += amount
-        
-        # Update statement totals
-        statement.operating_cash_flow = operating_cash_flow
-        statement.investing_cash_flow = investing_cash_flow
-        statement.financing_cash_flow = financing_cash_flow
-        statement.net_cash_flow = operating_cash_flow + investing_cash_flow + financing_cash_flow
+                totals[flow_type] += amount
         
-        db.commit()
+        statement.operating_cash_flow = totals['operating']
+        statement.investing_cash_flow = totals['investing']
+        statement.financing_cash_flow = totals['financing']
+        statement.net_cash_flow = sum(totals.values(), Decimal('0'))
+        
+        statement = self._save_statement(
+            db, statement, CashFlowItem, "statement_id", item_rows, "cash_flow_items", persist
+        )
         
         logger.info(f"Cash flow statement generated: {from_date} to {to_date}")
         
@@ -766,34 +729,17 @@ class DoubleEntryAccountingService:
     ) -> Dict:
         """Get financial summary"""
         
-        # Get financial year
-        if not financial_year_id:
-            fy = db.query(FinancialYear).filter(
-                FinancialYear.company_id == company_id,
-                FinancialYear.is_active == True
-            ).first()
-            if not fy:
-                raise ValueError("No active financial year found")
-            financial_year_id = fy.id
-        
-        # Get account balances
-        balances = db.query(AccountBalance).filter(
-            AccountBalance.company_id == company_id,
-            AccountBalance.financial_year_id == financial_year_id
-        ).all()
+        financial_year_id = self._resolve_financial_year_id(db, company_id, financial_year_id)
         
         # Calculate totals by account type
         totals = {}
-        for balance in balances:
-            account = db.query(ChartOfAccount).filter(
-                ChartOfAccount.id == balance.account_id
-            ).first()
-            
-            if account:
-                account_type = account.account_type
-                if account_type not in totals:
-                    totals[account_type] = Decimal('0')
-                totals[account_type] += balance.current_balance
+        for balance in self._get_statement_balances(
+            db, company_id, financial_year_id, active_only=False
+        ):
+            account_type = balance.account_type
+            if account_type not in totals:
+                totals[account_type] = Decimal('0')
+            totals[account_type] += Decimal(str(balance.current_balance))
         
         return {
             "financial_year_id": financial_year_id,
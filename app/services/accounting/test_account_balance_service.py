@@ -0,0 +1,167 @@
+"""
+Account Balance Snapshot Tests
+Folding journal entries into the balance snapshots at commit, and re-folding edits
+"""
+import pytest
+from decimal import Decimal
+from datetime import date
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.core import ChartOfAccount
+from app.models.accounting import JournalEntry, JournalEntryItem, AccountBalanceSnapshot
+from app.services.accounting.account_balance_service import account_balance_service
+
+
+@pytest.fixture
+def session_factory():
+    """In-memory database with the accounting tables"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[
+        ChartOfAccount.__table__, JournalEntry.__table__,
+        JournalEntryItem.__table__, AccountBalanceSnapshot.__table__
+    ])
+    factory = sessionmaker(bind=engine)
+    
+    db = factory()
+    for account_id, account_type in ((1, 'asset'), (2, 'income'), (3, 'asset')):
+        db.add(ChartOfAccount(
+            id=account_id, company_id=1, account_code=str(account_id), account_name=f"Account {account_id}",
+            account_type=account_type, balance_type='debit' if account_type == 'asset' else 'credit'
+        ))
+    db.commit()
+    db.close()
+    
+    yield factory
+    engine.dispose()
+
+
+def post_entry(db, number, entry_date, amount, status='posted', debit_account=1, credit_account=2):
+    entry = JournalEntry(company_id=1, entry_number=number, entry_date=entry_date, status=status)
+    db.add(entry)
+    db.flush()
+    db.add_all([
+        JournalEntryItem(company_id=1, entry_id=entry.id, account_id=debit_account,
+                         debit_amount=Decimal(amount), credit_amount=Decimal('0')),
+        JournalEntryItem(company_id=1, entry_id=entry.id, account_id=credit_account,
+                         debit_amount=Decimal('0'), credit_amount=Decimal(amount))
+    ])
+    return entry
+
+
+def snapshots(db):
+    return {
+        (snapshot.account_id, snapshot.period_type, snapshot.period_start):
+            (snapshot.debit_total, snapshot.credit_total, snapshot.transaction_count)
+        for snapshot in db.query(AccountBalanceSnapshot).all()
+    }
+
+
+def expected_snapshots(db):
+    """Snapshots recomputed from scratch from the posted journal lines"""
+    totals = {}
+    rows = db.query(JournalEntryItem, JournalEntry).join(
+        JournalEntry, JournalEntryItem.entry_id == JournalEntry.id
+    ).filter(JournalEntry.status == 'posted')
+    for item, entry in rows:
+        for key in ((item.account_id, 'day', entry.entry_date),
+                    (item.account_id, 'month', entry.entry_date.replace(day=1))):
+            debit, credit, count = totals.get(key, (Decimal('0'), Decimal('0'), 0))
+            totals[key] = (debit + item.debit_amount, credit + item.credit_amount, count + 1)
+    return totals
+
+
+class TestSnapshotFold:
+    """Test folding postings into the snapshots when the transaction commits"""
+    
+    def test_posted_entries_are_folded_at_commit(self, session_factory):
+        """Test that entries posted without the service are folded by the commit hook"""
+        db = session_factory()
+        post_entry(db, 'JE-1', date(2024, 1, 5), '100')
+        post_entry(db, 'JE-2', date(2024, 1, 20), '40')
+        post_entry(db, 'JE-3', date(2024, 1, 20), '7', status='draft')
+        db.commit()
+        
+        assert snapshots(db)[(1, 'month', date(2024, 1, 1))] == (Decimal('140'), Decimal('0'), 2)
+        assert snapshots(db) == expected_snapshots(db)
+        assert db.query(JournalEntry).filter(
+            JournalEntry.status == 'posted', JournalEntry.balance_snapshot_at.is_(None)
+        ).count() == 0
+    
+    def test_rolled_back_postings_are_not_folded(self, session_factory):
+        """Test that a rollback discards the entries noted in the transaction"""
+        db = session_factory()
+        post_entry(db, 'JE-1', date(2024, 1, 5), '100')
+        db.rollback()
+        db.commit()
+        
+        assert snapshots(db) == {}
+
+
+class TestSnapshotRefold:
+    """Test that edits to entries already folded reach the snapshots"""
+    
+    def test_edited_amount_and_account(self, session_factory):
+        """Test changing a line's amount and account"""
+        db = session_factory()
+        entry = post_entry(db, 'JE-1', date(2024, 1, 5), '100')
+        db.commit()
+        
+        item = db.query(JournalEntryItem).filter(
+            JournalEntryItem.entry_id == entry.id, JournalEntryItem.account_id == 1
+        ).one()
+        item.debit_amount = Decimal('120')
+        item.account_id = 3
+        db.commit()
+        
+        assert (1, 'day', date(2024, 1, 5)) not in snapshots(db)
+        assert snapshots(db)[(3, 'day', date(2024, 1, 5))] == (Decimal('120'), Decimal('0'), 1)
+        assert snapshots(db) == expected_snapshots(db)
+    
+    def test_moved_and_cancelled_entries(self, session_factory):
+        """Test moving an entry to another month and cancelling another"""
+        db = session_factory()
+        moved = post_entry(db, 'JE-1', date(2024, 1, 5), '100')
+        cancelled = post_entry(db, 'JE-2', date(2024, 1, 5), '30')
+        post_entry(db, 'JE-3', date(2024, 1, 6), '10')
+        db.commit()
+        
+        moved.entry_date = date(2024, 3, 1)
+        cancelled.status = 'cancelled'
+        db.commit()
+        
+        assert snapshots(db)[(1, 'month', date(2024, 1, 1))] == (Decimal('10'), Decimal('0'), 1)
+        assert snapshots(db)[(1, 'month', date(2024, 3, 1))] == (Decimal('100'), Decimal('0'), 1)
+        assert snapshots(db) == expected_snapshots(db)
+        assert db.get(JournalEntry, cancelled.id).balance_snapshot_at is None
+    
+    def test_deleted_entry(self, session_factory):
+        """Test deleting a folded entry and its lines"""
+        db = session_factory()
+        entry = post_entry(db, 'JE-1', date(2024, 2, 10), '100')
+        post_entry(db, 'JE-2', date(2024, 2, 11), '5')
+        db.commit()
+        
+        for item in db.query(JournalEntryItem).filter(JournalEntryItem.entry_id == entry.id):
+            db.delete(item)
+        db.flush()
+        db.delete(entry)
+        db.commit()
+        
+        assert (1, 'day', date(2024, 2, 10)) not in snapshots(db)
+        assert snapshots(db) == expected_snapshots(db)
+    
+    def test_refold_matches_rebuild(self, session_factory):
+        """Test that incremental folding and re-folding agree with a full rebuild"""
+        db = session_factory()
+        entries = [post_entry(db, f'JE-{n}', date(2024, 1 + n % 3, 1 + n), str(10 + n)) for n in range(9)]
+        db.commit()
+        entries[0].status = 'cancelled'
+        entries[1].entry_date = date(2024, 5, 5)
+        db.commit()
+        folded = snapshots(db)
+        
+        account_balance_service.rebuild_balance_snapshots(db, 1)
+        
+        assert snapshots(db) == folded
@@ -13,6 +13,10 @@ from .pdf_service import PDFService
 from .performance_monitoring_service import PerformanceMonitoringService
 from .system_integration_service import SystemIntegrationService
 from .whatsapp_service import WhatsAppService
+from .document_number_service import DocumentNumberService
+from .outbox_service import OutboxService
+from .gst_period_summary_service import GSTPeriodSummaryService
+from .export_service import ExportService
 
 # Service instances
 company_service = CompanyService()
@@ -29,6 +33,10 @@ pdf_service = PDFService()
 performance_monitoring_service = PerformanceMonitoringService()
 system_integration_service = SystemIntegrationService()
 whatsapp_service = WhatsAppService()
+document_number_service = DocumentNumberService()
+outbox_service = OutboxService()
+gst_period_summary_service = GSTPeriodSummaryService()
+export_service = ExportService()
 
 __all__ = [
     "CompanyService",
@@ -45,6 +53,10 @@ __all__ = [
     "PerformanceMonitoringService",
     "SystemIntegrationService",
     "WhatsAppService",
+    "DocumentNumberService",
+    "OutboxService",
+    "GSTPeriodSummaryService",
+    "ExportService",
     "company_service",
     "settings_service",
     "discount_management_service",
@@ -58,5 +70,9 @@ __all__ = [
     "pdf_service",
     "performance_monitoring_service",
     "system_integration_service",
-    "whatsapp_service"
+    "whatsapp_service",
+    "document_number_service",
+    "outbox_service",
+    "gst_period_summary_service",
+    "export_service"
 ]
\ No newline at end of file
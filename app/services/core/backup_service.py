@@ -1,6 +1,14 @@
 """
 Backup and Restore Service for ERP System
 Integrates with existing SQLAlchemy setup
+
+Backups are snapshots of content-addressed chunks: each file is cut into
+chunks, every chunk is stored once under its SHA-256 (zlib-compressed, in
+backups/store), and a snapshot is a JSON manifest listing each file's
+chunks. A nightly backup therefore writes only the chunks that changed, and
+files whose size and modification time match the previous snapshot are not
+even read. ZIP archives from earlier versions are still listed, verified and
+restored.
 """
 
 import os
@@ -8,11 +16,19 @@ import shutil
 import json
 import logging
 import zipfile
+import hashlib
+import tempfile
+import threading
+import uuid
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Iterator, Iterable, Tuple
 import subprocess
 
+import numpy as np
 from sqlalchemy import create_engine, text
 from ..database import engine, get_database_info
 from ..config import settings
@@ -20,9 +36,35 @@ from ..config import settings
 # Configure logging
 logger = logging.getLogger(__name__)
 
+MANIFEST_SUFFIX = '.manifest.json'
+MANIFEST_FORMAT = 'erp-backup-manifest'
+
+# Chunk files start with a marker: zlib-compressed, or stored as is when compression does not help
+_ZLIB = b'z'
+_RAW = b'r'
+
+class _ArchiveBuffer:
+    """Write-only file object that hands out what a ZipFile wrote so far"""
+    
+    def __init__(self):
+        self._parts: List[bytes] = []
+    
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        return len(data)
+    
+    def flush(self):
+        pass
+    
+    def drain(self) -> Iterator[bytes]:
+        if self._parts:
+            data = b''.join(self._parts)
+            self._parts = []
+            yield data
+
 class ERPBackupService:
     """Manages backup and restore for the ERP system"""
-
+    
     def __init__(self):
         """Initialize using application settings"""
         # Set paths from settings
@@ -30,30 +72,37 @@ class ERPBackupService:
         self.upload_dir = Path(settings.upload_dir)
         self.log_dir = Path(settings.log_dir)
         self.db_type = settings.database_type
-
+        
         # Database path/URL from settings
         if self.db_type == 'sqlite':
             self.db_path = Path(settings.sqlite_path)
         else:
             # Use the database URL from settings
             self.db_url = settings.database_url
-
+        
         # Create backup directory
         self.backup_dir.mkdir(parents=True, exist_ok=True)
-
+        self.chunk_dir = self.backup_dir / 'store' / 'chunks'
+        
         # Backup settings
         self.max_backups = settings.backup_retention_days
+        self.chunk_size = settings.backup_chunk_size
+        self.workers = settings.backup_workers
+        self.compression_level = settings.backup_compression_level
         
-    def create_backup(self, 
+        # One backup, restore or prune at a time in this process
+        self._lock = threading.RLock()
+    
+    def create_backup(self,
                      backup_name: Optional[str] = None,
                      include_logs: bool = False) -> Dict[str, Any]:
         """
-        Create a complete backup of the ERP system
+        Create an incremental snapshot of the ERP system
         
         Args:
             backup_name: Optional custom backup name
             include_logs: Whether to include log files
-            
+        
         Returns:
             Dict with backup information
         """
@@ -63,58 +112,64 @@ class ERPBackupService:
                 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
                 backup_name = f"erp_backup_{timestamp}"
             
-            backup_path = self.backup_dir / backup_name
-            backup_path.mkdir(parents=True, exist_ok=True)
-            
             logger.info(f"Creating backup: {backup_name}")
             
-            # 1. Backup database
-            self._backup_database(backup_path)
-            
-            # 2. Backup uploaded files
-            self._backup_uploads(backup_path)
-            
-            # 3. Backup configuration
-            self._backup_config(backup_path)
-            
-            # 4. Optionally backup logs
-            if include_logs:
-                self._backup_logs(backup_path)
-            
-            # 5. Create metadata
-            metadata = {
-                'timestamp': datetime.now().isoformat(),
-                'version': '1.0',
-                'db_type': self.db_type,
-                'erp_version': settings.app_version,
-                'includes_logs': include_logs,
-                'company': self._get_company_info()
-            }
-            
-            with open(backup_path / 'metadata.json', 'w') as f:
-                json.dump(metadata, f, indent=2)
-            
-            # 6. Compress to ZIP
-            zip_path = self._compress_backup(backup_path)
-            
-            # 7. Clean up uncompressed files
-            shutil.rmtree(backup_path)
-            
-            # 8. Clean old backups
-            self._cleanup_old_backups()
-            
-            # Calculate backup size
-            size_mb = zip_path.stat().st_size / (1024 * 1024)
+            with self._lock:
+                # Unchanged files are taken over from the latest snapshot without reading them
+                previous = self._latest_manifest()
+                previous_files = {entry['path']: entry for entry in previous['files']} if previous else {}
+                
+                stats = {'files': 0, 'bytes': 0, 'chunks': 0, 'new_chunks': 0, 'stored_bytes': 0, 'unchanged_files': 0}
+                files = []
+                
+                with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='backup') as pool:
+                    # 1. Backup database
+                    files.append(self._backup_database(pool, stats))
+                    
+                    # 2. Backup uploaded files
+                    files.extend(self._backup_tree(pool, self.upload_dir, 'uploads', previous_files, stats))
+                    
+                    # 3. Backup configuration
+                    files.extend(self._backup_tree(pool, Path('config'), 'config', previous_files, stats))
+                    
+                    # 4. Optionally backup logs
+                    if include_logs:
+                        files.extend(self._backup_tree(pool, self.log_dir, 'logs', previous_files, stats))
+                
+                # 5. Write the manifest last, so a snapshot exists only once all its chunks do
+                manifest = {
+                    'format': MANIFEST_FORMAT,
+                    'name': backup_name,
+                    'timestamp': datetime.now().isoformat(),
+                    'version': '2.0',
+                    'db_type': self.db_type,
+                    'erp_version': settings.app_version,
+                    'includes_logs': include_logs,
+                    'company': self._get_company_info(),
+                    'stats': stats,
+                    'files': files
+                }
+                
+                manifest_path = self.backup_dir / f"{backup_name}{MANIFEST_SUFFIX}"
+                self._write_atomic(manifest_path, json.dumps(manifest, separators=(',', ':')).encode('utf-8'))
+                
+                # 6. Clean old backups
+                self._cleanup_old_backups()
             
-            logger.info(f"Backup completed: {zip_path}")
+            logger.info(
+                f"Backup completed: {manifest_path} ({stats['files']} files, "
+                f"{stats['new_chunks']} of {stats['chunks']} chunks new, "
+                f"{stats['stored_bytes'] / (1024 * 1024):.1f} MB written)"
+            )
             
             return {
                 'success': True,
-                'backup_file': str(zip_path),
-                'size_mb': round(size_mb, 2),
-                'timestamp': metadata['timestamp']
+                'backup_file': str(manifest_path),
+                'size_mb': round(stats['bytes'] / (1024 * 1024), 2),
+                'written_mb': round(stats['stored_bytes'] / (1024 * 1024), 2),
+                'timestamp': manifest['timestamp']
             }
-            
+        
         except Exception as e:
             logger.error(f"Backup failed: {str(e)}")
             return {
@@ -122,30 +177,36 @@ class ERPBackupService:
                 'error': str(e)
             }
     
-    def _backup_database(self, backup_path: Path) -> None:
-        """Backup the database"""
+    def _backup_database(self, pool: ThreadPoolExecutor, stats: Dict) -> Dict:
+        """Chunk a consistent copy of the SQLite database, or pg_dump's output"""
         if self.db_type == 'sqlite':
-            # SQLite backup - simple file copy with proper handling
             import sqlite3
             
-            backup_db_path = backup_path / 'erp_system.db'
-            
-            # Use SQLite backup API for consistency
-            source = sqlite3.connect(str(self.db_path))
-            dest = sqlite3.connect(str(backup_db_path))
-            
-            with dest:
-                source.backup(dest)
-            
-            source.close()
-            dest.close()
+            # Take a consistent copy with the backup API, then chunk the copy. The
+            # copy runs in one read transaction, which in WAL mode blocks no writer,
+            # and no lock is held while the chunks are hashed and compressed.
+            copy_path = self.backup_dir / f".erp_system.{uuid.uuid4().hex[:8]}.db.tmp"
+            try:
+                source = sqlite3.connect(str(self.db_path), timeout=60)
+                target = sqlite3.connect(str(copy_path))
+                try:
+                    source.backup(target)
+                finally:
+                    target.close()
+                    source.close()
+                
+                stat = self.db_path.stat()
+                with open(copy_path, 'rb') as f:
+                    entry = self._store_stream(pool, self._fixed_chunks(f), stats)
+            finally:
+                copy_path.unlink(missing_ok=True)
             
+            entry.update(path='erp_system.db', mtime_ns=stat.st_mtime_ns, mode=stat.st_mode & 0o777)
             logger.info("Database backed up (SQLite)")
-            
+            return entry
+        
         else:
             # PostgreSQL backup
-            backup_file = backup_path / 'erp_system.sql'
-            
             # Parse connection details
             from urllib.parse import urlparse
             parsed = urlparse(self.db_url)
@@ -156,42 +217,202 @@ class ERPBackupService:
                 '-p', str(parsed.port),
                 '-U', parsed.username,
                 '-d', parsed.path.lstrip('/'),
-                '-f', str(backup_file),
-                '--no-owner'
+                '--no-owner',
+                '--clean',
+                '--if-exists'
             ]
             
             env = os.environ.copy()
             if parsed.password:
                 env['PGPASSWORD'] = parsed.password
             
-            result = subprocess.run(cmd, env=env, capture_output=True, text=True)
-            
-            if result.returncode != 0:
-                raise Exception(f"pg_dump failed: {result.stderr}")
-            
+            # The dump is chunked as it is produced; content-defined boundaries keep
+            # unchanged tables deduplicated even when earlier ones grow. stderr goes
+            # to a file, so a noisy pg_dump cannot block on a full pipe.
+            with tempfile.TemporaryFile() as errors:
+                process = subprocess.Popen(cmd, env=env, stdout=subprocess.PIPE, stderr=errors)
+                try:
+                    entry = self._store_stream(pool, self._content_chunks(process.stdout), stats)
+                finally:
+                    process.stdout.close()
+                    process.wait()
+                errors.seek(0)
+                stderr = errors.read().decode('utf-8', errors='replace')
+            
+            if process.returncode != 0:
+                raise Exception(f"pg_dump failed: {stderr}")
+            
+            entry.update(path='erp_system.sql', mtime_ns=None, mode=0o600)
             logger.info("Database backed up (PostgreSQL)")
+            return entry
+    
+    def _backup_tree(
+        self,
+        pool: ThreadPoolExecutor,
+        root: Path,
+        prefix: str,
+        previous_files: Dict[str, Dict],
+        stats: Dict
+    ) -> List[Dict]:
+        """Backup a directory file by file, reusing unchanged files from the previous snapshot"""
+        entries = []
+        if not root.exists():
+            return entries
+        
+        for directory, _, names in os.walk(root):
+            for name in sorted(names):
+                file_path = Path(directory) / name
+                path = f"{prefix}/{file_path.relative_to(root).as_posix()}"
+                stat = file_path.stat()
+                
+                previous = previous_files.get(path)
+                if (
+                    previous is not None
+                    and previous['size'] == stat.st_size
+                    and previous.get('mtime_ns') == stat.st_mtime_ns
+                    and all(self._chunk_path(digest).exists() for digest, _ in previous['chunks'])
+                ):
+                    entry = dict(previous)
+                    stats['files'] += 1
+                    stats['bytes'] += entry['size']
+                    stats['chunks'] += len(entry['chunks'])
+                    stats['unchanged_files'] += 1
+                else:
+                    with open(file_path, 'rb') as f:
+                        entry = self._store_stream(pool, self._fixed_chunks(f), stats)
+                    entry.update(path=path, mtime_ns=stat.st_mtime_ns, mode=stat.st_mode & 0o777)
+                
+                entries.append(entry)
+        
+        if entries:
+            logger.info(f"{prefix.title()} backed up ({len(entries)} files)")
+        return entries
     
-    def _backup_uploads(self, backup_path: Path) -> None:
-        """Backup uploaded files"""
-        if self.upload_dir.exists() and any(self.upload_dir.iterdir()):
-            dest_path = backup_path / 'uploads'
-            shutil.copytree(self.upload_dir, dest_path)
-            logger.info("Uploaded files backed up")
-    
-    def _backup_config(self, backup_path: Path) -> None:
-        """Backup configuration files"""
-        config_dir = Path('config')
-        if config_dir.exists():
-            dest_path = backup_path / 'config'
-            shutil.copytree(config_dir, dest_path)
-            logger.info("Configuration backed up")
-    
-    def _backup_logs(self, backup_path: Path) -> None:
-        """Backup log files"""
-        if self.log_dir.exists() and any(self.log_dir.iterdir()):
-            dest_path = backup_path / 'logs'
-            shutil.copytree(self.log_dir, dest_path)
-            logger.info("Log files backed up")
+    def _store_stream(self, pool: ThreadPoolExecutor, chunks: Iterable[bytes], stats: Dict) -> Dict:
+        """Hash, compress and store chunks on the pool, keeping a bounded number in flight"""
+        pending = deque()
+        stored = []
+        size = 0
+        
+        def collect(future):
+            digest, length, written = future.result()
+            stored.append([digest, length])
+            stats['chunks'] += 1
+            if written:
+                stats['new_chunks'] += 1
+                stats['stored_bytes'] += written
+        
+        for data in chunks:
+            size += len(data)
+            pending.append(pool.submit(self._store_chunk, data))
+            if len(pending) > self.workers * 2:
+                collect(pending.popleft())
+        
+        while pending:
+            collect(pending.popleft())
+        
+        stats['files'] += 1
+        stats['bytes'] += size
+        return {'size': size, 'chunks': stored}
+    
+    def _store_chunk(self, data: bytes) -> Tuple[str, int, int]:
+        """Store a chunk unless the store already has it; returns (digest, size, bytes written)"""
+        digest = hashlib.sha256(data).hexdigest()
+        chunk_path = self._chunk_path(digest)
+        if chunk_path.exists():
+            return digest, len(data), 0
+        
+        compressed = zlib.compress(data, self.compression_level)
+        payload = _ZLIB + compressed if len(compressed) < len(data) else _RAW + data
+        chunk_path.parent.mkdir(parents=True, exist_ok=True)
+        self._write_atomic(chunk_path, payload)
+        return digest, len(data), len(payload)
+    
+    def _fixed_chunks(self, f) -> Iterator[bytes]:
+        """Fixed-size chunks: a multiple of the SQLite page size, so changed pages change few chunks"""
+        while True:
+            data = f.read(self.chunk_size)
+            if not data:
+                break
+            yield data
+    
+    def _content_chunks(self, f) -> Iterator[bytes]:
+        """
+        Content-defined chunks for streams whose contents shift (database dumps).
+        
+        A boundary falls where a rolling hash of the last 64 bytes matches a
+        mask, so it moves with the content; the hash is computed for a whole
+        read at once with numpy. Chunks average chunk_size, within a quarter
+        and four times that.
+        """
+        window = 64
+        min_size = self.chunk_size // 4
+        max_size = self.chunk_size * 4
+        mask = (1 << max(int(self.chunk_size // 2).bit_length() - 1, 1)) - 1
+        table = np.random.default_rng(0x5EED).integers(0, 2 ** 63, size=256, dtype=np.uint64)
+        
+        buffer = b''
+        while True:
+            data = f.read(self.chunk_size)
+            if data:
+                buffer += data
+            if not buffer:
+                break
+            if data and len(buffer) < max_size:
+                continue
+            
+            # Rolling sum of per-byte random values over the window, for every position
+            values = table[np.frombuffer(buffer, dtype=np.uint8)]
+            sums = np.cumsum(values, dtype=np.uint64)
+            rolling = sums[window:] - sums[:-window]
+            candidates = np.flatnonzero(((rolling * np.uint64(0x9E3779B97F4A7C15) >> np.uint64(40)) & np.uint64(mask)) == 0) + window + 1
+            
+            start = 0
+            for boundary in candidates:
+                if boundary - start < min_size:
+                    continue
+                while boundary - start > max_size:
+                    yield buffer[start:start + max_size]
+                    start += max_size
+                yield buffer[start:boundary]
+                start = int(boundary)
+            
+            if not data:
+                # End of stream
+                while start < len(buffer):
+                    yield buffer[start:start + max_size]
+                    start += max_size
+                break
+            
+            # Cut overlong runs without a boundary; keep the tail for the next read
+            while len(buffer) - start > max_size:
+                yield buffer[start:start + max_size]
+                start += max_size
+            buffer = buffer[start:]
+    
+    def _chunk_path(self, digest: str) -> Path:
+        return self.chunk_dir / digest[:2] / digest
+    
+    def _read_chunk(self, digest: str, verify: bool = True) -> bytes:
+        chunk_path = self._chunk_path(digest)
+        if not chunk_path.exists():
+            raise FileNotFoundError(f"Missing chunk: {digest}")
+        
+        payload = chunk_path.read_bytes()
+        data = zlib.decompress(payload[1:]) if payload[:1] == _ZLIB else payload[1:]
+        if verify and hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Corrupted chunk: {digest}")
+        return data
+    
+    def _iter_file(self, entry: Dict, verify: bool = True) -> Iterator[bytes]:
+        for digest, _ in entry['chunks']:
+            yield self._read_chunk(digest, verify)
+    
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        temp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
     
     def _get_company_info(self) -> Dict:
         """Get company information from database"""
@@ -214,21 +435,34 @@ class ERPBackupService:
         
         return {}
     
-    def _compress_backup(self, backup_path: Path) -> Path:
-        """Compress backup to ZIP"""
-        zip_path = backup_path.with_suffix('.zip')
-        
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
-            for root, dirs, files in os.walk(backup_path):
-                for file in files:
-                    file_path = Path(root) / file
-                    arc_name = file_path.relative_to(backup_path)
-                    zf.write(file_path, arc_name)
-        
-        return zip_path
+    def is_manifest(self, backup_file: str) -> bool:
+        return str(backup_file).endswith(MANIFEST_SUFFIX)
+    
+    def _read_manifest(self, manifest_path: Path) -> Dict:
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+        if manifest.get('format') != MANIFEST_FORMAT:
+            raise ValueError(f"Not a backup manifest: {manifest_path.name}")
+        return manifest
+    
+    def _manifests(self) -> List[Tuple[Path, Dict]]:
+        """Snapshots in this backup directory, newest first"""
+        manifests = []
+        for manifest_path in self.backup_dir.glob(f"*{MANIFEST_SUFFIX}"):
+            try:
+                manifests.append((manifest_path, self._read_manifest(manifest_path)))
+            except Exception as e:
+                logger.warning(f"Skipping unreadable backup manifest {manifest_path.name}: {e}")
+        return sorted(manifests, key=lambda item: item[1].get('timestamp', ''), reverse=True)
+    
+    def _latest_manifest(self) -> Optional[Dict]:
+        for _, manifest in self._manifests():
+            if manifest.get('db_type') == self.db_type:
+                return manifest
+        return None
     
     def _cleanup_old_backups(self) -> None:
-        """Remove old backups exceeding limit"""
+        """Remove old backups exceeding limit, then the chunks no snapshot uses"""
         backups = sorted(
             self.backup_dir.glob('erp_backup_*.zip'),
             key=lambda x: x.stat().st_mtime,
@@ -239,14 +473,80 @@ class ERPBackupService:
             for old_backup in backups[self.max_backups:]:
                 old_backup.unlink()
                 logger.info(f"Deleted old backup: {old_backup.name}")
+        
+        manifests = self._manifests()
+        if len(manifests) > self.max_backups:
+            for manifest_path, _ in manifests[self.max_backups:]:
+                manifest_path.unlink()
+                logger.info(f"Deleted old backup: {manifest_path.name}")
+            self.prune_chunks()
+    
+    def prune_chunks(self, grace_seconds: int = 3600) -> Dict[str, Any]:
+        """
+        Delete chunks that no manifest references. Chunks newer than the grace
+        period are kept, as a backup in another process may still be writing its manifest.
+        """
+        with self._lock:
+            referenced = set()
+            for _, manifest in self._manifests():
+                referenced.update(digest for entry in manifest['files'] for digest, _ in entry['chunks'])
+            
+            cutoff = datetime.now().timestamp() - grace_seconds
+            removed = 0
+            freed = 0
+            if self.chunk_dir.exists():
+                for chunk_path in self.chunk_dir.glob('*/*'):
+                    if chunk_path.name in referenced or chunk_path.name.startswith('.'):
+                        continue
+                    stat = chunk_path.stat()
+                    if stat.st_mtime > cutoff:
+                        continue
+                    chunk_path.unlink()
+                    removed += 1
+                    freed += stat.st_size
+            
+            if removed:
+                logger.info(f"Pruned {removed} unused backup chunks ({freed / (1024 * 1024):.1f} MB)")
+            
+            return {'removed': removed, 'freed_mb': round(freed / (1024 * 1024), 2)}
+    
+    def delete_backup(self, backup_file: str) -> Dict[str, Any]:
+        """Delete a snapshot (and the chunks only it used) or an archive"""
+        try:
+            backup_path = self._resolve(backup_file)
+            if not backup_path.exists():
+                raise FileNotFoundError(f"Backup file not found: {backup_file}")
+            
+            with self._lock:
+                backup_path.unlink()
+                if self.is_manifest(backup_path.name):
+                    self.prune_chunks()
+            
+            logger.info(f"Deleted backup: {backup_path.name}")
+            return {'success': True}
+        
+        except Exception as e:
+            logger.error(f"Backup delete failed: {str(e)}")
+            return {'success': False, 'error': str(e)}
+    
+    def _resolve(self, backup_file: str) -> Path:
+        """A backup path given either as a name in the backup directory or a full path within it"""
+        backup_path = Path(backup_file)
+        if not backup_path.is_absolute() and not backup_path.exists():
+            backup_path = self.backup_dir / backup_path
+        
+        backup_dir = self.backup_dir.resolve()
+        if backup_dir not in backup_path.resolve().parents:
+            raise ValueError("Backup file must be inside the backup directory")
+        return backup_path
     
     def restore_backup(self, backup_file: str) -> Dict[str, Any]:
         """
-        Restore from backup file
+        Restore from a snapshot manifest or a backup ZIP file
         
         Args:
-            backup_file: Path to backup ZIP file
-            
+            backup_file: Path to backup manifest or ZIP file
+        
         Returns:
             Dict with restore status
         """
@@ -264,6 +564,18 @@ class ERPBackupService:
             if not safety_backup['success']:
                 raise Exception("Failed to create safety backup")
             
+            if self.is_manifest(backup_path.name):
+                with self._lock:
+                    self._restore_snapshot(self._read_manifest(backup_path))
+                
+                logger.info("Restore completed successfully")
+                
+                return {
+                    'success': True,
+                    'message': 'Restore completed successfully',
+                    'safety_backup': safety_backup['backup_file']
+                }
+            
             # Extract backup
             temp_dir = self.backup_dir / f"temp_restore_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
             temp_dir.mkdir(parents=True, exist_ok=True)
@@ -295,12 +607,12 @@ class ERPBackupService:
                     'message': 'Restore completed successfully',
                     'safety_backup': safety_backup['backup_file']
                 }
-                
+            
             finally:
                 # Clean up temp directory
                 if temp_dir.exists():
                     shutil.rmtree(temp_dir)
-                    
+        
         except Exception as e:
             logger.error(f"Restore failed: {str(e)}")
             return {
@@ -308,18 +620,142 @@ class ERPBackupService:
                 'error': str(e)
             }
     
+    def _restore_snapshot(self, manifest: Dict) -> None:
+        """Restore a snapshot from the chunk store, checking every chunk's hash as it is read"""
+        # Verify compatibility
+        if manifest['db_type'] != self.db_type:
+            raise ValueError("Database type mismatch")
+        
+        # Fail before anything is replaced if a chunk is missing
+        missing = [
+            entry['path'] for entry in manifest['files']
+            if not all(self._chunk_path(digest).exists() for digest, _ in entry['chunks'])
+        ]
+        if missing:
+            raise FileNotFoundError(f"Backup chunks missing for: {', '.join(missing[:5])}")
+        
+        sections: Dict[str, List[Dict]] = {}
+        for entry in manifest['files']:
+            section = entry['path'].split('/', 1)[0] if '/' in entry['path'] else 'database'
+            sections.setdefault(section, []).append(entry)
+        
+        # Restore components
+        for entry in sections.get('database', []):
+            self._restore_snapshot_database(entry)
+        
+        if 'uploads' in sections:
+            self._restore_snapshot_tree(sections['uploads'], self.upload_dir, 'uploads')
+            logger.info("Uploaded files restored")
+        
+        # Configuration is not restored, as for archives
+        logger.info("Configuration selectively restored")
+        
+        if manifest.get('includes_logs') and 'logs' in sections:
+            if self.log_dir.exists():
+                # Archive current logs instead of deleting
+                archive_dir = self.log_dir.parent / f"logs_archive_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+                shutil.move(self.log_dir, archive_dir)
+            self._restore_snapshot_tree(sections['logs'], self.log_dir, 'logs')
+            logger.info("Log files restored")
+    
+    def _replace_sqlite_database(self, source_path: Path) -> None:
+        """
+        Copy a restored database into the live one with the backup API.
+        
+        The copy takes the database's write lock and goes through its WAL, so
+        connections that stay open, in this process or another, see the old
+        contents until it commits and the restored contents afterwards. The
+        file is never swapped or its WAL deleted under them.
+        """
+        import sqlite3
+        
+        source = sqlite3.connect(str(source_path))
+        target = sqlite3.connect(str(self.db_path), timeout=60)
+        try:
+            result = source.execute('PRAGMA integrity_check').fetchone()[0]
+            if result != 'ok':
+                raise ValueError(f"Backup database failed its integrity check: {result}")
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+    
+    def _restore_snapshot_database(self, entry: Dict) -> None:
+        if self.db_type == 'sqlite':
+            # Rebuild the file beside the database, then copy it in
+            temp_path = self.db_path.with_name(f".{self.db_path.name}.restore")
+            try:
+                with open(temp_path, 'wb') as f:
+                    for data in self._iter_file(entry):
+                        f.write(data)
+                self._replace_sqlite_database(temp_path)
+            finally:
+                temp_path.unlink(missing_ok=True)
+            logger.info("Database restored (SQLite)")
+        else:
+            # PostgreSQL restore: the dump drops and recreates its objects
+            from urllib.parse import urlparse
+            parsed = urlparse(self.db_url)
+            
+            cmd = [
+                'psql',
+                '-h', parsed.hostname,
+                '-p', str(parsed.port),
+                '-U', parsed.username,
+                '-d', parsed.path.lstrip('/'),
+                '-v', 'ON_ERROR_STOP=1',
+                '-q'
+            ]
+            
+            env = os.environ.copy()
+            if parsed.password:
+                env['PGPASSWORD'] = parsed.password
+            
+            with tempfile.TemporaryFile() as errors:
+                process = subprocess.Popen(cmd, env=env, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=errors)
+                try:
+                    for data in self._iter_file(entry):
+                        process.stdin.write(data)
+                finally:
+                    process.stdin.close()
+                    process.wait()
+                errors.seek(0)
+                stderr = errors.read().decode('utf-8', errors='replace')
+            
+            if process.returncode != 0:
+                raise Exception(f"psql restore failed: {stderr}")
+            
+            logger.info("Database restored (PostgreSQL)")
+    
+    def _restore_snapshot_tree(self, entries: List[Dict], target: Path, prefix: str) -> None:
+        """Rebuild a directory beside the target, then swap it in"""
+        staging = target.with_name(f".{target.name}.restore")
+        if staging.exists():
+            shutil.rmtree(staging)
+        
+        for entry in entries:
+            file_path = staging / entry['path'][len(prefix) + 1:]
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(file_path, 'wb') as f:
+                for data in self._iter_file(entry):
+                    f.write(data)
+            if entry.get('mode'):
+                os.chmod(file_path, entry['mode'])
+            if entry.get('mtime_ns'):
+                os.utime(file_path, ns=(entry['mtime_ns'], entry['mtime_ns']))
+        
+        if target.exists():
+            shutil.rmtree(target)
+        staging.mkdir(parents=True, exist_ok=True)
+        os.replace(staging, target)
+    
     def _restore_database(self, restore_path: Path) -> None:
         """Restore database from backup"""
         if self.db_type == 'sqlite':
             backup_db = restore_path / 'erp_system.db'
             
             if backup_db.exists():
-                # Close all connections
-                from ..database import engine
-                engine.dispose()
-                
-                # Replace database file
-                shutil.copy2(backup_db, self.db_path)
+                self._replace_sqlite_database(backup_db)
                 logger.info("Database restored (SQLite)")
         else:
             # PostgreSQL restore
@@ -363,10 +799,39 @@ class ERPBackupService:
             shutil.copytree(backup_logs, self.log_dir)
             logger.info("Log files restored")
     
+    def iter_backup_archive(self, backup_file: str) -> Iterator[bytes]:
+        """
+        A snapshot as a ZIP archive (the same layout as archived backups),
+        compressed and streamed as its chunks are read
+        """
+        manifest = self._read_manifest(Path(backup_file))
+        metadata = {key: value for key, value in manifest.items() if key not in ('files', 'format')}
+        
+        buffer = _ArchiveBuffer()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr('metadata.json', json.dumps(metadata, indent=2))
+            for entry in manifest['files']:
+                with zf.open(entry['path'], 'w', force_zip64=True) as target:
+                    for data in self._iter_file(entry):
+                        target.write(data)
+                        yield from buffer.drain()
+        
+        yield from buffer.drain()
+    
     def list_backups(self) -> List[Dict]:
         """List all available backups"""
         backups = []
         
+        for manifest_path, manifest in self._manifests():
+            stats = manifest.get('stats', {})
+            backups.append({
+                'filename': manifest_path.name,
+                'path': str(manifest_path),
+                'size_mb': round(stats.get('bytes', 0) / (1024 * 1024), 2),
+                'created': manifest.get('timestamp'),
+                'metadata': {key: value for key, value in manifest.items() if key not in ('files', 'format')}
+            })
+        
         for backup_file in sorted(self.backup_dir.glob('erp_backup_*.zip'), reverse=True):
             stat = backup_file.stat()
             
@@ -388,16 +853,22 @@ class ERPBackupService:
                 'metadata': metadata
             })
         
-        return backups
+        return sorted(backups, key=lambda backup: backup['created'] or '', reverse=True)
     
-    def verify_backup(self, backup_file: str) -> Dict[str, Any]:
-        """Verify backup integrity"""
+    def verify_backup(self, backup_file: str, deep: bool = True) -> Dict[str, Any]:
+        """
+        Verify backup integrity. For snapshots every chunk must be present and,
+        when deep, decompress to its hash and add up to the file sizes.
+        """
         try:
             backup_path = Path(backup_file)
             
             if not backup_path.exists():
                 return {'valid': False, 'error': 'File not found'}
             
+            if self.is_manifest(backup_path.name):
+                return self._verify_snapshot(self._read_manifest(backup_path), deep)
+            
             with zipfile.ZipFile(backup_path, 'r') as zf:
                 # Check for corruption
                 bad_file = zf.testzip()
@@ -425,9 +896,47 @@ class ERPBackupService:
                     'metadata': metadata,
                     'files': len(files)
                 }
-                
+        
         except Exception as e:
             return {'valid': False, 'error': str(e)}
+    
+    def _verify_snapshot(self, manifest: Dict, deep: bool) -> Dict[str, Any]:
+        paths = {entry['path'] for entry in manifest['files']}
+        required = 'erp_system.db' if manifest.get('db_type') == 'sqlite' else 'erp_system.sql'
+        if required not in paths:
+            return {'valid': False, 'error': f'Missing: {required}'}
+        
+        # Each distinct chunk is checked once, on the pool
+        chunks = {}
+        for entry in manifest['files']:
+            if sum(length for _, length in entry['chunks']) != entry['size']:
+                return {'valid': False, 'error': f"Size mismatch: {entry['path']}"}
+            for digest, length in entry['chunks']:
+                chunks[digest] = (length, entry['path'])
+        
+        def check(item):
+            digest, (length, path) = item
+            if deep:
+                if len(self._read_chunk(digest)) != length:
+                    raise ValueError(f"Corrupted chunk: {digest}")
+            elif not self._chunk_path(digest).exists():
+                raise FileNotFoundError(f"Missing chunk: {digest}")
+            return path
+        
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='backup-verify') as pool:
+            futures = [(item[1][1], pool.submit(check, item)) for item in chunks.items()]
+            for path, future in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    return {'valid': False, 'error': f"{path}: {e}"}
+        
+        return {
+            'valid': True,
+            'metadata': {key: value for key, value in manifest.items() if key not in ('files', 'format')},
+            'files': len(manifest['files']),
+            'chunks': len(chunks)
+        }
 
 
 # Singleton instance
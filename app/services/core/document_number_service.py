@@ -0,0 +1,353 @@
+# backend/app/services/document_number_service.py
+from sqlalchemy.orm import Session
+from sqlalchemy import select, update, func, case
+from sqlalchemy.exc import IntegrityError
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Optional, Tuple, Callable, Generator
+import threading
+import logging
+
+from ..models.sales import BillSeries, BillNumberBlock
+from ..database import get_db_session
+
+logger = logging.getLogger(__name__)
+
+class DocumentNumberService:
+    """
+    Number allocation for document series (sales, purchase, returns,
+    payments, adjustments, POS).
+    
+    Numbers are reserved with a single atomic UPDATE on the series row, so
+    concurrent workers never hand out the same number. Gapless series
+    (GST invoices) reserve inside the caller's transaction: a rollback
+    returns the number and concurrent documents queue on the row lock.
+    Other series reserve in a short transaction of their own, so the row
+    lock is held only for that UPDATE. Series with a block size can hand
+    each POS session a pre-allocated range. SQLite has a single writer, so
+    there everything runs in the caller's transaction.
+    """
+    
+    # Series created on first use: document_type -> (name, prefix, number length, gapless)
+    # Tax invoices and credit notes must be numbered consecutively, so they are gapless
+    DEFAULT_SERIES = {
+        "sale": ("Sale Bills", "S", 6, True),
+        "sale_return": ("Sale Returns", "SR", 6, True),
+        "purchase": ("Purchase Bills", "PB", 6, False),
+        "purchase_return": ("Purchase Returns", "PRT", 6, False),
+        "purchase_order": ("Purchase Orders", "PO", 4, False),
+        "purchase_invoice": ("Purchase Invoices", "PI", 4, False),
+        "payment_received": ("Payments Received", "PR", 4, False),
+        "payment_made": ("Payments Made", "PP", 4, False),
+        "stock_adjustment": ("Stock Adjustments", "ADJ", 6, False),
+        "pos_transaction": ("POS Transactions", "POS", 8, False),
+    }
+    
+    default_block_size = 50
+    
+    # (company_id, document_type, period) -> series id; series rows are looked up by primary key.
+    # Least recently used first, so series of past periods fall out once the cache is full.
+    max_cached_series = 1000
+    _series_ids: "OrderedDict[Tuple[Optional[int], str, Optional[str]], int]" = OrderedDict()
+    _series_lock = threading.Lock()
+    
+    def __init__(self):
+        pass
+    
+    @classmethod
+    def clear_series_cache(cls):
+        """Forget cached series ids (after series are created, deactivated or re-defaulted)"""
+        with cls._series_lock:
+            cls._series_ids.clear()
+    
+    def next_number(
+        self,
+        db: Session,
+        company_id: Optional[int],
+        document_type: str,
+        pos_session_id: Optional[int] = None,
+        create: bool = True,
+        seed: Optional[Callable[[Session], int]] = None,
+        period: Optional[str] = None
+    ) -> str:
+        """
+        Allocate the next formatted number for a document type.
+        Pass pos_session_id to draw from the session's pre-allocated block,
+        or a period (e.g. '20240131') to number within a series of its own
+        whose prefix ends with the period.
+        """
+        series = self.get_series(db, company_id, document_type, create=create, seed=seed, period=period)
+        
+        if pos_session_id is not None and series.block_size and not series.is_gapless:
+            return self.allocate_from_block(db, series, pos_session_id)
+        
+        with self._allocation_session(db, series) as allocation_db:
+            number, row = self.reserve_numbers(allocation_db, series.id)
+        
+        return self._format_number(row, number)
+    
+    def peek_number(
+        self,
+        db: Session,
+        company_id: Optional[int],
+        document_type: str,
+        period: Optional[str] = None
+    ) -> str:
+        """
+        Preview the number the next document on the series would get,
+        without reserving it (a concurrent document may still take it)
+        """
+        series = self.get_series(db, company_id, document_type, create=False, period=period)
+        
+        current = series.current_number or 0
+        floor = (series.starting_number or 1) - 1
+        
+        return series.format_number(max(current, floor) + 1)
+    
+    def get_series(
+        self,
+        db: Session,
+        company_id: Optional[int],
+        document_type: str,
+        create: bool = True,
+        seed: Optional[Callable[[Session], int]] = None,
+        period: Optional[str] = None
+    ) -> BillSeries:
+        """Get the default active series for a document type (and period), creating it if allowed"""
+        
+        key = (company_id, document_type, period)
+        with self._series_lock:
+            series_id = self._series_ids.get(key)
+            if series_id is not None:
+                self._series_ids.move_to_end(key)
+        if series_id is not None:
+            series = db.get(BillSeries, series_id)
+            if series is not None and series.is_active:
+                return series
+            with self._series_lock:
+                self._series_ids.pop(key, None)
+        
+        series = self._find_series(db, company_id, document_type, period)
+        
+        if series is None:
+            if not create or document_type not in self.DEFAULT_SERIES:
+                raise ValueError(f"No bill series found for document type: {document_type}")
+            series = self._create_series(db, company_id, document_type, seed, period)
+        
+        with self._series_lock:
+            self._series_ids[key] = series.id
+            self._series_ids.move_to_end(key)
+            while len(self._series_ids) > self.max_cached_series:
+                self._series_ids.popitem(last=False)
+        return series
+    
+    def reserve_numbers(self, db: Session, series_id: int, count: int = 1):
+        """
+        Atomically reserve `count` consecutive numbers on a series.
+        Returns the first reserved number and the series formatting row.
+        """
+        current = func.coalesce(BillSeries.current_number, 0)
+        floor = func.coalesce(BillSeries.starting_number, 1) - 1
+        
+        stmt = update(BillSeries).where(
+            BillSeries.id == series_id
+        ).values(
+            current_number=case((current < floor, floor), else_=current) + count
+        ).execution_options(synchronize_session=False)
+        
+        columns = (BillSeries.current_number, BillSeries.prefix, BillSeries.suffix, BillSeries.number_length)
+        
+        if db.get_bind().dialect.update_returning:
+            row = db.execute(stmt.returning(*columns)).first()
+        else:
+            # The UPDATE holds the row lock, so the read-back sees our own value
+            db.execute(stmt)
+            row = db.execute(select(*columns).where(BillSeries.id == series_id)).first()
+        
+        if row is None:
+            raise ValueError(f"Bill series {series_id} not found")
+        
+        return row.current_number - count + 1, row
+    
+    def reserve_block(
+        self,
+        db: Session,
+        series: BillSeries,
+        pos_session_id: int,
+        size: Optional[int] = None
+    ) -> BillNumberBlock:
+        """Pre-allocate a range of numbers to a POS session"""
+        
+        with self._allocation_session(db, series) as allocation_db:
+            block = self._reserve_block(allocation_db, series, pos_session_id, size)
+        
+        return block
+    
+    def allocate_from_block(self, db: Session, series: BillSeries, pos_session_id: int) -> str:
+        """Take the next number from the session's open block, reserving a new block when exhausted"""
+        
+        with self._allocation_session(db, series) as allocation_db:
+            while True:
+                block_id = allocation_db.execute(
+                    select(BillNumberBlock.id).where(
+                        BillNumberBlock.series_id == series.id,
+                        BillNumberBlock.pos_session_id == pos_session_id,
+                        BillNumberBlock.status == 'open'
+                    ).order_by(BillNumberBlock.id).limit(1)
+                ).scalar()
+                
+                if block_id is None:
+                    block_id = self._reserve_block(allocation_db, series, pos_session_id).id
+                
+                number = self._take_from_block(allocation_db, block_id)
+                if number is not None:
+                    break
+                
+                allocation_db.execute(
+                    update(BillNumberBlock).where(
+                        BillNumberBlock.id == block_id
+                    ).values(status='exhausted').execution_options(synchronize_session=False)
+                )
+        
+        return series.format_number(number)
+    
+    def release_session_blocks(self, db: Session, pos_session_id: int) -> int:
+        """Close a POS session's open blocks; returns how many numbers went unused"""
+        
+        unused = db.query(
+            func.coalesce(func.sum(BillNumberBlock.end_number - BillNumberBlock.next_number + 1), 0)
+        ).filter(
+            BillNumberBlock.pos_session_id == pos_session_id,
+            BillNumberBlock.status == 'open'
+        ).scalar()
+        
+        db.execute(
+            update(BillNumberBlock).where(
+                BillNumberBlock.pos_session_id == pos_session_id,
+                BillNumberBlock.status == 'open'
+            ).values(status='released').execution_options(synchronize_session=False)
+        )
+        
+        if unused:
+            logger.info(f"POS session {pos_session_id} released {unused} unused bill numbers")
+        
+        return int(unused)
+    
+    def _reserve_block(
+        self,
+        db: Session,
+        series: BillSeries,
+        pos_session_id: int,
+        size: Optional[int] = None
+    ) -> BillNumberBlock:
+        size = size or series.block_size or self.default_block_size
+        
+        first_number, _ = self.reserve_numbers(db, series.id, size)
+        block = BillNumberBlock(
+            company_id=series.company_id,
+            series_id=series.id,
+            pos_session_id=pos_session_id,
+            start_number=first_number,
+            end_number=first_number + size - 1,
+            next_number=first_number,
+            status='open'
+        )
+        db.add(block)
+        db.flush()
+        
+        logger.info(
+            f"Reserved bill numbers {block.start_number}-{block.end_number} "
+            f"on series {series.series_code} for POS session {pos_session_id}"
+        )
+        
+        return block
+    
+    def _take_from_block(self, db: Session, block_id: int) -> Optional[int]:
+        stmt = update(BillNumberBlock).where(
+            BillNumberBlock.id == block_id,
+            BillNumberBlock.next_number <= BillNumberBlock.end_number
+        ).values(
+            next_number=BillNumberBlock.next_number + 1
+        ).execution_options(synchronize_session=False)
+        
+        if db.get_bind().dialect.update_returning:
+            next_number = db.execute(stmt.returning(BillNumberBlock.next_number)).scalar()
+        else:
+            if db.execute(stmt).rowcount == 0:
+                return None
+            next_number = db.execute(
+                select(BillNumberBlock.next_number).where(BillNumberBlock.id == block_id)
+            ).scalar()
+        
+        return next_number - 1 if next_number is not None else None
+    
+    def _find_series(
+        self,
+        db: Session,
+        company_id: Optional[int],
+        document_type: str,
+        period: Optional[str] = None
+    ) -> Optional[BillSeries]:
+        company_filter = BillSeries.company_id.is_(None) if company_id is None else BillSeries.company_id == company_id
+        
+        query = db.query(BillSeries).filter(
+            company_filter,
+            BillSeries.document_type == document_type,
+            BillSeries.is_active == True
+        )
+        if period is not None:
+            query = query.filter(BillSeries.prefix == self.DEFAULT_SERIES[document_type][1] + period)
+        
+        return query.order_by(BillSeries.is_default.desc(), BillSeries.id).first()
+    
+    def _create_series(
+        self,
+        db: Session,
+        company_id: Optional[int],
+        document_type: str,
+        seed: Optional[Callable[[Session], int]] = None,
+        period: Optional[str] = None
+    ) -> BillSeries:
+        series_name, prefix, number_length, is_gapless = self.DEFAULT_SERIES[document_type]
+        series_code = f"{document_type.upper()}-{company_id or 0}"
+        if period is not None:
+            series_name, prefix, series_code = f"{series_name} {period}", prefix + period, f"{series_code}-{period}"
+        
+        try:
+            with self._allocation_session(db) as setup_db:
+                with setup_db.begin_nested():
+                    setup_db.add(BillSeries(
+                        company_id=company_id,
+                        series_name=series_name,
+                        series_code=series_code,
+                        document_type=document_type,
+                        prefix=prefix,
+                        starting_number=1,
+                        current_number=seed(setup_db) if seed else 0,
+                        number_length=number_length,
+                        is_gapless=is_gapless,
+                        is_active=True,
+                        is_default=True
+                    ))
+            logger.info(f"Created bill series for {document_type} (company {company_id})")
+        except IntegrityError:
+            # Another worker created it first
+            logger.info(f"Bill series for {document_type} (company {company_id}) already created")
+        
+        return self._find_series(db, company_id, document_type, period)
+    
+    @contextmanager
+    def _allocation_session(self, db: Session, series: Optional[BillSeries] = None) -> Generator[Session, None, None]:
+        """Caller's transaction for gapless series and SQLite; otherwise a short transaction of our own"""
+        if (series is not None and series.is_gapless) or db.get_bind().dialect.name == "sqlite":
+            yield db
+        else:
+            with get_db_session() as allocation_db:
+                yield allocation_db
+    
+    @staticmethod
+    def _format_number(row, number: int) -> str:
+        return f"{row.prefix}{str(number).zfill(row.number_length or 0)}{row.suffix or ''}"
+
+# Global service instance
+document_number_service = DocumentNumberService()
@@ -1,10 +1,41 @@
 import pandas as pd
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Iterator, Optional, Sequence
+from decimal import Decimal, ROUND_HALF_UP
 import io
 from datetime import datetime
 import openpyxl
 from openpyxl.styles import Font, PatternFill, Alignment
 
+class ImportColumn:
+    """How one sheet column is read: target field, accepted headers, type and checks"""
+    
+    __slots__ = ("field", "headers", "kind", "label", "required", "default", "lower", "positive", "scale", "message")
+    
+    def __init__(
+        self,
+        field: str,
+        headers: Sequence[str],
+        kind: str = 'text',
+        required: bool = False,
+        default: Any = None,
+        lower: bool = False,
+        positive: bool = False,
+        scale: int = 2,
+        label: Optional[str] = None,
+        message: Optional[str] = None
+    ):
+        self.field = field
+        self.headers = [header.upper().replace(' ', '_') for header in headers]
+        self.kind = kind  # text, decimal, int
+        self.label = label or field.replace('_', ' ').title()
+        self.required = required
+        self.default = default
+        self.lower = lower
+        self.positive = positive
+        self.scale = scale
+        # Error for values that are not a valid number
+        self.message = message or f"Invalid {self.label}"
+
 class ExcelService:
     """Service for Excel import/export operations"""
     
@@ -68,101 +99,198 @@ class ExcelService:
         output.seek(0)
         return output.read()
     
+    # Item master columns (template headers)
+    ITEM_MASTER_COLUMNS = [
+        ImportColumn('barcode', ['BARCODE'], required=True),
+        ImportColumn('style_code', ['STYLE_CODE'], required=True, label='Style Code'),
+        ImportColumn('color', ['COLOR']),
+        ImportColumn('size', ['SIZE']),
+        ImportColumn('mrp_incl', ['MRP'], kind='decimal', label='MRP'),
+        ImportColumn('hsn', ['HSN']),
+        ImportColumn('brand', ['BRAND']),
+        ImportColumn('gender', ['GENDER']),
+        ImportColumn('category', ['CATEGORY']),
+        ImportColumn('sub_category', ['SUB_CATEGORY']),
+        ImportColumn('purchase_rate_basic', ['PURCHASE_RATE'], kind='decimal', label='Purchase Rate'),
+        ImportColumn('status', ['STATUS'], default='active', lower=True)
+    ]
+    
+    PURCHASE_ORDER_COLUMNS = [
+        ImportColumn('barcode', ['BARCODE'], required=True),
+        ImportColumn('qty', ['QTY'], kind='int', required=True, positive=True, label='Quantity', message='Invalid quantity')
+    ]
+    
+    # Rows read and validated at a time
+    CHUNK_ROWS = 5000
+    
     @staticmethod
-    def import_items_from_excel(file_content: bytes) -> Tuple[List[Dict], List[Dict]]:
+    def read_sheet_chunks(file_content: bytes, chunk_rows: int = CHUNK_ROWS) -> Tuple[List[str], Optional[int], Iterator[pd.DataFrame]]:
         """
-        Import items from Excel file
-        Returns: (successful_items, errors)
+        Stream the first sheet of a workbook as DataFrames of up to chunk_rows rows.
+        
+        Returns the normalized headers (stripped, upper case, spaces as
+        underscores), an estimate of the data row count (None when the file
+        does not say) and the chunks; each chunk carries the sheet row number
+        in `_row`. .xlsx is read row by row; legacy .xls has no streaming
+        reader and is read whole.
         """
-        try:
-            df = pd.read_excel(io.BytesIO(file_content), sheet_name=0)
+        
+        if not file_content.startswith(b'PK'):
+            frame = pd.read_excel(io.BytesIO(file_content), sheet_name=0, dtype=object)
+            frame.columns = ExcelService._normalize_headers(frame.columns)
+            columns = list(frame.columns)
+            frame['_row'] = range(2, len(frame) + 2)
+            return columns, len(frame), (frame.iloc[start:start + chunk_rows] for start in range(0, len(frame), chunk_rows))
+        
+        workbook = openpyxl.load_workbook(io.BytesIO(file_content), read_only=True, data_only=True)
+        worksheet = workbook.worksheets[0]
+        estimate = worksheet.max_row - 1 if worksheet.max_row else None
+        rows = worksheet.iter_rows(values_only=True)
+        columns = ExcelService._normalize_headers(next(rows, None) or ())
+        
+        def chunks():
+            try:
+                width = len(columns)
+                block = []
+                row_number = 1
+                for values in rows:
+                    row_number += 1
+                    # Rows may stop short of the header (trailing empty cells)
+                    if len(values) < width:
+                        values += (None,) * (width - len(values))
+                    block.append(values[:width] + (row_number,))
+                    if len(block) >= chunk_rows:
+                        yield ExcelService._frame(block, columns)
+                        block = []
+                if block:
+                    yield ExcelService._frame(block, columns)
+            finally:
+                workbook.close()
+        
+        return columns, estimate, chunks()
+    
+    @staticmethod
+    def _normalize_headers(headers) -> List[str]:
+        return [
+            str(header).strip().upper().replace(' ', '_') if header is not None else f"COLUMN_{position + 1}"
+            for position, header in enumerate(headers)
+        ]
+    
+    @staticmethod
+    def _frame(block: List[tuple], columns: List[str]) -> pd.DataFrame:
+        frame = pd.DataFrame.from_records(block, columns=columns + ['_row'])
+        # Rows with no values at all are skipped
+        return frame[frame[columns].notna().any(axis=1)]
+    
+    @staticmethod
+    def missing_columns(headers: List[str], columns: List[ImportColumn]) -> List[str]:
+        return [column.headers[0] for column in columns if column.required and not any(header in headers for header in column.headers)]
+    
+    @staticmethod
+    def validate_chunk(frame: pd.DataFrame, columns: List[ImportColumn]) -> Tuple[pd.DataFrame, List[Dict]]:
+        """
+        Normalize and check a chunk column by column.
+        Returns the valid rows (one column per field, plus `_row`) and {'row', 'error'} for the rest,
+        with the first failed check of each row as its error.
+        """
+        
+        result = pd.DataFrame({'_row': frame['_row'].values}, index=frame.index)
+        error = pd.Series(None, index=frame.index, dtype=object)
+        
+        def fail(condition: pd.Series, message: str):
+            error.mask(error.isna() & condition, message, inplace=True)
+        
+        for column in columns:
+            header = next((header for header in column.headers if header in frame.columns), None)
+            converted = pd.Series(None, index=frame.index, dtype=object)
+            present = pd.Series(False, index=frame.index)
             
-            # Normalize column names
-            df.columns = df.columns.str.strip().str.upper()
+            if header is not None:
+                values = frame[header]
+                text = values[values.notna()].astype(str).str.strip()
+                text = text[text != '']
+                present[text.index] = True
+                
+                if column.kind == 'text':
+                    # Numeric cells (barcodes, HSN codes) come back as floats
+                    whole = text.str.endswith('.0')
+                    if whole.any():
+                        text[whole] = text[whole].str.replace(r'^(\d+)\.0$', r'\1', regex=True)
+                    converted[text.index] = text.str.lower() if column.lower else text
+                else:
+                    numbers = pd.to_numeric(text, errors='coerce')
+                    invalid = numbers.isna() | (numbers.abs() == float('inf'))
+                    if column.kind == 'int':
+                        invalid |= numbers % 1 != 0
+                    fail(invalid.reindex(frame.index, fill_value=False), column.message)
+                    present[invalid[invalid].index] = False
+                    
+                    numbers = numbers[~invalid]
+                    if column.positive:
+                        fail((numbers <= 0).reindex(frame.index, fill_value=False), f"{column.label} must be positive")
+                    if column.kind == 'int':
+                        numbers = numbers.astype('int64')
+                    else:
+                        # From the cell text, rounded half up as the GST code rounds
+                        exponent = Decimal(1).scaleb(-column.scale)
+                        numbers = text[numbers.index].map(lambda value: Decimal(value).quantize(exponent, rounding=ROUND_HALF_UP))
+                    # Python numbers, as the database driver expects
+                    converted[numbers.index] = numbers.astype(object)
             
-            required_columns = ['BARCODE', 'STYLE_CODE']
-            missing_columns = [col for col in required_columns if col not in df.columns]
+            if column.required:
+                fail(~present, f"{column.label} is required")
             
-            if missing_columns:
-                return [], [{'error': f'Missing required columns: {", ".join(missing_columns)}'}]
+            if column.default is not None:
+                converted = converted.where(present, column.default)
             
-            successful_items = []
-            errors = []
+            result[column.field] = converted
+        
+        failed = error.notna()
+        errors = [
+            {'row': int(row), 'error': message}
+            for row, message in zip(frame['_row'][failed], error[failed])
+        ]
+        valid = result[~failed].astype(object)
+        return valid.where(valid.notna(), None), errors
+    
+    @staticmethod
+    def parse_excel(file_content: bytes, columns: List[ImportColumn], missing_error: Optional[str] = None) -> Tuple[List[Dict], List[Dict]]:
+        """Read, normalize and check a whole sheet chunk by chunk; returns (rows, errors)"""
+        
+        try:
+            headers, _, chunks = ExcelService.read_sheet_chunks(file_content)
             
-            for idx, row in df.iterrows():
-                try:
-                    # Clean and validate data
-                    item = {
-                        'barcode': str(row.get('BARCODE', '')).strip(),
-                        'style_code': str(row.get('STYLE_CODE', '')).strip(),
-                        'color': str(row.get('COLOR', '')).strip() if pd.notna(row.get('COLOR')) else None,
-                        'size': str(row.get('SIZE', '')).strip() if pd.notna(row.get('SIZE')) else None,
-                        'mrp_incl': float(row.get('MRP', 0)) if pd.notna(row.get('MRP')) else None,
-                        'hsn': str(row.get('HSN', '')).strip() if pd.notna(row.get('HSN')) else None,
-                        'brand': str(row.get('BRAND', '')).strip() if pd.notna(row.get('BRAND')) else None,
-                        'gender': str(row.get('GENDER', '')).strip() if pd.notna(row.get('GENDER')) else None,
-                        'category': str(row.get('CATEGORY', '')).strip() if pd.notna(row.get('CATEGORY')) else None,
-                        'sub_category': str(row.get('SUB_CATEGORY', '')).strip() if pd.notna(row.get('SUB_CATEGORY')) else None,
-                        'purchase_rate_basic': float(row.get('PURCHASE_RATE', 0)) if pd.notna(row.get('PURCHASE_RATE')) else None,
-                        'status': str(row.get('STATUS', 'active')).strip().lower()
-                    }
-                    
-                    # Validate barcode
-                    if not item['barcode']:
-                        errors.append({'row': idx + 2, 'error': 'Barcode is required'})
-                        continue
-                    
-                    if not item['style_code']:
-                        errors.append({'row': idx + 2, 'error': 'Style Code is required'})
-                        continue
-                    
-                    successful_items.append(item)
-                    
-                except Exception as e:
-                    errors.append({'row': idx + 2, 'error': str(e)})
+            missing = ExcelService.missing_columns(headers, columns)
+            if missing:
+                return [], [{'error': missing_error or f'Missing required columns: {", ".join(missing)}'}]
             
-            return successful_items, errors
+            rows = []
+            errors = []
+            for frame in chunks:
+                valid, chunk_errors = ExcelService.validate_chunk(frame, columns)
+                rows.extend(valid.drop(columns='_row').to_dict('records'))
+                errors.extend(chunk_errors)
             
+            return rows, errors
+        
         except Exception as e:
             return [], [{'error': f'Failed to read Excel file: {str(e)}'}]
     
+    @staticmethod
+    def import_items_from_excel(file_content: bytes) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Import items from Excel file
+        Returns: (successful_items, errors)
+        """
+        return ExcelService.parse_excel(file_content, ExcelService.ITEM_MASTER_COLUMNS)
+    
     @staticmethod
     def import_purchase_order(file_content: bytes) -> Tuple[List[Dict], List[Dict]]:
         """
         Import purchase order (BARCODE, QTY)
         Returns: (items, errors)
         """
-        try:
-            df = pd.read_excel(io.BytesIO(file_content), sheet_name=0)
-            df.columns = df.columns.str.strip().str.upper()
-            
-            if 'BARCODE' not in df.columns or 'QTY' not in df.columns:
-                return [], [{'error': 'Excel must have BARCODE and QTY columns'}]
-            
-            items = []
-            errors = []
-            
-            for idx, row in df.iterrows():
-                try:
-                    barcode = str(row['BARCODE']).strip()
-                    qty = int(row['QTY'])
-                    
-                    if not barcode:
-                        errors.append({'row': idx + 2, 'error': 'Barcode is required'})
-                        continue
-                    
-                    if qty <= 0:
-                        errors.append({'row': idx + 2, 'error': 'Quantity must be positive'})
-                        continue
-                    
-                    items.append({'barcode': barcode, 'qty': qty})
-                    
-                except ValueError:
-                    errors.append({'row': idx + 2, 'error': 'Invalid quantity'})
-                except Exception as e:
-                    errors.append({'row': idx + 2, 'error': str(e)})
-            
-            return items, errors
-            
-        except Exception as e:
-            return [], [{'error': f'Failed to read Excel file: {str(e)}'}]
\ No newline at end of file
+        return ExcelService.parse_excel(
+            file_content, ExcelService.PURCHASE_ORDER_COLUMNS,
+            missing_error='Excel must have BARCODE and QTY columns'
+        )
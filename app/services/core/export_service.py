@@ -0,0 +1,275 @@
+# backend/app/services/export_service.py
+from fastapi.responses import StreamingResponse
+from typing import Optional, List, Dict, Iterable, Iterator, Sequence, Any, Tuple
+from decimal import Decimal
+from datetime import datetime, date, time
+from itertools import chain
+import csv
+import io
+import json
+import re
+import tempfile
+import logging
+
+import xlsxwriter
+
+logger = logging.getLogger(__name__)
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return str(value)
+
+class ExportService:
+    """
+    Streaming CSV, XLSX, JSON and NDJSON writers.
+    
+    Rows are consumed from any iterable of dicts (typically a query
+    cursor) and written out a chunk at a time, so memory stays flat
+    however many rows there are. XLSX is built by xlsxwriter in constant
+    memory mode in a spooled temporary file, then streamed in blocks.
+    """
+    
+    MEDIA_TYPES = {
+        'csv': 'text/csv',
+        'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        'json': 'application/json',
+        'ndjson': 'application/x-ndjson'
+    }
+    
+    # Accepted aliases -> export format
+    FORMAT_ALIASES = {
+        'excel': 'xlsx',
+        'xls': 'xlsx',
+        'jsonl': 'ndjson'
+    }
+    
+    # Excel's sheet limit including the header row
+    XLSX_MAX_ROWS = 1048576
+    
+    def __init__(self, chunk_rows: int = 1000, block_size: int = 64 * 1024):
+        self.chunk_rows = chunk_rows
+        self.block_size = block_size
+    
+    def normalize_format(self, export_format: str) -> str:
+        export_format = (export_format or '').lower()
+        export_format = self.FORMAT_ALIASES.get(export_format, export_format)
+        if export_format not in self.MEDIA_TYPES:
+            raise ValueError(f"Unsupported export format: {export_format}")
+        return export_format
+    
+    def supports(self, export_format: Optional[str]) -> bool:
+        export_format = (export_format or '').lower()
+        return self.FORMAT_ALIASES.get(export_format, export_format) in self.MEDIA_TYPES
+    
+    def iter_export(
+        self,
+        rows: Iterable[Dict],
+        export_format: str,
+        columns: Optional[Sequence[str]] = None,
+        headers: Optional[Sequence[str]] = None,
+        sheet_name: str = 'Report'
+    ) -> Iterator[bytes]:
+        """Encode rows in the given format as a stream of byte blocks"""
+        
+        export_format = self.normalize_format(export_format)
+        
+        if export_format == 'ndjson':
+            return self.iter_ndjson(rows)
+        if export_format == 'json':
+            return self.iter_json(rows)
+        
+        if columns is None:
+            columns, rows = self._peek_columns(rows)
+        
+        if export_format == 'csv':
+            return self.iter_csv(rows, columns, headers)
+        return self.iter_xlsx(rows, columns, headers, sheet_name)
+    
+    def iter_csv(
+        self,
+        rows: Iterable[Dict],
+        columns: Sequence[str],
+        headers: Optional[Sequence[str]] = None
+    ) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(headers or columns)
+        
+        pending = 1
+        for row in rows:
+            writer.writerow([self._text(row.get(column)) for column in columns])
+            pending += 1
+            if pending >= self.chunk_rows:
+                yield buffer.getvalue().encode('utf-8')
+                buffer.seek(0)
+                buffer.truncate()
+                pending = 0
+        
+        if pending:
+            yield buffer.getvalue().encode('utf-8')
+    
+    def iter_ndjson(self, rows: Iterable[Dict]) -> Iterator[bytes]:
+        lines = []
+        for row in rows:
+            lines.append(json.dumps(row, default=_json_default))
+            if len(lines) >= self.chunk_rows:
+                yield ('\n'.join(lines) + '\n').encode('utf-8')
+                lines = []
+        
+        if lines:
+            yield ('\n'.join(lines) + '\n').encode('utf-8')
+    
+    def iter_json(self, rows: Iterable[Dict]) -> Iterator[bytes]:
+        """A JSON array, written element by element"""
+        
+        separator = '['
+        lines = []
+        for row in rows:
+            lines.append(separator + json.dumps(row, default=_json_default))
+            separator = ','
+            if len(lines) >= self.chunk_rows:
+                yield '\n'.join(lines).encode('utf-8')
+                lines = ['']
+        
+        lines.append(']' if separator == ',' else '[]')
+        yield '\n'.join(lines).encode('utf-8')
+    
+    def iter_xlsx(
+        self,
+        rows: Iterable[Dict],
+        columns: Sequence[str],
+        headers: Optional[Sequence[str]] = None,
+        sheet_name: str = 'Report'
+    ) -> Iterator[bytes]:
+        with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as output:
+            self.write_xlsx(output, rows, columns, headers, sheet_name)
+            output.seek(0)
+            while True:
+                block = output.read(self.block_size)
+                if not block:
+                    break
+                yield block
+    
+    def write_xlsx(
+        self,
+        output,
+        rows: Iterable[Dict],
+        columns: Sequence[str],
+        headers: Optional[Sequence[str]] = None,
+        sheet_name: str = 'Report'
+    ) -> int:
+        """Write rows to an XLSX file or file object, continuing on new sheets past Excel's row limit"""
+        
+        workbook = xlsxwriter.Workbook(output, {
+            'constant_memory': True,
+            'default_date_format': 'yyyy-mm-dd',
+            'remove_timezone': True,
+            'strings_to_formulas': False,
+            'strings_to_urls': False
+        })
+        header_format = workbook.add_format({'bold': True})
+        headers = list(headers or columns)
+        # Excel rejects these characters in sheet names
+        sheet_name = re.sub(r"[\[\]:*?/\\]", ' ', sheet_name).strip() or 'Report'
+        
+        def add_sheet(number):
+            name = sheet_name[:31] if number == 1 else f"{sheet_name[:26]} ({number})"
+            worksheet = workbook.add_worksheet(name)
+            worksheet.write_row(0, 0, headers, header_format)
+            return worksheet
+        
+        sheet_number = 1
+        worksheet = add_sheet(sheet_number)
+        row_index = 0
+        count = 0
+        for row in rows:
+            row_index += 1
+            if row_index >= self.XLSX_MAX_ROWS:
+                sheet_number += 1
+                worksheet = add_sheet(sheet_number)
+                row_index = 1
+            
+            for column_index, column in enumerate(columns):
+                value = self._cell(row.get(column))
+                if value is not None:
+                    worksheet.write(row_index, column_index, value)
+            count += 1
+        
+        workbook.close()
+        return count
+    
+    def write_file(
+        self,
+        file_path: str,
+        rows: Iterable[Dict],
+        export_format: str,
+        columns: Optional[Sequence[str]] = None,
+        headers: Optional[Sequence[str]] = None,
+        sheet_name: str = 'Report'
+    ) -> int:
+        """Stream rows into a file; returns its size in bytes"""
+        
+        size = 0
+        with open(file_path, 'wb') as output:
+            for block in self.iter_export(rows, export_format, columns, headers, sheet_name):
+                output.write(block)
+                size += len(block)
+        
+        return size
+    
+    def streaming_response(
+        self,
+        rows: Iterable[Dict],
+        export_format: str,
+        filename: str,
+        columns: Optional[Sequence[str]] = None,
+        headers: Optional[Sequence[str]] = None,
+        sheet_name: str = 'Report'
+    ) -> StreamingResponse:
+        """Response that encodes rows as the client reads them"""
+        
+        export_format = self.normalize_format(export_format)
+        
+        return self.response(
+            self.iter_export(rows, export_format, columns, headers, sheet_name),
+            export_format,
+            filename
+        )
+    
+    def response(self, chunks: Iterable[bytes], export_format: str, filename: str) -> StreamingResponse:
+        """Attachment response for an already encoded byte stream"""
+        
+        return StreamingResponse(
+            chunks,
+            media_type=self.MEDIA_TYPES[self.normalize_format(export_format)],
+            headers={"Content-Disposition": f"attachment; filename={filename}"}
+        )
+    
+    def _peek_columns(self, rows: Iterable[Dict]) -> Tuple[List[str], Iterable[Dict]]:
+        rows = iter(rows)
+        first = next(rows, None)
+        if first is None:
+            return [], iter(())
+        return list(first.keys()), chain((first,), rows)
+    
+    @staticmethod
+    def _text(value: Any) -> Any:
+        if value is None:
+            return ''
+        if isinstance(value, (datetime, date, time)):
+            return value.isoformat()
+        return value
+    
+    @staticmethod
+    def _cell(value: Any) -> Any:
+        if isinstance(value, Decimal):
+            return float(value)
+        if isinstance(value, (list, dict)):
+            return json.dumps(value, default=_json_default)
+        return value
+
+# Global service instance
+export_service = ExportService()
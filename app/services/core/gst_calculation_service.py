@@ -1,22 +1,70 @@
 # backend/app/services/gst_calculation_service.py
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, func, update
 from typing import Optional, List, Dict, Tuple
-from decimal import Decimal, ROUND_HALF_UP
-from datetime import datetime, date
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from datetime import datetime, date, timedelta
+import numpy as np
+import threading
+import time
+import uuid
 import logging
 
 from ..models.core import Company, GSTSlab
-from ..models.sales import SalesInvoice, SalesInvoiceItem
+from ..models.sales import SaleInvoice, SaleInvoiceItem
+from ..models.customers import Customer
 from ..models.purchase import PurchaseBill, PurchaseBillItem
+from .gst_tax_engine import gst_tax_engine, gst_context_cache, to_units, to_decimals, RATE_SCALE
+from .gst_period_summary_service import gst_period_summary_service
+from ..database import get_db_session
 
 logger = logging.getLogger(__name__)
 
+class GSTRetaxJob:
+    """Progress of a background sale invoice re-tax"""
+    
+    __slots__ = (
+        "id", "company_id", "user_id", "status", "lines_updated", "invoices_updated",
+        "result", "message", "created_at", "started_at", "finished_at"
+    )
+    
+    def __init__(self, job_id: str, company_id: int, user_id: Optional[int]):
+        self.id = job_id
+        self.company_id = company_id
+        self.user_id = user_id
+        self.status = "queued"  # queued, running, completed, failed
+        self.lines_updated = 0
+        self.invoices_updated = 0
+        self.result: Optional[Dict] = None
+        self.message: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+    
+    def to_dict(self) -> Dict:
+        return {
+            "job_id": self.id,
+            "company_id": self.company_id,
+            "status": self.status,
+            "lines_updated": self.lines_updated,
+            "invoices_updated": self.invoices_updated,
+            "result": self.result,
+            "message": self.message,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+
 class GSTCalculationService:
     """Service class for GST calculations and compliance"""
     
     def __init__(self):
         self.round_off = Decimal('0.01')
+        self.job_ttl = timedelta(hours=24)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, GSTRetaxJob] = {}
     
     def calculate_gst(
         self, 
@@ -42,34 +90,24 @@ class GSTCalculationService:
             Dict with GST breakdown
         """
         
-        # Get company state code if not provided
-        if not state_code:
-            company = db.query(Company).filter(Company.id == company_id).first()
-            state_code = company.gst_state_code if company else None
-        
-        # Calculate GST amount
-        gst_amount = (amount * gst_rate / 100).quantize(self.round_off, rounding=ROUND_HALF_UP)
+        # Company state code is not needed here: gst_type already says intra or interstate
+        group = gst_tax_engine.compute([amount], [gst_rate], interstate=(gst_type != "cgst_sgst")).rate_breakdown()[0]
         
         result = {
             "base_amount": amount,
             "gst_rate": gst_rate,
-            "gst_amount": gst_amount,
-            "total_amount": amount + gst_amount,
+            "gst_amount": group["gst_amount"],
+            "total_amount": amount + group["gst_amount"],
             "gst_type": gst_type
         }
         
         if gst_type == "cgst_sgst":
             # For intrastate transactions (CGST + SGST)
-            cgst_rate = gst_rate / 2
-            sgst_rate = gst_rate / 2
-            cgst_amount = (amount * cgst_rate / 100).quantize(self.round_off, rounding=ROUND_HALF_UP)
-            sgst_amount = (amount * sgst_rate / 100).quantize(self.round_off, rounding=ROUND_HALF_UP)
-            
             result.update({
-                "cgst_rate": cgst_rate,
-                "sgst_rate": sgst_rate,
-                "cgst_amount": cgst_amount,
-                "sgst_amount": sgst_amount,
+                "cgst_rate": gst_rate / 2,
+                "sgst_rate": gst_rate / 2,
+                "cgst_amount": group["cgst_amount"],
+                "sgst_amount": group["sgst_amount"],
                 "igst_rate": Decimal('0'),
                 "igst_amount": Decimal('0')
             })
@@ -81,7 +119,7 @@ class GSTCalculationService:
                 "cgst_amount": Decimal('0'),
                 "sgst_amount": Decimal('0'),
                 "igst_rate": gst_rate,
-                "igst_amount": gst_amount
+                "igst_amount": group["igst_amount"]
             })
         
         return result
@@ -106,64 +144,264 @@ class GSTCalculationService:
             Dict with invoice GST breakdown
         """
         
-        # Get company state code
-        company = db.query(Company).filter(Company.id == company_id).first()
-        company_state_code = company.gst_state_code if company else None
+        # Company state code comes from the cached GST context
+        context = gst_context_cache.get(db, company_id)
         
         # Determine GST type based on state codes
-        is_interstate = (company_state_code != customer_state_code)
+        is_interstate = context.is_interstate(customer_state_code)
         gst_type = "igst" if is_interstate else "cgst_sgst"
         
-        # Group items by GST rate
-        gst_groups = {}
-        for item in invoice_items:
-            gst_rate = Decimal(str(item.get('gst_rate', 0)))
-            if gst_rate not in gst_groups:
-                gst_groups[gst_rate] = []
-            gst_groups[gst_rate].append(item)
-        
-        # Calculate GST for each group
-        total_base_amount = Decimal('0')
-        total_gst_amount = Decimal('0')
-        total_cgst_amount = Decimal('0')
-        total_sgst_amount = Decimal('0')
-        total_igst_amount = Decimal('0')
-        
-        gst_breakdown = []
-        
-        for gst_rate, items in gst_groups.items():
-            group_amount = sum(Decimal(str(item.get('amount', 0))) for item in items)
-            group_gst = self.calculate_gst(
-                db, company_id, group_amount, gst_rate, gst_type, customer_state_code
-            )
-            
-            gst_breakdown.append({
-                "gst_rate": gst_rate,
-                "base_amount": group_amount,
-                "gst_amount": group_gst['gst_amount'],
-                "cgst_amount": group_gst['cgst_amount'],
-                "sgst_amount": group_gst['sgst_amount'],
-                "igst_amount": group_gst['igst_amount']
-            })
-            
-            total_base_amount += group_amount
-            total_gst_amount += group_gst['gst_amount']
-            total_cgst_amount += group_gst['cgst_amount']
-            total_sgst_amount += group_gst['sgst_amount']
-            total_igst_amount += group_gst['igst_amount']
+        # All lines in one pass; tax is rounded per rate group
+        computation = gst_tax_engine.compute(
+            [item.get('amount', 0) for item in invoice_items],
+            [item.get('gst_rate', 0) for item in invoice_items],
+            interstate=is_interstate
+        )
+        
+        gst_breakdown = [
+            {
+                "gst_rate": group["gst_rate"],
+                "base_amount": group["base_amount"],
+                "gst_amount": group["gst_amount"],
+                "cgst_amount": group["cgst_amount"],
+                "sgst_amount": group["sgst_amount"],
+                "igst_amount": group["igst_amount"]
+            }
+            for group in computation.rate_breakdown()
+        ]
+        
+        total_base_amount = sum((group["base_amount"] for group in gst_breakdown), Decimal('0'))
+        total_gst_amount = sum((group["gst_amount"] for group in gst_breakdown), Decimal('0'))
         
         return {
             "gst_type": gst_type,
             "is_interstate": is_interstate,
             "total_base_amount": total_base_amount,
             "total_gst_amount": total_gst_amount,
-            "total_cgst_amount": total_cgst_amount,
-            "total_sgst_amount": total_sgst_amount,
-            "total_igst_amount": total_igst_amount,
+            "total_cgst_amount": sum((group["cgst_amount"] for group in gst_breakdown), Decimal('0')),
+            "total_sgst_amount": sum((group["sgst_amount"] for group in gst_breakdown), Decimal('0')),
+            "total_igst_amount": sum((group["igst_amount"] for group in gst_breakdown), Decimal('0')),
             "total_amount": total_base_amount + total_gst_amount,
             "gst_breakdown": gst_breakdown
         }
     
+    def retax_sale_invoices(
+        self,
+        db: Session,
+        company_id: int,
+        rate_changes: Dict[Decimal, Decimal],
+        from_date: date = None,
+        to_date: date = None,
+        hsn_codes: Optional[List[str]] = None,
+        chunk_size: int = 50000,
+        job: Optional[GSTRetaxJob] = None
+    ) -> Dict:
+        """
+        Re-tax sale invoice lines after a GST rate change.
+        
+        rate_changes maps old rate -> new rate. Only draft invoices without a
+        journal entry or IRN are touched; confirmed, paid and e-invoiced ones
+        need a credit or debit note instead. Lines are read in id order, taxed
+        in bulk and written back one chunk per transaction. Line and invoice
+        totals change by the difference in GST, so TDS and other adjustments
+        in them are kept.
+        """
+        
+        started = time.monotonic()
+        context = gst_context_cache.get(db, company_id)
+        old_rates = to_units(list(rate_changes.keys()), RATE_SCALE)
+        new_rates = to_units(list(rate_changes.values()), RATE_SCALE)
+        
+        query = db.query(
+            SaleInvoiceItem.id,
+            SaleInvoiceItem.invoice_id,
+            SaleInvoiceItem.subtotal_amount,
+            SaleInvoiceItem.gst_rate,
+            SaleInvoiceItem.hsn_code,
+            SaleInvoiceItem.sac_code,
+            SaleInvoiceItem.total_gst_amount,
+            SaleInvoiceItem.total_amount,
+            SaleInvoice.place_of_supply,
+            SaleInvoice.supplier_state_code,
+            SaleInvoice.recipient_state_code
+        ).join(
+            SaleInvoice, SaleInvoice.id == SaleInvoiceItem.invoice_id
+        ).filter(
+            SaleInvoice.company_id == company_id,
+            SaleInvoice.status == 'draft',
+            SaleInvoice.irn.is_(None),
+            SaleInvoice.journal_entry_id.is_(None),
+            or_(SaleInvoice.journal_entry_created.is_(None), SaleInvoice.journal_entry_created == False),
+            SaleInvoiceItem.gst_rate.in_(list(rate_changes.keys()))
+        )
+        
+        if from_date:
+            query = query.filter(SaleInvoice.invoice_date >= from_date)
+        if to_date:
+            query = query.filter(SaleInvoice.invoice_date <= to_date)
+        if hsn_codes:
+            query = query.filter(SaleInvoiceItem.hsn_code.in_(hsn_codes))
+        
+        line_count = 0
+        invoice_ids = set()
+        last_id = 0
+        
+        while True:
+            rows = query.filter(SaleInvoiceItem.id > last_id).order_by(SaleInvoiceItem.id).limit(chunk_size).all()
+            if not rows:
+                break
+            
+            (ids, chunk_invoice_ids, amounts, rates, hsns, sacs, old_gst, old_totals,
+             places, suppliers, recipients) = zip(*rows)
+            last_id = ids[-1]
+            
+            # Map every old rate at once, so chained changes (12 -> 5, 5 -> 12) do not cascade
+            rate_units = to_units(rates, RATE_SCALE)
+            mapped_rates = rate_units.copy()
+            for old_rate, new_rate in zip(old_rates, new_rates):
+                mapped_rates[rate_units == old_rate] = new_rate
+            
+            # Place of supply when recorded, otherwise compare state codes
+            place = np.array([getattr(value, 'value', value) for value in places], dtype=object)
+            supplier = np.array([value or context.state_code for value in suppliers], dtype=object)
+            interstate = np.where(
+                place == None, supplier != np.array(recipients, dtype=object), place != 'intra_state'
+            ).astype(bool)
+            
+            computation = gst_tax_engine.compute(
+                amounts,
+                mapped_rates / RATE_SCALE,
+                [context.cess_rate(hsn, sac) for hsn, sac in zip(hsns, sacs)],
+                interstate
+            )
+            
+            half_rates = np.where(interstate, 0, mapped_rates * 5)  # thousandths of a percent
+            columns = {
+                'id': ids,
+                'gst_rate': to_decimals(mapped_rates),
+                'cgst_rate': to_decimals(half_rates, -3),
+                'sgst_rate': to_decimals(half_rates, -3),
+                'igst_rate': to_decimals(np.where(interstate, mapped_rates, 0)),
+                'cgst_amount': to_decimals(computation.cgst),
+                'sgst_amount': to_decimals(computation.sgst),
+                'igst_amount': to_decimals(computation.igst),
+                'cess_rate': to_decimals(computation.cess_rates),
+                'cess_amount': to_decimals(computation.cess),
+                'total_gst_amount': to_decimals(computation.total_gst),
+                'total_amount': to_decimals(
+                    to_units(old_totals, 100) - to_units(old_gst, 100) + computation.total_gst
+                )
+            }
+            names = list(columns)
+            db.execute(update(SaleInvoiceItem), [dict(zip(names, values)) for values in zip(*columns.values())])
+            
+            self._resum_sale_invoices(db, set(chunk_invoice_ids))
+            # Bulk updates bypass the session hooks, so refresh the GST summary here
+            gst_period_summary_service.refresh_documents(db, sale_invoice_ids=chunk_invoice_ids)
+            db.commit()
+            
+            line_count += len(ids)
+            invoice_ids.update(chunk_invoice_ids)
+            if job is not None:
+                job.lines_updated = line_count
+                job.invoices_updated = len(invoice_ids)
+        
+        elapsed = time.monotonic() - started
+        logger.info(f"Re-taxed {line_count} sale invoice lines on {len(invoice_ids)} invoices in {elapsed:.1f}s")
+        
+        return {
+            "lines_updated": line_count,
+            "invoices_updated": len(invoice_ids),
+            "elapsed_seconds": round(elapsed, 2),
+            "lines_per_minute": int(line_count * 60 / elapsed) if elapsed else line_count
+        }
+    
+    def _resum_sale_invoices(self, db: Session, invoice_ids: set):
+        """Recompute invoice GST totals from their lines and move the total by the change (one grouped read, one bulk update)"""
+        
+        totals = db.query(
+            SaleInvoiceItem.invoice_id,
+            func.coalesce(func.sum(SaleInvoiceItem.cgst_amount), 0),
+            func.coalesce(func.sum(SaleInvoiceItem.sgst_amount), 0),
+            func.coalesce(func.sum(SaleInvoiceItem.igst_amount), 0),
+            func.coalesce(func.sum(SaleInvoiceItem.cess_amount), 0),
+            func.coalesce(func.sum(SaleInvoiceItem.total_gst_amount), 0)
+        ).filter(
+            SaleInvoiceItem.invoice_id.in_(invoice_ids)
+        ).group_by(SaleInvoiceItem.invoice_id).all()
+        
+        previous = {
+            invoice_id: (total_amount or 0) - (total_gst_amount or 0)
+            for invoice_id, total_amount, total_gst_amount in db.query(
+                SaleInvoice.id, SaleInvoice.total_amount, SaleInvoice.total_gst_amount
+            ).filter(SaleInvoice.id.in_(invoice_ids)).all()
+        }
+        
+        if totals:
+            db.execute(update(SaleInvoice), [
+                {
+                    'id': invoice_id,
+                    'cgst_amount': cgst,
+                    'sgst_amount': sgst,
+                    'igst_amount': igst,
+                    'cess_amount': cess,
+                    'total_gst_amount': total_gst,
+                    'total_amount': previous.get(invoice_id, 0) + total_gst
+                }
+                for invoice_id, cgst, sgst, igst, cess, total_gst in totals
+            ])
+    
+    def start_retax_job(
+        self,
+        company_id: int,
+        rate_changes: Dict[Decimal, Decimal],
+        from_date: date = None,
+        to_date: date = None,
+        hsn_codes: Optional[List[str]] = None,
+        user_id: Optional[int] = None
+    ) -> GSTRetaxJob:
+        """Queue a sale invoice re-tax to run in the background; poll it with get_retax_job"""
+        
+        job = GSTRetaxJob(uuid.uuid4().hex, company_id, user_id)
+        with self._lock:
+            self._prune_jobs()
+            self._jobs[job.id] = job
+            self._pool().submit(self._run_retax_job, job, rate_changes, from_date, to_date, hsn_codes)
+        return job
+    
+    def get_retax_job(self, job_id: str) -> Optional[GSTRetaxJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+    
+    def _run_retax_job(self, job: GSTRetaxJob, rate_changes, from_date, to_date, hsn_codes):
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+        try:
+            with get_db_session() as db:
+                job.result = self.retax_sale_invoices(
+                    db, job.company_id, rate_changes, from_date=from_date, to_date=to_date,
+                    hsn_codes=hsn_codes, job=job
+                )
+            job.status = "completed"
+        except Exception as e:
+            job.status = "failed"
+            job.message = str(e)
+            logger.error(f"GST re-tax {job.id} failed: {str(e)}")
+        finally:
+            job.finished_at = datetime.utcnow()
+    
+    def _prune_jobs(self):
+        cutoff = datetime.utcnow() - self.job_ttl
+        for job_id, job in list(self._jobs.items()):
+            if job.finished_at and job.finished_at < cutoff:
+                del self._jobs[job_id]
+    
+    def _pool(self) -> ThreadPoolExecutor:
+        # One worker: re-taxes of the same invoices must not interleave
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gst-retax")
+        return self._executor
+    
     def get_gst_slab_by_rate(
         self, 
         db: Session, 
@@ -197,8 +435,9 @@ class GSTCalculationService:
     ) -> List[Dict]:
         """Get all available GST rates for company"""
         
-        if effective_date is None:
-            effective_date = date.today()
+        if effective_date is None or effective_date == date.today():
+            # Today's slabs come from the cached GST context
+            return list(gst_context_cache.get(db, company_id).slabs)
         
         gst_slabs = db.query(GSTSlab).filter(
             GSTSlab.company_id == company_id,
@@ -232,42 +471,24 @@ class GSTCalculationService:
     ) -> Dict[str, Decimal]:
         """Calculate GST liability for a period"""
         
-        # Get sales GST
-        sales_gst = db.query(
-            func.sum(SalesInvoiceItem.cgst_amount).label('total_cgst'),
-            func.sum(SalesInvoiceItem.sgst_amount).label('total_sgst'),
-            func.sum(SalesInvoiceItem.igst_amount).label('total_igst')
-        ).join(
-            SalesInvoice, SalesInvoiceItem.invoice_id == SalesInvoice.id
-        ).filter(
-            SalesInvoice.company_id == company_id,
-            SalesInvoice.invoice_date >= from_date,
-            SalesInvoice.invoice_date <= to_date,
-            SalesInvoice.status != 'cancelled'
-        ).first()
-        
-        # Get purchase GST (input credit)
-        purchase_gst = db.query(
-            func.sum(PurchaseBillItem.cgst_amount).label('total_cgst'),
-            func.sum(PurchaseBillItem.sgst_amount).label('total_sgst'),
-            func.sum(PurchaseBillItem.igst_amount).label('total_igst')
-        ).join(
-            PurchaseBill, PurchaseBillItem.bill_id == PurchaseBill.id
-        ).filter(
-            PurchaseBill.company_id == company_id,
-            PurchaseBill.bill_date >= from_date,
-            PurchaseBill.bill_date <= to_date,
-            PurchaseBill.status != 'cancelled'
-        ).first()
+        # Outward and inward totals from the GST period summary
+        totals = {
+            group['direction']: group
+            for group in gst_period_summary_service.aggregate(
+                db, company_id, from_date, to_date, dimensions=('direction',)
+            )
+        }
+        sales_gst = totals.get('outward', {})
+        purchase_gst = totals.get('inward', {})
         
         # Calculate net GST liability
-        sales_cgst = sales_gst.total_cgst or Decimal('0')
-        sales_sgst = sales_gst.total_sgst or Decimal('0')
-        sales_igst = sales_gst.total_igst or Decimal('0')
+        sales_cgst = sales_gst.get('cgst_amount') or Decimal('0')
+        sales_sgst = sales_gst.get('sgst_amount') or Decimal('0')
+        sales_igst = sales_gst.get('igst_amount') or Decimal('0')
         
-        purchase_cgst = purchase_gst.total_cgst or Decimal('0')
-        purchase_sgst = purchase_gst.total_sgst or Decimal('0')
-        purchase_igst = purchase_gst.total_igst or Decimal('0')
+        purchase_cgst = purchase_gst.get('cgst_amount') or Decimal('0')
+        purchase_sgst = purchase_gst.get('sgst_amount') or Decimal('0')
+        purchase_igst = purchase_gst.get('igst_amount') or Decimal('0')
         
         net_cgst = sales_cgst - purchase_cgst
         net_sgst = sales_sgst - purchase_sgst
@@ -312,23 +533,25 @@ class GSTCalculationService:
         
         # Get sales data
         sales_data = db.query(
-            SalesInvoice.invoice_number,
-            SalesInvoice.invoice_date,
-            SalesInvoice.customer_gst,
-            SalesInvoice.customer_name,
-            func.sum(SalesInvoiceItem.line_total).label('total_amount'),
-            func.sum(SalesInvoiceItem.cgst_amount).label('cgst_amount'),
-            func.sum(SalesInvoiceItem.sgst_amount).label('sgst_amount'),
-            func.sum(SalesInvoiceItem.igst_amount).label('igst_amount')
+            SaleInvoice.invoice_number,
+            SaleInvoice.invoice_date,
+            SaleInvoice.gstin.label('customer_gst'),
+            Customer.name.label('customer_name'),
+            func.sum(SaleInvoiceItem.total_amount).label('total_amount'),
+            func.sum(SaleInvoiceItem.cgst_amount).label('cgst_amount'),
+            func.sum(SaleInvoiceItem.sgst_amount).label('sgst_amount'),
+            func.sum(SaleInvoiceItem.igst_amount).label('igst_amount')
+        ).join(
+            SaleInvoiceItem, SaleInvoice.id == SaleInvoiceItem.invoice_id
         ).join(
-            SalesInvoiceItem, SalesInvoice.id == SalesInvoiceItem.invoice_id
+            Customer, Customer.id == SaleInvoice.customer_id
         ).filter(
-            SalesInvoice.company_id == company_id,
-            SalesInvoice.invoice_date >= from_date,
-            SalesInvoice.invoice_date <= to_date,
-            SalesInvoice.status != 'cancelled'
+            SaleInvoice.company_id == company_id,
+            SaleInvoice.invoice_date >= from_date,
+            SaleInvoice.invoice_date <= to_date,
+            SaleInvoice.status != 'cancelled'
         ).group_by(
-            SalesInvoice.id
+            SaleInvoice.id, Customer.id
         ).all()
         
         # Get purchase data
@@ -358,6 +581,8 @@ class GSTCalculationService:
                 "company_name": company.name,
                 "period": f"{from_date} to {to_date}"
             },
+            "gstr1_summary": self.get_gstr1_summary(db, company_id, from_date, to_date),
+            "gstr3b_summary": self.get_gstr3b_summary(db, company_id, from_date, to_date),
             "sales_data": [
                 {
                     "invoice_number": sale.invoice_number,
@@ -386,6 +611,46 @@ class GSTCalculationService:
             ]
         }
     
+    def get_gstr1_summary(self, db: Session, company_id: int, from_date: date, to_date: date) -> Dict:
+        """GSTR-1 summary tables (B2B/B2C rate-wise, B2C by place of supply, HSN summary) from the GST period summary"""
+        
+        def tables(dimensions):
+            return gst_period_summary_service.aggregate(
+                db, company_id, from_date, to_date, dimensions=dimensions, direction='outward'
+            )
+        
+        return {
+            "rate_wise": tables(('supply_type', 'gst_rate')),
+            "b2c_by_place_of_supply": [
+                group for group in tables(('supply_type', 'place_of_supply', 'gst_rate'))
+                if group['supply_type'] == 'B2C'
+            ],
+            "hsn_summary": tables(('hsn_code', 'gst_rate'))
+        }
+    
+    def get_gstr3b_summary(self, db: Session, company_id: int, from_date: date, to_date: date) -> Dict:
+        """GSTR-3B outward supplies, input tax credit and reverse charge totals from the GST period summary"""
+        
+        groups = gst_period_summary_service.aggregate(
+            db, company_id, from_date, to_date, dimensions=('direction', 'supply_type')
+        )
+        
+        def total(direction, supply_types=None):
+            selected = [
+                group for group in groups
+                if group['direction'] == direction and (supply_types is None or group['supply_type'] in supply_types)
+            ]
+            return {
+                measure: sum((group[measure] for group in selected), Decimal('0'))
+                for measure in ('taxable_amount', 'cgst_amount', 'sgst_amount', 'igst_amount', 'cess_amount')
+            }
+        
+        return {
+            "outward_supplies": total('outward'),
+            "eligible_itc": total('inward', ('B2B',)),
+            "inward_reverse_charge": total('inward', ('RCM',))
+        }
+    
     def validate_gst_number(self, gst_number: str) -> bool:
         """Validate GST number format"""
         if not gst_number or len(gst_number) != 15:
@@ -0,0 +1,491 @@
+# backend/app/services/gst_period_summary_service.py
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy import func, event, insert, delete, bindparam, inspect
+from sqlalchemy.exc import IntegrityError
+from typing import Optional, List, Dict, Iterable, Tuple
+from decimal import Decimal
+from datetime import datetime, date, timedelta
+from itertools import chain
+import time
+import logging
+
+from ..models.core import GSTPeriodSummary, GSTDocumentContribution
+from ..models.sales import SaleInvoice, SaleInvoiceItem
+from ..models.purchase import PurchaseBill, PurchaseBillItem
+from .gst_tax_engine import gst_context_cache
+from ...core.session_hooks import on_before_commit, transaction_info
+
+logger = logging.getLogger(__name__)
+
+MEASURES = ('taxable_amount', 'cgst_amount', 'sgst_amount', 'igst_amount', 'cess_amount', 'line_count')
+DIMENSIONS = ('period', 'direction', 'gst_rate', 'hsn_code', 'place_of_supply', 'supply_type')
+
+def month_start(value: date) -> date:
+    return value.replace(day=1)
+
+def month_end(value: date) -> date:
+    return (value.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+
+class GSTPeriodSummaryService:
+    """
+    Incrementally maintained GST cube: monthly totals per company, rate,
+    HSN, place of supply and supply type, for sales (outward) and
+    purchases (inward).
+    
+    Every invoice and bill records what it adds to each cell. When one is
+    saved, edited, cancelled or deleted, its contribution is recomputed and
+    only the difference is applied to the cells, in the same transaction.
+    Liability, return and rate-wise reports read the cells; partial months
+    at the edges of a date range are aggregated from the lines.
+    """
+    
+    def __init__(self):
+        pass
+    
+    def refresh_documents(
+        self,
+        db: Session,
+        sale_invoice_ids: Iterable[int] = (),
+        purchase_bill_ids: Iterable[int] = ()
+    ) -> int:
+        """Re-derive the contributions of changed documents and apply the differences; returns cells touched"""
+        
+        sale_invoice_ids = set(sale_invoice_ids)
+        purchase_bill_ids = set(purchase_bill_ids)
+        if not sale_invoice_ids and not purchase_bill_ids:
+            return 0
+        
+        documents = (('sale_invoice', sale_invoice_ids), ('purchase_bill', purchase_bill_ids))
+        
+        new_rows = self._sale_contributions(db, invoice_ids=sale_invoice_ids) if sale_invoice_ids else []
+        if purchase_bill_ids:
+            new_rows += self._purchase_contributions(db, bill_ids=purchase_bill_ids)
+        
+        old_rows = []
+        for document_type, ids in documents:
+            if ids:
+                old_rows += db.query(GSTDocumentContribution).filter(
+                    GSTDocumentContribution.document_type == document_type,
+                    GSTDocumentContribution.document_id.in_(ids)
+                ).all()
+        
+        deltas: Dict[str, Dict] = {}
+        for row in old_rows:
+            delta = deltas.setdefault(row.cell_key, self._empty_delta())
+            for measure in MEASURES:
+                delta[measure] -= getattr(row, measure) or 0
+            delta['document_count'] -= 1
+        
+        for row in new_rows:
+            delta = deltas.setdefault(row['cell_key'], self._empty_delta())
+            for measure in MEASURES:
+                delta[measure] += row[measure]
+            delta['document_count'] += 1
+            delta['cell'] = row
+        
+        # Replace the documents' contribution rows
+        for document_type, ids in documents:
+            if ids:
+                db.execute(
+                    delete(GSTDocumentContribution).where(
+                        GSTDocumentContribution.document_type == document_type,
+                        GSTDocumentContribution.document_id.in_(ids)
+                    ).execution_options(synchronize_session=False)
+                )
+        if new_rows:
+            db.execute(insert(GSTDocumentContribution), [self._contribution_values(row) for row in new_rows])
+        
+        changed = {
+            cell_key: delta for cell_key, delta in deltas.items()
+            if delta['document_count'] or any(delta[measure] for measure in MEASURES)
+        }
+        self._apply_deltas(db, changed)
+        
+        return len(changed)
+    
+    def rebuild(
+        self,
+        db: Session,
+        company_id: Optional[int] = None,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None
+    ) -> Dict:
+        """Recompute the cube from invoice and bill lines (backfills, repairs); whole months only"""
+        
+        started = time.monotonic()
+        from_date = month_start(from_date) if from_date else None
+        to_date = month_end(to_date) if to_date else None
+        
+        for model in (GSTPeriodSummary, GSTDocumentContribution):
+            conditions = []
+            if company_id is not None:
+                conditions.append(model.company_id == company_id)
+            if from_date:
+                conditions.append(model.period >= from_date.strftime('%Y-%m'))
+            if to_date:
+                conditions.append(model.period <= to_date.strftime('%Y-%m'))
+            db.execute(delete(model).where(*conditions).execution_options(synchronize_session=False))
+        
+        contributions = self._sale_contributions(db, company_id=company_id, from_date=from_date, to_date=to_date)
+        contributions += self._purchase_contributions(db, company_id=company_id, from_date=from_date, to_date=to_date)
+        
+        cells: Dict[str, Dict] = {}
+        for row in contributions:
+            cell = cells.get(row['cell_key'])
+            if cell is None:
+                cell = cells[row['cell_key']] = dict(self._cell_values(row), document_count=0)
+                for measure in MEASURES:
+                    cell[measure] = 0
+            for measure in MEASURES:
+                cell[measure] += row[measure]
+            cell['document_count'] += 1
+        
+        batch_size = 5000
+        values = [self._contribution_values(row) for row in contributions]
+        for start in range(0, len(values), batch_size):
+            db.execute(insert(GSTDocumentContribution), values[start:start + batch_size])
+        cell_values = list(cells.values())
+        for start in range(0, len(cell_values), batch_size):
+            db.execute(insert(GSTPeriodSummary), cell_values[start:start + batch_size])
+        
+        db.commit()
+        
+        elapsed = time.monotonic() - started
+        logger.info(f"Rebuilt GST summary: {len(cells)} cells from {len(contributions)} document contributions in {elapsed:.1f}s")
+        
+        return {
+            "cells": len(cells),
+            "contributions": len(contributions),
+            "elapsed_seconds": round(elapsed, 2)
+        }
+    
+    def aggregate(
+        self,
+        db: Session,
+        company_id: int,
+        from_date: date,
+        to_date: date,
+        dimensions: Tuple[str, ...] = ('direction', 'gst_rate'),
+        direction: Optional[str] = None
+    ) -> List[Dict]:
+        """Totals for a date range grouped by the given dimensions"""
+        
+        for dimension in dimensions:
+            if dimension not in DIMENSIONS:
+                raise ValueError(f"Unknown GST summary dimension: {dimension}")
+        
+        totals: Dict[tuple, Dict] = {}
+        
+        def add(key, values):
+            group = totals.get(key)
+            if group is None:
+                group = totals[key] = dict(zip(dimensions, key))
+                for measure in MEASURES:
+                    group[measure] = 0
+            for measure in MEASURES:
+                group[measure] += values[measure] or 0
+        
+        # Whole months from the cube
+        first_full = from_date if from_date.day == 1 else month_end(from_date) + timedelta(days=1)
+        last_full = to_date if to_date == month_end(to_date) else month_start(to_date) - timedelta(days=1)
+        
+        if first_full <= last_full:
+            columns = [getattr(GSTPeriodSummary, dimension) for dimension in dimensions]
+            query = db.query(
+                *columns,
+                *[func.sum(getattr(GSTPeriodSummary, measure)).label(measure) for measure in MEASURES]
+            ).filter(
+                GSTPeriodSummary.company_id == company_id,
+                GSTPeriodSummary.period >= first_full.strftime('%Y-%m'),
+                GSTPeriodSummary.period <= last_full.strftime('%Y-%m')
+            )
+            if direction:
+                query = query.filter(GSTPeriodSummary.direction == direction)
+            
+            for row in query.group_by(*columns).all():
+                add(tuple(row[:len(dimensions)]), row._mapping)
+        
+        # Partial months at either edge from the lines
+        edges = []
+        if first_full > last_full:
+            edges.append((from_date, to_date))
+        else:
+            if from_date < first_full:
+                edges.append((from_date, first_full - timedelta(days=1)))
+            if to_date > last_full:
+                edges.append((last_full + timedelta(days=1), to_date))
+        
+        for edge_from, edge_to in edges:
+            rows = []
+            if direction in (None, 'outward'):
+                rows += self._sale_contributions(db, company_id=company_id, from_date=edge_from, to_date=edge_to)
+            if direction in (None, 'inward'):
+                rows += self._purchase_contributions(db, company_id=company_id, from_date=edge_from, to_date=edge_to)
+            for row in rows:
+                add(tuple(row[dimension] for dimension in dimensions), row)
+        
+        return sorted(totals.values(), key=lambda group: tuple(str(group[dimension]) for dimension in dimensions))
+    
+    def _sale_contributions(
+        self,
+        db: Session,
+        invoice_ids: Optional[set] = None,
+        company_id: Optional[int] = None,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None
+    ) -> List[Dict]:
+        hsn = func.coalesce(SaleInvoiceItem.hsn_code, SaleInvoiceItem.sac_code)
+        group_columns = (
+            SaleInvoice.id, SaleInvoice.company_id, SaleInvoice.invoice_date, SaleInvoice.invoice_type,
+            SaleInvoice.gstin, SaleInvoice.recipient_state_code, SaleInvoiceItem.gst_rate, hsn
+        )
+        
+        query = db.query(
+            *group_columns,
+            func.sum(SaleInvoiceItem.subtotal_amount),
+            func.sum(SaleInvoiceItem.cgst_amount),
+            func.sum(SaleInvoiceItem.sgst_amount),
+            func.sum(SaleInvoiceItem.igst_amount),
+            func.sum(SaleInvoiceItem.cess_amount),
+            func.count(SaleInvoiceItem.id)
+        ).join(
+            SaleInvoiceItem, SaleInvoiceItem.invoice_id == SaleInvoice.id
+        ).filter(
+            SaleInvoice.status != 'cancelled'
+        )
+        
+        if invoice_ids is not None:
+            query = query.filter(SaleInvoice.id.in_(invoice_ids))
+        if company_id is not None:
+            query = query.filter(SaleInvoice.company_id == company_id)
+        if from_date:
+            query = query.filter(SaleInvoice.invoice_date >= from_date)
+        if to_date:
+            query = query.filter(SaleInvoice.invoice_date <= to_date)
+        
+        rows = []
+        for (invoice_id, row_company_id, invoice_date, invoice_type, gstin, state_code, rate, hsn_code,
+             taxable, cgst, sgst, igst, cess, line_count) in query.group_by(*group_columns).all():
+            # Credit notes reduce outward supplies
+            sign = -1 if invoice_type == 'credit_note' else 1
+            rows.append(self._contribution(
+                'sale_invoice', invoice_id, row_company_id, invoice_date, 'outward', rate, hsn_code,
+                state_code, 'B2B' if gstin else 'B2C', sign, taxable, cgst, sgst, igst, cess, line_count
+            ))
+        
+        return self._merge(rows)
+    
+    def _purchase_contributions(
+        self,
+        db: Session,
+        bill_ids: Optional[set] = None,
+        company_id: Optional[int] = None,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None
+    ) -> List[Dict]:
+        bill_date = func.date(PurchaseBill.pb_date)
+        group_columns = (
+            PurchaseBill.id, PurchaseBill.company_id, bill_date, PurchaseBill.reverse_charge,
+            PurchaseBillItem.gst_rate, PurchaseBillItem.hsn
+        )
+        
+        query = db.query(
+            *group_columns,
+            func.sum(PurchaseBillItem.line_taxable),
+            func.sum(PurchaseBillItem.cgst_amount),
+            func.sum(PurchaseBillItem.sgst_amount),
+            func.sum(PurchaseBillItem.igst_amount),
+            func.count(PurchaseBillItem.id)
+        ).join(
+            PurchaseBillItem, PurchaseBillItem.purchase_bill_id == PurchaseBill.id
+        ).filter(
+            PurchaseBill.status != 'cancelled'
+        )
+        
+        if bill_ids is not None:
+            query = query.filter(PurchaseBill.id.in_(bill_ids))
+        if company_id is not None:
+            query = query.filter(PurchaseBill.company_id == company_id)
+        if from_date:
+            query = query.filter(PurchaseBill.pb_date >= datetime.combine(from_date, datetime.min.time()))
+        if to_date:
+            query = query.filter(PurchaseBill.pb_date < datetime.combine(to_date + timedelta(days=1), datetime.min.time()))
+        
+        rows = []
+        for (bill_id, row_company_id, row_date, reverse_charge, rate, hsn_code,
+             taxable, cgst, sgst, igst, line_count) in query.group_by(*group_columns).all():
+            # Inward supplies are received in the company's own state
+            state_code = gst_context_cache.get(db, row_company_id).state_code if row_company_id else None
+            if isinstance(row_date, str):
+                row_date = date.fromisoformat(row_date)
+            rows.append(self._contribution(
+                'purchase_bill', bill_id, row_company_id, row_date, 'inward', rate, hsn_code,
+                state_code, 'RCM' if reverse_charge else 'B2B', 1, taxable, cgst, sgst, igst, 0, line_count
+            ))
+        
+        return self._merge(rows)
+    
+    def _contribution(
+        self, document_type, document_id, company_id, document_date, direction, rate, hsn_code,
+        state_code, supply_type, sign, taxable, cgst, sgst, igst, cess, line_count
+    ) -> Dict:
+        period = document_date.strftime('%Y-%m')
+        rate = Decimal(str(rate or 0)).quantize(Decimal('0.01'))
+        hsn_code = hsn_code or ''
+        state_code = state_code or ''
+        
+        def amount(value):
+            return sign * Decimal(str(value or 0))
+        
+        return {
+            'document_type': document_type,
+            'document_id': document_id,
+            'company_id': company_id,
+            'cell_key': f"{company_id}|{period}|{direction}|{rate}|{hsn_code}|{state_code}|{supply_type}",
+            'period': period,
+            'direction': direction,
+            'gst_rate': rate,
+            'hsn_code': hsn_code,
+            'place_of_supply': state_code,
+            'supply_type': supply_type,
+            'taxable_amount': amount(taxable),
+            'cgst_amount': amount(cgst),
+            'sgst_amount': amount(sgst),
+            'igst_amount': amount(igst),
+            'cess_amount': amount(cess),
+            'line_count': line_count
+        }
+    
+    def _merge(self, rows: List[Dict]) -> List[Dict]:
+        """One contribution per document and cell (HSN and SAC lines can land in the same cell)"""
+        merged: Dict[tuple, Dict] = {}
+        for row in rows:
+            key = (row['document_type'], row['document_id'], row['cell_key'])
+            existing = merged.get(key)
+            if existing is None:
+                merged[key] = row
+            else:
+                for measure in MEASURES:
+                    existing[measure] += row[measure]
+        return list(merged.values())
+    
+    def _apply_deltas(self, db: Session, deltas: Dict[str, Dict]):
+        if not deltas:
+            return
+        
+        table = GSTPeriodSummary.__table__
+        existing = {
+            cell_key for (cell_key,) in db.query(GSTPeriodSummary.cell_key).filter(
+                GSTPeriodSummary.cell_key.in_(list(deltas))
+            ).all()
+        }
+        
+        new_cells = [
+            dict(self._cell_values(delta['cell']), **{measure: delta[measure] for measure in MEASURES},
+                 document_count=delta['document_count'])
+            for cell_key, delta in deltas.items()
+            if cell_key not in existing and 'cell' in delta
+        ]
+        while new_cells:
+            try:
+                with db.begin_nested():
+                    db.execute(insert(GSTPeriodSummary), new_cells)
+                break
+            except IntegrityError:
+                # Another transaction created some of the cells first: the whole batch
+                # was rolled back, so add to those and insert the rest again
+                created = {
+                    cell_key for (cell_key,) in db.query(GSTPeriodSummary.cell_key).filter(
+                        GSTPeriodSummary.cell_key.in_([cell['cell_key'] for cell in new_cells])
+                    ).all()
+                }
+                if not created:
+                    raise
+                existing.update(created)
+                new_cells = [cell for cell in new_cells if cell['cell_key'] not in created]
+        
+        updates = [
+            dict({f"d_{measure}": delta[measure] for measure in MEASURES}, key=cell_key, d_document_count=delta['document_count'])
+            for cell_key, delta in deltas.items()
+            if cell_key in existing
+        ]
+        if updates:
+            # Increments, so concurrent documents in the same cell never overwrite each other
+            db.execute(
+                table.update().where(table.c.cell_key == bindparam('key')).values(
+                    updated_at=datetime.utcnow(),
+                    document_count=table.c.document_count + bindparam('d_document_count'),
+                    **{measure: table.c[measure] + bindparam(f"d_{measure}") for measure in MEASURES}
+                ),
+                updates
+            )
+            db.execute(
+                delete(GSTPeriodSummary).where(
+                    GSTPeriodSummary.cell_key.in_([update['key'] for update in updates]),
+                    GSTPeriodSummary.document_count <= 0
+                ).execution_options(synchronize_session=False)
+            )
+    
+    @staticmethod
+    def _empty_delta() -> Dict:
+        delta = {measure: 0 for measure in MEASURES}
+        delta['document_count'] = 0
+        return delta
+    
+    @staticmethod
+    def _cell_values(row: Dict) -> Dict:
+        return {
+            'company_id': row['company_id'],
+            'cell_key': row['cell_key'],
+            'period': row['period'],
+            'direction': row['direction'],
+            'gst_rate': row['gst_rate'],
+            'hsn_code': row['hsn_code'],
+            'place_of_supply': row['place_of_supply'],
+            'supply_type': row['supply_type']
+        }
+    
+    @staticmethod
+    def _contribution_values(row: Dict) -> Dict:
+        values = {
+            'document_type': row['document_type'],
+            'document_id': row['document_id'],
+            'company_id': row['company_id'],
+            'cell_key': row['cell_key'],
+            'period': row['period']
+        }
+        values.update((measure, row[measure]) for measure in MEASURES)
+        return values
+
+# Global service instance
+gst_period_summary_service = GSTPeriodSummaryService()
+
+# Document models -> (summary document kind, attribute holding the document id)
+_SUMMARY_DOCUMENTS = {
+    SaleInvoice: ('sale', 'id'),
+    SaleInvoiceItem: ('sale', 'invoice_id'),
+    PurchaseBill: ('purchase', 'id'),
+    PurchaseBillItem: ('purchase', 'purchase_bill_id')
+}
+_PENDING_DOCUMENTS = "gst_summary_pending"
+
+def _refresh_pending_documents(session):
+    pending = transaction_info(session).pop(_PENDING_DOCUMENTS, None)
+    if pending and (pending["sale"] or pending["purchase"]):
+        gst_period_summary_service.refresh_documents(session, pending["sale"], pending["purchase"])
+
+def _track_document(mapper, connection, target):
+    """Remember invoices and bills changed in this transaction, and refresh them just before it commits"""
+    kind, attribute = _SUMMARY_DOCUMENTS[mapper.class_]
+    session = object_session(target)
+    pending = transaction_info(session).setdefault(_PENDING_DOCUMENTS, {"sale": set(), "purchase": set()})
+    # Lines moved between documents update both
+    history = inspect(target).attrs[attribute].history
+    for document_id in chain((getattr(target, attribute),), history.deleted or ()):
+        if document_id is not None:
+            pending[kind].add(document_id)
+    on_before_commit(session, _PENDING_DOCUMENTS, _refresh_pending_documents)
+
+for _model in _SUMMARY_DOCUMENTS:
+    for _identifier in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _identifier, _track_document)
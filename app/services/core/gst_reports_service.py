@@ -1,17 +1,16 @@
 # backend/app/services/gst_reports_service.py
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, extract
+from sqlalchemy import and_, or_, extract
 from typing import Optional, List, Dict
 from decimal import Decimal
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 import pandas as pd
 import io
 import logging
 
 from ..models.core import Company
-from ..models.sales import SalesInvoice, SalesInvoiceItem
-from ..models.purchase import PurchaseBill, PurchaseBillItem
 from ..services.core import gst_calculation_service
+from .gst_period_summary_service import gst_period_summary_service
 
 logger = logging.getLogger(__name__)
 
@@ -38,39 +37,10 @@ class GSTReportsService:
             db, company_id, from_date, to_date
         )
         
-        # Get sales summary by GST rate
-        sales_by_rate = db.query(
-            SalesInvoiceItem.gst_rate,
-            func.sum(SalesInvoiceItem.line_total).label('total_amount'),
-            func.sum(SalesInvoiceItem.cgst_amount).label('cgst_amount'),
-            func.sum(SalesInvoiceItem.sgst_amount).label('sgst_amount'),
-            func.sum(SalesInvoiceItem.igst_amount).label('igst_amount'),
-            func.count(SalesInvoiceItem.id).label('invoice_count')
-        ).join(
-            SalesInvoice, SalesInvoiceItem.invoice_id == SalesInvoice.id
-        ).filter(
-            SalesInvoice.company_id == company_id,
-            SalesInvoice.invoice_date >= from_date,
-            SalesInvoice.invoice_date <= to_date,
-            SalesInvoice.status != 'cancelled'
-        ).group_by(SalesInvoiceItem.gst_rate).all()
-        
-        # Get purchase summary by GST rate
-        purchase_by_rate = db.query(
-            PurchaseBillItem.gst_rate,
-            func.sum(PurchaseBillItem.line_total).label('total_amount'),
-            func.sum(PurchaseBillItem.cgst_amount).label('cgst_amount'),
-            func.sum(PurchaseBillItem.sgst_amount).label('sgst_amount'),
-            func.sum(PurchaseBillItem.igst_amount).label('igst_amount'),
-            func.count(PurchaseBillItem.id).label('bill_count')
-        ).join(
-            PurchaseBill, PurchaseBillItem.bill_id == PurchaseBill.id
-        ).filter(
-            PurchaseBill.company_id == company_id,
-            PurchaseBill.bill_date >= from_date,
-            PurchaseBill.bill_date <= to_date,
-            PurchaseBill.status != 'cancelled'
-        ).group_by(PurchaseBillItem.gst_rate).all()
+        # Sales and purchase summaries by GST rate from the GST period summary
+        groups = gst_period_summary_service.aggregate(
+            db, company_id, from_date, to_date, dimensions=('direction', 'gst_rate')
+        )
         
         return {
             "company_details": {
@@ -84,26 +54,12 @@ class GSTReportsService:
             },
             "gst_liability": liability,
             "sales_summary": [
-                {
-                    "gst_rate": sale.gst_rate,
-                    "total_amount": sale.total_amount,
-                    "cgst_amount": sale.cgst_amount,
-                    "sgst_amount": sale.sgst_amount,
-                    "igst_amount": sale.igst_amount,
-                    "invoice_count": sale.invoice_count
-                }
-                for sale in sales_by_rate
+                self._rate_totals(group, "invoice_count")
+                for group in groups if group['direction'] == 'outward'
             ],
             "purchase_summary": [
-                {
-                    "gst_rate": purchase.gst_rate,
-                    "total_amount": purchase.total_amount,
-                    "cgst_amount": purchase.cgst_amount,
-                    "sgst_amount": purchase.sgst_amount,
-                    "igst_amount": purchase.igst_amount,
-                    "bill_count": purchase.bill_count
-                }
-                for purchase in purchase_by_rate
+                self._rate_totals(group, "bill_count")
+                for group in groups if group['direction'] == 'inward'
             ]
         }
     
@@ -116,84 +72,36 @@ class GSTReportsService:
     ) -> Dict:
         """Generate GST rate-wise detailed report"""
         
-        # Get all GST rates used in the period
-        sales_rates = db.query(SalesInvoiceItem.gst_rate).join(
-            SalesInvoice, SalesInvoiceItem.invoice_id == SalesInvoice.id
-        ).filter(
-            SalesInvoice.company_id == company_id,
-            SalesInvoice.invoice_date >= from_date,
-            SalesInvoice.invoice_date <= to_date,
-            SalesInvoice.status != 'cancelled'
-        ).distinct().all()
-        
-        purchase_rates = db.query(PurchaseBillItem.gst_rate).join(
-            PurchaseBill, PurchaseBillItem.bill_id == PurchaseBill.id
-        ).filter(
-            PurchaseBill.company_id == company_id,
-            PurchaseBill.bill_date >= from_date,
-            PurchaseBill.bill_date <= to_date,
-            PurchaseBill.status != 'cancelled'
-        ).distinct().all()
+        # One pass over the GST period summary, grouped by direction and rate
+        groups = {
+            (group['direction'], group['gst_rate']): self._rate_totals(group, "transaction_count")
+            for group in gst_period_summary_service.aggregate(
+                db, company_id, from_date, to_date, dimensions=('direction', 'gst_rate')
+            )
+        }
         
-        all_rates = set([rate.gst_rate for rate in sales_rates + purchase_rates])
+        empty = {
+            "total_amount": Decimal('0'),
+            "cgst_amount": Decimal('0'),
+            "sgst_amount": Decimal('0'),
+            "igst_amount": Decimal('0'),
+            "transaction_count": 0
+        }
         
         rate_wise_data = []
         
-        for rate in sorted(all_rates):
-            # Sales data for this rate
-            sales_data = db.query(
-                func.sum(SalesInvoiceItem.line_total).label('total_amount'),
-                func.sum(SalesInvoiceItem.cgst_amount).label('cgst_amount'),
-                func.sum(SalesInvoiceItem.sgst_amount).label('sgst_amount'),
-                func.sum(SalesInvoiceItem.igst_amount).label('igst_amount'),
-                func.count(SalesInvoiceItem.id).label('transaction_count')
-            ).join(
-                SalesInvoice, SalesInvoiceItem.invoice_id == SalesInvoice.id
-            ).filter(
-                SalesInvoice.company_id == company_id,
-                SalesInvoice.invoice_date >= from_date,
-                SalesInvoice.invoice_date <= to_date,
-                SalesInvoice.status != 'cancelled',
-                SalesInvoiceItem.gst_rate == rate
-            ).first()
-            
-            # Purchase data for this rate
-            purchase_data = db.query(
-                func.sum(PurchaseBillItem.line_total).label('total_amount'),
-                func.sum(PurchaseBillItem.cgst_amount).label('cgst_amount'),
-                func.sum(PurchaseBillItem.sgst_amount).label('sgst_amount'),
-                func.sum(PurchaseBillItem.igst_amount).label('igst_amount'),
-                func.count(PurchaseBillItem.id).label('transaction_count')
-            ).join(
-                PurchaseBill, PurchaseBillItem.bill_id == PurchaseBill.id
-            ).filter(
-                PurchaseBill.company_id == company_id,
-                PurchaseBill.bill_date >= from_date,
-                PurchaseBill.bill_date <= to_date,
-                PurchaseBill.status != 'cancelled',
-                PurchaseBillItem.gst_rate == rate
-            ).first()
+        for rate in sorted({rate for _, rate in groups}):
+            sales_data = groups.get(('outward', rate), empty)
+            purchase_data = groups.get(('inward', rate), empty)
             
             rate_wise_data.append({
                 "gst_rate": rate,
-                "sales": {
-                    "total_amount": sales_data.total_amount or Decimal('0'),
-                    "cgst_amount": sales_data.cgst_amount or Decimal('0'),
-                    "sgst_amount": sales_data.sgst_amount or Decimal('0'),
-                    "igst_amount": sales_data.igst_amount or Decimal('0'),
-                    "transaction_count": sales_data.transaction_count or 0
-                },
-                "purchase": {
-                    "total_amount": purchase_data.total_amount or Decimal('0'),
-                    "cgst_amount": purchase_data.cgst_amount or Decimal('0'),
-                    "sgst_amount": purchase_data.sgst_amount or Decimal('0'),
-                    "igst_amount": purchase_data.igst_amount or Decimal('0'),
-                    "transaction_count": purchase_data.transaction_count or 0
-                },
+                "sales": {key: sales_data[key] for key in empty},
+                "purchase": {key: purchase_data[key] for key in empty},
                 "net_liability": {
-                    "cgst": (sales_data.cgst_amount or Decimal('0')) - (purchase_data.cgst_amount or Decimal('0')),
-                    "sgst": (sales_data.sgst_amount or Decimal('0')) - (purchase_data.sgst_amount or Decimal('0')),
-                    "igst": (sales_data.igst_amount or Decimal('0')) - (purchase_data.igst_amount or Decimal('0'))
+                    "cgst": sales_data["cgst_amount"] - purchase_data["cgst_amount"],
+                    "sgst": sales_data["sgst_amount"] - purchase_data["sgst_amount"],
+                    "igst": sales_data["igst_amount"] - purchase_data["igst_amount"]
                 }
             })
         
@@ -381,5 +289,21 @@ class GSTReportsService:
             ]
         }
 
+    def _rate_totals(self, group: Dict, count_key: str) -> Dict:
+        total_amount = (
+            group['taxable_amount'] + group['cgst_amount'] + group['sgst_amount']
+            + group['igst_amount'] + group['cess_amount']
+        )
+        return {
+            "gst_rate": group['gst_rate'],
+            "taxable_amount": group['taxable_amount'],
+            "total_amount": total_amount,
+            "cgst_amount": group['cgst_amount'],
+            "sgst_amount": group['sgst_amount'],
+            "igst_amount": group['igst_amount'],
+            "cess_amount": group['cess_amount'],
+            count_key: group['line_count']
+        }
+
 # Global service instance
 gst_reports_service = GSTReportsService()
\ No newline at end of file
@@ -0,0 +1,262 @@
+# backend/app/services/gst_tax_engine.py
+from sqlalchemy.orm import Session
+from sqlalchemy import or_
+from typing import Optional, List, Dict, Iterable, Union
+from decimal import Decimal, ROUND_HALF_UP
+from datetime import date
+import numpy as np
+import logging
+
+from ..models.core import Company, GSTSlab
+from ...core.model_cache import ModelCache
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Amounts are held as integers in 1/10000 rupee, rates in 1/100 percent
+AMOUNT_SCALE = 10000
+RATE_SCALE = 100
+_UNIT = Decimal('1')
+
+# amount units x rate units / TAX_DIVISOR = tax in paise
+TAX_DIVISOR = AMOUNT_SCALE * RATE_SCALE
+
+# Largest |numerator| the int64 path takes before falling back to Python integers
+_INT64_SAFE = 2 ** 61
+
+def to_units(values: Iterable, scale: int) -> np.ndarray:
+    """Convert Decimal/float/str values to integer units (None counts as zero), rounding halves up"""
+    if isinstance(values, np.ndarray) and values.dtype.kind in "iu":
+        return values.astype(np.int64) * scale
+    
+    # Quantize in Decimal: float products can land either side of a half, and np.rint rounds halves to even
+    factor = Decimal(scale)
+    return np.fromiter(
+        (
+            0 if value is None else int((Decimal(str(value)) * factor).quantize(_UNIT, ROUND_HALF_UP))
+            for value in values
+        ),
+        dtype=np.int64
+    )
+
+def round_half_up(numerator: np.ndarray, denominator: int) -> np.ndarray:
+    """Integer division rounding halves away from zero, as Decimal ROUND_HALF_UP does"""
+    magnitude = (2 * np.abs(numerator) + denominator) // (2 * denominator)
+    return np.where(numerator < 0, -magnitude, magnitude)
+
+def to_decimals(units: np.ndarray, exponent: int = -2) -> List[Decimal]:
+    """Integer units back to Decimals (paise by default)"""
+    return [Decimal(int(value)).scaleb(exponent) for value in units]
+
+def _tax(amounts: np.ndarray, rates: np.ndarray, divisor: int) -> np.ndarray:
+    if amounts.size and int(np.abs(amounts).max()) * int(np.abs(rates).max()) * 2 >= _INT64_SAFE:
+        # Very large amounts: same arithmetic on Python integers
+        return round_half_up(amounts.astype(object) * rates.astype(object), divisor).astype(np.int64)
+    return round_half_up(amounts * rates, divisor)
+
+def _amount(units: int) -> Decimal:
+    value = Decimal(units).scaleb(-4)
+    return value.quantize(Decimal('0.01')) if units % 100 == 0 else value
+
+class GSTComputation:
+    """Per-line and per-rate GST for a set of lines, in paise"""
+    
+    __slots__ = (
+        "taxable", "rates", "cess_rates", "interstate",
+        "cgst", "sgst", "igst", "cess",
+        "group_rates", "group_interstate", "group_taxable", "group_gst", "group_cgst", "group_sgst",
+        "group_igst", "group_cess", "group_index"
+    )
+    
+    @property
+    def total_gst(self) -> np.ndarray:
+        return self.cgst + self.sgst + self.igst + self.cess
+    
+    @property
+    def taxable_paise(self) -> np.ndarray:
+        return round_half_up(self.taxable, AMOUNT_SCALE // 100)
+    
+    def line(self, index: int) -> Dict[str, Decimal]:
+        """One line's breakdown as Decimals"""
+        cgst, sgst, igst, cess = (int(self.cgst[index]), int(self.sgst[index]), int(self.igst[index]), int(self.cess[index]))
+        rate = Decimal(int(self.rates[index])).scaleb(-2)
+        intra = not self.interstate[index]
+        taxable = _amount(int(self.taxable[index]))
+        gst = Decimal(cgst + sgst + igst + cess).scaleb(-2)
+        
+        return {
+            "taxable_amount": taxable,
+            "gst_rate": rate,
+            "cgst_rate": rate / 2 if intra else Decimal('0'),
+            "sgst_rate": rate / 2 if intra else Decimal('0'),
+            "igst_rate": Decimal('0') if intra else rate,
+            "cgst_amount": Decimal(cgst).scaleb(-2),
+            "sgst_amount": Decimal(sgst).scaleb(-2),
+            "igst_amount": Decimal(igst).scaleb(-2),
+            "cess_rate": Decimal(int(self.cess_rates[index])).scaleb(-2),
+            "cess_amount": Decimal(cess).scaleb(-2),
+            "total_gst_amount": gst,
+            "total_amount": taxable + gst
+        }
+    
+    def rate_breakdown(self) -> List[Dict]:
+        """Per-rate totals; tax is rounded on each rate's combined taxable value"""
+        return [
+            {
+                "gst_rate": Decimal(int(self.group_rates[g])).scaleb(-2),
+                "is_interstate": bool(self.group_interstate[g]),
+                "base_amount": _amount(int(self.group_taxable[g])),
+                "gst_amount": Decimal(int(self.group_gst[g])).scaleb(-2),
+                "cgst_amount": Decimal(int(self.group_cgst[g])).scaleb(-2),
+                "sgst_amount": Decimal(int(self.group_sgst[g])).scaleb(-2),
+                "igst_amount": Decimal(int(self.group_igst[g])).scaleb(-2),
+                "cess_amount": Decimal(int(self.group_cess[g])).scaleb(-2)
+            }
+            for g in range(len(self.group_rates))
+        ]
+
+class GSTTaxEngine:
+    """
+    Columnar GST computation.
+    
+    Lines come in as parallel arrays (taxable amount, GST rate, cess rate,
+    interstate flag) and are taxed in one pass on integer units, so results
+    match Decimal ROUND_HALF_UP to the paisa. Each line is rounded on its own;
+    the per-rate breakdown rounds each rate's combined taxable value, the
+    way invoice totals have always been computed.
+    """
+    
+    def compute(
+        self,
+        amounts: Iterable,
+        rates: Iterable,
+        cess_rates: Optional[Iterable] = None,
+        interstate: Union[bool, Iterable[bool]] = False
+    ) -> GSTComputation:
+        """Tax a batch of lines"""
+        
+        taxable = to_units(amounts, AMOUNT_SCALE)
+        rate_units = to_units(rates, RATE_SCALE)
+        cess_units = to_units(cess_rates, RATE_SCALE) if cess_rates is not None else np.zeros_like(taxable)
+        inter = np.broadcast_to(np.asarray(interstate, dtype=bool), taxable.shape)
+        
+        result = GSTComputation()
+        result.taxable = taxable
+        result.rates = rate_units
+        result.cess_rates = cess_units
+        result.interstate = inter
+        
+        self._tax_lines(result, taxable, rate_units, cess_units, inter)
+        self._tax_groups(result, taxable, rate_units, inter)
+        
+        return result
+    
+    def _tax_lines(self, result, taxable, rate_units, cess_units, inter):
+        full = _tax(taxable, rate_units, TAX_DIVISOR)
+        half = _tax(taxable, rate_units, 2 * TAX_DIVISOR)
+        zero = np.zeros_like(taxable)
+        
+        result.cgst = np.where(inter, zero, half)
+        result.sgst = result.cgst
+        result.igst = np.where(inter, full, zero)
+        result.cess = _tax(taxable, cess_units, TAX_DIVISOR)
+    
+    def _tax_groups(self, result, taxable, rate_units, inter):
+        keys = rate_units * 2 + inter
+        group_keys, group_index = np.unique(keys, return_inverse=True)
+        
+        group_taxable = np.zeros(len(group_keys), dtype=np.int64)
+        np.add.at(group_taxable, group_index, taxable)
+        group_cess = np.zeros(len(group_keys), dtype=np.int64)
+        np.add.at(group_cess, group_index, result.cess)
+        
+        group_rates = group_keys // 2
+        group_inter = (group_keys % 2).astype(bool)
+        full = _tax(group_taxable, group_rates, TAX_DIVISOR)
+        half = _tax(group_taxable, group_rates, 2 * TAX_DIVISOR)
+        zero = np.zeros_like(group_taxable)
+        
+        result.group_index = group_index
+        result.group_rates = group_rates
+        result.group_interstate = group_inter
+        result.group_taxable = group_taxable
+        result.group_gst = full
+        result.group_cgst = np.where(group_inter, zero, half)
+        result.group_sgst = result.group_cgst
+        result.group_igst = np.where(group_inter, full, zero)
+        result.group_cess = group_cess
+
+class GSTContext:
+    """A company's GST settings: state code, slabs in force and cess rates by HSN/SAC"""
+    
+    __slots__ = ("company_id", "state_code", "slabs", "hsn_cess", "sac_cess")
+    
+    def __init__(self, company_id: int, state_code: Optional[str]):
+        self.company_id = company_id
+        self.state_code = state_code
+        self.slabs: List[Dict] = []
+        self.hsn_cess: Dict[str, Decimal] = {}
+        self.sac_cess: Dict[str, Decimal] = {}
+    
+    def cess_rate(self, hsn_code: Optional[str] = None, sac_code: Optional[str] = None) -> Decimal:
+        if hsn_code:
+            return self.hsn_cess.get(hsn_code, Decimal('0'))
+        if sac_code:
+            return self.sac_cess.get(sac_code, Decimal('0'))
+        return Decimal('0')
+    
+    def is_interstate(self, recipient_state_code: Optional[str]) -> bool:
+        return self.state_code != recipient_state_code
+
+class GSTContextCache(ModelCache):
+    """
+    Per-process cache of GST contexts, one per company.
+    
+    Saving a company, slab or HSN/SAC record retires every cached context.
+    """
+    
+    def watched_models(self):
+        from ..models.l10n_in import HSNCode, SACCode
+        return (Company, GSTSlab, HSNCode, SACCode)
+    
+    def build(self, db: Session, company_id: int) -> GSTContext:
+        """Load a company's state code, current slabs and cess rates (four queries)"""
+        from ..models.l10n_in import HSNCode, SACCode
+        
+        today = date.today()
+        
+        state_code = db.query(Company.gst_state_code).filter(Company.id == company_id).scalar()
+        context = GSTContext(company_id, state_code)
+        
+        context.slabs = [
+            {
+                "id": slab.id,
+                "rate": slab.rate,
+                "cgst_rate": slab.cgst_rate,
+                "sgst_rate": slab.sgst_rate,
+                "igst_rate": slab.igst_rate,
+                "description": slab.description,
+                "is_default": slab.is_default
+            }
+            for slab in db.query(GSTSlab).filter(
+                GSTSlab.company_id == company_id,
+                GSTSlab.effective_from <= today,
+                or_(GSTSlab.effective_to.is_(None), GSTSlab.effective_to >= today),
+                GSTSlab.is_active == True
+            ).order_by(GSTSlab.rate).all()
+        ]
+        
+        for model, target in ((HSNCode, context.hsn_cess), (SACCode, context.sac_cess)):
+            target.update(
+                db.query(model.code, model.cess_rate).filter(
+                    model.company_id == company_id,
+                    model.is_active == True,
+                    model.cess_rate > 0
+                ).all()
+            )
+        
+        return context
+
+# Global instances
+gst_tax_engine = GSTTaxEngine()
+gst_context_cache = GSTContextCache(ttl_seconds=settings.gst_context_cache_ttl_seconds)
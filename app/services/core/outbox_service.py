@@ -0,0 +1,268 @@
+# backend/app/services/outbox_service.py
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, or_, func
+from typing import Optional, List, Dict, Callable
+from datetime import datetime, timedelta
+import socket
+import os
+import logging
+
+from ..models.core import IntegrationOutbox
+from ..database import get_db_session
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# A topic handler receives a batch of claimed events and returns {event_id: error} for the ones that failed
+OutboxHandler = Callable[[Session, List[IntegrationOutbox]], Optional[Dict[int, str]]]
+
+class OutboxService:
+    """
+    Transactional outbox for post-commit integrations.
+    
+    Documents enqueue events in their own transaction, so an event exists
+    exactly when its document committed. Workers claim pending events in
+    batches and run each topic's handler over the whole batch; the outcome is
+    recorded in the same transaction as the handler's writes, so a processed
+    event is never applied twice. A worker that outlives its lock loses the
+    event to whoever reclaims it: run_each skips events no longer claimed by
+    this worker, and only claimed events get an outcome. Failures are retried
+    with exponential backoff and parked as failed after max_attempts.
+    """
+    
+    # Shared by every instance, so handlers registered at import are seen by the worker
+    _handlers: Dict[str, OutboxHandler] = {}
+    _stats: Dict[str, object] = {"processed": 0, "failed": 0, "retried": 0, "batches": 0, "last_batch_at": None}
+    
+    def __init__(self):
+        self.batch_size = settings.outbox_batch_size
+        self.max_attempts = settings.outbox_max_attempts
+        self.retry_base_seconds = 5
+        self.retry_max_seconds = 3600
+        self.lock_timeout_seconds = 300
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    
+    @classmethod
+    def register_handler(cls, topic: str, handler: OutboxHandler):
+        """Register the batch handler for a topic"""
+        cls._handlers[topic] = handler
+    
+    def enqueue(
+        self,
+        db: Session,
+        topic: str,
+        aggregate_type: str,
+        aggregate_id: int,
+        payload: Optional[Dict] = None,
+        company_id: Optional[int] = None
+    ) -> IntegrationOutbox:
+        """Add an event in the caller's transaction; one event per topic and document"""
+        
+        event = IntegrationOutbox(
+            company_id=company_id,
+            topic=topic,
+            aggregate_type=aggregate_type,
+            aggregate_id=aggregate_id,
+            idempotency_key=f"{topic}:{aggregate_type}:{aggregate_id}",
+            payload=payload,
+            status='pending',
+            attempts=0,
+            available_at=datetime.utcnow()
+        )
+        db.add(event)
+        return event
+    
+    def claim_batch(
+        self,
+        db: Session,
+        batch_size: Optional[int] = None,
+        topics: Optional[List[str]] = None
+    ) -> List[IntegrationOutbox]:
+        """Claim due events (and ones abandoned by a crashed worker) and commit the claim"""
+        
+        now = datetime.utcnow()
+        stale = now - timedelta(seconds=self.lock_timeout_seconds)
+        
+        query = db.query(IntegrationOutbox).filter(
+            or_(
+                and_(IntegrationOutbox.status == 'pending', IntegrationOutbox.available_at <= now),
+                and_(IntegrationOutbox.status == 'processing', IntegrationOutbox.locked_at < stale)
+            )
+        )
+        if topics:
+            query = query.filter(IntegrationOutbox.topic.in_(topics))
+        
+        events = query.order_by(IntegrationOutbox.id).limit(
+            batch_size or self.batch_size
+        ).with_for_update(skip_locked=True).all()
+        
+        for event in events:
+            event.status = 'processing'
+            event.locked_at = now
+            event.locked_by = self.worker_id
+            event.attempts = (event.attempts or 0) + 1
+        
+        db.commit()
+        return events
+    
+    def process_batch(self, batch_size: Optional[int] = None, topics: Optional[List[str]] = None) -> Dict:
+        """Claim one batch and run it, one transaction per topic"""
+        
+        with get_db_session() as db:
+            events = self.claim_batch(db, batch_size, topics)
+            if not events:
+                return {"claimed": 0, "processed": 0, "failed": 0}
+            
+            by_topic: Dict[str, List[IntegrationOutbox]] = {}
+            for event in events:
+                by_topic.setdefault(event.topic, []).append(event)
+            
+            processed = failed = 0
+            for topic, topic_events in by_topic.items():
+                event_ids = [event.id for event in topic_events]
+                handler = self._handlers.get(topic)
+                
+                if handler is None:
+                    failures = {event_id: f"No handler registered for topic {topic}" for event_id in event_ids}
+                else:
+                    try:
+                        failures = handler(db, topic_events) or {}
+                    except Exception as e:
+                        # The whole batch failed; drop its partial writes
+                        logger.error(f"Outbox handler for {topic} failed: {str(e)}")
+                        db.rollback()
+                        failures = {event_id: str(e) for event_id in event_ids}
+                
+                self._record_outcome(db, event_ids, failures)
+                db.commit()
+                
+                failed += len(failures)
+                processed += len(event_ids) - len(failures)
+            
+            self._stats["processed"] += processed
+            self._stats["failed"] += failed
+            self._stats["batches"] += 1
+            self._stats["last_batch_at"] = datetime.utcnow()
+            
+            return {"claimed": len(events), "processed": processed, "failed": failed}
+    
+    def run_each(self, db: Session, events: List[IntegrationOutbox], apply: Callable[[IntegrationOutbox], None]) -> Dict[int, str]:
+        """Apply a handler per event inside a savepoint, so one bad event does not sink the batch"""
+        
+        failures = {}
+        for event in events:
+            try:
+                with db.begin_nested():
+                    if not self._is_claimed(db, event.id):
+                        raise RuntimeError("Event was reclaimed or finished by another worker")
+                    apply(event)
+            except Exception as e:
+                logger.warning(f"Outbox event {event.id} ({event.topic}) failed: {str(e)}")
+                failures[event.id] = str(e)
+        return failures
+    
+    def get_lag_metrics(self, db: Session) -> Dict:
+        """Backlog per topic, age of the oldest waiting event and worker counters"""
+        
+        now = datetime.utcnow()
+        rows = db.query(
+            IntegrationOutbox.topic,
+            IntegrationOutbox.status,
+            func.count(IntegrationOutbox.id),
+            func.min(IntegrationOutbox.created_at)
+        ).filter(
+            IntegrationOutbox.status != 'done'
+        ).group_by(IntegrationOutbox.topic, IntegrationOutbox.status).all()
+        
+        topics = {}
+        for topic, status, count, oldest in rows:
+            entry = topics.setdefault(topic, {"pending": 0, "processing": 0, "failed": 0, "lag_seconds": 0.0})
+            entry[status] = count
+            if status != 'failed' and oldest is not None:
+                entry["lag_seconds"] = max(entry["lag_seconds"], (now - oldest).total_seconds())
+        
+        last_batch_at = self._stats["last_batch_at"]
+        
+        return {
+            "topics": topics,
+            "lag_seconds": max((entry["lag_seconds"] for entry in topics.values()), default=0.0),
+            "pending": sum(entry["pending"] + entry["processing"] for entry in topics.values()),
+            "failed": sum(entry["failed"] for entry in topics.values()),
+            "worker": {
+                "processed": self._stats["processed"],
+                "failed": self._stats["failed"],
+                "retried": self._stats["retried"],
+                "batches": self._stats["batches"],
+                "last_batch_at": last_batch_at.isoformat() if last_batch_at else None
+            }
+        }
+    
+    def retry_failed(self, db: Session, topic: Optional[str] = None) -> int:
+        """Put parked events back in the queue"""
+        
+        query = db.query(IntegrationOutbox).filter(IntegrationOutbox.status == 'failed')
+        if topic:
+            query = query.filter(IntegrationOutbox.topic == topic)
+        
+        count = query.update({
+            IntegrationOutbox.status: 'pending',
+            IntegrationOutbox.attempts: 0,
+            IntegrationOutbox.available_at: datetime.utcnow()
+        }, synchronize_session=False)
+        db.commit()
+        
+        return count
+    
+    def purge_processed(self, db: Session, older_than_days: int = 7) -> int:
+        """Delete processed events past the retention window"""
+        
+        cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+        count = db.query(IntegrationOutbox).filter(
+            IntegrationOutbox.status == 'done',
+            IntegrationOutbox.processed_at < cutoff
+        ).delete(synchronize_session=False)
+        db.commit()
+        
+        if count:
+            logger.info(f"Purged {count} processed outbox events")
+        
+        return count
+    
+    def _is_claimed(self, db: Session, event_id: int) -> bool:
+        """Lock the event and check it is still this worker's, so a reclaimed event is applied once"""
+        return db.query(IntegrationOutbox.id).filter(
+            IntegrationOutbox.id == event_id,
+            IntegrationOutbox.status == 'processing',
+            IntegrationOutbox.locked_by == self.worker_id
+        ).with_for_update().first() is not None
+    
+    def _record_outcome(self, db: Session, event_ids: List[int], failures: Dict[int, str]):
+        now = datetime.utcnow()
+        
+        # Events another worker reclaimed meanwhile keep that worker's claim
+        for event in db.query(IntegrationOutbox).filter(
+            IntegrationOutbox.id.in_(event_ids),
+            IntegrationOutbox.status == 'processing',
+            IntegrationOutbox.locked_by == self.worker_id
+        ).all():
+            event.locked_at = None
+            event.locked_by = None
+            
+            error = failures.get(event.id)
+            if error is None:
+                event.status = 'done'
+                event.processed_at = now
+                event.last_error = None
+            elif event.attempts >= self.max_attempts:
+                event.status = 'failed'
+                event.last_error = error
+                logger.error(f"Outbox event {event.id} ({event.topic}) parked after {event.attempts} attempts: {error}")
+            else:
+                delay = min(self.retry_base_seconds * 2 ** (event.attempts - 1), self.retry_max_seconds)
+                event.status = 'pending'
+                event.available_at = now + timedelta(seconds=delay)
+                event.last_error = error
+                self._stats["retried"] += 1
+
+# Global service instance
+outbox_service = OutboxService()
@@ -0,0 +1,583 @@
+# backend/app/services/report_processing.py
+from typing import Optional, List, Dict, Tuple, Any, Iterable
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+import math
+import logging
+
+import numpy as np
+import pandas as pd
+
+from .report_query_engine import json_safe
+
+logger = logging.getLogger(__name__)
+
+# Aggregations a template or view can ask for
+AGGREGATE_FUNCTIONS = ('sum', 'count', 'avg', 'min', 'max', 'distinct')
+
+# Accepted spellings -> aggregate function ('average' is what older templates use)
+FUNCTION_ALIASES = {
+    'average': 'avg',
+    'mean': 'avg',
+    'count_distinct': 'distinct'
+}
+
+# Decimal places kept exactly when money columns are summed as integers
+MAX_SCALE = 6
+
+def _decimal(value: Any) -> Optional[Decimal]:
+    """Exact Decimal for a number or numeric string, None for blanks; raises ValueError otherwise"""
+    if value is None or (isinstance(value, float) and math.isnan(value)) or value is pd.NA:
+        return None
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, bool):
+        raise ValueError(value)
+    if isinstance(value, (int, np.integer)):
+        return Decimal(int(value))
+    if isinstance(value, (float, np.floating)):
+        return Decimal(repr(float(value)))
+    if isinstance(value, str):
+        try:
+            return Decimal(value.strip())
+        except InvalidOperation:
+            raise ValueError(value)
+    raise ValueError(value)
+
+def _clean(value: Any) -> Any:
+    """Plain JSON-safe Python value for a pandas/numpy cell"""
+    if value is None or value is pd.NA or (isinstance(value, float) and math.isnan(value)):
+        return None
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return None if np.isnan(value) else float(value)
+    if isinstance(value, np.bool_):
+        return bool(value)
+    return json_safe(value)
+
+def _frame(rows: List[Dict]) -> pd.DataFrame:
+    """DataFrame of rows; integer columns with blanks keep their ints instead of becoming floats"""
+    frame = pd.DataFrame.from_records(rows)
+    for column in frame.columns[(frame.dtypes == np.float64).to_numpy()]:
+        if not frame[column].isna().any():
+            continue
+        values = pd.Series([row.get(column) for row in rows], index=frame.index, dtype=object)
+        if pd.api.types.infer_dtype(values, skipna=True) == 'integer':
+            frame[column] = values
+    return frame
+
+def _average(total: Any, count: Any) -> Optional[str]:
+    total = _decimal(total)
+    if total is None or not count:
+        return None
+    places = max(-total.as_tuple().exponent, 2) + 2
+    return str((total / Decimal(int(count))).quantize(Decimal(1).scaleb(-places), rounding=ROUND_HALF_UP))
+
+def _sort_terms(sorting: Any) -> List[Tuple[str, str]]:
+    if not sorting:
+        return []
+    if isinstance(sorting, dict):
+        sorting = sorting.get('fields') or [sorting]
+    terms = []
+    for term in sorting:
+        if isinstance(term, str):
+            terms.append((term, 'asc'))
+        elif term.get('field'):
+            terms.append((term['field'], (term.get('direction') or 'asc').lower()))
+    return terms
+
+class ReportProcessingSpec:
+    """Sorting, grouping and aggregation read from a template_config or a report view"""
+    
+    __slots__ = ("group_fields", "aggregates", "sort", "subtotals", "legacy_summary")
+    
+    def __init__(
+        self,
+        group_fields: List[str],
+        aggregates: List[Tuple[str, str, str]],
+        sort: List[Tuple[str, str]],
+        subtotals: bool = False,
+        legacy_summary: bool = False
+    ):
+        self.group_fields = group_fields
+        self.aggregates = aggregates
+        self.sort = sort
+        self.subtotals = subtotals
+        self.legacy_summary = legacy_summary
+    
+    @classmethod
+    def from_config(
+        cls,
+        config: Optional[Dict],
+        sorting: Any = None,
+        grouping: Any = None,
+        aggregation: Any = None
+    ) -> "ReportProcessingSpec":
+        """
+        Accepts the original single-field forms ({'field': ..}) as well as
+        {'fields': [..]} lists; grouping may set 'subtotals'. Explicit
+        sorting/grouping/aggregation (a view's own settings) override the config.
+        """
+        config = config or {}
+        sorting = sorting if sorting is not None else config.get('sorting')
+        grouping = grouping if grouping is not None else config.get('grouping')
+        aggregation = aggregation if aggregation is not None else config.get('aggregation')
+        
+        subtotals = bool(config.get('subtotals', False))
+        if isinstance(grouping, dict):
+            group_fields = list(grouping.get('fields') or ([grouping['field']] if grouping.get('field') else []))
+            subtotals = bool(grouping.get('subtotals', subtotals))
+        else:
+            group_fields = list(grouping or [])
+        
+        if isinstance(aggregation, dict):
+            terms = aggregation['fields'] if 'fields' in aggregation else [aggregation]
+        else:
+            terms = aggregation or []
+        
+        # A single aggregation without grouping keeps the original summary row shape
+        legacy = isinstance(aggregation, dict) and 'fields' not in aggregation and not group_fields
+        
+        aggregates = []
+        for term in terms:
+            field = term.get('field')
+            if not field:
+                continue
+            function = (term.get('function') or 'sum').lower()
+            function = FUNCTION_ALIASES.get(function, function)
+            if function not in AGGREGATE_FUNCTIONS:
+                raise ValueError(f"Unknown aggregate function: {function}")
+            alias = term.get('alias') or (field if legacy else ('count' if field == '*' else f"{field}_{function}"))
+            aggregates.append((field, function, alias))
+        
+        return cls(group_fields, aggregates, _sort_terms(sorting), subtotals, legacy and len(aggregates) == 1)
+    
+    @property
+    def grouped(self) -> bool:
+        return bool(self.group_fields and self.aggregates)
+    
+    def row_order(self) -> List[Tuple[str, str]]:
+        """Order of the rows the main query returns (group rows when grouped)"""
+        
+        if not self.group_fields:
+            return list(self.sort)
+        
+        sort = list(self.sort)
+        if self.grouped:
+            # Group rows only have the group fields and the aggregates
+            columns = set(self.group_fields) | {alias for _, _, alias in self.aggregates}
+            sort = [term for term in sort if term[0] in columns]
+        
+        if self.grouped and not self.subtotals:
+            order = sort
+        else:
+            # Rows of one group (or one subtotal prefix) must be adjacent
+            leading = self.group_fields[:-1] if self.grouped else self.group_fields
+            order = [(field, 'asc') for field in leading] + sort
+        
+        ordered = {field for field, _ in order}
+        order += [(field, 'asc') for field in self.group_fields if field not in ordered]
+        
+        seen = set()
+        return [term for term in order if not (term[0] in seen or seen.add(term[0]))]
+    
+    def total_levels(self) -> List[int]:
+        """Grouping depths that get total rows: each subtotal prefix (deepest first), then the grand total"""
+        
+        if not self.aggregates:
+            return []
+        if self.grouped and self.subtotals:
+            return list(range(len(self.group_fields) - 1, 0, -1)) + [0]
+        return [0]
+    
+    def sql_aggregates(self) -> List[Tuple[str, str, str]]:
+        """(function, column, alias) for the query engine; averages are summed and counted, then divided exactly"""
+        
+        terms = []
+        for field, function, alias in self.aggregates:
+            if function == 'avg':
+                terms.append(('sum', field, f"{alias}__sum"))
+                terms.append(('count', field, f"{alias}__count"))
+            elif function == 'distinct':
+                terms.append(('count_distinct', field, alias))
+            else:
+                terms.append((function, field, alias))
+        return terms
+
+class ReportProcessor:
+    """
+    Sorting, grouping and aggregation for Report Studio results.
+    
+    When rows come from SQL the work is pushed into the query: grouped
+    totals and each subtotal level are GROUP BY queries, and sorting is an
+    ORDER BY. Rows already in memory (stored instance data, report views)
+    are processed column-wise with pandas. Money columns are summed as
+    scaled integers, so totals keep their Decimal precision either way.
+    """
+    
+    def finish_rows(self, rows: Iterable[Dict], spec: ReportProcessingSpec) -> List[Dict]:
+        """Turn SQL aggregate rows into report values (exact averages, Decimal strings)"""
+        
+        aliases = {alias for _, _, alias in spec.aggregates} | {alias for _, _, alias in spec.sql_aggregates()}
+        
+        finished = []
+        for row in rows:
+            finished_row = {key: value for key, value in row.items() if key not in aliases}
+            for field, function, alias in spec.aggregates:
+                if function == 'avg':
+                    value = _average(self._exact(row.get(f"{alias}__sum")), row.get(f"{alias}__count"))
+                elif function in ('sum', 'min', 'max'):
+                    value = self._exact(row.get(alias))
+                else:
+                    value = row.get(alias)
+                finished_row[alias] = value
+            finished.append(finished_row)
+        return finished
+    
+    @staticmethod
+    def _exact(value: Any) -> Any:
+        """Numeric SQL totals as Decimal strings; databases without a decimal type return floats, rounded here"""
+        if isinstance(value, float):
+            value = _decimal(round(value, MAX_SCALE)).normalize()
+            return f"{value:f}"
+        if isinstance(value, int) and not isinstance(value, bool):
+            return str(value)
+        return value
+    
+    def assemble(
+        self,
+        rows: List[Dict],
+        totals: Dict[int, List[Dict]],
+        spec: ReportProcessingSpec
+    ) -> List[Dict]:
+        """Interleave subtotal rows after each group prefix and append the grand total"""
+        
+        if not spec.aggregates:
+            return list(rows)
+        
+        grand_total = (totals.get(0) or [None])[0]
+        
+        if not spec.grouped:
+            output = list(rows)
+            if grand_total is not None:
+                output.append(self._total_row(grand_total, spec))
+            return output
+        
+        group_fields = spec.group_fields
+        levels = [level for level in spec.total_levels() if level > 0]
+        subtotals = {
+            level: {
+                tuple(row.get(field) for field in group_fields[:level]): row
+                for row in totals.get(level, [])
+            }
+            for level in levels
+        }
+        
+        output = []
+        previous = None
+        
+        def close_groups(key):
+            for level in levels:
+                if key is None or key[:level] != previous[:level]:
+                    subtotal = subtotals[level].get(previous[:level])
+                    if subtotal is not None:
+                        output.append(self._subtotal_row(subtotal, previous, level, spec))
+        
+        for row in rows:
+            key = tuple(row.get(field) for field in group_fields)
+            if previous is not None:
+                close_groups(key)
+            output.append(row)
+            previous = key
+        
+        if previous is not None:
+            close_groups(None)
+        
+        if grand_total is not None:
+            output.append(self._total_row(grand_total, spec))
+        
+        return output
+    
+    def detail_rows(self, rows: List[Dict], spec: ReportProcessingSpec) -> List[Dict]:
+        """The query rows of assembled output, without the subtotal and total rows"""
+        
+        if not spec.aggregates or not rows:
+            return list(rows or [])
+        if not spec.grouped:
+            return list(rows[:-1])
+        return [row for row in rows if row.get('row_type') not in ('subtotal', 'total')]
+    
+    def sort_rows(self, rows: List[Dict], order: List[Tuple[str, str]]) -> List[Dict]:
+        """Stable, numeric-aware sort of rows held in memory"""
+        
+        if not order or not rows:
+            return list(rows)
+        
+        frame = pd.DataFrame.from_records([{field: row.get(field) for field, _ in order} for row in rows])
+        return [rows[position] for position in self._sort_frame(frame, order).index]
+    
+    def process(
+        self,
+        rows: List[Dict],
+        spec: ReportProcessingSpec,
+        filters: Optional[Dict] = None
+    ) -> List[Dict]:
+        """Filter, sort, group and aggregate rows held in memory"""
+        
+        if not rows:
+            return []
+        
+        frame = _frame(rows)
+        if filters:
+            frame = self._filter_frame(frame, filters)
+        
+        if spec.grouped:
+            groups = _frame(self._aggregate_frame(frame, spec, spec.group_fields))
+            result = self._records(self._sort_frame(groups, spec.row_order())) if len(groups) else []
+            totals = {level: self._aggregate_frame(frame, spec, spec.group_fields[:level]) for level in spec.total_levels()}
+        else:
+            result = self._records(self._sort_frame(frame, spec.row_order()))
+            totals = {0: self._aggregate_frame(frame, spec, [])} if spec.aggregates else {}
+        
+        return self.assemble(result, totals, spec)
+    
+    def _aggregate_frame(self, frame: pd.DataFrame, spec: ReportProcessingSpec, fields: List[str]) -> List[Dict]:
+        if not len(frame):
+            return []
+        
+        for field in fields:
+            if field not in frame.columns:
+                raise ValueError(f"Unknown report column: {field}")
+        
+        keys = fields if fields else np.zeros(len(frame), dtype=np.int8)
+        grouped = frame.groupby(keys, dropna=False, sort=False)
+        
+        results: Dict[str, pd.Series] = {}
+        for field, function, alias in spec.aggregates:
+            if field == '*':
+                results[alias] = grouped.size()
+                continue
+            if field not in frame.columns:
+                raise ValueError(f"Unknown report column: {field}")
+            
+            if function == 'count':
+                results[alias] = grouped[field].count()
+            elif function == 'distinct':
+                results[alias] = grouped[field].nunique()
+            else:
+                exact = self._exact_units(frame[field])
+                if exact is None:
+                    if function in ('sum', 'avg'):
+                        raise ValueError(f"Report column {field} is not numeric")
+                    results[alias] = getattr(grouped[field], function)()
+                    continue
+                
+                units, scale, integral = exact
+                unit_groups = units.groupby([frame[key] for key in fields] if fields else keys, dropna=False, sort=False)
+                if function == 'avg':
+                    sums = unit_groups.sum(min_count=1)
+                    counts = unit_groups.count()
+                    results[alias] = pd.Series(
+                        [_average(self._from_units(total, scale), count) for total, count in zip(sums, counts)],
+                        index=sums.index,
+                        dtype=object
+                    )
+                else:
+                    values = unit_groups.sum(min_count=1) if function == 'sum' else getattr(unit_groups, function)()
+                    if integral:
+                        results[alias] = values.astype(object).where(values.notna(), None)
+                    else:
+                        results[alias] = values.map(lambda value: self._from_units(value, scale)).astype(object)
+        
+        table = pd.DataFrame(results)
+        if fields:
+            table = table.reset_index()
+            table.columns = list(fields) + list(results)
+        return self._records(table)
+    
+    def _exact_units(self, series: pd.Series) -> Optional[Tuple[pd.Series, int, bool]]:
+        """
+        Values as integers of 10^-scale, or None when the column is not numeric.
+        The flag is set for integer columns, whose aggregates stay integers.
+        """
+        
+        if pd.api.types.is_bool_dtype(series):
+            return None
+        
+        kind = pd.api.types.infer_dtype(series, skipna=True)
+        if kind in ('integer', 'empty'):
+            try:
+                return series.astype('Int64'), 0, True
+            except (OverflowError, TypeError):
+                # Beyond 64 bits: Python integers, still exact
+                return series.astype(object).where(series.notna(), None), 0, True
+        if kind in ('floating', 'mixed-integer-float'):
+            return self._float_units(series)
+        if kind in ('decimal', 'string', 'mixed', 'mixed-integer'):
+            return self._text_units(series)
+        return None
+    
+    def _float_units(self, series: pd.Series) -> Optional[Tuple[pd.Series, int, bool]]:
+        values = series.astype('float64').to_numpy()
+        present = values[~np.isnan(values)]
+        if not np.isfinite(present).all():
+            return None
+        
+        # Fewest decimal places that hold every value (up to float noise)
+        for scale in range(MAX_SCALE + 1):
+            scaled = present * 10 ** scale
+            if np.allclose(scaled, np.round(scaled), rtol=1e-12, atol=0):
+                break
+        
+        scaled = values * 10 ** scale
+        units = pd.Series(np.sign(scaled) * np.floor(np.abs(scaled) + 0.5), index=series.index)
+        try:
+            return units.astype('Int64'), scale, False
+        except (OverflowError, TypeError):
+            return units.map(lambda unit: None if np.isnan(unit) else int(unit)).astype(object), scale, False
+    
+    def _text_units(self, series: pd.Series) -> Optional[Tuple[pd.Series, int, bool]]:
+        """Decimals and numeric strings, parsed as digit strings a column at a time"""
+        
+        text = series[series.notna()].astype(str).str.strip()
+        parts = text.str.extract(r'^([+-]?)(\d*)(?:\.(\d*))?$')
+        
+        # Exponents ('1E-7') and anything else unusual go through Decimal
+        unusual = parts[1].isna() | ((parts[1] == '') & parts[2].fillna('').eq(''))
+        if unusual.any():
+            try:
+                decimals = [_decimal(value) for value in text[unusual]]
+            except ValueError:
+                return None
+            if not all(value.is_finite() for value in decimals):
+                return None
+            text = text.copy()
+            text[unusual] = [format(value, 'f') for value in decimals]
+            parts = text.str.extract(r'^([+-]?)(\d*)(?:\.(\d*))?$')
+        
+        fractions = parts[2].fillna('')
+        scale = min(int(fractions.str.len().max()), MAX_SCALE) if len(text) else 0
+        
+        digits = parts[1].replace('', '0') + fractions.str.slice(0, scale).str.pad(scale, side='right', fillchar='0')
+        round_up = (fractions.str.slice(scale, scale + 1) >= '5').astype(int)
+        negative = parts[0] == '-'
+        
+        try:
+            magnitude = digits.astype('int64') + round_up
+            units = magnitude.where(~negative, -magnitude).astype('Int64').reindex(series.index)
+        except (OverflowError, ValueError):
+            # Beyond 64 bits: Python integers, still exact
+            magnitude = digits.map(int) + round_up
+            units = magnitude.where(~negative, -magnitude).astype(object).reindex(series.index)
+            units = units.where(units.notna(), None)
+        
+        return units, scale, False
+    
+    @staticmethod
+    def _from_units(value: Any, scale: int) -> Optional[str]:
+        if value is None or value is pd.NA or (isinstance(value, float) and math.isnan(value)):
+            return None
+        return str(Decimal(int(value)).scaleb(-scale))
+    
+    def _sort_frame(self, frame: pd.DataFrame, order: List[Tuple[str, str]]) -> pd.DataFrame:
+        if not order or not len(frame):
+            return frame
+        
+        keys = []
+        ascending = []
+        sort_frame = pd.DataFrame(index=frame.index)
+        for position, (field, direction) in enumerate(order):
+            if field not in frame.columns:
+                raise ValueError(f"Unknown report column: {field}")
+            if direction not in ('asc', 'desc'):
+                raise ValueError(f"Invalid sort direction: {direction}")
+            column = frame[field]
+            # Money travels as Decimal strings; order those by value, not text
+            numeric = pd.to_numeric(column.map(lambda value: str(value) if isinstance(value, Decimal) else value), errors='coerce')
+            if numeric.notna().sum() == column.notna().sum():
+                sort_frame[position] = numeric
+            else:
+                sort_frame[position] = column.map(lambda value: None if value is None else str(value))
+            keys.append(position)
+            ascending.append(direction == 'asc')
+        
+        order_index = sort_frame.sort_values(by=keys, ascending=ascending, kind='mergesort', na_position='last').index
+        return frame.loc[order_index]
+    
+    def _filter_frame(self, frame: pd.DataFrame, filters: Dict) -> pd.DataFrame:
+        mask = pd.Series(True, index=frame.index)
+        for field, condition in filters.items():
+            if field not in frame.columns:
+                raise ValueError(f"Unknown report column: {field}")
+            
+            if isinstance(condition, dict):
+                if len(condition) != 1:
+                    raise ValueError(f"Filter on {field} must have exactly one operator")
+                operator, value = next(iter(condition.items()))
+            elif isinstance(condition, (list, tuple, set)):
+                operator, value = 'in', condition
+            else:
+                operator, value = 'eq', condition
+            
+            column = frame[field]
+            if operator == 'is_null':
+                mask &= column.isna()
+                continue
+            if operator == 'not_null':
+                mask &= column.notna()
+                continue
+            if value is None:
+                continue
+            
+            if operator == 'in':
+                mask &= column.isin(list(value))
+            elif operator == 'like':
+                pattern = '^' + ''.join(
+                    '.*' if char == '%' else '.' if char == '_' else '\\' + char if not char.isalnum() else char
+                    for char in str(value)
+                ) + '$'
+                mask &= column.astype(str).str.match(pattern, na=False)
+            elif operator in ('eq', 'ne'):
+                matches = column == value
+                mask &= matches if operator == 'eq' else ~matches
+            elif operator in ('gt', 'gte', 'lt', 'lte', 'between'):
+                numeric = pd.to_numeric(column.map(lambda item: str(item) if isinstance(item, Decimal) else item), errors='coerce')
+                if operator == 'between':
+                    low, high = value
+                    mask &= numeric.between(float(low), float(high))
+                else:
+                    comparison = {'gt': numeric.gt, 'gte': numeric.ge, 'lt': numeric.lt, 'lte': numeric.le}[operator]
+                    mask &= comparison(float(value))
+            else:
+                raise ValueError(f"Unknown filter operator: {operator}")
+        
+        return frame[mask]
+    
+    @staticmethod
+    def _records(frame: pd.DataFrame) -> List[Dict]:
+        columns = list(frame.columns)
+        return [
+            {column: _clean(value) for column, value in zip(columns, values)}
+            for values in frame.itertuples(index=False, name=None)
+        ]
+    
+    @staticmethod
+    def _subtotal_row(totals: Dict, key: Tuple, level: int, spec: ReportProcessingSpec) -> Dict:
+        row = {field: (key[position] if position < level else None) for position, field in enumerate(spec.group_fields)}
+        row.update((alias, totals.get(alias)) for _, _, alias in spec.aggregates)
+        row['row_type'] = 'subtotal'
+        return row
+    
+    @staticmethod
+    def _total_row(totals: Dict, spec: ReportProcessingSpec) -> Dict:
+        if spec.legacy_summary:
+            field, function, alias = spec.aggregates[0]
+            return {alias: totals.get(alias), 'aggregation_type': 'average' if function == 'avg' else function}
+        
+        row = {field: None for field in spec.group_fields}
+        row.update((alias, totals.get(alias)) for _, _, alias in spec.aggregates)
+        row['row_type'] = 'total'
+        return row
+
+# Global processor instance
+report_processor = ReportProcessor()
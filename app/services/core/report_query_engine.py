@@ -0,0 +1,425 @@
+# backend/app/services/report_query_engine.py
+from sqlalchemy.orm import Session
+from sqlalchemy import text, bindparam, update, delete, func
+from typing import Optional, List, Dict, Iterator, Tuple, Any
+from decimal import Decimal
+from datetime import datetime, date, time as time_of_day, timedelta
+import hashlib
+import json
+import re
+import time
+import logging
+
+from ..models.core import ReportCache
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+_PLACEHOLDER = re.compile(r'\{(\w+)\}')
+
+# Filter operator -> SQL comparison; values are always bound
+FILTER_OPERATORS = {
+    'eq': '=',
+    'ne': '<>',
+    'gt': '>',
+    'gte': '>=',
+    'lt': '<',
+    'lte': '<=',
+    'like': 'LIKE',
+    'in': 'IN',
+    'between': 'BETWEEN',
+    'is_null': 'IS NULL',
+    'not_null': 'IS NOT NULL'
+}
+
+# Aggregate function -> SQL template
+SQL_AGGREGATES = {
+    'sum': 'SUM({})',
+    'count': 'COUNT({})',
+    'min': 'MIN({})',
+    'max': 'MAX({})',
+    'count_distinct': 'COUNT(DISTINCT {})'
+}
+
+def json_safe(value: Any) -> Any:
+    """Row value as stored in JSON columns (Decimals as strings, so no precision is lost)"""
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date, time_of_day)):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).hex()
+    return value
+
+class CompiledReportQuery:
+    """A report query with bound parameters, ready to execute"""
+    
+    __slots__ = ("sql", "params", "expanding", "fingerprint")
+    
+    def __init__(self, sql: Optional[str], params: Dict[str, Any], expanding: Tuple[str, ...] = ()):
+        self.sql = sql
+        self.params = params
+        self.expanding = expanding
+        self.fingerprint = hashlib.sha256(
+            json.dumps([sql, params], sort_keys=True, default=str).encode()
+        ).hexdigest()
+    
+    def statement(self):
+        statement = text(self.sql)
+        if self.expanding:
+            statement = statement.bindparams(*[bindparam(name, expanding=True) for name in self.expanding])
+        return statement
+
+class ReportResult:
+    """
+    Streaming report result. Iterate `chunks()` for lists of row dicts;
+    `row_count`, `truncated` and `columns` are filled in as rows arrive.
+    """
+    
+    __slots__ = ("columns", "row_count", "truncated", "elapsed", "_result", "_started", "_max_rows", "_timeout", "_chunk_size")
+    
+    def __init__(self, result, max_rows: int, timeout_seconds: float, chunk_size: int, started: float):
+        self.columns: List[str] = list(result.keys()) if result is not None else []
+        self.row_count = 0
+        self.truncated = False
+        self.elapsed = 0.0
+        self._result = result
+        self._started = started
+        self._max_rows = max_rows
+        self._timeout = timeout_seconds
+        self._chunk_size = chunk_size
+    
+    def chunks(self) -> Iterator[List[Dict]]:
+        if self._result is None:
+            return
+        
+        columns = self.columns
+        try:
+            for partition in self._result.partitions(self._chunk_size):
+                if self._timeout and time.monotonic() - self._started > self._timeout:
+                    raise ValueError(f"Report query exceeded the {self._timeout:g}s time limit")
+                
+                remaining = self._max_rows - self.row_count if self._max_rows else None
+                if remaining is not None and len(partition) > remaining:
+                    partition = partition[:remaining]
+                    self.truncated = True
+                
+                self.row_count += len(partition)
+                if partition:
+                    yield [dict(zip(columns, row)) for row in partition]
+                
+                if self.truncated or (remaining is not None and self.row_count >= self._max_rows):
+                    break
+        finally:
+            self._result.close()
+            self.elapsed = time.monotonic() - self._started
+
+class ReportQueryEngine:
+    """
+    Executes Report Studio queries with bound parameters and streams the
+    rows in chunks from a server-side cursor.
+    
+    Template SQL names its parameters as `{name}` or `:name`; both are
+    bound, never spliced into the text. Filters and sorting are compiled
+    onto the query as a wrapping SELECT whose column names must be plain
+    identifiers. Every run is capped by a row limit and a time limit.
+    """
+    
+    # Built-in data sources for templates without SQL
+    DATA_SOURCES = {
+        'sales': "SELECT * FROM sale_bill WHERE company_id = :company_id",
+        'purchases': "SELECT * FROM purchase_bill WHERE company_id = :company_id"
+    }
+    
+    def __init__(self, timeout_seconds: float = 300, max_rows: int = 1000000, chunk_size: int = 5000):
+        self.timeout_seconds = timeout_seconds
+        self.max_rows = max_rows
+        self.chunk_size = chunk_size
+    
+    def compile(
+        self,
+        db: Session,
+        query_sql: str,
+        parameters: Dict = None,
+        filters: Dict = None,
+        order_by: List[Tuple[str, str]] = None,
+        group_by: List[str] = None,
+        aggregates: List[Tuple[str, str, str]] = None
+    ) -> CompiledReportQuery:
+        """
+        Bind a report query's parameters and compile its filters and sort order.
+        With group_by or aggregates ((function, column, alias) tuples) it selects grouped totals instead of rows.
+        """
+        
+        base_sql = _PLACEHOLDER.sub(r':\1', query_sql.strip().rstrip(';'))
+        parameters = parameters or {}
+        
+        params = {}
+        expanding = []
+        for name in text(base_sql).compile().binds:
+            if name not in parameters:
+                raise ValueError(f"Missing report parameter: {name}")
+            value = parameters[name]
+            if isinstance(value, (list, tuple, set)):
+                value = list(value)
+                expanding.append(name)
+            params[name] = value
+        
+        quote = db.get_bind().dialect.identifier_preparer.quote
+        conditions = []
+        for column, condition in (filters or {}).items():
+            sql, values, expanded = self._compile_filter(quote, column, condition, len(params))
+            if sql:
+                conditions.append(sql)
+                params.update(values)
+                expanding.extend(expanded)
+        
+        ordering = []
+        for column, direction in order_by or ():
+            direction = (direction or 'asc').lower()
+            if direction not in ('asc', 'desc'):
+                raise ValueError(f"Invalid sort direction: {direction}")
+            ordering.append(f"{quote(self._identifier(column))} {direction.upper()}")
+        
+        grouping = [quote(self._identifier(column)) for column in group_by or ()]
+        selected = list(grouping)
+        for function, column, alias in aggregates or ():
+            if function not in SQL_AGGREGATES:
+                raise ValueError(f"Unknown aggregate function: {function}")
+            argument = '*' if column == '*' and function == 'count' else quote(self._identifier(column))
+            selected.append(f"{SQL_AGGREGATES[function].format(argument)} AS {quote(self._identifier(alias))}")
+        
+        sql = base_sql
+        if conditions or ordering or selected:
+            sql = f"SELECT {', '.join(selected) or '*'} FROM ({base_sql}) AS report_rows"
+            if conditions:
+                sql += " WHERE " + " AND ".join(conditions)
+            if grouping:
+                sql += " GROUP BY " + ", ".join(grouping)
+            if ordering:
+                sql += " ORDER BY " + ", ".join(ordering)
+        
+        return CompiledReportQuery(sql, params, tuple(expanding))
+    
+    def compile_source(
+        self,
+        db: Session,
+        data_source: str,
+        company_id: int,
+        parameters: Dict = None,
+        filters: Dict = None,
+        order_by: List[Tuple[str, str]] = None,
+        group_by: List[str] = None,
+        aggregates: List[Tuple[str, str, str]] = None
+    ) -> CompiledReportQuery:
+        """Compile a query for one of the built-in data sources"""
+        
+        query_sql = self.DATA_SOURCES.get(data_source)
+        if query_sql is None:
+            # A template without a known source reports no rows; new templates are checked when saved
+            logger.warning(f"Report data source {data_source!r} has no query; returning no rows")
+            return CompiledReportQuery(None, {})
+        
+        return self.compile(
+            db, query_sql, dict(parameters or {}, company_id=company_id), filters, order_by, group_by, aggregates
+        )
+    
+    def execute(
+        self,
+        db: Session,
+        query: CompiledReportQuery,
+        max_rows: Optional[int] = None,
+        timeout_seconds: Optional[float] = None,
+        chunk_size: Optional[int] = None
+    ) -> ReportResult:
+        """Start a query on a server-side cursor; consume `chunks()` before committing"""
+        
+        max_rows = self.max_rows if max_rows is None else max_rows
+        timeout_seconds = self.timeout_seconds if timeout_seconds is None else timeout_seconds
+        chunk_size = chunk_size or self.chunk_size
+        started = time.monotonic()
+        
+        if query.sql is None:
+            return ReportResult(None, max_rows, timeout_seconds, chunk_size, started)
+        
+        if timeout_seconds and db.get_bind().dialect.name == "postgresql":
+            # Enforced by the server too, so a slow query is cancelled before its first row
+            db.execute(text(f"SET LOCAL statement_timeout = {int(timeout_seconds * 1000)}"))
+        
+        result = db.execute(
+            query.statement(),
+            query.params,
+            execution_options={"stream_results": True, "yield_per": chunk_size}
+        )
+        
+        return ReportResult(result, max_rows, timeout_seconds, chunk_size, started)
+    
+    def _compile_filter(self, quote, column: str, condition: Any, index: int):
+        column_sql = quote(self._identifier(column))
+        
+        if isinstance(condition, dict):
+            if len(condition) != 1:
+                raise ValueError(f"Filter on {column} must have exactly one operator")
+            operator, value = next(iter(condition.items()))
+        elif isinstance(condition, (list, tuple, set)):
+            operator, value = 'in', condition
+        else:
+            operator, value = 'eq', condition
+        
+        if operator not in FILTER_OPERATORS:
+            raise ValueError(f"Unknown filter operator: {operator}")
+        
+        if operator in ('is_null', 'not_null'):
+            return f"{column_sql} {FILTER_OPERATORS[operator]}", {}, ()
+        
+        # Unset filters are ignored
+        if value is None:
+            return None, {}, ()
+        
+        name = f"filter_{index}"
+        if operator == 'in':
+            return f"{column_sql} IN :{name}", {name: list(value)}, (name,)
+        if operator == 'between':
+            low, high = value
+            return (
+                f"{column_sql} BETWEEN :{name}_low AND :{name}_high",
+                {f"{name}_low": low, f"{name}_high": high},
+                ()
+            )
+        return f"{column_sql} {FILTER_OPERATORS[operator]} :{name}", {name: value}, ()
+    
+    @staticmethod
+    def _identifier(name: str) -> str:
+        if not isinstance(name, str) or not _IDENTIFIER.match(name):
+            raise ValueError(f"Invalid report column name: {name}")
+        return name
+
+class ReportResultCache:
+    """
+    Report results cached in the report_cache table, keyed by template,
+    template revision and compiled query. Entries expire after the TTL;
+    each company's entries are kept under a byte budget by evicting the
+    least recently used first.
+    """
+    
+    def __init__(self, ttl_seconds: int = 900, max_bytes: int = 256 * 1024 * 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+    
+    def make_key(self, template, query: CompiledReportQuery) -> str:
+        revision = template.updated_at.isoformat() if template.updated_at else ''
+        digest = hashlib.sha256(f"{revision}|{query.fingerprint}".encode()).hexdigest()
+        return f"report:{template.id}:{digest}"
+    
+    def get(self, db: Session, cache_key: str) -> Optional[List[Dict]]:
+        """Cached rows, or None on a miss"""
+        
+        now = datetime.utcnow()
+        entry = db.query(ReportCache.id, ReportCache.cache_data).filter(
+            ReportCache.cache_key == cache_key,
+            ReportCache.expiry_date > now
+        ).first()
+        
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        db.execute(
+            update(ReportCache).where(ReportCache.id == entry.id).values(
+                hit_count=func.coalesce(ReportCache.hit_count, 0) + 1,
+                last_accessed=now
+            ).execution_options(synchronize_session=False)
+        )
+        self.hits += 1
+        return entry.cache_data
+    
+    def put(
+        self,
+        db: Session,
+        company_id: int,
+        template_id: int,
+        cache_key: str,
+        parameters: Optional[Dict],
+        rows: List[Dict]
+    ) -> int:
+        """Store JSON-safe rows in the caller's transaction; returns the entry size in bytes"""
+        
+        size = len(json.dumps(rows, default=str).encode())
+        if size > self.max_bytes:
+            return 0
+        
+        now = datetime.utcnow()
+        db.execute(delete(ReportCache).where(ReportCache.cache_key == cache_key).execution_options(synchronize_session=False))
+        db.add(ReportCache(
+            company_id=company_id,
+            cache_key=cache_key,
+            template_id=template_id,
+            parameters=parameters,
+            cache_data=rows,
+            cache_size=size,
+            created_date=now,
+            expiry_date=now + timedelta(seconds=self.ttl_seconds),
+            hit_count=0,
+            last_accessed=now
+        ))
+        db.flush()
+        
+        self.evict(db, company_id)
+        return size
+    
+    def evict(self, db: Session, company_id: int) -> int:
+        """Drop expired entries, then the least recently used until the company is under budget"""
+        
+        removed = db.execute(
+            delete(ReportCache).where(
+                ReportCache.company_id == company_id,
+                ReportCache.expiry_date <= datetime.utcnow()
+            ).execution_options(synchronize_session=False)
+        ).rowcount or 0
+        
+        total = db.query(func.coalesce(func.sum(ReportCache.cache_size), 0)).filter(
+            ReportCache.company_id == company_id
+        ).scalar()
+        if total <= self.max_bytes:
+            return removed
+        
+        evicted = []
+        for entry_id, size in db.query(ReportCache.id, ReportCache.cache_size).filter(
+            ReportCache.company_id == company_id
+        ).order_by(ReportCache.last_accessed, ReportCache.id).all():
+            if total <= self.max_bytes:
+                break
+            evicted.append(entry_id)
+            total -= size or 0
+        
+        if evicted:
+            db.execute(delete(ReportCache).where(ReportCache.id.in_(evicted)).execution_options(synchronize_session=False))
+        
+        return removed + len(evicted)
+    
+    def invalidate(self, db: Session, template_id: int) -> int:
+        """Drop every cached result of a template"""
+        return db.execute(
+            delete(ReportCache).where(ReportCache.template_id == template_id).execution_options(synchronize_session=False)
+        ).rowcount or 0
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get hit/miss counters for this process"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+# Global engine and cache
+report_query_engine = ReportQueryEngine(
+    timeout_seconds=settings.report_query_timeout_seconds,
+    max_rows=settings.report_max_rows,
+    chunk_size=settings.report_stream_chunk_size
+)
+report_result_cache = ReportResultCache(
+    ttl_seconds=settings.report_cache_ttl_seconds,
+    max_bytes=settings.report_cache_max_bytes
+)
@@ -0,0 +1,291 @@
+# backend/app/services/report_scheduler_service.py
+from sqlalchemy.orm import Session
+from typing import Optional, List, Dict, Tuple, Set
+from concurrent.futures import ThreadPoolExecutor, Future
+from datetime import datetime, date, timedelta
+import calendar
+import hashlib
+import json
+import threading
+import logging
+
+from ..models.core import ReportSchedule
+from ..config import settings
+from ..database import get_db_session
+from .report_studio_service import report_studio_service
+
+logger = logging.getLogger(__name__)
+
+def _parse_cron_field(expression: str, low: int, high: int) -> Set[int]:
+    values = set()
+    for part in expression.split(','):
+        part, _, step = part.partition('/')
+        step = int(step) if step else 1
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start, end = (int(value) for value in part.split('-', 1))
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+        if start < low or end > high or start > end or step < 1:
+            raise ValueError(f"Invalid cron field: {expression}")
+        values.update(range(start, end + 1, step))
+    return values
+
+def _cron_next(expression: str, after: datetime) -> datetime:
+    """Next minute matching a five-field cron expression (minute hour day month weekday)"""
+    
+    fields = expression.split()
+    if len(fields) != 5:
+        raise ValueError(f"Cron expression must have five fields: {expression}")
+    
+    minutes = sorted(_parse_cron_field(fields[0], 0, 59))
+    hours = sorted(_parse_cron_field(fields[1], 0, 23))
+    days = _parse_cron_field(fields[2], 1, 31)
+    months = _parse_cron_field(fields[3], 1, 12)
+    # Cron weekdays count from Sunday, and 7 is Sunday too
+    weekdays = {(day - 1) % 7 for day in _parse_cron_field(fields[4], 0, 7)}
+    any_day = fields[2] == '*'
+    any_weekday = fields[4] == '*'
+    
+    start = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    day = start.date()
+    for _ in range(366 * 5):
+        day_matches = day.day in days
+        weekday_matches = day.weekday() in weekdays
+        # As in cron, a restricted day of month and weekday match either
+        if any_day or any_weekday:
+            matches = day_matches and weekday_matches
+        else:
+            matches = day_matches or weekday_matches
+        
+        if day.month in months and matches:
+            for hour in hours:
+                for minute in minutes:
+                    candidate = datetime(day.year, day.month, day.day, hour, minute)
+                    if candidate >= start:
+                        return candidate
+        day += timedelta(days=1)
+    
+    raise ValueError(f"Cron expression never matches: {expression}")
+
+class _ScheduledRun:
+    """One report run in flight, with the identical schedules waiting on it"""
+    
+    __slots__ = ("key", "company_id", "schedule_id", "due_at", "followers", "future")
+    
+    def __init__(self, key: str, company_id: int, schedule_id: int, due_at: Optional[datetime]):
+        self.key = key
+        self.company_id = company_id
+        self.schedule_id = schedule_id
+        self.due_at = due_at
+        self.followers: List[Tuple[int, Optional[datetime]]] = []
+        self.future: Optional[Future] = None
+
+class ReportSchedulerService:
+    """
+    Runs due report schedules on a bounded worker pool.
+    
+    Each poll claims the active schedules whose next_run has passed (row
+    locks with SKIP LOCKED, so several app processes can poll the same
+    database) and moves next_run on before anything runs. Schedules that
+    would produce the same report - same company, template, parameters and
+    file format - share one run, whether they fall due together or while an
+    identical run is still going; each of them still gets its own log.
+    Schedule times are local wall-clock times, like the backup time.
+    """
+    
+    def __init__(self):
+        self.max_workers = settings.report_scheduler_workers
+        self.batch_size = settings.report_scheduler_batch_size
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, _ScheduledRun] = {}
+        self._stats = {"claimed": 0, "started": 0, "shared": 0, "succeeded": 0, "failed": 0, "last_poll_at": None}
+    
+    def next_run_time(self, schedule: ReportSchedule, after: datetime) -> Optional[datetime]:
+        """Next time a schedule falls due after the given time; None when it never runs again"""
+        
+        schedule_type = (schedule.schedule_type or '').lower()
+        if schedule.cron_expression:
+            return _cron_next(schedule.cron_expression, after)
+        
+        hour, minute = map(int, (schedule.schedule_time or '00:00').split(':')[:2])
+        anchor = schedule.schedule_date
+        
+        def at(day: date) -> datetime:
+            return datetime(day.year, day.month, day.day, hour, minute)
+        
+        if schedule_type == 'daily':
+            candidate = at(after.date())
+            return candidate if candidate > after else at(after.date() + timedelta(days=1))
+        
+        if schedule_type == 'weekly':
+            weekday = anchor.weekday() if anchor else 0
+            day = after.date() + timedelta(days=(weekday - after.weekday()) % 7)
+            candidate = at(day)
+            return candidate if candidate > after else at(day + timedelta(days=7))
+        
+        if schedule_type in ('monthly', 'yearly'):
+            year, month = after.year, after.month
+            if schedule_type == 'yearly':
+                month = anchor.month if anchor else 1
+            for _ in range(24):
+                # Days past the end of a month run on its last day
+                day = min(anchor.day if anchor else 1, calendar.monthrange(year, month)[1])
+                candidate = at(date(year, month, day))
+                if candidate > after:
+                    return candidate
+                if schedule_type == 'yearly':
+                    year += 1
+                else:
+                    year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+            return None
+        
+        # A custom schedule without a cron expression runs once
+        if anchor:
+            candidate = at(anchor)
+            return candidate if candidate > after else None
+        return None
+    
+    def run_key(self, company_id: int, template_id: int, parameters: Optional[Dict], file_format: Optional[str]) -> str:
+        """Schedules with the same key produce the same report"""
+        
+        payload = json.dumps(
+            [company_id, template_id, parameters or {}, (file_format or '').lower()],
+            sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def claim_due(self, db: Session, now: Optional[datetime] = None) -> List[Dict]:
+        """Claim due schedules, advancing next_run in the same transaction"""
+        
+        now = now or datetime.now()
+        
+        # New schedules get their first next_run; they do not run on the spot
+        unplanned = db.query(ReportSchedule).filter(
+            ReportSchedule.is_active == True,
+            ReportSchedule.next_run.is_(None),
+            ReportSchedule.last_run.is_(None)
+        ).limit(self.batch_size).with_for_update(skip_locked=True).all()
+        
+        for schedule in unplanned:
+            try:
+                schedule.next_run = self.next_run_time(schedule, now)
+            except ValueError as e:
+                logger.error(f"Report schedule {schedule.id} has an invalid timing: {str(e)}")
+                schedule.is_active = False
+        
+        schedules = db.query(ReportSchedule).filter(
+            ReportSchedule.is_active == True,
+            ReportSchedule.next_run <= now
+        ).order_by(ReportSchedule.next_run).limit(self.batch_size).with_for_update(skip_locked=True).all()
+        
+        claimed = []
+        for schedule in schedules:
+            claimed.append({
+                "schedule_id": schedule.id,
+                "company_id": schedule.company_id,
+                "due_at": schedule.next_run,
+                "key": self.run_key(schedule.company_id, schedule.template_id, schedule.parameters, schedule.file_format)
+            })
+            try:
+                schedule.next_run = self.next_run_time(schedule, now)
+            except ValueError as e:
+                logger.error(f"Report schedule {schedule.id} has an invalid timing: {str(e)}")
+                schedule.next_run = None
+                schedule.is_active = False
+        
+        db.commit()
+        return claimed
+    
+    def dispatch_due(self) -> Dict:
+        """Claim due schedules and hand them to the worker pool"""
+        
+        with get_db_session() as db:
+            claimed = self.claim_due(db)
+        
+        started = shared = 0
+        for item in claimed:
+            if self.submit(item["company_id"], item["schedule_id"], item["key"], item["due_at"]):
+                started += 1
+            else:
+                shared += 1
+        
+        with self._lock:
+            self._stats["claimed"] += len(claimed)
+            self._stats["last_poll_at"] = datetime.utcnow()
+        
+        if claimed:
+            logger.info(f"Report scheduler claimed {len(claimed)} schedules ({started} runs, {shared} shared)")
+        
+        return {"claimed": len(claimed), "started": started, "shared": shared}
+    
+    def submit(self, company_id: int, schedule_id: int, key: str, due_at: Optional[datetime] = None) -> bool:
+        """Queue a schedule's run; False when it joined an identical run already queued or running"""
+        
+        with self._lock:
+            run = self._in_flight.get(key)
+            if run is not None:
+                run.followers.append((schedule_id, due_at))
+                self._stats["shared"] += 1
+                return False
+            
+            run = _ScheduledRun(key, company_id, schedule_id, due_at)
+            self._in_flight[key] = run
+            run.future = self._pool().submit(self._execute, run)
+            self._stats["started"] += 1
+            return True
+    
+    def _execute(self, run: _ScheduledRun):
+        log_id = None
+        error = None
+        try:
+            with get_db_session() as db:
+                log = report_studio_service.execute_report_schedule(
+                    db, run.company_id, run.schedule_id, due_at=run.due_at
+                )
+                log_id = log.id
+        except Exception as e:
+            error = str(e)
+            logger.error(f"Scheduled report {run.schedule_id} failed: {error}")
+        
+        # Schedules that joined after this point start a run of their own
+        with self._lock:
+            self._stats["failed" if error is not None else "succeeded"] += 1
+            self._in_flight.pop(run.key, None)
+            followers = list(run.followers)
+        
+        if not followers:
+            return
+        
+        with get_db_session() as db:
+            for schedule_id, due_at in followers:
+                try:
+                    report_studio_service.record_shared_schedule_run(
+                        db, run.company_id, schedule_id, log_id, due_at=due_at, error=error
+                    )
+                except Exception as e:
+                    db.rollback()
+                    logger.error(f"Could not log shared run for report schedule {schedule_id}: {str(e)}")
+    
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="report-scheduler")
+        return self._executor
+    
+    def shutdown(self, wait: bool = False):
+        """Stop the pool; queued runs are dropped, running ones finish in the background"""
+        
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+    
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return dict(self._stats, in_flight=len(self._in_flight), workers=self.max_workers)
+
+# Global service instance
+report_scheduler_service = ReportSchedulerService()
@@ -3,11 +3,9 @@ from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, func, desc, asc
 from typing import Optional, List, Dict, Tuple
 from decimal import Decimal
-from datetime import datetime, date
-import json
+from datetime import datetime, date, timedelta
 import logging
 import uuid
-import pandas as pd
 import io
 import base64
 
@@ -16,6 +14,11 @@ from ..models.core import (
     ReportScheduleLog, ReportBuilder, ReportDashboard, ReportWidget, ReportExport,
     ReportAnalytics, ReportPermission, ReportCache
 )
+from ..config import settings
+from ..database import get_db_session
+from .export_service import export_service
+from .report_query_engine import CompiledReportQuery, report_query_engine, report_result_cache, json_safe
+from .report_processing import ReportProcessingSpec, report_processor
 
 logger = logging.getLogger(__name__)
 
@@ -147,6 +150,9 @@ class ReportStudioService:
         if not category:
             raise ValueError("Report category not found")
         
+        if not query_sql and data_source not in report_query_engine.DATA_SOURCES:
+            raise ValueError(f"Unknown report data source: {data_source}")
+        
         # Create report template
         template = ReportTemplate(
             company_id=company_id,
@@ -280,172 +286,311 @@ class ReportStudioService:
         try:
             start_time = datetime.utcnow()
             
-            # Execute query based on template configuration
-            if template.query_sql:
-                # Execute SQL query
-                data = self._execute_sql_query(db, template.query_sql, instance.parameters, instance.filters)
-            else:
-                # Use data source
-                data = self._get_data_from_source(db, template.data_source, instance.parameters, instance.filters)
+            # Sorting, grouping and aggregation run in the database
+            spec = ReportProcessingSpec.from_config(template.template_config)
+            query = self._compile_report_query(db, company_id, template, instance, spec)
+            
+            # Stream the query, or serve an identical recent run from the cache
+            cache_key = report_result_cache.make_key(template, query)
+            cached = report_result_cache.get(db, cache_key)
             
-            # Process data based on template configuration
-            processed_data = self._process_report_data(data, template.template_config)
+            if isinstance(cached, dict):
+                data = cached['rows']
+                totals = {int(level): rows for level, rows in cached['totals'].items()}
+                row_count = len(data)
+            else:
+                data, totals, row_count, complete = self._query_report(db, company_id, template, instance, spec, query=query)
+                if complete:
+                    report_result_cache.put(
+                        db, company_id, template.id, cache_key, instance.parameters,
+                        {'rows': data, 'totals': {str(level): rows for level, rows in totals.items()}}
+                    )
             
-            # Update instance
-            instance.data = processed_data
-            instance.status = 'generated'
-            instance.generated_date = datetime.utcnow()
-            instance.execution_time = (datetime.utcnow() - start_time).total_seconds()
-            instance.row_count = len(processed_data) if isinstance(processed_data, list) else 0
-            instance.updated_by = user_id
-            instance.updated_at = datetime.utcnow()
+            # Subtotal and total rows
+            processed_data = report_processor.assemble(data, totals, spec)
             
-            db.commit()
+            self._save_report_data(db, instance, processed_data, row_count, start_time, user_id)
             
             logger.info(f"Report instance generated: {instance.instance_name}")
             
             return instance
             
         except Exception as e:
-            # Update instance with error
-            instance.status = 'failed'
-            instance.error_message = str(e)
-            instance.updated_by = user_id
-            instance.updated_at = datetime.utcnow()
+            self._fail_report_instance(db, instance, e, user_id)
+            raise ValueError(f"Report generation failed: {str(e)}")
+    
+    def refresh_report_instance(
+        self, 
+        db: Session, 
+        company_id: int,
+        instance_id: int,
+        previous_instance_id: Optional[int] = None,
+        watermark: Optional[date] = None,
+        user_id: int = None
+    ) -> Dict:
+        """
+        Generate an instance from a previous run of the same report where possible.
+        
+        Templates whose config declares an incremental partition date
+        ({'incremental': {'partition_field': .., 'lookback_days': ..}}) only
+        query partitions from the watermark (less the lookback) onwards and keep
+        the previous run's rows for older ones; totals are re-aggregated by the
+        database. Anything else is a full generation.
+        """
+        
+        instance = db.query(ReportInstance).filter(
+            ReportInstance.id == instance_id,
+            ReportInstance.company_id == company_id
+        ).first()
+        
+        if not instance:
+            raise ValueError("Report instance not found")
+        
+        template = instance.template
+        spec = ReportProcessingSpec.from_config(template.template_config)
+        partition_field, lookback_days = self._report_partition(template)
+        
+        previous = None
+        if previous_instance_id and watermark and partition_field:
+            previous = db.query(ReportInstance).filter(
+                ReportInstance.id == previous_instance_id,
+                ReportInstance.company_id == company_id
+            ).first()
+        
+        if previous is None or not self._can_refresh_incrementally(template, spec, partition_field, instance, previous):
+            start_time = datetime.utcnow()
+            instance = self.generate_report_instance(db, company_id, instance_id, user_id)
+            return {
+                "instance": instance,
+                "refresh_mode": 'full',
+                "watermark": self._partition_watermark(instance.data, partition_field, instance.row_count),
+                "query_time": (datetime.utcnow() - start_time).total_seconds()
+            }
+        
+        try:
+            start_time = datetime.utcnow()
             
-            db.commit()
+            # Recompute from the watermark; earlier partitions are carried over
+            since = watermark - timedelta(days=lookback_days)
+            filters = dict(instance.filters or {})
+            filters[partition_field] = {'gte': since}
             
-            logger.error(f"Report generation failed: {str(e)}")
+            query = self._compile_report_query(db, company_id, template, instance, spec, filters=filters)
+            new_rows, new_count, _ = self._collect_report_rows(db, query)
+            if spec.grouped:
+                new_rows = report_processor.finish_rows(new_rows, spec)
+            
+            kept = [
+                row for row in report_processor.detail_rows(previous.data, spec)
+                if row.get(partition_field) is None or str(row[partition_field])[:10] < since.isoformat()
+            ]
+            data = report_processor.sort_rows(kept + new_rows, spec.row_order())
+            row_count = len(kept) + new_count
+            
+            totals = self._query_report_totals(db, company_id, template, instance, spec)
+            processed_data = report_processor.assemble(data[:settings.report_stored_rows], totals, spec)
+            
+            self._save_report_data(db, instance, processed_data, row_count, start_time, user_id)
+            
+            logger.info(
+                f"Report instance refreshed: {instance.instance_name} "
+                f"({len(new_rows)} rows since {since.isoformat()}, {len(kept)} carried over)"
+            )
+            
+            return {
+                "instance": instance,
+                "refresh_mode": 'incremental',
+                "watermark": self._partition_watermark(data, partition_field, row_count) or watermark,
+                "query_time": (datetime.utcnow() - start_time).total_seconds()
+            }
+            
+        except Exception as e:
+            self._fail_report_instance(db, instance, e, user_id)
             raise ValueError(f"Report generation failed: {str(e)}")
     
-    def _execute_sql_query(
+    def _report_partition(self, template: ReportTemplate) -> Tuple[Optional[str], int]:
+        incremental = (template.template_config or {}).get('incremental') or {}
+        return incremental.get('partition_field'), int(incremental.get('lookback_days', 1))
+    
+    def _can_refresh_incrementally(
         self, 
-        db: Session, 
-        query_sql: str, 
-        parameters: Dict = None, 
-        filters: Dict = None
-    ) -> List[Dict]:
-        """Execute SQL query"""
-        
-        # Apply parameters to query
-        if parameters:
-            for key, value in parameters.items():
-                query_sql = query_sql.replace(f"{{{key}}}", str(value))
-        
-        # Apply filters to query
-        if filters:
-            where_conditions = []
-            for key, value in filters.items():
-                if value is not None:
-                    where_conditions.append(f"{key} = '{value}'")
-            
-            if where_conditions:
-                if "WHERE" in query_sql.upper():
-                    query_sql += " AND " + " AND ".join(where_conditions)
-                else:
-                    query_sql += " WHERE " + " AND ".join(where_conditions)
-        
-        # Execute query
-        result = db.execute(query_sql)
-        columns = result.keys()
-        rows = result.fetchall()
-        
-        # Convert to list of dictionaries
-        data = []
-        for row in rows:
-            data.append(dict(zip(columns, row)))
+        template: ReportTemplate, 
+        spec: ReportProcessingSpec,
+        partition_field: str,
+        instance: ReportInstance,
+        previous: ReportInstance
+    ) -> bool:
+        """The previous run holds every row of the same report, and its rows split cleanly by partition"""
+        
+        if previous.status != 'generated' or previous.data is None or previous.row_count is None:
+            return False
+        if previous.template_id != instance.template_id:
+            return False
+        if template.updated_at and previous.generated_date and template.updated_at > previous.generated_date:
+            return False
+        if (previous.parameters or {}) != (instance.parameters or {}) or (previous.filters or {}) != (instance.filters or {}):
+            return False
+        if partition_field in (instance.filters or {}):
+            return False
+        # Group rows must not span partitions
+        if spec.grouped and partition_field not in spec.group_fields:
+            return False
+        
+        rows = report_processor.detail_rows(previous.data, spec)
+        return len(rows) >= previous.row_count and (not rows or partition_field in rows[0])
+    
+    def _partition_watermark(self, data: Optional[List[Dict]], partition_field: Optional[str], row_count: Optional[int]) -> Optional[date]:
+        """Latest partition date in a complete result"""
         
-        return data
+        if not partition_field or data is None or row_count is None or len(data) < row_count:
+            return None
+        
+        values = [str(row[partition_field])[:10] for row in data if row.get(partition_field) is not None]
+        return date.fromisoformat(max(values)) if values else None
     
-    def _get_data_from_source(
+    def _save_report_data(
         self, 
         db: Session, 
-        data_source: str, 
-        parameters: Dict = None, 
-        filters: Dict = None
-    ) -> List[Dict]:
-        """Get data from data source"""
-        
-        # This is a simplified implementation
-        # In a real system, you would have a data source registry
-        # and execute the appropriate query based on the data source
-        
-        if data_source == 'sales':
-            # Example: Get sales data
-            query = "SELECT * FROM sale_bill WHERE company_id = :company_id"
-            result = db.execute(query, {"company_id": parameters.get('company_id') if parameters else None})
-        elif data_source == 'purchases':
-            # Example: Get purchase data
-            query = "SELECT * FROM purchase_bill WHERE company_id = :company_id"
-            result = db.execute(query, {"company_id": parameters.get('company_id') if parameters else None})
-        else:
-            # Default: Return empty data
-            return []
+        instance: ReportInstance, 
+        data: List[Dict], 
+        row_count: int, 
+        start_time: datetime, 
+        user_id: int = None
+    ):
+        instance.data = data
+        instance.status = 'generated'
+        instance.generated_date = datetime.utcnow()
+        instance.execution_time = (datetime.utcnow() - start_time).total_seconds()
+        instance.row_count = row_count
+        instance.error_message = None
+        instance.updated_by = user_id
+        instance.updated_at = datetime.utcnow()
+        
+        db.commit()
+    
+    def _fail_report_instance(self, db: Session, instance: ReportInstance, error: Exception, user_id: int = None):
+        db.rollback()
         
-        columns = result.keys()
-        rows = result.fetchall()
+        instance.status = 'failed'
+        instance.error_message = str(error)
+        instance.updated_by = user_id
+        instance.updated_at = datetime.utcnow()
         
-        # Convert to list of dictionaries
-        data = []
-        for row in rows:
-            data.append(dict(zip(columns, row)))
+        db.commit()
         
-        return data
+        logger.error(f"Report generation failed: {str(error)}")
     
-    def _process_report_data(
+    def _compile_report_query(
         self, 
-        data: List[Dict], 
-        template_config: Dict
-    ) -> List[Dict]:
-        """Process report data based on template configuration"""
-        
-        if not data:
-            return []
-        
-        # Apply sorting
-        if template_config.get('sorting'):
-            sort_field = template_config['sorting'].get('field')
-            sort_direction = template_config['sorting'].get('direction', 'asc')
-            
-            if sort_field:
-                data.sort(key=lambda x: x.get(sort_field, ''), reverse=(sort_direction == 'desc'))
-        
-        # Apply grouping
-        if template_config.get('grouping'):
-            group_field = template_config['grouping'].get('field')
-            if group_field:
-                # Group data by field
-                grouped_data = {}
-                for item in data:
-                    key = item.get(group_field, '')
-                    if key not in grouped_data:
-                        grouped_data[key] = []
-                    grouped_data[key].append(item)
-                
-                # Convert back to list
-                data = []
-                for key, group in grouped_data.items():
-                    data.extend(group)
-        
-        # Apply aggregation
-        if template_config.get('aggregation'):
-            agg_config = template_config['aggregation']
-            agg_field = agg_config.get('field')
-            agg_function = agg_config.get('function', 'sum')
-            
-            if agg_field and agg_function:
-                if agg_function == 'sum':
-                    total = sum(item.get(agg_field, 0) for item in data if isinstance(item.get(agg_field), (int, float)))
-                    data.append({agg_field: total, 'aggregation_type': 'sum'})
-                elif agg_function == 'count':
-                    count = len(data)
-                    data.append({agg_field: count, 'aggregation_type': 'count'})
-                elif agg_function == 'average':
-                    values = [item.get(agg_field, 0) for item in data if isinstance(item.get(agg_field), (int, float))]
-                    average = sum(values) / len(values) if values else 0
-                    data.append({agg_field: average, 'aggregation_type': 'average'})
-        
-        return data
+        db: Session, 
+        company_id: int, 
+        template: ReportTemplate, 
+        instance: ReportInstance,
+        spec: Optional[ReportProcessingSpec] = None,
+        level: Optional[int] = None,
+        filters: Optional[Dict] = None
+    ) -> CompiledReportQuery:
+        """
+        Compile the template's SQL or data source with the instance's parameters and filters.
+        Grouped specs select group totals; `level` selects the totals of the first `level` group fields.
+        """
+        
+        filters = instance.filters if filters is None else filters
+        if spec is None:
+            spec = ReportProcessingSpec.from_config(template.template_config)
+        
+        # Sorting runs in the database, so a preview of a large result is its first rows
+        order_by = spec.row_order()
+        group_by = None
+        aggregates = None
+        if level is not None:
+            order_by = None
+            group_by = spec.group_fields[:level]
+            aggregates = spec.sql_aggregates()
+        elif spec.grouped:
+            group_by = spec.group_fields
+            aggregates = spec.sql_aggregates()
+        
+        parameters = dict(instance.parameters or {})
+        parameters.setdefault('company_id', company_id)
+        
+        if template.query_sql:
+            return report_query_engine.compile(
+                db, template.query_sql, parameters, filters, order_by, group_by, aggregates
+            )
+        
+        return report_query_engine.compile_source(
+            db, template.data_source, company_id, instance.parameters, filters, order_by, group_by, aggregates
+        )
+    
+    def _query_report(
+        self, 
+        db: Session, 
+        company_id: int, 
+        template: ReportTemplate, 
+        instance: ReportInstance,
+        spec: ReportProcessingSpec,
+        filters: Optional[Dict] = None,
+        query: Optional[CompiledReportQuery] = None
+    ) -> Tuple[List[Dict], Dict[int, List[Dict]], int, bool]:
+        """
+        Run a report with the spec pushed into SQL: the (group) rows, the total rows per level
+        (one GROUP BY query each, over the whole result), the row count and whether all rows were kept.
+        """
+        
+        if query is None:
+            query = self._compile_report_query(db, company_id, template, instance, spec, filters=filters)
+        
+        data, row_count, complete = self._collect_report_rows(db, query)
+        if spec.grouped:
+            data = report_processor.finish_rows(data, spec)
+        
+        totals = self._query_report_totals(db, company_id, template, instance, spec, filters)
+        
+        return data, totals, row_count, complete
+    
+    def _query_report_totals(
+        self, 
+        db: Session, 
+        company_id: int, 
+        template: ReportTemplate, 
+        instance: ReportInstance,
+        spec: ReportProcessingSpec,
+        filters: Optional[Dict] = None
+    ) -> Dict[int, List[Dict]]:
+        """Subtotal and grand total rows per grouping level"""
+        
+        totals = {}
+        for level in spec.total_levels():
+            level_query = self._compile_report_query(db, company_id, template, instance, spec, level=level, filters=filters)
+            rows = []
+            for chunk in report_query_engine.execute(db, level_query).chunks():
+                rows.extend({key: json_safe(value) for key, value in row.items()} for row in chunk)
+            totals[level] = report_processor.finish_rows(rows, spec)
+        
+        return totals
+    
+    def _collect_report_rows(self, db: Session, query: CompiledReportQuery) -> Tuple[List[Dict], int, bool]:
+        """
+        Stream a report query, keeping at most `report_stored_rows` rows.
+        Returns the kept rows, the total row count and whether the kept rows are the whole result.
+        """
+        
+        result = report_query_engine.execute(db, query)
+        stored_rows = settings.report_stored_rows
+        
+        data = []
+        for chunk in result.chunks():
+            if len(data) < stored_rows:
+                data.extend(
+                    {key: json_safe(value) for key, value in row.items()}
+                    for row in chunk[:stored_rows - len(data)]
+                )
+        
+        if result.truncated:
+            logger.warning(f"Report query stopped at the {result.row_count} row limit")
+        
+        return data, result.row_count, not result.truncated and result.row_count <= stored_rows
     
     # Report View Management
     def create_report_view(
@@ -505,6 +650,51 @@ class ReportStudioService:
         
         return view
     
+    def get_report_view_data(
+        self, 
+        db: Session, 
+        company_id: int,
+        view_id: int
+    ) -> Dict:
+        """Rows of a report view: its instance's result with the view's filters, sorting, grouping and aggregation"""
+        
+        view = db.query(ReportView).filter(
+            ReportView.id == view_id,
+            ReportView.company_id == company_id
+        ).first()
+        
+        if not view:
+            raise ValueError("Report view not found")
+        
+        instance = db.query(ReportInstance).filter(
+            ReportInstance.id == view.instance_id,
+            ReportInstance.company_id == company_id
+        ).first()
+        
+        if not instance or instance.status != 'generated':
+            raise ValueError("Report instance must be generated before viewing")
+        
+        template = instance.template
+        spec = ReportProcessingSpec.from_config(view.view_config, view.sorting, view.grouping, view.aggregation)
+        template_spec = ReportProcessingSpec.from_config(template.template_config)
+        
+        stored_rows = instance.data or []
+        if not template_spec.aggregates and instance.row_count is not None and len(stored_rows) >= instance.row_count:
+            # The stored rows are the whole result
+            data = report_processor.process(stored_rows, spec, view.filters)
+            row_count = instance.row_count
+        else:
+            filters = dict(instance.filters or {}, **(view.filters or {}))
+            rows, totals, row_count, _ = self._query_report(db, company_id, template, instance, spec, filters=filters)
+            data = report_processor.assemble(rows, totals, spec)
+        
+        return {
+            "view_id": view.id,
+            "instance_id": instance.id,
+            "row_count": row_count,
+            "data": data
+        }
+    
     # Report Schedule Management
     def create_report_schedule(
         self, 
@@ -566,9 +756,11 @@ class ReportStudioService:
         db: Session, 
         company_id: int,
         schedule_id: int,
-        user_id: int = None
+        user_id: int = None,
+        due_at: datetime = None,
+        incremental: bool = True
     ) -> ReportScheduleLog:
-        """Execute report schedule"""
+        """Execute report schedule, refreshing incrementally from its last successful run"""
         
         schedule = db.query(ReportSchedule).filter(
             ReportSchedule.id == schedule_id,
@@ -578,10 +770,17 @@ class ReportStudioService:
         if not schedule:
             raise ValueError("Report schedule not found")
         
+        # Schedules fall due in local time (see report_scheduler_service), so the run is logged on the same clock
+        start_time = datetime.now()
+        
         # Create schedule log
         log = ReportScheduleLog(
             company_id=company_id,
             schedule_id=schedule_id,
+            status='running',
+            due_at=due_at,
+            started_at=start_time,
+            wait_time=(start_time - due_at).total_seconds() if due_at else None,
             created_by=user_id
         )
         
@@ -590,7 +789,7 @@ class ReportStudioService:
         db.refresh(log)
         
         try:
-            start_time = datetime.utcnow()
+            previous = self.get_last_schedule_run(db, schedule_id) if incremental else None
             
             # Create report instance
             instance = self.create_report_instance(
@@ -603,16 +802,37 @@ class ReportStudioService:
             )
             
             # Generate report
-            self.generate_report_instance(db, company_id, instance.id, user_id)
+            refresh = self.refresh_report_instance(
+                db, company_id, instance.id,
+                previous_instance_id=previous.instance_id if previous else None,
+                watermark=previous.watermark if previous else None,
+                user_id=user_id
+            )
+            
+            # Write the schedule's file when it is a format the export service streams
+            export_time = None
+            if export_service.supports(schedule.file_format):
+                export_start = datetime.now()
+                instance.file_format = export_service.normalize_format(schedule.file_format)
+                instance.file_path = self._generate_export_file(db, instance, instance.file_format)
+                instance.file_size = self._get_file_size(instance.file_path)
+                export_time = (datetime.now() - export_start).total_seconds()
             
             # Update schedule
-            schedule.last_run = datetime.utcnow()
+            schedule.last_run = datetime.now()
             schedule.run_count += 1
             schedule.success_count += 1
             
             # Update log
             log.status = 'success'
-            log.execution_time = (datetime.utcnow() - start_time).total_seconds()
+            log.instance_id = instance.id
+            log.refresh_mode = refresh['refresh_mode']
+            log.watermark = refresh['watermark']
+            log.row_count = instance.row_count
+            log.query_time = refresh['query_time']
+            log.export_time = export_time
+            log.finished_at = datetime.now()
+            log.execution_time = (log.finished_at - start_time).total_seconds()
             log.file_path = instance.file_path
             log.file_size = instance.file_size
             
@@ -624,21 +844,92 @@ class ReportStudioService:
             
             db.commit()
             
-            logger.info(f"Report schedule executed: {schedule.schedule_name}")
+            logger.info(
+                f"Report schedule executed: {schedule.schedule_name} "
+                f"({log.refresh_mode}, {log.row_count} rows in {log.execution_time:.1f}s)"
+            )
             
             return log
             
         except Exception as e:
+            db.rollback()
+            
             # Update schedule and log with error
             schedule.failure_count += 1
             log.status = 'failed'
             log.error_message = str(e)
+            log.finished_at = datetime.now()
+            log.execution_time = (log.finished_at - start_time).total_seconds()
             
             db.commit()
             
             logger.error(f"Report schedule execution failed: {str(e)}")
             raise ValueError(f"Report schedule execution failed: {str(e)}")
     
+    def record_shared_schedule_run(
+        self, 
+        db: Session, 
+        company_id: int,
+        schedule_id: int,
+        source_log_id: Optional[int],
+        due_at: datetime = None,
+        error: str = None
+    ) -> ReportScheduleLog:
+        """Log a schedule that was served by an identical schedule's run instead of running itself"""
+        
+        schedule = db.query(ReportSchedule).filter(
+            ReportSchedule.id == schedule_id,
+            ReportSchedule.company_id == company_id
+        ).first()
+        
+        if not schedule:
+            raise ValueError("Report schedule not found")
+        
+        source = db.get(ReportScheduleLog, source_log_id) if source_log_id else None
+        now = datetime.now()
+        
+        log = ReportScheduleLog(
+            company_id=company_id,
+            schedule_id=schedule_id,
+            status='success' if source is not None and source.status == 'success' else 'failed',
+            due_at=due_at,
+            started_at=source.started_at if source is not None else now,
+            finished_at=now,
+            refresh_mode='shared',
+            notes=f"Shared run of schedule {source.schedule_id}" if source is not None else None,
+            error_message=error if source is None else source.error_message
+        )
+        if source is not None:
+            log.instance_id = source.instance_id
+            log.execution_time = source.execution_time
+            log.query_time = source.query_time
+            log.export_time = source.export_time
+            log.row_count = source.row_count
+            log.watermark = source.watermark
+            log.file_path = source.file_path
+            log.file_size = source.file_size
+        
+        schedule.last_run = now
+        schedule.run_count += 1
+        if log.status == 'success':
+            schedule.success_count += 1
+        else:
+            schedule.failure_count += 1
+        
+        db.add(log)
+        db.commit()
+        
+        return log
+    
+    def get_last_schedule_run(self, db: Session, schedule_id: int) -> Optional[ReportScheduleLog]:
+        """Latest successful run of a schedule that produced an instance"""
+        
+        return db.query(ReportScheduleLog).filter(
+            ReportScheduleLog.schedule_id == schedule_id,
+            ReportScheduleLog.status == 'success',
+            ReportScheduleLog.instance_id.isnot(None)
+        ).order_by(desc(ReportScheduleLog.id)).first()
+    
     # Report Export Management
     def export_report_instance(
         self, 
@@ -678,7 +969,7 @@ class ReportStudioService:
             db.refresh(export)
             
             # Generate export file
-            file_path = self._generate_export_file(instance, export_format, export_config)
+            file_path = self._generate_export_file(db, instance, export_format, export_config)
             
             # Update export record
             export.file_path = file_path
@@ -703,84 +994,82 @@ class ReportStudioService:
     
     def _generate_export_file(
         self, 
+        db: Session, 
         instance: ReportInstance, 
         export_format: str, 
         export_config: Dict = None
     ) -> str:
-        """Generate export file"""
-        
-        # This is a simplified implementation
-        # In a real system, you would use appropriate libraries for each format
-        
-        if export_format == 'csv':
-            return self._export_to_csv(instance, export_config)
-        elif export_format == 'excel':
-            return self._export_to_excel(instance, export_config)
-        elif export_format == 'json':
-            return self._export_to_json(instance, export_config)
-        else:
-            raise ValueError(f"Unsupported export format: {export_format}")
-    
-    def _export_to_csv(
-        self, 
-        instance: ReportInstance, 
-        export_config: Dict = None
-    ) -> str:
-        """Export to CSV format"""
+        """Generate export file, streaming rows from the query when the instance holds only a preview"""
         
-        if not instance.data:
-            raise ValueError("No data to export")
+        export_format = export_service.normalize_format(export_format)
         
-        # Convert data to DataFrame
-        df = pd.DataFrame(instance.data)
+        columns, rows = self.iter_report_rows(db, instance.company_id, instance)
         
         # Generate file path
-        file_path = f"/tmp/report_{instance.instance_code}_{datetime.now().strftime('%Y%m%d%H%M%S')}.csv"
+        file_path = f"/tmp/report_{instance.instance_code}_{datetime.now().strftime('%Y%m%d%H%M%S')}.{export_format}"
         
-        # Export to CSV
-        df.to_csv(file_path, index=False)
+        export_service.write_file(
+            file_path,
+            rows,
+            export_format,
+            columns=columns,
+            sheet_name=instance.instance_name or 'Report'
+        )
         
         return file_path
     
-    def _export_to_excel(
-        self, 
-        instance: ReportInstance, 
-        export_config: Dict = None
-    ) -> str:
-        """Export to Excel format"""
-        
-        if not instance.data:
-            raise ValueError("No data to export")
+    def iter_report_rows(self, db: Session, company_id: int, instance: ReportInstance):
+        """
+        Columns and rows of a generated instance: the stored rows when they are the
+        whole result, otherwise streamed from the report query.
+        """
         
-        # Convert data to DataFrame
-        df = pd.DataFrame(instance.data)
+        if instance.data is not None and instance.row_count is not None and len(instance.data) >= instance.row_count:
+            data = instance.data
+            columns = list(data[0].keys()) if data else []
+            return columns, iter(data)
         
-        # Generate file path
-        file_path = f"/tmp/report_{instance.instance_code}_{datetime.now().strftime('%Y%m%d%H%M%S')}.xlsx"
+        query = self._compile_report_query(db, company_id, instance.template, instance)
+        result = report_query_engine.execute(db, query)
         
-        # Export to Excel
-        df.to_excel(file_path, index=False)
+        def rows():
+            for chunk in result.chunks():
+                yield from chunk
         
-        return file_path
+        return result.columns, rows()
     
-    def _export_to_json(
+    def stream_report_export(
         self, 
-        instance: ReportInstance, 
-        export_config: Dict = None
-    ) -> str:
-        """Export to JSON format"""
+        db: Session, 
+        company_id: int,
+        instance_id: int,
+        export_format: str
+    ):
+        """Streaming download of a generated instance, read straight from the query cursor"""
+        
+        instance = db.query(ReportInstance).filter(
+            ReportInstance.id == instance_id,
+            ReportInstance.company_id == company_id
+        ).first()
+        
+        if not instance:
+            raise ValueError("Report instance not found")
         
-        if not instance.data:
-            raise ValueError("No data to export")
+        if instance.status != 'generated':
+            raise ValueError("Report instance must be generated before export")
         
-        # Generate file path
-        file_path = f"/tmp/report_{instance.instance_code}_{datetime.now().strftime('%Y%m%d%H%M%S')}.json"
+        export_format = export_service.normalize_format(export_format)
+        filename = f"report_{instance.instance_code}.{export_format}"
+        sheet_name = instance.instance_name or 'Report'
         
-        # Export to JSON
-        with open(file_path, 'w') as f:
-            json.dump(instance.data, f, indent=2, default=str)
+        # The response outlives the request's session, so rows are read in a session of their own
+        def body():
+            with get_db_session() as stream_db:
+                stream_instance = stream_db.get(ReportInstance, instance_id)
+                columns, rows = self.iter_report_rows(stream_db, company_id, stream_instance)
+                yield from export_service.iter_export(rows, export_format, columns=columns, sheet_name=sheet_name)
         
-        return file_path
+        return export_service.response(body(), export_format, filename)
     
     def _get_file_size(self, file_path: str) -> int:
         """Get file size in bytes"""
@@ -0,0 +1,112 @@
+"""
+Backup Service Tests
+Snapshots must restore the database and uploads exactly, without stopping other connections
+"""
+import pytest
+import sqlite3
+from pathlib import Path
+
+from app.config import settings
+from app.services.core.backup_service import ERPBackupService
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    """Backup service over a WAL database and an upload folder in a temporary directory"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(settings, "database_type", "sqlite")
+    monkeypatch.setattr(settings, "sqlite_path", str(tmp_path / "erp_system.db"))
+    monkeypatch.setattr(settings, "backup_location", str(tmp_path / "backups"))
+    monkeypatch.setattr(settings, "upload_dir", str(tmp_path / "uploads"))
+    monkeypatch.setattr(settings, "log_dir", str(tmp_path / "logs"))
+    
+    db = sqlite3.connect(tmp_path / "erp_system.db")
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+    db.executemany("INSERT INTO items VALUES (?, ?)", [(n, f"Item {n} " * 20) for n in range(1, 501)])
+    db.commit()
+    db.close()
+    
+    (tmp_path / "uploads" / "invoices").mkdir(parents=True)
+    (tmp_path / "uploads" / "invoices" / "INV-1.pdf").write_bytes(b"%PDF invoice one")
+    
+    service = ERPBackupService()
+    # Small chunks, so the database spans several of them
+    service.chunk_size = 8192
+    return service
+
+
+def items(path):
+    db = sqlite3.connect(path)
+    try:
+        return db.execute("SELECT id, name FROM items ORDER BY id").fetchall()
+    finally:
+        db.close()
+
+
+class TestRoundTrip:
+    """Test backing up, changing everything and restoring"""
+    
+    def test_restore_brings_back_database_and_uploads(self, service):
+        """Test that a restore undoes changes to rows and uploaded files"""
+        original = items(service.db_path)
+        backup = service.create_backup("before_changes")
+        assert backup["success"]
+        
+        db = sqlite3.connect(service.db_path)
+        db.execute("DELETE FROM items WHERE id > 100")
+        db.execute("UPDATE items SET name = 'changed' WHERE id = 1")
+        db.commit()
+        db.close()
+        invoice = service.upload_dir / "invoices" / "INV-1.pdf"
+        invoice.write_bytes(b"overwritten")
+        (service.upload_dir / "invoices" / "INV-2.pdf").write_bytes(b"%PDF invoice two")
+        
+        result = service.restore_backup(backup["backup_file"])
+        
+        assert result["success"], result.get("error")
+        assert items(service.db_path) == original
+        assert invoice.read_bytes() == b"%PDF invoice one"
+        assert not (service.upload_dir / "invoices" / "INV-2.pdf").exists()
+        assert service.verify_backup(backup["backup_file"])["valid"]
+        assert Path(result["safety_backup"]).exists()
+    
+    def test_unchanged_snapshot_writes_no_new_chunks(self, service):
+        """Test that a second backup of the same data stores nothing new"""
+        service.create_backup("first")
+        
+        manifest = service._read_manifest(Path(service.create_backup("second")["backup_file"]))
+        
+        assert manifest["stats"]["new_chunks"] == 0
+
+
+class TestLiveConnections:
+    """Test backup and restore next to connections the application keeps open"""
+    
+    def test_backup_does_not_wait_for_a_writer(self, service):
+        """Test that a backup runs while a write is in progress and leaves it out"""
+        writer = sqlite3.connect(service.db_path, isolation_level=None)
+        writer.execute("BEGIN IMMEDIATE")
+        writer.execute("INSERT INTO items VALUES (1000, 'uncommitted')")
+        
+        backup = service.create_backup("during_write")
+        writer.execute("COMMIT")
+        writer.close()
+        
+        assert backup["success"], backup.get("error")
+        service.restore_backup(backup["backup_file"])
+        assert (1000, 'uncommitted') not in items(service.db_path)
+    
+    def test_open_connection_sees_restored_data(self, service):
+        """Test that a pooled connection left open reads the restored rows, not a stale file"""
+        backup = service.create_backup("before_delete")
+        pooled = sqlite3.connect(service.db_path)
+        pooled.execute("DELETE FROM items")
+        pooled.commit()
+        
+        result = service.restore_backup(backup["backup_file"])
+        
+        assert result["success"], result.get("error")
+        assert pooled.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 500
+        assert pooled.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+        pooled.close()
@@ -0,0 +1,179 @@
+"""
+Document Number Service Tests
+Concurrent workers must never share a number, and gapless series must not skip one
+"""
+import pytest
+import threading
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.sales import BillSeries, BillNumberBlock
+from app.services.core.document_number_service import DocumentNumberService
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """File database with the series tables; transactions take the write lock up front like the writer engine"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'numbers.db'}",
+        connect_args={"check_same_thread": False, "isolation_level": None, "timeout": 30}
+    )
+    
+    @event.listens_for(engine, "begin")
+    def begin_immediate(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+    
+    Base.metadata.create_all(engine, tables=[BillSeries.__table__, BillNumberBlock.__table__])
+    DocumentNumberService.clear_series_cache()
+    
+    yield sessionmaker(bind=engine)
+    
+    DocumentNumberService.clear_series_cache()
+    engine.dispose()
+
+
+def allocate_concurrently(session_factory, workers, per_worker, **kwargs):
+    service = DocumentNumberService()
+    numbers = []
+    errors = []
+    lock = threading.Lock()
+    
+    def worker():
+        try:
+            for _ in range(per_worker):
+                db = session_factory()
+                try:
+                    number = service.next_number(db, 1, "sale", **kwargs)
+                    db.commit()
+                finally:
+                    db.close()
+                with lock:
+                    numbers.append(number)
+        except Exception as e:
+            errors.append(e)
+    
+    threads = [threading.Thread(target=worker) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert errors == []
+    return numbers
+
+
+class TestConcurrentAllocation:
+    """Test allocation from several workers at once"""
+    
+    def test_numbers_are_unique_and_contiguous(self, session_factory):
+        """Test that eight tills allocating at once get every number exactly once"""
+        numbers = allocate_concurrently(session_factory, workers=8, per_worker=25)
+        
+        assert len(set(numbers)) == 200
+        assert sorted(numbers) == [f"S{n:06d}" for n in range(1, 201)]
+    
+    def test_series_is_created_once(self, session_factory):
+        """Test that workers racing to create a missing series end up on the same row"""
+        allocate_concurrently(session_factory, workers=8, per_worker=1)
+        
+        db = session_factory()
+        assert db.query(BillSeries).filter(BillSeries.document_type == "sale").count() == 1
+        db.close()
+
+
+class TestGaplessSeries:
+    """Test that gapless series allocate inside the document's transaction"""
+    
+    def test_rollback_returns_the_number(self, session_factory):
+        """Test that a rolled back document gives its number to the next one"""
+        service = DocumentNumberService()
+        db = session_factory()
+        assert service.get_series(db, 1, "sale").is_gapless
+        db.commit()
+        
+        assert service.next_number(db, 1, "sale") == "S000001"
+        db.rollback()
+        
+        assert service.next_number(db, 1, "sale") == "S000001"
+        db.commit()
+        assert service.next_number(db, 1, "sale") == "S000002"
+        db.close()
+    
+    def test_peek_does_not_reserve(self, session_factory):
+        """Test that previewing the next number leaves it for the next document"""
+        service = DocumentNumberService()
+        db = session_factory()
+        service.get_series(db, 1, "sale").is_gapless = True
+        db.commit()
+        
+        assert service.peek_number(db, 1, "sale") == "S000001"
+        assert service.peek_number(db, 1, "sale") == "S000001"
+        assert service.next_number(db, 1, "sale") == "S000001"
+        db.commit()
+        assert service.peek_number(db, 1, "sale") == "S000002"
+        db.close()
+    
+    def test_invoice_series_are_gapless_by_default(self, session_factory):
+        """Test that tax invoice and credit note series are created gapless, and others are not"""
+        service = DocumentNumberService()
+        db = session_factory()
+        
+        assert service.get_series(db, 1, "sale_return").is_gapless
+        assert not service.get_series(db, 1, "purchase").is_gapless
+        db.close()
+
+
+class TestBlocks:
+    """Test numbers pre-allocated to POS sessions"""
+    
+    def test_sessions_draw_from_disjoint_blocks(self, session_factory):
+        """Test that each session gets its own range and a new block when one runs out"""
+        service = DocumentNumberService()
+        db = session_factory()
+        service.get_series(db, 1, "pos_transaction").block_size = 3
+        db.commit()
+        
+        first = [service.next_number(db, 1, "pos_transaction", pos_session_id=7) for _ in range(4)]
+        second = service.next_number(db, 1, "pos_transaction", pos_session_id=8)
+        db.commit()
+        
+        assert first == ["POS00000001", "POS00000002", "POS00000003", "POS00000004"]
+        assert second == "POS00000007"
+        
+        assert service.release_session_blocks(db, 7) == 2
+        assert service.release_session_blocks(db, 8) == 2
+        db.close()
+
+
+class TestPeriodSeries:
+    """Test series numbered within a period"""
+    
+    def test_each_period_restarts(self, session_factory):
+        """Test that a period gets its own series, continuing from the seed"""
+        service = DocumentNumberService()
+        db = session_factory()
+        
+        first_day = [service.next_number(db, 1, "payment_received", period="20240131") for _ in range(2)]
+        second_day = service.next_number(db, 1, "payment_received", period="20240201", seed=lambda seed_db: 41)
+        db.commit()
+        
+        assert first_day == ["PR202401310001", "PR202401310002"]
+        assert second_day == "PR202402010042"
+        db.close()
+    
+    def test_series_cache_is_bounded(self, session_factory, monkeypatch):
+        """Test that series of past periods drop out of the id cache once it is full"""
+        monkeypatch.setattr(DocumentNumberService, "max_cached_series", 3)
+        service = DocumentNumberService()
+        db = session_factory()
+        
+        for day in range(1, 6):
+            service.next_number(db, 1, "payment_received", period=f"202401{day:02d}")
+        db.commit()
+        
+        assert list(DocumentNumberService._series_ids) == [
+            (1, "payment_received", f"202401{day:02d}") for day in range(3, 6)
+        ]
+        assert service.next_number(db, 1, "payment_received", period="20240101") == "PR202401010002"
+        db.close()
@@ -0,0 +1,68 @@
+"""
+GST Period Summary Tests
+Deltas must land in their cells even when another transaction creates a cell first
+"""
+import pytest
+from decimal import Decimal
+from datetime import date
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.core import GSTPeriodSummary
+from app.services.core.gst_period_summary_service import GSTPeriodSummaryService, MEASURES
+
+
+@pytest.fixture
+def engine():
+    """In-memory database with the summary table; SQLite savepoints need the transaction begun explicitly"""
+    engine = create_engine("sqlite://", connect_args={"isolation_level": None})
+    
+    @event.listens_for(engine, "begin")
+    def begin(conn):
+        conn.exec_driver_sql("BEGIN")
+    
+    Base.metadata.create_all(engine, tables=[GSTPeriodSummary.__table__])
+    
+    yield engine
+    engine.dispose()
+
+
+def sale_delta(service, rate, taxable):
+    row = service._contribution(
+        'sale_invoice', 1, 1, date(2024, 1, 31), 'outward', rate, '6205', '29', 'B2C', 1,
+        taxable, taxable * rate / 200, taxable * rate / 200, 0, 0, 1
+    )
+    return row['cell_key'], dict({measure: row[measure] for measure in MEASURES}, document_count=1, cell=row)
+
+
+class TestApplyDeltas:
+    """Test applying document deltas to the summary cells"""
+    
+    def test_cell_created_concurrently_keeps_every_delta(self, engine):
+        """Test that when one new cell of a batch already exists, it is added to and the others are still inserted"""
+        service = GSTPeriodSummaryService()
+        taken_key, taken_delta = sale_delta(service, Decimal('5'), Decimal('1000'))
+        free_key, free_delta = sale_delta(service, Decimal('12'), Decimal('2000'))
+        
+        # Another transaction inserts one of the cells after this one checked which exist
+        raced = []
+        
+        @event.listens_for(engine, "before_cursor_execute")
+        def create_cell_first(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("SAVEPOINT") and not raced:
+                raced.append(statement)
+                conn.execute(insert(GSTPeriodSummary), dict(
+                    service._cell_values(taken_delta['cell']), **{measure: taken_delta[measure] for measure in MEASURES},
+                    document_count=1
+                ))
+        
+        db = sessionmaker(bind=engine)()
+        service._apply_deltas(db, {taken_key: taken_delta, free_key: free_delta})
+        db.commit()
+        
+        cells = {cell.cell_key: cell for cell in db.query(GSTPeriodSummary).all()}
+        assert raced
+        assert (cells[taken_key].taxable_amount, cells[taken_key].document_count) == (Decimal('2000'), 2)
+        assert (cells[free_key].taxable_amount, cells[free_key].document_count) == (Decimal('2000'), 1)
+        db.close()
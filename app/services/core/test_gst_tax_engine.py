@@ -0,0 +1,101 @@
+"""
+GST Tax Engine Tests
+Columnar GST must match Decimal ROUND_HALF_UP to the paisa
+"""
+import pytest
+import random
+import numpy as np
+from decimal import Decimal, ROUND_HALF_UP
+
+from app.services.core.gst_tax_engine import (
+    GSTTaxEngine, to_units, to_decimals, round_half_up, AMOUNT_SCALE, RATE_SCALE
+)
+
+PAISA = Decimal('0.01')
+
+
+def decimal_gst(amount: Decimal, rate: Decimal) -> Decimal:
+    """Tax one line the way invoices always did, in Decimal"""
+    return (amount * rate / 100).quantize(PAISA, ROUND_HALF_UP)
+
+
+class TestUnits:
+    """Test conversion to and from integer units"""
+    
+    @pytest.mark.parametrize("value, expected", [
+        ('0.005', 1), ('0.015', 2), ('0.025', 3), ('2.675', 268), ('-0.005', -1), (None, 0)
+    ])
+    def test_to_units_rounds_half_up(self, value, expected):
+        """Test that halves round away from zero, not to even"""
+        assert to_units([value], 100)[0] == expected
+    
+    def test_to_units_float_input(self):
+        """Test that floats whose binary value sits below a half still round half up"""
+        # 1.005 is 1.00499999999999989... as a float
+        assert to_units([1.005], 100)[0] == 101
+    
+    def test_to_units_integer_array(self):
+        """Test that integer arrays are scaled without a Decimal round trip"""
+        assert to_units(np.array([1, 2, 3]), RATE_SCALE).tolist() == [100, 200, 300]
+    
+    def test_round_half_up(self):
+        """Test integer division rounding halves away from zero"""
+        numerators = np.array([5, 15, 25, 4, -5, -15, -4])
+        assert round_half_up(numerators, 10).tolist() == [1, 2, 3, 0, -1, -2, 0]
+    
+    def test_to_decimals(self):
+        """Test converting paise back to Decimals"""
+        assert to_decimals(np.array([12345, -5])) == [Decimal('123.45'), Decimal('-0.05')]
+
+
+class TestGSTTaxEngine:
+    """Test line and per-rate GST"""
+    
+    def test_half_paisa_rounds_up(self):
+        """Test lines whose tax lands exactly on half a paisa"""
+        engine = GSTTaxEngine()
+        # 0.10 @ 5% = 0.005; 0.30 @ 5% = 0.015; 0.50 @ 5% = 0.025
+        computation = engine.compute(['0.10', '0.30', '0.50'], [5, 5, 5], interstate=True)
+        
+        assert to_decimals(computation.igst) == [Decimal('0.01'), Decimal('0.02'), Decimal('0.03')]
+    
+    def test_intrastate_split(self):
+        """Test that CGST and SGST are each rounded on half the rate"""
+        engine = GSTTaxEngine()
+        computation = engine.compute(['0.10'], [18])
+        line = computation.line(0)
+        
+        assert line["cgst_amount"] == decimal_gst(Decimal('0.10'), Decimal('9'))
+        assert line["sgst_amount"] == line["cgst_amount"]
+        assert line["igst_amount"] == Decimal('0')
+        assert line["total_gst_amount"] == line["cgst_amount"] * 2
+    
+    def test_matches_decimal_reference(self):
+        """Test random lines against Decimal ROUND_HALF_UP"""
+        engine = GSTTaxEngine()
+        generator = random.Random(14)
+        amounts = [Decimal(generator.randint(1, 10 ** 9)).scaleb(-2) for _ in range(2000)]
+        rates = [Decimal(generator.choice(['0.25', '3', '5', '12', '18', '28'])) for _ in amounts]
+        
+        computation = engine.compute(amounts, rates, interstate=True)
+        
+        assert to_decimals(computation.igst) == [decimal_gst(amount, rate) for amount, rate in zip(amounts, rates)]
+    
+    def test_rate_breakdown_rounds_per_rate(self):
+        """Test that the breakdown rounds each rate's combined taxable value once"""
+        engine = GSTTaxEngine()
+        computation = engine.compute(['0.10', '0.10', '0.10'], [5, 5, 5], interstate=True)
+        (group,) = computation.rate_breakdown()
+        
+        assert group["base_amount"] == Decimal('0.30')
+        assert group["gst_amount"] == decimal_gst(Decimal('0.30'), Decimal('5'))
+        assert sum(to_decimals(computation.igst)) == Decimal('0.03')
+    
+    def test_large_amounts(self):
+        """Test amounts large enough to leave the int64 path"""
+        engine = GSTTaxEngine()
+        amount = Decimal('98765432109876.55')
+        computation = engine.compute([amount], [28], interstate=True)
+        
+        assert to_decimals(computation.igst) == [decimal_gst(amount, Decimal('28'))]
+        assert computation.taxable[0] == int(amount * AMOUNT_SCALE)
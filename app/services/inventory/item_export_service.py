@@ -0,0 +1,117 @@
+# backend/app/services/item_export_service.py
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func, case, or_, literal
+from typing import Optional, List, Dict, Iterator, Sequence, Tuple
+
+from ..models.inventory import Item, StockItem
+from .stock_service import StockService
+
+class ItemExportService:
+    """
+    Item master export, read a page at a time.
+    
+    Pages follow a keyset cursor on item id, so each one is a short indexed
+    query whatever the offset, and current stock comes from a correlated
+    subquery in the same statement rather than a lookup per item. Rows are
+    yielded as they are read, ready for export_service to stream.
+    """
+    
+    # Column key -> header; all of them, in this order, by default
+    COLUMNS = {
+        'barcode': 'Barcode',
+        'style_code': 'Style Code',
+        'name': 'Name',
+        'description': 'Description',
+        'color': 'Color',
+        'size': 'Size',
+        'brand': 'Brand',
+        'gender': 'Gender',
+        'hsn_code': 'HSN Code',
+        'gst_rate': 'GST Rate',
+        'mrp': 'MRP',
+        'purchase_rate': 'Purchase Rate',
+        'selling_price': 'Selling Price',
+        'uom': 'UOM',
+        'current_stock': 'Current Stock',
+        'status': 'Status'
+    }
+    
+    # Blank text and prices export as '' and 0, as they always have
+    TEXT_COLUMNS = ('description', 'color', 'size', 'brand', 'gender', 'hsn_code')
+    NUMBER_COLUMNS = ('gst_rate', 'mrp', 'purchase_rate', 'selling_price')
+    
+    def __init__(self, page_size: int = 1000):
+        self.page_size = page_size
+        self.stock_service = StockService()
+    
+    def resolve_columns(self, columns: Optional[Sequence[str]] = None) -> Tuple[List[str], List[str]]:
+        """Validated column keys and their headers"""
+        
+        keys = [column.strip().lower() for column in columns or () if column.strip()] or list(self.COLUMNS)
+        unknown = [key for key in keys if key not in self.COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown export columns: {', '.join(unknown)}")
+        
+        keys = list(dict.fromkeys(keys))
+        return keys, [self.COLUMNS[key] for key in keys]
+    
+    def iter_items(
+        self,
+        db: Session,
+        columns: Sequence[str],
+        status: Optional[str] = 'active',
+        category_id: Optional[int] = None,
+        brand: Optional[str] = None,
+        search: Optional[str] = None,
+        location_id: Optional[int] = None
+    ) -> Iterator[Dict]:
+        """Yield export rows for the matching items in id order"""
+        
+        selected = []
+        for key in columns:
+            if key == 'current_stock':
+                if location_id is None:
+                    location_id = self.stock_service.get_main_location_id(db)
+                stock = select(func.sum(StockItem.quantity)).where(
+                    StockItem.item_id == Item.id,
+                    StockItem.location_id == location_id
+                ).scalar_subquery()
+                expression = case((Item.track_inventory == True, func.coalesce(stock, 0)), else_=literal(0))
+            elif key in self.TEXT_COLUMNS:
+                expression = func.coalesce(getattr(Item, key), '')
+            elif key in self.NUMBER_COLUMNS:
+                expression = func.coalesce(getattr(Item, key), 0)
+            else:
+                expression = getattr(Item, key)
+            selected.append(expression.label(key))
+        
+        query = select(Item.id, *selected)
+        
+        if status:
+            query = query.where(Item.status == status)
+        if category_id:
+            query = query.where(Item.category_id == category_id)
+        if brand:
+            query = query.where(Item.brand.ilike(f"%{brand}%"))
+        if search:
+            query = query.where(or_(
+                Item.barcode.ilike(f"%{search}%"),
+                Item.style_code.ilike(f"%{search}%"),
+                Item.name.ilike(f"%{search}%")
+            ))
+        
+        last_id = 0
+        while True:
+            page = db.execute(
+                query.where(Item.id > last_id).order_by(Item.id).limit(self.page_size)
+            ).all()
+            
+            for row in page:
+                yield dict(zip(columns, row[1:]))
+            
+            if len(page) < self.page_size:
+                break
+            last_id = page[-1][0]
+
+# Global service instance
+item_export_service = ItemExportService()
@@ -0,0 +1,289 @@
+# backend/app/services/item_import_service.py
+from sqlalchemy.orm import Session
+from sqlalchemy import insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from typing import Optional, List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+import threading
+import uuid
+import logging
+
+import pandas as pd
+
+from ..models.inventory import Item
+from ..config import settings
+from ..database import get_db_session
+from ..core.excel_service import ExcelService, ImportColumn
+
+logger = logging.getLogger(__name__)
+
+class ItemImportJob:
+    """Progress of a background item import"""
+    
+    __slots__ = (
+        "id", "filename", "user_id", "status", "total_rows", "processed_rows", "created", "updated",
+        "error_rows", "errors", "error_file", "message", "created_at", "started_at", "finished_at"
+    )
+    
+    def __init__(self, job_id: str, filename: str, user_id: Optional[int]):
+        self.id = job_id
+        self.filename = filename
+        self.user_id = user_id
+        self.status = "queued"  # queued, running, completed, failed
+        self.total_rows: Optional[int] = None
+        self.processed_rows = 0
+        self.created = 0
+        self.updated = 0
+        self.error_rows = 0
+        self.errors: List[Dict] = []
+        self.error_file: Optional[str] = None
+        self.message: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+    
+    def to_dict(self) -> Dict:
+        progress = None
+        if self.status == "completed":
+            progress = 100.0
+        elif self.total_rows:
+            progress = round(min(self.processed_rows / self.total_rows, 1) * 100, 1)
+        
+        return {
+            "job_id": self.id,
+            "filename": self.filename,
+            "status": self.status,
+            "total_rows": self.total_rows,
+            "processed_rows": self.processed_rows,
+            "progress_percent": progress,
+            "created_items": self.created,
+            "updated_items": self.updated,
+            "error_rows": self.error_rows,
+            "errors": self.errors,
+            "has_error_file": self.error_file is not None,
+            "message": self.message,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+
+class ItemImportService:
+    """
+    Item master import from Excel, a chunk of rows at a time.
+    
+    Each chunk is validated column-wise, checked against existing barcodes
+    with one query and written with a single INSERT ... ON CONFLICT (barcode)
+    DO UPDATE, so memory and round trips stay flat however long the sheet
+    is. Updates only touch the columns the sheet has. Large files can run
+    as background jobs that commit chunk by chunk and write the rejected
+    rows to a CSV error file.
+    """
+    
+    # Sheet columns (headers are matched case-insensitively)
+    ITEM_COLUMNS = [
+        ImportColumn('barcode', ['BARCODE'], required=True),
+        ImportColumn('style_code', ['STYLE_CODE'], required=True, label='Style Code'),
+        ImportColumn('name', ['NAME'], required=True),
+        ImportColumn('description', ['DESCRIPTION']),
+        ImportColumn('color', ['COLOR']),
+        ImportColumn('size', ['SIZE']),
+        ImportColumn('brand', ['BRAND']),
+        ImportColumn('gender', ['GENDER']),
+        ImportColumn('hsn_code', ['HSN_CODE', 'HSN'], label='HSN Code'),
+        ImportColumn('gst_rate', ['GST_RATE'], kind='decimal', default=18.0, label='GST Rate'),
+        ImportColumn('mrp', ['MRP'], kind='decimal', label='MRP'),
+        ImportColumn('purchase_rate', ['PURCHASE_RATE'], kind='decimal', label='Purchase Rate'),
+        ImportColumn('selling_price', ['SELLING_PRICE'], kind='decimal', label='Selling Price'),
+        ImportColumn('uom', ['UOM'], default='PCS', label='UOM')
+    ]
+    
+    # Keep IN (...) lists below SQLite's bound-parameter limit
+    lookup_chunk_size = 500
+    
+    # Errors kept on a result or job; the error file has all of them
+    max_reported_errors = 100
+    
+    def __init__(self):
+        self.chunk_rows = settings.item_import_chunk_rows
+        self.max_workers = settings.item_import_workers
+        self.job_ttl = timedelta(hours=24)
+        self.error_dir = Path(settings.upload_dir) / "import_errors"
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, ItemImportJob] = {}
+    
+    def import_items(
+        self,
+        db: Session,
+        file_content: bytes,
+        user_id: Optional[int] = None,
+        atomic: bool = True,
+        job: Optional[ItemImportJob] = None,
+        error_path: Optional[Path] = None
+    ) -> Dict:
+        """
+        Import an item master sheet.
+        
+        atomic: write nothing once a row fails and leave commit or rollback to
+        the caller; otherwise commit each chunk and skip the rows that fail.
+        """
+        
+        headers, estimate, chunks = ExcelService.read_sheet_chunks(file_content, self.chunk_rows)
+        missing = ExcelService.missing_columns(headers, self.ITEM_COLUMNS)
+        if missing:
+            raise ValueError(f"Missing required columns: {', '.join(column.lower() for column in missing)}")
+        
+        update_fields = [
+            column.field for column in self.ITEM_COLUMNS
+            if column.field != 'barcode' and any(header in headers for header in column.headers)
+        ]
+        
+        summary = job or ItemImportJob(None, None, user_id)
+        summary.total_rows = estimate
+        error_file = None
+        
+        try:
+            for frame in chunks:
+                valid, errors = ExcelService.validate_chunk(frame, self.ITEM_COLUMNS)
+                
+                if errors:
+                    summary.error_rows += len(errors)
+                    room = self.max_reported_errors - len(summary.errors)
+                    if room > 0:
+                        summary.errors.extend(errors[:room])
+                    if error_path is not None:
+                        error_file = self._write_errors(error_file, error_path, frame, errors)
+                        # Set once the file exists, so a failed job's partial file is served and pruned too
+                        summary.error_file = str(error_path)
+                
+                # One bad row fails an atomic import, so stop writing
+                if len(valid) and not (atomic and summary.error_rows):
+                    created, updated = self._upsert_chunk(db, valid.drop(columns='_row'), update_fields, user_id)
+                    summary.created += created
+                    summary.updated += updated
+                    if not atomic:
+                        db.commit()
+                
+                summary.processed_rows += len(frame)
+        finally:
+            if error_file is not None:
+                error_file.close()
+        
+        result = summary.to_dict()
+        result["total_processed"] = summary.created + summary.updated
+        return result
+    
+    def _upsert_chunk(self, db: Session, rows: pd.DataFrame, update_fields: List[str], user_id: Optional[int]):
+        """Insert or update one chunk; returns (created, updated)"""
+        
+        # The last row for a barcode wins, as a row-by-row import would have it
+        rows = rows.drop_duplicates(subset='barcode', keep='last')
+        barcodes = rows['barcode'].tolist()
+        
+        existing = {}
+        for start in range(0, len(barcodes), self.lookup_chunk_size):
+            existing.update(
+                db.query(Item.barcode, Item.id).filter(
+                    Item.barcode.in_(barcodes[start:start + self.lookup_chunk_size])
+                ).all()
+            )
+        
+        now = datetime.utcnow()
+        records = rows.assign(
+            status='active', created_by=user_id, updated_by=user_id, created_at=now, updated_at=now
+        ).to_dict('records')
+        
+        # updated_at has no onupdate in a bulk statement, so it is set here
+        changed = update_fields + ['status', 'updated_by', 'updated_at']
+        table = Item.__table__
+        dialect = db.get_bind().dialect.name
+        
+        if dialect in ('postgresql', 'sqlite'):
+            statement = (postgresql.insert if dialect == 'postgresql' else sqlite.insert)(table)
+            statement = statement.on_conflict_do_update(
+                index_elements=[table.c.barcode],
+                set_={field: statement.excluded[field] for field in changed}
+            )
+            db.execute(statement, records)
+        else:
+            created = [record for record in records if record['barcode'] not in existing]
+            updated = [
+                dict({field: record[field] for field in changed}, id=existing[record['barcode']])
+                for record in records if record['barcode'] in existing
+            ]
+            if created:
+                db.execute(insert(table), created)
+            if updated:
+                db.execute(update(Item), updated)
+        
+        return len(records) - len(existing), len(existing)
+    
+    def _write_errors(self, handle, error_path: Path, frame: pd.DataFrame, errors: List[Dict]):
+        """Append rejected rows, as they were in the sheet, to the error CSV"""
+        
+        if handle is None:
+            error_path.parent.mkdir(parents=True, exist_ok=True)
+            handle = open(error_path, 'w', newline='', encoding='utf-8')
+            header = True
+        else:
+            header = False
+        
+        messages = pd.Series({error['row']: error['error'] for error in errors})
+        rejected = frame[frame['_row'].isin(messages.index)]
+        output = rejected.drop(columns='_row')
+        output.insert(0, 'ROW', rejected['_row'].values)
+        output.insert(1, 'ERROR', rejected['_row'].map(messages).values)
+        output.to_csv(handle, header=header, index=False)
+        return handle
+    
+    def start_job(self, file_content: bytes, filename: str, user_id: Optional[int]) -> ItemImportJob:
+        """Queue an import to run in the background; poll it with get_job"""
+        
+        job = ItemImportJob(uuid.uuid4().hex, filename, user_id)
+        with self._lock:
+            self._prune_jobs()
+            self._jobs[job.id] = job
+            self._pool().submit(self._run_job, job, file_content)
+        return job
+    
+    def get_job(self, job_id: str) -> Optional[ItemImportJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+    
+    def _run_job(self, job: ItemImportJob, file_content: bytes):
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+        try:
+            with get_db_session() as db:
+                self.import_items(
+                    db, file_content, job.user_id, atomic=False, job=job,
+                    error_path=self.error_dir / f"{job.id}.csv"
+                )
+            job.status = "completed"
+            logger.info(
+                f"Item import {job.id} finished: {job.created} created, {job.updated} updated, {job.error_rows} rejected"
+            )
+        except Exception as e:
+            job.status = "failed"
+            job.message = str(e)
+            logger.error(f"Item import {job.id} failed: {str(e)}")
+        finally:
+            job.finished_at = datetime.utcnow()
+    
+    def _prune_jobs(self):
+        cutoff = datetime.utcnow() - self.job_ttl
+        for job_id, job in list(self._jobs.items()):
+            if job.finished_at and job.finished_at < cutoff:
+                del self._jobs[job_id]
+                if job.error_file:
+                    Path(job.error_file).unlink(missing_ok=True)
+    
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="item-import")
+        return self._executor
+
+# Global service instance
+item_import_service = ItemImportService()
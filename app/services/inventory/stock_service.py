@@ -1,19 +1,29 @@
 # backend/app/services/stock_service.py
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
-from typing import Optional, List, Dict
+from sqlalchemy import func, and_, or_, insert, Numeric
+from typing import Optional, List, Dict, Tuple, Iterator
 from decimal import Decimal
 from datetime import datetime
 import logging
 
 from ..models.inventory import StockLocation, StockItem, StockMovement, StockAdjustment, StockAdjustmentItem
-from ..models.inventory import Item
+from ..models.inventory import Item, ItemCategory
+from ..core.document_number_service import document_number_service
 
 logger = logging.getLogger(__name__)
 
+# Session.info key for main location ids by location code
+_MAIN_LOCATION_IDS = "stock_main_location_ids"
+
 class StockService:
     """Service class for stock management operations"""
     
+    # Keep IN (...) lists below SQLite's bound-parameter limit
+    lookup_chunk_size = 500
+    
+    # Movement types that add to stock; everything else reduces it
+    inbound_movement_types = frozenset({'in', 'adjustment_in'})
+    
     def __init__(self):
         self.main_location_code = "MAIN"
     
@@ -34,14 +44,22 @@ class StockService:
             db.add(location)
             db.commit()
         
+        db.info.setdefault(_MAIN_LOCATION_IDS, {})[self.main_location_code] = location.id
         return location
     
+    def get_main_location_id(self, db: Session) -> int:
+        """Get the main stock location id, cached on the session after the first lookup"""
+        # Cached per session, so a restore or re-seed is picked up by the next request
+        location_id = db.info.get(_MAIN_LOCATION_IDS, {}).get(self.main_location_code)
+        if location_id is None:
+            location_id = self.get_main_location(db).id
+        return location_id
+    
     def get_item_stock(self, db: Session, item_id: int, location_id: Optional[int] = None) -> Optional[Decimal]:
         """Get current stock quantity for an item"""
         
         if location_id is None:
-            location = self.get_main_location(db)
-            location_id = location.id
+            location_id = self.get_main_location_id(db)
         
         stock_item = db.query(StockItem).filter(
             and_(StockItem.item_id == item_id, StockItem.location_id == location_id)
@@ -49,6 +67,52 @@ class StockService:
         
         return stock_item.quantity if stock_item else Decimal('0')
     
+    def get_items_stock(
+        self,
+        db: Session,
+        item_ids: List[int],
+        location_id: Optional[int] = None
+    ) -> Dict[int, Decimal]:
+        """Get current stock quantities for many items in one grouped query
+        
+        Items without a stock record are reported as zero, matching get_item_stock.
+        """
+        
+        if location_id is None:
+            location_id = self.get_main_location_id(db)
+        
+        unique_ids = list(dict.fromkeys(item_ids))
+        stock = {item_id: Decimal('0') for item_id in unique_ids}
+        
+        for start in range(0, len(unique_ids), self.lookup_chunk_size):
+            chunk = unique_ids[start:start + self.lookup_chunk_size]
+            rows = db.query(
+                StockItem.item_id,
+                func.sum(StockItem.quantity)
+            ).filter(
+                and_(StockItem.item_id.in_(chunk), StockItem.location_id == location_id)
+            ).group_by(StockItem.item_id).all()
+            
+            for item_id, quantity in rows:
+                stock[item_id] = quantity if quantity is not None else Decimal('0')
+        
+        return stock
+    
+    def get_category_names(self, db: Session, category_ids: List[int]) -> Dict[int, str]:
+        """Resolve display names for many item categories in one query"""
+        
+        unique_ids = [category_id for category_id in dict.fromkeys(category_ids) if category_id]
+        names = {}
+        
+        for start in range(0, len(unique_ids), self.lookup_chunk_size):
+            chunk = unique_ids[start:start + self.lookup_chunk_size]
+            rows = db.query(ItemCategory.id, ItemCategory.display_name).filter(
+                ItemCategory.id.in_(chunk)
+            ).all()
+            names.update({category_id: display_name for category_id, display_name in rows})
+        
+        return names
+    
     def get_item_stock_all_locations(self, db: Session, item_id: int) -> Dict[int, Decimal]:
         """Get stock quantities for an item across all locations"""
         
@@ -60,8 +124,7 @@ class StockService:
         """Initialize stock record for an item"""
         
         if location_id is None:
-            location = self.get_main_location(db)
-            location_id = location.id
+            location_id = self.get_main_location_id(db)
         
         # Check if stock record already exists
         existing = db.query(StockItem).filter(
@@ -82,84 +145,226 @@ class StockService:
             db.commit()
             logger.info(f"Initialized stock for item {item_id} at location {location_id}")
     
+    def lock_stock_items(
+        self,
+        db: Session,
+        keys: List[Tuple[int, int]],
+        create: bool = True
+    ) -> Dict[Tuple[int, int], StockItem]:
+        """Load and row-lock stock records for (item_id, location_id) pairs
+        
+        Rows are locked in id order so concurrent batches cannot deadlock;
+        missing records are created with a single bulk insert.
+        """
+        
+        unique_keys = set(keys)
+        item_ids = sorted({item_id for item_id, _ in unique_keys})
+        location_ids = sorted({location_id for _, location_id in unique_keys})
+        
+        def load(ids):
+            found = {}
+            for start in range(0, len(ids), self.lookup_chunk_size):
+                chunk = ids[start:start + self.lookup_chunk_size]
+                rows = db.query(StockItem).filter(
+                    and_(StockItem.item_id.in_(chunk), StockItem.location_id.in_(location_ids))
+                ).order_by(StockItem.id).with_for_update().all()
+                
+                for stock_item in rows:
+                    key = (stock_item.item_id, stock_item.location_id)
+                    if key in unique_keys:
+                        found.setdefault(key, stock_item)
+            return found
+        
+        stock_items = load(item_ids)
+        missing = sorted(unique_keys - stock_items.keys())
+        
+        if missing and create:
+            db.execute(insert(StockItem), [
+                {
+                    'item_id': item_id,
+                    'location_id': location_id,
+                    'quantity': Decimal('0'),
+                    'reserved_quantity': Decimal('0'),
+                    'available_quantity': Decimal('0'),
+                    'average_cost': Decimal('0'),
+                    'last_cost': Decimal('0')
+                }
+                for item_id, location_id in missing
+            ])
+            stock_items.update(load(sorted({item_id for item_id, _ in missing})))
+            logger.info(f"Initialized stock for {len(missing)} item/location pairs")
+        
+        return stock_items
+    
+    def post_movements(
+        self,
+        db: Session,
+        movements: List[Dict],
+        commit: bool = True,
+        check_negative: bool = True,
+        return_movements: bool = False
+    ) -> Dict:
+        """Post a batch of stock movements in one pass
+        
+        Each movement is a dict with item_id, movement_type and quantity, and
+        optionally location_id (main location if omitted), unit_cost,
+        reference_type, reference_id, reference_number, batch_number,
+        serial_number, expiry_date and remarks. Movements for the same item
+        apply in list order. The affected stock records are locked, the whole
+        batch is checked for negative stock before anything is written, and
+        the movement rows go in with one bulk insert.
+        """
+        
+        if not movements:
+            return {'movement_count': 0, 'stock_items': {}, 'movements': []}
+        
+        main_location_id = None
+        lines = []
+        for movement in movements:
+            location_id = movement.get('location_id')
+            if location_id is None:
+                if main_location_id is None:
+                    main_location_id = self.get_main_location_id(db)
+                location_id = main_location_id
+            
+            unit_cost = movement.get('unit_cost')
+            lines.append((
+                movement,
+                (movement['item_id'], location_id),
+                Decimal(str(movement['quantity'])),
+                Decimal(str(unit_cost)) if unit_cost else None
+            ))
+        
+        stock_items = self.lock_stock_items(db, [key for _, key, _, _ in lines])
+        
+        negative_allowed = {}
+        if check_negative:
+            item_ids = list({key[0] for _, key, _, _ in lines})
+            for start in range(0, len(item_ids), self.lookup_chunk_size):
+                chunk = item_ids[start:start + self.lookup_chunk_size]
+                negative_allowed.update(
+                    db.query(Item.id, Item.allow_negative_stock).filter(Item.id.in_(chunk)).all()
+                )
+        
+        # Running (quantity, average cost, last cost, last type) per stock record
+        state = {
+            key: [stock_item.quantity or Decimal('0'), stock_item.average_cost or Decimal('0'), None, None]
+            for key, stock_item in stock_items.items()
+        }
+        
+        now = datetime.utcnow()
+        rows = []
+        shortages = {}
+        
+        for movement, key, quantity, unit_cost in lines:
+            current = state[key]
+            movement_type = movement['movement_type']
+            inbound = movement_type in self.inbound_movement_types
+            
+            quantity_before = current[0]
+            quantity_after = quantity_before + (quantity if inbound else -quantity)
+            
+            if quantity_after < 0 and check_negative and not negative_allowed.get(key[0]):
+                shortages.setdefault(key, (quantity_before, quantity))
+            
+            if inbound and unit_cost:
+                # Weighted average over the stock actually on hand before the receipt
+                on_hand = max(quantity_before, Decimal('0'))
+                if on_hand + quantity > 0:
+                    current[1] = ((on_hand * current[1]) + (quantity * unit_cost)) / (on_hand + quantity)
+                current[2] = unit_cost
+            
+            current[0] = quantity_after
+            current[3] = movement_type
+            
+            rows.append({
+                'item_id': key[0],
+                'location_id': key[1],
+                'movement_type': movement_type,
+                'reference_type': movement.get('reference_type'),
+                'reference_id': movement.get('reference_id'),
+                'reference_number': movement.get('reference_number'),
+                'quantity': quantity,
+                'unit_cost': unit_cost,
+                'total_cost': quantity * unit_cost if unit_cost else None,
+                'quantity_before': quantity_before,
+                'quantity_after': quantity_after,
+                'batch_number': movement.get('batch_number'),
+                'serial_number': movement.get('serial_number'),
+                'expiry_date': movement.get('expiry_date'),
+                'remarks': movement.get('remarks'),
+                'movement_date': now
+            })
+        
+        if shortages:
+            details = "; ".join(
+                f"Item {item_id} at location {location_id}: Available: {available}, Required: {required}"
+                for (item_id, location_id), (available, required) in shortages.items()
+            )
+            raise ValueError(f"Insufficient stock. {details}")
+        
+        if return_movements:
+            posted = db.scalars(
+                insert(StockMovement).returning(StockMovement, sort_by_parameter_order=True), rows
+            ).all()
+        else:
+            db.execute(insert(StockMovement), rows)
+            posted = []
+        
+        for key, (quantity, average_cost, last_cost, last_type) in state.items():
+            if last_type is None:
+                continue
+            
+            stock_item = stock_items[key]
+            stock_item.quantity = quantity
+            stock_item.average_cost = average_cost.quantize(Decimal('0.01'))
+            if last_cost is not None:
+                stock_item.last_cost = last_cost
+            stock_item.last_movement_date = now
+            stock_item.last_movement_type = last_type
+            stock_item.update_available_quantity()
+        
+        if commit:
+            db.commit()
+        else:
+            db.flush()
+        
+        logger.info(f"Posted {len(rows)} stock movements across {len(stock_items)} stock records")
+        
+        return {'movement_count': len(rows), 'stock_items': stock_items, 'movements': posted}
+    
     def add_stock_movement(
         self, 
         db: Session, 
         item_id: int, 
-        location_id: int,
+        location_id: Optional[int],
         movement_type: str,
         quantity: Decimal,
         unit_cost: Optional[Decimal] = None,
         reference_type: Optional[str] = None,
         reference_id: Optional[int] = None,
         reference_number: Optional[str] = None,
-        remarks: Optional[str] = None
+        remarks: Optional[str] = None,
+        batch_number: Optional[str] = None
     ) -> StockMovement:
-        """Add a stock movement and update stock levels"""
-        
-        # Get current stock
-        stock_item = db.query(StockItem).filter(
-            and_(StockItem.item_id == item_id, StockItem.location_id == location_id)
-        ).first()
-        
-        if not stock_item:
-            # Initialize stock if it doesn't exist
-            self.initialize_item_stock(db, item_id, location_id)
-            stock_item = db.query(StockItem).filter(
-                and_(StockItem.item_id == item_id, StockItem.location_id == location_id)
-            ).first()
-        
-        # Calculate quantity change based on movement type
-        quantity_change = quantity if movement_type in ['in', 'adjustment_in'] else -quantity
-        
-        # Store before quantity
-        quantity_before = stock_item.quantity
-        quantity_after = quantity_before + quantity_change
-        
-        # Validate negative stock if not allowed
-        item = db.query(Item).filter(Item.id == item_id).first()
-        if quantity_after < 0 and not (item and item.allow_negative_stock):
-            raise ValueError(f"Insufficient stock. Available: {quantity_before}, Required: {quantity}")
-        
-        # Create stock movement record
-        movement = StockMovement(
-            item_id=item_id,
-            location_id=location_id,
-            movement_type=movement_type,
-            reference_type=reference_type,
-            reference_id=reference_id,
-            reference_number=reference_number,
-            quantity=quantity,
-            unit_cost=unit_cost,
-            total_cost=quantity * unit_cost if unit_cost else None,
-            quantity_before=quantity_before,
-            quantity_after=quantity_after,
-            remarks=remarks
-        )
-        
-        db.add(movement)
-        
-        # Update stock item
-        stock_item.quantity = quantity_after
-        stock_item.last_movement_date = datetime.utcnow()
-        stock_item.last_movement_type = movement_type
-        
-        # Update cost information for incoming stock
-        if movement_type in ['in', 'adjustment_in'] and unit_cost:
-            # Calculate new average cost using weighted average
-            if stock_item.quantity > 0:
-                total_cost = (stock_item.quantity * stock_item.average_cost) + (quantity * unit_cost)
-                stock_item.average_cost = total_cost / stock_item.quantity
-            stock_item.last_cost = unit_cost
-        
-        # Update available quantity
-        stock_item.update_available_quantity()
-        
-        db.commit()
+        """Add a single stock movement and update stock levels"""
+        
+        result = self.post_movements(db, [{
+            'item_id': item_id,
+            'location_id': location_id,
+            'movement_type': movement_type,
+            'quantity': quantity,
+            'unit_cost': unit_cost,
+            'reference_type': reference_type,
+            'reference_id': reference_id,
+            'reference_number': reference_number,
+            'remarks': remarks,
+            'batch_number': batch_number
+        }], return_movements=True)
         
         logger.info(f"Stock movement added: Item {item_id}, Type: {movement_type}, Qty: {quantity}")
         
-        return movement
+        return result['movements'][0]
     
     def adjust_stock(
         self, 
@@ -172,12 +377,13 @@ class StockService:
         """Process stock adjustment for multiple items"""
         
         if location_id is None:
-            location = self.get_main_location(db)
-            location_id = location.id
+            location_id = self.get_main_location_id(db)
         
-        # Generate adjustment number
-        adjustment_count = db.query(StockAdjustment).count() + 1
-        adjustment_number = f"ADJ{adjustment_count:06d}"
+        # Generate adjustment number; a new series continues from the old count-based numbering
+        adjustment_number = document_number_service.next_number(
+            db, None, "stock_adjustment",
+            seed=lambda seed_db: seed_db.query(func.count(StockAdjustment.id)).scalar()
+        )
         
         # Create adjustment header
         adjustment = StockAdjustment(
@@ -192,16 +398,25 @@ class StockService:
         db.add(adjustment)
         db.flush()  # Get adjustment ID
         
+        # Lock the counted records so book quantities cannot move under the count
+        stock_items = self.lock_stock_items(db, [(adj_data['item_id'], location_id) for adj_data in adjustments])
+        book_quantities = {
+            key[0]: stock_item.quantity or Decimal('0') for key, stock_item in stock_items.items()
+        }
+        
         total_adjustment_value = Decimal('0')
+        adjustment_items = []
+        movements = []
         
         for adj_data in adjustments:
             item_id = adj_data['item_id']
             physical_quantity = Decimal(str(adj_data['physical_quantity']))
             unit_cost = Decimal(str(adj_data.get('unit_cost', 0)))
             
-            # Get current stock
-            current_stock = self.get_item_stock(db, item_id, location_id)
+            # Repeated lines for an item count against the stock left by the previous line
+            current_stock = book_quantities[item_id]
             adjustment_qty = physical_quantity - current_stock
+            book_quantities[item_id] = physical_quantity
             
             # Create adjustment item record
             adj_item = StockAdjustmentItem(
@@ -213,27 +428,27 @@ class StockService:
                 unit_cost=unit_cost
             )
             adj_item.calculate_adjustment()
-            
-            db.add(adj_item)
+            adjustment_items.append(adj_item)
             
             # Add stock movement if there's a difference
             if adjustment_qty != 0:
-                movement_type = "adjustment_in" if adjustment_qty > 0 else "adjustment_out"
-                self.add_stock_movement(
-                    db=db,
-                    item_id=item_id,
-                    location_id=location_id,
-                    movement_type=movement_type,
-                    quantity=abs(adjustment_qty),
-                    unit_cost=unit_cost if unit_cost > 0 else None,
-                    reference_type="adjustment",
-                    reference_id=adjustment.id,
-                    reference_number=adjustment_number,
-                    remarks=f"Stock adjustment: {reason}"
-                )
+                movements.append({
+                    'item_id': item_id,
+                    'location_id': location_id,
+                    'movement_type': "adjustment_in" if adjustment_qty > 0 else "adjustment_out",
+                    'quantity': abs(adjustment_qty),
+                    'unit_cost': unit_cost if unit_cost > 0 else None,
+                    'reference_type': "adjustment",
+                    'reference_id': adjustment.id,
+                    'reference_number': adjustment_number,
+                    'remarks': f"Stock adjustment: {reason}"
+                })
             
             total_adjustment_value += adj_item.adjustment_value or Decimal('0')
         
+        db.add_all(adjustment_items)
+        self.post_movements(db, movements, commit=False)
+        
         # Update adjustment totals
         adjustment.total_items = len(adjustments)
         adjustment.total_adjustment_value = total_adjustment_value
@@ -251,8 +466,7 @@ class StockService:
         """Reserve stock for pending orders"""
         
         if location_id is None:
-            location = self.get_main_location(db)
-            location_id = location.id
+            location_id = self.get_main_location_id(db)
         
         stock_item = db.query(StockItem).filter(
             and_(StockItem.item_id == item_id, StockItem.location_id == location_id)
@@ -275,8 +489,7 @@ class StockService:
         """Release reserved stock"""
         
         if location_id is None:
-            location = self.get_main_location(db)
-            location_id = location.id
+            location_id = self.get_main_location_id(db)
         
         stock_item = db.query(StockItem).filter(
             and_(StockItem.item_id == item_id, StockItem.location_id == location_id)
@@ -320,15 +533,31 @@ class StockService:
         
         return query.order_by(StockMovement.movement_date.desc()).limit(limit).all()
     
-    def get_low_stock_items(self, db: Session, location_id: Optional[int] = None) -> List[Dict]:
-        """Get items with stock below minimum level"""
+    def low_stock_query(
+        self,
+        db: Session,
+        location_id: Optional[int] = None,
+        category_id: Optional[int] = None
+    ):
+        """Build the shortage query; thresholds and ordering are evaluated in SQL
         
-        if location_id is None:
-            location = self.get_main_location(db)
-            location_id = location.id
+        Items without a stock record at the location count as zero stock.
+        """
         
-        # Query items with current stock below minimum level
-        query = db.query(Item, StockItem).join(
+        if location_id is None:
+            location_id = self.get_main_location_id(db)
+        
+        current_stock = func.coalesce(StockItem.quantity, 0)
+        shortage = (Item.min_stock_level - current_stock)
+        
+        query = db.query(
+            Item.id.label('item_id'),
+            Item.barcode,
+            Item.name,
+            current_stock.label('current_stock'),
+            Item.min_stock_level,
+            shortage.label('shortage')
+        ).outerjoin(
             StockItem, and_(
                 Item.id == StockItem.item_id,
                 StockItem.location_id == location_id
@@ -337,32 +566,93 @@ class StockService:
             and_(
                 Item.track_inventory == True,
                 Item.status == 'active',
-                StockItem.quantity <= Item.min_stock_level
+                current_stock <= Item.min_stock_level
             )
         )
         
-        low_stock_items = []
-        for item, stock in query.all():
-            low_stock_items.append({
-                'item_id': item.id,
-                'barcode': item.barcode,
-                'name': item.name,
-                'current_stock': stock.quantity,
-                'min_stock_level': item.min_stock_level,
-                'shortage': item.min_stock_level - stock.quantity
-            })
+        if category_id:
+            query = query.filter(Item.category_id == category_id)
         
-        return low_stock_items
+        return query.order_by(shortage.desc(), Item.id)
     
-    def get_stock_valuation(self, db: Session, location_id: Optional[int] = None) -> Dict:
-        """Get stock valuation report"""
+    def iter_low_stock_items(
+        self,
+        db: Session,
+        location_id: Optional[int] = None,
+        category_id: Optional[int] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        batch_size: int = 1000
+    ) -> Iterator[Dict]:
+        """Stream low stock rows, largest shortage first, fetching batch_size rows at a time"""
+        
+        query = self.low_stock_query(db, location_id, category_id).offset(offset)
+        if limit is not None:
+            query = query.limit(limit)
+        
+        for row in query.yield_per(batch_size):
+            yield {
+                'item_id': row.item_id,
+                'barcode': row.barcode,
+                'name': row.name,
+                'current_stock': row.current_stock,
+                'min_stock_level': row.min_stock_level,
+                'shortage': row.shortage
+            }
+    
+    def count_low_stock_items(
+        self,
+        db: Session,
+        location_id: Optional[int] = None,
+        category_id: Optional[int] = None
+    ) -> int:
+        """Count items below minimum level without loading them"""
         
-        if location_id is None:
-            location = self.get_main_location(db)
-            location_id = location.id
+        query = self.low_stock_query(db, location_id, category_id).order_by(None)
+        return query.count()
+    
+    def get_low_stock_items(self, db: Session, location_id: Optional[int] = None) -> List[Dict]:
+        """Get items with stock below minimum level"""
         
-        # Query items with stock
-        query = db.query(Item, StockItem).join(
+        return list(self.iter_low_stock_items(db, location_id))
+    
+    def _unit_cost_expression(self, use_average_cost: bool = True):
+        """Unit cost fallback chain, skipping zero costs like the Python `or` chain did"""
+        
+        costs = [func.nullif(Item.landed_cost, 0), func.nullif(Item.purchase_rate, 0)]
+        if use_average_cost:
+            costs.insert(0, func.nullif(StockItem.average_cost, 0))
+        
+        return func.coalesce(*costs, 0, type_=Numeric(10, 2))
+    
+    def stock_valuation_query(
+        self,
+        db: Session,
+        location_id: Optional[int] = None,
+        category_id: Optional[int] = None,
+        use_average_cost: bool = True
+    ):
+        """Build the valuation query; quantity x cost is computed in SQL"""
+        
+        if location_id is None:
+            location_id = self.get_main_location_id(db)
+        
+        unit_cost = self._unit_cost_expression(use_average_cost)
+        total_value = StockItem.quantity * unit_cost
+        
+        query = db.query(
+            Item.id.label('item_id'),
+            Item.barcode,
+            Item.name,
+            Item.category_id,
+            Item.brand,
+            Item.uom,
+            Item.min_stock_level,
+            StockItem.quantity,
+            StockItem.last_movement_date,
+            unit_cost.label('unit_cost'),
+            total_value.label('total_value')
+        ).join(
             StockItem, and_(
                 Item.id == StockItem.item_id,
                 StockItem.location_id == location_id
@@ -375,31 +665,72 @@ class StockService:
             )
         )
         
-        total_quantity = Decimal('0')
-        total_value = Decimal('0')
-        items_data = []
+        if category_id:
+            query = query.filter(Item.category_id == category_id)
         
-        for item, stock in query.all():
-            unit_cost = stock.average_cost or item.landed_cost or item.purchase_rate or Decimal('0')
-            item_value = stock.quantity * unit_cost
-            
-            items_data.append({
-                'item_id': item.id,
-                'barcode': item.barcode,
-                'name': item.name,
-                'quantity': stock.quantity,
-                'unit_cost': unit_cost,
-                'total_value': item_value
-            })
-            
-            total_quantity += stock.quantity
-            total_value += item_value
+        return query.order_by(total_value.desc(), Item.id)
+    
+    def iter_stock_valuation(
+        self,
+        db: Session,
+        location_id: Optional[int] = None,
+        category_id: Optional[int] = None,
+        use_average_cost: bool = True,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        batch_size: int = 1000
+    ) -> Iterator:
+        """Stream valuation rows, highest value first, fetching batch_size rows at a time"""
+        
+        query = self.stock_valuation_query(
+            db, location_id, category_id, use_average_cost
+        ).offset(offset)
+        if limit is not None:
+            query = query.limit(limit)
+        
+        return query.yield_per(batch_size)
+    
+    def get_stock_valuation_summary(
+        self,
+        db: Session,
+        location_id: Optional[int] = None,
+        category_id: Optional[int] = None,
+        use_average_cost: bool = True
+    ) -> Dict:
+        """Get valuation totals with a single aggregate query"""
+        
+        subquery = self.stock_valuation_query(
+            db, location_id, category_id, use_average_cost
+        ).order_by(None).subquery()
+        
+        total_items, total_quantity, total_value = db.query(
+            func.count(subquery.c.item_id),
+            func.coalesce(func.sum(subquery.c.quantity), 0),
+            func.coalesce(func.sum(subquery.c.total_value), 0)
+        ).one()
+        
+        return {
+            'total_items': total_items,
+            'total_quantity': Decimal(str(total_quantity)),
+            'total_value': Decimal(str(total_value))
+        }
+    
+    def get_stock_valuation(self, db: Session, location_id: Optional[int] = None) -> Dict:
+        """Get stock valuation report"""
+        
+        items_data = [
+            {
+                'item_id': row.item_id,
+                'barcode': row.barcode,
+                'name': row.name,
+                'quantity': row.quantity,
+                'unit_cost': row.unit_cost,
+                'total_value': row.total_value
+            }
+            for row in self.iter_stock_valuation(db, location_id)
+        ]
         
         return {
-            'summary': {
-                'total_items': len(items_data),
-                'total_quantity': total_quantity,
-                'total_value': total_value
-            },
-            'items': sorted(items_data, key=lambda x: x['total_value'], reverse=True)
-        }
\ No newline at end of file
+            'summary': self.get_stock_valuation_summary(db, location_id),
+            'items': items_data
+        }
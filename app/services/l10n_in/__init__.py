@@ -1,6 +1,8 @@
 # Indian Localization Services
 from .gst_service import indian_gst_service
+from .geography_index_service import geography_index_service
 
 __all__ = [
-    "indian_gst_service"
+    "indian_gst_service",
+    "geography_index_service"
 ]
\ No newline at end of file
@@ -0,0 +1,720 @@
+# backend/app/services/l10n_in/geography_index_service.py
+from typing import Optional, List, Dict, Iterable, Tuple, Sequence
+from datetime import datetime
+from pathlib import Path
+import hashlib
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import threading
+import logging
+
+import numpy as np
+import openpyxl
+
+from ...config import settings
+from ...core.constants import INDIAN_STATES
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'PGEOIDX1'
+INDEX_FILE = "geography.idx"
+# Bumped whenever the arrays change; older files are rebuilt from the source
+FORMAT_VERSION = 3
+
+# Names are indexed by their first KEY_WIDTH bytes (normalized UTF-8)
+KEY_WIDTH = 32
+
+# Pincodes are six digits and never start with 0
+PINCODE_BASE = 100000
+PINCODE_SLOTS = 900000
+
+KIND_AREA, KIND_CITY, KIND_STATE = 0, 1, 2
+KIND_NAMES = ('area', 'city', 'state')
+# Ranking tie-breaks: a state outranks a city outranks an area of the same size
+KIND_BONUS = (0.0, 0.5, 1.0)
+
+_SEPARATORS = re.compile(r'[\W_]+', re.UNICODE)
+
+def normalize_name(value) -> str:
+    """Case-folded name with punctuation and repeated spaces collapsed, as indexed"""
+    return _SEPARATORS.sub(' ', str(value or '').casefold()).strip()
+
+def _text(value) -> str:
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ''
+    return str(value).strip()
+
+def _coordinate(value) -> float:
+    try:
+        return float(value) if value not in (None, '') else math.nan
+    except (TypeError, ValueError):
+        return math.nan
+
+# Source workbook headers (matched case-insensitively) for each record field
+SOURCE_COLUMNS = {
+    'pincode': ('pincode', 'pin_code', 'pin', 'postal_code', 'postalcode'),
+    'area_name': ('area_name', 'area', 'officename', 'office_name', 'locality', 'place', 'location'),
+    'city_name': ('city_name', 'city', 'town', 'district', 'districtname'),
+    'state_name': ('state_name', 'statename', 'state', 'province'),
+    'state_code': ('state_code', 'statecode', 'state_id'),
+    'region': ('region', 'zone', 'division'),
+    'latitude': ('latitude', 'lat', 'lat_coord'),
+    'longitude': ('longitude', 'lng', 'lon', 'long', 'lng_coord')
+}
+
+# Names the post office data uses for merged or renamed states
+STATE_ALIASES = {
+    'the dadra and nagar haveli and daman and diu': '26',
+    'dadra and nagar haveli and daman and diu': '26',
+    'orissa': '21',
+    'pondicherry': '34',
+    'uttaranchal': '05'
+}
+
+def read_pincode_workbook(path) -> Iterable[Dict]:
+    """
+    Pincode records from the first sheet of a workbook. States are matched
+    to the GST state list, which fills in the canonical name, code and region.
+    """
+    
+    by_name = {normalize_name(state["name"]): state for state in INDIAN_STATES}
+    by_code = {state["code"]: state for state in INDIAN_STATES}
+    for alias, code in STATE_ALIASES.items():
+        by_name[alias] = by_code[code]
+    
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        headers = [normalize_name(header).replace(' ', '_') for header in next(rows, None) or ()]
+        positions = {}
+        for field, names in SOURCE_COLUMNS.items():
+            position = next((headers.index(name) for name in names if name in headers), None)
+            if position is not None:
+                positions[field] = position
+        if 'pincode' not in positions:
+            raise ValueError(f"No pincode column in {path}")
+        
+        for values in rows:
+            record = {
+                field: values[position] if position < len(values) else None
+                for field, position in positions.items()
+            }
+            state_name = _text(record.get('state_name'))
+            if state_name.upper() in ('NA', 'N/A'):
+                state_name = ''
+            code = _text(record.get('state_code'))
+            if code.endswith('.0'):
+                code = code[:-2]
+            state = by_code.get(code.zfill(2) if code.isdigit() else code) or by_name.get(normalize_name(state_name))
+            if state is not None:
+                record['state_name'] = state["name"]
+                record['state_code'] = state["code"]
+                record['region'] = _text(record.get('region')) or state["region"]
+            else:
+                record['state_name'] = state_name
+            yield record
+    finally:
+        workbook.close()
+
+def _csr(owner: np.ndarray, count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Offsets and members grouping positions by owner id (negative ids are skipped)"""
+    positions = np.flatnonzero(owner >= 0)
+    order = positions[np.argsort(owner[positions], kind='stable')]
+    offsets = np.zeros(count + 1, dtype=np.int32)
+    np.cumsum(np.bincount(owner[positions], minlength=count), out=offsets[1:])
+    return offsets, order.astype(np.int32)
+
+def _distinct_pincodes(pincodes: np.ndarray, offsets: np.ndarray, members: np.ndarray) -> np.ndarray:
+    """Distinct pincodes per group; members are in pincode order within each group"""
+    if not len(members):
+        return np.zeros(len(offsets) - 1, dtype=np.int32)
+    values = pincodes[members]
+    starts = np.zeros(len(members), dtype=np.int32)
+    starts[1:] = values[1:] != values[:-1]
+    starts[offsets[:-1]] = 1
+    return np.add.reduceat(starts, offsets[:-1]).astype(np.int32)
+
+def build_geography_index(records: Iterable[Dict], path, metadata: Optional[Dict] = None) -> Dict:
+    """
+    Compile pincode records (pincode, area_name, city_name, state_name,
+    state_code, region, latitude, longitude) into an index file.
+    Returns the file's header.
+    """
+    
+    rows = {}
+    for record in records:
+        pincode = _text(record.get('pincode'))
+        if pincode.endswith('.0'):
+            pincode = pincode[:-2]
+        if len(pincode) != 6 or not pincode.isdigit() or pincode[0] == '0':
+            continue
+        row = (
+            int(pincode),
+            _text(record.get('state_name')),
+            _text(record.get('city_name')),
+            _text(record.get('area_name')),
+            _text(record.get('state_code')),
+            _text(record.get('region'))
+        )
+        # Repeated rows collapse to one; the first coordinates win
+        rows.setdefault(row, (_coordinate(record.get('latitude')), _coordinate(record.get('longitude'))))
+    
+    ordered = sorted(rows)
+    
+    strings: Dict[str, int] = {'': 0}
+    def string_id(value: str) -> int:
+        return strings.setdefault(value, len(strings))
+    
+    states: Dict[Tuple, int] = {}
+    cities: Dict[Tuple, int] = {}
+    areas: Dict[Tuple, int] = {}
+    state_columns = ([], [], [])
+    city_columns = ([], [])
+    area_columns = ([], [])
+    
+    record_count = len(ordered)
+    rec_pincode = np.empty(record_count, dtype=np.uint32)
+    rec_city = np.empty(record_count, dtype=np.int32)
+    rec_area = np.empty(record_count, dtype=np.int32)
+    rec_lat = np.empty(record_count, dtype=np.float64)
+    rec_lon = np.empty(record_count, dtype=np.float64)
+    
+    for position, row in enumerate(ordered):
+        pincode, state_name, city_name, area_name, state_code, region = row
+        
+        state = states.get((state_name, state_code))
+        if state is None:
+            state = states[(state_name, state_code)] = len(states)
+            state_columns[0].append(string_id(state_name))
+            state_columns[1].append(string_id(state_code))
+            state_columns[2].append(string_id(region))
+        
+        city = cities.get((city_name, state))
+        if city is None:
+            city = cities[(city_name, state)] = len(cities)
+            city_columns[0].append(string_id(city_name))
+            city_columns[1].append(state)
+        
+        area = -1
+        if area_name:
+            area = areas.get((area_name, city))
+            if area is None:
+                area = areas[(area_name, city)] = len(areas)
+                area_columns[0].append(string_id(area_name))
+                area_columns[1].append(city)
+        
+        rec_pincode[position] = pincode
+        rec_city[position] = city
+        rec_area[position] = area
+        rec_lat[position], rec_lon[position] = rows[row]
+    
+    city_state = np.array(city_columns[1], dtype=np.int32)
+    area_city = np.array(area_columns[1], dtype=np.int32)
+    rec_state = city_state[rec_city] if record_count else np.empty(0, dtype=np.int32)
+    
+    # Direct-address table: pincode - PINCODE_BASE -> first record, or -1
+    pin_first = np.full(PINCODE_SLOTS, -1, dtype=np.int32)
+    if record_count:
+        unique, first = np.unique(rec_pincode, return_index=True)
+        pin_first[unique.astype(np.int64) - PINCODE_BASE] = first
+    
+    area_rec_off, area_rec = _csr(rec_area, len(areas))
+    city_rec_off, city_rec = _csr(rec_city, len(cities))
+    state_rec_off, state_rec = _csr(rec_state, len(states))
+    state_city_off, state_city = _csr(city_state, len(states))
+    area_pins = _distinct_pincodes(rec_pincode, area_rec_off, area_rec)
+    city_pins = _distinct_pincodes(rec_pincode, city_rec_off, city_rec)
+    state_pins = _distinct_pincodes(rec_pincode, state_rec_off, state_rec)
+    
+    # Prefix index: every name, and every word-suffix of it ("new delhi" is found by "del")
+    names = {value: key for key, value in strings.items()}
+    entries = []
+    for kind, name_ids, pins in (
+        (KIND_AREA, area_columns[0], area_pins),
+        (KIND_CITY, city_columns[0], city_pins),
+        (KIND_STATE, state_columns[0], state_pins)
+    ):
+        for entity, name_id in enumerate(name_ids):
+            normalized = normalize_name(names[name_id])
+            if not normalized:
+                continue
+            score = math.log1p(int(pins[entity])) + KIND_BONUS[kind]
+            words = normalized.split(' ')
+            for start in range(len(words)):
+                key = ' '.join(words[start:]).encode('utf-8')[:KEY_WIDTH]
+                entries.append((key, -score, kind, entity, 1 if start else 0))
+    entries.sort()
+    
+    string_bytes = [value.encode('utf-8') for value in strings]
+    string_offsets = np.zeros(len(string_bytes) + 1, dtype=np.uint32)
+    np.cumsum([len(value) for value in string_bytes], out=string_offsets[1:])
+    
+    arrays = {
+        'rec_pincode': rec_pincode,
+        'rec_city': rec_city,
+        'rec_area': rec_area,
+        'rec_lat': rec_lat,
+        'rec_lon': rec_lon,
+        'pin_first': pin_first,
+        'state_name': np.array(state_columns[0], dtype=np.int32),
+        'state_code': np.array(state_columns[1], dtype=np.int32),
+        'state_region': np.array(state_columns[2], dtype=np.int32),
+        'city_name': np.array(city_columns[0], dtype=np.int32),
+        'city_state': city_state,
+        'area_name': np.array(area_columns[0], dtype=np.int32),
+        'area_city': area_city,
+        'area_rec_off': area_rec_off,
+        'area_rec': area_rec,
+        'city_rec_off': city_rec_off,
+        'city_rec': city_rec,
+        'state_rec_off': state_rec_off,
+        'state_rec': state_rec,
+        'state_city_off': state_city_off,
+        'state_city': state_city,
+        'area_pins': area_pins,
+        'city_pins': city_pins,
+        'state_pins': state_pins,
+        'key_text': np.array([entry[0] for entry in entries], dtype=f'S{KEY_WIDTH}'),
+        'key_score': np.array([-entry[1] for entry in entries], dtype=np.float32),
+        'key_kind': np.array([entry[2] for entry in entries], dtype=np.uint8),
+        'key_entity': np.array([entry[3] for entry in entries], dtype=np.int32),
+        'key_suffix': np.array([entry[4] for entry in entries], dtype=np.uint8),
+        'string_offsets': string_offsets,
+        'string_data': np.frombuffer(b''.join(string_bytes), dtype=np.uint8)
+    }
+    
+    # Checksum of the array data, as laid out in the file
+    checksum = hashlib.sha256()
+    for array in arrays.values():
+        checksum.update(np.ascontiguousarray(array).tobytes())
+    
+    header = dict(metadata or {})
+    header.update({
+        'format': FORMAT_VERSION,
+        'checksum': checksum.hexdigest(),
+        'built_at': datetime.utcnow().isoformat(),
+        'counts': {
+            'records': record_count,
+            'pincodes': int(np.count_nonzero(pin_first >= 0)),
+            'areas': len(areas),
+            'cities': len(cities),
+            'states': len(states)
+        },
+        'arrays': {}
+    })
+    
+    offset = 0
+    for name, array in arrays.items():
+        header['arrays'][name] = [array.dtype.str, list(array.shape), offset]
+        offset += -(-array.nbytes // 64) * 64
+    
+    header_bytes = json.dumps(header, sort_keys=True).encode('utf-8')
+    data_start = -(-(16 + len(header_bytes)) // 64) * 64
+    
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(temp_path, 'wb') as output:
+        output.write(MAGIC + struct.pack('<Q', len(header_bytes)) + header_bytes)
+        for name, array in arrays.items():
+            output.seek(data_start + header['arrays'][name][2])
+            output.write(np.ascontiguousarray(array).tobytes())
+        output.truncate(data_start + offset)
+    # Readers that already mapped the old file keep their copy
+    os.replace(temp_path, path)
+    
+    return header
+
+def compile_geography_dataset(source, path) -> Dict:
+    """Compile a pincode workbook into an index file; returns the file's header"""
+    
+    source = Path(source)
+    with open(source, 'rb') as workbook:
+        digest = hashlib.sha256(workbook.read()).hexdigest()
+    return build_geography_index(
+        read_pincode_workbook(source), path, {'source': {'file': source.name, 'sha256': digest}}
+    )
+
+class GeographyIndex:
+    """
+    Read-only view of an index file, memory-mapped so every worker on the
+    machine shares the same pages. Records are ordered by pincode; areas,
+    cities and states are ids into column arrays, names into a string pool.
+    """
+    
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as source:
+            self._mmap = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        if self._mmap[:8] != MAGIC:
+            raise ValueError(f"Not a geography index: {self.path}")
+        (length,) = struct.unpack_from('<Q', self._mmap, 8)
+        self.header = json.loads(self._mmap[16:16 + length])
+        if self.header.get('format') != FORMAT_VERSION:
+            raise ValueError(f"Geography index {self.path} is format {self.header.get('format')}, expected {FORMAT_VERSION}")
+        data_start = -(-(16 + length) // 64) * 64
+        
+        for name, (dtype, shape, offset) in self.header['arrays'].items():
+            count = int(np.prod(shape)) if shape else 1
+            array = np.frombuffer(self._mmap, dtype=np.dtype(dtype), count=count, offset=data_start + offset)
+            setattr(self, name, array.reshape(shape))
+        
+        # One- and two-letter queries match the most names, and there are few of them
+        self._short_queries: Dict[Tuple, List[Tuple[int, int]]] = {}
+    
+    @property
+    def counts(self) -> Dict[str, int]:
+        return self.header['counts']
+    
+    def close(self):
+        """Unmap the file; the index and arrays taken from it must not be used afterwards"""
+        
+        for name in self.header['arrays']:
+            self.__dict__.pop(name, None)
+        self._short_queries.clear()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # A caller still holds one of the arrays; the mapping goes when it is released
+            logger.debug(f"Geography index {self.path} still in use, unmapped when released")
+    
+    def verify(self) -> bool:
+        """Whether the array data matches the checksum it was written with"""
+        
+        checksum = hashlib.sha256()
+        # In file order; the header lists them by name
+        for name in sorted(self.header['arrays'], key=lambda name: self.header['arrays'][name][2]):
+            checksum.update(getattr(self, name).tobytes())
+        return checksum.hexdigest() == self.header['checksum']
+    
+    def _string(self, string_id: int) -> str:
+        return bytes(self.string_data[self.string_offsets[string_id]:self.string_offsets[string_id + 1]]).decode('utf-8')
+    
+    def _optional(self, string_id: int) -> Optional[str]:
+        return self._string(string_id) or None
+    
+    def strings(self, string_ids: np.ndarray) -> List[str]:
+        """Pooled strings for a column of string ids (names and codes)"""
+        return [self._string(string_id) for string_id in string_ids.tolist()]
+    
+    def record(self, position: int) -> Dict:
+        """A record as the pincode endpoints return it"""
+        
+        city = int(self.rec_city[position])
+        state = int(self.city_state[city])
+        area = int(self.rec_area[position])
+        latitude = float(self.rec_lat[position])
+        longitude = float(self.rec_lon[position])
+        
+        return {
+            "pincode": f"{int(self.rec_pincode[position]):06d}",
+            "area_name": self._string(int(self.area_name[area])) if area >= 0 else '',
+            "city_name": self._string(int(self.city_name[city])),
+            "state_name": self._string(int(self.state_name[state])),
+            "state_code": self._string(int(self.state_code[state])),
+            "region": self._optional(int(self.state_region[state])),
+            "latitude": None if math.isnan(latitude) else latitude,
+            "longitude": None if math.isnan(longitude) else longitude,
+            "is_active": True
+        }
+    
+    def lookup(self, pincode: str) -> List[Dict]:
+        """Every record of a pincode, by direct addressing"""
+        
+        pincode = (pincode or '').strip()
+        if len(pincode) != 6 or not pincode.isdigit():
+            return []
+        slot = int(pincode) - PINCODE_BASE
+        if slot < 0 or slot >= PINCODE_SLOTS or self.pin_first[slot] < 0:
+            return []
+        
+        first = int(self.pin_first[slot])
+        last = first
+        while last < len(self.rec_pincode) and self.rec_pincode[last] == self.rec_pincode[first]:
+            last += 1
+        return [self.record(position) for position in range(first, last)]
+    
+    def pincode_range(self, prefix: str) -> range:
+        """Record positions whose pincode starts with the given digits"""
+        
+        prefix = prefix.strip()
+        if not prefix.isdigit() or len(prefix) > 6:
+            return range(0)
+        scale = 10 ** (6 - len(prefix))
+        low, high = np.searchsorted(self.rec_pincode, [int(prefix) * scale, (int(prefix) + 1) * scale])
+        return range(int(low), int(high))
+    
+    def _key_range(self, key: bytes) -> Tuple[int, int]:
+        low = int(np.searchsorted(self.key_text, key, 'left'))
+        if len(key) >= KEY_WIDTH:
+            return low, int(np.searchsorted(self.key_text, key, 'right'))
+        # 0xff never occurs in UTF-8, so it sorts after every continuation of the prefix
+        return low, int(np.searchsorted(self.key_text, key + b'\xff', 'left'))
+    
+    def ranked(self, query: str, kinds: Optional[Sequence[int]] = None, limit: int = 10) -> List[Tuple[int, int]]:
+        """
+        (kind, entity) pairs whose name, or a word in it, starts with the query.
+        Exact names come first, then names that start with the query, each by size.
+        """
+        
+        normalized = normalize_name(query)
+        if not normalized or limit <= 0:
+            return []
+        
+        if len(normalized) <= 2:
+            cache_key = (normalized, tuple(kinds) if kinds is not None else None, limit)
+            found = self._short_queries.get(cache_key)
+            if found is None:
+                found = self._short_queries[cache_key] = self._ranked(normalized, kinds, limit)
+            return list(found)
+        return self._ranked(normalized, kinds, limit)
+    
+    def _ranked(self, normalized: str, kinds: Optional[Sequence[int]], limit: int) -> List[Tuple[int, int]]:
+        key = normalized.encode('utf-8')[:KEY_WIDTH]
+        low, high = self._key_range(key)
+        if low >= high:
+            return []
+        
+        score = self.key_score[low:high] - self.key_suffix[low:high].astype(np.float32)
+        score = score + (self.key_text[low:high] == key) * np.float32(10)
+        if kinds is not None:
+            score = np.where(np.isin(self.key_kind[low:high], list(kinds)), score, -np.inf)
+        
+        # Names can repeat as word-suffixes, so take a few extra before removing duplicates
+        take = min(high - low, limit * 3)
+        top = np.argpartition(-score, take - 1)[:take] if take < high - low else np.arange(high - low)
+        top = top[np.argsort(-score[top], kind='stable')]
+        
+        long_query = len(normalized.encode('utf-8')) > KEY_WIDTH
+        found = []
+        seen = set()
+        for position in top:
+            if score[position] == -np.inf:
+                break
+            match = (int(self.key_kind[low + position]), int(self.key_entity[low + position]))
+            if match in seen:
+                continue
+            seen.add(match)
+            # Keys are truncated, so long queries are checked against the full name
+            if long_query and f" {normalized}" not in f" {normalize_name(self.entity_name(*match))}":
+                continue
+            found.append(match)
+            if len(found) >= limit:
+                break
+        return found
+    
+    def entity_name(self, kind: int, entity: int) -> str:
+        names = (self.area_name, self.city_name, self.state_name)[kind]
+        return self._string(int(names[entity]))
+    
+    def entity_records(self, kind: int, entity: int) -> np.ndarray:
+        offsets, members = (
+            (self.area_rec_off, self.area_rec),
+            (self.city_rec_off, self.city_rec),
+            (self.state_rec_off, self.state_rec)
+        )[kind]
+        return members[offsets[entity]:offsets[entity + 1]]
+    
+    def entity(self, kind: int, entity: int) -> Dict:
+        """An area, city or state as an autocomplete suggestion"""
+        
+        records = self.entity_records(kind, entity)
+        first = self.record(int(records[0])) if len(records) else {}
+        area_name = self.entity_name(KIND_AREA, entity) if kind == KIND_AREA else None
+        city_name = first.get("city_name") if kind != KIND_STATE else None
+        state_name = first.get("state_name", self.entity_name(kind, entity) if kind == KIND_STATE else None)
+        
+        label = ", ".join(part for part in (area_name, city_name, state_name) if part)
+        return {
+            "type": KIND_NAMES[kind],
+            "label": label,
+            "area_name": area_name,
+            "city_name": city_name,
+            "state_name": state_name,
+            "state_code": first.get("state_code"),
+            "pincode": first.get("pincode") if kind == KIND_AREA else None,
+            "pincode_count": int((self.area_pins, self.city_pins, self.state_pins)[kind][entity])
+        }
+    
+    def autocomplete(self, query: str, limit: int = 10, kinds: Optional[Sequence[str]] = None) -> List[Dict]:
+        """Ranked suggestions: pincodes for digits, otherwise areas, cities and states"""
+        
+        query = (query or '').strip()
+        if query.isdigit():
+            suggestions = []
+            previous = None
+            for position in self.pincode_range(query):
+                if self.rec_pincode[position] == previous:
+                    continue
+                previous = self.rec_pincode[position]
+                record = self.record(position)
+                label = ", ".join(part for part in (record["area_name"], record["city_name"], record["state_name"]) if part)
+                suggestions.append({
+                    "type": "pincode",
+                    "label": f"{record['pincode']} - {label}" if label else record['pincode'],
+                    "area_name": record["area_name"] or None,
+                    "city_name": record["city_name"],
+                    "state_name": record["state_name"],
+                    "state_code": record["state_code"],
+                    "pincode": record["pincode"],
+                    "pincode_count": 1
+                })
+                if len(suggestions) >= limit:
+                    break
+            return suggestions
+        
+        kind_ids = [KIND_NAMES.index(kind) for kind in kinds] if kinds else None
+        return [self.entity(kind, entity) for kind, entity in self.ranked(query, kind_ids, limit)]
+    
+    def search(self, query: str, search_type: str = "all", limit: int = 20) -> List[Dict]:
+        """Records matching a pincode prefix, or in the best matching areas, cities or states"""
+        
+        query = (query or '').strip()
+        if search_type == "pincode" or (search_type == "all" and query.isdigit()):
+            positions = self.pincode_range(query)
+            return [self.record(position) for position in positions[:limit]]
+        
+        kinds = None if search_type == "all" else [KIND_NAMES.index(search_type)]
+        results = []
+        for kind, entity in self.ranked(query, kinds, limit):
+            for position in self.entity_records(kind, entity)[:limit - len(results)]:
+                results.append(self.record(int(position)))
+            if len(results) >= limit:
+                break
+        return results
+    
+    def find(self, kind: int, name: str, within: Optional[str] = None, limit: int = 1) -> List[int]:
+        """Best matching entities of a kind, optionally only those whose parent names match `within`"""
+        
+        wanted = normalize_name(within) if within else None
+        matches = []
+        for _, entity in self.ranked(name, [kind], limit if wanted is None else limit * 20):
+            if wanted is not None:
+                if kind == KIND_CITY:
+                    parent = self._string(int(self.state_name[self.city_state[entity]]))
+                else:
+                    parent = self._string(int(self.city_name[self.area_city[entity]]))
+                if wanted not in normalize_name(parent):
+                    continue
+            matches.append(entity)
+            if len(matches) >= limit:
+                break
+        return matches
+    
+    def city(self, city: int) -> Dict:
+        state = int(self.city_state[city])
+        pincodes = np.unique(self.rec_pincode[self.entity_records(KIND_CITY, city)])
+        return {
+            "city_name": self._string(int(self.city_name[city])),
+            "state_name": self._string(int(self.state_name[state])),
+            "state_code": self._string(int(self.state_code[state])),
+            "region": self._optional(int(self.state_region[state])),
+            "pincodes": [f"{int(pincode):06d}" for pincode in pincodes]
+        }
+    
+    def state(self, state: int) -> Dict:
+        cities = self.state_city[self.state_city_off[state]:self.state_city_off[state + 1]]
+        pincodes = np.unique(self.rec_pincode[self.entity_records(KIND_STATE, state)])
+        return {
+            "state_name": self._string(int(self.state_name[state])),
+            "state_code": self._string(int(self.state_code[state])),
+            "region": self._optional(int(self.state_region[state])),
+            "cities": sorted({self._string(int(self.city_name[city])) for city in cities}),
+            "pincodes": [f"{int(pincode):06d}" for pincode in pincodes]
+        }
+    
+    def area(self, area: int) -> Dict:
+        record = self.record(int(self.entity_records(KIND_AREA, area)[0]))
+        return {
+            key: record[key]
+            for key in ("area_name", "city_name", "state_name", "state_code", "pincode", "latitude", "longitude")
+        }
+    
+    def nearby(self, latitude: float, longitude: float, radius_km: float, limit: int = 20) -> List[Dict]:
+        """Records within radius_km of a point, nearest first"""
+        
+        lat = np.radians(self.rec_lat)
+        lon = np.radians(self.rec_lon)
+        origin_lat, origin_lon = math.radians(latitude), math.radians(longitude)
+        
+        # Haversine distance
+        a = np.sin((lat - origin_lat) / 2) ** 2 + math.cos(origin_lat) * np.cos(lat) * np.sin((lon - origin_lon) / 2) ** 2
+        distance = 2 * 6371 * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+        
+        within = np.flatnonzero(distance <= radius_km)
+        nearest = within[np.argsort(distance[within], kind='stable')][:limit]
+        return [self.record(int(position)) for position in nearest]
+
+class GeographyIndexService:
+    """
+    Opens the geography index on first use and keeps it mapped.
+    
+    The index is the compiled pincode workbook. Requests only map it:
+    process_pincode_excel.py compiles it, and reload() maps the new file.
+    An index older than its workbook is still served, with a warning.
+    """
+    
+    def __init__(self):
+        self.index_path = Path(settings.geography_data_dir) / INDEX_FILE
+        self.source_path = Path(settings.geography_source_file)
+        self._index: Optional[GeographyIndex] = None
+        self._lock = threading.Lock()
+    
+    def get_index(self) -> Optional[GeographyIndex]:
+        """The open index, or None when there is no geography data"""
+        
+        index = self._index
+        if index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = self._open()
+                index = self._index
+        return index
+    
+    def reload(self) -> Optional[GeographyIndex]:
+        """
+        Map the index file again, e.g. after it was rebuilt. Requests already
+        holding the old index keep using it; its mapping is released when
+        the last of them drops it.
+        """
+        
+        with self._lock:
+            self._index = self._open()
+            return self._index
+    
+    def build(self, verify: bool = True) -> Dict:
+        """Compile the index from the source workbook"""
+        
+        header = compile_geography_dataset(self.source_path, self.index_path)
+        if verify and not GeographyIndex(self.index_path).verify():
+            raise ValueError(f"Geography index {self.index_path} failed its checksum")
+        logger.info(f"Built geography index {header['checksum'][:12]}: {header['counts']}")
+        return header
+    
+    def _open(self) -> Optional[GeographyIndex]:
+        if not self.index_path.exists():
+            logger.warning(f"No geography index at {self.index_path}; run process_pincode_excel.py to build it")
+            return None
+        
+        try:
+            index = GeographyIndex(self.index_path)
+        except ValueError as e:
+            logger.warning(f"{e}; run process_pincode_excel.py to rebuild it")
+            return None
+        
+        if self.source_path.exists() and self.source_path.stat().st_mtime > self.index_path.stat().st_mtime:
+            logger.warning(
+                f"Geography index {self.index_path} is older than {self.source_path}; "
+                "run process_pincode_excel.py to rebuild it"
+            )
+        
+        logger.info(f"Geography index loaded: {index.counts['pincodes']} pincodes")
+        return index
+
+# Global service instance
+geography_index_service = GeographyIndexService()
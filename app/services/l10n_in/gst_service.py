@@ -12,6 +12,7 @@ from ...models.l10n_in import (
 from ...models.core import Company
 from ...models.sales import SalesInvoice, SalesInvoiceItem
 from ...models.purchase import PurchaseInvoice, PurchaseInvoiceItem
+from ..core.gst_tax_engine import gst_tax_engine, gst_context_cache
 
 logger = logging.getLogger(__name__)
 
@@ -40,37 +41,23 @@ class IndianGSTService:
                 db, company_id, supplier_state_code, recipient_state_code
             )
             
-            # Calculate GST components
-            if place_of_supply == PlaceOfSupplyType.INTRA_STATE:
-                # Intra-state: CGST + SGST
-                cgst_rate = gst_rate / 2
-                sgst_rate = gst_rate / 2
-                cgst_amount = (taxable_amount * cgst_rate) / 100
-                sgst_amount = (taxable_amount * sgst_rate) / 100
-                igst_amount = Decimal('0')
-                
-            elif place_of_supply == PlaceOfSupplyType.INTER_STATE:
-                # Inter-state: IGST
-                cgst_rate = Decimal('0')
-                sgst_rate = Decimal('0')
-                cgst_amount = Decimal('0')
-                sgst_amount = Decimal('0')
-                igst_amount = (taxable_amount * gst_rate) / 100
-                
-            else:
-                # Export/Import: IGST
-                cgst_rate = Decimal('0')
-                sgst_rate = Decimal('0')
-                cgst_amount = Decimal('0')
-                sgst_amount = Decimal('0')
-                igst_amount = (taxable_amount * gst_rate) / 100
+            # CESS rate from the company's cached HSN/SAC rates
+            cess_rate = gst_context_cache.get(db, company_id).cess_rate(hsn_code, sac_code)
             
-            # Calculate CESS if applicable
-            cess_rate, cess_amount = self._calculate_cess(
-                db, company_id, hsn_code, sac_code, taxable_amount
-            )
+            # Export/Import are taxed as IGST, like inter-state supplies
+            line = gst_tax_engine.compute(
+                [taxable_amount], [gst_rate], [cess_rate],
+                interstate=(place_of_supply != PlaceOfSupplyType.INTRA_STATE)
+            ).line(0)
+            
+            cgst_rate = line["cgst_rate"]
+            sgst_rate = line["sgst_rate"]
+            cgst_amount = line["cgst_amount"]
+            sgst_amount = line["sgst_amount"]
+            igst_amount = line["igst_amount"]
+            cess_amount = line["cess_amount"]
             
-            total_gst_amount = cgst_amount + sgst_amount + igst_amount + cess_amount
+            total_gst_amount = line["total_gst_amount"]
             total_amount = taxable_amount + total_gst_amount
             
             return {
@@ -117,32 +104,12 @@ class IndianGSTService:
     ) -> tuple[Decimal, Decimal]:
         """Calculate CESS based on HSN/SAC codes"""
         
-        cess_rate = Decimal('0')
-        cess_amount = Decimal('0')
-        
-        if hsn_code:
-            hsn_record = db.query(HSNCode).filter(
-                HSNCode.code == hsn_code,
-                HSNCode.company_id == company_id,
-                HSNCode.is_active == True
-            ).first()
-            
-            if hsn_record and hsn_record.cess_rate:
-                cess_rate = hsn_record.cess_rate
-                cess_amount = (taxable_amount * cess_rate) / 100
-        
-        elif sac_code:
-            sac_record = db.query(SACCode).filter(
-                SACCode.code == sac_code,
-                SACCode.company_id == company_id,
-                SACCode.is_active == True
-            ).first()
-            
-            if sac_record and sac_record.cess_rate:
-                cess_rate = sac_record.cess_rate
-                cess_amount = (taxable_amount * cess_rate) / 100
+        cess_rate = gst_context_cache.get(db, company_id).cess_rate(hsn_code, sac_code)
+        if not cess_rate:
+            return Decimal('0'), Decimal('0')
         
-        return cess_rate, cess_amount
+        line = gst_tax_engine.compute([taxable_amount], [0], [cess_rate]).line(0)
+        return cess_rate, line["cess_amount"]
     
     def get_gst_slabs(self, db: Session, company_id: int) -> List[Dict]:
         """Get all GST slabs for a company"""
@@ -1,10 +1,10 @@
 # backend/app/services/pos/pos_discount_service.py
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc, asc
-from typing import Optional, List, Dict, Tuple
+from sqlalchemy import or_
+from typing import Optional, List, Dict, Callable
 from decimal import Decimal
 from datetime import datetime, date
-import json
+import operator
 import logging
 
 from ...models.pos.pos_discount_integration import (
@@ -13,12 +13,14 @@ from ...models.pos.pos_discount_integration import (
     POSDiscountAnalytics, POSDiscountConfiguration, POSDiscountAudit
 )
 from ...models.core.discount_management import (
-    DiscountRule, DiscountCoupon, DiscountTier, CustomerDiscount,
+    DiscountType, DiscountRule, DiscountCoupon, DiscountTier, CustomerDiscount,
     DiscountApplication, CouponUsage
 )
 from ...models.customers import Customer
 from ...models.inventory import Item
 from ...models.loyalty import LoyaltyProgram
+from ...core.model_cache import ModelCache
+from ...config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -26,8 +28,7 @@ class POSDiscountService:
     """Service class for POS discount calculations and management"""
     
     def __init__(self):
-        self.discount_cache = {}
-        self.rule_engine = DiscountRuleEngine()
+        self.rule_engine = discount_rule_engine
     
     def calculate_transaction_discounts(
         self, 
@@ -40,8 +41,9 @@ class POSDiscountService:
         
         try:
             # Get base transaction data
-            subtotal = transaction_data.get('subtotal', 0)
+            subtotal = Decimal(str(transaction_data.get('subtotal', 0)))
             items = transaction_data.get('items', [])
+            company_id = transaction_data.get('company_id')
             
             # Initialize discount calculation
             calculation_result = {
@@ -55,7 +57,7 @@ class POSDiscountService:
             
             # 1. Get customer information and benefits
             if customer_id:
-                customer_benefits = self.get_customer_benefits(db, customer_id, subtotal)
+                customer_benefits = self.get_customer_benefits(db, customer_id, subtotal, company_id)
                 calculation_result['customer_benefits'] = customer_benefits
                 
                 # Add customer-specific discounts
@@ -63,20 +65,20 @@ class POSDiscountService:
                     calculation_result['discounts'].extend(customer_benefits['discounts'])
             
             # 2. Get item-based discounts
-            item_discounts = self.get_item_discounts(db, items, store_id)
+            item_discounts = self.get_item_discounts(db, items, store_id, company_id)
             calculation_result['discounts'].extend(item_discounts)
             
             # 3. Get order-level discounts
-            order_discounts = self.get_order_discounts(db, subtotal, store_id)
+            order_discounts = self.get_order_discounts(db, subtotal, store_id, company_id)
             calculation_result['discounts'].extend(order_discounts)
             
             # 4. Get available coupons
-            available_coupons = self.get_available_coupons(db, customer_id, subtotal)
+            available_coupons = self.get_available_coupons(db, customer_id, subtotal, company_id)
             calculation_result['available_coupons'] = available_coupons
             
             # 5. Get loyalty program benefits
             if customer_id:
-                loyalty_benefits = self.get_loyalty_benefits(db, customer_id, subtotal)
+                loyalty_benefits = self.get_loyalty_benefits(db, customer_id, subtotal, company_id)
                 calculation_result['loyalty_points'] = loyalty_benefits.get('points_earned', 0)
                 if loyalty_benefits.get('discounts'):
                     calculation_result['discounts'].extend(loyalty_benefits['discounts'])
@@ -97,7 +99,8 @@ class POSDiscountService:
         self, 
         db: Session, 
         customer_id: int, 
-        order_amount: Decimal
+        order_amount: Decimal,
+        company_id: Optional[int] = None
     ) -> Dict:
         """Get customer-specific benefits and discounts"""
         
@@ -111,37 +114,32 @@ class POSDiscountService:
                 'customer': customer,
                 'discounts': [],
                 'loyalty_points': 0,
-                'customer_tier': None
+                'customer_tier': customer.customer_type
             }
             
-            # Get customer-specific discounts
-            customer_discounts = db.query(CustomerDiscount).filter(
-                CustomerDiscount.customer_id == customer_id,
-                CustomerDiscount.is_active == True,
-                CustomerDiscount.start_date <= date.today(),
-                or_(
-                    CustomerDiscount.end_date.is_(None),
-                    CustomerDiscount.end_date >= date.today()
-                )
-            ).all()
+            rules = self.rule_engine.get_rules(db, company_id)
+            order_amount = Decimal(str(order_amount))
             
-            for discount in customer_discounts:
+            # Customer-specific discounts and rules
+            for discount in rules.customer_discounts.get(customer_id, ()):
                 if self.check_discount_conditions(discount, order_amount):
                     benefits['discounts'].append({
                         'type': 'customer_specific',
-                        'name': f"Customer Discount - {discount.discount_type.name}",
-                        'value': discount.discount_value,
-                        'percentage': discount.discount_percentage,
-                        'max_amount': discount.max_discount_amount,
-                        'min_order': discount.min_order_amount
+                        'name': discount.name,
+                        'value': discount.amount_for(order_amount),
+                        'percentage': discount.percentage,
+                        'max_amount': discount.max_amount,
+                        'min_order': discount.min_order,
+                        'priority': discount.priority
                     })
             
-            # Get customer tier and benefits
-            if hasattr(customer, 'customer_tier'):
-                benefits['customer_tier'] = customer.customer_tier
-                
-                # Get tier-specific discounts
-                tier_discounts = self.get_tier_discounts(db, customer.customer_tier, order_amount)
+            for rule in rules.customer_rules.get(customer_id, ()):
+                if rule.matches(amount=order_amount):
+                    benefits['discounts'].append(rule.as_discount('customer_rule', order_amount))
+            
+            # Get tier-specific discounts
+            if customer.customer_type:
+                tier_discounts = self.get_tier_discounts(db, customer.customer_type, order_amount, company_id)
                 benefits['discounts'].extend(tier_discounts)
             
             return benefits
@@ -154,49 +152,25 @@ class POSDiscountService:
         self, 
         db: Session, 
         items: List[Dict], 
-        store_id: Optional[int] = None
+        store_id: Optional[int] = None,
+        company_id: Optional[int] = None
     ) -> List[Dict]:
-        """Get item-based discounts"""
-        
-        discounts = []
+        """Get item, category and quantity tier discounts for every cart line in one pass"""
         
         try:
-            for item in items:
-                item_id = item.get('item_id')
-                quantity = item.get('quantity', 0)
-                unit_price = item.get('unit_price', 0)
-                
-                # Get item-specific discount rules
-                item_rules = db.query(DiscountRule).filter(
-                    DiscountRule.rule_type == 'item',
-                    DiscountRule.target_id == item_id,
-                    DiscountRule.is_active == True,
-                    DiscountRule.start_date <= date.today(),
-                    or_(
-                        DiscountRule.end_date.is_(None),
-                        DiscountRule.end_date >= date.today()
+            rules = self.rule_engine.get_rules(db, company_id)
+            
+            # Category rules need each line's category; resolve the missing ones in one query
+            item_categories = {}
+            if rules.category_rules:
+                missing = {item.get('item_id') for item in items if item.get('category_id') is None}
+                missing.discard(None)
+                if missing:
+                    item_categories = dict(
+                        db.query(Item.id, Item.category_id).filter(Item.id.in_(missing)).all()
                     )
-                ).all()
-                
-                for rule in item_rules:
-                    if self.check_rule_conditions(rule, quantity, unit_price):
-                        discount_amount = self.calculate_discount_amount(rule, quantity * unit_price)
-                        if discount_amount > 0:
-                            discounts.append({
-                                'type': 'item_rule',
-                                'rule_id': rule.id,
-                                'name': rule.rule_name,
-                                'item_id': item_id,
-                                'value': discount_amount,
-                                'percentage': rule.discount_percentage,
-                                'priority': rule.priority
-                            })
-                
-                # Get quantity-based tier discounts
-                tier_discounts = self.get_quantity_tier_discounts(db, item_id, quantity)
-                discounts.extend(tier_discounts)
             
-            return discounts
+            return self.rule_engine.evaluate_cart(rules, items, item_categories)
             
         except Exception as e:
             logger.error(f"Error getting item discounts: {str(e)}")
@@ -206,38 +180,22 @@ class POSDiscountService:
         self, 
         db: Session, 
         order_amount: Decimal, 
-        store_id: Optional[int] = None
+        store_id: Optional[int] = None,
+        company_id: Optional[int] = None
     ) -> List[Dict]:
         """Get order-level discounts"""
         
-        discounts = []
-        
         try:
-            # Get order amount-based discount rules
-            order_rules = db.query(DiscountRule).filter(
-                DiscountRule.rule_type == 'order',
-                DiscountRule.is_active == True,
-                DiscountRule.start_date <= date.today(),
-                or_(
-                    DiscountRule.end_date.is_(None),
-                    DiscountRule.end_date >= date.today()
-                )
-            ).all()
+            rules = self.rule_engine.get_rules(db, company_id)
+            order_amount = Decimal(str(order_amount))
             
-            for rule in order_rules:
-                if self.check_rule_conditions(rule, order_amount):
-                    discount_amount = self.calculate_discount_amount(rule, order_amount)
-                    if discount_amount > 0:
-                        discounts.append({
-                            'type': 'order_rule',
-                            'rule_id': rule.id,
-                            'name': rule.rule_name,
-                            'value': discount_amount,
-                            'percentage': rule.discount_percentage,
-                            'priority': rule.priority
-                        })
-            
-            return discounts
+            return [
+                discount for discount in (
+                    rule.as_discount('order_rule', order_amount)
+                    for rule in rules.order_rules if rule.matches(amount=order_amount)
+                )
+                if discount['value'] > 0
+            ]
             
         except Exception as e:
             logger.error(f"Error getting order discounts: {str(e)}")
@@ -247,70 +205,48 @@ class POSDiscountService:
         self, 
         db: Session, 
         customer_id: Optional[int], 
-        order_amount: Decimal
+        order_amount: Decimal,
+        company_id: Optional[int] = None
     ) -> List[Dict]:
         """Get available coupons for the transaction"""
         
-        coupons = []
-        
         try:
-            # Get active coupons
-            query = db.query(DiscountCoupon).filter(
-                DiscountCoupon.is_active == True,
-                DiscountCoupon.start_date <= date.today(),
-                or_(
-                    DiscountCoupon.end_date.is_(None),
-                    DiscountCoupon.end_date >= date.today()
-                )
-            )
-            
-            # Filter by customer if specified
-            if customer_id:
-                query = query.filter(
-                    or_(
-                        DiscountCoupon.customer_id.is_(None),
-                        DiscountCoupon.customer_id == customer_id
-                    )
-                )
-            
-            # Filter by minimum order amount
-            query = query.filter(
-                or_(
-                    DiscountCoupon.min_order_amount.is_(None),
-                    DiscountCoupon.min_order_amount <= order_amount
-                )
-            )
-            
-            active_coupons = query.all()
-            
-            for coupon in active_coupons:
-                # Check usage limits
-                if coupon.max_usage_count and coupon.current_usage_count >= coupon.max_usage_count:
-                    continue
-                
-                # Check if single-use and already used by customer
-                if coupon.is_single_use and customer_id:
-                    existing_usage = db.query(CouponUsage).filter(
-                        CouponUsage.coupon_id == coupon.id,
+            rules = self.rule_engine.get_rules(db, company_id)
+            order_amount = Decimal(str(order_amount))
+            
+            candidates = [
+                coupon for coupon in rules.coupons
+                if (coupon.customer_id is None or coupon.customer_id == customer_id)
+                and (coupon.min_order is None or coupon.min_order <= order_amount)
+                and not (coupon.max_usage and coupon.usage_count >= coupon.max_usage)
+            ]
+            
+            # Single-use coupons this customer already redeemed, in one query
+            used = set()
+            single_use_ids = [coupon.id for coupon in candidates if coupon.is_single_use]
+            if customer_id and single_use_ids:
+                used = {
+                    coupon_id for coupon_id, in db.query(CouponUsage.coupon_id).filter(
+                        CouponUsage.coupon_id.in_(single_use_ids),
                         CouponUsage.customer_id == customer_id
-                    ).first()
-                    if existing_usage:
-                        continue
-                
-                coupons.append({
+                    ).distinct()
+                }
+            
+            return [
+                {
                     'id': coupon.id,
-                    'code': coupon.coupon_code,
-                    'name': coupon.coupon_name,
+                    'code': coupon.code,
+                    'name': coupon.name,
                     'description': coupon.description,
-                    'value': coupon.discount_value,
-                    'percentage': coupon.discount_percentage,
-                    'max_amount': coupon.max_discount_amount,
-                    'min_order': coupon.min_order_amount,
-                    'usage_count': coupon.current_usage_count,
-                    'max_usage': coupon.max_usage_count
-                })
-            
-            return coupons
+                    'value': coupon.value,
+                    'percentage': coupon.percentage,
+                    'max_amount': coupon.max_amount,
+                    'min_order': coupon.min_order,
+                    'usage_count': coupon.usage_count,
+                    'max_usage': coupon.max_usage
+                }
+                for coupon in candidates if coupon.id not in used
+            ]
             
         except Exception as e:
             logger.error(f"Error getting available coupons: {str(e)}")
@@ -320,7 +256,8 @@ class POSDiscountService:
         self, 
         db: Session, 
         customer_id: int, 
-        order_amount: Decimal
+        order_amount: Decimal,
+        company_id: Optional[int] = None
     ) -> Dict:
         """Get loyalty program benefits"""
         
@@ -344,7 +281,7 @@ class POSDiscountService:
             benefits['points_earned'] = points_earned
             
             # Get loyalty-based discounts
-            loyalty_discounts = self.get_loyalty_discounts(db, customer_id, order_amount)
+            loyalty_discounts = self.get_loyalty_discounts(db, customer_id, order_amount, company_id)
             benefits['discounts'] = loyalty_discounts
             
             return benefits
@@ -353,6 +290,42 @@ class POSDiscountService:
             logger.error(f"Error getting loyalty benefits: {str(e)}")
             return benefits
     
+    def get_tier_discounts(
+        self,
+        db: Session,
+        customer_type: str,
+        order_amount: Decimal,
+        company_id: Optional[int] = None
+    ) -> List[Dict]:
+        """Get discounts for a customer type (retail, wholesale, corporate)"""
+        
+        rules = self.rule_engine.get_rules(db, company_id)
+        order_amount = Decimal(str(order_amount))
+        
+        return [
+            rule.as_discount('customer_tier', order_amount)
+            for rule in rules.customer_type_rules.get(customer_type, ())
+            if rule.matches(amount=order_amount)
+        ]
+    
+    def get_loyalty_discounts(
+        self,
+        db: Session,
+        customer_id: int,
+        order_amount: Decimal,
+        company_id: Optional[int] = None
+    ) -> List[Dict]:
+        """Get loyalty rule discounts for a loyalty member's order"""
+        
+        rules = self.rule_engine.get_rules(db, company_id)
+        order_amount = Decimal(str(order_amount))
+        
+        return [
+            rule.as_discount('loyalty_rule', order_amount)
+            for rule in rules.loyalty_rules
+            if rule.matches(amount=order_amount)
+        ]
+    
     def apply_discount_priority(self, calculation_result: Dict) -> Dict:
         """Apply discount priority and calculate final amounts"""
         
@@ -547,65 +520,305 @@ class POSDiscountService:
         except Exception as e:
             logger.error(f"Error saving discount calculation: {str(e)}")
     
-    def check_rule_conditions(
-        self, 
-        rule: DiscountRule, 
-        value: Decimal, 
-        additional_value: Optional[Decimal] = None
-    ) -> bool:
-        """Check if rule conditions are met"""
-        
-        try:
-            if rule.condition_type == 'quantity':
-                return self.compare_values(value, rule.condition_value, rule.condition_operator)
-            elif rule.condition_type == 'amount':
-                return self.compare_values(value, rule.condition_value, rule.condition_operator)
-            elif rule.condition_type == 'date':
-                return rule.start_date <= date.today() and (not rule.end_date or rule.end_date >= date.today())
-            
-            return True
-            
-        except Exception as e:
-            logger.error(f"Error checking rule conditions: {str(e)}")
-            return False
+    def check_discount_conditions(self, discount: "CompiledDiscount", order_amount: Decimal) -> bool:
+        """Check a customer discount's minimum order amount"""
+        return discount.min_order is None or order_amount >= discount.min_order
+
+_OPERATORS = {
+    '>=': operator.ge,
+    '<=': operator.le,
+    '>': operator.gt,
+    '<': operator.lt,
+    '=': operator.eq
+}
+
+def _compile_condition(condition_type: Optional[str], operator_symbol: Optional[str], condition_value) -> Optional[Callable]:
+    """Resolve a rule condition to a predicate once, instead of per evaluation"""
+    if condition_type not in ('quantity', 'amount'):
+        # Date conditions are covered by the validity window; others always pass
+        return None
     
-    def compare_values(self, value1: Decimal, value2: Decimal, operator: str) -> bool:
-        """Compare two values with given operator"""
-        
-        if operator == '>=':
-            return value1 >= value2
-        elif operator == '<=':
-            return value1 <= value2
-        elif operator == '>':
-            return value1 > value2
-        elif operator == '<':
-            return value1 < value2
-        elif operator == '=':
-            return value1 == value2
-        else:
-            return False
+    compare = _OPERATORS.get(operator_symbol)
+    if compare is None or condition_value is None:
+        return lambda value: False
     
-    def calculate_discount_amount(self, rule: DiscountRule, amount: Decimal) -> Decimal:
-        """Calculate discount amount for rule"""
-        
-        if rule.discount_percentage:
-            discount_amount = amount * (rule.discount_percentage / 100)
+    threshold = Decimal(str(condition_value))
+    return lambda value: compare(value, threshold)
+
+# Customer type conditions store the type by its position in Customer.customer_type
+CUSTOMER_TYPE_CODES = {1: 'retail', 2: 'wholesale', 3: 'corporate'}
+
+def _customer_type_for(condition_value) -> Optional[str]:
+    """Customer type named by a rule's condition value, as a type code or the type itself"""
+    if condition_value is None:
+        return None
+    if isinstance(condition_value, str) and not condition_value.strip().isdigit():
+        return condition_value.strip().lower() or None
+    return CUSTOMER_TYPE_CODES.get(int(Decimal(str(condition_value))))
+
+class CompiledDiscount:
+    """A discount rule, quantity tier or customer discount reduced to what evaluation needs"""
+    
+    __slots__ = (
+        "id", "name", "condition_type", "condition", "percentage", "value",
+        "max_amount", "min_order", "priority"
+    )
+    
+    def __init__(self, id: int, name: str, condition_type: Optional[str] = None, condition: Optional[Callable] = None,
+                 percentage=None, value=None, max_amount=None, min_order=None, priority: int = 0):
+        self.id = id
+        self.name = name
+        self.condition_type = condition_type
+        self.condition = condition
+        self.percentage = percentage
+        self.value = value
+        self.max_amount = max_amount
+        self.min_order = min_order
+        self.priority = priority or 0
+    
+    @classmethod
+    def from_rule(cls, rule: DiscountRule) -> "CompiledDiscount":
+        return cls(
+            id=rule.id,
+            name=rule.rule_name,
+            condition_type=rule.condition_type,
+            condition=_compile_condition(rule.condition_type, rule.condition_operator, rule.condition_value),
+            percentage=rule.discount_percentage,
+            value=rule.discount_value,
+            max_amount=rule.max_discount_amount,
+            min_order=rule.min_order_amount,
+            priority=rule.priority
+        )
+    
+    def matches(self, quantity: Decimal = Decimal('0'), amount: Decimal = Decimal('0')) -> bool:
+        """Check the rule condition against a line quantity or an amount"""
+        if self.condition is None:
+            return True
+        return self.condition(quantity if self.condition_type == 'quantity' else amount)
+    
+    def amount_for(self, amount: Decimal) -> Decimal:
+        """Discount amount on a base amount, capped at the maximum"""
+        if self.percentage:
+            discount_amount = amount * (self.percentage / 100)
         else:
-            discount_amount = rule.discount_value
+            discount_amount = self.value or Decimal('0')
         
-        # Apply maximum discount limit
-        if rule.max_discount_amount:
-            discount_amount = min(discount_amount, rule.max_discount_amount)
+        if self.max_amount:
+            discount_amount = min(discount_amount, self.max_amount)
         
         return discount_amount
+    
+    def as_discount(self, discount_type: str, amount: Decimal, **extra) -> Dict:
+        discount = {
+            'type': discount_type,
+            'rule_id': self.id,
+            'name': self.name,
+            'value': self.amount_for(amount),
+            'percentage': self.percentage,
+            'priority': self.priority
+        }
+        discount.update(extra)
+        return discount
 
-class DiscountRuleEngine:
-    """Advanced discount rule engine"""
+class CompiledCoupon:
+    """Coupon fields needed to list available coupons"""
     
-    def __init__(self):
-        self.rule_cache = {}
+    __slots__ = (
+        "id", "code", "name", "description", "value", "percentage", "max_amount",
+        "min_order", "usage_count", "max_usage", "is_single_use", "customer_id"
+    )
+    
+    def __init__(self, coupon: DiscountCoupon):
+        self.id = coupon.id
+        self.code = coupon.coupon_code
+        self.name = coupon.coupon_name
+        self.description = coupon.description
+        self.value = coupon.discount_value
+        self.percentage = coupon.discount_percentage
+        self.max_amount = coupon.max_discount_amount
+        self.min_order = coupon.min_order_amount
+        self.usage_count = coupon.current_usage_count or 0
+        self.max_usage = coupon.max_usage_count
+        self.is_single_use = bool(coupon.is_single_use)
+        self.customer_id = coupon.customer_id
+
+class DiscountRuleSet:
+    """A company's discounts valid on one day, indexed for cart evaluation"""
+    
+    __slots__ = (
+        "company_id", "item_rules", "category_rules", "customer_rules", "customer_type_rules",
+        "order_rules", "loyalty_rules", "quantity_tiers", "customer_discounts", "coupons"
+    )
+    
+    def __init__(self, company_id: Optional[int]):
+        self.company_id = company_id
+        self.item_rules: Dict[int, List[CompiledDiscount]] = {}
+        self.category_rules: Dict[int, List[CompiledDiscount]] = {}
+        self.customer_rules: Dict[int, List[CompiledDiscount]] = {}
+        self.customer_type_rules: Dict[str, List[CompiledDiscount]] = {}
+        self.order_rules: List[CompiledDiscount] = []
+        self.loyalty_rules: List[CompiledDiscount] = []
+        self.quantity_tiers: List[CompiledDiscount] = []
+        self.customer_discounts: Dict[int, List[CompiledDiscount]] = {}
+        self.coupons: List[CompiledCoupon] = []
+
+class DiscountRuleEngine(ModelCache):
+    """
+    Per-process cache of compiled discount rules, one rule set per company.
+    
+    A rule set holds the active rules, quantity tiers, coupons and customer
+    discounts valid today, indexed by item, category, customer, customer type
+    and order level, so a whole cart is evaluated without further queries.
+    Saving a company's discount record (a coupon redemption included)
+    retires only that company's rule set; shared records retire them all.
+    """
     
-    def evaluate_rules(self, transaction_data: Dict) -> List[Dict]:
-        """Evaluate all applicable rules"""
-        # Implementation for complex rule evaluation
-        pass
\ No newline at end of file
+    def get_rules(self, db: Session, company_id: Optional[int] = None) -> DiscountRuleSet:
+        """Get the company's compiled rules, loading them on a miss"""
+        return self.get(db, company_id)
+    
+    def watched_models(self):
+        return (DiscountRule, DiscountTier, DiscountCoupon, CustomerDiscount, DiscountType)
+    
+    def invalidated_keys(self, target):
+        company_id = getattr(target, 'company_id', None)
+        if company_id is None:
+            return None
+        # The rule set loaded without a company holds every company's rules
+        return (company_id, None)
+    
+    def build(self, db: Session, company_id: Optional[int] = None) -> DiscountRuleSet:
+        """Load and index the company's active discounts (four queries)"""
+        
+        today = date.today()
+        rule_set = DiscountRuleSet(company_id)
+        
+        def active(model):
+            conditions = [
+                model.is_active == True,
+                model.start_date <= today,
+                or_(model.end_date.is_(None), model.end_date >= today)
+            ]
+            if company_id is not None:
+                conditions.append(or_(model.company_id == company_id, model.company_id.is_(None)))
+            return conditions
+        
+        for rule in db.query(DiscountRule).filter(*active(DiscountRule)).all():
+            compiled = CompiledDiscount.from_rule(rule)
+            
+            if rule.rule_type == 'item':
+                rule_set.item_rules.setdefault(rule.target_id, []).append(compiled)
+            elif rule.rule_type == 'category':
+                rule_set.category_rules.setdefault(rule.target_id, []).append(compiled)
+            elif rule.rule_type == 'customer' and rule.condition_type == 'customer_type':
+                customer_type = _customer_type_for(rule.condition_value)
+                if customer_type is None:
+                    logger.warning(f"Discount rule {rule.id} has no valid customer type in its condition value")
+                else:
+                    rule_set.customer_type_rules.setdefault(customer_type, []).append(compiled)
+            elif rule.rule_type == 'customer':
+                rule_set.customer_rules.setdefault(rule.target_id, []).append(compiled)
+            elif rule.rule_type == 'order':
+                rule_set.order_rules.append(compiled)
+            elif rule.rule_type == 'loyalty':
+                rule_set.loyalty_rules.append(compiled)
+        
+        tier_query = db.query(DiscountTier).filter(DiscountTier.is_active == True)
+        if company_id is not None:
+            tier_query = tier_query.filter(or_(DiscountTier.company_id == company_id, DiscountTier.company_id.is_(None)))
+        
+        # Deepest tier first, so evaluation stops at the first band reached
+        for tier in sorted(tier_query.all(), key=lambda tier: tier.min_quantity, reverse=True):
+            min_quantity = Decimal(str(tier.min_quantity))
+            max_quantity = Decimal(str(tier.max_quantity)) if tier.max_quantity is not None else None
+            rule_set.quantity_tiers.append(CompiledDiscount(
+                id=tier.id,
+                name=tier.tier_name,
+                condition_type='quantity',
+                condition=lambda quantity, low=min_quantity, high=max_quantity: (
+                    quantity >= low and (high is None or quantity <= high)
+                ),
+                percentage=tier.discount_percentage,
+                value=tier.discount_amount,
+                priority=tier.display_order
+            ))
+        
+        discount_rows = db.query(CustomerDiscount, DiscountType.type_name).outerjoin(
+            DiscountType, DiscountType.id == CustomerDiscount.discount_type_id
+        ).filter(*active(CustomerDiscount)).all()
+        
+        for discount, type_name in discount_rows:
+            rule_set.customer_discounts.setdefault(discount.customer_id, []).append(CompiledDiscount(
+                id=discount.id,
+                name=f"Customer Discount - {type_name}",
+                percentage=discount.discount_percentage,
+                value=discount.discount_value,
+                max_amount=discount.max_discount_amount,
+                min_order=discount.min_order_amount
+            ))
+        
+        rule_set.coupons = [
+            CompiledCoupon(coupon)
+            for coupon in db.query(DiscountCoupon).filter(*active(DiscountCoupon)).all()
+        ]
+        
+        # Higher priority first
+        for rules in (
+            list(rule_set.item_rules.values()) + list(rule_set.category_rules.values())
+            + list(rule_set.customer_rules.values()) + list(rule_set.customer_type_rules.values())
+            + [rule_set.order_rules, rule_set.loyalty_rules]
+        ):
+            rules.sort(key=lambda rule: rule.priority, reverse=True)
+        
+        return rule_set
+    
+    def evaluate_cart(
+        self,
+        rules: DiscountRuleSet,
+        items: List[Dict],
+        item_categories: Optional[Dict[int, int]] = None
+    ) -> List[Dict]:
+        """Evaluate item, category and quantity tier discounts for all cart lines in one pass"""
+        
+        item_categories = item_categories or {}
+        discounts = []
+        
+        for item in items:
+            item_id = item.get('item_id')
+            quantity = Decimal(str(item.get('quantity', 0)))
+            line_amount = quantity * Decimal(str(item.get('unit_price', 0)))
+            
+            category_id = item.get('category_id')
+            if category_id is None:
+                category_id = item_categories.get(item_id)
+            
+            for discount_type, line_rules in (
+                ('item_rule', rules.item_rules.get(item_id, ())),
+                ('category_rule', rules.category_rules.get(category_id, ()) if category_id is not None else ())
+            ):
+                for rule in line_rules:
+                    if rule.matches(quantity, line_amount):
+                        discount = rule.as_discount(discount_type, line_amount, item_id=item_id)
+                        if discount['value'] > 0:
+                            discounts.append(discount)
+            
+            # Quantity tiers are bands; only the deepest one reached applies
+            for tier in rules.quantity_tiers:
+                if tier.matches(quantity):
+                    discount_amount = tier.amount_for(line_amount)
+                    if discount_amount > 0:
+                        discounts.append({
+                            'type': 'quantity_tier',
+                            'tier_id': tier.id,
+                            'name': tier.name,
+                            'item_id': item_id,
+                            'value': discount_amount,
+                            'percentage': tier.percentage,
+                            'priority': tier.priority
+                        })
+                    break
+        
+        return discounts
+
+# Global rule engine, shared by every POSDiscountService
+discount_rule_engine = DiscountRuleEngine(ttl_seconds=settings.discount_rule_cache_ttl_seconds)
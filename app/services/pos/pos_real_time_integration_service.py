@@ -6,7 +6,6 @@ from decimal import Decimal
 from datetime import datetime, date, timedelta
 import json
 import logging
-import asyncio
 from fastapi import WebSocket, WebSocketDisconnect
 from fastapi.websockets import WebSocketState
 
@@ -18,60 +17,95 @@ from ...models.core.discount_management import DiscountRule, DiscountCoupon, Cus
 from ...models.loyalty import LoyaltyTransaction, LoyaltyProgram
 from ...models.sales import SaleOrder, SaleInvoice
 from ...models.core.payment import Payment
+from ..inventory import stock_service
+from ..core.outbox_service import outbox_service
+from ...core.realtime_hub import realtime_hub, HubClient, BROADCAST_TOPIC, store_topic, session_topic, item_topic
 
 logger = logging.getLogger(__name__)
 
 class POSRealTimeIntegrationService:
     """Service for real-time POS integration with all modules"""
     
+    # Integrations that run after checkout commits, through the outbox
+    deferred_topics = ('pos.customer', 'pos.loyalty', 'pos.accounting', 'pos.sales')
+    
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        # session_id -> hub client and activity timestamps
         self.pos_sessions: Dict[int, Dict] = {}
         self.real_time_cache = {}
     
-    async def connect_websocket(self, websocket: WebSocket, session_id: int):
-        """Connect WebSocket for real-time POS updates"""
-        await websocket.accept()
-        self.active_connections.append(websocket)
+    @property
+    def active_connections(self) -> List[WebSocket]:
+        return [session_data['client'].websocket for session_data in self.pos_sessions.values()]
+    
+    def register_outbox_handlers(self):
+        """Register the deferred post-sale integrations with the outbox worker"""
+        integrations = {
+            'pos.customer': self.real_time_customer_integration,
+            'pos.loyalty': self.real_time_loyalty_integration,
+            'pos.accounting': self.real_time_accounting_integration,
+            'pos.sales': self.real_time_sales_integration
+        }
+        for topic, integration in integrations.items():
+            outbox_service.register_handler(
+                topic, lambda db, events, integration=integration: self.handle_outbox_events(db, events, integration)
+            )
+    
+    async def connect_websocket(self, websocket: WebSocket, session_id: int, store_id: Optional[int] = None) -> HubClient:
+        """Connect WebSocket for real-time POS updates, subscribed to its session and store"""
+        topics = [session_topic(session_id)]
+        if store_id is not None:
+            topics.append(store_topic(store_id))
+        
+        client = await realtime_hub.connect(
+            websocket, topics,
+            info={'session_id': session_id, 'store_id': store_id},
+            on_detach=lambda detached: self._forget_session(session_id, detached)
+        )
         
         # Initialize POS session
         self.pos_sessions[session_id] = {
-            'websocket': websocket,
+            'client': client,
             'session_id': session_id,
+            'store_id': store_id,
             'connected_at': datetime.utcnow(),
             'last_activity': datetime.utcnow()
         }
         
         logger.info(f"POS WebSocket connected for session {session_id}")
+        return client
     
     async def disconnect_websocket(self, websocket: WebSocket, session_id: int):
         """Disconnect WebSocket"""
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-        
-        if session_id in self.pos_sessions:
-            del self.pos_sessions[session_id]
+        session_data = self.pos_sessions.get(session_id)
+        if session_data and session_data['client'].websocket is websocket:
+            # The hub's detach callback removes the session
+            await realtime_hub.disconnect(session_data['client'])
         
         logger.info(f"POS WebSocket disconnected for session {session_id}")
     
+    def _forget_session(self, session_id: int, client: HubClient):
+        """Drop a session once its client leaves the hub, unless a newer connection replaced it"""
+        session_data = self.pos_sessions.get(session_id)
+        if session_data and session_data['client'] is client:
+            del self.pos_sessions[session_id]
+    
     async def broadcast_to_session(self, session_id: int, message: Dict):
         """Broadcast message to specific POS session"""
+        await realtime_hub.publish(session_topic(session_id), message)
         if session_id in self.pos_sessions:
-            websocket = self.pos_sessions[session_id]['websocket']
-            try:
-                await websocket.send_json(message)
-                self.pos_sessions[session_id]['last_activity'] = datetime.utcnow()
-            except Exception as e:
-                logger.error(f"Error broadcasting to session {session_id}: {str(e)}")
-                await self.disconnect_websocket(websocket, session_id)
+            self.pos_sessions[session_id]['last_activity'] = datetime.utcnow()
+    
+    async def broadcast_to_store(self, store_id: int, message: Dict):
+        """Broadcast message to every terminal in a store"""
+        await realtime_hub.publish(store_topic(store_id), message)
     
     async def broadcast_to_all(self, message: Dict):
         """Broadcast message to all active POS sessions"""
-        for session_id, session_data in self.pos_sessions.items():
-            await self.broadcast_to_session(session_id, message)
+        await realtime_hub.publish(BROADCAST_TOPIC, message)
     
     def create_pos_transaction_with_real_time_integrations(self, db: Session, transaction_data: Dict) -> Dict:
-        """Create POS transaction with real-time integrations"""
+        """Create POS transaction; stock moves at checkout, the other integrations run after commit"""
         
         try:
             # Create POS transaction
@@ -81,7 +115,6 @@ class POSRealTimeIntegrationService:
                 transaction_number=transaction_data['transaction_number'],
                 transaction_date=transaction_data['transaction_date'],
                 customer_id=transaction_data.get('customer_id'),
-                staff_id=transaction_data['staff_id'],
                 subtotal=transaction_data['subtotal'],
                 discount_amount=transaction_data.get('discount_amount', 0),
                 tax_amount=transaction_data.get('tax_amount', 0),
@@ -94,115 +127,180 @@ class POSRealTimeIntegrationService:
             db.flush()
             
             # Create transaction items
-            transaction_items = []
-            for item_data in transaction_data['items']:
-                transaction_item = POSTransactionItem(
+            transaction_items = [
+                POSTransactionItem(
                     transaction_id=pos_transaction.id,
                     item_id=item_data['item_id'],
                     quantity=item_data['quantity'],
                     unit_price=item_data['unit_price'],
                     total_price=item_data['total_price'],
-                    discount_amount=item_data.get('discount_amount', 0)
+                    discount_amount=item_data.get('discount_amount', 0),
+                    net_amount=item_data.get(
+                        'net_amount', Decimal(str(item_data['total_price'])) - Decimal(str(item_data.get('discount_amount', 0)))
+                    )
                 )
-                db.add(transaction_item)
-                transaction_items.append(transaction_item)
-            
+                for item_data in transaction_data['items']
+            ]
+            db.add_all(transaction_items)
             db.flush()
             
-            # Real-time integrations
             integration_results = {}
+            # Transactions have no store of their own; the till's session does
+            store_id = pos_transaction.session.store_id
             
-            # 1. Real-time Inventory Integration
-            inventory_result = self.real_time_inventory_integration(db, pos_transaction, transaction_items)
-            integration_results['inventory'] = inventory_result
-            
-            # 2. Real-time Customer Integration
-            customer_result = self.real_time_customer_integration(db, pos_transaction)
-            integration_results['customer'] = customer_result
-            
-            # 3. Real-time Discount Integration
-            discount_result = self.real_time_discount_integration(db, pos_transaction, transaction_data.get('applied_discounts', []))
-            integration_results['discounts'] = discount_result
-            
-            # 4. Real-time Loyalty Integration
-            loyalty_result = self.real_time_loyalty_integration(db, pos_transaction)
-            integration_results['loyalty'] = loyalty_result
+            # Stock and discounts are part of the sale itself
+            integration_results['inventory'] = self.real_time_inventory_integration(db, pos_transaction, transaction_items)
+            integration_results['discounts'] = self.real_time_discount_integration(
+                db, pos_transaction, transaction_data.get('applied_discounts', [])
+            )
             
-            # 5. Real-time Accounting Integration
-            accounting_result = self.real_time_accounting_integration(db, pos_transaction)
-            integration_results['accounting'] = accounting_result
+            # Customer stats, loyalty, accounting and sales records commit with the sale as outbox events
+            for topic in self.deferred_topics:
+                if topic in ('pos.customer', 'pos.loyalty') and not pos_transaction.customer_id:
+                    integration_results[topic.split('.', 1)[1]] = {'status': 'skipped', 'message': 'No customer specified'}
+                    continue
             
-            # 6. Real-time Sales Integration
-            sales_result = self.real_time_sales_integration(db, pos_transaction)
-            integration_results['sales'] = sales_result
+                outbox_service.enqueue(
+                    db, topic, 'pos_transaction', pos_transaction.id,
+                    company_id=pos_transaction.company_id
+                )
+                integration_results[topic.split('.', 1)[1]] = {'status': 'queued'}
             
             db.commit()
             
-            # Send real-time updates
-            asyncio.create_task(self.send_real_time_updates(
+        except Exception as e:
+            logger.error(f"Error creating POS transaction with real-time integrations: {str(e)}")
+            db.rollback()
+            raise ValueError(f"Failed to create POS transaction: {str(e)}")
+        
+        # The sale is committed from here on: a failed update must not turn it into an error the client retries
+        try:
+            self.publish_stock_updates(store_id, integration_results['inventory'].get('stock_updates', []))
+        except Exception as e:
+            logger.error(f"Error publishing stock updates for POS transaction {pos_transaction.id}: {str(e)}")
+        
+        try:
+            self.schedule_real_time_update(
                 pos_transaction.session_id,
                 {
                     'type': 'transaction_completed',
                     'transaction_id': pos_transaction.id,
                     'transaction_number': pos_transaction.transaction_number,
-                    'total_amount': pos_transaction.total_amount,
-                    'integration_results': integration_results
+                    'total_amount': float(pos_transaction.total_amount),
+                    'integration_results': {
+                        name: result.get('status') for name, result in integration_results.items()
+                    }
                 }
-            ))
+            )
+        except Exception as e:
+            logger.error(f"Error sending real-time updates for POS transaction {pos_transaction.id}: {str(e)}")
+        
+        return {
+            'success': True,
+            'transaction_id': pos_transaction.id,
+            'transaction_number': pos_transaction.transaction_number,
+            'integration_results': integration_results,
+            'message': 'POS transaction completed; post-sale integrations queued'
+        }
             
-            return {
-                'success': True,
-                'transaction_id': pos_transaction.id,
-                'transaction_number': pos_transaction.transaction_number,
-                'integration_results': integration_results,
-                'message': 'POS transaction completed with real-time integrations'
+    def schedule_real_time_update(self, session_id: int, update_data: Dict):
+        """Queue a WebSocket update from sync code, which runs outside the event loop"""
+        realtime_hub.publish_threadsafe(session_topic(session_id), update_data)
+    
+    def publish_stock_updates(self, store_id: Optional[int], stock_updates: List[Dict]):
+        """Publish new stock levels to the store and item topics; rapid sales of an item collapse into one frame per tick"""
+        timestamp = datetime.utcnow().isoformat()
+        for stock_update in stock_updates:
+            message = {
+                'type': 'stock_update',
+                'store_id': store_id,
+                'data': {
+                    'item_id': stock_update['item_id'],
+                    'new_quantity': float(stock_update['new_quantity']),
+                    'new_available': float(stock_update['new_available']),
+                    'is_low_stock': bool(stock_update['is_low_stock'])
+                },
+                'timestamp': timestamp
             }
+            coalesce_key = f"stock:{stock_update['item_id']}:{store_id}"
+            if store_id is not None:
+                realtime_hub.publish_threadsafe(store_topic(store_id), message, coalesce_key)
+            realtime_hub.publish_threadsafe(item_topic(stock_update['item_id']), message, coalesce_key)
+    
+    def handle_outbox_events(self, db: Session, events: List, integration) -> Dict[int, str]:
+        """Run one post-sale integration for a batch of outbox events"""
+        
+        transactions = {
+            transaction.id: transaction
+            for transaction in db.query(POSTransaction).filter(
+                POSTransaction.id.in_({event.aggregate_id for event in events})
+            ).all()
+        }
             
-        except Exception as e:
-            logger.error(f"Error creating POS transaction with real-time integrations: {str(e)}")
-            db.rollback()
-            raise ValueError(f"Failed to create POS transaction: {str(e)}")
+        def apply(event):
+            pos_transaction = transactions.get(event.aggregate_id)
+            if pos_transaction is None:
+                raise ValueError(f"POS transaction {event.aggregate_id} not found")
     
-    def real_time_inventory_integration(self, db: Session, pos_transaction: POSTransaction, transaction_items: List[POSTransactionItem]) -> Dict:
-        """Real-time inventory integration for POS transaction"""
+            result = integration(db, pos_transaction)
+            if result.get('status') == 'error':
+                raise RuntimeError(result.get('message'))
         
-        try:
-            stock_updates = []
-            
-            for item in transaction_items:
-                # Get stock item
-                stock_item = db.query(StockItem).filter(
-                    StockItem.item_id == item.item_id,
-                    StockItem.location_id == pos_transaction.store_id
-                ).first()
-                
-                if stock_item:
-                    # Update stock in real-time
-                    stock_item.quantity -= item.quantity
-                    stock_item.available_quantity -= item.quantity
-                    stock_item.update_available_quantity()
-                    
-                    # Update last movement
-                    stock_item.last_movement_date = datetime.utcnow()
-                    stock_item.last_movement_type = 'pos_sale'
-                    
-                    stock_updates.append({
-                        'item_id': item.item_id,
-                        'quantity_sold': item.quantity,
-                        'new_quantity': stock_item.quantity,
-                        'new_available': stock_item.available_quantity,
-                        'is_low_stock': stock_item.available_quantity <= (stock_item.item.minimum_stock_level if hasattr(stock_item, 'item') else 0)
-                    })
+        return outbox_service.run_each(db, events, apply)
             
-            return {
-                'status': 'success',
-                'stock_updates': stock_updates,
-                'message': 'Stock updated in real-time'
+    def real_time_inventory_integration(self, db: Session, pos_transaction: POSTransaction, transaction_items: List[POSTransactionItem]) -> Dict:
+        """Real-time inventory integration for POS transaction
+        
+        Runs inside the sale's transaction, so database errors propagate and
+        roll the sale back rather than being reported as a result.
+        """
+        
+        store_id = pos_transaction.session.store_id
+        
+        # Only items already stocked at the store are moved; the store id is
+        # not a stock location of its own, so no stock records are created here
+        stock_items = stock_service.lock_stock_items(
+            db, [(item.item_id, store_id) for item in transaction_items], create=False
+        )
+        stocked_items = [item for item in transaction_items if (item.item_id, store_id) in stock_items]
+        
+        # One batched posting for the basket. The sale has already happened
+        # at the counter, so it is recorded even against short stock.
+        result = stock_service.post_movements(db, [
+            {
+                'item_id': item.item_id,
+                'location_id': store_id,
+                'movement_type': 'pos_sale',
+                'quantity': item.quantity,
+                'reference_type': 'pos_transaction',
+                'reference_id': pos_transaction.id,
+                'reference_number': pos_transaction.transaction_number
             }
-            
-        except Exception as e:
-            logger.error(f"Error in real-time inventory integration: {str(e)}")
-            return {'status': 'error', 'message': str(e)}
+            for item in stocked_items
+        ], commit=False, check_negative=False)
+        
+        min_levels = dict(
+            db.query(Item.id, Item.min_stock_level).filter(
+                Item.id.in_({item.item_id for item in stocked_items})
+            ).all()
+        ) if stocked_items else {}
+        
+        stock_updates = []
+        for item in stocked_items:
+            stock_item = result['stock_items'][(item.item_id, store_id)]
+            stock_updates.append({
+                'item_id': item.item_id,
+                'quantity_sold': item.quantity,
+                'new_quantity': stock_item.quantity,
+                'new_available': stock_item.available_quantity,
+                'is_low_stock': stock_item.available_quantity <= (min_levels.get(item.item_id) or 0)
+            })
+        
+        return {
+            'status': 'success',
+            'stock_updates': stock_updates,
+            'message': 'Stock updated in real-time'
+        }
     
     def real_time_customer_integration(self, db: Session, pos_transaction: POSTransaction) -> Dict:
         """Real-time customer integration for POS transaction"""
@@ -244,11 +342,13 @@ class POSRealTimeIntegrationService:
         try:
             discount_applications = []
             
+            discount_ids = {discount_data['discount_id'] for discount_data in applied_discounts}
+            discount_rules = {
+                rule.id: rule for rule in db.query(DiscountRule).filter(DiscountRule.id.in_(discount_ids)).all()
+            } if discount_ids else {}
+            
             for discount_data in applied_discounts:
-                # Get discount rule
-                discount_rule = db.query(DiscountRule).filter(
-                    DiscountRule.id == discount_data['discount_id']
-                ).first()
+                discount_rule = discount_rules.get(discount_data['discount_id'])
                 
                 if discount_rule:
                     # Apply discount in real-time
@@ -288,6 +388,12 @@ class POSRealTimeIntegrationService:
             if not loyalty_program:
                 return {'status': 'skipped', 'message': 'No loyalty program found'}
             
+            if db.query(LoyaltyTransaction.id).filter(
+                LoyaltyTransaction.reference_type == 'pos_transaction',
+                LoyaltyTransaction.reference_id == pos_transaction.id
+            ).first():
+                return {'status': 'skipped', 'message': 'Loyalty points already posted'}
+            
             # Calculate points earned in real-time
             points_earned = int(pos_transaction.total_amount * loyalty_program.points_per_rupee)
             
@@ -319,6 +425,12 @@ class POSRealTimeIntegrationService:
         """Real-time accounting integration for POS transaction"""
         
         try:
+            if db.query(JournalEntry.id).filter(
+                JournalEntry.reference_type == 'pos_transaction',
+                JournalEntry.reference_id == pos_transaction.id
+            ).first():
+                return {'status': 'skipped', 'message': 'Journal entry already posted'}
+            
             # Create journal entry in real-time
             journal_entry = JournalEntry(
                 company_id=pos_transaction.company_id,
@@ -372,6 +484,11 @@ class POSRealTimeIntegrationService:
         """Real-time sales integration for POS transaction"""
         
         try:
+            if db.query(SaleOrder.id).filter(
+                SaleOrder.order_number == f"POS-{pos_transaction.transaction_number}"
+            ).first():
+                return {'status': 'skipped', 'message': 'Sales records already created'}
+            
             # Create sale order in real-time
             sale_order = SaleOrder(
                 company_id=pos_transaction.company_id,
@@ -637,4 +754,6 @@ class POSRealTimeIntegrationService:
         return db.query(ChartOfAccount).filter(
             ChartOfAccount.company_id == company_id,
             ChartOfAccount.account_type == 'revenue'
-        ).first()
\ No newline at end of file
+        ).first()
+# Global service instance
+pos_real_time_integration_service = POSRealTimeIntegrationService()
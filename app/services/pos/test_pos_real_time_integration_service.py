@@ -0,0 +1,89 @@
+"""
+POS Real-time Integration Tests
+A checkout commits the sale, moves stock at the session's store and queues the post-sale integrations
+"""
+import pytest
+from decimal import Decimal
+from datetime import date, datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.pos.pos_models import POSSession, POSTransaction, POSTransactionItem
+from app.models.inventory import Item, StockItem, StockMovement
+from app.models.core import IntegrationOutbox
+from app.services.pos.pos_real_time_integration_service import POSRealTimeIntegrationService
+
+
+@pytest.fixture
+def db():
+    """In-memory database with an open till at store 5 and one stocked item"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[
+        POSSession.__table__, POSTransaction.__table__, POSTransactionItem.__table__,
+        Item.__table__, StockItem.__table__, StockMovement.__table__, IntegrationOutbox.__table__
+    ])
+    session = sessionmaker(bind=engine)()
+    
+    session.add_all([
+        POSSession(id=1, company_id=1, session_number='S-1', session_date=date(2024, 1, 31),
+                   store_id=5, cashier_id=1, status='open'),
+        Item(id=1, company_id=1, barcode='8901234567890', style_code='SH-101', name='Cotton Shirt',
+             min_stock_level=Decimal('2')),
+        StockItem(item_id=1, location_id=5, quantity=Decimal('10'), reserved_quantity=Decimal('0'),
+                  available_quantity=Decimal('10'), average_cost=Decimal('100'), last_cost=Decimal('100'))
+    ])
+    session.commit()
+    
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def checkout(db, quantity='3', customer_id=None):
+    return POSRealTimeIntegrationService().create_pos_transaction_with_real_time_integrations(db, {
+        'company_id': 1,
+        'session_id': 1,
+        'transaction_number': 'POS00000001',
+        'transaction_date': datetime(2024, 1, 31, 10, 30),
+        'customer_id': customer_id,
+        'staff_id': 1,
+        'subtotal': Decimal('450'),
+        'total_amount': Decimal('450'),
+        'payment_method': 'cash',
+        'items': [{
+            'item_id': 1,
+            'quantity': Decimal(quantity),
+            'unit_price': Decimal('150'),
+            'total_price': Decimal('450')
+        }]
+    })
+
+
+class TestCheckout:
+    """Test a full checkout through create_pos_transaction_with_real_time_integrations"""
+    
+    def test_sale_commits_and_moves_stock_at_the_session_store(self, db):
+        """Test that the sale is saved and stock leaves the till's store"""
+        result = checkout(db)
+        
+        assert result['success'] is True
+        assert result['integration_results']['inventory']['status'] == 'success'
+        
+        transaction = db.query(POSTransaction).one()
+        assert transaction.transaction_number == 'POS00000001'
+        assert db.query(POSTransactionItem).one().net_amount == Decimal('450')
+        
+        stock_item = db.query(StockItem).one()
+        assert stock_item.quantity == Decimal('7')
+        
+        movement = db.query(StockMovement).one()
+        assert (movement.location_id, movement.movement_type, movement.reference_id) == (5, 'pos_sale', transaction.id)
+    
+    def test_post_sale_integrations_are_queued(self, db):
+        """Test that accounting and sales records go to the outbox; customer steps are skipped without a customer"""
+        result = checkout(db)
+        
+        assert sorted(event.topic for event in db.query(IntegrationOutbox).all()) == ['pos.accounting', 'pos.sales']
+        assert result['integration_results']['customer']['status'] == 'skipped'
+        assert result['integration_results']['sales']['status'] == 'queued'
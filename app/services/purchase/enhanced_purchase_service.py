@@ -1,6 +1,6 @@
 # backend/app/services/enhanced_purchase_service.py
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc, asc
+from sqlalchemy import and_, or_, func, desc, asc, update
 from typing import Optional, List, Dict, Tuple
 from decimal import Decimal
 from datetime import datetime, date
@@ -16,12 +16,12 @@ from ..models.purchase import (
     PurchaseReturn, PurchaseReturnItem, PurchaseOrder, PurchaseOrderItem,
     PurchaseInvoice, PurchaseInvoiceItem
 )
-from ..models.inventory import Item
-from ..models.customers import Supplier
 from ..models.inventory import StockItem, StockLocation
 from ..models.purchase import PurchaseBill, PurchaseBillItem
 from ..models.accounting import JournalEntry, JournalEntryItem
 from ..models.core import ChartOfAccount
+from ..core.document_number_service import document_number_service
+from .purchase_item_matcher import PurchaseItemMatcher
 
 logger = logging.getLogger(__name__)
 
@@ -281,73 +281,78 @@ class EnhancedPurchaseService:
         import_id: int,
         user_id: int = None
     ) -> Dict:
-        """Match Excel import items to master data"""
-        
-        import_items = self.get_excel_import_items(db, company_id, import_id)
+        """
+        Match Excel import items to master data.
+        All rows are resolved against indexes loaded once (PurchaseItemMatcher)
+        and written back with a single bulk update.
+        """
+        
+        matcher = PurchaseItemMatcher(db, company_id)
+        
+        import_items = db.query(
+            PurchaseExcelImportItem.id,
+            PurchaseExcelImportItem.row_number,
+            PurchaseExcelImportItem.item_name,
+            PurchaseExcelImportItem.item_code,
+            PurchaseExcelImportItem.barcode,
+            PurchaseExcelImportItem.supplier_name,
+            PurchaseExcelImportItem.supplier_code,
+            PurchaseExcelImportItem.matched_item_id,
+            PurchaseExcelImportItem.match_confidence,
+            PurchaseExcelImportItem.match_method,
+            PurchaseExcelImportItem.matched_supplier_id
+        ).filter(
+            PurchaseExcelImportItem.company_id == company_id,
+            PurchaseExcelImportItem.import_id == import_id
+        ).order_by(PurchaseExcelImportItem.row_number).all()
         
         matched_items = 0
         unmatched_items = 0
         matching_results = []
+        updates = []
         
         for item in import_items:
-            try:
-                # Try to match item by barcode
-                matched_item = None
-                if item.barcode:
-                    matched_item = db.query(Item).filter(
-                        Item.company_id == company_id,
-                        Item.barcode == item.barcode
-                    ).first()
-                
-                # Try to match item by item code
-                if not matched_item and item.item_code:
-                    matched_item = db.query(Item).filter(
-                        Item.company_id == company_id,
-                        Item.item_code == item.item_code
-                    ).first()
-                
-                # Try to match item by name
-                if not matched_item and item.item_name:
-                    matched_item = db.query(Item).filter(
-                        Item.company_id == company_id,
-                        Item.name.ilike(f"%{item.item_name}%")
-                    ).first()
-                
-                # Try to match supplier
-                matched_supplier = None
-                if item.supplier_name:
-                    matched_supplier = db.query(Supplier).filter(
-                        Supplier.company_id == company_id,
-                        Supplier.name.ilike(f"%{item.supplier_name}%")
-                    ).first()
-                
-                if matched_item:
-                    item.matched_item_id = matched_item.id
-                    item.processing_status = 'processed'
-                    matched_items += 1
-                else:
-                    item.processing_status = 'error'
-                    item.error_message = "Item not found in master data"
-                    unmatched_items += 1
-                
-                if matched_supplier:
-                    item.matched_supplier_id = matched_supplier.id
-                
-                matching_results.append({
-                    "row_number": item.row_number,
-                    "item_name": item.item_name,
-                    "matched_item_id": item.matched_item_id,
-                    "matched_supplier_id": item.matched_supplier_id,
-                    "status": item.processing_status
-                })
-                
-            except Exception as e:
-                item.processing_status = 'error'
-                item.error_message = str(e)
+            item_id, confidence, method = matcher.match_item(item.barcode, item.item_code, item.item_name)
+            # Items and suppliers matched before are kept when this run finds none
+            if not item_id and item.matched_item_id:
+                item_id, confidence, method = item.matched_item_id, item.match_confidence, item.match_method
+            supplier_id, supplier_confidence, _ = matcher.match_supplier(item.supplier_code, item.supplier_name)
+            
+            if item_id:
+                processing_status = 'processed'
+                matched_items += 1
+            else:
+                processing_status = 'error'
                 unmatched_items += 1
-        
+            
+            updates.append({
+                "id": item.id,
+                "matched_item_id": item_id,
+                "match_confidence": confidence if item_id else None,
+                "match_method": method,
+                "matched_supplier_id": supplier_id or item.matched_supplier_id,
+                "processing_status": processing_status,
+                "error_message": None if item_id else "Item not found in master data",
+                "updated_by": user_id
+            })
+            
+            matching_results.append({
+                "row_number": item.row_number,
+                "item_name": item.item_name,
+                "matched_item_id": item_id,
+                "match_confidence": confidence if item_id else None,
+                "match_method": method,
+                "matched_supplier_id": supplier_id or item.matched_supplier_id,
+                "supplier_confidence": supplier_confidence if supplier_id else None,
+                "status": processing_status
+            })
+        
+        if updates:
+            db.execute(update(PurchaseExcelImportItem), updates)
         db.commit()
         
+        logger.info(f"Matched import {import_id}: {matched_items} matched, {unmatched_items} unmatched")
+        
         return {
             "import_id": import_id,
             "total_items": len(import_items),
@@ -628,7 +633,7 @@ class EnhancedPurchaseService:
         """Create purchase return"""
         
         # Generate return number
-        return_number = f"PR-{datetime.now().strftime('%Y%m%d')}-{str(uuid.uuid4())[:8]}"
+        return_number = document_number_service.next_number(db, company_id, "purchase_return")
         
         # Get original bill details if provided
         original_bill = None
@@ -3,17 +3,18 @@ from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, func, desc, asc
 from typing import Optional, List, Dict, Tuple
 from decimal import Decimal
-from datetime import datetime, date, timedelta
+from datetime import date, timedelta
 import json
 import logging
 
 from ...models.purchase import PurchaseOrder, PurchaseOrderItem, PurchaseBill, PurchaseBillItem, PurchasePayment
 from ...models.suppliers import Supplier
-from ...models.inventory import Item, StockItem
+from ...models.inventory import Item
 from ...models.accounting import JournalEntry, JournalEntryItem, ChartOfAccount
 from ...models.core.discount_management import DiscountRule, DiscountCoupon
 from ...models.pos.pos_models import POSTransaction
 from ...models.core.payment import Payment
+from ..inventory import stock_service
 
 logger = logging.getLogger(__name__)
 
@@ -347,53 +348,29 @@ class PurchaseIntegrationService:
                 PurchaseBillItem.purchase_bill_id == purchase_bill.id
             ).all()
             
-            stock_updates = []
+            # Post the whole bill as one batch; stock records are created as needed
+            result = stock_service.post_movements(db, [
+                {
+                    'item_id': item.item_id,
+                    'location_id': purchase_bill.location_id,
+                    'movement_type': 'in',
+                    'quantity': item.quantity,
+                    'unit_cost': item.unit_price,
+                    'reference_type': 'purchase_bill',
+                    'reference_id': purchase_bill.id,
+                    'reference_number': purchase_bill.bill_number
+                }
+                for item in bill_items
+            ], commit=False)
             
+            stock_updates = []
             for item in bill_items:
-                # Get or create stock item
-                stock_item = db.query(StockItem).filter(
-                    StockItem.item_id == item.item_id,
-                    StockItem.location_id == purchase_bill.location_id
-                ).first()
-                
-                if not stock_item:
-                    # Create new stock item
-                    stock_item = StockItem(
-                        item_id=item.item_id,
-                        location_id=purchase_bill.location_id,
-                        quantity=0,
-                        reserved_quantity=0,
-                        available_quantity=0,
-                        average_cost=0,
-                        last_cost=0
-                    )
-                    db.add(stock_item)
-                
-                # Update stock quantities
-                old_quantity = stock_item.quantity
-                old_average_cost = stock_item.average_cost
-                
-                # Calculate new average cost
-                total_cost = (old_quantity * old_average_cost) + (item.quantity * item.unit_price)
-                total_quantity = old_quantity + item.quantity
-                new_average_cost = total_cost / total_quantity if total_quantity > 0 else 0
-                
-                # Update stock item
-                stock_item.quantity += item.quantity
-                stock_item.available_quantity += item.quantity
-                stock_item.average_cost = new_average_cost
-                stock_item.last_cost = item.unit_price
-                stock_item.update_available_quantity()
-                
-                # Update last movement
-                stock_item.last_movement_date = datetime.utcnow()
-                stock_item.last_movement_type = 'purchase'
-                
+                stock_item = result['stock_items'][(item.item_id, purchase_bill.location_id)]
                 stock_updates.append({
                     'item_id': item.item_id,
                     'quantity_added': item.quantity,
                     'new_quantity': stock_item.quantity,
-                    'new_average_cost': new_average_cost,
+                    'new_average_cost': stock_item.average_cost,
                     'new_available': stock_item.available_quantity
                 })
             
@@ -0,0 +1,161 @@
+# backend/app/services/purchase_item_matcher.py
+from sqlalchemy.orm import Session
+from typing import Optional, List, Dict, Tuple, Iterable
+import re
+import logging
+
+import numpy as np
+
+from ..models.inventory import Item
+from ..models.customers import Supplier
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+_SEPARATORS = re.compile(r'[\W_]+', re.UNICODE)
+
+# (matched id, confidence 0-100, how it matched)
+Match = Tuple[Optional[int], float, Optional[str]]
+NO_MATCH: Match = (None, 0.0, None)
+
+def normalize_name(value) -> str:
+    """Case-folded name with punctuation and repeated spaces collapsed"""
+    return _SEPARATORS.sub(' ', str(value or '').casefold()).strip()
+
+def normalize_code(value) -> str:
+    """Barcodes and codes as typed, less surrounding spaces and the .0 of a numeric cell"""
+    code = str(value or '').strip()
+    if code.endswith('.0') and code[:-2].isdigit():
+        code = code[:-2]
+    return code
+
+def _trigrams(normalized: str) -> List[str]:
+    padded = f" {normalized} "
+    return list({padded[start:start + 3] for start in range(len(padded) - 2)})
+
+class NameIndex:
+    """
+    Names indexed for fuzzy lookup by character trigrams.
+    
+    A query is scored against every name sharing a trigram with it: the mean
+    of the Dice coefficient of the two trigram sets and the share of the
+    query's trigrams found in the name, so a name that contains the query
+    (what a substring search found) still ranks well.
+    """
+    
+    __slots__ = ("exact", "ids", "sizes", "postings")
+    
+    def __init__(self, entries: Iterable[Tuple[int, str]]):
+        # Names shared by several records (item variants) resolve to the first
+        self.exact: Dict[str, int] = {}
+        for entity_id, name in entries:
+            normalized = normalize_name(name)
+            if normalized:
+                self.exact.setdefault(normalized, entity_id)
+        
+        self.ids = np.fromiter(self.exact.values(), dtype=np.int64, count=len(self.exact))
+        self.sizes = np.empty(len(self.exact), dtype=np.float64)
+        postings: Dict[str, List[int]] = {}
+        for position, normalized in enumerate(self.exact):
+            grams = _trigrams(normalized)
+            self.sizes[position] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(position)
+        self.postings = {gram: np.array(positions, dtype=np.int32) for gram, positions in postings.items()}
+    
+    def match(self, name) -> Tuple[Optional[int], float]:
+        """Best matching id and its score (0-1; 1 for an exact name)"""
+        
+        normalized = normalize_name(name)
+        if not normalized:
+            return None, 0.0
+        if normalized in self.exact:
+            return self.exact[normalized], 1.0
+        
+        grams = _trigrams(normalized)
+        lists = [self.postings[gram] for gram in grams if gram in self.postings]
+        if not lists:
+            return None, 0.0
+        
+        shared = np.bincount(np.concatenate(lists), minlength=len(self.ids))
+        score = (2 * shared / (self.sizes + len(grams)) + shared / len(grams)) / 2
+        best = int(np.argmax(score))
+        return int(self.ids[best]), float(score[best])
+
+class PurchaseItemMatcher:
+    """
+    Resolves purchase import rows to a company's items and suppliers.
+    
+    Master data is read once, one query per table, into dictionaries for
+    barcodes and codes and a NameIndex for names, so matching a row costs
+    no queries. Exact barcode, code and name matches have confidence 100;
+    fuzzy name matches below min_confidence are left unmatched.
+    """
+    
+    def __init__(self, db: Session, company_id: int, min_confidence: Optional[float] = None):
+        self.min_confidence = settings.purchase_match_min_confidence if min_confidence is None else min_confidence
+        
+        items = db.query(
+            Item.id, Item.barcode, Item.style_code, Item.supplier_item_code, Item.name
+        ).filter(Item.company_id == company_id).order_by(Item.id).all()
+        
+        self.barcodes: Dict[str, int] = {}
+        self.item_codes: Dict[str, int] = {}
+        for item_id, barcode, _, supplier_item_code, _ in items:
+            if barcode:
+                self.barcodes.setdefault(normalize_code(barcode), item_id)
+            # A supplier's own code for an item comes before our style code
+            if supplier_item_code:
+                self.item_codes.setdefault(normalize_code(supplier_item_code).casefold(), item_id)
+        for item_id, _, style_code, _, _ in items:
+            if style_code:
+                self.item_codes.setdefault(normalize_code(style_code).casefold(), item_id)
+        self.item_names = NameIndex((item_id, name) for item_id, _, _, _, name in items)
+        
+        suppliers = db.query(
+            Supplier.id, Supplier.supplier_code, Supplier.name
+        ).filter(Supplier.company_id == company_id).order_by(Supplier.id).all()
+        
+        self.supplier_codes = {
+            normalize_code(code).casefold(): supplier_id for supplier_id, code, _ in reversed(suppliers) if code
+        }
+        self.supplier_names = NameIndex((supplier_id, name) for supplier_id, _, name in suppliers)
+        
+        # Invoices repeat names (one supplier, item variants), so each is scored once
+        self._name_matches: Dict[Tuple[str, str], Match] = {}
+    
+    def match_item(self, barcode=None, item_code=None, item_name=None) -> Match:
+        """Match by barcode, then item code, then name"""
+        
+        item_id = self.barcodes.get(normalize_code(barcode)) if barcode else None
+        if item_id is not None:
+            return item_id, 100.0, 'barcode'
+        
+        item_id = self.item_codes.get(normalize_code(item_code).casefold()) if item_code else None
+        if item_id is not None:
+            return item_id, 100.0, 'item_code'
+        
+        return self._match_name('item', self.item_names, item_name)
+    
+    def match_supplier(self, supplier_code=None, supplier_name=None) -> Match:
+        """Match by supplier code, then name"""
+        
+        supplier_id = self.supplier_codes.get(normalize_code(supplier_code).casefold()) if supplier_code else None
+        if supplier_id is not None:
+            return supplier_id, 100.0, 'supplier_code'
+        
+        return self._match_name('supplier', self.supplier_names, supplier_name)
+    
+    def _match_name(self, kind: str, index: NameIndex, name) -> Match:
+        if not name:
+            return NO_MATCH
+        
+        key = (kind, normalize_name(name))
+        if key not in self._name_matches:
+            entity_id, score = index.match(name)
+            confidence = round(score * 100, 2)
+            if entity_id is None or confidence < self.min_confidence:
+                self._name_matches[key] = NO_MATCH
+            else:
+                self._name_matches[key] = (entity_id, confidence, 'name' if score == 1.0 else 'fuzzy_name')
+        return self._name_matches[key]
@@ -0,0 +1,126 @@
+"""
+Purchase Item Matcher Tests
+Exact keys always match; fuzzy names match only at or above the confidence threshold
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.database import Base
+from app.models.inventory import Item
+from app.models.customers import Supplier
+from app.services.purchase.purchase_item_matcher import PurchaseItemMatcher, NameIndex, NO_MATCH
+
+
+@pytest.fixture
+def db():
+    """In-memory database with a few items and suppliers of company 1"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Item.__table__, Supplier.__table__])
+    session = sessionmaker(bind=engine)()
+    
+    session.add_all([
+        Item(id=1, company_id=1, barcode='8901234567890', style_code='SH-101',
+             supplier_item_code='RT-9', name='Cotton Shirt Blue'),
+        Item(id=2, company_id=1, barcode='8901234567891', style_code='RT-9', name='Cotton Shirt, Blue'),
+        Item(id=3, company_id=1, barcode='8901234567892', style_code='JN-7', name='Denim Jeans Slim Fit'),
+        Item(id=4, company_id=2, barcode='8901234567893', style_code='XX-1', name='Silk Saree'),
+        Supplier(id=1, company_id=1, supplier_code='SUPP01', name='Raymond Textiles Ltd'),
+        Supplier(id=2, company_id=1, supplier_code='SUPP02', name='Arvind Mills')
+    ])
+    session.commit()
+    
+    yield session
+    session.close()
+    engine.dispose()
+
+
+class TestExactMatches:
+    """Test barcode, code and name matches, which are always certain"""
+    
+    def test_barcode_from_a_numeric_cell(self, db):
+        """Test that a barcode read as a float still matches"""
+        matcher = PurchaseItemMatcher(db, 1)
+        
+        assert matcher.match_item(barcode=8901234567892.0) == (3, 100.0, 'barcode')
+    
+    def test_supplier_item_code_before_style_code(self, db):
+        """Test that a supplier's code for an item wins over another item's style code"""
+        matcher = PurchaseItemMatcher(db, 1)
+        
+        assert matcher.match_item(item_code='rt-9') == (1, 100.0, 'item_code')
+        assert matcher.match_item(item_code='SH-101') == (1, 100.0, 'item_code')
+    
+    def test_exact_name_ignores_case_and_punctuation(self, db):
+        """Test that names equal after normalizing match with full confidence, to the first record"""
+        matcher = PurchaseItemMatcher(db, 1)
+        
+        assert matcher.match_item(item_name='COTTON SHIRT - BLUE') == (1, 100.0, 'name')
+        assert matcher.match_supplier(supplier_name='arvind mills') == (2, 100.0, 'name')
+    
+    def test_other_companies_are_not_matched(self, db):
+        """Test that another company's items are not loaded"""
+        matcher = PurchaseItemMatcher(db, 1, min_confidence=0)
+        
+        assert matcher.match_item(barcode='8901234567893') == NO_MATCH
+        assert matcher.match_item(item_name='Silk Saree')[0] != 4
+
+
+class TestConfidenceThreshold:
+    """Test how min_confidence decides fuzzy name matches"""
+    
+    def test_close_name_matches_fuzzily(self, db):
+        """Test that a misspelt name matches with a confidence below 100"""
+        matcher = PurchaseItemMatcher(db, 1)
+        item_id, confidence, method = matcher.match_item(item_name='Denim Jeans Slimfit')
+        
+        assert (item_id, method) == (3, 'fuzzy_name')
+        assert settings.purchase_match_min_confidence <= confidence < 100
+    
+    def test_unrelated_name_is_left_unmatched(self, db):
+        """Test that a name sharing a few trigrams with an item stays below the threshold"""
+        matcher = PurchaseItemMatcher(db, 1)
+        
+        assert matcher.match_item(item_name='Leather Belt') == NO_MATCH
+        assert matcher.match_supplier(supplier_name='Raj Traders') == NO_MATCH
+    
+    def test_threshold_is_inclusive(self, db):
+        """Test that a score equal to min_confidence matches and one just above it does not"""
+        _, score = PurchaseItemMatcher(db, 1).item_names.match('Raymond Shirt Blue')
+        confidence = round(score * 100, 2)
+        
+        assert PurchaseItemMatcher(db, 1, min_confidence=confidence).match_item(
+            item_name='Raymond Shirt Blue'
+        ) == (1, confidence, 'fuzzy_name')
+        assert PurchaseItemMatcher(db, 1, min_confidence=confidence + 0.01).match_item(
+            item_name='Raymond Shirt Blue'
+        ) == NO_MATCH
+    
+    def test_threshold_does_not_apply_to_exact_keys(self, db):
+        """Test that barcodes, codes and exact names match even at a threshold of 100"""
+        matcher = PurchaseItemMatcher(db, 1, min_confidence=100)
+        
+        assert matcher.match_item(barcode='8901234567890') == (1, 100.0, 'barcode')
+        assert matcher.match_supplier(supplier_code='supp02') == (2, 100.0, 'supplier_code')
+        assert matcher.match_supplier(supplier_name='Raymond Textiles Ltd.') == (1, 100.0, 'name')
+        assert matcher.match_supplier(supplier_name='Raymond Textile') == NO_MATCH
+
+
+class TestNameIndex:
+    """Test the trigram scores behind the confidence"""
+    
+    def test_contained_name_outscores_its_overlap(self):
+        """Test that a query contained in a name scores higher than the Dice coefficient alone"""
+        index = NameIndex([(1, 'Denim Jeans Slim Fit'), (2, 'Denim Jacket')])
+        item_id, score = index.match('Denim Jeans')
+        
+        assert item_id == 1
+        assert 0.5 < score < 1.0
+    
+    def test_no_shared_trigram(self):
+        """Test that a query sharing nothing with any name has no match"""
+        index = NameIndex([(1, 'Denim Jeans')])
+        
+        assert index.match('xyz') == (None, 0.0)
+        assert index.match('') == (None, 0.0)
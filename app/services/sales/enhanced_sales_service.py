@@ -18,6 +18,7 @@ from ..models.inventory import StockItem, StockLocation
 from ..models.sale import SaleBill, SaleBillItem
 from ..models.accounting import JournalEntry, JournalEntryItem
 from ..models.core import ChartOfAccount
+from ..core.document_number_service import document_number_service
 
 logger = logging.getLogger(__name__)
 
@@ -326,6 +327,8 @@ class EnhancedSalesService:
         starting_number: int = 1,
         number_length: int = 6,
         is_default: bool = False,
+        is_gapless: bool = False,
+        block_size: int = 0,
         notes: str = None,
         user_id: int = None
     ) -> BillSeries:
@@ -360,6 +363,8 @@ class EnhancedSalesService:
             current_number=starting_number - 1,
             number_length=number_length,
             is_default=is_default,
+            is_gapless=is_gapless,
+            block_size=block_size,
             notes=notes,
             created_by=user_id
         )
@@ -368,6 +373,9 @@ class EnhancedSalesService:
         db.commit()
         db.refresh(bill_series)
         
+        # A new default series changes which series numbers are drawn from
+        document_number_service.clear_series_cache()
+        
         logger.info(f"Bill series created: {series_name}")
         
         return bill_series
@@ -399,37 +407,13 @@ class EnhancedSalesService:
         company_id: int,
         document_type: str
     ) -> str:
-        """Generate next bill number"""
-        
-        # Get default series for document type
-        series = db.query(BillSeries).filter(
-            BillSeries.company_id == company_id,
-            BillSeries.document_type == document_type,
-            BillSeries.is_default == True,
-            BillSeries.is_active == True
-        ).first()
-        
-        if not series:
-            # Get any active series for document type
-            series = db.query(BillSeries).filter(
-                BillSeries.company_id == company_id,
-                BillSeries.document_type == document_type,
-                BillSeries.is_active == True
-            ).first()
-        
-        if not series:
-            raise ValueError(f"No bill series found for document type: {document_type}")
+        """
+        Preview the next bill number. Nothing is reserved: the number is
+        allocated inside the transaction that creates the document, so
+        gapless series never lose one to a preview.
+        """
         
-        # Generate bill number
-        bill_number = series.generate_number()
-        
-        # Update current number
-        series.current_number += 1
-        db.commit()
-        
-        logger.info(f"Generated bill number: {bill_number}")
-        
-        return bill_number
+        return document_number_service.peek_number(db, company_id, document_type)
     
     # Payment Mode Management
     def create_payment_mode(
@@ -678,7 +662,7 @@ class EnhancedSalesService:
         """Create sale return"""
         
         # Generate return number
-        return_number = f"SR-{datetime.now().strftime('%Y%m%d')}-{str(uuid.uuid4())[:8]}"
+        return_number = document_number_service.next_number(db, company_id, "sale_return")
         
         # Get original bill details if provided
         original_bill = None
@@ -914,6 +898,9 @@ class EnhancedSalesService:
         session.total_sales = sum(sale.total_amount for sale in sales)
         session.total_transactions = len(sales)
         
+        # Unused pre-allocated bill numbers go back out of circulation
+        document_number_service.release_session_blocks(db, session_id)
+        
         db.commit()
         
         logger.info(f"POS session closed: {session.session_number}")
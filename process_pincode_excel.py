@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 """
 Process the uploaded pincode Excel file
-This script will automatically detect and process your Excel file
+This script will automatically detect your Excel file, compile it into the
+geography dataset the API serves from, and seed the database from that
+dataset (pass --skip-db to only compile)
 """
 
 import os
@@ -47,7 +49,7 @@ def find_excel_file():
     return None
 
 def process_excel_file():
-    """Process the Excel file and set up the system"""
+    """Compile the Excel file into the geography dataset"""
     logger.info("🚀 Starting Excel file processing...")
     
     # Find the Excel file
@@ -55,54 +57,43 @@ def process_excel_file():
     if not excel_file:
         return False
     
-    # Move to data directory if not already there
-    data_dir = Path("data")
-    data_dir.mkdir(exist_ok=True)
+    from app.services.l10n_in.geography_index_service import geography_index_service
     
-    target_path = data_dir / "pincode wise details.xlsx"
+    # Move to the configured source location if not already there
+    target_path = geography_index_service.source_path
+    target_path.parent.mkdir(parents=True, exist_ok=True)
     if not target_path.exists():
         import shutil
         shutil.copy2(excel_file, target_path)
         logger.info(f"📁 Copied Excel file to: {target_path}")
     
-    # Run the processing script
+    # Compile (and checksum) the dataset
     try:
-        import subprocess
-        result = subprocess.run([
-            sys.executable, 
-            "data/process_pincode_data.py"
-        ], capture_output=True, text=True)
+        header = geography_index_service.build()
+        counts = header["counts"]
+        logger.info("✅ Excel file processed successfully!")
+        logger.info(f"📊 Dataset saved to {geography_index_service.index_path} (checksum {header['checksum'][:12]})")
+        logger.info(f"   {counts['pincodes']} pincodes, {counts['cities']} cities, {counts['states']} states, {counts['areas']} areas")
+        return True
         
-        if result.returncode == 0:
-            logger.info("✅ Excel file processed successfully!")
-            logger.info("📊 Processed data saved to data/processed/")
-            return True
-        else:
-            logger.error(f"❌ Processing failed: {result.stderr}")
-            return False
-            
     except Exception as e:
-        logger.error(f"❌ Error running processing script: {e}")
+        logger.error(f"❌ Error compiling geography dataset: {e}")
         return False
 
 def setup_database_import():
-    """Set up database import"""
+    """Seed the database from the compiled dataset"""
     logger.info("🗄️ Setting up database import...")
     
     try:
-        import subprocess
-        result = subprocess.run([
-            sys.executable,
-            "data/import_to_database.py"
-        ], capture_output=True, text=True)
+        from app.database import get_db_session
+        from app.core.init_indian_geography import init_indian_geography_data
+        
+        with get_db_session() as db:
+            init_indian_geography_data(db)
+        
+        logger.info("✅ Database import completed!")
+        return True
         
-        if result.returncode == 0:
-            logger.info("✅ Database import completed!")
-            return True
-        else:
-            logger.error(f"❌ Database import failed: {result.stderr}")
-            return False
-            
     except Exception as e:
         logger.error(f"❌ Error running database import: {e}")
         return False
@@ -112,39 +103,33 @@ def main():
     logger.info("🎯 PINCODE EXCEL FILE PROCESSOR")
     logger.info("=" * 50)
     
-    # Step 1: Find and process Excel file
+    # Step 1: Find and compile Excel file
     if not process_excel_file():
         logger.error("❌ Failed to process Excel file")
         return False
     
     # Step 2: Import to database
-    logger.info("🔄 Importing processed data to database...")
-    if not setup_database_import():
-        logger.error("❌ Failed to import data to database")
-        return False
+    if "--skip-db" in sys.argv:
+        logger.info("⏭️ Skipping database import")
+    else:
+        logger.info("🔄 Importing compiled data to database...")
+        if not setup_database_import():
+            logger.error("❌ Failed to import data to database")
+            return False
     
     # Step 3: Verify setup
     logger.info("🔍 Verifying setup...")
     
-    # Check if processed files exist
-    processed_dir = Path("data/processed")
-    required_files = [
-        "pincodes.json",
-        "pincode_lookup.json", 
-        "city_lookup.json",
-        "state_lookup.json",
-        "area_lookup.json"
-    ]
-    
-    all_files_exist = all((processed_dir / file).exists() for file in required_files)
+    from app.services.l10n_in.geography_index_service import geography_index_service
     
-    if all_files_exist:
-        logger.info("✅ All processed files created successfully!")
+    index = geography_index_service.reload()
+    if index is not None and index.verify():
+        logger.info("✅ Geography dataset verified!")
         logger.info("🎉 PINCODE SYSTEM IS READY!")
         logger.info("")
         logger.info("📋 What's been set up:")
         logger.info("  ✅ Excel file processed")
-        logger.info("  ✅ JSON data files created")
+        logger.info("  ✅ Geography dataset compiled")
         logger.info("  ✅ Database import completed")
         logger.info("  ✅ API endpoints ready")
         logger.info("  ✅ Setup wizard enhanced")
@@ -156,7 +141,7 @@ def main():
         logger.info("   - Fast pincode search and validation")
         return True
     else:
-        logger.error("❌ Some processed files are missing")
+        logger.error("❌ Geography dataset is missing or failed its checksum")
         return False
 
 if __name__ == "__main__":